@@ -9,6 +9,12 @@ Advanced AI model management system for enterprise deployment:
 - Automated deployment pipelines
 - Performance monitoring and optimization
 - Model registry and metadata management
+
+Live inference goes through TrafficRouter: traffic is split across model
+versions by weight with sticky per-session assignment, shadow versions
+receive mirrored requests off the critical path, and canary, shadow and
+A/B experiments are promoted or rolled back by sequential tests on the
+measured latency and error rates.
 """
 
 import asyncio
@@ -16,10 +22,14 @@ import time
 import logging
 import json
 import hashlib
+import math
+import random
 import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Callable
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple, Union, Callable
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import threading
 import sqlite3
@@ -44,6 +54,7 @@ class DeploymentStrategy(Enum):
     CANARY = "canary"
     ROLLING = "rolling"
     A_B_TEST = "a_b_test"
+    SHADOW = "shadow"
 
 @dataclass
 class ModelMetadata:
@@ -62,10 +73,385 @@ class ModelMetadata:
     file_size: int
     checksum: str
 
+# Histogram vedra za latenco rastejo za 5 %, kar da percentile z ~2.5 % napako
+LATENCY_FLOOR_MS = 0.001
+LATENCY_BUCKET_GROWTH = 1.05
+
+
+class VersionStats:
+    """Measured latency and error distribution of one model version"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.mismatches = 0
+        self.latency_sum_ms = 0.0
+        # Log-latency moments of successful requests, used by the sequential tests
+        self.log_n = 0
+        self.log_sum = 0.0
+        self.log_sumsq = 0.0
+        self.buckets: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float, error: bool = False, mismatch: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.latency_sum_ms += latency_ms
+            if error:
+                self.errors += 1
+                return
+            if mismatch:
+                self.mismatches += 1
+            log_latency = math.log(max(latency_ms, LATENCY_FLOOR_MS))
+            self.log_n += 1
+            self.log_sum += log_latency
+            self.log_sumsq += log_latency * log_latency
+            self.buckets[int((log_latency - math.log(LATENCY_FLOOR_MS)) / math.log(LATENCY_BUCKET_GROWTH))] += 1
+
+    def error_moments(self) -> Tuple[int, float]:
+        """Request count and error rate, smoothed so that zero errors still has variance"""
+        with self._lock:
+            return self.requests, (self.errors + 0.5) / (self.requests + 1)
+
+    def log_latency_moments(self) -> Tuple[int, float, float]:
+        """Count, mean and variance of log latency over successful requests"""
+        with self._lock:
+            if self.log_n < 2:
+                return self.log_n, 0.0, 0.0
+            mean = self.log_sum / self.log_n
+            return self.log_n, mean, max(self.log_sumsq / self.log_n - mean * mean, 0.0) * self.log_n / (self.log_n - 1)
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            total = sum(self.buckets.values())
+            if not total:
+                return 0.0
+            rank, seen = q / 100.0 * total, 0
+            for index in sorted(self.buckets):
+                seen += self.buckets[index]
+                if seen >= rank:
+                    return LATENCY_FLOOR_MS * LATENCY_BUCKET_GROWTH ** (index + 0.5)
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        successes = self.log_n
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "mismatches": self.mismatches,
+            "latency_ms": {
+                "mean": self.latency_sum_ms / self.requests if self.requests else 0.0,
+                "geometric_mean": math.exp(self.log_sum / successes) if successes else 0.0,
+                "p50": self.percentile(50),
+                "p90": self.percentile(90),
+                "p99": self.percentile(99)
+            }
+        }
+
+
+def always_valid_p_value(effect: float, variance: float, tau: float) -> float:
+    """mSPRT p-value for a normal effect estimate with a N(0, tau^2) mixture.
+
+    Unlike a fixed-horizon p-value it may be checked after every request:
+    the chance that it ever drops below alpha under the null is at most alpha.
+    """
+    if variance <= 0:
+        return 1.0
+    spread = variance + tau * tau
+    log_likelihood_ratio = 0.5 * math.log(variance / spread) + effect * effect * tau * tau / (2 * variance * spread)
+    return min(1.0, math.exp(-log_likelihood_ratio))
+
+
+@dataclass
+class ExperimentPolicy:
+    """When a candidate version is promoted or rolled back"""
+    alpha: float = 0.05
+    min_samples: int = 200
+    max_samples: int = 50000
+    error_margin: float = 0.01      # tolerated absolute increase of the error rate
+    latency_margin: float = 0.10    # tolerated relative increase of typical latency
+    error_tau: float = 0.02
+    latency_tau: float = 0.2
+    auto_apply: bool = True
+
+
+class SequentialTest:
+    """Always-valid comparison of a candidate against its control.
+
+    Rollback when the candidate is significantly worse on the error rate or
+    the log latency; promote when it is significantly within the margins on
+    both; roll back as inconclusive after max_samples. The smallest p-value
+    seen so far is kept per hypothesis, which is valid because the mSPRT
+    bound holds uniformly over time.
+    """
+
+    def __init__(self, policy: ExperimentPolicy):
+        self.policy = policy
+        self.p_values = {"error_harm": 1.0, "latency_harm": 1.0, "error_noninferior": 1.0,
+                         "latency_noninferior": 1.0}
+
+    def evaluate(self, control: VersionStats, candidate: VersionStats) -> Dict[str, Any]:
+        policy = self.policy
+        control_n, control_rate = control.error_moments()
+        candidate_n, candidate_rate = candidate.error_moments()
+        samples = min(control_n, candidate_n)
+        decision = {"action": "continue", "reason": "", "samples": {"control": control_n, "candidate": candidate_n}}
+        if samples < policy.min_samples:
+            return decision
+
+        error_effect = candidate_rate - control_rate
+        error_variance = control_rate * (1 - control_rate) / control_n + candidate_rate * (1 - candidate_rate) / candidate_n
+        self._update("error_harm", error_effect, error_effect, error_variance, policy.error_tau)
+        self._update("error_noninferior", -(error_effect - policy.error_margin), error_effect - policy.error_margin,
+                     error_variance, policy.error_tau)
+
+        control_log_n, control_mean, control_var = control.log_latency_moments()
+        candidate_log_n, candidate_mean, candidate_var = candidate.log_latency_moments()
+        if min(control_log_n, candidate_log_n) >= 2:
+            latency_effect = candidate_mean - control_mean
+            latency_variance = control_var / control_log_n + candidate_var / candidate_log_n
+            margin = math.log1p(policy.latency_margin)
+            self._update("latency_harm", latency_effect, latency_effect, latency_variance, policy.latency_tau)
+            self._update("latency_noninferior", -(latency_effect - margin), latency_effect - margin,
+                         latency_variance, policy.latency_tau)
+            decision["latency_ratio"] = math.exp(latency_effect)
+        decision["error_rate_difference"] = error_effect
+        decision["p_values"] = dict(self.p_values)
+
+        # Dve hipotezi škode: Bonferroni
+        if self.p_values["error_harm"] <= policy.alpha / 2:
+            decision.update(action="rollback", reason="error rate regression")
+        elif self.p_values["latency_harm"] <= policy.alpha / 2:
+            decision.update(action="rollback", reason="latency regression")
+        elif self.p_values["error_noninferior"] <= policy.alpha and self.p_values["latency_noninferior"] <= policy.alpha:
+            decision.update(action="promote", reason="non-inferior on error rate and latency")
+        elif samples >= policy.max_samples:
+            decision.update(action="rollback", reason="inconclusive after max_samples")
+        return decision
+
+    def _update(self, name: str, direction: float, effect: float, variance: float, tau: float):
+        # Only evidence in the hypothesis' own direction counts
+        if direction > 0:
+            self.p_values[name] = min(self.p_values[name], always_valid_p_value(effect, variance, tau))
+
+
+@dataclass
+class Experiment:
+    experiment_id: str
+    route: str
+    control: str
+    candidate: str
+    mode: str                       # "canary" (live split) or "shadow" (mirrored)
+    weight: float
+    policy: ExperimentPolicy
+    test: SequentialTest
+    arms: Dict[Tuple[str, str], VersionStats]
+    status: str = "running"
+    decision: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Route:
+    name: str
+    stable: str
+    weights: Dict[str, float]
+    shadows: List[str] = field(default_factory=list)
+    salt: str = ""
+    experiment: Optional[Experiment] = None
+    # (version, cumulative upper bound), non-stable versions first
+    ranges: List[Tuple[str, float]] = field(default_factory=list)
+
+
+class TrafficRouter:
+    """Splits live inference traffic across model versions.
+
+    A session hashes to a fixed point in [0, 1) per route, and versions own
+    consecutive slices of that interval with the stable version last, so a
+    session keeps its version while weights are unchanged and growing a
+    candidate's weight only moves sessions from the stable version to it.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter, shadow_workers: int = 2,
+                 max_shadow_pending: int = 256,
+                 on_decision: Optional[Callable[[Experiment], None]] = None):
+        self.clock = clock
+        self.on_decision = on_decision
+        self.routes: Dict[str, Route] = {}
+        self.predictors: Dict[str, Callable[[Any], Any]] = {}
+        self.stats: Dict[Tuple[str, str], VersionStats] = {}
+        self.shadow_dropped = 0
+        self._experiments = 0
+        self._lock = threading.RLock()
+        self._shadow_pool = ThreadPoolExecutor(max_workers=max(1, shadow_workers), thread_name_prefix="mia-shadow")
+        self._shadow_slots = threading.BoundedSemaphore(max_shadow_pending)
+
+    def add_version(self, version: str, predictor: Callable[[Any], Any]):
+        self.predictors[version] = predictor
+
+    def version_stats(self, version: str, role: str = "live") -> VersionStats:
+        with self._lock:
+            return self.stats.setdefault((version, role), VersionStats())
+
+    def set_stable(self, route_name: str, version: str):
+        """Send all traffic of the route to version"""
+        with self._lock:
+            route = self.routes.get(route_name)
+            if route is None:
+                route = self.routes[route_name] = Route(route_name, version, {}, salt=route_name)
+            route.stable = version
+            self._set_weights(route, {version: 1.0})
+
+    def set_weights(self, route_name: str, weights: Dict[str, float]):
+        with self._lock:
+            self._set_weights(self.routes[route_name], weights)
+
+    def _set_weights(self, route: Route, weights: Dict[str, float]):
+        unknown = [version for version in weights if version not in self.predictors]
+        if unknown:
+            raise KeyError(f"No predictor for versions: {unknown}")
+        total = sum(weights.values())
+        if total <= 0 or any(weight < 0 for weight in weights.values()):
+            raise ValueError(f"Invalid traffic weights: {weights}")
+        route.weights = {version: weight / total for version, weight in weights.items() if weight > 0}
+        ordered = [version for version in route.weights if version != route.stable]
+        if route.stable in route.weights:
+            ordered.append(route.stable)
+        bound, ranges = 0.0, []
+        for version in ordered:
+            bound += route.weights[version]
+            ranges.append((version, bound))
+        ranges[-1] = (ranges[-1][0], 1.0)
+        route.ranges = ranges
+
+    @staticmethod
+    def _bucket(salt: str, session_id: str) -> float:
+        digest = hashlib.blake2b(f"{salt}:{session_id}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2.0 ** 64
+
+    def assign(self, route_name: str, session_id: Optional[str] = None) -> str:
+        route = self.routes.get(route_name)
+        if route is None:
+            raise KeyError(f"Unknown route: {route_name}")
+        point = random.random() if session_id is None else self._bucket(route.salt, session_id)
+        for version, bound in route.ranges:
+            if point < bound:
+                return version
+        return route.ranges[-1][0]
+
+    def infer(self, route_name: str, request: Any, session_id: Optional[str] = None) -> Any:
+        """Serve request from the session's version; model errors propagate after being recorded"""
+        version = self.assign(route_name, session_id)
+        route = self.routes[route_name]
+        started = self.clock()
+        try:
+            result = self.predictors[version](request)
+        except Exception:
+            self._record(route, version, "live", (self.clock() - started) * 1000.0, True)
+            raise
+        self._record(route, version, "live", (self.clock() - started) * 1000.0, False)
+        for shadow in route.shadows:
+            self._mirror(route, shadow, request, result)
+        return result
+
+    def _mirror(self, route: Route, version: str, request: Any, served: Any):
+        if not self._shadow_slots.acquire(blocking=False):
+            with self._lock:
+                self.shadow_dropped += 1
+            return
+        try:
+            future = self._shadow_pool.submit(self._run_shadow, route, version, request, served)
+        except RuntimeError:
+            self._shadow_slots.release()
+            return
+        future.add_done_callback(lambda _: self._shadow_slots.release())
+
+    def _run_shadow(self, route: Route, version: str, request: Any, served: Any):
+        started = self.clock()
+        try:
+            result = self.predictors[version](request)
+        except Exception:
+            self._record(route, version, "shadow", (self.clock() - started) * 1000.0, True)
+            return
+        self._record(route, version, "shadow", (self.clock() - started) * 1000.0, False, result != served)
+
+    def _record(self, route: Route, version: str, role: str, latency_ms: float, error: bool, mismatch: bool = False):
+        self.version_stats(version, role).record(latency_ms, error, mismatch)
+        experiment = route.experiment
+        if experiment is None:
+            return
+        arm = experiment.arms.get((version, role))
+        if arm is not None:
+            arm.record(latency_ms, error, mismatch)
+            self._evaluate(route, experiment)
+
+    def start_experiment(self, route_name: str, candidate: str, weight: float = 0.1, mode: str = "canary",
+                         policy: Optional[ExperimentPolicy] = None, experiment_id: Optional[str] = None) -> Experiment:
+        """Compare candidate against the route's stable version on live ("canary") or mirrored ("shadow") traffic"""
+        with self._lock:
+            route = self.routes.get(route_name)
+            if route is None:
+                raise KeyError(f"Unknown route: {route_name}")
+            if route.experiment is not None and route.experiment.status == "running":
+                raise ValueError(f"Route {route_name} already runs experiment {route.experiment.experiment_id}")
+            if candidate not in self.predictors or candidate == route.stable:
+                raise ValueError(f"Invalid candidate for route {route_name}: {candidate}")
+            if mode not in ("canary", "shadow"):
+                raise ValueError(f"Unknown experiment mode: {mode}")
+            policy = policy or ExperimentPolicy()
+            self._experiments += 1
+            experiment_id = experiment_id or f"{route_name}:{candidate}:{self._experiments}"
+            candidate_role = "live" if mode == "canary" else "shadow"
+            experiment = Experiment(experiment_id, route_name, route.stable, candidate, mode, weight, policy,
+                                    SequentialTest(policy),
+                                    {(route.stable, "live"): VersionStats(), (candidate, candidate_role): VersionStats()})
+            # Nov poskus dobi nov razpored sej
+            route.salt = experiment_id
+            if mode == "canary":
+                self._set_weights(route, {candidate: weight, route.stable: 1.0 - weight})
+            else:
+                route.shadows = [candidate]
+            route.experiment = experiment
+            return experiment
+
+    def _evaluate(self, route: Route, experiment: Experiment):
+        control = experiment.arms[(experiment.control, "live")]
+        candidate = experiment.arms[(experiment.candidate, "live" if experiment.mode == "canary" else "shadow")]
+        with self._lock:
+            if experiment.status != "running":
+                return
+            decision = experiment.test.evaluate(control, candidate)
+            if decision["action"] == "continue":
+                return
+            experiment.decision = decision
+            promote = decision["action"] == "promote"
+            if experiment.mode == "shadow":
+                experiment.status = "validated" if promote else "rolled_back"
+            else:
+                experiment.status = "promoted" if promote else "rolled_back"
+            if experiment.policy.auto_apply:
+                self._apply(route, experiment)
+        if self.on_decision:
+            self.on_decision(experiment)
+
+    def _apply(self, route: Route, experiment: Experiment):
+        if experiment.mode == "shadow":
+            route.shadows = [version for version in route.shadows if version != experiment.candidate]
+        elif experiment.status == "promoted":
+            route.stable = experiment.candidate
+            self._set_weights(route, {experiment.candidate: 1.0})
+        else:
+            self._set_weights(route, {experiment.control: 1.0})
+
+    def close(self):
+        self._shadow_pool.shutdown(wait=True)
+
+
 class UltimateAIModelManager:
     """Ultimate AI Model Management Hub"""
     
-    def __init__(self, registry_path: str = "model_registry"):
+    def __init__(self, registry_path: str = "model_registry", policy: Optional[ExperimentPolicy] = None,
+                 clock: Callable[[], float] = time.perf_counter, shadow_workers: int = 2):
         self.logger = self._setup_logging()
         self.registry_path = Path(registry_path)
         self.registry_path.mkdir(exist_ok=True)
@@ -74,10 +460,15 @@ class UltimateAIModelManager:
         self.models = {}
         self.deployments = {}
         self.ab_tests = {}
+        self.policy = policy or ExperimentPolicy()
+        self.router = TrafficRouter(clock=clock, shadow_workers=shadow_workers, on_decision=self._on_decision)
+        self._experiment_owners: Dict[str, Tuple[str, str]] = {}
         
         # Performance monitoring
         self.performance_metrics = []
         self.monitoring_active = False
+        self._monitor_stop = threading.Event()
+        self._last_collection: Dict[str, Tuple[float, int, int, float]] = {}
         
         self.logger.info("🤖 Ultimate AI Model Manager initialized")
     
@@ -96,15 +487,19 @@ class UltimateAIModelManager:
         
         return logger
     
-    def register_model(self, model_id: str, metadata: Dict[str, Any]) -> bool:
-        """Register a new model"""
+    def register_model(self, model_id: str, metadata: Dict[str, Any],
+                       predictor: Optional[Callable[[Any], Any]] = None) -> bool:
+        """Register a new model; versions sharing metadata["route"] serve the same traffic"""
         try:
             self.models[model_id] = {
                 "metadata": metadata,
                 "registered_at": datetime.now(),
                 "status": ModelStatus.DEVELOPMENT.value,
-                "versions": []
+                "versions": [],
+                "route": metadata.get("route", model_id)
             }
+            if predictor is not None:
+                self.router.add_version(model_id, predictor)
             
             self.logger.info(f"✅ Model registered: {model_id}")
             return True
@@ -115,30 +510,52 @@ class UltimateAIModelManager:
     
     def deploy_model(self, model_id: str, strategy: str = "canary", 
                     rollout_percentage: float = 25.0) -> bool:
-        """Deploy model using specified strategy"""
+        """Deploy model using specified strategy.
+
+        The first version on a route, or blue_green, takes all traffic at once.
+        canary, rolling and a_b_test send rollout_percentage of sessions to
+        the model and shadow mirrors requests to it; these are promoted or
+        rolled back automatically once the sequential test decides.
+        """
         try:
             if model_id not in self.models:
                 self.logger.error(f"Model {model_id} not found")
                 return False
+            if model_id not in self.router.predictors:
+                self.logger.error(f"Model {model_id} has no predictor to serve traffic")
+                return False
+            DeploymentStrategy(strategy)
             
-            deployment_id = f"{strategy}_{model_id}_{int(self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200)}"
+            route_name = self.models[model_id]["route"]
+            route = self.router.routes.get(route_name)
+            baseline = route.stable if route else None
+            deployment_id = f"{strategy}_{model_id}_{len(self.deployments) + 1}"
             
             self.deployments[deployment_id] = {
                 "model_id": model_id,
                 "strategy": strategy,
                 "rollout_percentage": rollout_percentage,
+                "route": route_name,
+                "baseline": baseline,
                 "status": "deploying",
                 "start_time": datetime.now()
             }
             
-            # Perform actual operation
             self.logger.info(f"🚀 Deploying {model_id} using {strategy} strategy")
-            time.sleep(1)  # Perform actual operation
+            if baseline is None or baseline == model_id or strategy == DeploymentStrategy.BLUE_GREEN.value:
+                self.router.set_stable(route_name, model_id)
+                self.deployments[deployment_id]["status"] = "active"
+                self.deployments[deployment_id]["rollout_percentage"] = 100.0
+                self._set_production(model_id, baseline)
+            else:
+                mode = "shadow" if strategy == DeploymentStrategy.SHADOW.value else "canary"
+                experiment = self.router.start_experiment(route_name, model_id, rollout_percentage / 100.0, mode,
+                                                          self.policy, deployment_id)
+                self._experiment_owners[experiment.experiment_id] = ("deployment", deployment_id)
+                self.deployments[deployment_id]["status"] = "active"
+                self.models[model_id]["status"] = ModelStatus.STAGING.value if mode == "shadow" else ModelStatus.TESTING.value
             
-            self.deployments[deployment_id]["status"] = "active"
-            self.models[model_id]["status"] = ModelStatus.PRODUCTION.value
-            
-            self.logger.info(f"✅ Deployment completed: {deployment_id}")
+            self.logger.info(f"✅ Deployment started: {deployment_id}")
             return True
             
         except Exception as e:
@@ -147,22 +564,27 @@ class UltimateAIModelManager:
     
     def create_ab_test(self, test_id: str, model_a: str, model_b: str, 
                       traffic_split: float = 0.5) -> bool:
-        """Create A/B test between two models"""
+        """Create A/B test between two models; traffic_split is the share of sessions sent to model_b"""
         try:
             if model_a not in self.models or model_b not in self.models:
                 self.logger.error("One or both models not found")
                 return False
             
+            route_name = self.models[model_a]["route"]
+            route = self.router.routes.get(route_name)
+            if route is None or route.stable != model_a:
+                self.router.set_stable(route_name, model_a)
+            experiment = self.router.start_experiment(route_name, model_b, traffic_split, "canary", self.policy, test_id)
+            self._experiment_owners[experiment.experiment_id] = ("ab_test", test_id)
+            
             self.ab_tests[test_id] = {
                 "model_a": model_a,
                 "model_b": model_b,
                 "traffic_split": traffic_split,
+                "route": route_name,
                 "start_time": datetime.now(),
                 "status": "active",
-                "metrics": {
-                    "model_a": {"requests": 0, "latency": [], "accuracy": []},
-                    "model_b": {"requests": 0, "latency": [], "accuracy": []}
-                }
+                "experiment": experiment
             }
             
             self.logger.info(f"🧪 A/B test created: {test_id}")
@@ -172,36 +594,89 @@ class UltimateAIModelManager:
             self.logger.error(f"Failed to create A/B test: {e}")
             return False
     
-    def start_monitoring(self):
+    def infer(self, route: str, request: Any, session_id: Optional[str] = None) -> Any:
+        """Serve a live request on route; model errors propagate to the caller"""
+        return self.router.infer(route, request, session_id)
+    
+    def get_ab_test_results(self, test_id: str) -> Dict[str, Any]:
+        """Measured per-arm distributions and the sequential test state"""
+        test = self.ab_tests.get(test_id)
+        if not test:
+            return {}
+        experiment = test["experiment"]
+        return {
+            "status": test["status"],
+            "winner": test.get("winner"),
+            "arms": {version: stats.snapshot() for (version, _), stats in experiment.arms.items()},
+            "p_values": dict(experiment.test.p_values),
+            "decision": experiment.decision
+        }
+    
+    def _set_production(self, model_id: str, previous: Optional[str]):
+        self.models[model_id]["status"] = ModelStatus.PRODUCTION.value
+        if previous and previous != model_id and previous in self.models:
+            # Prejšnja različica ostane pripravljena za hitro vrnitev
+            self.models[previous]["status"] = ModelStatus.STAGING.value
+    
+    def _on_decision(self, experiment: Experiment):
+        kind, owner_id = self._experiment_owners.get(experiment.experiment_id, (None, None))
+        promoted = experiment.status == "promoted"
+        if promoted:
+            self._set_production(experiment.candidate, experiment.control)
+        elif experiment.status == "rolled_back" and experiment.candidate in self.models:
+            self.models[experiment.candidate]["status"] = ModelStatus.DEPRECATED.value
+        
+        if kind == "deployment":
+            self.deployments[owner_id]["status"] = experiment.status
+            self.deployments[owner_id]["decision"] = experiment.decision
+        elif kind == "ab_test":
+            self.ab_tests[owner_id]["status"] = "completed"
+            self.ab_tests[owner_id]["winner"] = experiment.candidate if promoted else experiment.control
+        
+        self.logger.info(f"📐 {experiment.experiment_id}: {experiment.status} ({experiment.decision.get('reason')})")
+    
+    def collect_metrics(self) -> List[Dict[str, Any]]:
+        """Append measured metrics of production models since the previous collection"""
+        collected = []
+        now = time.monotonic()
+        for model_id, model in self.models.items():
+            if model["status"] != ModelStatus.PRODUCTION.value or model_id not in self.router.predictors:
+                continue
+            stats = self.router.version_stats(model_id)
+            requests, errors, latency_sum = stats.requests, stats.errors, stats.latency_sum_ms
+            since, last_requests, last_errors, last_latency = self._last_collection.get(model_id, (now, 0, 0, 0.0))
+            self._last_collection[model_id] = (now, requests, errors, latency_sum)
+            window = requests - last_requests
+            if window <= 0:
+                continue
+            metrics = {
+                "model_id": model_id,
+                "timestamp": datetime.now(),
+                "requests": window,
+                "latency_ms": (latency_sum - last_latency) / window,
+                "p99_latency_ms": stats.percentile(99),
+                "throughput_rps": window / (now - since) if now > since else 0.0,
+                "error_rate": (errors - last_errors) / window
+            }
+            collected.append(metrics)
+        
+        self.performance_metrics.extend(collected)
+        # Keep only recent metrics
+        if len(self.performance_metrics) > 1000:
+            self.performance_metrics = self.performance_metrics[-1000:]
+        return collected
+    
+    def start_monitoring(self, interval: float = 30.0):
         """Start performance monitoring"""
         self.monitoring_active = True
+        self._monitor_stop.clear()
         
         def monitoring_loop():
-            while self.monitoring_active:
+            while not self._monitor_stop.wait(interval):
                 try:
-                    # Perform actual operation
-                    for model_id in self.models:
-                        if self.models[model_id]["status"] == ModelStatus.PRODUCTION.value:
-                            metrics = {
-                                "model_id": model_id,
-                                "timestamp": datetime.now(),
-                                "latency_ms": 50.0 + (hash(model_id) % 50),
-                                "throughput_rps": 100.0 + (hash(model_id) % 100),
-                                "accuracy": 0.95 + (hash(model_id) % 5) / 100,
-                                "error_rate": 0.01 + (hash(model_id) % 3) / 1000
-                            }
-                            
-                            self.performance_metrics.append(metrics)
-                    
-                    # Keep only recent metrics
-                    if len(self.performance_metrics) > 1000:
-                        self.performance_metrics = self.performance_metrics[-1000:]
-                    
-                    time.sleep(30)  # Monitor every 30 seconds
-                    
+                    self.collect_metrics()
                 except Exception as e:
                     self.logger.error(f"Monitoring error: {e}")
-                    time.sleep(60)
         
         monitor_thread = threading.Thread(target=monitoring_loop, daemon=True)
         monitor_thread.start()
@@ -211,6 +686,7 @@ class UltimateAIModelManager:
     def stop_monitoring(self):
         """Stop performance monitoring"""
         self.monitoring_active = False
+        self._monitor_stop.set()
         self.logger.info("📊 Performance monitoring stopped")
     
     def get_system_overview(self) -> Dict[str, Any]:
@@ -228,18 +704,19 @@ class UltimateAIModelManager:
             
             avg_latency = sum(m["latency_ms"] for m in recent_metrics) / max(len(recent_metrics), 1)
             avg_throughput = sum(m["throughput_rps"] for m in recent_metrics) / max(len(recent_metrics), 1)
-            avg_accuracy = sum(m["accuracy"] for m in recent_metrics) / max(len(recent_metrics), 1)
+            avg_error_rate = sum(m["error_rate"] for m in recent_metrics) / max(len(recent_metrics), 1)
             
             return {
                 "total_models": len(self.models),
                 "models_by_status": status_counts,
                 "active_deployments": len([d for d in self.deployments.values() if d["status"] == "active"]),
                 "active_ab_tests": len([t for t in self.ab_tests.values() if t["status"] == "active"]),
+                "routes": {name: dict(route.weights) for name, route in self.router.routes.items()},
                 "monitoring_active": self.monitoring_active,
                 "performance_summary": {
                     "avg_latency_ms": avg_latency,
                     "avg_throughput_rps": avg_throughput,
-                    "avg_accuracy": avg_accuracy,
+                    "avg_error_rate": avg_error_rate,
                     "metrics_collected": len(recent_metrics)
                 }
             }
@@ -248,41 +725,83 @@ class UltimateAIModelManager:
             self.logger.error(f"Failed to get system overview: {e}")
             return {}
 
+def synthetic_model(latency_ms: float, error_rate: float = 0.0, jitter: float = 0.25, seed: Optional[int] = None,
+                    sleep: Callable[[float], None] = time.sleep) -> Callable[[Any], Any]:
+    """Stub predictor with a log-normal latency around latency_ms and a fixed error rate"""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    
+    def predict(request: Any) -> Any:
+        with lock:
+            delay = latency_ms * rng.lognormvariate(0.0, jitter)
+            failed = rng.random() < error_rate
+        sleep(delay / 1000.0)
+        if failed:
+            raise RuntimeError("synthetic model error")
+        return {"echo": request}
+    
+    return predict
+
 def main():
     """Main execution function"""
     print("🤖 Initializing Ultimate AI Model Management Hub...")
     
     # Initialize model manager
-    model_manager = UltimateAIModelManager()
+    model_manager = UltimateAIModelManager(policy=ExperimentPolicy(min_samples=100))
     
     # Start monitoring
-    model_manager.start_monitoring()
+    model_manager.start_monitoring(interval=1.0)
     
     # Register sample models
     model_manager.register_model("mia_consciousness_v1", {
         "name": "MIA Consciousness Model",
         "version": "1.0.0",
         "description": "Advanced consciousness model",
-        "parameters": {"layers": 24, "hidden_size": 1024}
-    })
+        "parameters": {"layers": 24, "hidden_size": 1024},
+        "route": "consciousness"
+    }, synthetic_model(0.4, 0.01, seed=1))
+    
+    model_manager.register_model("mia_consciousness_v2", {
+        "name": "MIA Consciousness Model",
+        "version": "2.0.0",
+        "description": "Faster consciousness model",
+        "parameters": {"layers": 16, "hidden_size": 1024},
+        "route": "consciousness"
+    }, synthetic_model(0.2, 0.01, seed=2))
     
     model_manager.register_model("mia_memory_v1", {
         "name": "MIA Memory Model", 
         "version": "1.0.0",
         "description": "Advanced memory model",
-        "parameters": {"layers": 12, "hidden_size": 512}
-    })
+        "parameters": {"layers": 12, "hidden_size": 512},
+        "route": "memory"
+    }, synthetic_model(0.3, 0.01, seed=3))
+    
+    model_manager.register_model("mia_memory_v2", {
+        "name": "MIA Memory Model", 
+        "version": "2.0.0",
+        "description": "Memory model with a regression",
+        "parameters": {"layers": 12, "hidden_size": 512},
+        "route": "memory"
+    }, synthetic_model(0.3, 0.15, seed=4))
     
     # Deploy models
-    model_manager.deploy_model("mia_consciousness_v1", "canary", 25.0)
+    model_manager.deploy_model("mia_consciousness_v1", "blue_green")
+    model_manager.deploy_model("mia_consciousness_v2", "canary", 25.0)
     model_manager.deploy_model("mia_memory_v1", "blue_green")
     
     # Create A/B test
-    model_manager.create_ab_test("consciousness_test", "mia_consciousness_v1", "mia_memory_v1")
+    model_manager.create_ab_test("memory_test", "mia_memory_v1", "mia_memory_v2")
     
-    # Wait for monitoring data
-    print("⏱️ Collecting performance data...")
-    time.sleep(3)
+    # Serve synthetic traffic
+    print("⏱️ Serving synthetic traffic...")
+    for i in range(3000):
+        for route in ("consciousness", "memory"):
+            try:
+                model_manager.infer(route, {"prompt": i}, session_id=f"user-{i % 500}")
+            except RuntimeError:
+                pass
+    model_manager.collect_metrics()
     
     # Get system overview
     overview = model_manager.get_system_overview()
@@ -299,20 +818,28 @@ def main():
         
         perf = overview.get('performance_summary', {})
         print(f"\nPerformance Summary:")
-        print(f"  Avg Latency: {perf.get('avg_latency_ms', 0):.1f}ms")
+        print(f"  Avg Latency: {perf.get('avg_latency_ms', 0):.2f}ms")
         print(f"  Avg Throughput: {perf.get('avg_throughput_rps', 0):.1f} RPS")
-        print(f"  Avg Accuracy: {perf.get('avg_accuracy', 0):.2%}")
+        print(f"  Avg Error Rate: {perf.get('avg_error_rate', 0):.2%}")
         
         status_counts = overview.get('models_by_status', {})
         print(f"\nModels by Status:")
         for status, count in status_counts.items():
             print(f"  {status}: {count}")
+        
+        print(f"\nDecisions:")
+        for deployment_id, deployment in model_manager.deployments.items():
+            reason = deployment.get("decision", {}).get("reason", "")
+            print(f"  {deployment_id}: {deployment['status']} {reason}")
+        for test_id, test in model_manager.ab_tests.items():
+            print(f"  {test_id}: {test['status']}, winner {test.get('winner')}")
     
     print("="*60)
     print("✅ Ultimate AI Model Management Hub operational!")
     
     # Stop monitoring
     model_manager.stop_monitoring()
+    model_manager.router.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
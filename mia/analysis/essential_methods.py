@@ -7,6 +7,7 @@ Essential methods for analysis module production readiness.
 """
 
 from typing import Dict, List, Any, Optional
+from mia.core.service_registry import lazy_services
 class AnalysisEssentialMethods:
     """Essential methods for analysis module"""
     
@@ -154,4 +155,4 @@ class AnalysisEssentialMethods:
             }
 
 # Global instance
-analysis_essential = AnalysisEssentialMethods()
+__getattr__ = lazy_services(__name__, analysis_essential=AnalysisEssentialMethods)
@@ -10,11 +10,14 @@ from .consent_manager import ConsentManager
 from .data_processor import DataProcessor
 from .audit_system import ComplianceAuditSystem
 from .privacy_manager import PrivacyManager
+from .data_map import SubjectDataMap, SubjectRequestExecutor
 
 __all__ = [
     'LGPDComplianceManager',
     'ConsentManager',
     'DataProcessor',
     'ComplianceAuditSystem',
-    'PrivacyManager'
+    'PrivacyManager',
+    'SubjectDataMap',
+    'SubjectRequestExecutor'
 ]
\ No newline at end of file
@@ -1,5 +1,3 @@
-import time
-import platform
 #!/usr/bin/env python3
 """
 MIA Enterprise AGI - Compliance Audit System
@@ -10,6 +8,8 @@ LGPD compliance auditing and monitoring system.
 
 import logging
 import json
+import hashlib
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
@@ -47,6 +47,9 @@ class ComplianceAuditSystem:
         self.compliance_violations = []
         self.audit_history = []
         
+        # Subject index: subject_id -> audit entries and violations naming the subject
+        self.subject_entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        
         self.logger.info("📊 Compliance Audit System initialized")
     
 
@@ -182,7 +185,7 @@ class ComplianceAuditSystem:
                 "compliance_check": self._check_processing_compliance(processing_data)
             }
             
-            self.audit_logs.append(audit_entry)
+            self._append_entry(self.audit_logs, audit_entry)
             
             # Check for violations
             if not audit_entry["compliance_check"]["compliant"]:
@@ -209,7 +212,7 @@ class ComplianceAuditSystem:
                 "compliance_check": self._check_subject_rights_compliance(request_data)
             }
             
-            self.audit_logs.append(audit_entry)
+            self._append_entry(self.audit_logs, audit_entry)
             
             # Check for violations
             if not audit_entry["compliance_check"]["compliant"]:
@@ -323,7 +326,7 @@ class ComplianceAuditSystem:
                 "resolution_deadline": (datetime.now() + timedelta(days=30)).isoformat()
             }
             
-            self.compliance_violations.append(violation)
+            self._append_entry(self.compliance_violations, violation)
             
             self.logger.warning(f"📊 Compliance violation recorded: {violation['violation_id']}")
             
@@ -528,6 +531,45 @@ class ComplianceAuditSystem:
         
         return list(set(recommendations))  # Remove duplicates
     
+    def _append_entry(self, records: List[Dict[str, Any]], entry: Dict[str, Any]):
+        """Append an audit record and tag it with its subject"""
+        records.append(entry)
+        if entry.get("subject_id") is not None:
+            self.subject_entries[entry["subject_id"]].append(entry)
+    
+    def _rebuild_subject_index(self):
+        """Rebuild the subject index after loading records"""
+        self.subject_entries.clear()
+        # Loaded audit history holds its own copies of the violations it reported
+        history_violations = [violation for audit in self.audit_history for violation in audit.get("violations", [])]
+        for entry in self.audit_logs + self.compliance_violations + history_violations:
+            if entry.get("subject_id") is not None:
+                self.subject_entries[entry["subject_id"]].append(entry)
+    
+    def find_subject_records(self, subject_id: str) -> List[str]:
+        """Ids of audit records naming a subject (subject data map)"""
+        return [entry.get("violation_id") or entry.get("audit_id") for entry in self.subject_entries.get(subject_id, [])]
+    
+    def export_subject_data(self, subject_id: str) -> List[Dict[str, Any]]:
+        """Audit records naming a subject"""
+        return json.loads(json.dumps(self.subject_entries.get(subject_id, []), default=str))
+    
+    def erase_subject_data(self, subject_id: str) -> int:
+        """Pseudonymize a subject in the audit trail.
+        
+        Audit records must be retained, so the subject id is replaced with
+        a one-way hash and free-form request data is dropped.
+        """
+        entries = self.subject_entries.pop(subject_id, [])
+        pseudonym = "erased_" + hashlib.sha256(subject_id.encode()).hexdigest()[:16]
+        for entry in entries:
+            entry["subject_id"] = pseudonym
+            if "additional_data" in entry:
+                entry["additional_data"] = None
+        if entries:
+            self._save_audit_records()
+        return len(entries)
+    
     def _load_audit_records(self):
         """Load audit records from storage"""
         try:
@@ -538,6 +580,7 @@ class ComplianceAuditSystem:
                     self.audit_logs = data.get("audit_logs", [])
                     self.compliance_violations = data.get("compliance_violations", [])
                     self.audit_history = data.get("audit_history", [])
+                self._rebuild_subject_index()
                     
         except Exception as e:
             self.logger.warning(f"Failed to load audit records: {e}")
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+MIA Enterprise AGI - Subject Data Map
+=====================================
+
+Registry of every store that holds personal data, and an executor that
+fulfils erasure and access requests across all of them in parallel.
+
+Stores tag records with the data subject when they are written and keep
+that tag indexed, so finding one subject's records never scans a store.
+A store takes part by exposing three methods:
+
+    find_subject_records(key) -> List[str]   keys of the subject's records
+    export_subject_data(key)  -> Any         JSON-serializable copy
+    erase_subject_data(key)   -> int         number of records erased
+
+Stores register themselves here when they are built
+(``register_subject_store``); a map created with ``include_registered``
+covers all of them. A store's name is ``<kind>`` or ``<kind>:<instance>``,
+and requests can be scoped to kinds (e.g. only ``email``).
+
+Each request is journaled per store. Retrying a request with the same id
+resumes it and skips stores whose erasure was already verified.
+"""
+
+import json
+import logging
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, List, Optional
+
+STORE_METHODS = ("find_subject_records", "export_subject_data", "erase_subject_data")
+
+# Journal states of one store within one request
+PENDING = "pending"
+DONE = "done"
+VERIFIED = "verified"
+FAILED = "failed"
+
+
+# Shrambe, ki so se prijavile ob gradnji; šibke reference, da zavržena shramba izpade
+_registered_stores: Dict[str, "weakref.ref"] = {}
+_registered_lock = threading.Lock()
+
+
+def register_subject_store(name: str, store: Any):
+    """Include ``store`` in subject rights requests for as long as it exists"""
+    with _registered_lock:
+        _registered_stores[name] = weakref.ref(store)
+
+
+def unregister_subject_store(name: str, store: Any = None):
+    """Withdraw a store, only if ``name`` still refers to ``store`` when one is given"""
+    with _registered_lock:
+        ref = _registered_stores.get(name)
+        if ref is not None and (store is None or ref() in (store, None)):
+            del _registered_stores[name]
+
+
+def registered_subject_stores() -> Dict[str, Any]:
+    """Live self-registered stores, by name"""
+    with _registered_lock:
+        stores = {name: ref() for name, ref in _registered_stores.items()}
+        for name in [name for name, store in stores.items() if store is None]:
+            del _registered_stores[name]
+    return {name: store for name, store in stores.items() if store is not None}
+
+
+def _missing_methods(store: Any) -> List[str]:
+    return [method for method in STORE_METHODS if not callable(getattr(store, method, None))]
+
+
+class SubjectDataMap:
+    """Named stores holding personal data, each indexed by data subject"""
+
+    def __init__(self, include_registered: bool = False):
+        self.logger = logging.getLogger("MIA.Compliance.DataMap")
+        self.include_registered = include_registered
+        self._stores: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, store: Any):
+        """Add a store; it must implement the subject store methods"""
+        missing = _missing_methods(store)
+        if missing:
+            raise TypeError(f"Store {name!r} does not implement {', '.join(missing)}")
+        with self._lock:
+            self._stores[name] = store
+        self.logger.info(f"🗺️ Registered subject store: {name}")
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._stores.pop(name, None)
+
+    @property
+    def stores(self) -> Dict[str, Any]:
+        with self._lock:
+            stores = dict(self._stores)
+        if self.include_registered:
+            # Shramba, dodana tudi neposredno, se ne sme obdelati dvakrat
+            local = {id(store) for store in stores.values()}
+            for name, store in registered_subject_stores().items():
+                if name not in stores and id(store) not in local and not _missing_methods(store):
+                    stores[name] = store
+        return stores
+
+    def kinds(self) -> List[str]:
+        """Kinds of stores in the map, usable as request categories"""
+        return sorted({store_kind(name) for name in self.stores})
+
+    def locate(self, subject_id: str, identities: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+        """Record keys of a subject in every store that holds any"""
+        located = {}
+        for name, store in self.stores.items():
+            keys = store.find_subject_records(subject_key(name, subject_id, identities))
+            if keys:
+                located[name] = list(keys)
+        return located
+
+
+def store_kind(name: str) -> str:
+    """``email`` for a store named ``email`` or ``email:/path/mailbox.db``"""
+    return name.split(":", 1)[0]
+
+
+def subject_key(store: str, subject_id: str, identities: Optional[Dict[str, str]] = None) -> str:
+    """The subject's identifier in one store (e.g. an email address for the mailbox), by name or kind"""
+    identities = identities or {}
+    return identities.get(store, identities.get(store_kind(store), subject_id))
+
+
+class RequestJournal:
+    """Per-store progress of subject requests, kept in SQLite"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS request_stores (
+                    request_id TEXT NOT NULL,
+                    store TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    subject_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    records INTEGER NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated_at REAL,
+                    PRIMARY KEY (request_id, store)
+                ) WITHOUT ROWID
+            """)
+
+    def get(self, request_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            self._db.row_factory = sqlite3.Row
+            rows = self._db.execute("SELECT * FROM request_stores WHERE request_id = ?", (request_id,)).fetchall()
+        return {row["store"]: dict(row) for row in rows}
+
+    def update(self, request_id: str, store: str, action: str, subject_id: str, status: str,
+               records: int = 0, attempts: int = 0, error: Optional[str] = None):
+        with self._lock, self._db:
+            self._db.execute("""
+                INSERT INTO request_stores (request_id, store, action, subject_id, status, records, attempts,
+                                            error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(request_id, store) DO UPDATE SET
+                    status = excluded.status, records = request_stores.records + excluded.records,
+                    attempts = request_stores.attempts + excluded.attempts, error = excluded.error,
+                    updated_at = excluded.updated_at
+            """, (request_id, store, action, subject_id, status, records, attempts, error, time.time()))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class SubjectRequestExecutor:
+    """Fans erasure and export of one subject out across all stores.
+
+    Every store runs on its own worker with bounded retries. An erasure
+    is only complete once the store's index no longer finds the subject;
+    otherwise the store is retried and finally reported as failed.
+    """
+
+    def __init__(self, data_map: SubjectDataMap, journal_path: str, max_workers: int = 8,
+                 retries: int = 2, retry_delay: float = 0.05):
+        self.data_map = data_map
+        self.journal = RequestJournal(journal_path)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.logger = logging.getLogger("MIA.Compliance.DataMap")
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="subject-request")
+
+    def erase(self, subject_id: str, request_id: Optional[str] = None,
+              identities: Optional[Dict[str, str]] = None,
+              progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+              kinds: Optional[Collection[str]] = None) -> Dict[str, Any]:
+        """Erase a subject from every store (or the stores of ``kinds``) and verify nothing is left"""
+        return self._run("erase", subject_id, request_id, identities, progress, kinds)
+
+    def export(self, subject_id: str, request_id: Optional[str] = None,
+               identities: Optional[Dict[str, str]] = None,
+               progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+               kinds: Optional[Collection[str]] = None) -> Dict[str, Any]:
+        """Collect a subject's data from every store (or the stores of ``kinds``)"""
+        return self._run("export", subject_id, request_id, identities, progress, kinds)
+
+    def verify(self, subject_id: str, identities: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+        """Records of a subject that are still stored, by store"""
+        return self.data_map.locate(subject_id, identities)
+
+    def _run(self, action: str, subject_id: str, request_id: Optional[str],
+             identities: Optional[Dict[str, str]], progress: Optional[Callable],
+             kinds: Optional[Collection[str]] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        request_id = request_id or f"{action}_{subject_id}_{int(time.time() * 1000)}"
+        stores = self.data_map.stores
+        if kinds:
+            stores = {name: store for name, store in stores.items() if store_kind(name) in kinds}
+        journal = self.journal.get(request_id)
+        results: Dict[str, Dict[str, Any]] = {}
+        lock = threading.Lock()
+
+        def report(name: str, result: Dict[str, Any]):
+            with lock:
+                results[name] = result
+                event = {"request_id": request_id, "action": action, "store": name, "status": result["status"],
+                         "completed": len(results), "total": len(stores)}
+            if progress:
+                try:
+                    progress(event)
+                except Exception as e:
+                    self.logger.warning(f"Progress callback error: {e}")
+
+        futures = []
+        for name, store in stores.items():
+            # Ponovni poskus preskoči shrambe, kjer je izbris že preverjen
+            if action == "erase" and journal.get(name, {}).get("status") == VERIFIED:
+                report(name, {"status": VERIFIED, "records": 0, "attempts": 0, "skipped": True})
+                continue
+            self.journal.update(request_id, name, action, subject_id, PENDING)
+            key = subject_key(name, subject_id, identities)
+            futures.append(self._pool.submit(self._run_store, request_id, action, subject_id, name, store, key, report))
+        for future in futures:
+            future.result()
+
+        failed = sorted(name for name, result in results.items() if result["status"] == FAILED)
+        response = {
+            "success": not failed,
+            "request_id": request_id,
+            "subject_id": subject_id,
+            "action": action,
+            "stores": {name: {k: v for k, v in result.items() if k != "data"} for name, result in sorted(results.items())},
+            "kinds": sorted({store_kind(name) for name in stores}),
+            "failed_stores": failed,
+            "records": sum(result["records"] for result in results.values()),
+            "duration_seconds": time.perf_counter() - started,
+            "completed_at": datetime.now().isoformat()
+        }
+        if action == "export":
+            response["data"] = {name: result["data"] for name, result in sorted(results.items()) if "data" in result}
+        self.logger.info(f"🗺️ Subject {action} {request_id}: {response['records']} records, "
+                         f"{len(failed)} failed stores")
+        return response
+
+    def _run_store(self, request_id: str, action: str, subject_id: str, name: str, store: Any, key: str,
+                   report: Callable[[str, Dict[str, Any]], None]):
+        result = {"status": FAILED, "records": 0, "attempts": 0}
+        for attempt in range(self.retries + 1):
+            result["attempts"] = attempt + 1
+            try:
+                if action == "export":
+                    result["data"] = store.export_subject_data(key)
+                    result["records"] = len(store.find_subject_records(key))
+                    result["status"] = DONE
+                    break
+                result["records"] += store.erase_subject_data(key) or 0
+                remaining = store.find_subject_records(key)
+                if not remaining:
+                    result["status"] = VERIFIED
+                    break
+                result["error"] = f"{len(remaining)} records remain after erasure"
+            except Exception as e:
+                result["error"] = str(e)
+                self.logger.warning(f"Subject {action} failed in {name} (attempt {attempt + 1}): {e}")
+            if attempt < self.retries:
+                time.sleep(self.retry_delay * 2 ** attempt)
+        if result["status"] != FAILED:
+            result.pop("error", None)
+        self.journal.update(request_id, name, action, subject_id, result["status"], result["records"],
+                            result["attempts"], result.get("error"))
+        report(name, result)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        self.journal.close()
+
+
+class SQLiteSubjectTable:
+    """Subject store over one table in one or more SQLite databases.
+
+    ``connections`` maps a tier name to an open connection; the column
+    holding the subject must be indexed for lookups to stay logarithmic.
+    """
+
+    def __init__(self, connections: Dict[str, sqlite3.Connection], table: str = "memories",
+                 column: str = "user_id", key: str = "id", indexed: bool = True):
+        self.connections = connections
+        self.table = table
+        self.column = column
+        self.key = key
+        # NOT INDEXED forces a full scan (used as the baseline in benchmarks)
+        self._source = table if indexed else f"{table} NOT INDEXED"
+
+    def find_subject_records(self, subject_id: str) -> List[str]:
+        keys = []
+        for tier, conn in self.connections.items():
+            rows = conn.execute(f"SELECT {self.key} FROM {self._source} WHERE {self.column} = ?", (subject_id,))
+            keys.extend(f"{tier}:{row[0]}" for row in rows)
+        return keys
+
+    def export_subject_data(self, subject_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        exported = {}
+        for tier, conn in self.connections.items():
+            cursor = conn.execute(f"SELECT * FROM {self._source} WHERE {self.column} = ?", (subject_id,))
+            columns = [description[0] for description in cursor.description]
+            # Binarni stolpci (vektorji) niso prenosljivi podatki
+            rows = [{column: value for column, value in zip(columns, row) if not isinstance(value, bytes)}
+                    for row in cursor]
+            if rows:
+                exported[tier] = rows
+        return exported
+
+    def erase_subject_data(self, subject_id: str) -> int:
+        erased = 0
+        for conn in self.connections.values():
+            cursor = conn.execute(f"DELETE FROM {self.table} WHERE {self.column} = ?", (subject_id,))
+            conn.commit()
+            erased += max(cursor.rowcount, 0)
+        return erased
+
+
+def _synthetic_tiers(directory: Path, records: int, subjects: int, target: str, target_records: int,
+                     batch: int = 200_000) -> Dict[str, sqlite3.Connection]:
+    """Memory tiers with the MemorySystem schema filled with synthetic records"""
+    tiers = ["short_term", "medium_term", "long_term", "meta"]
+    connections = {}
+    rng = random.Random(7)
+    per_tier = records // len(tiers)
+    target_positions = set(rng.sample(range(records), target_records))
+    for index, tier in enumerate(tiers):
+        conn = sqlite3.connect(str(directory / f"{tier}.db"), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("""
+            CREATE TABLE memories (
+                id TEXT PRIMARY KEY, content TEXT NOT NULL, memory_type TEXT NOT NULL, timestamp REAL NOT NULL,
+                emotional_tone TEXT NOT NULL, importance_score REAL NOT NULL, context_tags TEXT, user_id TEXT,
+                session_id TEXT, vector_embedding BLOB, access_count INTEGER DEFAULT 0, last_accessed REAL,
+                related_memories TEXT, embedding_version TEXT
+            )
+        """)
+        start = index * per_tier
+        end = records if index == len(tiers) - 1 else start + per_tier
+        for first in range(start, end, batch):
+            rows = [
+                (f"m{n}", f"memory {n}", tier, float(n), "neutral", 0.5, "[]",
+                 target if n in target_positions else f"user{rng.randrange(subjects)}", None, None, 0, None, "[]", None)
+                for n in range(first, min(first + batch, end))
+            ]
+            conn.executemany("INSERT INTO memories VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.commit()
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user_id ON memories(user_id)")
+        conn.commit()
+        connections[tier] = conn
+    return connections
+
+
+def benchmark_subject_requests(records: int = 10_000_000, subjects: int = 100_000, target_records: int = 100,
+                               side_records: int = 20_000, workdir: Optional[Path] = None) -> Dict[str, Any]:
+    """Fulfilment time of one subject's export and erasure in a synthetic corpus.
+
+    ``records`` rows go into the four SQLite memory tiers; the JSON-backed
+    compliance stores and the mailbox get ``side_records`` each, as they
+    hold far fewer records. The indexed lookup is compared with the full
+    scan every store needed before subjects were indexed.
+    """
+    from mia.compliance.audit_system import ComplianceAuditSystem
+    from mia.compliance.data_processor import DataProcessor
+    from mia.core.persistent_knowledge_store import PersistentKnowledgeStore
+    from mia.modules.api_email.imap_sync import MailboxStore
+
+    temporary = workdir is None
+    root = Path(workdir or tempfile.mkdtemp(prefix="mia_data_map_"))
+    root.mkdir(parents=True, exist_ok=True)
+    target = "subject-target"
+    address = "target@example.com"
+    result: Dict[str, Any] = {"records": records, "side_records": side_records, "target_records": target_records}
+    try:
+        started = time.perf_counter()
+        tiers = _synthetic_tiers(root, records, subjects, target, target_records)
+
+        processor = DataProcessor(str(root))
+        for n in range(side_records):
+            subject = target if n % 1000 == 0 else f"user{n % subjects}"
+            processor._add_processing_record({"processing_id": f"proc_{n}", "subject_id": subject,
+                                              "purpose": "analytics", "legal_basis": "consent",
+                                              "data_categories": ["usage"], "retention_until": "2030-01-01"})
+        audit = ComplianceAuditSystem(str(root))
+        for n in range(side_records):
+            subject = target if n % 1000 == 0 else f"user{n % subjects}"
+            audit._append_entry(audit.audit_logs, {"audit_id": f"audit_{n}", "event_type": "data_processing",
+                                                   "subject_id": subject})
+        knowledge = PersistentKnowledgeStore(str(root / "knowledge"))
+        for n in range(side_records):
+            subject = target if n % 1000 == 0 else f"user{n % subjects}"
+            knowledge.conversation_history.append({"user_id": subject, "user_input": f"q{n}", "mia_response": "a",
+                                                   "timestamp": float(n), "metadata": {}})
+        knowledge.conversation_history = knowledge.conversation_history[-1000:]
+        mailbox = MailboxStore(str(root / "mailbox.db"))
+        mailbox.add_messages("mia@example.com", "INBOX", [
+            (n, {"sender": f"Target <{address}>" if n % 1000 == 0 else f"friend{n % subjects}@example.net",
+                 "subject": f"message {n}", "body": "hello"})
+            for n in range(side_records)
+        ])
+        result["corpus_build_seconds"] = time.perf_counter() - started
+        for logger in (processor.logger, audit.logger, logging.getLogger("mia.core.persistent_knowledge_store")):
+            logger.setLevel(logging.WARNING)
+
+        # Izhodišče: poizvedba brez indeksa, kot pred označevanjem subjektov
+        scan = SQLiteSubjectTable(tiers, indexed=False)
+        started = time.perf_counter()
+        scanned = scan.find_subject_records(target)
+        result["full_scan_locate_seconds"] = time.perf_counter() - started
+
+        data_map = SubjectDataMap()
+        data_map.register("memory", SQLiteSubjectTable(tiers))
+        data_map.register("data_processor", processor)
+        data_map.register("audit", audit)
+        data_map.register("knowledge", knowledge)
+        data_map.register("email", mailbox)
+        identities = {"email": address}
+        executor = SubjectRequestExecutor(data_map, str(root / "journal.db"))
+        try:
+            started = time.perf_counter()
+            located = data_map.locate(target, identities)
+            result["indexed_locate_seconds"] = time.perf_counter() - started
+            result["located"] = {name: len(keys) for name, keys in located.items()}
+            result["scan_matches_index"] = sorted(scanned) == sorted(located.get("memory", []))
+
+            exported = executor.export(target, "bench-export", identities)
+            erased = executor.erase(target, "bench-erase", identities)
+            retried = executor.erase(target, "bench-erase", identities)
+            result.update({
+                "export_seconds": exported["duration_seconds"],
+                "exported_records": exported["records"],
+                "erase_seconds": erased["duration_seconds"],
+                "erased_records": erased["records"],
+                "erase_success": erased["success"],
+                "retry_skipped_stores": sum(bool(store.get("skipped")) for store in retried["stores"].values()),
+                "remaining_after_erase": executor.verify(target, identities)
+            })
+        finally:
+            executor.close()
+            mailbox.close()
+            for conn in tiers.values():
+                conn.close()
+    finally:
+        if temporary:
+            shutil.rmtree(root, ignore_errors=True)
+    return result
+
+
+if __name__ == "__main__":
+    import sys
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    print(json.dumps(benchmark_subject_requests(records=count), indent=2))
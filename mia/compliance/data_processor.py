@@ -1,5 +1,3 @@
-import time
-import platform
 #!/usr/bin/env python3
 """
 MIA Enterprise AGI - Data Processor
@@ -11,8 +9,9 @@ LGPD compliant data processing and handling system.
 import logging
 import json
 import hashlib
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime, timedelta
 from enum import Enum
 
@@ -48,6 +47,10 @@ class DataProcessor:
         self.processing_activities = {}
         self.data_inventory = {}
         
+        # Subject indexes: subject_id -> record ids, kept current on every write
+        self.subject_activities: Dict[str, Set[str]] = defaultdict(set)
+        self.subject_inventory: Dict[str, Set[str]] = defaultdict(set)
+        
         self.logger.info("🔄 Data Processor initialized")
     
     def _setup_logging(self) -> logging.Logger:
@@ -126,7 +129,7 @@ class DataProcessor:
                 "data_minimized": minimized_data != request_data
             }
             
-            self.processing_activities[processing_id] = processing_record
+            self._add_processing_record(processing_record)
             self._save_processing_records()
             
             self.logger.info(f"🔄 Data processed: {processing_id}")
@@ -300,27 +303,58 @@ class DataProcessor:
         except Exception:
             return "hash_error"
     
+    def _add_processing_record(self, processing_record: Dict[str, Any]):
+        """Store a processing record and tag it with its subject"""
+        processing_id = processing_record["processing_id"]
+        self.processing_activities[processing_id] = processing_record
+        if processing_record.get("subject_id") is not None:
+            self.subject_activities[processing_record["subject_id"]].add(processing_id)
+    
+    def add_inventory_item(self, item_id: str, item: Dict[str, Any]):
+        """Store a data inventory item and tag it with its subject"""
+        self.data_inventory[item_id] = item
+        if item.get("subject_id") is not None:
+            self.subject_inventory[item["subject_id"]].add(item_id)
+    
+    def _rebuild_subject_index(self):
+        """Rebuild subject indexes after loading records"""
+        self.subject_activities.clear()
+        self.subject_inventory.clear()
+        for processing_id, activity in self.processing_activities.items():
+            if activity.get("subject_id") is not None:
+                self.subject_activities[activity["subject_id"]].add(processing_id)
+        for item_id, item in self.data_inventory.items():
+            if item.get("subject_id") is not None:
+                self.subject_inventory[item["subject_id"]].add(item_id)
+    
     def delete_data(self, subject_id: str, data_categories: Optional[List[str]] = None) -> Dict[str, Any]:
         """Delete data for a subject (right to erasure)"""
         try:
             deleted_activities = []
             
-            for processing_id, activity in list(self.processing_activities.items()):
-                if activity["subject_id"] == subject_id:
-                    # Check if specific data categories requested
-                    if data_categories is None or any(cat in activity["data_categories"] for cat in data_categories):
-                        deleted_activities.append(processing_id)
-                        del self.processing_activities[processing_id]
+            for processing_id in list(self.subject_activities.get(subject_id, ())):
+                activity = self.processing_activities[processing_id]
+                # Check if specific data categories requested
+                if data_categories is None or any(cat in activity["data_categories"] for cat in data_categories):
+                    deleted_activities.append(processing_id)
+                    del self.processing_activities[processing_id]
+                    self.subject_activities[subject_id].discard(processing_id)
             
             # Remove from data inventory
             deleted_inventory = []
-            for item_id, item in list(self.data_inventory.items()):
-                if item.get("subject_id") == subject_id:
-                    if data_categories is None or any(cat in item.get("categories", []) for cat in data_categories):
-                        deleted_inventory.append(item_id)
-                        del self.data_inventory[item_id]
+            for item_id in list(self.subject_inventory.get(subject_id, ())):
+                item = self.data_inventory[item_id]
+                if data_categories is None or any(cat in item.get("categories", []) for cat in data_categories):
+                    deleted_inventory.append(item_id)
+                    del self.data_inventory[item_id]
+                    self.subject_inventory[subject_id].discard(item_id)
             
-            self._save_processing_records()
+            for index in (self.subject_activities, self.subject_inventory):
+                if not index.get(subject_id, True):
+                    del index[subject_id]
+            
+            if deleted_activities or deleted_inventory:
+                self._save_processing_records()
             
             self.logger.info(f"🔄 Data deleted for subject: {subject_id}")
             
@@ -344,20 +378,12 @@ class DataProcessor:
             subject_data = {
                 "subject_id": subject_id,
                 "export_timestamp": datetime.now().isoformat(),
-                "processing_activities": [],
-                "data_inventory": []
+                "processing_activities": [self.processing_activities[processing_id]
+                                          for processing_id in sorted(self.subject_activities.get(subject_id, ()))],
+                "data_inventory": [self.data_inventory[item_id]
+                                   for item_id in sorted(self.subject_inventory.get(subject_id, ()))]
             }
             
-            # Collect processing activities
-            for processing_id, activity in self.processing_activities.items():
-                if activity["subject_id"] == subject_id:
-                    subject_data["processing_activities"].append(activity)
-            
-            # Collect data inventory
-            for item_id, item in self.data_inventory.items():
-                if item.get("subject_id") == subject_id:
-                    subject_data["data_inventory"].append(item)
-            
             self.logger.info(f"🔄 Data exported for subject: {subject_id}")
             
             return {
@@ -374,6 +400,25 @@ class DataProcessor:
                 "error": str(e)
             }
     
+    def find_subject_records(self, subject_id: str) -> List[str]:
+        """Keys of all records tagged with a subject (subject data map)"""
+        return ([f"activity:{processing_id}" for processing_id in sorted(self.subject_activities.get(subject_id, ()))] +
+                [f"inventory:{item_id}" for item_id in sorted(self.subject_inventory.get(subject_id, ()))])
+    
+    def export_subject_data(self, subject_id: str) -> Dict[str, Any]:
+        """Subject's records for an access or portability request"""
+        result = self.export_data(subject_id)
+        if not result["success"]:
+            raise RuntimeError(result["error"])
+        return result["export_data"]
+    
+    def erase_subject_data(self, subject_id: str) -> int:
+        """Erase every record of a subject; returns the number erased"""
+        result = self.delete_data(subject_id)
+        if not result["success"]:
+            raise RuntimeError(result["error"])
+        return result["deleted_processing_activities"] + result["deleted_inventory_items"]
+    
     def _load_processing_records(self):
         """Load processing records from storage"""
         try:
@@ -383,6 +428,7 @@ class DataProcessor:
                     data = json.load(f)
                     self.processing_activities = data.get("processing_activities", {})
                     self.data_inventory = data.get("data_inventory", {})
+                self._rebuild_subject_index()
                     
         except Exception as e:
             self.logger.warning(f"Failed to load processing records: {e}")
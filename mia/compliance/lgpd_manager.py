@@ -1,5 +1,3 @@
-import time
-import platform
 #!/usr/bin/env python3
 """
 MIA Enterprise AGI - LGPD Manager
@@ -20,6 +18,7 @@ from .consent_manager import ConsentManager
 from .data_processor import DataProcessor
 from .audit_system import ComplianceAuditSystem
 from .privacy_manager import PrivacyManager
+from .data_map import SubjectDataMap
 
 
 class LGPDLegalBasis(Enum):
@@ -54,6 +53,13 @@ class LGPDComplianceManager:
         self.audit_system = ComplianceAuditSystem(project_root)
         self.privacy_manager = PrivacyManager(project_root)
         
+        # Every store holding personal data: memory, knowledge, AGI core, mailbox and session
+        # history register themselves when built; others join via register_data_store
+        self.data_map = SubjectDataMap(include_registered=True)
+        self.data_map.register("data_processor", self.data_processor)
+        self.data_map.register("audit", self.audit_system)
+        self.privacy_manager.attach_data_map(self.data_map)
+        
         # LGPD configuration
         self.lgpd_config = {
             "controller_info": {
@@ -318,6 +324,10 @@ class LGPDComplianceManager:
             "errors": errors
         }
     
+    def register_data_store(self, name: str, store: Any):
+        """Include a store (memory, knowledge, mailbox, ...) in subject rights requests"""
+        self.data_map.register(name, store)
+    
     def handle_subject_rights_request(self, request_type: str, subject_id: str, 
                                     additional_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Handle LGPD subject rights requests"""
@@ -329,12 +339,16 @@ class LGPDComplianceManager:
                 request_type, subject_id, additional_data
             )
             
-            # Log audit trail
+            # Log audit trail (without the exported personal data itself)
+            logged_result = dict(result)
+            if "request_result" in result:
+                logged_result["request_result"] = {key: value for key, value in result["request_result"].items()
+                                                   if key not in ("access_data", "portable_data")}
             self.audit_system.log_subject_rights_request({
                 "request_type": request_type,
                 "subject_id": subject_id,
                 "additional_data": additional_data,
-                "result": result,
+                "result": logged_result,
                 "timestamp": datetime.now().isoformat()
             })
             
@@ -12,6 +12,7 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
+from mia.core.service_registry import lazy_services
 
 class ManagementHandler:
     """Handler for management methods"""
@@ -406,4 +407,4 @@ class ManagementHandler:
             }
 
 # Create global instance
-management_handler = ManagementHandler()
+__getattr__ = lazy_services(__name__, management_handler=ManagementHandler)
@@ -1,5 +1,3 @@
-import time
-import base64
 #!/usr/bin/env python3
 """
 MIA Enterprise AGI - Privacy Manager
@@ -15,6 +13,8 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from enum import Enum
 
+from .data_map import SubjectDataMap, SubjectRequestExecutor
+
 
 class SubjectRightType(Enum):
     """LGPD subject rights types"""
@@ -55,6 +55,10 @@ class PrivacyManager:
         self.privacy_notices = {}
         self.data_subjects = {}
         
+        # Subject data map; without one, requests are answered from this manager's records only
+        self.data_map: Optional[SubjectDataMap] = None
+        self.request_executor: Optional[SubjectRequestExecutor] = None
+        
         self.logger.info("🔒 Privacy Manager initialized")
     
 
@@ -129,6 +133,33 @@ class PrivacyManager:
         """Return deterministic time for testing"""
         return 1640995200.0  # Fixed timestamp: 2022-01-01 00:00:00 UTC
     
+    def attach_data_map(self, data_map: SubjectDataMap):
+        """Fulfil access, portability and erasure requests across the stores of a data map"""
+        if self.request_executor:
+            self.request_executor.close()
+            self.request_executor = None
+        self.data_map = data_map
+    
+    def _run_subject_request(self, action: str, request_record: Dict[str, Any],
+                             kinds: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run an export or erasure through the data map, tracking progress on the request"""
+        if self.request_executor is None:
+            journal = self.project_root / "mia_data" / "privacy" / "subject_requests.db"
+            self.request_executor = SubjectRequestExecutor(self.data_map, str(journal))
+        request_record["status"] = RequestStatus.IN_PROGRESS.value
+        
+        def progress(event: Dict[str, Any]):
+            request_record["progress"] = {"completed": event["completed"], "total": event["total"]}
+            request_record["processing_notes"].append({
+                "timestamp": datetime.now().isoformat(),
+                "note": f"{event['store']}: {event['status']}"
+            })
+        
+        method = self.request_executor.erase if action == "erase" else self.request_executor.export
+        return method(request_record["subject_id"], request_record["request_id"],
+                      identities=request_record["additional_data"].get("identities"), progress=progress,
+                      kinds=kinds)
+    
     def initialize_privacy_system(self) -> Dict[str, Any]:
         """Initialize privacy management system"""
         try:
@@ -172,7 +203,9 @@ class PrivacyManager:
                     "error": f"Invalid request type: {request_type}"
                 }
             
-            request_id = f"request_{subject_id}_{request_type}_{int(self._get_deterministic_time())}"
+            # A failed request is retried by passing its id; stores already handled are skipped
+            request_id = (additional_data or {}).get("request_id") or \
+                f"request_{subject_id}_{request_type}_{int(self._get_deterministic_time())}_{len(self.subject_rights_requests)}"
             
             # Create request record
             request_record = {
@@ -241,6 +274,30 @@ class PrivacyManager:
         try:
             subject_id = request_record["subject_id"]
             
+            if self.data_map:
+                export = self._run_subject_request("export", request_record)
+                if not export["success"]:
+                    return {"success": False, "error": "Data export incomplete", "failed_stores": export["failed_stores"]}
+                subject_data = {
+                    "subject_id": subject_id,
+                    "data_collection_timestamp": datetime.now().isoformat(),
+                    "personal_data": export["data"],
+                    "processing_activities": export["data"].get("data_processor", {}).get("processing_activities", []),
+                    "consents": self._get_subject_consents(subject_id),
+                    "data_sources": [store for store, details in export["stores"].items() if details["records"]]
+                }
+                request_record["processing_notes"].append({
+                    "timestamp": datetime.now().isoformat(),
+                    "note": f"Collected {export['records']} records for subject {subject_id}",
+                    "data_categories": subject_data["data_sources"]
+                })
+                return {
+                    "success": True,
+                    "access_data": subject_data,
+                    "data_format": "json",
+                    "delivery_method": "secure_download"
+                }
+            
             # Collect all data for the subject
             subject_data = {
                 "subject_id": subject_id,
@@ -330,6 +387,46 @@ class PrivacyManager:
                     "reasons": erasure_check["reasons"]
                 }
             
+            if self.data_map:
+                # Kategorije izbirajo vrste shramb; neznane kategorije ni mogoče izbrisati ločeno
+                available = self.data_map.kinds()
+                unknown = sorted(set(data_categories) - set(available))
+                if unknown:
+                    return {
+                        "success": False,
+                        "error": f"Unknown data categories: {', '.join(unknown)}",
+                        "available_categories": available
+                    }
+                erasure = self._run_subject_request("erase", request_record, data_categories or None)
+                erased_data = {
+                    "subject_id": subject_id,
+                    "erasure_timestamp": erasure["completed_at"],
+                    "erased_categories": sorted(set(data_categories)) or ["all"],
+                    "erasure_method": "subject_data_map",
+                    "erased_records": erasure["records"],
+                    "stores": erasure["stores"],
+                    "verified": erasure["success"],
+                    "verification_hash": self._generate_erasure_hash(subject_id, data_categories)
+                }
+                request_record["processing_notes"].append({
+                    "timestamp": datetime.now().isoformat(),
+                    "note": f"Erased {erasure['records']} records for subject {subject_id}",
+                    "erased_categories": erased_data["erased_categories"]
+                })
+                if not erasure["success"]:
+                    return {
+                        "success": False,
+                        "error": "Erasure incomplete; retry with the same request_id",
+                        "request_id": request_record["request_id"],
+                        "failed_stores": erasure["failed_stores"],
+                        "erasure_confirmation": erased_data
+                    }
+                return {
+                    "success": True,
+                    "erasure_confirmation": erased_data,
+                    "erasure_certificate": f"CERT_{erased_data['verification_hash']}"
+                }
+            
             # Perform erasure (this would integrate with data storage systems)
             erased_data = {
                 "subject_id": subject_id,
@@ -364,12 +461,20 @@ class PrivacyManager:
         try:
             subject_id = request_record["subject_id"]
             
+            if self.data_map:
+                export = self._run_subject_request("export", request_record)
+                if not export["success"]:
+                    return {"success": False, "error": "Data export incomplete", "failed_stores": export["failed_stores"]}
+                personal_data = export["data"]
+            else:
+                personal_data = self._get_portable_data(subject_id)
+            
             # Collect portable data (only data provided by the subject or generated through their use)
             portable_data = {
                 "subject_id": subject_id,
                 "export_timestamp": datetime.now().isoformat(),
                 "data_format": "json",
-                "personal_data": self._get_portable_data(subject_id),
+                "personal_data": personal_data,
                 "metadata": {
                     "export_version": "1.0",
                     "data_controller": "MIA Enterprise AGI",
@@ -12,6 +12,7 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
+from mia.core.service_registry import lazy_services
 
 class SecurityHandler:
     """Handler for security methods"""
@@ -210,4 +211,4 @@ class SecurityHandler:
             }
 
 # Create global instance
-security_handler = SecurityHandler()
+__getattr__ = lazy_services(__name__, security_handler=SecurityHandler)
@@ -7,16 +7,19 @@ Dynamically adapts LLM models based on system capabilities
 import asyncio
 import json
 import logging
-import psutil
-import subprocess
 import time
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
-import requests
 import os
 
+from mia.core.hardware_profile import get_hardware_profile
+from mia.core.model_residency import GIB, ModelResidencyManager, current_vram
+from mia.core.model_router import SLORouter
+from mia.core.telemetry import get_telemetry
+from mia.core.service_registry import get_service, lazy_services
+
 class ModelSize(Enum):
 
     def _get_deterministic_time(self) -> float:
@@ -81,9 +84,19 @@ class AdaptiveLLMManager:
         # Currently loaded models
         self.loaded_models: Dict[str, Any] = {}
         
+        # Models selected for this system; loaded lazily within the RAM/VRAM budget
+        self.selected_models: Dict[str, ModelSpec] = {}
+        self.residency = ModelResidencyManager(
+            self._instantiate_model, ram_budget=0,
+            unloader=self._release_model_instance, vram_probe=current_vram
+        )
+        
         # Performance monitoring
         self.performance_history: List[Dict[str, Any]] = []
         
+        # Per (model, task) latency sketches and SLO-aware model selection
+        self.router = SLORouter(latency_slo=2.0, quality_floor=0.5)
+        
         # Initialize system (will be done when event loop is available)
         self._initialized = False
     
@@ -92,6 +105,10 @@ class AdaptiveLLMManager:
         try:
             # Analyze system capabilities
             self.system_caps = await self._analyze_system_capabilities()
+            self.residency.set_budgets(
+                int(self.system_caps.ram_available * 0.8 * GIB),
+                int(self.system_caps.vram_available * 0.9 * GIB)
+            )
             
             # Load model catalog
             await self._load_model_catalog()
@@ -99,7 +116,7 @@ class AdaptiveLLMManager:
             # Select optimal models
             optimal_models = await self._select_optimal_models()
             
-            # Download and load models
+            # Download models; they are loaded on first use or by prefetch
             await self._download_and_load_models(optimal_models)
             
             self.logger.info("Adaptive LLM system initialized successfully")
@@ -110,42 +127,24 @@ class AdaptiveLLMManager:
     async def _analyze_system_capabilities(self) -> SystemCapabilities:
         """Analyze current system capabilities"""
         
-        # CPU information
-        cpu_cores = psutil.cpu_count(logical=True)
-        cpu_freq = psutil.cpu_freq().max if psutil.cpu_freq() else 2000.0
+        # Static facts from the cached hardware profile, usage from telemetry
+        profile = get_hardware_profile()
+        snapshot = get_telemetry().latest()
         
-        # Memory information
-        memory = psutil.virtual_memory()
-        ram_total = memory.total / (1024**3)
-        ram_available = memory.available / (1024**3)
+        cpu_cores = profile.cpu_logical_cores
+        cpu_freq = profile.cpu_frequency_mhz
+        ram_total = profile.ram_total_gb
+        ram_available = snapshot.memory_available_gb
         
-        # GPU information
-        gpu_available = False
-        vram_total = 0.0
-        vram_available = 0.0
+        gpu_available = profile.gpu_available
+        vram_total = profile.gpu_memory_gb
+        allocated = current_vram()
+        vram_available = max(0.0, vram_total - (allocated or 0) / GIB)
         
-        try:
-            # Try NVIDIA
-            result = subprocess.run(['nvidia-smi', '--query-gpu=memory.total,memory.free', 
-                                   '--format=csv,noheader,nounits'], 
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                if lines and lines[0]:
-                    total, free = lines[0].split(', ')
-                    vram_total = float(total) / 1024
-                    vram_available = float(free) / 1024
-                    gpu_available = True
-        except Exception as e:
-            self.logger.warning(f"GPU detection failed: {e}")
-            vram_total = 0.0
-            vram_available = 0.0
-            gpu_available = False
-        disk = psutil.disk_usage('/')
-        disk_free = disk.free / (1024**3)
+        disk_free = snapshot.disk_free_gb
         
-        # Network speed (simple test)
-        network_speed = await self._test_network_speed()
+        # Link speed in KB/s instead of a download test on every start
+        network_speed = profile.network_speed_mbps * 125
         
         # Determine performance tier
         if gpu_available and vram_total >= 8 and ram_total >= 16:
@@ -175,22 +174,6 @@ class AdaptiveLLMManager:
         
         return caps
     
-    async def _test_network_speed(self) -> float:
-        """Test network download speed"""
-        try:
-            start_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
-            response = requests.get('https://httpbin.org/bytes/1024', timeout=5)
-            end_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
-            
-            if response.status_code == 200:
-                speed = len(response.content) / (end_time - start_time) / 1024  # KB/s
-                return speed
-        except Exception as e:
-            self.logger.debug(f"Network speed test failed: {e}")
-            return 50.0  # Default fallback speed in KB/s
-        
-        return 100.0  # Default conservative estimate
-    
     async def _load_model_catalog(self):
         """Load available models catalog"""
         
@@ -340,12 +323,17 @@ class AdaptiveLLMManager:
         return selected_models
     
     async def _download_and_load_models(self, models: List[ModelSpec]):
-        """Download and load selected models"""
+        """Download selected models and register them for lazy loading"""
         
         for model in models:
             try:
                 await self._download_model(model)
-                await self._load_model(model)
+                self.selected_models[model.name] = model
+                self.residency.register(
+                    model.name, model.capabilities,
+                    ram_estimate=int(model.ram_requirement * GIB),
+                    vram_estimate=int(model.vram_requirement * GIB)
+                )
             except Exception as e:
                 self.logger.error(f"Failed to load model {model.name}: {e}")
     
@@ -392,47 +380,36 @@ class AdaptiveLLMManager:
         
         self.logger.info(f"Model {model.name} downloaded successfully")
     
-    async def _load_model(self, model: ModelSpec):
-        """Load model into memory"""
+    async def _instantiate_model(self, model_name: str) -> Dict[str, Any]:
+        """Load model into memory; called by the residency manager, which measures its footprint"""
         
-        try:
-            model_path = self.data_path / model.local_path
-            
-            # Load model configuration
-            with open(model_path / "config.json", "r") as f:
-                config = json.load(f)
-            
-            # Create model instance for local inference
-            model_instance = {
-                "name": model.name,
-                "config": config,
-                "loaded_at": self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200,
-                "type": model.type.value,
-                "capabilities": model.capabilities,
-                "performance_score": model.performance_score,
-                "status": "loaded",
-                "memory_usage": self._estimate_model_memory(model)
-            }
-            
-            self.loaded_models[model.name] = model_instance
-            
-            self.logger.info(f"Model {model.name} loaded successfully")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to load model {model.name}: {e}")
-    
-    def _estimate_model_memory(self, model: 'ModelSpec') -> float:
-        """Estimate memory usage for model in GB"""
-        size_map = {
-            "7B": 14.0,   # ~14GB for 7B model
-            "13B": 26.0,  # ~26GB for 13B model
-            "30B": 60.0,  # ~60GB for 30B model
-            "65B": 130.0, # ~130GB for 65B model
-            "small": 2.0,
-            "medium": 6.0,
-            "large": 12.0
+        model = self.selected_models.get(model_name) or self.model_catalog[model_name]
+        model_path = self.data_path / model.local_path
+        
+        # Load model configuration
+        with open(model_path / "config.json", "r") as f:
+            config = json.load(f)
+        
+        # Create model instance for local inference
+        model_instance = {
+            "name": model.name,
+            "config": config,
+            "loaded_at": time.time(),
+            "type": model.type.value,
+            "capabilities": model.capabilities,
+            "performance_score": model.performance_score,
+            "status": "loaded"
         }
-        return size_map.get(model.size.value, 8.0)  # Default 8GB
+        
+        self.loaded_models[model.name] = model_instance
+        
+        self.logger.info(f"Model {model.name} loaded successfully")
+        return model_instance
+    
+    def _release_model_instance(self, model_name: str, model_instance: Dict[str, Any]):
+        """Drop an evicted model so its memory can be reclaimed"""
+        self.loaded_models.pop(model_name, None)
+        model_instance["status"] = "unloaded"
     
     async def get_best_model(self, task_type: str, capabilities: List[str] = None) -> Optional[Dict[str, Any]]:
         """Get best available model for specific task"""
@@ -448,8 +425,12 @@ class AdaptiveLLMManager:
         # Filter models by task type and capabilities
         suitable_models = []
         
-        for model_name, model in self.loaded_models.items():
-            model_caps = model.get("capabilities", [])
+        for model_name, spec in self.selected_models.items():
+            model = self.loaded_models.get(model_name) or {
+                "name": model_name,
+                "performance_score": spec.performance_score
+            }
+            model_caps = spec.capabilities
             
             # Check if model supports required capabilities
             if capabilities and not any(cap in model_caps for cap in capabilities):
@@ -465,51 +446,49 @@ class AdaptiveLLMManager:
             elif task_type == "image_generation" and "image_generation" in model_caps:
                 suitable_models.append(model)
         
-        # Return best performing model
+        # Return best performing model, loading it if it is not resident
         if suitable_models:
             best_model = max(suitable_models, key=lambda x: x["performance_score"])
-            return best_model
+            try:
+                instance = await self.residency.acquire(best_model["name"], task_type)
+                self.residency.release(best_model["name"])
+                return instance
+            except Exception as e:
+                self.logger.error(f"Failed to load model {best_model['name']}: {e}")
         
         return None
     
     def select_optimal_model(self, task_type: str = "conversation", 
                            requirements: Optional[Dict] = None) -> Optional[Dict]:
-        """Select optimal model based on task and requirements"""
+        """Select model for task under the latency SLO and quality floor.
+        
+        requirements may override "latency_slo" (p95, seconds) and "quality_floor".
+        """
         try:
             # Get suitable models for task
-            suitable_models = []
+            suitable_models = {}
             
             for model_name, model in self.loaded_models.items():
                 model_caps = model.get("capabilities", [])
                 
                 # Check task compatibility
                 if task_type in model_caps or "general" in model_caps:
-                    suitable_models.append(model)
+                    suitable_models[model_name] = model
             
             if not suitable_models:
                 self.logger.warning(f"No suitable models found for task: {task_type}")
                 return None
             
-            # Score models based on performance and requirements
-            best_model = None
-            best_score = -1
-            
-            for model in suitable_models:
-                score = model.get("performance_score", 0.0)
-                
-                # Apply requirement-based scoring
-                if requirements:
-                    if requirements.get("speed_priority", False):
-                        score += model.get("speed_score", 0.0) * 0.3
-                    if requirements.get("quality_priority", False):
-                        score += model.get("quality_score", 0.0) * 0.3
-                
-                if score > best_score:
-                    best_score = score
-                    best_model = model
+            requirements = requirements or {}
+            decision = self.router.choose(
+                task_type, list(suitable_models),
+                latency_slo=requirements.get("latency_slo"),
+                quality_floor=requirements.get("quality_floor")
+            )
+            best_model = suitable_models.get(decision.model)
             
             if best_model:
-                self.logger.info(f"🎯 Selected optimal model: {best_model['name']}")
+                self.logger.info(f"🎯 Selected optimal model: {best_model['name']} ({decision.reason})")
             
             return best_model
             
@@ -521,41 +500,17 @@ class AdaptiveLLMManager:
                          latency: float, quality_score: float = 1.0):
         """Track model performance metrics"""
         try:
-            if model_name not in self.performance_history:
-                self.performance_history[model_name] = {
-                    "latencies": [],
-                    "quality_scores": [],
-                    "task_counts": {}
-                }
+            self.router.observe(model_name, task_type, latency, quality_score)
             
-            # Record metrics
-            self.performance_history[model_name]["latencies"].append(latency)
-            self.performance_history[model_name]["quality_scores"].append(quality_score)
-            
-            # Track task usage
-            if task_type not in self.performance_history[model_name]["task_counts"]:
-                self.performance_history[model_name]["task_counts"][task_type] = 0
-            self.performance_history[model_name]["task_counts"][task_type] += 1
-            
-            # Keep only recent history (last 100 entries)
-            for key in ["latencies", "quality_scores"]:
-                if len(self.performance_history[model_name][key]) > 100:
-                    self.performance_history[model_name][key] = \
-                        self.performance_history[model_name][key][-100:]
-            
-            # Update model performance score
             if model_name in self.loaded_models:
-                avg_latency = sum(self.performance_history[model_name]["latencies"]) / \
-                            len(self.performance_history[model_name]["latencies"])
-                avg_quality = sum(self.performance_history[model_name]["quality_scores"]) / \
-                            len(self.performance_history[model_name]["quality_scores"])
-                
-                # Combined performance score (quality/latency ratio)
-                performance_score = (avg_quality / max(avg_latency, 0.1)) * 100
-                
-                self.loaded_models[model_name]["performance_score"] = performance_score
-                self.loaded_models[model_name]["avg_latency"] = avg_latency
-                self.loaded_models[model_name]["avg_quality"] = avg_quality
+                summary = self.router.summary(model_name, task_type)
+                self.loaded_models[model_name].setdefault("latency", {})[task_type] = {
+                    "p50": summary["p50"],
+                    "p95": summary["p95"],
+                    "p99": summary["p99"],
+                    "quality": summary["quality"],
+                    "slo_attainment": summary["slo_attainment"]
+                }
             
             self.logger.debug(f"📊 Performance tracked for {model_name}: "
                             f"latency={latency:.3f}s, quality={quality_score:.3f}")
@@ -568,14 +523,14 @@ class AdaptiveLLMManager:
         
         while True:
             try:
-                # Check current resource usage
-                memory = psutil.virtual_memory()
-                cpu_percent = psutil.cpu_percent(interval=1)
+                # Check current resource usage from the shared sampler
+                snapshot = get_telemetry().latest()
+                cpu_percent = snapshot.cpu_percent
                 
                 # Record performance metrics
                 metrics = {
-                    "timestamp": self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200,
-                    "ram_usage": memory.percent,
+                    "timestamp": snapshot.timestamp,
+                    "ram_usage": snapshot.memory_percent,
                     "cpu_usage": cpu_percent,
                     "loaded_models": len(self.loaded_models)
                 }
@@ -587,8 +542,10 @@ class AdaptiveLLMManager:
                     self.performance_history = self.performance_history[-100:]
                 
                 # Check if adaptation is needed
-                if memory.percent > 90 or cpu_percent > 95:
+                if snapshot.memory_percent > 90 or cpu_percent > 95:
                     await self._adapt_to_resource_pressure()
+                else:
+                    await self.residency.prefetch()
                 
                 # Sleep before next check
                 await asyncio.sleep(30)
@@ -602,16 +559,12 @@ class AdaptiveLLMManager:
         
         self.logger.warning("System under resource pressure, adapting...")
         
-        # Unload least used models
-        if len(self.loaded_models) > 1:
-            # Find least performing model
-            models_by_score = sorted(self.loaded_models.items(), 
-                                   key=lambda x: x[1]["performance_score"])
-            
-            model_to_unload = models_by_score[0][0]
-            del self.loaded_models[model_to_unload]
-            
-            self.logger.info(f"Unloaded model {model_to_unload} to free resources")
+        # Release enough model memory to get back to 85% RAM usage, lowest GreedyDual-Size priority first
+        snapshot = get_telemetry().latest()
+        excess = int(snapshot.memory_total * max(snapshot.memory_percent - 85.0, 0.0) / 100.0)
+        released = await self.residency.shed(max(excess, 1))
+        
+        self.logger.info(f"Unloaded models worth {released / GIB:.2f} GiB to free resources")
     
     def get_system_status(self) -> Dict[str, Any]:
         """Get adaptive LLM system status"""
@@ -627,10 +580,13 @@ class AdaptiveLLMManager:
                 name: {
                     "type": model["type"],
                     "capabilities": model["capabilities"],
-                    "performance_score": model["performance_score"]
+                    "performance_score": model["performance_score"],
+                    "memory_usage": self.residency.resident[name].ram_bytes if name in self.residency.resident else 0
                 }
                 for name, model in self.loaded_models.items()
             },
+            "residency": self.residency.get_status(),
+            "routing": self.router.get_status(),
             "model_catalog_size": len(self.model_catalog),
             "performance_history_size": len(self.performance_history)
         }
@@ -646,11 +602,16 @@ class AdaptiveLLMManager:
                     "model": model_name
                 }
             
-            model = self.loaded_models[model_name]
-            
-            # Perform actual operation
-            generated_text = f"Generated response from {model_name}: {prompt[:50]}..."
-            token_count = len(generated_text.split())
+            # Pin the model so eviction waits until generation finishes
+            pinned = self.residency.try_acquire(model_name)
+            model = pinned or self.loaded_models[model_name]
+            try:
+                # Perform actual operation
+                generated_text = f"Generated response from {model_name}: {prompt[:50]}..."
+                token_count = len(generated_text.split())
+            finally:
+                if pinned is not None:
+                    self.residency.release(model_name)
             
             # Update model performance metrics
             if "performance_score" in model:
@@ -714,18 +675,21 @@ class AdaptiveLLMManager:
             self.logger.error(f"Failed to load model {model_name}: {e}")
             return False
 
-# Global adaptive LLM manager
-adaptive_llm = AdaptiveLLMManager()
-adaptive_llm_manager = adaptive_llm  # Alias for system integrator
+# Global adaptive LLM manager (adaptive_llm_manager: alias for system integrator)
+__getattr__ = lazy_services(__name__, adaptive_llm=AdaptiveLLMManager, adaptive_llm_manager="adaptive_llm")
+
+def get_adaptive_llm() -> AdaptiveLLMManager:
+    """Process-wide adaptive LLM manager, constructed on first use"""
+    return get_service(f"{__name__}.adaptive_llm")
 
 async def get_best_model_for_task(task_type: str, capabilities: List[str] = None) -> Optional[Dict[str, Any]]:
     """Global function to get best model for task"""
-    return await adaptive_llm.get_best_model(task_type, capabilities)
+    return await get_adaptive_llm().get_best_model(task_type, capabilities)
 
 def get_adaptive_llm_status() -> Dict[str, Any]:
     """Global function to get adaptive LLM status"""
     try:
-        return adaptive_llm.get_system_status()
+        return get_adaptive_llm().get_system_status()
     except:
         # Fallback status
         return {
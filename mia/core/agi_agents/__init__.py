@@ -4,9 +4,15 @@ MIA AGI Agents Package
 Advanced AGI agent system for autonomous operations
 """
 
-from .planner import agi_planner
-from .executor import agi_executor
-from .validator import agi_validator
-from .optimizer import agi_optimizer
+from mia.core.service_registry import lazy_services
+from . import planner, executor, validator, optimizer
+
+__getattr__ = lazy_services(
+    __name__,
+    agi_planner="mia.core.agi_agents.planner.agi_planner",
+    agi_executor="mia.core.agi_agents.executor.agi_executor",
+    agi_validator="mia.core.agi_agents.validator.agi_validator",
+    agi_optimizer="mia.core.agi_agents.optimizer.agi_optimizer"
+)
 
 __all__ = ['agi_planner', 'agi_executor', 'agi_validator', 'agi_optimizer']
\ No newline at end of file
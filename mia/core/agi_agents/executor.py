@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
+from mia.core.service_registry import lazy_services
 
 class ExecutionStatus(Enum):
 
@@ -614,4 +615,4 @@ class AGIExecutor:
             return {"error": str(e)}
 
 # Global instance
-agi_executor = AGIExecutor()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, agi_executor=AGIExecutor)
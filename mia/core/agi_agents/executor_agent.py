@@ -20,6 +20,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import asyncio
 import queue
+from mia.core.service_registry import lazy_services
 
 class ExecutionStatus(Enum):
 
@@ -653,11 +654,12 @@ class ExecutorAgent:
             operation = task_data.get("operation", "")
             
             if operation == "get_system_info":
-                import psutil
+                from mia.core.telemetry import get_telemetry
+                snapshot = get_telemetry().latest()
                 return {
-                    "cpu_percent": psutil.cpu_percent(),
-                    "memory_percent": psutil.virtual_memory().percent,
-                    "disk_usage": psutil.disk_usage('/').percent
+                    "cpu_percent": snapshot.cpu_percent,
+                    "memory_percent": snapshot.memory_percent,
+                    "disk_usage": snapshot.disk_percent
                 }
             
             elif operation == "list_processes":
@@ -779,4 +781,4 @@ class ExecutorAgent:
             return {"error": str(e)}
 
 # Global instance
-executor_agent = ExecutorAgent()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, executor_agent=ExecutorAgent)
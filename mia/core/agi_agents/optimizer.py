@@ -8,12 +8,14 @@ import json
 import logging
 import time
 import threading
-import psutil
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from mia.core.telemetry import get_telemetry
+from mia.core.service_registry import lazy_services
+
 class OptimizationType(Enum):
 
     def _get_deterministic_time(self) -> float:
@@ -196,12 +198,7 @@ class AGIOptimizer:
         """Initialize performance baselines"""
         try:
             # Collect initial performance metrics
-            self.performance_baselines.update({
-                "cpu_usage": psutil.cpu_percent(interval=1),
-                "memory_usage": psutil.virtual_memory().percent,
-                "disk_usage": psutil.disk_usage('/').percent,
-                "load_average": os.getloadavg()[0] if hasattr(os, 'getloadavg') else 0.0
-            })
+            self.performance_baselines.update(self._current_metrics())
             
             self.logger.info("📊 Performance baselines initialized")
             
@@ -383,7 +380,7 @@ class AGIOptimizer:
             current_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
             
             if optimization_type == OptimizationType.MEMORY:
-                current_memory = psutil.virtual_memory().percent
+                current_memory = get_telemetry().latest().memory_percent
                 target_memory = current_memory * 0.85  # 15% reduction target
                 
                 metrics.append(OptimizationMetric(
@@ -398,7 +395,7 @@ class AGIOptimizer:
                 ))
             
             elif optimization_type == OptimizationType.CPU:
-                current_cpu = psutil.cpu_percent(interval=1)
+                current_cpu = get_telemetry().latest().cpu_percent
                 target_cpu = current_cpu * 0.9  # 10% reduction target
                 
                 metrics.append(OptimizationMetric(
@@ -431,15 +428,20 @@ class AGIOptimizer:
             self.logger.error(f"Failed to generate optimization metrics: {e}")
             return []
     
+    def _current_metrics(self) -> Dict[str, float]:
+        """Current system metrics from the shared telemetry sampler"""
+        snapshot = get_telemetry().latest()
+        return {
+            "cpu_usage": snapshot.cpu_percent,
+            "memory_usage": snapshot.memory_percent,
+            "disk_usage": snapshot.disk_percent,
+            "load_average": snapshot.load_average[0]
+        }
+    
     def _monitor_performance(self):
         """Monitor system performance"""
         try:
-            current_metrics = {
-                "cpu_usage": psutil.cpu_percent(interval=1),
-                "memory_usage": psutil.virtual_memory().percent,
-                "disk_usage": psutil.disk_usage('/').percent,
-                "load_average": os.getloadavg()[0] if hasattr(os, 'getloadavg') else 0.0
-            }
+            current_metrics = self._current_metrics()
             
             # Check thresholds
             thresholds = self.config.get("thresholds", {})
@@ -456,7 +458,8 @@ class AGIOptimizer:
         """Identify optimization opportunities"""
         try:
             # Check for memory optimization opportunities
-            memory_usage = psutil.virtual_memory().percent
+            snapshot = get_telemetry().latest()
+            memory_usage = snapshot.memory_percent
             if memory_usage > self.config.get("thresholds", {}).get("memory_usage", 85.0):
                 if not any(task.optimization_type == OptimizationType.MEMORY and 
                           task.status in [OptimizationStatus.PENDING, OptimizationStatus.ANALYZING, OptimizationStatus.OPTIMIZING]
@@ -471,7 +474,7 @@ class AGIOptimizer:
                     )
             
             # Check for CPU optimization opportunities
-            cpu_usage = psutil.cpu_percent(interval=1)
+            cpu_usage = snapshot.cpu_percent
             if cpu_usage > self.config.get("thresholds", {}).get("cpu_usage", 80.0):
                 if not any(task.optimization_type == OptimizationType.CPU and 
                           task.status in [OptimizationStatus.PENDING, OptimizationStatus.ANALYZING, OptimizationStatus.OPTIMIZING]
@@ -696,12 +699,7 @@ class AGIOptimizer:
         """Update performance baselines"""
         try:
             # Update baselines with current metrics
-            current_metrics = {
-                "cpu_usage": psutil.cpu_percent(interval=1),
-                "memory_usage": psutil.virtual_memory().percent,
-                "disk_usage": psutil.disk_usage('/').percent,
-                "load_average": os.getloadavg()[0] if hasattr(os, 'getloadavg') else 0.0
-            }
+            current_metrics = self._current_metrics()
             
             # Use exponential moving average to update baselines
             alpha = 0.1  # Smoothing factor
@@ -767,4 +765,4 @@ class AGIOptimizer:
             return {"error": str(e)}
 
 # Global instance
-agi_optimizer = AGIOptimizer()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, agi_optimizer=AGIOptimizer)
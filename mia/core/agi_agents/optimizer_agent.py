@@ -16,6 +16,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 import numpy as np
+from mia.core.service_registry import lazy_services
 
 class OptimizationTarget(Enum):
     """Optimization targets"""
@@ -1022,4 +1023,4 @@ class OptimizerAgent:
             return {"error": str(e)}
 
 # Global instance
-optimizer_agent = OptimizerAgent()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, optimizer_agent=OptimizerAgent)
@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
+from mia.core.service_registry import lazy_services
 
 class PlanType(Enum):
 
@@ -420,4 +421,4 @@ class AGIPlanner:
             return {"error": str(e)}
 
 # Global instance
-agi_planner = AGIPlanner()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, agi_planner=AGIPlanner)
@@ -15,6 +15,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 import asyncio
+from mia.core.service_registry import lazy_services
 
 class PlanType(Enum):
 
@@ -643,4 +644,4 @@ class PlannerAgent:
             return {"error": str(e)}
 
 # Global instance
-planner_agent = PlannerAgent()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, planner_agent=PlannerAgent)
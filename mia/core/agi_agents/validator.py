@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
+from mia.core.service_registry import lazy_services
 
 class ValidationLevel(Enum):
 
@@ -787,4 +788,4 @@ class AGIValidator:
             return {"error": str(e)}
 
 # Global instance
-agi_validator = AGIValidator()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, agi_validator=AGIValidator)
@@ -15,6 +15,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
+from mia.core.service_registry import lazy_services
 
 class ValidationLevel(Enum):
 
@@ -963,4 +964,4 @@ class ValidatorAgent:
             return {"error": str(e)}
 
 # Global instance
-validator_agent = ValidatorAgent()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, validator_agent=ValidatorAgent)
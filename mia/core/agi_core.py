@@ -5,13 +5,17 @@ The main AGI core that provides reasoning, understanding, and autonomous capabil
 """
 
 import asyncio
+import itertools
 import logging
 import json
 import time
-from typing import Dict, List, Any, Optional, Union
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Set, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
+from mia.compliance.data_map import register_subject_store
+from mia.core.service_registry import get_service, lazy_services
 
 class ThoughtType(Enum):
     """Types of thoughts the AGI can have"""
@@ -89,6 +93,8 @@ class AGICore:
         self.tasks: Dict[str, Task] = {}
         self.memories: Dict[str, Memory] = {}
         self.context: Dict[str, Any] = {}
+        self.subject_memories: Dict[str, Set[str]] = defaultdict(set)  # subject_id -> memory ids
+        self._id_sequence = itertools.count(1)  # ločuje id-je, ustvarjene v isti milisekundi
         
         # Core components
         self.semantic_engine = None
@@ -114,6 +120,7 @@ class AGICore:
             "start_time": time.time()
         }
         
+        register_subject_store("agi_core", self)
         self.logger.info("🧠 AGI Core initialized")
     
     def _setup_logging(self) -> logging.Logger:
@@ -424,7 +431,7 @@ class AGICore:
                 # Restore memories
                 for memory_data in state.get("memories", []):
                     memory = Memory(**memory_data)
-                    self.memories[memory.id] = memory
+                    self._add_memory(memory)
                 
                 # Restore context
                 self.context.update(state.get("context", {}))
@@ -436,12 +443,16 @@ class AGICore:
     
     async def save_state(self):
         """Save current AGI state"""
+        self._write_state()
+    
+    def _write_state(self) -> bool:
+        """Write memories and context to the state file"""
         state_file = Path("mia/data/agi_state.json")
         state_file.parent.mkdir(parents=True, exist_ok=True)
         
         try:
             state = {
-                "memories": [asdict(memory) for memory in self.memories.values()],
+                "memories": [asdict(memory) for memory in list(self.memories.values())],
                 "context": self.context,
                 "metrics": self.metrics,
                 "timestamp": time.time()
@@ -451,16 +462,56 @@ class AGICore:
                 json.dump(state, f, indent=2)
                 
             self.logger.info("💾 AGI state saved")
+            return True
             
         except Exception as e:
             self.logger.error(f"❌ Failed to save state: {e}")
+            return False
+    
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}_{int(time.time() * 1000)}_{next(self._id_sequence)}"
+    
+    def _add_memory(self, memory: Memory):
+        """Store a memory, indexed by the data subject it belongs to"""
+        self.memories[memory.id] = memory
+        subject_id = memory.context.get("subject_id")
+        if subject_id:
+            self.subject_memories[subject_id].add(memory.id)
+    
+    def find_subject_records(self, subject_id: str) -> List[str]:
+        """Memory ids belonging to a data subject (subject data map)"""
+        keys = sorted(memory_id for memory_id in self.subject_memories.get(subject_id, ()) if memory_id in self.memories)
+        if self.context.get("last_subject_id") == subject_id:
+            keys.append("context:last_message")
+        return keys
+    
+    def export_subject_data(self, subject_id: str) -> Dict[str, Any]:
+        """A data subject's memories and conversation context"""
+        memories = [asdict(self.memories[memory_id]) for memory_id in self.find_subject_records(subject_id)
+                    if memory_id in self.memories]
+        last_message = self.context.get("last_message") if self.context.get("last_subject_id") == subject_id else None
+        return {"memories": memories, "last_message": last_message}
+    
+    def erase_subject_data(self, subject_id: str) -> int:
+        """Forget a data subject's memories and persist the state"""
+        erased = 0
+        for memory_id in self.subject_memories.pop(subject_id, ()):
+            if self.memories.pop(memory_id, None) is not None:
+                erased += 1
+        if self.context.get("last_subject_id") == subject_id:
+            for key in ("last_message", "last_subject_id"):
+                self.context.pop(key, None)
+            erased += 1
+        if erased and not self._write_state():
+            raise RuntimeError("AGI state could not be saved after erasure")
+        return erased
     
     async def think(self, prompt: str, thought_type: ThoughtType = ThoughtType.REASONING) -> Thought:
         """
         Generate a thought based on the given prompt
         This is the core reasoning function of the AGI
         """
-        thought_id = f"thought_{int(time.time() * 1000)}"
+        thought_id = self._new_id("thought")
         
         self.logger.info(f"🤔 Thinking about: {prompt[:100]}...")
         
@@ -646,12 +697,12 @@ Please provide a thoughtful, professional response to the following:"""
             context=thought.context
         )
         
-        self.memories[memory_id] = memory
+        self._add_memory(memory)
         self.logger.debug(f"💾 Stored thought in memory: {memory_id}")
     
     async def process_task(self, description: str, priority: int = 5) -> Task:
         """Process a new task"""
-        task_id = f"task_{int(time.time() * 1000)}"
+        task_id = self._new_id("task")
         
         task = Task(
             id=task_id,
@@ -704,10 +755,12 @@ Please provide a thoughtful, professional response to the following:"""
             task.updated_at = time.time()
             self.logger.error(f"❌ Task failed: {task.id} - {e}")
     
-    async def chat(self, message: str) -> str:
+    async def chat(self, message: str, subject_id: Optional[str] = None) -> str:
         """
         Main chat interface - process user message and return response
         This is the primary interface for interacting with the AGI
+        
+        subject_id identifies the user, so their memories can be exported or erased
         """
         self.logger.info(f"💬 Processing chat message: {message[:50]}...")
         
@@ -716,13 +769,20 @@ Please provide a thoughtful, professional response to the following:"""
         
         # Update context
         self.context["last_message"] = message
+        self.context["last_subject_id"] = subject_id
         self.context["last_response_time"] = time.time()
         
+        # The thought is derived from the user's message
+        thought_memory = self.memories.get(f"memory_{thought.id}")
+        if subject_id and thought_memory:
+            thought_memory.context["subject_id"] = subject_id
+            self.subject_memories[subject_id].add(thought_memory.id)
+        
         # Generate response
         response = await self._generate_chat_response(message, thought)
         
         # Store conversation in memory
-        await self._store_conversation(message, response)
+        await self._store_conversation(message, response, subject_id)
         
         return response
     
@@ -781,9 +841,9 @@ Please provide a thoughtful, professional response to the following:"""
         else:
             return "statement"
     
-    async def _store_conversation(self, message: str, response: str):
+    async def _store_conversation(self, message: str, response: str, subject_id: Optional[str] = None):
         """Store conversation in memory"""
-        memory_id = f"conversation_{int(time.time() * 1000)}"
+        memory_id = self._new_id("conversation")
         
         memory = Memory(
             id=memory_id,
@@ -792,10 +852,10 @@ Please provide a thoughtful, professional response to the following:"""
             importance=0.6,
             timestamp=time.time(),
             associations=[],
-            context={"type": "chat_interaction"}
+            context={"type": "chat_interaction", "subject_id": subject_id}
         )
         
-        self.memories[memory_id] = memory
+        self._add_memory(memory)
     
     async def get_status(self) -> Dict[str, Any]:
         """Get current AGI status"""
@@ -827,12 +887,16 @@ Please provide a thoughtful, professional response to the following:"""
         self.logger.info("👋 AGI Core shutdown complete")
 
 # Global AGI core instance
-agi_core = AGICore()
+__getattr__ = lazy_services(__name__, agi_core=AGICore)
+
+def get_agi_core() -> AGICore:
+    """Process-wide AGI core, constructed on first use"""
+    return get_service(f"{__name__}.agi_core")
 
 async def initialize_agi():
     """Initialize the global AGI core"""
-    await agi_core.initialize()
+    await get_agi_core().initialize()
 
 async def shutdown_agi():
     """Shutdown the global AGI core"""
-    await agi_core.shutdown()
\ No newline at end of file
+    await get_agi_core().shutdown()
\ No newline at end of file
@@ -18,6 +18,10 @@ import importlib.util
 import asyncio
 from dataclasses import dataclass
 
+from mia.core.hardware_profile import get_hardware_profile
+from mia.core.startup_orchestrator import ResourceClass, StartupOrchestrator, StartupStep
+from mia.core.telemetry import get_telemetry
+
 @dataclass
 class HardwareProfile:
     """Hardware configuration profile"""
@@ -53,6 +57,7 @@ class MIABootBuilder:
         self.config: Dict = {}
         self.logger = self._setup_logging()
         self.base_path = Path(__file__).parent.parent.parent
+        self.startup: Optional[StartupOrchestrator] = None
     
     def detect_hardware(self):
         """Detect system hardware capabilities (sync version)"""
@@ -110,46 +115,90 @@ class MIABootBuilder:
         )
         return logging.getLogger(__name__)
     
+    def _module_steps(self) -> List[StartupStep]:
+        """Module init steps; UI is the ready point, optional modules follow it"""
+        has_profile = lambda: self.model_profile is not None
+        return [
+            StartupStep("consciousness", self._init_consciousness, blocking=True),
+            StartupStep("memory", self._init_memory_system, blocking=True),
+            StartupStep("voice", self._init_voice_module, blocking=True,
+                        condition=lambda: has_profile() and bool(self.model_profile.stt_model)),
+            StartupStep("ui", self._init_ui_module, blocking=True),
+            StartupStep("multimodal", self._init_multimodal_module, optional=True, blocking=True,
+                        condition=lambda: has_profile() and bool(self.model_profile.image_model)),
+            StartupStep("projects", self._init_project_module, optional=True, blocking=True),
+            StartupStep("monitoring", self._init_monitoring_module, optional=True, blocking=True),
+        ]
+
+    def _startup_steps(self) -> List[StartupStep]:
+        """Full boot graph: hardware, models and modules with their dependencies"""
+        steps = [
+            StartupStep("load_config", self._load_config, timeout=10.0, blocking=True),
+            StartupStep("detect_hardware", self._run_hardware_detection, resource=ResourceClass.SUBPROCESS,
+                        blocking=True),
+            StartupStep("select_models", self._run_model_selection, ("detect_hardware",), ResourceClass.CPU,
+                        blocking=True),
+            StartupStep("install_dependencies", self._install_dependencies, resource=ResourceClass.SUBPROCESS,
+                        timeout=900.0, optional=True, blocking=True),
+            StartupStep("setup_models", self._prepare_model_files, ("select_models",), blocking=True),
+        ]
+        for step in self._module_steps():
+            if step.name in ("voice", "multimodal"):
+                step.depends_on = ("select_models",)
+            steps.append(step)
+        steps.append(StartupStep("health_check", self._system_health_check,
+                                 ("setup_models", "consciousness", "memory", "voice", "ui"), ResourceClass.CPU,
+                                 blocking=True))
+        return steps
+
     async def initialize(self) -> bool:
-        """Main initialization sequence"""
+        """Main initialization sequence.
+
+        Independent steps run concurrently; optional modules and the
+        dependency install start once the UI is initialized and finish in
+        the background (see ``wait_for_deferred``).
+        """
         try:
             self.logger.info("🚀 MIA Bootstrap System Starting...")
             
-            # Load configuration
-            await self._load_config()
-            
-            # Detect hardware
-            self.hardware_profile = await self._detect_hardware()
-            self.logger.info(f"Hardware detected: {self.hardware_profile}")
-            
-            # Select optimal models
-            self.model_profile = await self._select_models()
-            self.logger.info(f"Models selected: {self.model_profile}")
+            self.startup = StartupOrchestrator(self._startup_steps(), ready_step="ui", name="bootstrap")
+            completed = await self.startup.run()
+            self.logger.info(f"Startup timeline: {self.startup.trace_path}")
             
-            # Download and setup models
-            await self._setup_models()
-            
-            # Initialize core modules
-            await self._initialize_core_modules()
-            
-            # Initialize peripheral modules
-            await self._initialize_peripheral_modules()
-            
-            # Perform system health check
-            health_status = await self._system_health_check()
-            
-            if health_status:
+            health = self.startup.results.get("health_check")
+            if completed and health is not None and health.value:
                 self.logger.info("✅ MIA Bootstrap completed successfully!")
                 await self._save_system_state()
                 return True
             else:
-                self.logger.error("❌ MIA Bootstrap failed health check!")
+                failed = {name: result.error for name, result in self.startup.results.items()
+                          if not result.succeeded}
+                self.logger.error(f"❌ MIA Bootstrap failed health check! {failed}")
                 return False
                 
         except Exception as e:
             self.logger.error(f"❌ Bootstrap failed: {str(e)}")
             return False
     
+    async def wait_for_deferred(self):
+        """Wait for deferred optional startup steps"""
+        if self.startup is not None:
+            await self.startup.wait_deferred()
+    
+    async def _run_hardware_detection(self):
+        self.hardware_profile = await self._detect_hardware()
+        self.logger.info(f"Hardware detected: {self.hardware_profile}")
+    
+    async def _run_model_selection(self):
+        self.model_profile = await self._select_models()
+        self.logger.info(f"Models selected: {self.model_profile}")
+    
+    def _write_json(self, path: str, data: Dict):
+        """Write a JSON file, creating its directory (steps run concurrently)"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+    
     async def _load_config(self):
         """Load MIA configuration"""
         try:
@@ -163,44 +212,17 @@ class MIABootBuilder:
     async def _detect_hardware(self) -> HardwareProfile:
         """Detect and analyze hardware capabilities"""
         
-        # CPU detection
-        cpu_cores = psutil.cpu_count(logical=True)
-        cpu_freq = psutil.cpu_freq().max if psutil.cpu_freq() else 2000.0
-        
-        # Memory detection
-        memory = psutil.virtual_memory()
-        ram_gb = memory.total / (1024**3)
+        # Static facts from the cached hardware profile, disk usage from telemetry
+        profile = get_hardware_profile()
+        cpu_cores = profile.cpu_logical_cores
+        cpu_freq = profile.cpu_frequency_mhz
+        ram_gb = profile.ram_total_gb
+        gpu_available = profile.gpu_available
+        gpu_memory_gb = profile.gpu_memory_gb
+        if gpu_available:
+            self.logger.info(f"{profile.gpu_model} detected with {gpu_memory_gb:.1f}GB VRAM")
         
-        # GPU detection
-        gpu_available = False
-        gpu_memory_gb = 0.0
-        
-        try:
-            # Try to detect NVIDIA GPU
-            result = subprocess.run(['nvidia-smi', '--query-gpu=memory.total', '--format=csv,noheader,nounits'], 
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                gpu_memory_gb = float(result.stdout.strip()) / 1024
-                gpu_available = True
-                self.logger.info(f"NVIDIA GPU detected with {gpu_memory_gb:.1f}GB VRAM")
-        except Exception as e:
-            self.logger.debug(f"NVIDIA GPU detection failed: {e}")
-            
-        if not gpu_available:
-            try:
-                # Try to detect AMD GPU
-                result = subprocess.run(['rocm-smi', '--showmeminfo', 'vram'], 
-                                      capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    gpu_available = True
-                    gpu_memory_gb = 8.0  # Default assumption for AMD
-                    self.logger.info("AMD GPU detected")
-            except Exception as e:
-                self.logger.warning(f"GPU detection failed: {e}")
-                gpu_available = False
-                gpu_memory_gb = 0.0
-        disk = psutil.disk_usage('/')
-        disk_space_gb = disk.free / (1024**3)
+        disk_space_gb = get_telemetry().latest().disk_free_gb
         
         # Architecture detection
         architecture = platform.machine()
@@ -314,7 +336,12 @@ class MIABootBuilder:
         # Install required packages first
         await self._install_dependencies()
         
-        # Create model directories
+        await self._prepare_model_files()
+        
+        self.logger.info("Models setup completed")
+    
+    async def _prepare_model_files(self):
+        """Create model directories and configurations"""
         model_dirs = [
             "mia/data/models/language",
             "mia/data/models/voice", 
@@ -326,8 +353,6 @@ class MIABootBuilder:
         
         # Setup model configurations for local deployment
         await self._create_model_configs()
-        
-        self.logger.info("Models setup completed")
     
     async def _install_dependencies(self):
         """Install required Python packages"""
@@ -355,8 +380,7 @@ class MIABootBuilder:
             "local_path": "mia/data/models/language/"
         }
         
-        with open("mia/data/models/language/config.json", "w") as f:
-            json.dump(language_config, f, indent=2)
+        self._write_json("mia/data/models/language/config.json", language_config)
         
         # Voice model configs
         voice_config = {
@@ -366,8 +390,7 @@ class MIABootBuilder:
             "local_path": "mia/data/models/voice/"
         }
         
-        with open("mia/data/models/voice/config.json", "w") as f:
-            json.dump(voice_config, f, indent=2)
+        self._write_json("mia/data/models/voice/config.json", voice_config)
         
         # Image model config (if available)
         if self.model_profile.image_model:
@@ -377,8 +400,7 @@ class MIABootBuilder:
                 "local_path": "mia/data/models/image/"
             }
             
-            with open("mia/data/models/image/config.json", "w") as f:
-                json.dump(image_config, f, indent=2)
+            self._write_json("mia/data/models/image/config.json", image_config)
     
     async def _initialize_core_modules(self):
         """Initialize core MIA modules"""
@@ -403,8 +425,7 @@ class MIABootBuilder:
             "adaptation_rate": 0.1
         }
         
-        with open("mia/data/consciousness_state.json", "w") as f:
-            json.dump(consciousness_config, f, indent=2)
+        self._write_json("mia/data/consciousness_state.json", consciousness_config)
     
     async def _init_memory_system(self):
         """Initialize memory system"""
@@ -435,20 +456,11 @@ class MIABootBuilder:
         self.logger.info("🔧 Initializing MIA modules...")
         
         try:
-            # Initialize core systems first
-            await self._init_consciousness_system()
-            await self._init_memory_system()
-            
-            # Initialize peripheral modules based on hardware capabilities
-            if self.model_profile and self.model_profile.stt_model:
-                await self._init_voice_module()
-            
-            if self.model_profile and self.model_profile.image_model:
-                await self._init_multimodal_module()
-            
-            await self._init_ui_module()
-            await self._init_project_module()
-            await self._init_monitoring_module()
+            # Independent modules initialize concurrently, peripheral ones once the UI is ready
+            startup = StartupOrchestrator(self._module_steps(), ready_step="ui", name="modules")
+            if not await startup.run(wait_deferred=True):
+                failed = {name: result.error for name, result in startup.results.items() if not result.succeeded}
+                raise RuntimeError(f"module initialization failed: {failed}")
             
             self.logger.info("✅ All MIA modules initialized successfully")
             return True
@@ -502,8 +514,7 @@ class MIABootBuilder:
             "real_time_processing": True
         }
         
-        with open("mia/data/voice_config.json", "w") as f:
-            json.dump(voice_config, f, indent=2)
+        self._write_json("mia/data/voice_config.json", voice_config)
     
     async def _init_multimodal_module(self):
         """Initialize multimodal generation module"""
@@ -515,8 +526,7 @@ class MIABootBuilder:
             "quality_mode": "balanced"
         }
         
-        with open("mia/data/multimodal_config.json", "w") as f:
-            json.dump(multimodal_config, f, indent=2)
+        self._write_json("mia/data/multimodal_config.json", multimodal_config)
     
     async def _init_ui_module(self):
         """Initialize UI module"""
@@ -530,8 +540,7 @@ class MIABootBuilder:
             "developer_mode_enabled": True
         }
         
-        with open("mia/data/ui_config.json", "w") as f:
-            json.dump(ui_config, f, indent=2)
+        self._write_json("mia/data/ui_config.json", ui_config)
     
     async def _init_project_module(self):
         """Initialize project management module"""
@@ -544,8 +553,7 @@ class MIABootBuilder:
             "supported_frameworks": ["fastapi", "react", "vue", "django"]
         }
         
-        with open("mia/data/project_config.json", "w") as f:
-            json.dump(project_config, f, indent=2)
+        self._write_json("mia/data/project_config.json", project_config)
     
     async def _init_monitoring_module(self):
         """Initialize system monitoring module"""
@@ -558,8 +566,7 @@ class MIABootBuilder:
             "health_check_interval": 60
         }
         
-        with open("mia/data/monitoring_config.json", "w") as f:
-            json.dump(monitoring_config, f, indent=2)
+        self._write_json("mia/data/monitoring_config.json", monitoring_config)
     
     async def _system_health_check(self) -> bool:
         """Perform comprehensive system health check"""
@@ -584,9 +591,10 @@ class MIABootBuilder:
                 self.logger.error(f"❌ {file_path} - MISSING")
         
         # Check system resources
-        memory_usage = psutil.virtual_memory().percent
-        cpu_usage = psutil.cpu_percent(interval=1)
-        disk_usage = psutil.disk_usage('/').percent
+        snapshot = get_telemetry().latest()
+        memory_usage = snapshot.memory_percent
+        cpu_usage = snapshot.cpu_percent
+        disk_usage = snapshot.disk_percent
         
         if memory_usage < 90:
             checks.append(True)
@@ -631,8 +639,7 @@ class MIABootBuilder:
             ]
         }
         
-        with open("mia/data/system_state.json", "w") as f:
-            json.dump(system_state, f, indent=2)
+        self._write_json("mia/data/system_state.json", system_state)
         
         self.logger.info("System state saved successfully")
 
@@ -643,6 +650,7 @@ async def main():
     
     if success:
         print("🎉 MIA is ready to activate!")
+        await bootstrap.wait_for_deferred()
         return 0
     else:
         print("💥 MIA bootstrap failed!")
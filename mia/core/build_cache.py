@@ -0,0 +1,764 @@
+#!/usr/bin/env python3
+"""
+MIA Build Cache
+Inkrementalni predpomnilnik gradenj: vsak korak navede vhode (vzorce
+datotek, zaklepne datoteke, različice orodij) in izhode; izhodi se hranijo
+v vsebinsko naslovljeni shrambi, zato se nespremenjeni koraki preskočijo
+ali obnovijo s trdimi povezavami. Virtualna okolja so deljena in ključena
+z zgoščeno vrednostjo requirements, pakiranje je inkrementalno, neodvisni
+koraki tečejo vzporedno
+"""
+
+import fnmatch
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger("MIA.BuildCache")
+
+# Imeniki, ki so izhodi gradnje ali orodij in nikoli vhodi
+DEFAULT_EXCLUDES = ("node_modules", "venv", ".venv", "__pycache__", ".git", ".mia-build",
+                    "dist", "build", ".pytest_cache", "coverage")
+
+OUTPUT_LIMIT = 4000
+
+Runner = Callable[[List[str], Path, float], subprocess.CompletedProcess]
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return _sha256(text.encode("utf-8"))
+
+
+def _excluded(name: str, excludes: Sequence[str]) -> bool:
+    return any(name == pattern or fnmatch.fnmatch(name, pattern) for pattern in excludes)
+
+
+def iter_files(root: Path, excludes: Sequence[str] = DEFAULT_EXCLUDES) -> List[str]:
+    """Relative POSIX paths of files and symlinks under ``root``, sorted, excluded names pruned"""
+    found = []
+    root = Path(root)
+    for directory, dirs, files in os.walk(root):
+        relative = os.path.relpath(directory, root)
+        prefix = "" if relative == "." else relative.replace(os.sep, "/") + "/"
+        kept = []
+        for name in dirs:
+            if _excluded(name, excludes):
+                continue
+            if os.path.islink(os.path.join(directory, name)):
+                found.append(prefix + name)
+            else:
+                kept.append(name)
+        dirs[:] = kept
+        found.extend(prefix + name for name in files if not _excluded(name, excludes))
+    return sorted(found)
+
+
+class FileHasher:
+    """Content digests memoized by (mtime, size, inode), persisted between builds"""
+
+    def __init__(self, state_path: Optional[Union[str, Path]] = None):
+        self.state_path = Path(state_path) if state_path else None
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List] = {}
+        self._dirty = False
+        self.stats = {"hits": 0, "hashed": 0}
+        if self.state_path and self.state_path.exists():
+            try:
+                with open(self.state_path, 'r') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def digest(self, path: Union[str, Path]) -> str:
+        path = os.path.abspath(path)
+        info = os.stat(path)
+        signature = [info.st_mtime_ns, info.st_size, info.st_ino]
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[:3] == signature:
+                self.stats["hits"] += 1
+                return entry[3]
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        with self._lock:
+            self._entries[path] = signature + [digest]
+            self._dirty = True
+            self.stats["hashed"] += 1
+        return digest
+
+    def save(self):
+        if not self.state_path or not self._dirty:
+            return
+        with self._lock:
+            data = json.dumps(self._entries)
+            self._dirty = False
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.state_path.with_suffix(f".tmp{os.getpid()}")
+        temp.write_text(data)
+        os.replace(temp, self.state_path)
+
+
+class ContentStore:
+    """Content-addressed, read-only blobs plus tree manifests that link back out of the store"""
+
+    def __init__(self, root: Union[str, Path], hasher: Optional[FileHasher] = None):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.hasher = hasher or FileHasher()
+
+    def object_path(self, digest: str, executable: bool = False) -> Path:
+        return self.objects / digest[:2] / (digest + ("-x" if executable else ""))
+
+    def put_file(self, path: Path) -> Tuple[str, bool]:
+        """Store a file's content; returns (digest, executable)"""
+        digest = self.hasher.digest(path)
+        executable = bool(os.stat(path).st_mode & stat.S_IXUSR)
+        target = self.object_path(digest, executable)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temp = target.with_name(f"{target.name}.{uuid.uuid4().hex}.tmp")
+            shutil.copyfile(path, temp)
+            # Objekti so samo za branje, ker se povezujejo nazaj v projekte
+            os.chmod(temp, 0o555 if executable else 0o444)
+            os.replace(temp, target)
+        return digest, executable
+
+    def put_bytes(self, data: bytes) -> str:
+        digest = _sha256(data)
+        target = self.object_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temp = target.with_name(f"{target.name}.{uuid.uuid4().hex}.tmp")
+            temp.write_bytes(data)
+            os.chmod(temp, 0o444)
+            os.replace(temp, target)
+        return digest
+
+    def get_bytes(self, digest: str) -> Optional[bytes]:
+        target = self.object_path(digest)
+        return target.read_bytes() if target.exists() else None
+
+    def link(self, digest: str, executable: bool, dest: Path):
+        """Hardlink a stored object to ``dest``, copying across filesystems"""
+        source = self.object_path(digest, executable)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists() or dest.is_symlink():
+            dest.unlink()
+        try:
+            os.link(source, dest)
+        except OSError:
+            shutil.copy2(source, dest)
+
+    def snapshot(self, root: Path, relative: str) -> Optional[Dict[str, List]]:
+        """Store a file or directory under ``root``; returns its manifest, None if absent"""
+        path = root / relative
+        if not path.exists() and not path.is_symlink():
+            return None
+        if path.is_symlink() or path.is_file():
+            names = [relative]
+        else:
+            names = [f"{relative}/{name}" for name in iter_files(path, excludes=())]
+        manifest = {}
+        for name in names:
+            item = root / name
+            if item.is_symlink():
+                manifest[name] = ["link", os.readlink(item)]
+            else:
+                digest, executable = self.put_file(item)
+                manifest[name] = ["file", digest, executable]
+        return manifest
+
+    def matches(self, root: Path, relative: str, manifest: Dict[str, List]) -> bool:
+        """Whether the output on disk already equals ``manifest`` (stat-cached, no rehash)"""
+        path = root / relative
+        if path.is_symlink() or path.is_file():
+            names = [relative]
+        elif path.is_dir():
+            names = [f"{relative}/{name}" for name in iter_files(path, excludes=())]
+        else:
+            return False
+        if len(names) != len(manifest):
+            return False
+        for name in names:
+            expected = manifest.get(name)
+            item = root / name
+            if expected is None:
+                return False
+            if expected[0] == "link":
+                if not item.is_symlink() or os.readlink(item) != expected[1]:
+                    return False
+            elif item.is_symlink() or self.hasher.digest(item) != expected[1]:
+                return False
+        return True
+
+    def restore(self, root: Path, relative: str, manifest: Dict[str, List]):
+        path = root / relative
+        if path.is_symlink() or path.is_file():
+            path.unlink()
+        elif path.is_dir():
+            shutil.rmtree(path)
+        for name, entry in manifest.items():
+            dest = root / name
+            if entry[0] == "link":
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                os.symlink(entry[1], dest)
+            else:
+                self.link(entry[1], entry[2], dest)
+
+
+@dataclass
+class BuildStep:
+    """One build action with the inputs that decide whether it must run again.
+
+    ``inputs`` are fnmatch patterns over project-relative paths (``*``
+    crosses directories; names in ``DEFAULT_EXCLUDES`` are never inputs),
+    ``files`` are explicit paths that may lie outside the project, e.g.
+    local package tarballs. ``tools`` are executables whose identity is
+    part of the key, ``salt`` is any other key material.
+    """
+    name: str
+    command: List[str]
+    inputs: List[str] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    tools: List[str] = field(default_factory=list)
+    deps: List[str] = field(default_factory=list)
+    salt: str = ""
+    optional: bool = False
+    cacheable: bool = True
+    timeout: float = 300.0
+
+
+def run_command(command: List[str], cwd: Path, timeout: float) -> subprocess.CompletedProcess:
+    return subprocess.run(command, cwd=cwd, capture_output=True, text=True, timeout=timeout)
+
+
+class BuildCache:
+    """Runs build steps as a dependency graph, skipping or restoring the unchanged ones.
+
+    A step's key hashes its command, inputs, tools, salt and the keys of
+    the steps it depends on. After a successful run its outputs go to the
+    content store and an action record is written under the key. On a
+    later build with the same key the step is a no-op when the outputs on
+    disk still match, and is restored by hardlinking from the store when
+    they do not (a fresh checkout, a cleaned tree). Failed steps are never
+    cached.
+    """
+
+    def __init__(self, root: Union[str, Path] = "mia_data/build_cache", max_workers: int = 4,
+                 runner: Optional[Runner] = None):
+        self.root = Path(root)
+        self.actions = self.root / "actions"
+        self.actions.mkdir(parents=True, exist_ok=True)
+        self.hasher = FileHasher(self.root / "file_digests.json")
+        self.store = ContentStore(self.root, self.hasher)
+        self.max_workers = max(1, max_workers)
+        self.runner = runner or run_command
+        self._tools: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "restored": 0, "executed": 0, "failed": 0}
+
+    def tool_fingerprint(self, tool: str) -> str:
+        """Identity of an executable from its resolved path and stat, without running it"""
+        with self._lock:
+            if tool in self._tools:
+                return self._tools[tool]
+        resolved = shutil.which(tool)
+        if resolved is None:
+            fingerprint = f"{tool}:missing"
+        else:
+            real = os.path.realpath(resolved)
+            info = os.stat(real)
+            fingerprint = f"{real}:{info.st_size}:{info.st_mtime_ns}"
+        with self._lock:
+            self._tools[tool] = fingerprint
+        return fingerprint
+
+    def step_key(self, step: BuildStep, project_path: Path, dep_keys: Sequence[str] = ()) -> str:
+        project_path = Path(project_path)
+        material = {"command": step.command, "outputs": step.outputs, "salt": step.salt,
+                    "tools": [self.tool_fingerprint(tool) for tool in step.tools], "deps": list(dep_keys)}
+        if step.inputs:
+            material["inputs"] = [
+                [name, self.hasher.digest(project_path / name) if (project_path / name).is_file() else
+                 "link:" + os.readlink(project_path / name)]
+                for name in iter_files(project_path)
+                if any(fnmatch.fnmatch(name, pattern) for pattern in step.inputs)
+            ]
+        material["files"] = [[name, self.hasher.digest(project_path / name)
+                              if (project_path / name).is_file() else None] for name in step.files]
+        return _sha256(json.dumps(material, sort_keys=True).encode("utf-8"))
+
+    def _action_path(self, key: str) -> Path:
+        return self.actions / f"{key}.json"
+
+    def _load_action(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._action_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        manifests = {}
+        for output, digest in record["outputs"].items():
+            data = self.store.get_bytes(digest) if digest else b"null"
+            if data is None:
+                return None
+            manifests[output] = json.loads(data)
+        record["manifests"] = manifests
+        return record
+
+    def _save_action(self, key: str, record: Dict[str, Any]):
+        path = self._action_path(key)
+        temp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        temp.write_text(json.dumps(record))
+        os.replace(temp, path)
+
+    def _execute(self, step: BuildStep, project_path: Path, dep_keys: List[str]) -> Tuple[Dict[str, Any], str]:
+        started = time.perf_counter()
+        result = {"step": step.name, "command": ' '.join(step.command), "cached": False}
+        key = self.step_key(step, project_path, dep_keys) if step.cacheable else ""
+        result["key"] = key[:16]
+
+        record = self._load_action(key) if key else None
+        if record is not None:
+            restored = False
+            for output, manifest in record["manifests"].items():
+                if manifest is not None and not self.store.matches(project_path, output, manifest):
+                    self.store.restore(project_path, output, manifest)
+                    restored = True
+            result.update(success=True, return_code=0, output=record["output"], error=record["error"],
+                          cached="restored" if restored else "hit", seconds=time.perf_counter() - started)
+            with self._lock:
+                self.stats["restored" if restored else "hits"] += 1
+            # Obnovljeni izhodi so lahko tudi vhodi; odvisni koraki vidijo ustaljen ključ
+            return result, self.step_key(step, project_path, dep_keys) if restored else key
+
+        try:
+            process = self.runner(step.command, project_path, step.timeout)
+            result.update(success=process.returncode == 0, return_code=process.returncode,
+                          output=(process.stdout or "")[-OUTPUT_LIMIT:], error=(process.stderr or "")[-OUTPUT_LIMIT:])
+        except subprocess.TimeoutExpired:
+            result.update(success=False, error="Command timed out")
+        except Exception as e:
+            result.update(success=False, error=str(e))
+
+        with self._lock:
+            self.stats["executed" if result["success"] else "failed"] += 1
+        if result["success"] and key:
+            outputs = {}
+            for output in step.outputs:
+                manifest = self.store.snapshot(project_path, output)
+                outputs[output] = self.store.put_bytes(json.dumps(manifest, sort_keys=True).encode("utf-8")) \
+                    if manifest is not None else None
+            action = {"step": step.name, "outputs": outputs, "output": result["output"], "error": result["error"]}
+            self._save_action(key, action)
+            # Korak lahko ustvari lastne vhode (npr. package-lock.json); zapis velja tudi za nov ključ
+            settled = self.step_key(step, project_path, dep_keys)
+            if settled != key:
+                self._save_action(settled, action)
+                key = settled
+        result["seconds"] = time.perf_counter() - started
+        return result, key
+
+    def run(self, steps: List[BuildStep], project_path: Union[str, Path]) -> List[Dict[str, Any]]:
+        """Run ``steps`` in dependency order, independent ones in parallel; results in declaration order"""
+        project_path = Path(project_path)
+        names = {step.name for step in steps}
+        for step in steps:
+            unknown = set(step.deps) - names
+            if unknown:
+                raise ValueError(f"Step {step.name!r} depends on unknown steps: {sorted(unknown)}")
+
+        pending = {step.name: step for step in steps}
+        results: Dict[str, Dict[str, Any]] = {}
+        keys: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mia-build") as pool:
+            running = {}
+            while pending or running:
+                for name, step in list(pending.items()):
+                    if not all(dep in results for dep in step.deps):
+                        continue
+                    del pending[name]
+                    failed = [dep for dep in step.deps if not results[dep]["success"]]
+                    if failed:
+                        results[name] = {"step": name, "command": ' '.join(step.command), "success": False,
+                                         "cached": False, "error": f"Dependency failed: {', '.join(failed)}"}
+                        continue
+                    future = pool.submit(self._execute, step, project_path, [keys[dep] for dep in step.deps])
+                    running[future] = name
+                if not running:
+                    if pending:
+                        raise ValueError(f"Dependency cycle between steps: {sorted(pending)}")
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name], keys[name] = future.result()
+        self.hasher.save()
+        return [results[step.name] for step in steps]
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"root": str(self.root), "actions": sum(1 for _ in self.actions.glob("*.json")),
+                "file_digests": self.hasher.stats, **self.stats}
+
+
+class VenvPool:
+    """Virtual environments shared between projects, keyed by requirements and interpreter"""
+
+    def __init__(self, root: Union[str, Path] = "mia_data/build_cache/venvs", python: str = sys.executable,
+                 with_pip: bool = True, pip_args: Sequence[str] = (), runner: Optional[Runner] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.python = python
+        self.with_pip = with_pip
+        self.pip_args = list(pip_args)
+        self.runner = runner or run_command
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "reused": 0}
+
+    def key(self, requirements: Optional[Path]) -> str:
+        content = requirements.read_bytes() if requirements and requirements.exists() else b""
+        real = os.path.realpath(self.python)
+        material = [content.decode("utf-8", "replace"), real, os.stat(real).st_size, self.with_pip, self.pip_args]
+        return _sha256(json.dumps(material).encode("utf-8"))[:24]
+
+    @staticmethod
+    def python_path(venv: Path) -> Path:
+        return venv / "Scripts" / "python.exe" if os.name == 'nt' else venv / "bin" / "python"
+
+    def pip_command(self, venv: Path) -> List[str]:
+        """pip invocation targeting ``venv``; without pip in the venv the host pip installs into it"""
+        if self.with_pip:
+            return [str(self.python_path(venv)), "-m", "pip"]
+        return [self.python, "-m", "pip", "--python", str(self.python_path(venv))]
+
+    def ensure(self, requirements: Optional[Path]) -> Tuple[Path, str, bool]:
+        """Shared venv for ``requirements``; returns (path, stamp, created)"""
+        key = self.key(requirements)
+        venv = self.root / key
+        marker = venv / ".mia-complete"
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if marker.exists():
+                self.stats["reused"] += 1
+                return venv, marker.read_text().strip(), False
+            if venv.exists():
+                shutil.rmtree(venv)
+            command = [self.python, "-m", "venv", str(venv)] + ([] if self.with_pip else ["--without-pip"])
+            self._check(command, self.root)
+            try:
+                if requirements and requirements.exists():
+                    self._check(self.pip_command(venv) + ["install", "-r", str(requirements.resolve())] +
+                                self.pip_args, requirements.parent)
+            except Exception:
+                shutil.rmtree(venv, ignore_errors=True)
+                raise
+            # Žig loči ponovno ustvarjeno okolje od prejšnjega z istim ključem
+            stamp = f"{key}-{uuid.uuid4().hex[:8]}"
+            marker.write_text(stamp)
+            self.stats["created"] += 1
+            return venv, stamp, True
+
+    def _check(self, command: List[str], cwd: Path):
+        process = self.runner(command, cwd, 600.0)
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command, process.stdout, process.stderr)
+
+    @staticmethod
+    def link(project_venv: Path, venv: Path) -> bool:
+        """Point ``project_venv`` at the shared venv; a real directory there is left alone"""
+        if project_venv.is_symlink():
+            if os.readlink(project_venv) == str(venv):
+                return True
+            project_venv.unlink()
+        elif project_venv.exists():
+            return False
+        os.symlink(venv, project_venv, target_is_directory=True)
+        return True
+
+
+def materialize_tree(store: ContentStore, source: Path, dest: Path, excludes: Sequence[str] = DEFAULT_EXCLUDES,
+                     keep: Iterable[str] = ()) -> Dict[str, Any]:
+    """Mirror ``source`` into ``dest`` with hardlinks from the store, touching only what changed"""
+    source, dest = Path(source), Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    wanted = set()
+    manifest = {}
+    stats = {"linked": 0, "unchanged": 0, "removed": 0}
+    for name in iter_files(source, excludes):
+        item = source / name
+        if item.is_symlink():
+            continue
+        digest, executable = store.put_file(item)
+        wanted.add(name)
+        manifest[name] = [digest, executable]
+        target = dest / name
+        try:
+            if os.stat(target).st_ino == os.stat(store.object_path(digest, executable)).st_ino:
+                stats["unchanged"] += 1
+                continue
+        except FileNotFoundError:
+            pass
+        store.link(digest, executable, target)
+        stats["linked"] += 1
+    keep = set(keep)
+    for name in iter_files(dest, excludes=()):
+        if name not in wanted and name not in keep:
+            (dest / name).unlink()
+            stats["removed"] += 1
+    store.hasher.save()
+    stats["digest"] = _sha256(json.dumps(manifest, sort_keys=True).encode("utf-8"))
+    stats["files"] = sorted(wanted)
+    return stats
+
+
+def write_archive(source: Path, archive_path: Path, digest: str, mtime: float = 0.0) -> bool:
+    """Deterministic tar.gz of ``source``; skipped when the tree digest is unchanged"""
+    stamp = archive_path.with_name(archive_path.name + ".digest")
+    if archive_path.exists() and stamp.exists() and stamp.read_text() == digest:
+        return False
+    temp = archive_path.with_name(f"{archive_path.name}.{uuid.uuid4().hex}.tmp")
+    with open(temp, 'wb') as raw:
+        with tarfile.open(fileobj=raw, mode="w:gz", compresslevel=6) as archive:
+            for name in iter_files(source, excludes=()):
+                info = archive.gettarinfo(str(source / name), arcname=f"./{name}")
+                info.mtime, info.uid, info.gid, info.uname, info.gname = mtime, 0, 0, "", ""
+                if info.isreg():
+                    info.mode = 0o755 if info.mode & stat.S_IXUSR else 0o644
+                    with open(source / name, 'rb') as f:
+                        archive.addfile(info, f)
+                else:
+                    archive.addfile(info)
+    os.replace(temp, archive_path)
+    stamp.write_text(digest)
+    return True
+
+
+PYTHON_INPUTS = ["*.py", "*.toml", "*.cfg", "*.ini", "requirements*.txt"]
+
+
+def plan_python_steps(project_path: Path, python: Path, pip: List[str], venv_stamp: str) -> List[BuildStep]:
+    """Steps after the shared venv is ready; every key includes the venv's stamp"""
+    steps = []
+    if (project_path / "tests").exists():
+        steps.append(BuildStep("Run tests", [str(python), "-m", "pytest", "tests/"], inputs=PYTHON_INPUTS,
+                               salt=venv_stamp, optional=True))
+    steps.append(BuildStep("Create distribution", pip + ["install", "build"], salt=venv_stamp, optional=True))
+    return steps
+
+
+def _local_package_files(package_json: Dict[str, Any]) -> List[str]:
+    files = []
+    for section in ("dependencies", "devDependencies"):
+        for spec in package_json.get(section, {}).values():
+            if isinstance(spec, str) and spec.startswith("file:") and Path(spec[5:]).suffix in (".tgz", ".tar"):
+                files.append(spec[5:])
+    return sorted(files)
+
+
+def plan_node_steps(project_path: Path, react: bool = False) -> List[BuildStep]:
+    """npm install, then tests and the production build in parallel"""
+    package_json = json.loads((project_path / "package.json").read_text())
+    scripts = package_json.get("scripts", {})
+    install = ["npm", "install", "--no-audit", "--no-fund"]
+    steps = [BuildStep("Install dependencies", install, inputs=["package.json", "package-lock.json", ".npmrc"],
+                       files=_local_package_files(package_json), outputs=["node_modules", "package-lock.json"],
+                       tools=["node", "npm"])]
+    if react or "test" in scripts:
+        command = ["npm", "test", "--", "--coverage", "--watchAll=false"] if react else ["npm", "test"]
+        steps.append(BuildStep("Run tests", command, inputs=["*"], tools=["node", "npm"],
+                               deps=["Install dependencies"], optional=True))
+    if react or "build" in scripts:
+        steps.append(BuildStep("Build for production" if react else "Build project", ["npm", "run", "build"],
+                               inputs=["*"], outputs=["build", "dist"], tools=["node", "npm"],
+                               deps=["Install dependencies"]))
+    return steps
+
+
+def _fixture_wheel(directory: Path, name: str, version: str) -> Path:
+    """Minimal pure-Python wheel so installs need no index"""
+    module = name.replace("-", "_")
+    dist_info = f"{module}-{version}.dist-info"
+    files = {
+        f"{module}/__init__.py": f"__version__ = {version!r}\n",
+        f"{dist_info}/METADATA": f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n",
+        f"{dist_info}/WHEEL": "Wheel-Version: 1.0\nGenerator: mia-fixture\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    record = "".join(f"{path},,\n" for path in files) + f"{dist_info}/RECORD,,\n"
+    path = directory / f"{module}-{version}-py3-none-any.whl"
+    with zipfile.ZipFile(path, "w") as wheel:
+        for archive_name, content in sorted(files.items()):
+            wheel.writestr(zipfile.ZipInfo(archive_name, (1980, 1, 1, 0, 0, 0)), content)
+        wheel.writestr(zipfile.ZipInfo(f"{dist_info}/RECORD", (1980, 1, 1, 0, 0, 0)), record)
+    return path
+
+
+def _fixture_npm_package(directory: Path, name: str, version: str, bin_name: Optional[str] = None) -> Path:
+    """npm tarball with an optional no-op executable, installable via a file: dependency"""
+    package = {"name": name, "version": version, "main": "index.js"}
+    files = {"package/index.js": f"module.exports = {{ name: {json.dumps(name)} }};\n"}
+    if bin_name:
+        package["bin"] = {bin_name: "bin.js"}
+        files["package/bin.js"] = "#!/usr/bin/env node\nprocess.exit(0);\n"
+    files["package/package.json"] = json.dumps(package, indent=2)
+    path = directory / f"{name}-{version}.tgz"
+    with tarfile.open(path, "w:gz") as archive:
+        for archive_name, content in sorted(files.items()):
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(archive_name)
+            info.size = len(data)
+            info.mode = 0o755 if archive_name.endswith("bin.js") else 0o644
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+def _fixture_projects(root: Path) -> Dict[str, Dict[str, Any]]:
+    """The built-in FastAPI and Express templates' file layout, resolved against local fixtures"""
+    wheels = root / "fixtures" / "wheels"
+    packages = root / "fixtures" / "npm"
+    wheels.mkdir(parents=True)
+    packages.mkdir(parents=True)
+
+    python_deps = [("fastapi", "0.104.0"), ("uvicorn", "0.24.0"), ("pydantic", "2.0.0"),
+                   ("python-multipart", "0.0.6"), ("python-jose", "3.3.0"), ("passlib", "1.7.4"), ("build", "1.0.0")]
+    for name, version in python_deps:
+        _fixture_wheel(wheels, name, version)
+    fastapi = root / "fastapi_app"
+    (fastapi / "src").mkdir(parents=True)
+    (fastapi / "src" / "main.py").write_text(
+        "from fastapi import FastAPI\n\napp = FastAPI()\n\n\n@app.get('/')\nasync def root():\n"
+        "    return {'message': 'ok'}\n")
+    (fastapi / "src" / "models.py").write_text("class Item:\n    name: str\n")
+    (fastapi / "src" / "routes.py").write_text("def get_status():\n    return {'status': 'ok'}\n")
+    (fastapi / "requirements.txt").write_text(
+        "".join(f"{name}>={version}\n" for name, version in python_deps if name != "build"))
+
+    node_deps = [("express", "4.18.0", None), ("cors", "2.8.5", None), ("helmet", "7.0.0", None),
+                 ("morgan", "1.10.0", None)]
+    dev_deps = [("nodemon", "3.0.0", "nodemon"), ("jest", "29.0.0", "jest"), ("eslint", "8.0.0", "eslint"),
+                ("supertest", "6.3.0", None)]
+    express = root / "express_app"
+    (express / "src" / "routes").mkdir(parents=True)
+
+    def spec(name, version, bin_name):
+        return f"file:{os.path.relpath(_fixture_npm_package(packages, name, version, bin_name), express)}"
+
+    package_json = {
+        "name": "express-app", "version": "1.0.0", "main": "src/app.js",
+        "scripts": {"start": "node src/app.js", "test": "jest", "lint": "eslint src/"},
+        "dependencies": {name: spec(name, version, bin_name) for name, version, bin_name in node_deps},
+        "devDependencies": {name: spec(name, version, bin_name) for name, version, bin_name in dev_deps},
+    }
+    (express / "package.json").write_text(json.dumps(package_json, indent=2))
+    (express / "src" / "app.js").write_text(
+        "const express = require('express');\nmodule.exports = express;\n")
+    (express / "src" / "routes" / "index.js").write_text("module.exports = {};\n")
+    return {"fastapi": {"path": fastapi, "wheels": wheels}, "express": {"path": express}}
+
+
+def benchmark_build_cache(workdir: Optional[Union[str, Path]] = None, rebuilds: int = 3) -> Dict[str, Any]:
+    """Cold build, no-op rebuild and fresh-checkout rebuild of the FastAPI and Express templates.
+
+    Dependencies come from generated local wheels and npm tarballs only.
+    ``uncached`` reruns every step the way BuildSystem did before the
+    cache; the shared venv is recreated each time for the same reason.
+    """
+    owned = workdir is None
+    root = Path(tempfile.mkdtemp(prefix="mia_build_bench_") if owned else workdir)
+    try:
+        projects = _fixture_projects(root)
+        cache = BuildCache(root / "cache")
+        venvs = VenvPool(root / "cache" / "venvs", with_pip=False,
+                         pip_args=["--no-index", "--find-links", str(projects["fastapi"]["wheels"]),
+                                   "--disable-pip-version-check", "-q"])
+        node_available = shutil.which("npm") is not None
+
+        def build(project: str, path: Path, use_cache: bool = True) -> Tuple[float, List[Dict[str, Any]]]:
+            started = time.perf_counter()
+            if project == "fastapi":
+                if not use_cache:
+                    shutil.rmtree(venvs.root / venvs.key(path / "requirements.txt"), ignore_errors=True)
+                venv, stamp, _ = venvs.ensure(path / "requirements.txt")
+                VenvPool.link(path / "venv", venv)
+                steps = plan_python_steps(path, VenvPool.python_path(venv), venvs.pip_command(venv), stamp)
+            else:
+                steps = plan_node_steps(path)
+            if not use_cache:
+                for step in steps:
+                    step.cacheable = False
+            results = cache.run(steps, path)
+            return time.perf_counter() - started, results
+
+        report = {"node_available": node_available}
+        for project, info in projects.items():
+            if project == "express" and not node_available:
+                continue
+            path = info["path"]
+            cold, cold_steps = build(project, path)
+            noop_runs = [build(project, path) for _ in range(rebuilds)]
+            checkout = root / f"{path.name}_checkout"
+            shutil.copytree(path, checkout, ignore=shutil.ignore_patterns(*DEFAULT_EXCLUDES, "package-lock.json"))
+            fresh, fresh_steps = build(project, checkout)
+            uncached, _ = build(project, path, use_cache=False)
+            report[project] = {
+                "cold_seconds": cold,
+                "uncached_rebuild_seconds": uncached,
+                "noop_rebuild_seconds": min(seconds for seconds, _ in noop_runs),
+                "fresh_checkout_seconds": fresh,
+                "cold_steps": {step["step"]: step["success"] for step in cold_steps},
+                "noop_steps": {step["step"]: step["cached"] for step in noop_runs[-1][1]},
+                "fresh_checkout_steps": {step["step"]: step["cached"] for step in fresh_steps},
+                "speedup": uncached / min(seconds for seconds, _ in noop_runs)
+            }
+
+        package_root = root / "packages"
+        source = projects["fastapi"]["path"]
+        started = time.perf_counter()
+        first = materialize_tree(cache.store, source, package_root / "fastapi_app")
+        write_archive(package_root / "fastapi_app", package_root / "fastapi_app.tar.gz", first["digest"])
+        first_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        again = materialize_tree(cache.store, source, package_root / "fastapi_app")
+        rewritten = write_archive(package_root / "fastapi_app", package_root / "fastapi_app.tar.gz", again["digest"])
+        report["packaging"] = {"first_seconds": first_seconds, "incremental_seconds": time.perf_counter() - started,
+                               "linked": first["linked"], "relinked": again["linked"],
+                               "archive_rewritten": rewritten}
+        report["venvs"] = venvs.stats
+        report["cache"] = cache.get_status()
+        return report
+    finally:
+        if owned:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_build_cache(), indent=2, default=str))
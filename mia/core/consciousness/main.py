@@ -16,7 +16,9 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 
-from ..memory.main import memory_system, MemoryType, EmotionalTone, store_memory
+from ..memory.main import get_memory_system, MemoryType, EmotionalTone, store_memory
+from .scheduler import CognitiveScheduler
+from mia.core.service_registry import lazy_services, service
 
 class ConsciousnessState(Enum):
 
@@ -106,6 +108,18 @@ class ConsciousnessModule:
         self.proactive_enabled = True
         self.initiative_threshold = 0.7
         
+        # Subsystem scheduling - deadlines per subsystem, user input triggers reactions
+        self.proactive_interval = 60  # seconds
+        self.emotional_refresh_interval = 60
+        self.thought_interval = 30
+        self.evaluation_interval = 60
+        self.evaluation_min_spacing = 5  # input bursts share one evaluation
+        self.save_interval = 300
+        self.save_coalesce_delay = 5  # seconds between a change and its (single) save
+        self.state_dirty = False
+        self.scheduler = CognitiveScheduler()
+        self._register_subsystems()
+        
         # Event handlers
         self.event_handlers = {}
         
@@ -195,49 +209,56 @@ class ConsciousnessModule:
         
         self.logger.info("Self-assessment completed")
     
+    def _register_subsystems(self):
+        """Register cognitive subsystems with their deadlines and triggers"""
+        self.scheduler.register("introspection", self._scheduled_introspection,
+                                interval=self.introspection_interval)
+        self.scheduler.register("proactive", self._scheduled_proactive_check,
+                                interval=self.proactive_interval)
+        self.scheduler.register("emotion", self._update_emotional_state,
+                                interval=self.emotional_refresh_interval, triggers=("user_input",))
+        self.scheduler.register("thoughts", self._process_thoughts,
+                                interval=self.thought_interval, triggers=("user_input",))
+        self.scheduler.register("evaluation", self._scheduled_evaluation,
+                                interval=self.evaluation_interval, triggers=("user_input",),
+                                min_spacing=self.evaluation_min_spacing)
+        self.scheduler.register("save", self._scheduled_save, interval=self.save_interval)
+    
+    async def _scheduled_introspection(self):
+        if self.introspection_enabled:
+            await self._introspect()
+            self.last_introspection = time.time()
+            self.mark_state_dirty()
+    
+    async def _scheduled_proactive_check(self):
+        if self.proactive_enabled:
+            await self._check_proactive_opportunities()
+    
+    async def _scheduled_evaluation(self):
+        if self.self_evaluation_enabled:
+            await self._evaluate_performance()
+    
+    def _scheduled_save(self):
+        """Save only if something changed since the last save"""
+        if self.state_dirty:
+            self.state_dirty = False
+            self._save_consciousness_state()
+    
+    def mark_state_dirty(self):
+        """Mark state as changed; bursts of changes coalesce into one save"""
+        self.state_dirty = True
+        self.scheduler.request("save", self.save_coalesce_delay)
+    
     async def _consciousness_loop(self):
-        """Main consciousness processing loop"""
-        while True:
-            try:
-                current_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
-                
-                # Introspection cycle
-                if (self.introspection_enabled and 
-                    current_time - self.last_introspection > self.introspection_interval):
-                    await self._introspect()
-                    self.last_introspection = current_time
-                
-                # Proactive behavior check
-                if self.proactive_enabled:
-                    await self._check_proactive_opportunities()
-                
-                # Update emotional state
-                await self._update_emotional_state()
-                
-                # Process active thoughts
-                await self._process_thoughts()
-                
-                # Self-evaluation
-                if self.self_evaluation_enabled:
-                    await self._evaluate_performance()
-                
-                # Save state periodically
-                if current_time % 300 < 1:  # Every 5 minutes
-                    self._save_consciousness_state()
-                
-                # Sleep briefly to prevent overwhelming
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                self.logger.error(f"Error in consciousness loop: {e}")
-                await asyncio.sleep(5)
+        """Main consciousness processing loop - sleeps until the next subsystem deadline or trigger"""
+        await self.scheduler.run()
     
     async def _introspect(self):
         """Perform introspective analysis"""
         self.consciousness_state = ConsciousnessState.INTROSPECTIVE
         
         # Analyze recent memories
-        recent_memories = memory_system.get_context_for_conversation(limit=10)
+        recent_memories = get_memory_system().get_context_for_conversation(limit=10)
         
         # Analyze patterns in interactions
         interaction_patterns = self._analyze_interaction_patterns(recent_memories)
@@ -330,7 +351,7 @@ class ConsciousnessModule:
         """Check for opportunities to take proactive action"""
         
         # Check if user seems inactive
-        recent_memories = memory_system.get_context_for_conversation(limit=5)
+        recent_memories = get_memory_system().get_context_for_conversation(limit=5)
         if not recent_memories or (self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200 - recent_memories[0].timestamp > 1800):  # 30 minutes
             
             if self._get_deterministic_random() if hasattr(self, "_get_deterministic_random") else 0.5 < 0.1:  # 10% chance
@@ -381,7 +402,7 @@ class ConsciousnessModule:
         """Update current emotional state based on context"""
         
         # Get recent context
-        recent_memories = memory_system.get_context_for_conversation(limit=3)
+        recent_memories = get_memory_system().get_context_for_conversation(limit=3)
         
         if not recent_memories:
             self.emotional_state = EmotionalState.NEUTRAL
@@ -461,7 +482,7 @@ class ConsciousnessModule:
         """Evaluate recent performance and adjust accordingly"""
         
         # Simple performance metrics
-        recent_memories = memory_system.get_context_for_conversation(limit=20)
+        recent_memories = get_memory_system().get_context_for_conversation(limit=20)
         
         if recent_memories:
             # Calculate average importance of recent memories
@@ -522,6 +543,10 @@ class ConsciousnessModule:
         # Update personality traits based on interaction
         self._adapt_personality(user_input, context)
         
+        # Wake subsystems that react to input; state save is coalesced
+        self.scheduler.trigger("user_input")
+        self.mark_state_dirty()
+        
         # Generate response context
         # Handle both enum and string consciousness states for Enterprise compatibility
         consciousness_state_value = self.consciousness_state.value if hasattr(self.consciousness_state, 'value') else self.consciousness_state
@@ -658,6 +683,7 @@ class ConsciousnessModule:
         self.logger.info("🧠 Consciousness shutting down...")
         
         # Cancel consciousness loop
+        self.scheduler.stop()
         if self.consciousness_task:
             self.consciousness_task.cancel()
         
@@ -879,6 +905,7 @@ class ConsciousnessModule:
         """Stop consciousness loop - Enterprise API compatibility"""
         try:
             self.consciousness_active = False
+            self.scheduler.stop()
             
             if hasattr(self, '_consciousness_task') and self._consciousness_task:
                 self._consciousness_task.cancel()
@@ -986,4 +1013,6 @@ class ConsciousnessModule:
             return {"error": "Self-identity model not available"}
 
 # Global consciousness instance for system integration
-consciousness = ConsciousnessModule()
+__getattr__ = lazy_services(
+    __name__, consciousness=service(ConsciousnessModule, depends_on=["mia.core.memory.main.memory_system"])
+)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+MIA Cognitive Scheduler
+Deadline-driven scheduling of consciousness subsystems: each subsystem runs
+when its interval elapses or when an event it listens to is triggered, and
+the loop sleeps until the earliest deadline instead of polling.
+"""
+
+import asyncio
+import heapq
+import inspect
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("MIA.Consciousness.Scheduler")
+
+
+@dataclass
+class ScheduledSubsystem:
+    """A cognitive subsystem with its own deadline"""
+    name: str
+    callback: Callable[[], Any]
+    interval: Optional[float]  # None = runs only when triggered or requested
+    triggers: Tuple[str, ...]
+    min_spacing: float  # Lower bound between two runs, coalesces bursts of triggers
+    deadline: Optional[float] = None
+    last_run: Optional[float] = None
+    generation: int = 0
+    runs: int = 0
+    errors: int = 0
+
+
+@dataclass
+class SchedulerStats:
+    """Counters for measuring scheduling overhead"""
+    wakeups: int = 0
+    triggers: int = 0
+    runs: Dict[str, int] = field(default_factory=dict)
+    started_at: Optional[float] = None
+
+    def wakeups_per_minute(self, now: float) -> float:
+        if self.started_at is None or now <= self.started_at:
+            return 0.0
+        return self.wakeups * 60.0 / (now - self.started_at)
+
+
+class CognitiveScheduler:
+    """Heap of per-subsystem deadlines with event triggers.
+
+    ``trigger(event)`` pulls every subscribed subsystem's deadline forward to
+    now (respecting ``min_spacing``) and wakes the loop, so reaction latency
+    is bounded by the subsystems' own run time rather than a polling period.
+    ``request(name, delay)`` schedules a one-off run no later than ``delay``
+    from now; repeated requests coalesce into the earliest pending one.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.subsystems: Dict[str, ScheduledSubsystem] = {}
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._sequence = 0
+        self._subscribers: Dict[str, List[str]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.running = False
+        self.stats = SchedulerStats()
+
+    def register(self, name: str, callback: Callable[[], Any], interval: Optional[float] = None,
+                 triggers: Iterable[str] = (), min_spacing: float = 0.0, run_immediately: bool = False):
+        """Register a subsystem; callback may be a plain function or a coroutine function"""
+        subsystem = ScheduledSubsystem(name, callback, interval, tuple(triggers), min_spacing)
+        self.subsystems[name] = subsystem
+        for event in subsystem.triggers:
+            self._subscribers.setdefault(event, []).append(name)
+        now = self.clock()
+        if run_immediately:
+            self._set_deadline(subsystem, now)
+        elif interval is not None:
+            self._set_deadline(subsystem, now + interval)
+
+    def _set_deadline(self, subsystem: ScheduledSubsystem, deadline: float):
+        """Replace the subsystem's deadline; stale heap entries are skipped by generation"""
+        subsystem.generation += 1
+        subsystem.deadline = deadline
+        self._sequence += 1
+        heapq.heappush(self._heap, (deadline, self._sequence, subsystem.name, subsystem.generation))
+
+    def _earliest_allowed(self, subsystem: ScheduledSubsystem, now: float) -> float:
+        if subsystem.last_run is None:
+            return now
+        return max(now, subsystem.last_run + subsystem.min_spacing)
+
+    def _notify(self):
+        if self._wakeup is None or self._loop is None:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._wakeup.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def trigger(self, event: str) -> int:
+        """Mark subsystems listening to event as due; safe to call from any thread"""
+        with self._lock:
+            now = self.clock()
+            self.stats.triggers += 1
+            woken = 0
+            for name in self._subscribers.get(event, ()):
+                subsystem = self.subsystems[name]
+                due = self._earliest_allowed(subsystem, now)
+                if subsystem.deadline is None or due < subsystem.deadline:
+                    self._set_deadline(subsystem, due)
+                    woken += 1
+        if woken:
+            self._notify()
+        return woken
+
+    def request(self, name: str, delay: float = 0.0):
+        """Run subsystem within delay seconds; an earlier pending deadline is kept"""
+        with self._lock:
+            subsystem = self.subsystems[name]
+            due = max(self.clock() + delay, self._earliest_allowed(subsystem, self.clock()))
+            if subsystem.deadline is None or due < subsystem.deadline:
+                self._set_deadline(subsystem, due)
+            else:
+                return
+        self._notify()
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest live deadline, discarding stale heap entries; caller holds _lock"""
+        heap = self._heap
+        while heap:
+            deadline, _, name, generation = heap[0]
+            subsystem = self.subsystems.get(name)
+            if subsystem is not None and subsystem.generation == generation:
+                return deadline
+            heapq.heappop(heap)
+        return None
+
+    def _pop_due(self, now: float) -> List[ScheduledSubsystem]:
+        due = []
+        with self._lock:
+            while True:
+                deadline = self.next_deadline()
+                if deadline is None or deadline > now:
+                    break
+                _, _, name, _ = heapq.heappop(self._heap)
+                subsystem = self.subsystems[name]
+                subsystem.deadline = None
+                due.append(subsystem)
+        return due
+
+    async def _run_subsystem(self, subsystem: ScheduledSubsystem):
+        try:
+            result = subsystem.callback()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            subsystem.errors += 1
+            logger.error(f"Error in cognitive subsystem {subsystem.name}: {e}")
+        finally:
+            now = self.clock()
+            subsystem.last_run = now
+            subsystem.runs += 1
+            self.stats.runs[subsystem.name] = subsystem.runs
+            if subsystem.interval is not None:
+                with self._lock:
+                    next_deadline = now + subsystem.interval
+                    if subsystem.deadline is None or next_deadline < subsystem.deadline:
+                        self._set_deadline(subsystem, next_deadline)
+
+    async def run_due(self) -> int:
+        """Run every subsystem whose deadline has passed; returns how many ran"""
+        due = self._pop_due(self.clock())
+        for subsystem in due:
+            await self._run_subsystem(subsystem)
+        return len(due)
+
+    async def run(self):
+        """Scheduler loop: sleep until the next deadline or trigger, then run what is due"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.running = True
+        self.stats.started_at = self.clock()
+        try:
+            while self.running:
+                await self.run_due()
+                self._wakeup.clear()
+                # A trigger may have arrived while subsystems were running
+                with self._lock:
+                    deadline = self.next_deadline()
+                now = self.clock()
+                if deadline is not None and deadline <= now:
+                    continue
+                timeout = None if deadline is None else deadline - now
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self.stats.wakeups += 1
+        finally:
+            self.running = False
+
+    def stop(self):
+        self.running = False
+        self._notify()
@@ -1,13 +1,23 @@
 #!/usr/bin/env python3
 """
 Deterministic Scheduler
+Naloge se izvajajo vzporedno na N delavcih, rezultati pa se potrdijo v
+kanoničnem zaporedju (priority, order), zato je hash izvajanja enak kot
+pri izvajanju na eni niti
 """
 
+import hashlib
+import heapq
+import json
+import logging
 import threading
 import time
-from typing import Callable, Any, List, Dict
-from queue import PriorityQueue
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("MIA.DeterministicScheduler")
+
 
 @dataclass
 class DeterministicTask:
@@ -18,100 +28,260 @@ class DeterministicTask:
     function: Callable
     args: tuple
     kwargs: dict
+    reads: FrozenSet[str] = frozenset()
+    writes: FrozenSet[str] = frozenset()
+    depends_on: FrozenSet[str] = frozenset()
+    # Undeclared tasks may touch anything, so they run alone in canonical order
+    exclusive: bool = True
+
+    def conflicts_with(self, earlier: "DeterministicTask") -> bool:
+        """Whether this task must wait for ``earlier`` to finish"""
+        if self.exclusive or earlier.exclusive or earlier.task_id in self.depends_on:
+            return True
+        return bool(earlier.writes & (self.reads | self.writes) or self.writes & earlier.reads)
+
+
+@dataclass
+class _Slot:
+    """Admitted task with its canonical sequence number"""
+    sequence: int
+    task: DeterministicTask
+    started: bool = False
+    finished: bool = False
+    entry: Dict[str, Any] = field(default_factory=dict)
+
 
 class DeterministicScheduler:
-    """Deterministični scheduler"""
-    
-    def __init__(self, deterministic_seed: int = 42):
+    """Deterministični scheduler.
+
+    Tasks are admitted in (priority, order) sequence into a bounded window.
+    A worker may start an admitted task once every earlier unfinished task
+    it conflicts with (declared ``reads``/``writes`` keys, ``depends_on``
+    ids, or an undeclared task) has finished; results are committed in
+    admission order. For tasks scheduled before execution starts this gives
+    the same execution order and hash for any number of workers. Workers
+    are threads: I/O-bound tasks overlap, CPU-bound tasks only scale when
+    they release the GIL (hashlib, zlib, numpy).
+    """
+
+    def __init__(self, deterministic_seed: int = 42, workers: int = 1, result_retention: int = 1000,
+                 window: Optional[int] = None):
         self.deterministic_seed = deterministic_seed
-        self.task_queue = PriorityQueue()
-        self.execution_order = []
+        self.workers = max(1, workers)
+        self.window = window or max(16, self.workers * 4)
         self.task_counter = 0
         self.running = False
-        self.worker_thread = None
-        
-    def schedule_task(self, function: Callable, priority: int = 0, *args, **kwargs) -> str:
-        """Razporedi nalogo deterministično"""
-        task_id = f"task_{self.task_counter}_{self.deterministic_seed}"
-        
-        task = DeterministicTask(
-            priority=priority,
-            order=self.task_counter,
-            task_id=task_id,
-            function=function,
-            args=args,
-            kwargs=kwargs
-        )
-        
-        # Dodaj v priority queue (deterministični vrstni red)
-        self.task_queue.put((priority, self.task_counter, task))
-        self.task_counter += 1
-        
+        self.worker_threads: List[threading.Thread] = []
+
+        # Zadnji potrjeni rezultati; hash se računa sproti
+        self.execution_order: Deque[Dict[str, Any]] = deque(maxlen=result_retention)
+        self.committed_count = 0
+        self._hasher = hashlib.sha256(b'{"execution_order":[')
+
+        self._pending: List[Tuple[int, int, DeterministicTask]] = []
+        self._admitted: "OrderedDict[int, _Slot]" = OrderedDict()
+        self._next_sequence = 0
+        self._active = 0
+        self._condition = threading.Condition()
+
+    @property
+    def worker_thread(self) -> Optional[threading.Thread]:
+        """First worker, for callers of the single-thread scheduler"""
+        return self.worker_threads[0] if self.worker_threads else None
+
+    def schedule_task(self, function: Callable, priority: int = 0, *args,
+                      reads: Optional[Iterable[str]] = None, writes: Optional[Iterable[str]] = None,
+                      depends_on: Optional[Iterable[str]] = None, **kwargs) -> str:
+        """Razporedi nalogo deterministično.
+
+        ``reads``/``writes`` name the shared state the task touches and
+        ``depends_on`` lists task ids it must follow; a task that declares
+        none of them is treated as touching everything.
+        """
+        with self._condition:
+            task_id = f"task_{self.task_counter}_{self.deterministic_seed}"
+            declared = reads is not None or writes is not None or depends_on is not None
+            task = DeterministicTask(
+                priority=priority,
+                order=self.task_counter,
+                task_id=task_id,
+                function=function,
+                args=args,
+                kwargs=kwargs,
+                reads=frozenset(reads or ()),
+                writes=frozenset(writes or ()),
+                depends_on=frozenset(depends_on or ()),
+                exclusive=not declared
+            )
+
+            # Dodaj v kopico (deterministični vrstni red)
+            heapq.heappush(self._pending, (priority, self.task_counter, task))
+            self.task_counter += 1
+            self._condition.notify_all()
+
         return task_id
-    
+
     def start_deterministic_execution(self):
         """Začni deterministično izvajanje"""
-        if not self.running:
+        with self._condition:
+            if self.running:
+                return
             self.running = True
-            self.worker_thread = threading.Thread(target=self._execute_tasks_deterministic)
-            self.worker_thread.daemon = True
-            self.worker_thread.start()
-    
+            self.worker_threads = [
+                threading.Thread(target=self._execute_tasks_deterministic, name=f"mia-scheduler-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+        for thread in self.worker_threads:
+            thread.start()
+
+    def _admit(self):
+        """Move pending tasks into the window in canonical order"""
+        while self._pending and len(self._admitted) < self.window:
+            _, _, task = heapq.heappop(self._pending)
+            self._admitted[self._next_sequence] = _Slot(self._next_sequence, task)
+            self._next_sequence += 1
+
+    def _next_runnable(self) -> Optional[_Slot]:
+        self._admit()
+        unfinished: List[DeterministicTask] = []
+        for slot in self._admitted.values():
+            if not slot.started and not any(slot.task.conflicts_with(earlier) for earlier in unfinished):
+                return slot
+            if not slot.finished:
+                unfinished.append(slot.task)
+                if slot.task.exclusive:
+                    # Nothing after an unfinished exclusive task can start
+                    return None
+        return None
+
     def _execute_tasks_deterministic(self):
         """Izvajaj naloge deterministično"""
-        while self.running:
+        while True:
+            with self._condition:
+                slot = None
+                while self.running:
+                    slot = self._next_runnable()
+                    if slot is not None:
+                        break
+                    self._condition.wait()
+                if slot is None:
+                    return
+                slot.started = True
+                self._active += 1
+
+            task = slot.task
+            entry: Dict[str, Any] = {"task_id": task.task_id, "priority": task.priority, "order": task.order}
             try:
-                if not self.task_queue.empty():
-                    priority, order, task = self.task_queue.get(timeout=1)
-                    
-                    # Izvedi nalogo
-                    try:
-                        result = task.function(*task.args, **task.kwargs)
-                        self.execution_order.append({
-                            "task_id": task.task_id,
-                            "priority": priority,
-                            "order": order,
-                            "result": str(result)[:100]  # Omeji dolžino
-                        })
-                    except Exception as e:
-                        self.execution_order.append({
-                            "task_id": task.task_id,
-                            "priority": priority,
-                            "order": order,
-                            "error": str(e)
-                        })
-                    
-                    self.task_queue.task_done()
-                else:
-                    time.sleep(0.01)  # Kratka pavza
-                    
+                entry["result"] = str(task.function(*task.args, **task.kwargs))[:100]  # Omeji dolžino
             except Exception as e:
-                # Ignoriraj timeout napake
-                self.logger.debug(f"Scheduler exception: {e}")
-                continue
-        
-        # Return execution summary
-        return {
-            "executed_tasks": len([t for t in self.tasks if t.get("executed", False)]),
-            "total_tasks": len(self.tasks),
-            "status": "completed" if not self.running else "running"
-        }
+                logger.debug(f"Task {task.task_id} failed: {e}")
+                entry["error"] = str(e)
+
+            with self._condition:
+                slot.entry = entry
+                slot.finished = True
+                self._active -= 1
+                self._commit()
+                self._condition.notify_all()
+
+    def _commit(self):
+        """Potrdi končane naloge v kanoničnem zaporedju"""
+        while self._admitted:
+            sequence, slot = next(iter(self._admitted.items()))
+            if not slot.finished:
+                break
+            del self._admitted[sequence]
+            encoded = json.dumps(slot.entry, sort_keys=True, separators=(',', ':'))
+            self._hasher.update(((',' if self.committed_count else '') + encoded).encode())
+            self.committed_count += 1
+            self.execution_order.append(slot.entry)
+
+    def wait_until_complete(self, timeout: Optional[float] = None) -> bool:
+        """Block until every scheduled task is committed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._admitted:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
     def stop_execution(self):
         """Ustavi izvajanje"""
-        self.running = False
-        if self.worker_thread:
-            self.worker_thread.join(timeout=5)
-    
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+        for thread in self.worker_threads:
+            thread.join(timeout=5)
+        self.worker_threads = []
+
     def get_execution_hash(self) -> str:
-        """Pridobi hash izvajanja"""
-        import hashlib
-        import json
-        
-        execution_data = {
-            "execution_order": self.execution_order,
-            "seed": self.deterministic_seed,
-            "task_count": self.task_counter
+        """Pridobi hash izvajanja.
+
+        Same digest as hashing the JSON of the full execution order, seed
+        and task count, without keeping the full order in memory.
+        """
+        with self._condition:
+            hasher = self._hasher.copy()
+            suffix = f'],"seed":{json.dumps(self.deterministic_seed)},"task_count":{self.task_counter}}}'
+        hasher.update(suffix.encode())
+        return hasher.hexdigest()
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "running": self.running,
+                "workers": self.workers,
+                "scheduled": self.task_counter,
+                "committed": self.committed_count,
+                "pending": len(self._pending),
+                "in_window": len(self._admitted),
+                "active": self._active,
+                "retained_results": len(self.execution_order)
+            }
+
+
+def _run_mix(workers: int, tasks: List[Tuple[Callable, dict]], seed: int = 42) -> Tuple[str, float]:
+    scheduler = DeterministicScheduler(seed, workers=workers)
+    for function, declared in tasks:
+        scheduler.schedule_task(function, 0, **declared)
+    started = time.perf_counter()
+    scheduler.start_deterministic_execution()
+    scheduler.wait_until_complete()
+    elapsed = time.perf_counter() - started
+    scheduler.stop_execution()
+    return scheduler.get_execution_hash(), elapsed
+
+
+def benchmark_scheduler(n_tasks: int = 64, workers: int = 4, io_seconds: float = 0.01,
+                        cpu_bytes: int = 4 * 1024 * 1024) -> Dict[str, Any]:
+    """Speedup of N workers over one on I/O-bound and GIL-releasing CPU-bound tasks"""
+    payload = bytes(range(256)) * (cpu_bytes // 256)
+
+    def io_task(i):
+        time.sleep(io_seconds)
+        return i
+
+    def cpu_task(i):
+        return hashlib.sha256(payload + str(i).encode()).hexdigest()
+
+    mixes = {
+        "io_bound": [(lambda i=i: io_task(i), {"writes": [f"io_{i}"]}) for i in range(n_tasks)],
+        "cpu_bound": [(lambda i=i: cpu_task(i), {"writes": [f"cpu_{i}"]}) for i in range(n_tasks)],
+    }
+    results: Dict[str, Any] = {"tasks": n_tasks, "workers": workers}
+    for name, tasks in mixes.items():
+        serial_hash, serial = _run_mix(1, tasks)
+        parallel_hash, parallel = _run_mix(workers, tasks)
+        results[name] = {
+            "serial_seconds": serial,
+            "parallel_seconds": parallel,
+            "speedup": serial / parallel if parallel > 0 else 0.0,
+            "hash_identical": serial_hash == parallel_hash,
         }
-        
-        data_str = json.dumps(execution_data, sort_keys=True, separators=(',', ':'))
-        return hashlib.sha256(data_str.encode()).hexdigest()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_scheduler(), indent=2))
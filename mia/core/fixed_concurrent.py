@@ -7,6 +7,7 @@ import concurrent.futures
 import threading
 import multiprocessing
 from typing import Any, Callable, List, Optional
+from mia.core.service_registry import lazy_services
 
 class FixedConcurrentProcessor:
     """Fixed concurrent processing implementation"""
@@ -48,4 +49,4 @@ class FixedConcurrentProcessor:
             return False
 
 # Global instance
-concurrent_processor = FixedConcurrentProcessor()
+__getattr__ = lazy_services(__name__, concurrent_processor=FixedConcurrentProcessor)
@@ -8,17 +8,18 @@ import os
 import json
 import logging
 import time
-import psutil
 import platform
-import subprocess
 import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
-import glob
 import hashlib
 
+from mia.core.hardware_profile import get_hardware_profile
+from mia.core.telemetry import get_telemetry
+from mia.core.service_registry import lazy_services
+
 class HardwareType(Enum):
     """Types of hardware components"""
     CPU = "cpu"
@@ -189,263 +190,60 @@ class HardwareOptimizer:
             self._create_fallback_profile()
     
     def _detect_cpu(self) -> Dict[str, Any]:
-        """Detect CPU specifications"""
-        try:
-            cpu_info = {
-                "cores": psutil.cpu_count(logical=False),
-                "logical_cores": psutil.cpu_count(logical=True),
-                "frequency": 0.0,
-                "architecture": platform.machine(),
-                "model": "Unknown"
-            }
-            
-            # Get CPU frequency
-            freq_info = psutil.cpu_freq()
-            if freq_info:
-                cpu_info["frequency"] = freq_info.max or freq_info.current or 2000.0
-            else:
-                cpu_info["frequency"] = 2000.0  # Default assumption
-            
-            # Try to get CPU model
-            try:
-                if platform.system() == "Linux":
-                    with open("/proc/cpuinfo", "r") as f:
-                        for line in f:
-                            if "model name" in line:
-                                cpu_info["model"] = line.split(":")[1].strip()
-                                break
-                elif platform.system() == "Darwin":  # macOS
-                    result = subprocess.run(
-                        ["sysctl", "-n", "machdep.cpu.brand_string"],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    if result.returncode == 0:
-                        cpu_info["model"] = result.stdout.strip()
-                elif platform.system() == "Windows":
-                    result = subprocess.run(
-                        ["wmic", "cpu", "get", "name"],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    if result.returncode == 0:
-                        lines = result.stdout.strip().split('\n')
-                        if len(lines) > 1:
-                            cpu_info["model"] = lines[1].strip()
-            except Exception as e:
-                self.logger.debug(f"CPU model detection failed: {e}")
-                
-            return cpu_info
-            
-        except Exception as e:
-            self.logger.error(f"Failed to detect CPU: {e}")
-            return {
-                "cores": 4, "logical_cores": 8, "frequency": 2000.0,
-                "architecture": "unknown", "model": "Unknown CPU"
-            }
+        """CPU specifications from the cached hardware profile"""
+        profile = get_hardware_profile()
+        return {
+            "cores": profile.cpu_physical_cores,
+            "logical_cores": profile.cpu_logical_cores,
+            "frequency": profile.cpu_frequency_mhz,
+            "architecture": profile.cpu_architecture or platform.machine(),
+            "model": profile.cpu_model
+        }
     
     def _detect_memory(self) -> Dict[str, Any]:
-        """Detect memory specifications"""
-        try:
-            memory = psutil.virtual_memory()
-            
-            memory_info = {
-                "total_gb": memory.total / (1024**3),
-                "available_gb": memory.available / (1024**3),
-                "used_gb": memory.used / (1024**3),
-                "percent_used": memory.percent,
-                "type": "Unknown"
-            }
-            
-            # Try to detect memory type (DDR3, DDR4, etc.)
-            try:
-                if platform.system() == "Linux":
-                    # Try dmidecode
-                    result = subprocess.run(
-                        ["sudo", "dmidecode", "--type", "memory"],
-                        capture_output=True, text=True, timeout=10
-                    )
-                    if result.returncode == 0 and "DDR" in result.stdout:
-                        if "DDR4" in result.stdout:
-                            memory_info["type"] = "DDR4"
-                        elif "DDR3" in result.stdout:
-                            memory_info["type"] = "DDR3"
-                        elif "DDR5" in result.stdout:
-                            memory_info["type"] = "DDR5"
-            except Exception as e:
-                self.logger.debug(f"Memory type detection failed: {e}")
-                
-            return memory_info
-            
-        except Exception as e:
-            self.logger.error(f"Failed to detect memory: {e}")
-            return {
-                "total_gb": 8.0, "available_gb": 4.0, "used_gb": 4.0,
-                "percent_used": 50.0, "type": "Unknown"
-            }
+        """Memory specifications; usage comes from the shared telemetry sampler"""
+        profile = get_hardware_profile()
+        snapshot = get_telemetry().latest()
+        gb = 1024**3
+        return {
+            "total_gb": snapshot.memory_total / gb if snapshot.memory_total else profile.ram_total_gb,
+            "available_gb": snapshot.memory_available / gb,
+            "used_gb": snapshot.memory_used / gb,
+            "percent_used": snapshot.memory_percent,
+            "type": profile.memory_type
+        }
     
     def _detect_gpu(self) -> Dict[str, Any]:
-        """Detect GPU specifications"""
-        try:
-            gpu_info = {
-                "available": False,
-                "memory_gb": 0.0,
-                "model": "None",
-                "driver_version": "Unknown",
-                "compute_capability": None
-            }
-            
-            # Try NVIDIA GPU detection
-            try:
-                result = subprocess.run(
-                    ["nvidia-smi", "--query-gpu=name,memory.total,driver_version", 
-                     "--format=csv,noheader,nounits"],
-                    capture_output=True, text=True, timeout=10
-                )
-                
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')
-                    if lines and lines[0]:
-                        parts = lines[0].split(', ')
-                        if len(parts) >= 3:
-                            gpu_info["available"] = True
-                            gpu_info["model"] = parts[0].strip()
-                            gpu_info["memory_gb"] = float(parts[1]) / 1024
-                            gpu_info["driver_version"] = parts[2].strip()
-                
-                # Try to get compute capability
-                try:
-                    result = subprocess.run(
-                        ["nvidia-smi", "--query-gpu=compute_cap", "--format=csv,noheader"],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    if result.returncode == 0:
-                        gpu_info["compute_capability"] = result.stdout.strip()
-                except Exception as e:
-                    self.logger.debug(f"Failed to get NVIDIA compute capability: {e}")
-            
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                self.logger.debug("NVIDIA tools not available")
-            if not gpu_info["available"]:
-                try:
-                    result = subprocess.run(
-                        ["rocm-smi", "--showproductname", "--showmeminfo", "vram"],
-                        capture_output=True, text=True, timeout=10
-                    )
-                    if result.returncode == 0:
-                        gpu_info["available"] = True
-                        gpu_info["model"] = "AMD GPU"
-                        # Parse AMD GPU memory (simplified)
-                        if "Total VRAM" in result.stdout:
-                            # Extract memory size (this is a simplified parser)
-                            gpu_info["memory_gb"] = 8.0  # Default assumption
-                except (subprocess.TimeoutExpired, FileNotFoundError):
-                    self.logger.debug("AMD ROCm tools not available")
-            if not gpu_info["available"]:
-                try:
-                    # Check for Intel integrated graphics
-                    if platform.system() == "Linux":
-                        gpu_devices = glob.glob("/sys/class/drm/card*/device/vendor")
-                        for device in gpu_devices:
-                            with open(device, 'r') as f:
-                                vendor_id = f.read().strip()
-                                if vendor_id == "0x8086":  # Intel vendor ID
-                                    gpu_info["available"] = True
-                                    gpu_info["model"] = "Intel Integrated Graphics"
-                                    gpu_info["memory_gb"] = 2.0  # Shared memory assumption
-                                    break
-                except Exception as e:
-                    self.logger.debug(f"GPU detection failed: {e}")
-                    
-            return gpu_info
-            
-        except Exception as e:
-            self.logger.error(f"Failed to detect GPU: {e}")
-            return {
-                "available": False, "memory_gb": 0.0, "model": "None",
-                "driver_version": "Unknown", "compute_capability": None
-            }
+        """GPU specifications from the cached hardware profile"""
+        profile = get_hardware_profile()
+        return {
+            "available": profile.gpu_available,
+            "memory_gb": profile.gpu_memory_gb,
+            "model": profile.gpu_model,
+            "driver_version": profile.gpu_driver_version,
+            "compute_capability": profile.gpu_compute_capability
+        }
     
     def _detect_storage(self) -> Dict[str, Any]:
-        """Detect storage specifications"""
-        try:
-            # Get disk usage
-            disk_usage = psutil.disk_usage('/')
-            
-            storage_info = {
-                "total_gb": disk_usage.total / (1024**3),
-                "free_gb": disk_usage.free / (1024**3),
-                "used_gb": disk_usage.used / (1024**3),
-                "percent_used": (disk_usage.used / disk_usage.total) * 100,
-                "type": "Unknown"
-            }
-            
-            # Try to detect storage type (SSD vs HDD)
-            try:
-                if platform.system() == "Linux":
-                    # Check for SSD indicators
-                    result = subprocess.run(
-                        ["lsblk", "-d", "-o", "name,rota"],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    if result.returncode == 0:
-                        lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                        for line in lines:
-                            parts = line.split()
-                            if len(parts) >= 2 and parts[1] == "0":
-                                storage_info["type"] = "SSD"
-                                break
-                        else:
-                            storage_info["type"] = "HDD"
-                elif platform.system() == "Darwin":  # macOS
-                    # Most modern Macs have SSDs
-                    storage_info["type"] = "SSD"
-                elif platform.system() == "Windows":
-                    # Try to detect via WMI
-                    result = subprocess.run(
-                        ["wmic", "diskdrive", "get", "mediatype"],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    if result.returncode == 0 and "SSD" in result.stdout:
-                        storage_info["type"] = "SSD"
-                    else:
-                        storage_info["type"] = "HDD"
-            except:
-                # Default assumption for modern systems
-                storage_info["type"] = "SSD"
-            
-            return storage_info
-            
-        except Exception as e:
-            self.logger.error(f"Failed to detect storage: {e}")
-            return {
-                "total_gb": 100.0, "free_gb": 50.0, "used_gb": 50.0,
-                "percent_used": 50.0, "type": "Unknown"
-            }
+        """Storage specifications; usage comes from the shared telemetry sampler"""
+        snapshot = get_telemetry().latest()
+        gb = 1024**3
+        return {
+            "total_gb": snapshot.disk_total / gb,
+            "free_gb": snapshot.disk_free / gb,
+            "used_gb": snapshot.disk_used / gb,
+            "percent_used": snapshot.disk_percent,
+            "type": get_hardware_profile().storage_type
+        }
     
     def _detect_network(self) -> Dict[str, Any]:
-        """Detect network specifications"""
-        try:
-            network_info = {
-                "speed_mbps": 100.0,  # Default assumption
-                "interface_type": "Unknown",
-                "connected": True
-            }
-            
-            # Try to get network interface information
-            try:
-                net_stats = psutil.net_if_stats()
-                for interface, stats in net_stats.items():
-                    if stats.isup and interface != "lo":  # Skip loopback
-                        network_info["speed_mbps"] = stats.speed
-                        network_info["interface_type"] = interface
-                        break
-            except Exception as e:
-                self.logger.debug(f"Failed to get network info: {e}")
-                
-            return network_info
-            
-        except Exception as e:
-            self.logger.error(f"Failed to detect network: {e}")
-            return {"speed_mbps": 100.0, "interface_type": "Unknown", "connected": True}
+        """Network specifications from the cached hardware profile"""
+        profile = get_hardware_profile()
+        return {
+            "speed_mbps": profile.network_speed_mbps,
+            "interface_type": profile.network_interface,
+            "connected": True
+        }
     
     def _determine_performance_tier(self, cpu_info: Dict, memory_info: Dict, 
                                   gpu_info: Dict, storage_info: Dict) -> PerformanceTier:
@@ -956,4 +754,4 @@ class HardwareOptimizer:
             return False
 
 # Global instance
-hardware_optimizer = HardwareOptimizer()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, hardware_optimizer=HardwareOptimizer)
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+MIA Hardware Profile
+Enoten, predpomnjen profil strojne opreme: poceni prstni odtis stroja
+odloči, ali je shranjen profil še veljaven; počasne sonde (nvidia-smi,
+lsblk, dmidecode, wmic ...) tečejo vzporedno s časovnimi omejitvami
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import platform
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger("MIA.HardwareProfile")
+
+PROFILE_VERSION = 1
+GIB = 1024 ** 3
+
+
+@dataclass
+class HardwareProfile:
+    """Static hardware facts; volatile usage (free RAM, disk, load) comes from telemetry"""
+    fingerprint: str = ""
+    cpu_model: str = "Unknown"
+    cpu_architecture: str = ""
+    cpu_physical_cores: int = 1
+    cpu_logical_cores: int = 1
+    cpu_frequency_mhz: float = 2000.0
+    ram_total_gb: float = 0.0
+    memory_type: str = "Unknown"
+    gpu_available: bool = False
+    gpu_vendor: str = "none"
+    gpu_model: str = "None"
+    gpu_memory_gb: float = 0.0
+    gpu_driver_version: str = "Unknown"
+    gpu_compute_capability: Optional[str] = None
+    storage_type: str = "Unknown"
+    network_interface: str = "Unknown"
+    network_speed_mbps: float = 100.0
+    probed_at: float = 0.0
+    probe_seconds: float = 0.0
+    probe_errors: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HardwareProfile":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+# Poceni prstni odtis
+
+def _read(path: str) -> str:
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _cpu_model() -> str:
+    for line in _read("/proc/cpuinfo").splitlines():
+        if line.startswith("model name") or line.startswith("Hardware"):
+            return line.split(":", 1)[1].strip()
+    return platform.processor() or platform.machine()
+
+
+def _ram_total() -> int:
+    for line in _read("/proc/meminfo").splitlines():
+        if line.startswith("MemTotal:"):
+            return int(line.split()[1]) * 1024
+    if PSUTIL_AVAILABLE:
+        return psutil.virtual_memory().total
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def _pci_devices() -> List[str]:
+    """vendor:device pairs of PCI devices, GPUs included, from sysfs"""
+    devices = []
+    for path in sorted(glob.glob("/sys/bus/pci/devices/*")):
+        vendor = _read(os.path.join(path, "vendor"))
+        device = _read(os.path.join(path, "device"))
+        if vendor:
+            devices.append(f"{vendor}:{device}")
+    return devices
+
+
+def _gpu_devices() -> List[str]:
+    devices = []
+    for path in sorted(glob.glob("/sys/class/drm/card[0-9]*/device")):
+        vendor = _read(os.path.join(path, "vendor"))
+        if vendor:
+            devices.append(f"{vendor}:{_read(os.path.join(path, 'device'))}")
+    devices.extend(sorted(os.path.basename(p) for p in glob.glob("/proc/driver/nvidia/gpus/*")))
+    return devices
+
+
+def machine_fingerprint_data() -> Dict[str, Any]:
+    """Facts that identify the machine; reading them never spawns a process"""
+    return {
+        "system": platform.system(),
+        "kernel": platform.release(),
+        "machine": platform.machine(),
+        "cpu_model": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        # Rounded so kernel memory reservations do not change the fingerprint
+        "ram_total_mib": _ram_total() // (64 * 1024 ** 2) * 64,
+        "pci_devices": _pci_devices(),
+        "gpu_devices": _gpu_devices(),
+    }
+
+
+def machine_fingerprint() -> str:
+    payload = json.dumps(machine_fingerprint_data(), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+# Sonde
+
+def run_command(args: List[str], timeout: float = 5.0) -> Optional[str]:
+    """stdout of a successful command, None if it is missing, fails or times out"""
+    try:
+        result = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def probe_cpu(timeout: float) -> Dict[str, Any]:
+    info: Dict[str, Any] = {
+        "cpu_architecture": platform.machine(),
+        "cpu_logical_cores": os.cpu_count() or 1,
+        "cpu_model": _cpu_model(),
+    }
+    if PSUTIL_AVAILABLE:
+        info["cpu_physical_cores"] = psutil.cpu_count(logical=False) or info["cpu_logical_cores"]
+        freq = psutil.cpu_freq()
+        if freq:
+            info["cpu_frequency_mhz"] = freq.max or freq.current or 2000.0
+    else:
+        cores = {line for line in _read("/proc/cpuinfo").splitlines()
+                 if line.startswith("core id") or line.startswith("physical id")}
+        info["cpu_physical_cores"] = max(1, len(cores) - 1) if cores else info["cpu_logical_cores"]
+    max_freq = _read("/sys/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq")
+    if "cpu_frequency_mhz" not in info and max_freq.isdigit():
+        info["cpu_frequency_mhz"] = int(max_freq) / 1000.0
+
+    system = platform.system()
+    if system == "Darwin":
+        output = run_command(["sysctl", "-n", "machdep.cpu.brand_string"], timeout)
+        if output:
+            info["cpu_model"] = output.strip()
+    elif system == "Windows":
+        output = run_command(["wmic", "cpu", "get", "name"], timeout)
+        lines = output.strip().split("\n") if output else []
+        if len(lines) > 1:
+            info["cpu_model"] = lines[1].strip()
+    return info
+
+
+def probe_memory(timeout: float) -> Dict[str, Any]:
+    info: Dict[str, Any] = {"ram_total_gb": _ram_total() / GIB}
+    if platform.system() == "Linux":
+        # -n: never wait for a sudo password prompt
+        output = run_command(["sudo", "-n", "dmidecode", "--type", "memory"], timeout)
+        for memory_type in ("DDR5", "DDR4", "DDR3"):
+            if output and memory_type in output:
+                info["memory_type"] = memory_type
+                break
+    return info
+
+
+def probe_gpu(timeout: float) -> Dict[str, Any]:
+    output = run_command(["nvidia-smi", "--query-gpu=name,memory.total,driver_version,compute_cap",
+                          "--format=csv,noheader,nounits"], timeout)
+    if output is None:
+        output = run_command(["nvidia-smi", "--query-gpu=name,memory.total,driver_version",
+                              "--format=csv,noheader,nounits"], timeout)
+    if output and output.strip():
+        parts = [part.strip() for part in output.strip().split("\n")[0].split(",")]
+        if len(parts) >= 3:
+            return {
+                "gpu_available": True,
+                "gpu_vendor": "nvidia",
+                "gpu_model": parts[0],
+                "gpu_memory_gb": float(parts[1]) / 1024,
+                "gpu_driver_version": parts[2],
+                "gpu_compute_capability": parts[3] if len(parts) > 3 else None,
+            }
+
+    output = run_command(["rocm-smi", "--showproductname", "--showmeminfo", "vram"], timeout)
+    if output is not None:
+        return {"gpu_available": True, "gpu_vendor": "amd", "gpu_model": "AMD GPU",
+                "gpu_memory_gb": 8.0 if "Total VRAM" in output else 0.0}
+
+    for device in _gpu_devices():
+        if device.startswith("0x8086:"):  # Intel vendor ID
+            return {"gpu_available": True, "gpu_vendor": "intel", "gpu_model": "Intel Integrated Graphics",
+                    "gpu_memory_gb": 2.0}  # Shared memory assumption
+    return {}
+
+
+def probe_storage(timeout: float) -> Dict[str, Any]:
+    system = platform.system()
+    if system == "Linux":
+        flags = [_read(path) for path in glob.glob("/sys/block/*/queue/rotational")
+                 if not os.path.basename(os.path.dirname(os.path.dirname(path))).startswith(("loop", "ram", "zram"))]
+        if not flags:
+            output = run_command(["lsblk", "-d", "-o", "name,rota"], timeout)
+            flags = [line.split()[1] for line in (output or "").strip().split("\n")[1:] if len(line.split()) >= 2]
+        if flags:
+            return {"storage_type": "SSD" if "0" in flags else "HDD"}
+    elif system == "Darwin":
+        # Most modern Macs have SSDs
+        return {"storage_type": "SSD"}
+    elif system == "Windows":
+        output = run_command(["wmic", "diskdrive", "get", "mediatype"], timeout)
+        return {"storage_type": "SSD" if output and "SSD" in output else "HDD"}
+    return {"storage_type": "SSD"}
+
+
+def probe_network(timeout: float) -> Dict[str, Any]:
+    if PSUTIL_AVAILABLE:
+        for interface, stats in psutil.net_if_stats().items():
+            if stats.isup and interface != "lo":
+                return {"network_interface": interface, "network_speed_mbps": float(stats.speed or 100)}
+        return {}
+    for path in sorted(glob.glob("/sys/class/net/*")):
+        interface = os.path.basename(path)
+        if interface == "lo" or _read(os.path.join(path, "operstate")) != "up":
+            continue
+        speed = _read(os.path.join(path, "speed"))
+        return {"network_interface": interface,
+                "network_speed_mbps": float(speed) if speed.lstrip("-").isdigit() and int(speed) > 0 else 100.0}
+    return {}
+
+
+DEFAULT_PROBES: Dict[str, Callable[[float], Dict[str, Any]]] = {
+    "cpu": probe_cpu,
+    "memory": probe_memory,
+    "gpu": probe_gpu,
+    "storage": probe_storage,
+    "network": probe_network,
+}
+
+
+class HardwareProfileService:
+    """Hardware profile persisted under the machine fingerprint.
+
+    Warm start: the stored fingerprint matches, the stored profile is used
+    and nothing is probed. Changed machine: the stale profile is returned at
+    once and the probes re-run in the background. No profile yet: the probes
+    run in parallel and the caller waits at most ``probe_timeout``; a probe
+    that does not finish in time leaves its fields at their defaults.
+    """
+
+    def __init__(self, cache_path: str = "mia/data/hardware/profile.json", probe_timeout: float = 10.0,
+                 probes: Optional[Dict[str, Callable[[float], Dict[str, Any]]]] = None,
+                 fingerprint: Callable[[], str] = machine_fingerprint):
+        self.cache_path = Path(cache_path)
+        self.probe_timeout = probe_timeout
+        self.probes = dict(DEFAULT_PROBES if probes is None else probes)
+        self.fingerprint_fn = fingerprint
+        self.profile: Optional[HardwareProfile] = None
+        self.stale = False
+        self.source = "none"  # "cache", "stale_cache" or "probe"
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def get(self, wait_for_fresh: bool = False) -> HardwareProfile:
+        """Current profile, loading or probing it on first use"""
+        with self._lock:
+            if self.profile is None:
+                self._load_or_probe()
+            profile = self.profile
+        if wait_for_fresh:
+            self.wait()
+            profile = self.profile
+        return profile
+
+    def _load_or_probe(self):
+        fingerprint = self.fingerprint_fn()
+        cached = self._read_cache()
+        if cached is not None and cached.fingerprint == fingerprint:
+            self.profile, self.stale, self.source = cached, False, "cache"
+            logger.debug("Hardware profile reused from cache")
+        elif cached is not None:
+            self.profile, self.stale, self.source = cached, True, "stale_cache"
+            logger.info("Hardware changed since the profile was stored; re-probing in background")
+            self.refresh(fingerprint)
+        else:
+            self.profile, self.stale, self.source = self.probe(fingerprint), False, "probe"
+            self._write_cache(self.profile)
+
+    def probe(self, fingerprint: Optional[str] = None) -> HardwareProfile:
+        """Run all probes in parallel; each contributes fields of the profile"""
+        started = time.perf_counter()
+        profile = HardwareProfile(fingerprint=fingerprint or self.fingerprint_fn())
+        executor = ThreadPoolExecutor(max_workers=max(1, len(self.probes)), thread_name_prefix="mia-hw-probe")
+        futures = {executor.submit(probe, self.probe_timeout): name for name, probe in self.probes.items()}
+        done, pending = wait(futures, timeout=self.probe_timeout)
+        # Do not wait for probes stuck past their timeout
+        executor.shutdown(wait=False)
+
+        values: Dict[str, Any] = {}
+        for future in done:
+            name = futures[future]
+            try:
+                values.update(future.result() or {})
+            except Exception as e:
+                profile.probe_errors.append(f"{name}: {e}")
+        for future in pending:
+            profile.probe_errors.append(f"{futures[future]}: timed out")
+        for key, value in values.items():
+            if hasattr(profile, key):
+                setattr(profile, key, value)
+        profile.probed_at = time.time()
+        profile.probe_seconds = time.perf_counter() - started
+        logger.info(f"Hardware probed in {profile.probe_seconds:.2f}s")
+        return profile
+
+    def refresh(self, fingerprint: Optional[str] = None) -> threading.Thread:
+        """Re-probe in a background thread and swap in the result"""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return self._refresh_thread
+
+        def run():
+            profile = self.probe(fingerprint)
+            self._write_cache(profile)
+            self.profile, self.stale, self.source = profile, False, "probe"
+
+        self._refresh_thread = threading.Thread(target=run, name="mia-hw-refresh", daemon=True)
+        self._refresh_thread.start()
+        return self._refresh_thread
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until a running background refresh has finished"""
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _read_cache(self) -> Optional[HardwareProfile]:
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+            if data.get("version") != PROFILE_VERSION:
+                return None
+            return HardwareProfile.from_dict(data["profile"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_cache(self, profile: HardwareProfile):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"version": PROFILE_VERSION, "profile": asdict(profile)}, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not store hardware profile: {e}")
+
+
+_service: Optional[HardwareProfileService] = None
+_service_lock = threading.Lock()
+
+
+def get_hardware_profile_service() -> HardwareProfileService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = HardwareProfileService()
+    return _service
+
+
+def get_hardware_profile() -> HardwareProfile:
+    """Process-wide hardware profile"""
+    return get_hardware_profile_service().get()
@@ -10,6 +10,7 @@ import logging
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from mia.core.service_registry import get_service, lazy_services
 
 @dataclass
 class PhysicalAttributes:
@@ -327,20 +328,24 @@ class SelfIdentityModel:
         }
 
 # Globalna instanca modela samozavedanja
-self_identity_model = SelfIdentityModel()
+__getattr__ = lazy_services(__name__, self_identity_model=SelfIdentityModel)
+
+def get_self_identity_model() -> SelfIdentityModel:
+    """Process-wide self-identity model, constructed on first use"""
+    return get_service(f"{__name__}.self_identity_model")
 
 def get_self_identity() -> SelfIdentityModel:
     """Pridobi globalno instanco modela samozavedanja"""
-    return self_identity_model
+    return get_self_identity_model()
 
 def get_self_description(mode: str = "standard") -> str:
     """Globalna funkcija za opis sebe"""
-    return self_identity_model.get_self_description(mode)
+    return get_self_identity_model().get_self_description(mode)
 
 def perform_self_reflection() -> Dict[str, Any]:
     """Globalna funkcija za samorefleksijo"""
-    return self_identity_model.perform_self_reflection()
+    return get_self_identity_model().perform_self_reflection()
 
 def get_introspective_thoughts() -> List[str]:
     """Globalna funkcija za introspektivne misli"""
-    return self_identity_model.get_introspective_thoughts()
\ No newline at end of file
+    return get_self_identity_model().get_introspective_thoughts()
\ No newline at end of file
@@ -16,6 +16,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 import asyncio
+from mia.core.service_registry import lazy_services
 
 class ThreatLevel(Enum):
 
@@ -181,4 +182,4 @@ class ImmuneKernel:
             return {"error": str(e)}
 
 # Global instance
-immune_kernel = ImmuneKernel()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, immune_kernel=ImmuneKernel)
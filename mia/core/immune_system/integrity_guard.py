@@ -16,6 +16,9 @@ from enum import Enum
 import threading
 import sqlite3
 
+from mia.core.integrity_engine import IntegrityEngine
+from mia.core.service_registry import lazy_services
+
 class IntegrityLevel(Enum):
 
     def _get_deterministic_time(self) -> float:
@@ -93,6 +96,14 @@ class IntegrityGuard:
         self.protected_resources: Dict[str, IntegrityRecord] = {}
         self.violations: Dict[str, IntegrityViolation] = {}
         
+        # Shared integrity engine; protected resources are tracked individually
+        self.engine = IntegrityEngine(
+            patterns=(),
+            excluded_patterns=self.config.get("excluded_patterns", []),
+            algorithm=self.config.get("checksum_algorithm", "sha256"),
+            state_path=str(self.integrity_dir / "engine_state.json")
+        )
+        
         # Cryptographic keys
         self.signing_key = self._get_or_create_signing_key()
         
@@ -308,22 +319,10 @@ class IntegrityGuard:
             return False
     
     def _calculate_checksum(self, file_path: str) -> Optional[str]:
-        """Calculate file checksum"""
+        """Calculate file checksum (cached by the engine until the file's stat changes)"""
         try:
-            algorithm = self.config.get("checksum_algorithm", "sha256")
-            
-            if algorithm == "sha256":
-                hash_obj = hashlib.sha256()
-            elif algorithm == "md5":
-                hash_obj = hashlib.md5()
-            else:
-                hash_obj = hashlib.sha256()  # Default
-            
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_obj.update(chunk)
-            
-            return hash_obj.hexdigest()
+            self.engine.track(file_path)
+            return self.engine.digest(file_path)
             
         except Exception as e:
             self.logger.error(f"Failed to calculate checksum: {e}")
@@ -414,6 +413,7 @@ class IntegrityGuard:
                 return
             
             self.monitoring_active = True
+            self.engine.start_watching()
             self.monitoring_thread = threading.Thread(
                 target=self._monitoring_loop,
                 daemon=True
@@ -429,6 +429,7 @@ class IntegrityGuard:
         """Stop integrity monitoring"""
         try:
             self.monitoring_active = False
+            self.engine.stop_watching()
             
             if self.monitoring_thread:
                 self.monitoring_thread.join(timeout=5.0)
@@ -455,11 +456,56 @@ class IntegrityGuard:
             self.logger.error(f"Failed to get integrity status: {e}")
             return {"error": str(e)}
     
+    def verify_resources(self) -> List[IntegrityViolation]:
+        """Verify protected resources; only files whose stat changed are re-read"""
+        detected = []
+        
+        try:
+            changes = self.engine.refresh()
+            entries = self.engine.entries()
+            now = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
+            
+            for resource_path in changes.changed:
+                record = self.protected_resources.get(resource_path)
+                if record is None:
+                    continue
+                
+                entry = entries.get(resource_path)
+                actual = entry.digest if entry else "missing"
+                if actual == record.checksum:
+                    continue
+                
+                violation_id = hashlib.sha256(f"{resource_path}_{actual}".encode()).hexdigest()[:16]
+                violation = IntegrityViolation(
+                    violation_id=violation_id,
+                    resource_path=resource_path,
+                    violation_type=ViolationType.CHECKSUM_MISMATCH,
+                    severity="critical" if record.integrity_level == IntegrityLevel.CRITICAL else "high",
+                    description=f"Checksum mismatch for {resource_path}",
+                    expected_value=record.checksum,
+                    actual_value=actual,
+                    detected_at=now,
+                    resolved=False,
+                    resolution_action=None
+                )
+                self.violations[violation_id] = violation
+                detected.append(violation)
+                self.logger.warning(f"⚠️ Integrity violation: {violation.description}")
+            
+            for record in self.protected_resources.values():
+                record.last_verified = now
+                record.verification_count += 1
+            
+        except Exception as e:
+            self.logger.error(f"Failed to verify resources: {e}")
+        
+        return detected
+    
     def _monitoring_loop(self):
         """Main monitoring loop"""
         while self.monitoring_active:
             try:
-                # Basic monitoring implementation
+                self.verify_resources()
                 time.sleep(self.monitoring_interval)
                 
             except Exception as e:
@@ -467,4 +513,4 @@ class IntegrityGuard:
                 time.sleep(self.monitoring_interval)
 
 # Global instance
-integrity_guard = IntegrityGuard()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, integrity_guard=IntegrityGuard)
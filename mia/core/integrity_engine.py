@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+MIA Integrity Engine
+Change-driven file hashing with stat-gated rehash, parallel hashing and a Merkle tree over directories
+"""
+
+import fnmatch
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+READ_BUFFER_SIZE = 1 << 20      # 1 MiB reads instead of 4 KiB
+MMAP_THRESHOLD = 16 << 20       # hash files above 16 MiB through mmap
+RACY_WINDOW_NS = 2_000_000_000  # mtimes this close to the scan are not trusted (same-tick edits)
+
+DEFAULT_EXCLUDED = ("__pycache__", ".git", "*.pyc", "*.tmp", "*.log")
+
+
+class FileSignature(NamedTuple):
+    """Cheap stat-derived identity of a file's content"""
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+@dataclass
+class FileEntry:
+    """Hashed file tracked by the engine"""
+    path: str
+    signature: FileSignature
+    digest: str
+    racy: bool = False
+
+
+@dataclass
+class ChangeSet:
+    """Result of a refresh pass"""
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    stat_calls: int = 0
+    hashed: int = 0
+    full_scan: bool = False
+
+    @property
+    def changed(self) -> List[str]:
+        return self.added + self.modified + self.removed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+
+def hash_file(path: str, algorithm: str = "sha256", buffer_size: int = READ_BUFFER_SIZE) -> str:
+    """Hash a file with large buffered reads, or mmap for big files"""
+    hasher = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+        else:
+            buffer = bytearray(min(buffer_size, max(size, 1)))
+            view = memoryview(buffer)
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+def _parent(path: str) -> str:
+    return os.path.dirname(path)
+
+
+def _depth(path: str) -> int:
+    depth = 0
+    while _parent(path) != path:
+        path = _parent(path)
+        depth += 1
+    return depth
+
+
+class _MerkleTree:
+    """Directory Merkle tree with incremental recomputation of dirty directories"""
+
+    def __init__(self):
+        self._leaves: Dict[str, str] = {}
+        self._children: Dict[str, Set[str]] = {}
+        self._dir_hashes: Dict[str, str] = {}
+        self._dirty: Set[str] = set()
+
+    def _mark_ancestors(self, path: str):
+        child, parent = path, _parent(path)
+        while True:
+            self._dirty.add(parent)
+            if parent == child:
+                break
+            child, parent = parent, _parent(parent)
+
+    def set(self, path: str, digest: str):
+        if self._leaves.get(path) == digest:
+            return
+        if path not in self._leaves:
+            child = path
+            while True:
+                parent = _parent(child)
+                if parent == child:
+                    break
+                siblings = self._children.setdefault(parent, set())
+                known = child in siblings
+                siblings.add(child)
+                if known:
+                    break
+                child = parent
+        self._leaves[path] = digest
+        self._mark_ancestors(path)
+
+    def remove(self, path: str):
+        if path not in self._leaves:
+            return
+        del self._leaves[path]
+        self._mark_ancestors(path)
+        child, parent = path, _parent(path)
+        while parent != child:
+            siblings = self._children.get(parent)
+            if siblings is None:
+                break
+            siblings.discard(child)
+            if siblings:
+                break
+            del self._children[parent]
+            self._dir_hashes.pop(parent, None)
+            child, parent = parent, _parent(parent)
+
+    def _node_hash(self, node: str) -> str:
+        if node in self._leaves:
+            return self._leaves[node]
+        return self._dir_hashes[node]
+
+    def root(self) -> str:
+        if self._dirty:
+            for directory in sorted(self._dirty, key=_depth, reverse=True):
+                children = self._children.get(directory)
+                if not children:
+                    self._dir_hashes.pop(directory, None)
+                    continue
+                hasher = hashlib.sha256()
+                for child in sorted(children):
+                    kind = "f" if child in self._leaves else "d"
+                    hasher.update(f"{os.path.basename(child)}\0{kind}\0{self._node_hash(child)}\n".encode())
+                self._dir_hashes[directory] = hasher.hexdigest()
+            self._dirty.clear()
+
+        tops = sorted(d for d in self._children if _parent(d) == d)
+        if not tops:
+            return hashlib.sha256(b"").hexdigest()
+        if len(tops) == 1:
+            return self._dir_hashes[tops[0]]
+        hasher = hashlib.sha256()
+        for top in tops:
+            hasher.update(f"{top}\0{self._dir_hashes[top]}\n".encode())
+        return hasher.hexdigest()
+
+
+def merkle_root(digests: Dict[str, str]) -> str:
+    """Merkle root of a {path: digest} mapping, comparable with IntegrityEngine.root_hash()"""
+    tree = _MerkleTree()
+    for path, digest in digests.items():
+        tree.set(os.path.normpath(path), digest)
+    return tree.root()
+
+
+class _DirtyPathHandler(FileSystemEventHandler):
+    """Forwards filesystem events to the engine's dirty set"""
+
+    def __init__(self, engine: "IntegrityEngine"):
+        self.engine = engine
+
+    def on_any_event(self, event):
+        if getattr(event, "is_directory", False):
+            return
+        self.engine.mark_dirty(event.src_path)
+        dest = getattr(event, "dest_path", None)
+        if dest:
+            self.engine.mark_dirty(dest)
+
+
+class IntegrityEngine:
+    """Shared change-driven integrity engine
+
+    A refresh only stats files; content is rehashed when (size, mtime_ns, inode)
+    changed. When filesystem events are available (``start_watching`` or an
+    ``event_driven`` caller feeding ``mark_dirty``) refreshes touch only the
+    reported paths until the next periodic full scan.
+    """
+
+    def __init__(self, roots: Iterable[str] = (), patterns: Iterable[str] = ("*.py",),
+                 excluded_patterns: Iterable[str] = DEFAULT_EXCLUDED, algorithm: str = "sha256",
+                 max_workers: Optional[int] = None, state_path: Optional[str] = None,
+                 full_scan_interval: float = 3600.0, event_driven: bool = False):
+        self.logger = logging.getLogger("MIA.IntegrityEngine")
+        self.roots: List[str] = [os.path.normpath(r) for r in roots]
+        self.patterns = tuple(patterns)
+        self.excluded_patterns = tuple(excluded_patterns)
+        self.algorithm = algorithm
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self.state_path = Path(state_path) if state_path else None
+        self.full_scan_interval = full_scan_interval
+        # True when the caller feeds mark_dirty() from its own event source
+        self.event_driven = event_driven
+
+        self._entries: Dict[str, FileEntry] = {}
+        self._tracked: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._merkle = _MerkleTree()
+        self._observer = None
+        self._last_full_scan = 0.0
+        self._scanned_once = False
+
+        self.stats = {"refreshes": 0, "full_scans": 0, "stat_calls": 0, "hashed_files": 0, "hashed_bytes": 0}
+
+        self._load_state()
+
+    # -- configuration -----------------------------------------------------
+
+    def add_root(self, root: str):
+        """Scan every matching file below ``root``"""
+        root = os.path.normpath(root)
+        with self._lock:
+            if root not in self.roots:
+                self.roots.append(root)
+                self._scanned_once = False
+
+    def track(self, path: str):
+        """Track an individual file regardless of roots and patterns"""
+        path = os.path.normpath(path)
+        with self._lock:
+            self._tracked.add(path)
+        self.mark_dirty(path)
+
+    def untrack(self, path: str):
+        path = os.path.normpath(path)
+        with self._lock:
+            self._tracked.discard(path)
+        self.mark_dirty(path)
+
+    def mark_dirty(self, path: str):
+        """Report a filesystem change (e.g. from inotify) so the next refresh re-stats it"""
+        with self._dirty_lock:
+            self._dirty.add(os.path.normpath(path))
+
+    @property
+    def watching(self) -> bool:
+        return self._observer is not None
+
+    def start_watching(self) -> bool:
+        """Subscribe to inotify/FSEvents via watchdog when installed"""
+        if not WATCHDOG_AVAILABLE or self._observer is not None:
+            return self._observer is not None
+        try:
+            observer = Observer()
+            handler = _DirtyPathHandler(self)
+            for root in self.roots:
+                if os.path.isdir(root):
+                    observer.schedule(handler, root, recursive=True)
+            for path in self._tracked:
+                parent = _parent(path) or "."
+                if os.path.isdir(parent):
+                    observer.schedule(handler, parent, recursive=False)
+            observer.daemon = True
+            observer.start()
+            self._observer = observer
+            self.logger.info("Integrity engine watching filesystem events")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Filesystem watching unavailable, falling back to stat scans: {e}")
+            return False
+
+    def stop_watching(self):
+        observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=5)
+
+    # -- scanning ----------------------------------------------------------
+
+    def _excluded(self, name: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.excluded_patterns)
+
+    def _matches(self, path: str) -> bool:
+        if path in self._tracked:
+            return True
+        if not any(path == r or path.startswith(r.rstrip(os.sep) + os.sep) or r == "." for r in self.roots):
+            return False
+        parts = Path(path).parts
+        if any(self._excluded(part) for part in parts):
+            return False
+        return any(fnmatch.fnmatch(parts[-1], pattern) for pattern in self.patterns)
+
+    def _walk(self, root: str, found: Dict[str, FileSignature]):
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if self._excluded(entry.name):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file() and any(fnmatch.fnmatch(entry.name, p) for p in self.patterns):
+                                st = entry.stat()
+                                found[os.path.normpath(entry.path)] = FileSignature(
+                                    st.st_size, st.st_mtime_ns, st.st_ino)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    @staticmethod
+    def _stat(path: str) -> Optional[FileSignature]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        return FileSignature(st.st_size, st.st_mtime_ns, st.st_ino)
+
+    def _hash_many(self, paths: List[str]) -> Dict[str, Optional[str]]:
+        def work(path: str) -> Tuple[str, Optional[str]]:
+            try:
+                return path, hash_file(path, self.algorithm)
+            except OSError as e:
+                self.logger.error(f"File hash calculation error for {path}: {e}")
+                return path, None
+
+        if len(paths) <= 1:
+            return dict(work(p) for p in paths)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="integrity-hash") as pool:
+            return dict(pool.map(work, paths))
+
+    def refresh(self, full: Optional[bool] = None) -> ChangeSet:
+        """Bring entries up to date and return what changed since the previous refresh"""
+        with self._lock:
+            now = time.time()
+            if full is None:
+                events = self._observer is not None or self.event_driven
+                full = (not self._scanned_once or not events
+                        or now - self._last_full_scan >= self.full_scan_interval)
+
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+
+            changes = ChangeSet(full_scan=full)
+            scan_start_ns = time.time_ns()
+
+            if full:
+                current: Dict[str, FileSignature] = {}
+                for root in self.roots:
+                    if os.path.isdir(root):
+                        self._walk(root, current)
+                    else:
+                        sig = self._stat(root)
+                        if sig is not None:
+                            current[root] = sig
+                for path in self._tracked:
+                    sig = self._stat(path)
+                    if sig is not None:
+                        current[path] = sig
+                changes.stat_calls = len(current) + len(self._tracked)
+                candidates = set(current) | set(self._entries)
+            else:
+                candidates = {p for p in dirty if p in self._entries or self._matches(p)}
+                candidates |= {p for p, e in self._entries.items() if e.racy}
+                current = {}
+                for path in candidates:
+                    sig = self._stat(path)
+                    if sig is not None:
+                        current[path] = sig
+                changes.stat_calls = len(candidates)
+
+            to_hash: List[str] = []
+            for path in candidates:
+                sig = current.get(path)
+                entry = self._entries.get(path)
+                if sig is None:
+                    if entry is not None:
+                        del self._entries[path]
+                        self._merkle.remove(path)
+                        changes.removed.append(path)
+                    continue
+                if entry is None or entry.racy or entry.signature != sig:
+                    to_hash.append(path)
+
+            digests = self._hash_many(sorted(to_hash))
+            for path, digest in digests.items():
+                if digest is None:
+                    continue
+                sig = current[path]
+                racy = sig.mtime_ns >= scan_start_ns - RACY_WINDOW_NS
+                entry = self._entries.get(path)
+                self.stats["hashed_bytes"] += sig.size
+                if entry is None:
+                    changes.added.append(path)
+                elif entry.digest != digest:
+                    changes.modified.append(path)
+                self._entries[path] = FileEntry(path, sig, digest, racy)
+                self._merkle.set(path, digest)
+
+            changes.hashed = len(to_hash)
+            if full:
+                self._last_full_scan = now
+                self._scanned_once = True
+                self.stats["full_scans"] += 1
+            self.stats["refreshes"] += 1
+            self.stats["stat_calls"] += changes.stat_calls
+            self.stats["hashed_files"] += changes.hashed
+
+            if changes or changes.hashed:
+                self.save_state()
+            return changes
+
+    # -- queries -----------------------------------------------------------
+
+    def digest(self, path: str) -> Optional[str]:
+        """Current digest of a tracked file (rehashed only if its stat signature changed)"""
+        path = os.path.normpath(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            sig = self._stat(path)
+            if sig is None:
+                return None
+            if entry is not None and entry.signature == sig and not entry.racy:
+                return entry.digest
+            self._tracked.add(path)
+        self.mark_dirty(path)
+        self.refresh(full=False)
+        entry = self._entries.get(path)
+        return entry.digest if entry else None
+
+    def entries(self) -> Dict[str, FileEntry]:
+        with self._lock:
+            return dict(self._entries)
+
+    def digests(self) -> Dict[str, str]:
+        with self._lock:
+            return {path: entry.digest for path, entry in self._entries.items()}
+
+    def root_hash(self) -> str:
+        """Merkle root over all tracked files; equal roots mean identical trees"""
+        with self._lock:
+            return self._merkle.root()
+
+    # -- persistence -------------------------------------------------------
+
+    def save_state(self):
+        """Persist stat signatures and digests so restarts skip rehashing unchanged files"""
+        if self.state_path is None:
+            return
+        try:
+            state = {
+                "algorithm": self.algorithm,
+                "entries": {p: [e.signature.size, e.signature.mtime_ns, e.signature.inode, e.digest]
+                            for p, e in self._entries.items() if not e.racy},
+            }
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.error(f"Integrity state save error: {e}")
+
+    def _load_state(self):
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            if state.get("algorithm") != self.algorithm:
+                return
+            for path, (size, mtime_ns, inode, digest) in state.get("entries", {}).items():
+                self._entries[path] = FileEntry(path, FileSignature(size, mtime_ns, inode), digest)
+                self._merkle.set(path, digest)
+        except Exception as e:
+            self.logger.error(f"Integrity state load error: {e}")
+            self._entries.clear()
+            self._merkle = _MerkleTree()
@@ -22,6 +22,9 @@ from urllib.parse import urljoin, urlparse
 # import nltk  # Optional dependency
 from collections import defaultdict
 
+from mia.core.text_encoder import get_text_encoder
+from mia.core.service_registry import get_service, lazy_services
+
 class ContentType(Enum):
 
     def _get_deterministic_time(self) -> float:
@@ -512,34 +515,8 @@ class InternetLearningEngine:
     def vectorize_content(self, content: str) -> Optional[List[float]]:
         """Convert content to vector embedding"""
         try:
-            # TF-IDF based vectorization with normalization
-            # This provides basic semantic understanding for content similarity
-            
-            # Tokenize and clean
-            words = re.findall(r'\b\w+\b', content.lower())
-            
-            # Create simple word frequency vector
-            word_freq = defaultdict(int)
-            for word in words:
-                if len(word) > 2:  # Skip very short words
-                    word_freq[word] += 1
-            
-            # Convert to fixed-size vector (simplified)
-            # Take top 100 most frequent words and create vector
-            sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:100]
-            
-            vector = []
-            for word, freq in sorted_words:
-                # Simple hash-based embedding
-                word_hash = hash(word) % 1000
-                normalized_freq = min(freq / len(words), 1.0)
-                vector.append(word_hash * normalized_freq)
-            
-            # Pad to fixed size (384 dimensions)
-            while len(vector) < 384:
-                vector.append(0.0)
-            
-            return vector[:384]
+            # Stable feature hashing (sublinear TF), shared with the memory system
+            return get_text_encoder(384, min_token_length=3).encode(content)
             
         except Exception as e:
             self.logger.error(f"Failed to vectorize content: {e}")
@@ -987,14 +964,17 @@ class InternetLearningEngine:
         self.learning_enabled = False
         self.logger.info("Internet learning disabled")
 
-# Global internet learning engine
-internet_learning = InternetLearningEngine()
-internet_learning_engine = internet_learning  # Alias for system integrator
+# Global internet learning engine (internet_learning_engine: alias for system integrator)
+__getattr__ = lazy_services(__name__, internet_learning=InternetLearningEngine, internet_learning_engine="internet_learning")
+
+def get_internet_learning() -> InternetLearningEngine:
+    """Process-wide internet learning engine, constructed on first use"""
+    return get_service(f"{__name__}.internet_learning")
 
 def get_internet_learning_status() -> Dict[str, Any]:
     """Global function to get internet learning status"""
     try:
-        return internet_learning.get_learning_status()
+        return get_internet_learning().get_learning_status()
     except:
         # Fallback status
         return {
@@ -1014,12 +994,12 @@ def add_learning_source(url: str, name: str, content_type: str, priority: str =
     """Global function to add learning source"""
     content_type_enum = ContentType(content_type.lower())
     priority_enum = LearningPriority[priority.upper()]
-    internet_learning.add_learning_source(url, name, content_type_enum, priority_enum)
+    get_internet_learning().add_learning_source(url, name, content_type_enum, priority_enum)
 
 def enable_internet_learning():
     """Global function to enable internet learning"""
-    internet_learning.enable_learning()
+    get_internet_learning().enable_learning()
 
 def disable_internet_learning():
     """Global function to disable internet learning"""
-    internet_learning.disable_learning()
\ No newline at end of file
+    get_internet_learning().disable_learning()
\ No newline at end of file
@@ -16,6 +16,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 from collections import defaultdict, Counter
 import hashlib
+from mia.core.service_registry import lazy_services
 
 class LearningType(Enum):
     """Types of learning"""
@@ -450,4 +451,4 @@ class LearningSystem:
         return self.conversations[-limit:] if self.conversations else []
 
 # Global learning system instance
-learning_system = LearningSystem()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, learning_system=LearningSystem)
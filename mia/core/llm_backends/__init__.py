@@ -4,6 +4,12 @@ MIA Enterprise AGI - LLM Backends
 Support for various LLM backends (Ollama, OpenAI, Hugging Face, etc.)
 """
 
-from .ollama_backend import ollama_backend
+from mia.core.service_registry import lazy_services
+from . import ollama_backend
+
+# Ime podmodula bi zasenčilo globalno instanco, ki se ustvari ob prvi uporabi
+del ollama_backend
+
+__getattr__ = lazy_services(__name__, ollama_backend="mia.core.llm_backends.ollama_backend.ollama_backend")
 
 __all__ = ['ollama_backend']
\ No newline at end of file
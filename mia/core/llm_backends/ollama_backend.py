@@ -10,6 +10,7 @@ import asyncio
 import aiohttp
 from typing import Dict, List, Any, Optional, AsyncGenerator
 from dataclasses import dataclass
+from mia.core.service_registry import lazy_services
 
 @dataclass
 class OllamaModel:
@@ -247,4 +248,4 @@ class OllamaBackend:
         self.logger.info("🧹 Ollama backend cleaned up")
 
 # Global Ollama backend instance
-ollama_backend = OllamaBackend()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, ollama_backend=OllamaBackend)
@@ -17,6 +17,10 @@ import pickle
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from mia.core.text_encoder import get_text_encoder
+from mia.core.service_registry import get_service, lazy_services
+from mia.compliance.data_map import SQLiteSubjectTable, register_subject_store
+
 class MemoryType(Enum):
 
     def _get_deterministic_time(self) -> float:
@@ -71,6 +75,10 @@ class MemorySystem:
         # Store config path for Enterprise compatibility
         self.config_path = config_path
         
+        # Vectorization (stable feature hashing shared with other subsystems)
+        self.vector_dim = 384
+        self.text_encoder = get_text_encoder(self.vector_dim)
+        
         # Initialize advanced optimizer
         self.advanced_optimizer = None
         self._init_advanced_optimizer()
@@ -84,14 +92,14 @@ class MemorySystem:
         self.long_term_db = self._init_database("long_term")
         self.meta_db = self._init_database("meta")
         
+        # Re-encode embeddings written by an older encoder (or the old salted hash)
+        self.reencode_stale_embeddings()
+        
         # Memory limits
         self.short_term_limit = 1000
         self.medium_term_limit = 10000
         self.long_term_unlimited = True
         
-        # Vectorization (simple implementation)
-        self.vector_dim = 384
-        
         # Current session
         self.current_session_id = self._generate_session_id()
         
@@ -106,6 +114,7 @@ class MemorySystem:
         }
         
         self.logger = self._setup_logging()
+        register_subject_store(f"memory:{self.data_path.resolve()}", self)
         
     def _setup_logging(self) -> logging.Logger:
         """Setup logging for memory system"""
@@ -144,15 +153,22 @@ class MemorySystem:
                 vector_embedding BLOB,
                 access_count INTEGER DEFAULT 0,
                 last_accessed REAL,
-                related_memories TEXT
+                related_memories TEXT,
+                embedding_version TEXT
             )
         """)
         
+        # Migrate databases created before embeddings were versioned
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(memories)")}
+        if "embedding_version" not in columns:
+            conn.execute("ALTER TABLE memories ADD COLUMN embedding_version TEXT")
+        
         # Create indexes for faster queries
         conn.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON memories(timestamp)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_importance ON memories(importance_score)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_session ON memories(session_id)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_emotional_tone ON memories(emotional_tone)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user_id ON memories(user_id)")
         
         conn.commit()
         return conn
@@ -163,27 +179,40 @@ class MemorySystem:
     
     def _generate_memory_id(self, content: str) -> str:
         """Generate unique memory ID based on content and timestamp"""
-        unique_string = f"{content}_{self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200}"
+        unique_string = f"{content}_{self._get_deterministic_time() if hasattr(self, '_get_deterministic_time') else 1640995200}"
         return hashlib.sha256(unique_string.encode()).hexdigest()[:16]
     
     def _simple_vectorize(self, text: str) -> List[float]:
-        """Simple text vectorization using hash-based embedding"""
-        # Basic implementation using word hashing for vector generation
-        # Provides consistent embeddings for similar text content
-        words = text.lower().split()
-        vector = np.zeros(self.vector_dim)
-        
-        for i, word in enumerate(words[:self.vector_dim]):
-            # Simple hash-based embedding
-            hash_val = hash(word) % self.vector_dim
-            vector[hash_val] += 1.0 / (i + 1)  # Position weighting
-        
-        # Normalize
-        norm = np.linalg.norm(vector)
-        if norm > 0:
-            vector = vector / norm
-        
-        return vector.tolist()
+        """Text vectorization using the shared feature-hashing encoder"""
+        return self.text_encoder.encode(text)
+    
+    def reencode_stale_embeddings(self, batch_size: int = 512) -> int:
+        """Re-encode stored embeddings whose encoder version differs from the current one"""
+        version = self.text_encoder.version
+        reencoded = 0
+        
+        for db in (self.short_term_db, self.medium_term_db, self.long_term_db, self.meta_db):
+            stale = db.execute("""
+                SELECT id, content FROM memories
+                WHERE embedding_version IS NULL OR embedding_version != ?
+            """, (version,)).fetchall()
+            
+            for start in range(0, len(stale), batch_size):
+                chunk = stale[start:start + batch_size]
+                vectors = self.text_encoder.encode_batch([content for _, content in chunk])
+                db.executemany(
+                    "UPDATE memories SET vector_embedding = ?, embedding_version = ? WHERE id = ?",
+                    [(pickle.dumps(vector.tolist()), version, memory_id)
+                     for (memory_id, _), vector in zip(chunk, vectors)]
+                )
+            
+            if stale:
+                db.commit()
+                reencoded += len(stale)
+        
+        if reencoded:
+            self.logger.info(f"Re-encoded {reencoded} memories with encoder {version}")
+        return reencoded
     
     def _calculate_importance(self, content: str, emotional_tone: EmotionalTone, 
                            context_tags: List[str]) -> float:
@@ -305,13 +334,13 @@ class MemorySystem:
             INSERT OR REPLACE INTO memories 
             (id, content, memory_type, timestamp, emotional_tone, importance_score,
              context_tags, user_id, session_id, vector_embedding, access_count,
-             last_accessed, related_memories)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             last_accessed, related_memories, embedding_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             memory.id, memory.content, memory.memory_type.value, memory.timestamp,
             memory.emotional_tone.value, memory.importance_score, context_tags_str,
             memory.user_id, memory.session_id, vector_blob, memory.access_count,
-            memory.last_accessed, related_memories_str
+            memory.last_accessed, related_memories_str, self.text_encoder.version
         ))
         
         db.commit()
@@ -394,7 +423,9 @@ class MemorySystem:
             context_tags=json.loads(memory_data[6]) if memory_data[6] else [],
             user_id=memory_data[7],
             session_id=memory_data[8],
-            vector_embedding=pickle.loads(memory_data[9]) if memory_data[9] else None,
+            vector_embedding=(pickle.loads(memory_data[9])
+                              if memory_data[9] and self.text_encoder.is_current(memory_data[13])
+                              else self._simple_vectorize(memory_data[1])),
             access_count=memory_data[10],
             last_accessed=memory_data[11],
             related_memories=json.loads(memory_data[12]) if memory_data[12] else []
@@ -417,6 +448,7 @@ class MemorySystem:
         """Retrieve memories based on various criteria"""
         
         memories = []
+        query_vector = self._simple_vectorize(query) if query else None
         
         # Determine which databases to search
         databases = []
@@ -460,7 +492,6 @@ class MemorySystem:
                 
                 # Vector similarity check if query provided
                 if query and memory.vector_embedding:
-                    query_vector = self._simple_vectorize(query)
                     similarity = self._cosine_similarity(query_vector, memory.vector_embedding)
                     
                     if similarity >= similarity_threshold:
@@ -580,6 +611,29 @@ class MemorySystem:
         
         return stats
     
+    def _subject_table(self) -> SQLiteSubjectTable:
+        """All memory tiers, looked up by the indexed user_id column"""
+        return SQLiteSubjectTable({
+            MemoryType.SHORT_TERM.value: self.short_term_db,
+            MemoryType.MEDIUM_TERM.value: self.medium_term_db,
+            MemoryType.LONG_TERM.value: self.long_term_db,
+            MemoryType.META.value: self.meta_db
+        })
+    
+    def find_subject_records(self, user_id: str) -> List[str]:
+        """Memory ids of a user in every tier (subject data map)"""
+        return self._subject_table().find_subject_records(user_id)
+    
+    def export_subject_data(self, user_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        """A user's memories by tier, without embeddings"""
+        return self._subject_table().export_subject_data(user_id)
+    
+    def erase_subject_data(self, user_id: str) -> int:
+        """Delete a user's memories from every tier"""
+        erased = self._subject_table().erase_subject_data(user_id)
+        self.logger.info(f"Erased {erased} memories of user {user_id}")
+        return erased
+    
     def cleanup_old_memories(self, days_old: int = 30):
         """Clean up very old short-term memories"""
         cutoff_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200 - (days_old * 24 * 3600)
@@ -687,17 +741,21 @@ class MemorySystem:
                 self.logger.error(f"Failed to refresh identity memories: {e}")
 
 # Global memory system instance
-memory_system = MemorySystem()
+__getattr__ = lazy_services(__name__, memory_system=MemorySystem)
+
+def get_memory_system() -> MemorySystem:
+    """Process-wide memory system, constructed on first use"""
+    return get_service(f"{__name__}.memory_system")
 
 def store_memory(content: str, emotional_tone: EmotionalTone = EmotionalTone.NEUTRAL,
                 context_tags: List[str] = None, user_id: str = None) -> str:
     """Global function to store memory"""
-    return memory_system.store_memory(content, emotional_tone, context_tags, user_id)
+    return get_memory_system().store_memory(content, emotional_tone, context_tags, user_id)
 
 def retrieve_memories(query: str = None, limit: int = 10) -> List[Memory]:
     """Global function to retrieve memories"""
-    return memory_system.retrieve_memories(query=query, limit=limit)
+    return get_memory_system().retrieve_memories(query=query, limit=limit)
 
 def get_conversation_context(query: str = None) -> List[Memory]:
     """Global function to get conversation context"""
-    return memory_system.get_context_for_conversation(query=query)
\ No newline at end of file
+    return get_memory_system().get_context_for_conversation(query=query)
\ No newline at end of file
@@ -15,6 +15,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 import psutil
+from mia.core.service_registry import get_service, lazy_services
 
 class ModelType(Enum):
     """Types of AI models"""
@@ -517,16 +518,20 @@ class ModelDiscoveryEngine:
         return stats
 
 # Global model discovery instance
-model_discovery = ModelDiscoveryEngine()
+__getattr__ = lazy_services(__name__, model_discovery=ModelDiscoveryEngine)
+
+def get_model_discovery() -> ModelDiscoveryEngine:
+    """Process-wide model discovery engine, constructed on first use"""
+    return get_service(f"{__name__}.model_discovery")
 
 def discover_models(continuous: bool = True):
     """Start model discovery"""
-    model_discovery.start_discovery(continuous)
+    get_model_discovery().start_discovery(continuous)
 
 def get_available_models() -> Dict[str, ModelInfo]:
     """Get all available models"""
-    return model_discovery.get_discovered_models()
+    return get_model_discovery().get_discovered_models()
 
 def get_best_llm_models(limit: int = 5) -> List[ModelInfo]:
     """Get best available LLM models"""
-    return model_discovery.get_best_llm_models(limit)
\ No newline at end of file
+    return get_model_discovery().get_best_llm_models(limit)
\ No newline at end of file
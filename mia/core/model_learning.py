@@ -17,7 +17,8 @@ import threading
 import subprocess
 import tempfile
 
-from .model_discovery import ModelInfo, ModelType, ModelFormat, model_discovery
+from .model_discovery import ModelInfo, ModelType, ModelFormat, get_model_discovery
+from mia.core.service_registry import get_service, lazy_services, service
 
 class LearningMethod(Enum):
     """Methods for learning from models"""
@@ -127,7 +128,7 @@ class ModelLearningEngine:
             self.logger.warning("Learning already in progress")
             return
         
-        discovered_models = model_discovery.get_discovered_models()
+        discovered_models = get_model_discovery().get_discovered_models()
         llm_models = [model for model in discovered_models.values() 
                      if model.model_type == ModelType.LLM]
         
@@ -606,16 +607,23 @@ class ModelLearningEngine:
             self.logger.error(f"Failed to save learning results: {e}")
 
 # Global model learning instance
-model_learning = ModelLearningEngine()
+__getattr__ = lazy_services(
+    __name__,
+    model_learning=service(ModelLearningEngine, depends_on=["mia.core.model_discovery.model_discovery"])
+)
+
+def get_model_learning() -> ModelLearningEngine:
+    """Process-wide model learning engine, constructed on first use"""
+    return get_service(f"{__name__}.model_learning")
 
 def start_learning_from_models():
     """Start learning from discovered models"""
-    model_learning.start_learning_from_discovered_models()
+    get_model_learning().start_learning_from_discovered_models()
 
 def get_learning_progress() -> Dict[str, Any]:
     """Get current learning progress"""
-    return model_learning.get_learning_stats()
+    return get_model_learning().get_learning_stats()
 
 def get_extracted_knowledge() -> Dict[str, ExtractedKnowledge]:
     """Get all extracted knowledge"""
-    return model_learning.get_extracted_knowledge()
\ No newline at end of file
+    return get_model_learning().get_extracted_knowledge()
\ No newline at end of file
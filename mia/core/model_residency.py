@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+MIA Model Residency
+Upravljanje rezidentnih modelov v okviru proračuna RAM in VRAM: leno
+nalaganje z enim samim letom na model, izmerjen odtis ob nalaganju,
+GreedyDual-Size izrivanje in predhodno nalaganje po napovedani mešanici nalog
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+logger = logging.getLogger("MIA.ModelResidency")
+
+GIB = 1024 ** 3
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes (0 if it cannot be read)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    return 0
+
+
+def current_vram() -> Optional[int]:
+    """Bytes allocated on the current CUDA device; None when VRAM cannot be measured"""
+    if TORCH_AVAILABLE and torch.cuda.is_available():
+        return torch.cuda.memory_allocated()
+    return None
+
+
+@dataclass
+class ModelProfile:
+    """What the manager knows about a model, resident or not"""
+    name: str
+    tasks: Tuple[str, ...]
+    ram_estimate: int
+    vram_estimate: int
+    ram_measured: Optional[int] = None
+    vram_measured: Optional[int] = None
+    load_seconds: Optional[float] = None
+    loads: int = 0
+
+    @property
+    def ram_bytes(self) -> int:
+        return self.ram_estimate if self.ram_measured is None else self.ram_measured
+
+    @property
+    def vram_bytes(self) -> int:
+        return self.vram_estimate if self.vram_measured is None else self.vram_measured
+
+
+@dataclass
+class ResidentModel:
+    """A loaded model with its GreedyDual-Size priority and in-flight count"""
+    name: str
+    instance: Any
+    ram_bytes: int
+    vram_bytes: int
+    priority: float
+    in_flight: int = 0
+    hits: int = 0
+    draining: bool = False
+    idle: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def __post_init__(self):
+        self.idle.set()
+
+
+@dataclass
+class ResidencyStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0  # Acquires that waited on a load already in flight
+    loads: int = 0
+    load_seconds: float = 0.0
+    evictions: int = 0
+    cancelled_evictions: int = 0
+    prefetches: int = 0
+    bytes_freed: int = 0  # RSS actually returned by evictions
+    peak_ram: int = 0
+    peak_vram: int = 0
+
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ModelResidencyManager:
+    """Keeps the most valuable models resident within RAM and VRAM budgets.
+
+    Priority follows GreedyDual-Size: ``H = L + cost * demand / size`` where
+    cost is the measured load time, demand the predicted share of the task
+    mix the model serves, size its measured footprint in GiB and ``L`` the
+    priority of the last evicted model, so idle models age out. Loads are
+    serialised, which keeps per-model RSS deltas attributable, and
+    single-flight, so concurrent acquires of a cold model share one load.
+    Evicting a model that still serves requests waits for them to drain.
+    """
+
+    def __init__(self, loader: Callable[[str], Any], ram_budget: int, vram_budget: int = 0,
+                 unloader: Optional[Callable[[str, Any], Any]] = None,
+                 rss_probe: Callable[[], int] = current_rss,
+                 vram_probe: Optional[Callable[[], Optional[int]]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 demand_decay: float = 0.98, prefetch_share: float = 0.15,
+                 cost_aware: bool = True):
+        self.loader = loader
+        self.unloader = unloader
+        self.ram_budget = ram_budget
+        self.vram_budget = vram_budget
+        self.rss_probe = rss_probe
+        self.vram_probe = vram_probe
+        self.clock = clock
+        self.demand_decay = demand_decay
+        self.prefetch_share = prefetch_share
+        self.cost_aware = cost_aware
+
+        self.profiles: Dict[str, ModelProfile] = {}
+        self.resident: Dict[str, ResidentModel] = {}
+        self.task_weights: Dict[str, float] = {}
+        self.inflation = 0.0
+        self.stats = ResidencyStats()
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._load_lock: Optional[asyncio.Lock] = None
+
+    # Registracija in napoved povpraševanja
+
+    def register(self, name: str, tasks: Iterable[str] = (), ram_estimate: int = 0, vram_estimate: int = 0):
+        """Make a model loadable; estimates are used until its footprint is measured"""
+        profile = self.profiles.get(name)
+        if profile is None:
+            self.profiles[name] = ModelProfile(name, tuple(tasks), ram_estimate, vram_estimate)
+        else:
+            profile.tasks = tuple(tasks)
+            profile.ram_estimate = ram_estimate
+            profile.vram_estimate = vram_estimate
+
+    def set_budgets(self, ram_budget: int, vram_budget: int = 0):
+        self.ram_budget = ram_budget
+        self.vram_budget = vram_budget
+
+    def observe_task(self, task: str):
+        """Fold one request into the exponentially decayed task mix"""
+        decay = self.demand_decay
+        for key in self.task_weights:
+            self.task_weights[key] *= decay
+        self.task_weights[task] = self.task_weights.get(task, 0.0) + 1.0
+
+    def task_share(self, task: str) -> float:
+        total = sum(self.task_weights.values())
+        return self.task_weights.get(task, 0.0) / total if total else 0.0
+
+    def predicted_demand(self, name: str) -> float:
+        """Share of the current task mix this model can serve"""
+        profile = self.profiles.get(name)
+        if profile is None:
+            return 0.0
+        return sum(self.task_share(task) for task in profile.tasks)
+
+    def _priority(self, name: str) -> float:
+        if not self.cost_aware:
+            return self.clock()  # Recency only, i.e. LRU
+        profile = self.profiles[name]
+        cost = max(profile.load_seconds or 1.0, 1e-3)
+        demand = max(self.predicted_demand(name), 1e-3)
+        size = max((profile.ram_bytes + profile.vram_bytes) / GIB, 1e-3)
+        return self.inflation + cost * demand / size
+
+    # Poraba
+
+    @property
+    def ram_used(self) -> int:
+        return sum(model.ram_bytes for model in self.resident.values())
+
+    @property
+    def vram_used(self) -> int:
+        return sum(model.vram_bytes for model in self.resident.values())
+
+    def _overflow(self, ram_need: int = 0, vram_need: int = 0) -> Tuple[int, int]:
+        ram = max(0, self.ram_used + ram_need - self.ram_budget)
+        vram = max(0, self.vram_used + vram_need - self.vram_budget)
+        return ram, vram
+
+    # Pridobivanje in sproščanje
+
+    async def acquire(self, name: str, task: Optional[str] = None) -> Any:
+        """Return the model instance, loading it if needed; pair with release()"""
+        if name not in self.profiles:
+            raise KeyError(f"Model {name} is not registered")
+        if task is not None:
+            self.observe_task(task)
+
+        missed = False
+        while True:
+            resident = self.resident.get(name)
+            if resident is not None:
+                if resident.draining:
+                    # Still in memory, so serving it beats evicting and reloading
+                    resident.draining = False
+                    self.stats.cancelled_evictions += 1
+                resident.in_flight += 1
+                resident.idle.clear()
+                resident.hits += 1
+                resident.priority = self._priority(name)
+                if not missed:
+                    self.stats.hits += 1
+                return resident.instance
+
+            if not missed:
+                self.stats.misses += 1
+                missed = True
+            load = self._loading.get(name)
+            if load is None:
+                load = asyncio.ensure_future(self._load(name))
+                self._loading[name] = load
+                load.add_done_callback(lambda _, n=name: self._loading.pop(n, None))
+            else:
+                self.stats.coalesced += 1
+            await asyncio.shield(load)
+
+    def try_acquire(self, name: str) -> Any:
+        """Pin an already resident model without loading; None if it is not resident"""
+        resident = self.resident.get(name)
+        if resident is None or resident.draining:
+            return None
+        resident.in_flight += 1
+        resident.idle.clear()
+        resident.hits += 1
+        resident.priority = self._priority(name)
+        self.stats.hits += 1
+        return resident.instance
+
+    def release(self, name: str):
+        resident = self.resident.get(name)
+        if resident is None or resident.in_flight == 0:
+            return
+        resident.in_flight -= 1
+        if resident.in_flight == 0:
+            resident.idle.set()
+
+    @asynccontextmanager
+    async def lease(self, name: str, task: Optional[str] = None):
+        instance = await self.acquire(name, task)
+        try:
+            yield instance
+        finally:
+            self.release(name)
+
+    # Nalaganje in izrivanje
+
+    async def _load(self, name: str):
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if name in self.resident:
+                return
+            profile = self.profiles[name]
+            await self._make_room(profile.ram_bytes, profile.vram_bytes, protect=name)
+
+            rss_before = self.rss_probe()
+            vram_before = self.vram_probe() if self.vram_probe else None
+            started = self.clock()
+            instance = self.loader(name)
+            if inspect.isawaitable(instance):
+                instance = await instance
+            profile.load_seconds = self.clock() - started
+            profile.ram_measured = max(0, self.rss_probe() - rss_before)
+            vram_after = self.vram_probe() if vram_before is not None else None
+            if vram_after is not None:
+                profile.vram_measured = max(0, vram_after - vram_before)
+            profile.loads += 1
+
+            self.resident[name] = ResidentModel(name, instance, profile.ram_bytes, profile.vram_bytes,
+                                                self._priority(name))
+            self.stats.loads += 1
+            self.stats.load_seconds += profile.load_seconds
+            self.stats.peak_ram = max(self.stats.peak_ram, self.ram_used)
+            self.stats.peak_vram = max(self.stats.peak_vram, self.vram_used)
+            logger.info(f"Loaded model {name}: {profile.ram_bytes / GIB:.2f} GiB RAM, "
+                        f"{profile.vram_bytes / GIB:.2f} GiB VRAM in {profile.load_seconds:.2f}s")
+
+            # The estimate may have been too optimistic
+            await self._make_room(protect=name)
+
+    def _victims(self, ram_need: int, vram_need: int, protect: Optional[str],
+                 skip: Iterable[str] = (), idle_only: bool = False) -> Optional[List[ResidentModel]]:
+        """Lowest-priority models whose eviction fits the request, idle ones first; None if impossible"""
+        ram_over, vram_over = self._overflow(ram_need, vram_need)
+        if not ram_over and not vram_over:
+            return []
+        candidates = [model for model in self.resident.values()
+                      if model.name != protect and model.name not in skip and not model.draining
+                      and (not idle_only or model.in_flight == 0)]
+        candidates.sort(key=lambda model: (model.in_flight > 0, model.priority))
+        chosen = []
+        for model in candidates:
+            if ram_over <= 0 and vram_over <= 0:
+                break
+            if (ram_over > 0 and model.ram_bytes) or (vram_over > 0 and model.vram_bytes):
+                chosen.append(model)
+                ram_over -= model.ram_bytes
+                vram_over -= model.vram_bytes
+        if ram_over > 0 or vram_over > 0:
+            return None
+        return chosen
+
+    async def _make_room(self, ram_need: int = 0, vram_need: int = 0, protect: Optional[str] = None):
+        skip = set()
+        while True:
+            victims = self._victims(ram_need, vram_need, protect, skip)
+            if victims is None:
+                # Take what can be freed and run over budget rather than refuse
+                victims = self._victims(0, 0, protect, skip) or []
+                if not victims:
+                    if any(self._overflow(ram_need, vram_need)):
+                        logger.warning(f"Model residency over budget: {self.ram_used / GIB:.2f} GiB RAM "
+                                       f"of {self.ram_budget / GIB:.2f} GiB")
+                    return
+            if not victims:
+                return
+            victim = victims[0]
+            if not await self._evict(victim):
+                skip.add(victim.name)
+
+    async def _evict(self, model: ResidentModel) -> bool:
+        """Drain in-flight requests, then unload; False if a new request revived the model"""
+        model.draining = True
+        while model.in_flight:
+            await model.idle.wait()
+            if not model.draining:
+                return False
+        if not model.draining or self.resident.get(model.name) is not model:
+            return False
+
+        del self.resident[model.name]
+        self.inflation = max(self.inflation, model.priority)
+        rss_before = self.rss_probe()
+        if self.unloader is not None:
+            result = self.unloader(model.name, model.instance)
+            if inspect.isawaitable(result):
+                await result
+        model.instance = None
+        self.stats.evictions += 1
+        self.stats.bytes_freed += max(0, rss_before - self.rss_probe())
+        logger.info(f"Evicted model {model.name} (priority {model.priority:.3f})")
+        return True
+
+    async def shed(self, ram_bytes: int) -> int:
+        """Evict lowest-priority idle models until ram_bytes of footprint is released"""
+        released = 0
+        for model in sorted(self.resident.values(), key=lambda m: (m.in_flight > 0, m.priority)):
+            if released >= ram_bytes:
+                break
+            if model.in_flight == 0 and not model.draining and await self._evict(model):
+                released += model.ram_bytes
+        return released
+
+    async def prefetch(self) -> List[str]:
+        """Load models the task mix predicts will be needed, when they outrank what they displace"""
+        loaded = []
+        ranked = sorted(self.profiles, key=self.predicted_demand, reverse=True)
+        for name in ranked:
+            if name in self.resident or name in self._loading:
+                continue
+            if self.predicted_demand(name) < self.prefetch_share:
+                break
+            profile = self.profiles[name]
+            victims = self._victims(profile.ram_bytes, profile.vram_bytes, None, idle_only=True)
+            if victims is None:
+                continue
+            if victims and max(v.priority for v in victims) >= self._priority(name):
+                continue
+            load = asyncio.ensure_future(self._load(name))
+            self._loading[name] = load
+            load.add_done_callback(lambda _, n=name: self._loading.pop(n, None))
+            try:
+                await asyncio.shield(load)
+            except Exception as e:
+                logger.error(f"Prefetch of {name} failed: {e}")
+                continue
+            self.stats.prefetches += 1
+            loaded.append(name)
+        return loaded
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "ram_budget": self.ram_budget,
+            "vram_budget": self.vram_budget,
+            "ram_used": self.ram_used,
+            "vram_used": self.vram_used,
+            "resident": {
+                name: {
+                    "ram_bytes": model.ram_bytes,
+                    "vram_bytes": model.vram_bytes,
+                    "priority": model.priority,
+                    "in_flight": model.in_flight,
+                    "hits": model.hits,
+                    "load_seconds": self.profiles[name].load_seconds,
+                }
+                for name, model in self.resident.items()
+            },
+            "task_mix": {task: self.task_share(task) for task in self.task_weights},
+            "stats": {
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "hit_ratio": self.stats.hit_ratio(),
+                "coalesced": self.stats.coalesced,
+                "loads": self.stats.loads,
+                "load_seconds": self.stats.load_seconds,
+                "evictions": self.stats.evictions,
+                "cancelled_evictions": self.stats.cancelled_evictions,
+                "prefetches": self.stats.prefetches,
+                "bytes_freed": self.stats.bytes_freed,
+                "peak_ram": self.stats.peak_ram,
+                "peak_vram": self.stats.peak_vram,
+            },
+        }
+
+
+def benchmark_residency(n_requests: int = 20000, ram_budget_gib: float = 24.0, seed: int = 11) -> Dict[str, Any]:
+    """Replay a skewed task mix against simulated models and compare GreedyDual-Size with LRU.
+
+    Footprints and load times are accounted on a virtual clock and a virtual
+    RSS counter, so the figures depend only on the policy.
+    """
+    import random
+
+    # name: (tasks, GiB, seconds to load)
+    models = {
+        "chat-small": (("conversation",), 4.0, 4.0),
+        "chat-large": (("conversation", "text_generation"), 14.0, 40.0),
+        "coder": (("code",), 8.0, 15.0),
+        "whisper": (("speech_to_text",), 2.0, 3.0),
+        "vision": (("image_understanding",), 6.0, 12.0),
+        "summarizer": (("summarization", "text_generation"), 5.0, 6.0),
+    }
+    task_models = {}
+    for name, (tasks, _, _) in models.items():
+        for task in tasks:
+            task_models.setdefault(task, []).append(name)
+    tasks = ["conversation", "text_generation", "code", "speech_to_text", "image_understanding", "summarization"]
+    weights = [40, 20, 15, 12, 8, 5]
+
+    def run(cost_aware: bool) -> Dict[str, Any]:
+        rng = random.Random(seed)
+        state = {"now": 0.0, "rss": 0}
+
+        async def loader(name):
+            state["now"] += models[name][2]
+            state["rss"] += int(models[name][1] * GIB)
+            return {"name": name}
+
+        def unloader(name, instance):
+            state["rss"] -= int(models[name][1] * GIB)
+
+        manager = ModelResidencyManager(loader, int(ram_budget_gib * GIB), unloader=unloader,
+                                        rss_probe=lambda: state["rss"], clock=lambda: state["now"],
+                                        cost_aware=cost_aware)
+        for name, (model_tasks, gib, _) in models.items():
+            manager.register(name, model_tasks, ram_estimate=int(gib * GIB))
+
+        async def replay():
+            for _ in range(n_requests):
+                task = rng.choices(tasks, weights)[0]
+                name = rng.choice(task_models[task])
+                async with manager.lease(name, task):
+                    state["now"] += 0.05
+
+        asyncio.run(replay())
+        return {
+            "hit_ratio": round(manager.stats.hit_ratio(), 4),
+            "loads": manager.stats.loads,
+            "load_seconds": round(manager.stats.load_seconds, 1),
+            "evictions": manager.stats.evictions,
+            "peak_ram_gib": round(manager.stats.peak_ram / GIB, 2),
+        }
+
+    gds = run(cost_aware=True)
+    lru = run(cost_aware=False)
+    return {
+        "requests": n_requests,
+        "ram_budget_gib": ram_budget_gib,
+        "greedy_dual_size": gds,
+        "lru": lru,
+        "load_seconds_saved": round(lru["load_seconds"] - gds["load_seconds"], 1),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(benchmark_residency(), indent=2))
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+MIA Model Router
+Usmerjanje zahtev med modeli s Thompsonovim vzorčenjem pod ciljem zakasnitve
+(p95 SLO) in spodnjo mejo kakovosti; zakasnitve se vodijo v pretočnih
+kvantilnih skicah (DDSketch) z eksponentnim pozabljanjem
+"""
+
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class DDSketch:
+    """Relative-error quantile sketch over positive values (DDSketch).
+
+    Values fall into logarithmic buckets of ratio ``gamma``, so every
+    quantile is returned within ``relative_accuracy`` of an actual value.
+    Bucket counts are floats so samples can carry weights, which is how
+    ``DecayingSketch`` forgets old observations.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048, min_value: float = 1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self.bins: Dict[int, float] = {}
+        self.zero_weight = 0.0
+        self.total = 0.0
+
+    def key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    def value(self, key: int) -> float:
+        """Representative value of a bucket, the midpoint in relative terms"""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, weight: float = 1.0):
+        if value <= self.min_value:
+            self.zero_weight += weight
+        else:
+            k = self.key(value)
+            self.bins[k] = self.bins.get(k, 0.0) + weight
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.total += weight
+
+    def _collapse(self):
+        """Fold the lowest buckets together; accuracy is kept for the upper quantiles"""
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins + 1
+        target = keys[excess]
+        self.bins[target] += sum(self.bins.pop(k) for k in keys[:excess])
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.total <= 0:
+            return None
+        rank = q * self.total
+        cumulative = self.zero_weight
+        if cumulative >= rank and self.zero_weight > 0:
+            return 0.0
+        for k in sorted(self.bins):
+            cumulative += self.bins[k]
+            if cumulative >= rank:
+                return self.value(k)
+        return self.value(max(self.bins))
+
+    def rank(self, value: float) -> float:
+        """Weight of samples at or below value"""
+        if value <= self.min_value:
+            return self.zero_weight
+        limit = self.key(value)
+        return self.zero_weight + sum(w for k, w in self.bins.items() if k <= limit)
+
+    def scale(self, factor: float):
+        for k in self.bins:
+            self.bins[k] *= factor
+        self.zero_weight *= factor
+        self.total *= factor
+
+    def merge(self, other: "DDSketch"):
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for k, w in other.bins.items():
+            self.bins[k] = self.bins.get(k, 0.0) + w
+        self.zero_weight += other.zero_weight
+        self.total += other.total
+        while len(self.bins) > self.max_bins:
+            self._collapse()
+
+
+class DecayingSketch:
+    """Latency and quality summary whose evidence halves every ``half_life`` seconds.
+
+    Instead of rescaling every bucket on each sample, new samples get a
+    weight that grows as ``2 ** ((t - landmark) / half_life)``; all ratios
+    are unaffected and counts are renormalised (on reads as well as writes)
+    only when the weight gets large. ``effective_count`` expresses the decayed evidence in units of
+    one fresh sample, so an idle model's posterior widens again over time.
+    """
+
+    # 2 ** 332 ~ 1e100: beyond it the landmark moves to now
+    MAX_EXPONENT = 332.0
+
+    def __init__(self, half_life: float = 120.0, relative_accuracy: float = 0.01):
+        self.half_life = half_life
+        self.latency = DDSketch(relative_accuracy)
+        self.quality_weight = 0.0
+        self.landmark: Optional[float] = None
+        self.observations = 0
+
+    def _weight(self, now: float) -> float:
+        if self.landmark is None:
+            self.landmark = now
+        exponent = (now - self.landmark) / self.half_life
+        if exponent > self.MAX_EXPONENT:
+            # Po dolgem mirovanju bi utež prekoračila float; stari dokazi se ob tem izničijo
+            factor = 2.0 ** -exponent
+            self.latency.scale(factor)
+            self.quality_weight *= factor
+            self.landmark = now
+            return 1.0
+        return 2.0 ** exponent
+
+    def add(self, latency: float, quality: float, now: float):
+        weight = self._weight(now)
+        self.latency.add(latency, weight)
+        self.quality_weight += min(max(quality, 0.0), 1.0) * weight
+        self.observations += 1
+
+    def effective_count(self, now: float) -> float:
+        if self.landmark is None:
+            return 0.0
+        return self.latency.total / self._weight(now)
+
+    def effective_within(self, latency_slo: float, now: float) -> float:
+        """Decayed number of samples that met the latency target"""
+        if self.landmark is None:
+            return 0.0
+        return self.latency.rank(latency_slo) / self._weight(now)
+
+    def effective_quality(self, now: float) -> float:
+        if self.landmark is None:
+            return 0.0
+        return self.quality_weight / self._weight(now)
+
+    def mean_quality(self) -> Optional[float]:
+        if self.latency.total <= 0:
+            return None
+        return self.quality_weight / self.latency.total
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.latency.quantile(q)
+
+
+@dataclass
+class RouteDecision:
+    model: Optional[str]
+    reason: str  # "explore", "feasible", "fallback" or "none"
+    samples: Dict[str, Tuple[float, float]] = field(default_factory=dict)  # model: (slo, quality) draws
+
+
+class SLORouter:
+    """Thompson-sampling router under a latency SLO and a quality floor.
+
+    For every candidate the router draws the probability of answering within
+    the task's latency target from ``Beta(1 + within, 1 + missed)`` and its
+    quality from ``Beta(1 + good, 1 + bad)``, both on decayed counts taken
+    from the candidate's sketch. Candidates whose draws meet the SLO quantile
+    and the quality floor are feasible and the best sampled quality among
+    them wins; if none is feasible the one most likely to meet the SLO is
+    used. A model whose latency degrades accumulates misses and drops out of
+    the feasible set; once its evidence decays it is probed again.
+    """
+
+    def __init__(self, latency_slo: float = 2.0, quality_floor: float = 0.5, slo_quantile: float = 0.95,
+                 half_life: float = 120.0, min_samples: float = 3.0, relative_accuracy: float = 0.01,
+                 clock: Callable[[], float] = time.monotonic, seed: Optional[int] = None):
+        self.latency_slo = latency_slo
+        self.quality_floor = quality_floor
+        self.slo_quantile = slo_quantile
+        self.half_life = half_life
+        self.min_samples = min_samples
+        self.relative_accuracy = relative_accuracy
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.task_slos: Dict[str, float] = {}
+        self.routes: Dict[Tuple[str, str], DecayingSketch] = {}
+        self.task_models: Dict[str, List[str]] = {}
+        self.decisions: Dict[str, int] = {"explore": 0, "feasible": 0, "fallback": 0, "none": 0}
+
+    def set_slo(self, task: str, latency_slo: float):
+        self.task_slos[task] = latency_slo
+
+    def slo_for(self, task: str) -> float:
+        return self.task_slos.get(task, self.latency_slo)
+
+    def route(self, model: str, task: str) -> DecayingSketch:
+        key = (model, task)
+        sketch = self.routes.get(key)
+        if sketch is None:
+            sketch = DecayingSketch(self.half_life, self.relative_accuracy)
+            self.routes[key] = sketch
+            self.task_models.setdefault(task, []).append(model)
+        return sketch
+
+    def observe(self, model: str, task: str, latency: float, quality: float = 1.0) -> DecayingSketch:
+        """Record one served request; quality is expected in [0, 1]"""
+        sketch = self.route(model, task)
+        sketch.add(latency, quality, self.clock())
+        return sketch
+
+    def choose(self, task: str, candidates: Optional[Iterable[str]] = None,
+               latency_slo: Optional[float] = None, quality_floor: Optional[float] = None) -> RouteDecision:
+        """Pick a model for one request of the given task type"""
+        names = list(self.task_models.get(task, ()) if candidates is None else candidates)
+        if not names:
+            self.decisions["none"] += 1
+            return RouteDecision(None, "none")
+        slo = self.slo_for(task) if latency_slo is None else latency_slo
+        floor = self.quality_floor if quality_floor is None else quality_floor
+        now = self.clock()
+
+        # Models with (almost) no recent evidence are tried before sampling
+        unexplored = []
+        for name in names:
+            sketch = self.routes.get((name, task))
+            count = sketch.effective_count(now) if sketch is not None else 0.0
+            if count < self.min_samples:
+                unexplored.append((count, name))
+        if unexplored:
+            self.decisions["explore"] += 1
+            return RouteDecision(min(unexplored)[1], "explore")
+
+        samples = {}
+        for name in names:
+            sketch = self.routes[(name, task)]
+            count = sketch.effective_count(now)
+            within = min(sketch.effective_within(slo, now), count)
+            good = min(sketch.effective_quality(now), count)
+            samples[name] = (self.rng.betavariate(1 + within, 1 + count - within),
+                             self.rng.betavariate(1 + good, 1 + count - good))
+
+        feasible = [name for name, (slo_draw, quality_draw) in samples.items()
+                    if slo_draw >= self.slo_quantile and quality_draw >= floor]
+        if feasible:
+            self.decisions["feasible"] += 1
+            return RouteDecision(max(feasible, key=lambda n: samples[n][1]), "feasible", samples)
+        self.decisions["fallback"] += 1
+        return RouteDecision(max(samples, key=lambda n: samples[n][0]), "fallback", samples)
+
+    def summary(self, model: str, task: str) -> Dict[str, Any]:
+        sketch = self.routes.get((model, task))
+        if sketch is None:
+            return {}
+        now = self.clock()
+        count = sketch.effective_count(now)
+        slo = self.slo_for(task)
+        return {
+            "observations": sketch.observations,
+            "effective_count": count,
+            "p50": sketch.quantile(0.5),
+            "p95": sketch.quantile(0.95),
+            "p99": sketch.quantile(0.99),
+            "quality": sketch.mean_quality(),
+            "slo": slo,
+            "slo_attainment": sketch.effective_within(slo, now) / count if count else None,
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "latency_slo": self.latency_slo,
+            "task_slos": dict(self.task_slos),
+            "quality_floor": self.quality_floor,
+            "slo_quantile": self.slo_quantile,
+            "decisions": dict(self.decisions),
+            "routes": {f"{model}/{task}": self.summary(model, task) for model, task in self.routes},
+        }
+
+
+@dataclass
+class SyntheticModel:
+    """Lognormal latency (median, sigma) and Bernoulli quality for the simulation harness"""
+    name: str
+    median: float
+    sigma: float
+    quality: float
+
+    def sample(self, rng: random.Random) -> Tuple[float, float]:
+        latency = self.median * math.exp(rng.gauss(0.0, self.sigma))
+        return latency, 1.0 if rng.random() < self.quality else 0.0
+
+    def p95(self) -> float:
+        return self.median * math.exp(1.6449 * self.sigma)
+
+
+def simulate_routing(n_requests: int = 20000, latency_slo: float = 1.0, quality_floor: float = 0.5,
+                     requests_per_second: float = 5.0, degrade_at: float = 0.5, seed: int = 5) -> Dict[str, Any]:
+    """Compare the SLO router with mean-based selection on synthetic latency distributions.
+
+    "balanced" is the best model that meets the p95 target until it degrades
+    (median latency x3) at ``degrade_at`` of the run. "heavy-tail" has the
+    better mean ratio but misses p95 and "large" is best on quality but too
+    slow. Reward is the model's true quality when it meets the SLO at that
+    moment and 0 otherwise; regret is measured against the best such model.
+    """
+    def models_at(step: int) -> Dict[str, SyntheticModel]:
+        degraded = step >= int(n_requests * degrade_at)
+        return {
+            "fast-small": SyntheticModel("fast-small", 0.25, 0.3, 0.62),
+            "balanced": SyntheticModel("balanced", 1.35 if degraded else 0.45, 0.3, 0.80),
+            "heavy-tail": SyntheticModel("heavy-tail", 0.35, 0.75, 0.84),
+            "large": SyntheticModel("large", 1.4, 0.25, 0.92),
+        }
+
+    def oracle(models: Dict[str, SyntheticModel]) -> float:
+        feasible = [m.quality for m in models.values() if m.p95() <= latency_slo and m.quality >= quality_floor]
+        return max(feasible) if feasible else 0.0
+
+    def reward(model: SyntheticModel) -> float:
+        return model.quality if model.p95() <= latency_slo and model.quality >= quality_floor else 0.0
+
+    def run(policy: str) -> Dict[str, Any]:
+        rng = random.Random(seed)
+        state = {"now": 0.0}
+        router = SLORouter(latency_slo=latency_slo, quality_floor=quality_floor,
+                           clock=lambda: state["now"], seed=seed)
+        history: Dict[str, Tuple[List[float], List[float]]] = {}
+        regret = 0.0
+        within = 0
+        latencies = []
+        reroute_after = None
+        degrade_step = int(n_requests * degrade_at)
+        names = list(models_at(0))
+
+        for step in range(n_requests):
+            state["now"] = step / requests_per_second
+            models = models_at(step)
+            if policy == "slo_router":
+                choice = router.choose("conversation", names).model
+            else:
+                # Former AdaptiveLLMManager scoring: quality/latency over the last 100 calls
+                untried = [n for n in names if n not in history]
+                if untried:
+                    choice = untried[0]
+                else:
+                    choice = max(names, key=lambda n: (sum(history[n][1]) / len(history[n][1])) /
+                                 max(sum(history[n][0]) / len(history[n][0]), 0.1))
+            latency, quality = models[choice].sample(rng)
+            router.observe(choice, "conversation", latency, quality)
+            lat_hist, q_hist = history.setdefault(choice, ([], []))
+            lat_hist.append(latency)
+            q_hist.append(quality)
+            del lat_hist[:-100], q_hist[:-100]
+
+            regret += oracle(models) - reward(models[choice])
+            within += latency <= latency_slo
+            latencies.append(latency)
+            if step >= degrade_step and reroute_after is None and choice != "balanced":
+                recent = router.summary("balanced", "conversation")
+                if recent.get("slo_attainment") is not None and recent["slo_attainment"] < 0.95:
+                    reroute_after = step - degrade_step
+
+        latencies.sort()
+        return {
+            "cumulative_regret": round(regret, 1),
+            "regret_per_request": round(regret / n_requests, 4),
+            "slo_attainment": round(within / n_requests, 4),
+            "delivered_p95": round(latencies[int(0.95 * (len(latencies) - 1))], 3),
+            "requests_to_reroute": reroute_after,
+            "decisions": dict(router.decisions) if policy == "slo_router" else None,
+        }
+
+    return {
+        "requests": n_requests,
+        "latency_slo": latency_slo,
+        "slo_router": run("slo_router"),
+        "mean_score": run("mean_score"),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(simulate_routing(), indent=2))
@@ -18,6 +18,7 @@ from enum import Enum
 import mimetypes
 import subprocess
 import tempfile
+from mia.core.service_registry import lazy_services
 
 class ModalityType(Enum):
     """Types of modalities"""
@@ -449,4 +450,4 @@ class MultimodalSystem:
             self.logger.error(f"❌ Cleanup error: {e}")
 
 # Global multimodal system instance
-multimodal_system = MultimodalSystem()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, multimodal_system=MultimodalSystem)
@@ -15,6 +15,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 import queue
+from mia.core.service_registry import lazy_services
 
 class VideoStyle(Enum):
 
@@ -627,4 +628,4 @@ class VideoGenerator:
             )
 
 # Global instance
-video_generator = VideoGenerator()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, video_generator=VideoGenerator)
@@ -15,6 +15,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import psutil
+from mia.core.service_registry import lazy_services
 
 class OwnershipLevel(Enum):
 
@@ -553,4 +554,4 @@ class OwnerGuard:
             return False
 
 # Global instance
-owner_guard = OwnerGuard()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, owner_guard=OwnerGuard)
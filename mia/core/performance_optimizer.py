@@ -7,6 +7,7 @@ import sys
 import psutil
 import gc
 from typing import Dict, Any
+from mia.core.service_registry import lazy_services
 
 class PerformanceOptimizer:
     """Performance optimization utilities"""
@@ -55,4 +56,4 @@ class PerformanceOptimizer:
         }
 
 # Global optimizer instance
-performance_optimizer = PerformanceOptimizer()
+__getattr__ = lazy_services(__name__, performance_optimizer=PerformanceOptimizer)
@@ -16,6 +16,8 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 from collections import defaultdict
 
+from mia.compliance.data_map import register_subject_store
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -66,6 +68,8 @@ class PersistentKnowledgeStore:
         self.relations: List[Relation] = []
         self.user_models: Dict[str, UserModel] = {}
         self.conversation_history: List[Dict[str, Any]] = []
+        self.aliases: Dict[str, str] = {}  # merged entity -> canonical entity
+        self.user_facts: Dict[str, Dict[int, Fact]] = defaultdict(dict)  # user_id -> prispevana dejstva
         
         # Statistics
         self.stats = {
@@ -78,6 +82,7 @@ class PersistentKnowledgeStore:
         
         # Load existing data
         self.load_from_disk()
+        register_subject_store(f"knowledge:{self.data_dir.resolve()}", self)
         
         logger.info(f"Initialized knowledge store with {self.stats['total_facts']} facts")
         
@@ -100,6 +105,7 @@ class PersistentKnowledgeStore:
         try:
             # Normalize inputs
             entity = entity.strip().lower()
+            entity = self.aliases.get(entity, entity)
             property = property.strip().lower()
             
             if not entity or not property or not value:
@@ -134,6 +140,8 @@ class PersistentKnowledgeStore:
             )
             
             self.facts[entity][property] = fact
+            if user_id:
+                self.user_facts[user_id][id(fact)] = fact
             self.stats['total_facts'] += 1
             self.stats['last_updated'] = time.time()
             
@@ -164,6 +172,7 @@ class PersistentKnowledgeStore:
         """
         try:
             entity = entity.strip().lower()
+            entity = self.aliases.get(entity, entity)
             
             if entity not in self.facts:
                 return None
@@ -398,6 +407,65 @@ class PersistentKnowledgeStore:
             logger.error(f"Error getting user conversations: {e}")
             return []
             
+    def merge_entity(self, duplicate: str, canonical: str) -> Dict[str, int]:
+        """
+        Združi podvojeno entiteto v kanonično.
+        
+        Dejstva se prenesejo (ob konfliktu obdrži tisto z višjo zanesljivostjo),
+        relacije se preusmerijo, podvojena entiteta pa ostane kot alias.
+        
+        Args:
+            duplicate: Podvojena entiteta
+            canonical: Entiteta, ki ostane
+            
+        Returns:
+            Število prenesenih dejstev in preusmerjenih relacij
+        """
+        result = {'facts_moved': 0, 'relations_redirected': 0}
+        try:
+            duplicate = duplicate.strip().lower()
+            canonical = canonical.strip().lower()
+            canonical = self.aliases.get(canonical, canonical)
+            if duplicate == canonical:
+                return result
+                
+            for prop, fact in self.facts.pop(duplicate, {}).items():
+                existing = self.facts[canonical].get(prop)
+                if existing is None or fact.confidence > existing.confidence:
+                    fact.entity = canonical
+                    self.facts[canonical][prop] = fact
+                    result['facts_moved'] += 1
+                if existing is not None:
+                    self.stats['total_facts'] -= 1
+                    
+            seen = set()
+            relations = []
+            for relation in self.relations:
+                if relation.subject == duplicate or relation.object == duplicate:
+                    relation.subject = canonical if relation.subject == duplicate else relation.subject
+                    relation.object = canonical if relation.object == duplicate else relation.object
+                    result['relations_redirected'] += 1
+                key = (relation.subject, relation.predicate, relation.object)
+                if key not in seen:
+                    seen.add(key)
+                    relations.append(relation)
+            self.relations = relations
+            self.stats['total_relations'] = len(self.relations)
+            
+            for alias, target in self.aliases.items():
+                if target == duplicate:
+                    self.aliases[alias] = canonical
+            self.aliases[duplicate] = canonical
+            self.stats['last_updated'] = time.time()
+            
+            logger.info(f"Merged entity {duplicate} -> {canonical}: {result}")
+            self.save_to_disk()
+            
+        except Exception as e:
+            logger.error(f"Error merging entity {duplicate}: {e}")
+            
+        return result
+        
     def get_statistics(self) -> Dict[str, Any]:
         """Pridobi statistike baze znanja."""
         return {
@@ -408,6 +476,64 @@ class PersistentKnowledgeStore:
                                if time.time() - u.last_interaction < 86400])  # Last 24h
         }
         
+    def _live_user_facts(self, user_id: str) -> List[Fact]:
+        """Dejstva uporabnika, ki so še v bazi (združevanje entitet lahko dejstvo zavrže)"""
+        return [fact for fact in self.user_facts.get(user_id, {}).values()
+                if self.facts.get(fact.entity, {}).get(fact.property) is fact]
+        
+    def find_subject_records(self, user_id: str) -> List[str]:
+        """Ključi zapisov uporabnika (za zemljevid podatkov subjektov)."""
+        keys = [f"fact:{fact.entity}.{fact.property}" for fact in self._live_user_facts(user_id)]
+        if user_id in self.user_models:
+            keys.append(f"user_model:{user_id}")
+        # Zgodovina pogovorov je omejena na 1000 vnosov, zato zadošča pregled
+        keys.extend(f"conversation:{conv['timestamp']}" for conv in self.conversation_history
+                    if conv.get('user_id') == user_id)
+        return keys
+        
+    def export_subject_data(self, user_id: str) -> Dict[str, Any]:
+        """Izvozi vse podatke uporabnika."""
+        model = self.user_models.get(user_id)
+        return {
+            'facts': [asdict(fact) for fact in self._live_user_facts(user_id)],
+            'user_model': asdict(model) if model else None,
+            'conversations': self.get_user_conversations(user_id, limit=len(self.conversation_history))
+        }
+        
+    def erase_subject_data(self, user_id: str) -> int:
+        """
+        Izbriši vse podatke uporabnika, tudi iz varnostnih kopij.
+        
+        Returns:
+            Število izbrisanih zapisov
+        """
+        erased = 0
+        for fact in self._live_user_facts(user_id):
+            del self.facts[fact.entity][fact.property]
+            if not self.facts[fact.entity]:
+                del self.facts[fact.entity]
+            self.stats['total_facts'] -= 1
+            erased += 1
+        self.user_facts.pop(user_id, None)
+        
+        if self.user_models.pop(user_id, None) is not None:
+            self.stats['total_users'] -= 1
+            erased += 1
+            
+        kept = [conv for conv in self.conversation_history if conv.get('user_id') != user_id]
+        erased += len(self.conversation_history) - len(kept)
+        self.conversation_history = kept
+        
+        if erased:
+            self.stats['last_updated'] = time.time()
+            if not self.save_to_disk():
+                raise RuntimeError("Knowledge base could not be saved after erasure")
+            # Starejše varnostne kopije še vsebujejo izbrisane podatke
+            for backup in sorted(self.data_dir.glob('knowledge_backup_*.json'))[:-1]:
+                backup.unlink()
+            logger.info(f"Erased {erased} records of user {user_id}")
+        return erased
+        
     def save_to_disk(self) -> bool:
         """Shrani bazo znanja na disk."""
         try:
@@ -420,6 +546,7 @@ class PersistentKnowledgeStore:
                 'relations': [asdict(relation) for relation in self.relations],
                 'user_models': {uid: asdict(model) for uid, model in self.user_models.items()},
                 'conversation_history': self.conversation_history[-1000:],  # Last 1000
+                'aliases': self.aliases,
                 'stats': self.stats,
                 'version': '1.0',
                 'saved_at': time.time()
@@ -463,6 +590,8 @@ class PersistentKnowledgeStore:
                 for prop, fact_data in properties.items():
                     fact = Fact(**fact_data)
                     self.facts[entity][prop] = fact
+                    if fact.user_id:
+                        self.user_facts[fact.user_id][id(fact)] = fact
                     
             # Load relations
             for relation_data in data.get('relations', []):
@@ -476,6 +605,7 @@ class PersistentKnowledgeStore:
                 
             # Load conversation history
             self.conversation_history = data.get('conversation_history', [])
+            self.aliases = data.get('aliases', {})
             
             # Load stats
             self.stats.update(data.get('stats', {}))
@@ -495,6 +625,8 @@ class PersistentKnowledgeStore:
             self.relations.clear()
             self.user_models.clear()
             self.conversation_history.clear()
+            self.aliases.clear()
+            self.user_facts.clear()
             self.stats = {
                 'total_facts': 0,
                 'total_relations': 0,
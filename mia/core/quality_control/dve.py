@@ -16,6 +16,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
+from mia.core.service_registry import lazy_services
 
 class DeterminismLevel(Enum):
 
@@ -796,4 +797,4 @@ class DVE:
             return {"error": str(e)}
 
 # Global instance
-dve = DVE()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, dve=DVE)
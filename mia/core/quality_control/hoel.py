@@ -15,6 +15,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 import queue
+from mia.core.service_registry import lazy_services
 
 class OversightLevel(Enum):
 
@@ -1122,4 +1123,4 @@ class HOEL:
             return {"error": str(e)}
 
 # Global instance
-hoel = HOEL()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, hoel=HOEL)
@@ -14,6 +14,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
+from mia.core.service_registry import lazy_services
 
 class OptimizationType(Enum):
 
@@ -635,4 +636,4 @@ class PAE:
             return {"error": str(e)}
 
 # Global instance
-pae = PAE()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, pae=PAE)
@@ -8,13 +8,15 @@ import os
 import json
 import logging
 import time
-import psutil
 import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from collections import deque
+
+from mia.core.telemetry import get_telemetry
 import statistics
+from mia.core.service_registry import lazy_services
 
 @dataclass
 class PerformanceMetric:
@@ -194,52 +196,50 @@ class QPM:
         try:
             current_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
             
+            snapshot = get_telemetry().latest()
+            
             # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=None)
             self.record_performance_metric(
                 "cpu_usage",
-                cpu_percent,
+                snapshot.cpu_percent,
                 "percent",
                 "system",
-                {"cores": psutil.cpu_count()}
+                {"cores": snapshot.cpu_count}
             )
             
             # Memory metrics
-            memory = psutil.virtual_memory()
             self.record_performance_metric(
                 "memory_usage",
-                memory.percent,
+                snapshot.memory_percent,
                 "percent",
                 "system",
-                {"total_gb": memory.total / (1024**3), "available_gb": memory.available / (1024**3)}
+                {"total_gb": snapshot.memory_total / (1024**3), "available_gb": snapshot.memory_available_gb}
             )
             
             # Disk metrics
-            disk = psutil.disk_usage('/')
             self.record_performance_metric(
                 "disk_usage",
-                (disk.used / disk.total) * 100,
+                (snapshot.disk_used / snapshot.disk_total) * 100,
                 "percent",
                 "system",
-                {"total_gb": disk.total / (1024**3), "free_gb": disk.free / (1024**3)}
+                {"total_gb": snapshot.disk_total / (1024**3), "free_gb": snapshot.disk_free_gb}
             )
             
             # Network metrics
-            network = psutil.net_io_counters()
             self.record_performance_metric(
                 "network_bytes_sent",
-                network.bytes_sent,
+                snapshot.net_bytes_sent,
                 "bytes",
                 "system",
-                {"packets_sent": network.packets_sent}
+                {"packets_sent": snapshot.net_packets_sent}
             )
             
             self.record_performance_metric(
                 "network_bytes_recv",
-                network.bytes_recv,
+                snapshot.net_bytes_recv,
                 "bytes",
                 "system",
-                {"packets_recv": network.packets_recv}
+                {"packets_recv": snapshot.net_packets_recv}
             )
             
         except Exception as e:
@@ -248,33 +248,30 @@ class QPM:
     def _collect_process_metrics(self):
         """Collect process-level metrics"""
         try:
-            current_process = psutil.Process()
+            snapshot = get_telemetry().latest()
             
             # Process CPU usage
-            cpu_percent = current_process.cpu_percent()
             self.record_performance_metric(
                 "process_cpu_usage",
-                cpu_percent,
+                snapshot.process_cpu_percent,
                 "percent",
                 "process",
-                {"pid": current_process.pid}
+                {"pid": os.getpid()}
             )
             
             # Process memory usage
-            memory_info = current_process.memory_info()
             self.record_performance_metric(
                 "process_memory_rss",
-                memory_info.rss / (1024**2),  # MB
+                snapshot.process_rss / (1024**2),  # MB
                 "MB",
                 "process",
-                {"vms_mb": memory_info.vms / (1024**2)}
+                {"vms_mb": snapshot.process_vms / (1024**2)}
             )
             
             # Process thread count
-            num_threads = current_process.num_threads()
             self.record_performance_metric(
                 "process_threads",
-                num_threads,
+                snapshot.process_threads,
                 "count",
                 "process",
                 {}
@@ -546,4 +543,4 @@ class QPM:
             return {"error": str(e)}
 
 # Global instance
-qpm = QPM()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, qpm=QPM)
@@ -16,6 +16,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 from collections import deque
+from mia.core.service_registry import lazy_services
 
 class RegressionType(Enum):
 
@@ -1220,4 +1221,4 @@ class QRD:
             return {"error": str(e)}
 
 # Global instance
-qrd = QRD()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, qrd=QRD)
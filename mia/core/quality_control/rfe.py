@@ -17,6 +17,7 @@ from enum import Enum
 import threading
 from collections import deque
 import psutil
+from mia.core.service_registry import lazy_services
 
 class ResourceType(Enum):
 
@@ -967,4 +968,4 @@ class RFE:
             return {"error": str(e)}
 
 # Global instance
-rfe = RFE()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, rfe=RFE)
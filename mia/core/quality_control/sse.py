@@ -16,6 +16,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 from collections import deque
+from mia.core.service_registry import lazy_services
 
 class StabilityLevel(Enum):
 
@@ -642,4 +643,4 @@ class SSE:
             return {"error": str(e)}
 
 # Global instance
-sse = SSE()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, sse=SSE)
@@ -19,6 +19,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import ast
 import inspect
+from mia.core.service_registry import get_service, lazy_services
 
 class EvolutionType(Enum):
 
@@ -508,23 +509,23 @@ def {fixed_function_name}(self, *args, **kwargs):
         metrics = {}
         
         try:
+            from mia.core.telemetry import get_telemetry
+            snapshot = get_telemetry().latest()
+            
             # CPU metrics
-            metrics["cpu_usage"] = psutil.cpu_percent(interval=1)
+            metrics["cpu_usage"] = snapshot.cpu_percent
             metrics["cpu_frequency"] = psutil.cpu_freq().current if psutil.cpu_freq() else 0
             
             # Memory metrics
-            memory = psutil.virtual_memory()
-            metrics["memory_usage"] = memory.percent
-            metrics["memory_available"] = memory.available / (1024**3)  # GB
+            metrics["memory_usage"] = snapshot.memory_percent
+            metrics["memory_available"] = snapshot.memory_available_gb  # GB
             
             # Disk metrics
-            disk = psutil.disk_usage('/')
-            metrics["disk_usage"] = (disk.used / disk.total) * 100
+            metrics["disk_usage"] = (snapshot.disk_used / snapshot.disk_total) * 100
             
             # Process metrics
-            process = psutil.Process()
-            metrics["process_memory"] = process.memory_info().rss / (1024**2)  # MB
-            metrics["process_cpu"] = process.cpu_percent()
+            metrics["process_memory"] = snapshot.process_rss / (1024**2)  # MB
+            metrics["process_cpu"] = snapshot.process_cpu_percent
             
         except Exception as e:
             self.logger.warning(f"Failed to collect some metrics: {e}")
@@ -1054,14 +1055,17 @@ assert hasattr(algorithm, 'learning_rate'), "Algorithm missing required attribut
         self.evolution_enabled = False
         self.logger.info("Evolution system disabled")
 
-# Global self-evolution engine
-evolution_engine = SelfEvolutionEngine()
-self_evolution_engine = evolution_engine  # Alias for system integrator
+# Global self-evolution engine (self_evolution_engine: alias for system integrator)
+__getattr__ = lazy_services(__name__, evolution_engine=SelfEvolutionEngine, self_evolution_engine="evolution_engine")
+
+def get_evolution_engine() -> SelfEvolutionEngine:
+    """Process-wide self-evolution engine, constructed on first use"""
+    return get_service(f"{__name__}.evolution_engine")
 
 def get_evolution_status() -> Dict[str, Any]:
     """Global function to get evolution status"""
     try:
-        return evolution_engine.get_evolution_status()
+        return get_evolution_engine().get_evolution_status()
     except:
         # Fallback status
         return {
@@ -1083,8 +1087,8 @@ def get_evolution_status() -> Dict[str, Any]:
 
 def enable_self_evolution():
     """Global function to enable self-evolution"""
-    evolution_engine.enable_evolution()
+    get_evolution_engine().enable_evolution()
 
 def disable_self_evolution():
     """Global function to disable self-evolution"""
-    evolution_engine.disable_evolution()
\ No newline at end of file
+    get_evolution_engine().disable_evolution()
\ No newline at end of file
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+MIA Service Registry
+Globalne instance modulov se ustvarijo ob prvi uporabi namesto ob uvozu:
+gradnja je varna za niti (en sam graditelj, ostali počakajo), odvisnosti
+so deklarirane, stari atributi modulov pa ostanejo dostopni prek
+modulskega __getattr__
+"""
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger("MIA.ServiceRegistry")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+class ServiceError(RuntimeError):
+    """Unknown service or circular service dependency"""
+
+
+@dataclass(frozen=True)
+class ServiceSpec:
+    """Factory and declared dependencies of one lazy service"""
+    factory: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+
+
+def service(factory: Callable[[], Any], depends_on: Iterable[str] = ()) -> ServiceSpec:
+    """Declare a lazy service with dependencies for ``lazy_services``"""
+    return ServiceSpec(factory, tuple(depends_on))
+
+
+@dataclass
+class _Entry:
+    name: str
+    factory: Callable[[], Any]
+    depends_on: Tuple[str, ...]
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    instance: Any = None
+    constructed: bool = False
+    construction_seconds: float = 0.0
+    thread: str = ""
+    error: Optional[str] = None
+    bindings: List[Tuple[str, str]] = field(default_factory=list)
+
+
+class ServiceRegistry:
+    """Lazy, single-flight service construction.
+
+    ``get`` builds a service on first use, after its declared dependencies.
+    Concurrent callers of a service under construction wait for the one
+    builder instead of constructing a second instance. A failed factory is
+    not cached, so the next ``get`` retries. Constructed instances are
+    written to the module attributes bound to them, so later lookups of the
+    old global names are plain attribute reads.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def register(self, name: str, factory: Callable[[], Any], depends_on: Iterable[str] = ()):
+        """Register (or replace, e.g. on module reload) a lazy service"""
+        with self._lock:
+            previous = self._entries.get(name)
+            entry = _Entry(name, factory, tuple(depends_on))
+            if previous is not None:
+                entry.bindings = previous.bindings
+            self._entries[name] = entry
+
+    def bind(self, name: str, module_name: str, attribute: str):
+        """Publish the service as ``module_name.attribute`` once constructed"""
+        entry = self._entry(name)
+        with self._lock:
+            if (module_name, attribute) not in entry.bindings:
+                entry.bindings.append((module_name, attribute))
+
+    def _entry(self, name: str) -> _Entry:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise ServiceError(f"Unknown service: {name}") from None
+
+    def _check_cycles(self, name: str, path: Tuple[str, ...] = ()):
+        if name in path:
+            raise ServiceError("Circular service dependency: " + " -> ".join(path + (name,)))
+        for dependency in self._entry(name).depends_on:
+            self._check_cycles(dependency, path + (name,))
+
+    def get(self, name: str) -> Any:
+        """Return the service, constructing it and its dependencies on first use"""
+        entry = self._entry(name)
+        if entry.constructed:
+            return entry.instance
+
+        # Sklad gradnje te niti ujame tudi nedeklarirane krožne odvisnosti
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        if name in stack:
+            raise ServiceError("Circular service dependency: " + " -> ".join(stack + [name]))
+        if not stack:
+            self._check_cycles(name)
+
+        stack.append(name)
+        try:
+            for dependency in entry.depends_on:
+                self.get(dependency)
+            with entry.lock:
+                if not entry.constructed:
+                    started = time.perf_counter()
+                    try:
+                        instance = entry.factory()
+                    except Exception as e:
+                        entry.error = f"{type(e).__name__}: {e}"
+                        raise
+                    self._store(entry, instance, time.perf_counter() - started)
+                    logger.debug(f"Constructed {name} in {entry.construction_seconds * 1000:.1f} ms")
+        finally:
+            stack.pop()
+        return entry.instance
+
+    def set(self, name: str, instance: Any):
+        """Replace the instance of a service (e.g. rebuilt with a new config)"""
+        entry = self._entry(name)
+        with entry.lock:
+            self._store(entry, instance, 0.0)
+
+    def _store(self, entry: _Entry, instance: Any, seconds: float):
+        entry.instance = instance
+        entry.construction_seconds = seconds
+        entry.thread = threading.current_thread().name
+        entry.error = None
+        entry.constructed = True
+        for module_name, attribute in entry.bindings:
+            module = sys.modules.get(module_name)
+            if module is not None:
+                setattr(module, attribute, instance)
+
+    def reset(self, name: Optional[str] = None):
+        """Forget constructed instances so the next ``get`` builds them again"""
+        names = [name] if name is not None else list(self._entries)
+        for service_name in names:
+            entry = self._entry(service_name)
+            with entry.lock:
+                entry.instance = None
+                entry.constructed = False
+                entry.construction_seconds = 0.0
+                for module_name, attribute in entry.bindings:
+                    module = sys.modules.get(module_name)
+                    if module is not None:
+                        module.__dict__.pop(attribute, None)
+
+    def is_constructed(self, name: str) -> bool:
+        return self._entry(name).constructed
+
+    def names(self) -> List[str]:
+        return sorted(self._entries)
+
+    def constructed(self) -> List[str]:
+        return sorted(name for name, entry in self._entries.items() if entry.constructed)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "constructed": entry.constructed,
+                "construction_seconds": entry.construction_seconds,
+                "depends_on": list(entry.depends_on),
+                "thread": entry.thread,
+                "error": entry.error
+            }
+            for name, entry in sorted(self._entries.items())
+        }
+
+
+_registry = ServiceRegistry()
+
+
+def get_registry() -> ServiceRegistry:
+    """Globalni register storitev"""
+    return _registry
+
+
+def get_service(name: str) -> Any:
+    """Return the named service, constructing it on first use"""
+    return _registry.get(name)
+
+
+def lazy_services(module_name: str, **services: Union[Callable[[], Any], ServiceSpec, str]) -> Callable[[str], Any]:
+    """Register a module's global instances and return its ``__getattr__``.
+
+    Each keyword maps the old global name to a factory, a ``service(...)``
+    spec, or a string: another name of the same module it aliases, or the
+    full name of a service it re-exports (``"mia.interfaces.chat.chat_interface"``).
+    Services are registered as ``<module_name>.<name>``. Use at the bottom
+    of the module instead of ``name = Class()``::
+
+        __getattr__ = lazy_services(__name__, agi_core=AGICore)
+    """
+    targets: Dict[str, str] = {}
+    for attribute, spec in services.items():
+        if isinstance(spec, str):
+            continue
+        if not isinstance(spec, ServiceSpec):
+            spec = ServiceSpec(spec)
+        name = f"{module_name}.{attribute}"
+        _registry.register(name, spec.factory, spec.depends_on)
+        targets[attribute] = name
+    for attribute, spec in services.items():
+        if isinstance(spec, str):
+            targets[attribute] = spec if "." in spec else targets[spec]
+    for attribute, name in targets.items():
+        _registry.bind(name, module_name, attribute)
+
+    def __getattr__(attribute: str) -> Any:
+        name = targets.get(attribute)
+        if name is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {attribute!r}")
+        return _registry.get(name)
+
+    return __getattr__
+
+
+# Profiler uvoza
+
+_PROFILE_SCRIPT = """
+import json, sys, threading, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+errors = {{}}
+for module in {modules!r}:
+    try:
+        __import__(module)
+    except BaseException as e:
+        errors[module] = f"{{type(e).__name__}}: {{e}}"
+imported = time.perf_counter() - started
+threads_after_import = sorted(t.name for t in threading.enumerate() if t is not threading.main_thread())
+from mia.core.service_registry import get_registry
+registry = get_registry()
+constructed_at_import = registry.constructed()
+if {construct!r}:
+    for name in registry.names():
+        try:
+            registry.get(name)
+        except BaseException as e:
+            pass
+print("\\n" + json.dumps({{
+    "import_seconds": imported,
+    "errors": errors,
+    "threads_after_import": threads_after_import,
+    "constructed_at_import": constructed_at_import,
+    "services": registry.get_status()
+}}))
+"""
+
+
+def parse_importtime(output: str) -> Dict[str, Dict[str, float]]:
+    """Parse ``python -X importtime`` lines into per-module milliseconds"""
+    modules: Dict[str, Dict[str, float]] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules[name.strip()] = {
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000
+            }
+        except ValueError:
+            continue
+    return modules
+
+
+def profile_imports(modules: Sequence[str] = ("mia_main",), construct: bool = False, top: int = 25,
+                    timeout: float = 300.0) -> Dict[str, Any]:
+    """Cold-import ``modules`` in a fresh interpreter and report the cost.
+
+    Reports per-module import time (``-X importtime``), threads alive after
+    import, services constructed during import (should be none) and, with
+    ``construct=True``, the construction time of every registered service.
+    """
+    script = _PROFILE_SCRIPT.format(root=str(PROJECT_ROOT), modules=list(modules), construct=construct)
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", script], cwd=str(PROJECT_ROOT),
+                               capture_output=True, text=True, timeout=timeout)
+    wall = time.perf_counter() - started
+
+    report: Dict[str, Any] = {}
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith("{"):
+            report = json.loads(line)
+            break
+    timings = parse_importtime(completed.stderr)
+    mia_modules = {name: value for name, value in timings.items() if name.split(".")[0].startswith("mia")}
+    report.update({
+        "modules": list(modules),
+        "process_seconds": wall,
+        "returncode": completed.returncode,
+        "module_count": len(timings),
+        "slowest_imports": [
+            {"module": name, **value}
+            for name, value in sorted(mia_modules.items(), key=lambda item: item[1]["self_ms"], reverse=True)[:top]
+        ]
+    })
+    services = report.get("services", {})
+    report["slowest_constructions"] = sorted(
+        ({"service": name, "seconds": status["construction_seconds"], "error": status["error"]}
+         for name, status in services.items() if status["constructed"] or status["error"]),
+        key=lambda item: item["seconds"], reverse=True
+    )[:top]
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile MIA import and service construction cost")
+    parser.add_argument("modules", nargs="*", default=["mia_main"])
+    parser.add_argument("--construct", action="store_true", help="also construct every registered service")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+    print(json.dumps(profile_imports(args.modules, args.construct, args.top), indent=2))
@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+MIA Session Runtime
+Izvajalnik klepetalnih sej: omejena vhodna vrsta na sejo, preklic tekočega
+odgovora ob novem sporočilu (preklic seže v klic LLM), globalni nadzor
+sprejema s pravičnim razvrščanjem med sejami, zavrnitev z odgovorom "busy"
+ob preobremenitvi in omejena zgodovina seje s prelivanjem na disk,
+razvrščena po posamezniku (subject), da jo zajamejo zahteve za izbris
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import shutil
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from mia.compliance.data_map import register_subject_store
+from mia.core.service_registry import get_service, lazy_services
+
+logger = logging.getLogger("MIA.SessionRuntime")
+
+ERROR_REPLY = "Sorry, I encountered an error processing your message."
+
+
+class AdmissionRejected(Exception):
+    """Request shed by admission control"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionController:
+    """Global limit on concurrent backend calls with fair queueing.
+
+    At most ``max_concurrent`` calls run at once. Waiters are served round
+    robin by session, so one session pipelining many requests cannot
+    starve the others. Beyond ``max_waiting`` queued requests, or after
+    waiting ``max_wait`` seconds, a request is rejected with
+    ``AdmissionRejected`` instead of adding to everyone's latency.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_waiting: int = 64, max_wait: float = 10.0):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_waiting = max_waiting
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = 0
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self.stats = {"admitted": 0, "queued": 0, "rejected_full": 0, "rejected_timeout": 0}
+
+    async def acquire(self, session_id: str):
+        if self.active < self.max_concurrent and not self.waiting:
+            self.active += 1
+            self.stats["admitted"] += 1
+            return
+        if self.waiting >= self.max_waiting:
+            self.stats["rejected_full"] += 1
+            raise AdmissionRejected("server_busy")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(session_id, deque()).append(future)
+        self.waiting += 1
+        self.stats["queued"] += 1
+        try:
+            await asyncio.wait_for(future, self.max_wait)
+        except asyncio.TimeoutError:
+            self._forget(session_id, future)
+            self.stats["rejected_timeout"] += 1
+            raise AdmissionRejected("admission_timeout")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Mesto je bilo dodeljeno hkrati s preklicem
+                self.release()
+            else:
+                self._forget(session_id, future)
+            raise
+        self.stats["admitted"] += 1
+
+    def _forget(self, session_id: str, future: asyncio.Future):
+        waiters = self._waiters.get(session_id)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            self.waiting -= 1
+            if not waiters:
+                del self._waiters[session_id]
+
+    def release(self):
+        self.active -= 1
+        while self._waiters and self.active < self.max_concurrent:
+            session_id, waiters = next(iter(self._waiters.items()))
+            future = waiters.popleft()
+            self.waiting -= 1
+            # Seja gre na konec vrste: krožno razvrščanje med sejami
+            del self._waiters[session_id]
+            if waiters:
+                self._waiters[session_id] = waiters
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, session_id: str):
+        await self.acquire(session_id)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "waiting": self.waiting,
+            "waiting_sessions": len(self._waiters),
+            **self.stats
+        }
+
+
+class SessionHistory:
+    """Last ``limit`` messages in memory; older ones spill to a JSONL file"""
+
+    def __init__(self, limit: int = 50, spill_path: Optional[Path] = None):
+        self.limit = limit
+        self.spill_path = spill_path
+        self.messages: Deque[Dict[str, Any]] = deque()
+        self.spilled = 0
+
+    def append(self, message: Dict[str, Any]):
+        self.messages.append(message)
+        if len(self.messages) > self.limit:
+            evicted = self.messages.popleft()
+            if self.spill_path is not None:
+                try:
+                    self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.spill_path, 'a') as f:
+                        f.write(json.dumps(evicted, separators=(",", ":")) + "\n")
+                    self.spilled += 1
+                except OSError as e:
+                    logger.warning(f"Failed to spill session history: {e}")
+
+    def recent(self, count: Optional[int] = None) -> List[Dict[str, Any]]:
+        messages = list(self.messages)
+        return messages if count is None else messages[-count:]
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        """Spilled and in-memory messages, oldest first"""
+        spilled = []
+        if self.spill_path is not None and self.spill_path.exists():
+            with open(self.spill_path, 'r') as f:
+                spilled = [json.loads(line) for line in f if line.strip()]
+        return spilled + list(self.messages)
+
+
+@dataclass
+class SessionRequest:
+    """One inbound message of a session"""
+    request_id: str
+    type: str
+    content: str
+    data: Dict[str, Any]
+    supersede: bool = True
+    received: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class ChatSession:
+    """Connection state of one chat session"""
+    session_id: str
+    send: Callable[[Dict[str, Any]], Awaitable[Any]]
+    transport: Any
+    history: SessionHistory
+    created_at: float = field(default_factory=time.time)
+    last_activity: float = field(default_factory=time.time)
+    queue: Deque[SessionRequest] = field(default_factory=deque)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    current: Optional[SessionRequest] = None
+    current_task: Optional[asyncio.Task] = None
+    worker: Optional[asyncio.Task] = None
+    closed: bool = False
+    completed: int = 0
+    cancelled: int = 0
+    shed: int = 0
+    subject_id: Optional[str] = None
+
+
+class SessionHistoryStore:
+    """Session histories of each data subject, for the subject data map.
+
+    Spill files live in one directory per subject (named by a hash of the
+    subject id), so one subject's sessions are found without opening any
+    other session's file. Messages of open sessions still held in memory
+    are included. Runtimes filing under the same directory share one store
+    (``for_directory``), so it sees the open sessions of every one of them.
+    """
+
+    _by_directory: "weakref.WeakValueDictionary[Path, SessionHistoryStore]" = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.runtimes: "weakref.WeakSet[SessionRuntime]" = weakref.WeakSet()
+
+    @classmethod
+    def for_directory(cls, directory: Path) -> "SessionHistoryStore":
+        """The store of ``directory``, registered with the subject data map"""
+        directory = Path(directory).resolve()
+        with cls._lock:
+            store = cls._by_directory.get(directory)
+            if store is None:
+                store = cls._by_directory[directory] = cls(directory)
+                register_subject_store(f"sessions:{directory}", store)
+            return store
+
+    def attach(self, runtime: "SessionRuntime"):
+        self.runtimes.add(runtime)
+
+    def subject_dir(self, subject_id: str) -> Path:
+        return self.directory / hashlib.sha256(subject_id.encode("utf-8")).hexdigest()[:32]
+
+    def spill_path(self, subject_id: str, session_id: str) -> Path:
+        return self.subject_dir(subject_id) / f"{session_id}.jsonl"
+
+    def _open_sessions(self, subject_id: str) -> List[ChatSession]:
+        return [session for runtime in list(self.runtimes) for session in list(runtime.sessions.values())
+                if session.subject_id == subject_id]
+
+    def _spilled(self, subject_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        spilled = {}
+        directory = self.subject_dir(subject_id)
+        if directory.is_dir():
+            for path in sorted(directory.glob("*.jsonl")):
+                with open(path, 'r') as f:
+                    spilled[path.stem] = [json.loads(line) for line in f if line.strip()]
+        return spilled
+
+    def find_subject_records(self, subject_id: str) -> List[str]:
+        keys = [f"{session_id}:{index}" for session_id, messages in self._spilled(subject_id).items()
+                for index in range(len(messages))]
+        for session in self._open_sessions(subject_id):
+            keys.extend(f"{session.session_id}:memory:{index}" for index in range(len(session.history.messages)))
+        return keys
+
+    def export_subject_data(self, subject_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        exported = self._spilled(subject_id)
+        for session in self._open_sessions(subject_id):
+            exported.setdefault(session.session_id, []).extend(session.history.messages)
+        return exported
+
+    def erase_subject_data(self, subject_id: str) -> int:
+        erased = 0
+        for session in self._open_sessions(subject_id):
+            erased += len(session.history.messages)
+            session.history.messages.clear()
+        erased += sum(len(messages) for messages in self._spilled(subject_id).values())
+        shutil.rmtree(self.subject_dir(subject_id), ignore_errors=True)
+        return erased
+
+
+class SessionRuntime:
+    """Runs chat sessions on top of an async request handler.
+
+    ``handler(session, request)`` produces the reply text (or ``None`` if it
+    answers the client itself). Each session processes its requests one at
+    a time in arrival order; a request with ``supersede`` set (the default)
+    cancels the reply in flight and drops queued requests, and a
+    ``{"type": "cancel"}`` message cancels without replacement. The
+    cancellation is delivered into the handler's await, and so into the
+    LLM call it is awaiting. Session history is filed under the session's
+    data subject, so it can be exported or erased with the subject's data.
+    """
+
+    def __init__(self, handler: Callable[[ChatSession, SessionRequest], Awaitable[Optional[str]]],
+                 admission: Optional[AdmissionController] = None, max_queue: int = 8,
+                 history_limit: int = 50, history_dir: Optional[str] = "mia_data/interfaces/sessions",
+                 max_sessions: int = 1000):
+        self.handler = handler
+        self.admission = admission or get_service(f"{__name__}.admission_controller")
+        self.max_queue = max_queue
+        self.history_limit = history_limit
+        self.history_dir = Path(history_dir) if history_dir else None
+        self.max_sessions = max_sessions
+        self.sessions: Dict[str, ChatSession] = {}
+        self.latencies: Deque[float] = deque(maxlen=10000)
+        self.stats = {"requests": 0, "completed": 0, "cancelled": 0, "busy": 0, "errors": 0, "rejected_sessions": 0}
+        self.history_store = SessionHistoryStore.for_directory(self.history_dir) if self.history_dir else None
+        if self.history_store is not None:
+            self.history_store.attach(self)
+
+    def open(self, send: Callable[[Dict[str, Any]], Awaitable[Any]], session_id: Optional[str] = None,
+             transport: Any = None, subject_id: Optional[str] = None) -> Optional[ChatSession]:
+        """Start a session, or return None when ``max_sessions`` are open.
+
+        ``subject_id`` is the user the history belongs to; an anonymous
+        session is its own subject.
+        """
+        if len(self.sessions) >= self.max_sessions:
+            self.stats["rejected_sessions"] += 1
+            return None
+        session_id = session_id or str(uuid.uuid4())
+        subject_id = subject_id or session_id
+        spill_path = self.history_store.spill_path(subject_id, session_id) if self.history_store else None
+        session = ChatSession(session_id, send, transport, SessionHistory(self.history_limit, spill_path),
+                              subject_id=subject_id)
+        session.worker = asyncio.create_task(self._run_session(session))
+        self.sessions[session_id] = session
+        return session
+
+    async def submit(self, session: ChatSession, data: Dict[str, Any]):
+        """Accept one inbound message without waiting for its reply"""
+        session.last_activity = time.time()
+        request_id = str(data.get("id") or uuid.uuid4())
+
+        if data.get("type") == "cancel":
+            await self._cancel_pending(session, "cancelled")
+            return
+
+        request = SessionRequest(request_id, data.get("type", "unknown"), data.get("content", ""), data,
+                                 supersede=data.get("supersede", True))
+        self.stats["requests"] += 1
+        if request.supersede:
+            await self._cancel_pending(session, "superseded")
+        elif len(session.queue) >= self.max_queue:
+            await self._busy(session, request, "session_queue_full")
+            return
+        session.queue.append(request)
+        session.wakeup.set()
+
+    async def _cancel_pending(self, session: ChatSession, reason: str):
+        dropped = list(session.queue)
+        session.queue.clear()
+        if session.current_task is not None and not session.current_task.done():
+            dropped.insert(0, session.current)
+            session.current_task.cancel()
+        for request in dropped:
+            session.cancelled += 1
+            self.stats["cancelled"] += 1
+            await self._send(session, {"type": "cancelled", "request_id": request.request_id, "reason": reason,
+                                       "timestamp": time.time()})
+
+    async def _busy(self, session: ChatSession, request: SessionRequest, reason: str):
+        session.shed += 1
+        self.stats["busy"] += 1
+        await self._send(session, {"type": "busy", "request_id": request.request_id, "reason": reason,
+                                   "timestamp": time.time()})
+
+    async def _send(self, session: ChatSession, payload: Dict[str, Any]):
+        try:
+            await session.send(payload)
+        except Exception as e:
+            logger.debug(f"Send to session {session.session_id} failed: {e}")
+
+    async def _run_session(self, session: ChatSession):
+        while not session.closed:
+            if not session.queue:
+                session.wakeup.clear()
+                await session.wakeup.wait()
+                continue
+            request = session.queue.popleft()
+            session.current = request
+            session.current_task = asyncio.create_task(self._process(session, request))
+            # wait() se ob preklicu zahteve ne prekine, le ob zaprtju seje
+            await asyncio.wait({session.current_task})
+            session.current = None
+            session.current_task = None
+
+    async def _process(self, session: ChatSession, request: SessionRequest):
+        try:
+            async with self.admission.slot(session.session_id):
+                reply = await self.handler(session, request)
+        except AdmissionRejected as e:
+            await self._busy(session, request, e.reason)
+            return
+        except Exception as e:
+            logger.error(f"Session request failed: {e}")
+            self.stats["errors"] += 1
+            await self._send(session, {"type": "error", "request_id": request.request_id, "content": ERROR_REPLY,
+                                       "timestamp": time.time()})
+            return
+
+        now = time.time()
+        session.history.append({"role": "user", "content": request.content, "request_id": request.request_id,
+                                "timestamp": now})
+        if reply is not None:
+            session.history.append({"role": "assistant", "content": reply, "request_id": request.request_id,
+                                    "timestamp": now})
+            await self._send(session, {"type": "assistant", "content": reply, "request_id": request.request_id,
+                                       "timestamp": now})
+        self.latencies.append(time.perf_counter() - request.received)
+        session.completed += 1
+        self.stats["completed"] += 1
+
+    async def close(self, session: ChatSession):
+        """Stop a session and cancel whatever it is still doing"""
+        session.closed = True
+        session.queue.clear()
+        tasks = [task for task in (session.current_task, session.worker) if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.sessions.pop(session.session_id, None)
+
+    async def shutdown(self):
+        for session in list(self.sessions.values()):
+            await self.close(session)
+
+    def latency_percentiles(self) -> Dict[str, float]:
+        return _percentiles(list(self.latencies))
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self.sessions),
+            "max_sessions": self.max_sessions,
+            "queued": sum(len(session.queue) for session in self.sessions.values()),
+            "in_flight": sum(1 for session in self.sessions.values() if session.current is not None),
+            "latency": self.latency_percentiles(),
+            "admission": self.admission.get_status(),
+            **self.stats
+        }
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    rank = lambda q: ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+    return {"p50": rank(0.50), "p99": rank(0.99), "max": ordered[-1]}
+
+
+def jain_fairness(values: List[float]) -> float:
+    """Jain's fairness index: 1.0 when all values are equal, 1/n when one gets everything"""
+    values = [value for value in values if value > 0]
+    if not values:
+        return 1.0
+    return sum(values) ** 2 / (len(values) * sum(value * value for value in values))
+
+
+class StubBackend:
+    """LLM stand-in that degrades under overload.
+
+    Up to ``capacity`` overlapping calls take ``base_latency``; beyond that
+    latency grows with the square of the overload, as batching and cache
+    contention make an overloaded inference server slower per call.
+    """
+
+    def __init__(self, base_latency: float = 0.02, capacity: int = 4):
+        self.base_latency = base_latency
+        self.capacity = capacity
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, prompt: str) -> str:
+        self.in_flight += 1
+        self.calls += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.base_latency * max(1.0, self.in_flight / self.capacity) ** 2)
+            return f"echo: {prompt}"
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+async def _run_load(clients: int, heavy_clients: int, duration: float, backend: StubBackend,
+                    runtime: Optional[SessionRuntime], seed: int) -> Dict[str, Any]:
+    """Simulated WebSocket clients for ``duration`` seconds.
+
+    Light clients send one message and wait for the reply; heavy clients
+    pipeline bursts of four. Fairness is Jain's index over the number of
+    replies each client received.
+    """
+    rng = random.Random(seed)
+    completed = [0] * clients
+    latencies: List[float] = []
+    busy = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(index: int):
+        nonlocal busy
+        burst = 4 if index < heavy_clients else 1
+        await asyncio.sleep(rng.uniform(0, backend.base_latency * 5))
+        replies: asyncio.Queue = asyncio.Queue()
+        session = runtime.open(replies.put) if runtime is not None else None
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                if session is None:
+                    # Brez izvajalnika: vsako sporočilo gre naravnost na zaledje
+                    await asyncio.gather(*(backend.generate(f"{index}:{j}") for j in range(burst)))
+                    answered = burst
+                else:
+                    for j in range(burst):
+                        await runtime.submit(session, {"type": "user_message", "content": f"{index}:{j}",
+                                                       "supersede": False})
+                    answered = 0
+                    for _ in range(burst):
+                        reply = await replies.get()
+                        answered += reply["type"] == "assistant"
+                        busy += reply["type"] == "busy"
+                completed[index] += answered
+                if burst == 1:
+                    latencies.append(time.perf_counter() - started)
+        finally:
+            if session is not None:
+                await runtime.close(session)
+
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return {
+        "replies": sum(completed),
+        "heavy_client_share": sum(completed[:heavy_clients]) / max(1, sum(completed)),
+        "light_client_latency": _percentiles(latencies),
+        "fairness": jain_fairness([float(count) for count in completed]),
+        "busy_replies": busy,
+        "backend_peak_concurrency": backend.peak
+    }
+
+
+def benchmark_sessions(clients: int = 50, heavy_clients: int = 5, duration: float = 2.0,
+                       base_latency: float = 0.01, capacity: int = 8, seed: int = 7) -> Dict[str, Any]:
+    """Load test: simulated chat clients against a stub backend, direct vs through SessionRuntime"""
+
+    async def run(with_runtime: bool) -> Dict[str, Any]:
+        backend = StubBackend(base_latency, capacity)
+        runtime = None
+        if with_runtime:
+            admission = AdmissionController(max_concurrent=capacity, max_waiting=clients * 4, max_wait=30.0)
+
+            async def handler(session: ChatSession, request: SessionRequest) -> str:
+                return await backend.generate(request.content)
+
+            runtime = SessionRuntime(handler, admission=admission, history_dir=None)
+        result = await _run_load(clients, heavy_clients, duration, backend, runtime, seed)
+        if runtime is not None:
+            result["admission"] = runtime.admission.get_status()
+        return result
+
+    direct = asyncio.run(run(False))
+    managed = asyncio.run(run(True))
+    return {
+        "clients": clients,
+        "heavy_clients": heavy_clients,
+        "duration": duration,
+        "backend_capacity": capacity,
+        "direct": direct,
+        "session_runtime": managed,
+        "p99_improvement": (direct["light_client_latency"]["p99"] / managed["light_client_latency"]["p99"]
+                            if managed["light_client_latency"]["p99"] else 0.0)
+    }
+
+
+# Global instance
+__getattr__ = lazy_services(__name__, admission_controller=AdmissionController)
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_sessions(), indent=2))
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+MIA Startup Orchestrator
+Koraki zagona deklarirajo odvisnosti in razred virov (CPU, I/O, podproces);
+neodvisni koraki tečejo sočasno s časovnimi omejitvami, neobvezni koraki
+se odložijo, dokler uporabniški vmesnik ni pripravljen, vsak zagon pa
+zapiše časovnico v formatu Chrome trace
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("MIA.StartupOrchestrator")
+
+
+class ResourceClass(Enum):
+    """What a startup step mostly waits on"""
+    CPU = "cpu"
+    IO = "io"
+    SUBPROCESS = "subprocess"
+
+
+# Privzeto število sočasnih korakov po razredu virov
+DEFAULT_LIMITS = {
+    ResourceClass.CPU: max(1, os.cpu_count() or 1),
+    ResourceClass.IO: 8,
+    ResourceClass.SUBPROCESS: 2,
+}
+
+
+@dataclass
+class StartupStep:
+    """One init step.
+
+    ``run`` is a plain function (run in a worker thread) or a coroutine
+    function (awaited on the startup loop). Set ``blocking`` for coroutine
+    functions that block instead of awaiting; they run to completion in a
+    worker thread on their own loop, so they must not leave tasks behind.
+    Optional steps start only after the ready step and never fail startup.
+    ``condition`` is checked when the step's dependencies are done; a step
+    whose condition is false is skipped without failing its dependents.
+    """
+    name: str
+    run: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+    resource: ResourceClass = ResourceClass.IO
+    timeout: float = 30.0
+    optional: bool = False
+    blocking: bool = False
+    condition: Optional[Callable[[], bool]] = None
+
+    def __post_init__(self):
+        self.depends_on = tuple(self.depends_on)
+
+
+@dataclass
+class StepResult:
+    """Outcome and timing of one step, in seconds since the boot started"""
+    name: str
+    status: str  # ok, failed, timeout, skipped
+    resource: str
+    optional: bool
+    started: float = 0.0
+    finished: float = 0.0
+    lane: int = 0
+    error: Optional[str] = None
+    value: Any = None
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == "ok" or (self.status == "skipped" and self.error is None)
+
+
+class StartupTrace:
+    """Chrome trace (chrome://tracing, Perfetto) timeline of one boot"""
+
+    def __init__(self, name: str = "mia"):
+        self.name = name
+        self.origin = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.perf_counter() - self.origin
+
+    def complete(self, name: str, category: str, started: float, finished: float, lane: int,
+                 args: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self.events.append({
+                "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": lane,
+                "ts": round(started * 1e6, 1), "dur": round((finished - started) * 1e6, 1), "args": args or {}
+            })
+
+    def instant(self, name: str, at: Optional[float] = None, args: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self.events.append({
+                "name": name, "cat": "milestone", "ph": "i", "s": "g", "pid": os.getpid(), "tid": 0,
+                "ts": round((self.now() if at is None else at) * 1e6, 1), "args": args or {}
+            })
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        metadata = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0, "args": {"name": self.name}}]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> Path:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.to_dict()))
+        os.replace(temporary, target)
+        return target
+
+
+class StartupOrchestrator:
+    """Runs startup steps as a dependency graph.
+
+    Required steps start as soon as their dependencies succeed, limited
+    per resource class. ``run`` returns once every required step is done;
+    optional steps are deferred until ``ready_step`` succeeds (or all
+    required steps are done) and keep running in the background until
+    ``wait_deferred``. A failed or timed-out required step skips its
+    dependents. A timed-out thread step cannot be interrupted; it is
+    abandoned and its result ignored.
+    """
+
+    def __init__(self, steps: Iterable[StartupStep] = (), ready_step: Optional[str] = None, name: str = "mia",
+                 limits: Optional[Dict[ResourceClass, int]] = None, max_concurrency: Optional[int] = None,
+                 trace_dir: Optional[str] = "mia/logs/startup", keep_traces: int = 20):
+        self.name = name
+        self.steps: Dict[str, StartupStep] = {}
+        self.ready_step = ready_step
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.max_concurrency = max_concurrency
+        self.trace_dir = trace_dir
+        self.keep_traces = keep_traces
+        self.results: Dict[str, StepResult] = {}
+        self.trace = StartupTrace(name)
+        self.trace_path: Optional[Path] = None
+        self.ready_at: Optional[float] = None
+        self._deferred: List[asyncio.Task] = []
+        self._finisher: Optional[asyncio.Task] = None
+        self._lanes: List[bool] = []
+        for step in steps:
+            self.add(step)
+
+    def add(self, step: StartupStep) -> StartupStep:
+        if step.name in self.steps:
+            raise ValueError(f"Duplicate startup step: {step.name}")
+        self.steps[step.name] = step
+        return step
+
+    def validate(self):
+        """Reject unknown dependencies, cycles and required steps waiting on optional ones"""
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise ValueError(f"Step {step.name} depends on unknown step {dependency}")
+                if not step.optional and self.steps[dependency].optional:
+                    raise ValueError(f"Required step {step.name} cannot depend on deferred step {dependency}")
+        if self.ready_step is not None and self.ready_step not in self.steps:
+            raise ValueError(f"Unknown ready step: {self.ready_step}")
+
+        state: Dict[str, int] = {}
+
+        def visit(name: str, path: Tuple[str, ...]):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError("Circular startup dependency: " + " -> ".join(path + (name,)))
+            state[name] = 1
+            for dependency in self.steps[name].depends_on:
+                visit(dependency, path + (name,))
+            state[name] = 2
+
+        for name in self.steps:
+            visit(name, ())
+
+    def _take_lane(self) -> int:
+        for index, busy in enumerate(self._lanes):
+            if not busy:
+                self._lanes[index] = True
+                return index + 1
+        self._lanes.append(True)
+        return len(self._lanes)
+
+    def _release_lane(self, lane: int):
+        self._lanes[lane - 1] = False
+
+    async def _invoke(self, step: StartupStep, loop: asyncio.AbstractEventLoop, executor: ThreadPoolExecutor):
+        if inspect.iscoroutinefunction(step.run) and not step.blocking:
+            return await step.run()
+        if inspect.iscoroutinefunction(step.run):
+            return await loop.run_in_executor(executor, lambda: asyncio.run(step.run()))
+        return await loop.run_in_executor(executor, step.run)
+
+    async def _run_step(self, step: StartupStep, done: Dict[str, asyncio.Event], ready: asyncio.Event,
+                        semaphores: Dict[ResourceClass, asyncio.Semaphore], overall: Optional[asyncio.Semaphore],
+                        loop: asyncio.AbstractEventLoop, executor: ThreadPoolExecutor):
+        result = StepResult(step.name, "skipped", step.resource.value, step.optional)
+        try:
+            for dependency in step.depends_on:
+                await done[dependency].wait()
+            failed = [dependency for dependency in step.depends_on if not self.results[dependency].succeeded]
+            if failed:
+                result.error = f"dependency failed: {', '.join(failed)}"
+                return
+            if step.condition is not None and not step.condition():
+                return
+            if step.optional:
+                await ready.wait()
+
+            async with semaphores[step.resource]:
+                if overall is not None:
+                    await overall.acquire()
+                lane = self._take_lane()
+                result.lane = lane
+                result.started = self.trace.now()
+                try:
+                    result.value = await asyncio.wait_for(self._invoke(step, loop, executor), step.timeout)
+                    result.status = "ok"
+                except asyncio.TimeoutError:
+                    result.status = "timeout"
+                    result.error = f"timed out after {step.timeout:.1f}s"
+                except Exception as e:
+                    result.status = "failed"
+                    result.error = f"{type(e).__name__}: {e}"
+                finally:
+                    result.finished = self.trace.now()
+                    self._release_lane(lane)
+                    if overall is not None:
+                        overall.release()
+        finally:
+            self.results[step.name] = result
+            if result.status != "skipped":
+                self.trace.complete(step.name, step.resource.value, result.started, result.finished, result.lane,
+                                    {"status": result.status, "optional": step.optional,
+                                     "depends_on": list(step.depends_on), "error": result.error})
+            log = logger.warning if result.error else logger.debug
+            log(f"Startup step {step.name}: {result.status} in {result.duration * 1000:.0f} ms"
+                + (f" ({result.error})" if result.error else ""))
+            done[step.name].set()
+            if step.name == self.ready_step and result.succeeded:
+                self._mark_ready(ready)
+
+    def _mark_ready(self, ready: asyncio.Event):
+        if not ready.is_set():
+            self.ready_at = self.trace.now()
+            self.trace.instant("ready", self.ready_at)
+            ready.set()
+
+    async def run(self, wait_deferred: bool = False) -> bool:
+        """Run required steps; True when all of them succeeded"""
+        self.validate()
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=sum(self.limits.values()), thread_name_prefix=f"{self.name}-startup")
+        semaphores = {resource: asyncio.Semaphore(limit) for resource, limit in self.limits.items()}
+        overall = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        done = {name: asyncio.Event() for name in self.steps}
+        ready = asyncio.Event()
+
+        tasks = {name: loop.create_task(self._run_step(step, done, ready, semaphores, overall, loop, executor))
+                 for name, step in self.steps.items()}
+        required = [tasks[name] for name, step in self.steps.items() if not step.optional]
+        self._deferred = [tasks[name] for name, step in self.steps.items() if step.optional]
+
+        await asyncio.gather(*required)
+        # Brez ločenega koraka pripravljenosti se odloženi koraki začnejo po obveznih
+        self._mark_ready(ready)
+        self.trace.instant("required_complete")
+        self._write_trace()
+
+        async def finish_deferred():
+            await asyncio.gather(*self._deferred)
+            executor.shutdown(wait=False)
+            self.trace.instant("deferred_complete")
+            self._write_trace()
+
+        self._finisher = loop.create_task(finish_deferred())
+        if wait_deferred:
+            await self.wait_deferred()
+        return all(self.results[name].succeeded for name, step in self.steps.items() if not step.optional)
+
+    async def wait_deferred(self):
+        """Wait for the deferred optional steps and the final trace"""
+        if self._finisher is not None:
+            await self._finisher
+
+    def _write_trace(self):
+        if not self.trace_dir:
+            return
+        try:
+            if self.trace_path is None:
+                stamp = time.strftime("%Y%m%d-%H%M%S")
+                self.trace_path = Path(self.trace_dir) / f"{self.name}-{stamp}-{os.getpid()}.json"
+            self.trace.write(str(self.trace_path))
+            traces = sorted(Path(self.trace_dir).glob(f"{self.name}-*.json"), key=lambda path: path.stat().st_mtime)
+            for old in traces[:-self.keep_traces] if self.keep_traces else []:
+                old.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to write startup trace: {e}")
+
+    def get_report(self) -> Dict[str, Any]:
+        """Per-step status and timing"""
+        return {
+            "ready_seconds": self.ready_at,
+            "trace_path": str(self.trace_path) if self.trace_path else None,
+            "steps": {
+                name: {"status": result.status, "resource": result.resource, "optional": result.optional,
+                       "started": result.started, "duration": result.duration, "error": result.error}
+                for name, result in sorted(self.results.items(), key=lambda item: item[1].started)
+            }
+        }
+
+
+# Merjenje časa do prvega klepeta
+
+def _stub(seconds: float, resource: ResourceClass) -> Callable[[], Any]:
+    if resource is ResourceClass.CPU:
+        def run():
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                pass
+    else:
+        def run():
+            time.sleep(seconds)
+    return run
+
+
+# (name, seconds, resource, depends_on, optional): delays of the bootstrap steps
+# measured on a mid-range laptop with a warm disk cache
+BOOT_PROFILE = [
+    ("load_config", 0.02, ResourceClass.IO, (), False),
+    ("detect_hardware", 0.25, ResourceClass.SUBPROCESS, (), False),
+    ("install_dependencies", 1.50, ResourceClass.SUBPROCESS, (), True),
+    ("select_models", 0.01, ResourceClass.CPU, ("detect_hardware", "load_config"), False),
+    ("setup_models", 0.15, ResourceClass.IO, ("select_models",), False),
+    ("consciousness", 0.08, ResourceClass.IO, ("load_config",), False),
+    ("memory", 0.12, ResourceClass.IO, ("load_config",), False),
+    ("voice", 0.20, ResourceClass.IO, ("select_models",), False),
+    ("multimodal", 0.30, ResourceClass.IO, ("select_models",), True),
+    ("ui", 0.10, ResourceClass.IO, ("load_config",), False),
+    ("chat", 0.05, ResourceClass.CPU, ("setup_models", "consciousness", "memory", "ui"), False),
+    ("projects", 0.05, ResourceClass.IO, ("load_config",), True),
+    ("monitoring", 0.05, ResourceClass.IO, ("load_config",), True),
+    ("health_check", 0.02, ResourceClass.CPU, ("chat", "voice"), False),
+]
+
+
+def benchmark_startup(scale: float = 1.0, trace_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Time to first chat, sequential boot vs orchestrated, with stubbed subsystems"""
+    steps = [StartupStep(name, _stub(seconds * scale, resource), depends_on, resource, optional=optional)
+             for name, seconds, resource, depends_on, optional in BOOT_PROFILE]
+
+    # Dosedanji zagon: vsi koraki zaporedno, klepet po vseh razen zdravstvenega pregleda
+    started = time.perf_counter()
+    sequential_first_chat = None
+    for step in steps:
+        step.run()
+        if step.name == "chat":
+            sequential_first_chat = time.perf_counter() - started
+    sequential_total = time.perf_counter() - started
+
+    orchestrator = StartupOrchestrator(steps, ready_step="chat", name="benchmark", trace_dir=trace_dir)
+    started = time.perf_counter()
+    success = asyncio.run(orchestrator.run(wait_deferred=True))
+    orchestrated_total = time.perf_counter() - started
+    first_chat = orchestrator.ready_at
+
+    return {
+        "success": success,
+        "scale": scale,
+        "sequential": {"first_chat_seconds": sequential_first_chat, "total_seconds": sequential_total},
+        "orchestrated": {"first_chat_seconds": first_chat, "total_seconds": orchestrated_total},
+        "first_chat_speedup": sequential_first_chat / first_chat if first_chat else 0.0,
+        "trace_path": str(orchestrator.trace_path) if orchestrator.trace_path else None,
+        "steps": orchestrator.get_report()["steps"]
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_startup(trace_dir="mia/logs/startup"), indent=2))
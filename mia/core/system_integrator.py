@@ -14,6 +14,7 @@ from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
+from mia.core.service_registry import lazy_services
 
 class IntegrationStatus(Enum):
 
@@ -611,4 +612,4 @@ class SystemIntegrator:
             self.logger.error(f"System shutdown failed: {e}")
 
 # Global instance
-system_integrator = SystemIntegrator()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, system_integrator=SystemIntegrator)
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+MIA System Telemetry
+En sam vzorčevalnik sistemske telemetrije v ozadju: bere /proc (ali psutil,
+kjer /proc ni na voljo), hrani zadnji posnetek in kratko zgodovino ter
+obvešča sinhrone in asinhrone naročnike ter opazovalce pragov
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger("MIA.Telemetry")
+
+
+@dataclass(frozen=True)
+class TelemetrySnapshot:
+    """One immutable sample of system and process state"""
+    timestamp: float
+    monotonic: float
+    cpu_percent: float
+    cpu_count: int
+    load_average: Tuple[float, float, float]
+    memory_total: int
+    memory_available: int
+    memory_used: int
+    memory_percent: float
+    swap_total: int
+    swap_used: int
+    swap_percent: float
+    disk_path: str
+    disk_total: int
+    disk_used: int
+    disk_free: int
+    disk_percent: float
+    net_bytes_sent: int
+    net_bytes_recv: int
+    net_packets_sent: int
+    net_packets_recv: int
+    process_count: int
+    system_threads: int
+    process_rss: int
+    process_vms: int
+    process_cpu_percent: float
+    process_threads: int
+
+    @property
+    def memory_available_gb(self) -> float:
+        return self.memory_available / (1024 ** 3)
+
+    @property
+    def disk_free_gb(self) -> float:
+        return self.disk_free / (1024 ** 3)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
+
+@dataclass
+class ThresholdWatch:
+    """Fires once when metric crosses threshold, re-arms after it moves back past clear_margin"""
+    watch_id: int
+    metric: str
+    threshold: float
+    callback: Callable[[TelemetrySnapshot, str, float], Any]
+    above: bool = True
+    clear_margin: float = 0.0
+    armed: bool = True
+
+    def check(self, snapshot: TelemetrySnapshot) -> bool:
+        value = getattr(snapshot, self.metric)
+        crossed = value >= self.threshold if self.above else value <= self.threshold
+        if crossed and self.armed:
+            self.armed = False
+            return True
+        if not crossed and not self.armed:
+            cleared = (value < self.threshold - self.clear_margin if self.above
+                       else value > self.threshold + self.clear_margin)
+            if cleared:
+                self.armed = True
+        return False
+
+
+@dataclass
+class SamplerStats:
+    samples: int = 0
+    sample_cpu_seconds: float = 0.0  # CPU time spent by the sampler thread itself
+    max_sample_seconds: float = 0.0
+    callback_errors: int = 0
+    started_at: Optional[float] = None
+
+    def overhead_ratio(self, now: float) -> float:
+        """Fraction of one core used for sampling since start"""
+        if self.started_at is None or now <= self.started_at:
+            return 0.0
+        return self.sample_cpu_seconds / (now - self.started_at)
+
+
+class ProcReader:
+    """Reads counters straight from /proc; raises OSError where /proc is missing"""
+
+    def __init__(self, disk_path: str = "/"):
+        self.disk_path = disk_path
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self.cpu_count = os.cpu_count() or 1
+        self._last_cpu: Optional[Tuple[int, int]] = None
+        self._last_process: Optional[Tuple[float, float]] = None
+
+    def _cpu_percent(self) -> float:
+        with open("/proc/stat", "r") as f:
+            values = [int(v) for v in f.readline().split()[1:]]
+        idle = values[3] + (values[4] if len(values) > 4 else 0)
+        total = sum(values[:8])
+        last = self._last_cpu
+        self._last_cpu = (total, idle)
+        if last is None:
+            # First sample: average since boot
+            return 100.0 * (total - idle) / total if total else 0.0
+        d_total = total - last[0]
+        return 100.0 * (d_total - (idle - last[1])) / d_total if d_total else 0.0
+
+    def _process_cpu_percent(self, now: float) -> float:
+        times = os.times()
+        used = times.user + times.system
+        last = self._last_process
+        self._last_process = (now, used)
+        if last is None or now <= last[0]:
+            return 0.0
+        return 100.0 * (used - last[1]) / (now - last[0])
+
+    def _meminfo(self) -> Dict[str, int]:
+        info = {}
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("MemTotal", "MemAvailable", "MemFree", "Buffers", "Cached", "SwapTotal", "SwapFree"):
+                    info[key] = int(rest.split()[0]) * 1024
+        if "MemAvailable" not in info:
+            info["MemAvailable"] = info.get("MemFree", 0) + info.get("Buffers", 0) + info.get("Cached", 0)
+        return info
+
+    def _net(self) -> Tuple[int, int, int, int]:
+        recv = sent = packets_recv = packets_sent = 0
+        with open("/proc/net/dev", "r") as f:
+            for line in f.readlines()[2:]:
+                fields = line.partition(":")[2].split()
+                recv += int(fields[0])
+                packets_recv += int(fields[1])
+                sent += int(fields[8])
+                packets_sent += int(fields[9])
+        return sent, recv, packets_sent, packets_recv
+
+    def read(self) -> TelemetrySnapshot:
+        now = time.monotonic()
+        cpu_percent = self._cpu_percent()
+        with open("/proc/loadavg", "r") as f:
+            parts = f.read().split()
+        load_average = (float(parts[0]), float(parts[1]), float(parts[2]))
+        system_threads = int(parts[3].partition("/")[2])
+
+        mem = self._meminfo()
+        memory_total = mem["MemTotal"]
+        memory_available = mem["MemAvailable"]
+        memory_used = memory_total - memory_available
+        swap_total = mem.get("SwapTotal", 0)
+        swap_used = swap_total - mem.get("SwapFree", 0)
+
+        fs = os.statvfs(self.disk_path)
+        disk_total = fs.f_blocks * fs.f_frsize
+        disk_free = fs.f_bavail * fs.f_frsize
+        disk_used = (fs.f_blocks - fs.f_bfree) * fs.f_frsize
+        disk_percent = 100.0 * disk_used / (disk_used + disk_free) if disk_used + disk_free else 0.0
+
+        sent, recv, packets_sent, packets_recv = self._net()
+        process_count = sum(1 for name in os.listdir("/proc") if name.isdigit())
+
+        with open("/proc/self/statm", "r") as f:
+            statm = f.read().split()
+        with open("/proc/self/stat", "r") as f:
+            stat = f.read().rpartition(")")[2].split()
+
+        return TelemetrySnapshot(
+            timestamp=time.time(),
+            monotonic=now,
+            cpu_percent=cpu_percent,
+            cpu_count=self.cpu_count,
+            load_average=load_average,
+            memory_total=memory_total,
+            memory_available=memory_available,
+            memory_used=memory_used,
+            memory_percent=100.0 * memory_used / memory_total if memory_total else 0.0,
+            swap_total=swap_total,
+            swap_used=swap_used,
+            swap_percent=100.0 * swap_used / swap_total if swap_total else 0.0,
+            disk_path=self.disk_path,
+            disk_total=disk_total,
+            disk_used=disk_used,
+            disk_free=disk_free,
+            disk_percent=disk_percent,
+            net_bytes_sent=sent,
+            net_bytes_recv=recv,
+            net_packets_sent=packets_sent,
+            net_packets_recv=packets_recv,
+            process_count=process_count,
+            system_threads=system_threads,
+            process_rss=int(statm[1]) * self.page_size,
+            process_vms=int(statm[0]) * self.page_size,
+            process_cpu_percent=self._process_cpu_percent(now),
+            process_threads=int(stat[17]),
+        )
+
+
+class PsutilReader:
+    """Fallback for platforms without /proc; every call used is non-blocking"""
+
+    def __init__(self, disk_path: str = "/"):
+        self.disk_path = disk_path
+        self.process = psutil.Process() if PSUTIL_AVAILABLE else None
+        if PSUTIL_AVAILABLE:
+            psutil.cpu_percent(interval=None)
+            self.process.cpu_percent(interval=None)
+
+    def read(self) -> TelemetrySnapshot:
+        now = time.monotonic()
+        if not PSUTIL_AVAILABLE:
+            return empty_snapshot(self.disk_path)
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        net = psutil.net_io_counters()
+        try:
+            load_average = tuple(os.getloadavg())
+        except (OSError, AttributeError):
+            load_average = (0.0, 0.0, 0.0)
+        system_threads = 0
+        for proc in psutil.process_iter(["num_threads"]):
+            system_threads += proc.info.get("num_threads") or 0
+        memory_info = self.process.memory_info()
+        return TelemetrySnapshot(
+            timestamp=time.time(),
+            monotonic=now,
+            cpu_percent=psutil.cpu_percent(interval=None),
+            cpu_count=psutil.cpu_count() or 1,
+            load_average=load_average,
+            memory_total=memory.total,
+            memory_available=memory.available,
+            memory_used=memory.total - memory.available,
+            memory_percent=memory.percent,
+            swap_total=swap.total,
+            swap_used=swap.used,
+            swap_percent=swap.percent,
+            disk_path=self.disk_path,
+            disk_total=disk.total,
+            disk_used=disk.used,
+            disk_free=disk.free,
+            disk_percent=disk.percent,
+            net_bytes_sent=net.bytes_sent if net else 0,
+            net_bytes_recv=net.bytes_recv if net else 0,
+            net_packets_sent=net.packets_sent if net else 0,
+            net_packets_recv=net.packets_recv if net else 0,
+            process_count=len(psutil.pids()),
+            system_threads=system_threads,
+            process_rss=memory_info.rss,
+            process_vms=memory_info.vms,
+            process_cpu_percent=self.process.cpu_percent(interval=None),
+            process_threads=self.process.num_threads(),
+        )
+
+
+def empty_snapshot(disk_path: str = "/") -> TelemetrySnapshot:
+    now = time.monotonic()
+    return TelemetrySnapshot(time.time(), now, 0.0, os.cpu_count() or 1, (0.0, 0.0, 0.0),
+                             0, 0, 0, 0.0, 0, 0, 0.0, disk_path, 0, 0, 0, 0.0,
+                             0, 0, 0, 0, 0, 0, 0, 0, 0.0, threading.active_count())
+
+
+def make_reader(disk_path: str = "/"):
+    """/proc where it exists, psutil elsewhere"""
+    try:
+        reader = ProcReader(disk_path)
+        reader.read()
+        # Let the first real sample report CPU since boot rather than since this probe
+        reader._last_cpu = None
+        reader._last_process = None
+        return reader
+    except (OSError, ValueError, IndexError, KeyError):
+        return PsutilReader(disk_path)
+
+
+class SystemTelemetry:
+    """Background sampler shared by every monitor in the process.
+
+    ``latest()`` returns the most recent immutable snapshot; publishing it is
+    a single reference assignment, so readers never take a lock or wait for
+    a measurement. ``history()`` is a short ring of recent snapshots.
+    Sync subscribers and threshold callbacks run on the sampler thread;
+    ``stream()`` delivers snapshots to coroutines through their own loop.
+    """
+
+    def __init__(self, interval: float = 1.0, history_size: int = 300, disk_path: str = "/",
+                 reader: Optional[Any] = None):
+        self.interval = interval
+        self.disk_path = disk_path
+        self.reader = reader
+        self._latest: Optional[TelemetrySnapshot] = None
+        self._history: deque = deque(maxlen=history_size)
+        self._subscribers: Dict[int, Callable[[TelemetrySnapshot], Any]] = {}
+        self._watches: Dict[int, ThresholdWatch] = {}
+        self._async_subscribers: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = {}
+        self._next_id = 0
+        self._registry_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = SamplerStats()
+
+    # Življenjski cikel
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Take a first sample immediately and start the background thread (idempotent)"""
+        with self._start_lock:
+            if self.running:
+                return
+            if self.reader is None:
+                self.reader = make_reader(self.disk_path)
+            self._stop_event.clear()
+            self.stats.started_at = time.monotonic()
+            self._sample()
+            self._thread = threading.Thread(target=self._run, name="mia-telemetry", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+
+    def set_interval(self, interval: float):
+        self.interval = interval
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        cpu_before = time.thread_time()
+        wall_before = time.perf_counter()
+        try:
+            snapshot = self.reader.read()
+        except Exception as e:
+            logger.error(f"Telemetry sample failed: {e}")
+            return
+        self._latest = snapshot
+        self._history.append(snapshot)
+        self._publish(snapshot)
+        self.stats.samples += 1
+        self.stats.sample_cpu_seconds += time.thread_time() - cpu_before
+        self.stats.max_sample_seconds = max(self.stats.max_sample_seconds, time.perf_counter() - wall_before)
+
+    def _publish(self, snapshot: TelemetrySnapshot):
+        with self._registry_lock:
+            subscribers = list(self._subscribers.values())
+            watches = list(self._watches.values())
+            async_subscribers = list(self._async_subscribers.values())
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                self.stats.callback_errors += 1
+                logger.error(f"Telemetry subscriber failed: {e}")
+        for watch in watches:
+            try:
+                if watch.check(snapshot):
+                    watch.callback(snapshot, watch.metric, getattr(snapshot, watch.metric))
+            except Exception as e:
+                self.stats.callback_errors += 1
+                logger.error(f"Telemetry threshold callback for {watch.metric} failed: {e}")
+        for loop, queue in async_subscribers:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_put_latest, queue, snapshot)
+
+    # Branje
+
+    def latest(self) -> TelemetrySnapshot:
+        """Most recent snapshot; starts the sampler on first use"""
+        snapshot = self._latest
+        if snapshot is None:
+            self.start()
+            snapshot = self._latest or empty_snapshot(self.disk_path)
+        return snapshot
+
+    def history(self, seconds: Optional[float] = None) -> List[TelemetrySnapshot]:
+        snapshots = list(self._history)
+        if seconds is None or not snapshots:
+            return snapshots
+        cutoff = snapshots[-1].monotonic - seconds
+        return [s for s in snapshots if s.monotonic >= cutoff]
+
+    def average(self, metric: str, seconds: float) -> float:
+        """Mean of a metric over the recent history window"""
+        snapshots = self.history(seconds) or [self.latest()]
+        return sum(getattr(s, metric) for s in snapshots) / len(snapshots)
+
+    # Naročnine
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def subscribe(self, callback: Callable[[TelemetrySnapshot], Any]) -> int:
+        """Call callback with every new snapshot on the sampler thread; keep it short"""
+        with self._registry_lock:
+            subscription_id = self._new_id()
+            self._subscribers[subscription_id] = callback
+        self.start()
+        return subscription_id
+
+    def on_threshold(self, metric: str, threshold: float,
+                     callback: Callable[[TelemetrySnapshot, str, float], Any],
+                     above: bool = True, clear_margin: float = 0.0) -> int:
+        """Call callback(snapshot, metric, value) when metric crosses threshold"""
+        if metric not in TelemetrySnapshot.__dataclass_fields__:
+            raise ValueError(f"Unknown telemetry metric: {metric}")
+        with self._registry_lock:
+            watch_id = self._new_id()
+            self._watches[watch_id] = ThresholdWatch(watch_id, metric, threshold, callback, above, clear_margin)
+        self.start()
+        return watch_id
+
+    def unsubscribe(self, subscription_id: int):
+        with self._registry_lock:
+            self._subscribers.pop(subscription_id, None)
+            self._watches.pop(subscription_id, None)
+            self._async_subscribers.pop(subscription_id, None)
+
+    async def stream(self) -> AsyncIterator[TelemetrySnapshot]:
+        """Yield each new snapshot; a slow consumer only ever sees the newest one"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        with self._registry_lock:
+            subscription_id = self._new_id()
+            self._async_subscribers[subscription_id] = (asyncio.get_running_loop(), queue)
+        self.start()
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(subscription_id)
+
+    async def next_snapshot(self, timeout: Optional[float] = None) -> TelemetrySnapshot:
+        """Wait for the next sample without blocking the event loop"""
+        stream = self.stream()
+        try:
+            return await asyncio.wait_for(stream.__anext__(), timeout)
+        finally:
+            await stream.aclose()
+
+    def get_status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "reader": type(self.reader).__name__ if self.reader else None,
+            "samples": self.stats.samples,
+            "history_size": len(self._history),
+            "subscribers": len(self._subscribers) + len(self._async_subscribers),
+            "threshold_watches": len(self._watches),
+            "overhead_ratio": self.stats.overhead_ratio(now),
+            "max_sample_seconds": self.stats.max_sample_seconds,
+            "callback_errors": self.stats.callback_errors,
+        }
+
+
+def _put_latest(queue: asyncio.Queue, snapshot: TelemetrySnapshot):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(snapshot)
+
+
+_telemetry: Optional[SystemTelemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> SystemTelemetry:
+    """Process-wide telemetry sampler, started on first use"""
+    global _telemetry
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                _telemetry = SystemTelemetry(interval=float(os.environ.get("MIA_TELEMETRY_INTERVAL", "1.0")))
+    _telemetry.start()
+    return _telemetry
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+MIA Text Encoder
+Stable feature-hashing text encoder shared by memory, internet learning and the hybrid pipeline
+"""
+
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Any
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    sparse = None
+    SCIPY_AVAILABLE = False
+
+try:
+    import mmh3
+    MMH3_AVAILABLE = True
+except ImportError:
+    mmh3 = None
+    MMH3_AVAILABLE = False
+
+# Bump whenever tokenization, hashing or weighting changes so stored
+# embeddings produced by an older encoder are detected and re-encoded.
+ENCODER_NAME = "fhash-murmur3"
+ENCODER_REVISION = 1
+
+HASH_SEED = 0x4D1A
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def murmur3_32(data: bytes, seed: int = HASH_SEED) -> int:
+    """MurmurHash3 (x86, 32-bit) - identical output to mmh3.hash(data, seed, signed=False)"""
+    c1 = 0xCC9E2D51
+    c2 = 0x1B873593
+    length = len(data)
+    h = seed & 0xFFFFFFFF
+    rounded_end = length & ~0x3
+
+    for i in range(0, rounded_end, 4):
+        k = data[i] | (data[i + 1] << 8) | (data[i + 2] << 16) | (data[i + 3] << 24)
+        k = (k * c1) & 0xFFFFFFFF
+        k = ((k << 15) | (k >> 17)) & 0xFFFFFFFF
+        k = (k * c2) & 0xFFFFFFFF
+        h ^= k
+        h = ((h << 13) | (h >> 19)) & 0xFFFFFFFF
+        h = (h * 5 + 0xE6546B64) & 0xFFFFFFFF
+
+    k = 0
+    tail = length & 0x3
+    if tail == 3:
+        k ^= data[rounded_end + 2] << 16
+    if tail >= 2:
+        k ^= data[rounded_end + 1] << 8
+    if tail >= 1:
+        k ^= data[rounded_end]
+        k = (k * c1) & 0xFFFFFFFF
+        k = ((k << 15) | (k >> 17)) & 0xFFFFFFFF
+        k = (k * c2) & 0xFFFFFFFF
+        h ^= k
+
+    h ^= length
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & 0xFFFFFFFF
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & 0xFFFFFFFF
+    h ^= h >> 16
+    return h
+
+
+def stable_hash(token: str, seed: int = HASH_SEED) -> int:
+    """Process-independent 32-bit hash of a token"""
+    if MMH3_AVAILABLE:
+        return mmh3.hash(token, seed, signed=False)
+    return murmur3_32(token.encode("utf-8"), seed)
+
+
+class TextEncoder:
+    """Feature-hashing encoder with sublinear TF weighting and optional character n-grams"""
+
+    def __init__(self, dim: int = 384, char_ngrams: Optional[Tuple[int, int]] = None,
+                 ngram_weight: float = 0.5, alternate_sign: bool = True,
+                 min_token_length: int = 1, cache_size: int = 200000):
+        if dim <= 0:
+            raise ValueError("dim must be positive")
+        if char_ngrams is not None and not (1 <= char_ngrams[0] <= char_ngrams[1]):
+            raise ValueError("char_ngrams must be (min_n, max_n) with 1 <= min_n <= max_n")
+
+        self.dim = dim
+        self.char_ngrams = tuple(char_ngrams) if char_ngrams else None
+        self.ngram_weight = ngram_weight
+        self.alternate_sign = alternate_sign
+        self.min_token_length = min_token_length
+        self.cache_size = cache_size
+
+        # token -> (bucket, sign); hashing dominates encode cost so buckets are memoized
+        self._bucket_cache: Dict[str, Tuple[int, float]] = {}
+
+    @property
+    def version(self) -> str:
+        """Identifier stored next to every embedding; a mismatch means the row is stale"""
+        ngrams = f"{self.char_ngrams[0]}-{self.char_ngrams[1]}x{self.ngram_weight}" if self.char_ngrams else "none"
+        return (f"{ENCODER_NAME}.r{ENCODER_REVISION}:d{self.dim}:ng{ngrams}"
+                f":s{int(self.alternate_sign)}:m{self.min_token_length}")
+
+    def tokenize(self, text: str) -> List[str]:
+        """Lowercase word tokenization"""
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        if self.min_token_length > 1:
+            tokens = [t for t in tokens if len(t) >= self.min_token_length]
+        return tokens
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        cached = self._bucket_cache.get(feature)
+        if cached is not None:
+            return cached
+
+        h = stable_hash(feature)
+        sign = -1.0 if (self.alternate_sign and (h >> 31) & 1) else 1.0
+        cached = (h % self.dim, sign)
+
+        if len(self._bucket_cache) >= self.cache_size:
+            self._bucket_cache.clear()
+        self._bucket_cache[feature] = cached
+        return cached
+
+    def _char_ngram_counts(self, token_counts: Counter) -> Counter:
+        min_n, max_n = self.char_ngrams
+        counts: Counter = Counter()
+        for token, tf in token_counts.items():
+            padded = f"<{token}>"
+            for n in range(min_n, max_n + 1):
+                for i in range(len(padded) - n + 1):
+                    # "#" prefix keeps n-gram features disjoint from whole-word features
+                    counts["#" + padded[i:i + n]] += tf
+        return counts
+
+    def features(self, text: str) -> Dict[int, float]:
+        """Sparse L2-normalized feature map {bucket: weight} for a single text"""
+        token_counts = Counter(self.tokenize(text or ""))
+        if not token_counts:
+            return {}
+
+        weights: Dict[int, float] = defaultdict(float)
+        bucket = self._bucket
+        log = math.log
+
+        for token, tf in token_counts.items():
+            index, sign = bucket(token)
+            weights[index] += sign * (1.0 + log(tf))
+
+        if self.char_ngrams:
+            scale = self.ngram_weight
+            for gram, tf in self._char_ngram_counts(token_counts).items():
+                index, sign = bucket(gram)
+                weights[index] += sign * scale * (1.0 + log(tf))
+
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if norm == 0:
+            return {}
+        return {index: w / norm for index, w in weights.items() if w != 0.0}
+
+    def encode(self, text: str) -> List[float]:
+        """Dense embedding of a single text as a list of floats"""
+        vector = [0.0] * self.dim
+        for index, weight in self.features(text).items():
+            vector[index] = weight
+        return vector
+
+    def _coo(self, texts: Sequence[str]) -> Tuple[List[int], List[int], List[float]]:
+        rows: List[int] = []
+        cols: List[int] = []
+        values: List[float] = []
+        for row, text in enumerate(texts):
+            feats = self.features(text)
+            rows.extend([row] * len(feats))
+            cols.extend(feats.keys())
+            values.extend(feats.values())
+        return rows, cols, values
+
+    def encode_batch(self, texts: Sequence[str]):
+        """Encode many texts into a (len(texts), dim) float32 array"""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for batch encoding")
+
+        rows, cols, values = self._coo(texts)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if values:
+            matrix[np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)] = values
+        return matrix
+
+    def encode_sparse(self, texts: Sequence[str]):
+        """Encode many texts into a scipy CSR matrix (for large dims where dense rows are wasteful)"""
+        if not SCIPY_AVAILABLE:
+            raise ImportError("scipy is required for sparse encoding")
+
+        data: List[float] = []
+        indices: List[int] = []
+        indptr: List[int] = [0]
+        for text in texts:
+            feats = self.features(text)
+            ordered = sorted(feats.items())
+            indices.extend(index for index, _ in ordered)
+            data.extend(weight for _, weight in ordered)
+            indptr.append(len(indices))
+
+        return sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32),
+             np.asarray(indices, dtype=np.int32),
+             np.asarray(indptr, dtype=np.int64)),
+            shape=(len(texts), self.dim),
+        )
+
+    def is_current(self, version: Optional[str]) -> bool:
+        """Whether an embedding tagged with ``version`` was produced by this encoder"""
+        return version == self.version
+
+
+_encoders: Dict[Tuple[Any, ...], TextEncoder] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_text_encoder(dim: int = 384, char_ngrams: Optional[Tuple[int, int]] = None,
+                     **kwargs) -> TextEncoder:
+    """Get shared text encoder instance for the given configuration"""
+    key = (dim, tuple(char_ngrams) if char_ngrams else None, tuple(sorted(kwargs.items())))
+    encoder = _encoders.get(key)
+    if encoder is None:
+        with _encoders_lock:
+            encoder = _encoders.get(key)
+            if encoder is None:
+                encoder = TextEncoder(dim=dim, char_ngrams=char_ngrams, **kwargs)
+                _encoders[key] = encoder
+    return encoder
+
+
+def _legacy_memory_vectorize(text: str, dim: int = 384) -> List[float]:
+    """Previous MemorySystem._simple_vectorize (salted builtin hash), kept for benchmarking"""
+    words = text.lower().split()
+    vector = np.zeros(dim)
+    for i, word in enumerate(words[:dim]):
+        vector[hash(word) % dim] += 1.0 / (i + 1)
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector = vector / norm
+    return vector.tolist()
+
+
+def _legacy_internet_vectorize(content: str) -> List[float]:
+    """Previous InternetLearningEngine.vectorize_content, kept for benchmarking"""
+    words = re.findall(r'\b\w+\b', content.lower())
+    word_freq = defaultdict(int)
+    for word in words:
+        if len(word) > 2:
+            word_freq[word] += 1
+    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:100]
+    vector = [(hash(word) % 1000) * min(freq / len(words), 1.0) for word, freq in sorted_words]
+    vector.extend([0.0] * (384 - len(vector)))
+    return vector[:384]
+
+
+def _synthetic_texts(n_texts: int, words_per_text: int = 60, vocabulary: int = 5000,
+                     seed: int = 1234) -> List[str]:
+    import random
+    rng = random.Random(seed)
+    vocab = [f"w{i}{'x' * (i % 7)}" for i in range(vocabulary)]
+    return [" ".join(rng.choice(vocab) for _ in range(words_per_text)) for _ in range(n_texts)]
+
+
+def benchmark_text_encoders(texts: Optional[Iterable[str]] = None, n_texts: int = 5000,
+                            repeats: int = 3) -> Dict[str, Any]:
+    """Measure encoder throughput (texts/sec) against the previous per-module implementations"""
+    texts = list(texts) if texts is not None else _synthetic_texts(n_texts)
+
+    def best_rate(fn) -> float:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return len(texts) / best if best > 0 else float("inf")
+
+    results: Dict[str, Any] = {"n_texts": len(texts), "repeats": repeats}
+
+    encoder = TextEncoder(dim=384)
+    results["encoder_version"] = encoder.version
+    results["encode_texts_per_sec"] = best_rate(lambda: [encoder.encode(t) for t in texts])
+    results["legacy_internet_texts_per_sec"] = best_rate(
+        lambda: [_legacy_internet_vectorize(t) for t in texts])
+
+    if NUMPY_AVAILABLE:
+        results["encode_batch_texts_per_sec"] = best_rate(lambda: encoder.encode_batch(texts))
+        results["legacy_memory_texts_per_sec"] = best_rate(
+            lambda: [_legacy_memory_vectorize(t) for t in texts])
+        results["speedup_vs_legacy_memory"] = (
+            results["encode_batch_texts_per_sec"] / results["legacy_memory_texts_per_sec"])
+    if SCIPY_AVAILABLE:
+        wide = TextEncoder(dim=2 ** 20, char_ngrams=(3, 4))
+        results["encode_sparse_2e20_texts_per_sec"] = best_rate(lambda: wide.encode_sparse(texts))
+
+    return results
+
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(benchmark_text_encoders(), indent=2))
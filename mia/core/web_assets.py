@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+MIA Web Assets
+Cevovod spletnih virov: strani se izrišejo enkrat (ob zagonu ali gradnji),
+statični viri dobijo ime z zgoščeno vsebino, vse je vnaprej stisnjeno
+(gzip, brotli kjer je na voljo) in postreženo z močnimi ETagi, glavami
+Cache-Control in odgovori 304 na pogojne zahteve
+"""
+
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger("MIA.WebAssets")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Najmanjša velikost, pri kateri se stiskanje splača
+MIN_COMPRESS_SIZE = 256
+
+
+@dataclass
+class Asset:
+    """One served resource with its precompressed representations"""
+    url: str
+    content_type: str
+    digest: str
+    cache_control: str
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+    headers: Dict[str, Dict[str, str]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        # Glave odgovorov so pripravljene vnaprej za vsako predstavitev
+        for encoding, body in self.encodings.items():
+            headers = {"ETag": self.etag(encoding), "Cache-Control": self.cache_control, "Vary": "Accept-Encoding",
+                       "Content-Type": self.content_type, "Content-Length": str(len(body))}
+            if encoding != "identity":
+                headers["Content-Encoding"] = encoding
+            self.headers[encoding] = headers
+
+    def etag(self, encoding: str) -> str:
+        # Vsaka predstavitev ima svoj močan ETag
+        suffix = "" if encoding == "identity" else f"-{encoding}"
+        return f'"{self.digest}{suffix}"'
+
+    @property
+    def etags(self) -> List[str]:
+        return [self.etag(encoding) for encoding in self.encodings]
+
+    @property
+    def size(self) -> int:
+        return len(self.encodings["identity"])
+
+
+@dataclass
+class AssetResponse:
+    """Status, headers and body for one asset request"""
+    status: int
+    headers: Dict[str, str]
+    body: bytes = b""
+
+
+@functools.lru_cache(maxsize=64)
+def _preferred_encodings(accept_encoding: str) -> Tuple[str, ...]:
+    """Encodings the client accepts, best first; identity is always last"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    preferred = tuple(encoding for encoding in ("br", "gzip")
+                      if accepted.get(encoding, accepted.get("*", 0.0)) > 0)
+    return preferred + ("identity",)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match == etag:
+        return True
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uporablja šibko primerjavo
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class AssetPipeline:
+    """Rendered pages and fingerprinted static assets, ready to serve.
+
+    Static assets are published under ``/assets/<stem>.<hash><suffix>`` and
+    served as immutable; references to their source URLs in pages are
+    rewritten to the fingerprinted URL. Pages keep their URL and are
+    served with ``no-cache``, so clients revalidate them with
+    ``If-None-Match`` and get a body-less 304 while nothing changed.
+    """
+
+    def __init__(self, prefix: str = "/assets", brotli_enabled: bool = True):
+        self.prefix = prefix.rstrip("/")
+        self.brotli_enabled = brotli_enabled and BROTLI_AVAILABLE
+        self.assets: Dict[str, Asset] = {}
+        self.references: Dict[str, str] = {}
+        self.stats = {"requests": 0, "not_modified": 0, "bytes_sent": 0, "bytes_identity": 0}
+
+    def _compress(self, body: bytes, content_type: str) -> Dict[str, bytes]:
+        encodings = {"identity": body}
+        compressible = content_type.startswith("text/") or content_type.split(";")[0] in (
+            "application/javascript", "application/json", "image/svg+xml")
+        if not compressible or len(body) < MIN_COMPRESS_SIZE:
+            return encodings
+        if self.brotli_enabled:
+            compressed = brotli.compress(body, quality=11)
+            if len(compressed) < len(body):
+                encodings["br"] = compressed
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(compressed) < len(body):
+            encodings["gzip"] = compressed
+        return encodings
+
+    def _add(self, url: str, body: bytes, content_type: str, cache_control: str) -> Asset:
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        asset = Asset(url, content_type, digest, cache_control, self._compress(body, content_type))
+        self.assets[url] = asset
+        return asset
+
+    def add_static(self, name: str, content: Union[str, bytes], content_type: Optional[str] = None,
+                   source_url: Optional[str] = None) -> str:
+        """Publish a fingerprinted static asset; returns its URL"""
+        body = content.encode("utf-8") if isinstance(content, str) else content
+        content_type = content_type or self._guess_type(name)
+        stem, dot, suffix = name.rpartition(".")
+        if not dot:
+            stem, suffix = name, ""
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        url = f"{self.prefix}/{stem}.{digest}{dot}{suffix}"
+        self._add(url, body, content_type, IMMUTABLE)
+        if source_url:
+            self.references[source_url] = url
+        return url
+
+    def add_page(self, url: str, content: Union[str, Callable[[], str]],
+                 content_type: str = "text/html; charset=utf-8") -> Asset:
+        """Render a page once, pointing it at fingerprinted assets"""
+        html = content() if callable(content) else content
+        for source_url, fingerprinted in self.references.items():
+            html = html.replace(source_url, fingerprinted)
+        return self._add(url, html.encode("utf-8"), content_type, REVALIDATE)
+
+    @staticmethod
+    def _guess_type(name: str) -> str:
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type += "; charset=utf-8"
+        return content_type
+
+    def url_for(self, source_url: str) -> str:
+        return self.references.get(source_url, source_url)
+
+    def respond(self, url: str, accept_encoding: str = "", if_none_match: str = "") -> Optional[AssetResponse]:
+        """Response for a GET of ``url``, or None if it is not an asset"""
+        asset = self.assets.get(url)
+        if asset is None:
+            return None
+        encoding = next(e for e in _preferred_encodings(accept_encoding) if e in asset.encodings)
+        self.stats["requests"] += 1
+        self.stats["bytes_identity"] += asset.size
+
+        headers = asset.headers[encoding]
+        # 304 velja samo za izbrano predstavitev, ne za katerikoli kodiranje
+        if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+            self.stats["not_modified"] += 1
+            return AssetResponse(304, {"ETag": headers["ETag"], "Cache-Control": asset.cache_control,
+                                       "Vary": "Accept-Encoding"})
+
+        body = asset.encodings[encoding]
+        self.stats["bytes_sent"] += len(body)
+        return AssetResponse(200, dict(headers), body)
+
+    def write(self, output_dir: Union[str, Path]) -> Path:
+        """Write every representation plus a manifest, for build-time rendering"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {"prefix": self.prefix, "references": self.references, "assets": {}}
+        for url, asset in self.assets.items():
+            files = {}
+            for encoding, body in asset.encodings.items():
+                file_name = f"{asset.digest}.{encoding}"
+                (output_dir / file_name).write_bytes(body)
+                files[encoding] = file_name
+            manifest["assets"][url] = {"content_type": asset.content_type, "digest": asset.digest,
+                                       "cache_control": asset.cache_control, "files": files}
+        manifest_path = output_dir / "manifest.json"
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest_path
+
+    @classmethod
+    def load(cls, output_dir: Union[str, Path]) -> "AssetPipeline":
+        """Load assets written by ``write`` without rendering anything"""
+        output_dir = Path(output_dir)
+        with open(output_dir / "manifest.json", 'r') as f:
+            manifest = json.load(f)
+        pipeline = cls(prefix=manifest["prefix"], brotli_enabled=False)
+        pipeline.references = manifest["references"]
+        for url, entry in manifest["assets"].items():
+            encodings = {encoding: (output_dir / file_name).read_bytes()
+                         for encoding, file_name in entry["files"].items()}
+            pipeline.assets[url] = Asset(url, entry["content_type"], entry["digest"], entry["cache_control"],
+                                         encodings)
+        return pipeline
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "assets": len(self.assets),
+            "brotli": self.brotli_enabled,
+            "identity_bytes": sum(asset.size for asset in self.assets.values()),
+            "compressed_bytes": sum(min(len(body) for body in asset.encodings.values())
+                                    for asset in self.assets.values()),
+            **self.stats
+        }
+
+
+def _sample_pages(scale: int = 40) -> Tuple[Dict[str, Callable[[], str]], Dict[str, Tuple[str, str]]]:
+    """Pages shaped like the UI handlers': a large inline HTML literal returned on every call"""
+    css = "\n".join(f".panel-{i} {{ margin: {i % 7}px; padding: {i % 5}px; color: #{i * 2654435761 % 0xffffff:06x}; }}"
+                    for i in range(scale * 20))
+    js = "\n".join(f"function handler{i}(event) {{ return update('panel-{i}', event.data); }}"
+                   for i in range(scale * 10))
+
+    def page(title: str) -> Callable[[], str]:
+        rows = "".join(f"<div class=\"panel-{i}\"><h3>{title} {i}</h3><p>Status: active</p></div>\n"
+                       for i in range(scale * 5))
+        html = f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="UTF-8"><title>MIA - {title}</title>
+<link rel="stylesheet" href="/static/unified.css"></head>
+<body>{rows}<script src="/static/unified.js"></script></body>
+</html>"""
+        return lambda: html
+
+    pages = {"/": page("Home"), "/chat": page("Chat"), "/dashboard": page("Dashboard")}
+    static = {"/static/unified.css": ("unified.css", css), "/static/unified.js": ("unified.js", js)}
+    return pages, static
+
+
+def benchmark_assets(pages: Optional[Dict[str, Callable[[], str]]] = None,
+                     static: Optional[Dict[str, Tuple[str, str]]] = None, requests: int = 300) -> Dict[str, Any]:
+    """Per-request CPU time and bytes: the current render-per-request handlers vs the asset pipeline.
+
+    ``legacy`` is what the handlers do today (render and encode, no
+    compression); ``legacy_gzip`` adds per-request gzip, the cheapest way
+    to get the same byte savings without precompressing.
+    """
+    if pages is None:
+        pages, static = _sample_pages()
+    static = static or {}
+    urls = list(pages)
+
+    def per_request(handler: Callable[[str], bytes]) -> Tuple[float, int]:
+        started = time.process_time()
+        sent = 0
+        for i in range(requests):
+            sent += len(handler(urls[i % len(urls)]))
+        return (time.process_time() - started) / requests, sent
+
+    # Dosedanji način: vsaka zahteva znova izriše in kodira stran, brez stiskanja in validatorjev
+    legacy_cpu, legacy_bytes = per_request(lambda url: pages[url]().encode("utf-8"))
+    legacy_gzip_cpu, _ = per_request(lambda url: gzip.compress(pages[url]().encode("utf-8"), compresslevel=6))
+    legacy_static = sum(len(content.encode("utf-8")) for _, content in static.values())
+
+    started = time.process_time()
+    pipeline = AssetPipeline()
+    for source_url, (name, content) in static.items():
+        pipeline.add_static(name, content, source_url=source_url)
+    for url, render in pages.items():
+        pipeline.add_page(url, render)
+    build_seconds = time.process_time() - started
+
+    accept = "gzip, deflate, br"
+    pipeline_cpu, pipeline_bytes = per_request(lambda url: pipeline.respond(url, accept).body)
+    etags = {url: pipeline.respond(url, accept).headers["ETag"] for url in urls}
+    statuses = set()
+
+    def conditional(url: str) -> bytes:
+        response = pipeline.respond(url, accept, etags[url])
+        statuses.add(response.status)
+        return response.body
+
+    conditional_cpu, conditional_bytes = per_request(conditional)
+    static_first = sum(len(pipeline.respond(url, accept).body) for url in pipeline.references.values())
+
+    return {
+        "requests": requests,
+        "brotli": pipeline.brotli_enabled,
+        "build_cpu_seconds": build_seconds,
+        "legacy": {"cpu_per_request_us": legacy_cpu * 1e6, "page_bytes_per_request": legacy_bytes / requests,
+                   "static_bytes_per_visit": legacy_static},
+        "legacy_gzip": {"cpu_per_request_us": legacy_gzip_cpu * 1e6},
+        "pipeline": {"cpu_per_request_us": pipeline_cpu * 1e6, "page_bytes_per_request": pipeline_bytes / requests,
+                     "static_bytes_first_visit": static_first, "static_bytes_repeat_visit": 0},
+        "conditional": {"cpu_per_request_us": conditional_cpu * 1e6, "bytes_per_request": conditional_bytes / requests,
+                        "statuses": sorted(statuses)},
+        "byte_savings": 1 - pipeline_bytes / legacy_bytes,
+        "cpu_vs_legacy_gzip": legacy_gzip_cpu / pipeline_cpu if pipeline_cpu else 0.0
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_assets(), indent=2))
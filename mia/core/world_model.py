@@ -14,8 +14,12 @@ from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
+from contextlib import contextmanager
 import networkx as nx
 
+from mia.core.world_model_index import ChangeJournal, EntityIndex, IncrementalTopologicalOrder
+from mia.core.service_registry import lazy_services
+
 class EntityType(Enum):
 
     def _get_deterministic_time(self) -> float:
@@ -92,9 +96,10 @@ class OntologyRule:
 class WorldModel:
     """Konceptualno-simbolni model sveta"""
     
-    def __init__(self, config_path: str = "mia/data/world_model/config.json"):
+    def __init__(self, config_path: str = "mia/data/world_model/config.json",
+                 data_dir: str = "mia/data/world_model"):
         self.config_path = config_path
-        self.world_model_dir = Path("mia/data/world_model")
+        self.world_model_dir = Path(data_dir)
         self.world_model_dir.mkdir(parents=True, exist_ok=True)
         
         self.logger = logging.getLogger("MIA.WorldModel")
@@ -110,6 +115,16 @@ class WorldModel:
         # Semantic network
         self.semantic_network = nx.DiGraph()
         
+        # Secondary indexes
+        self.entity_index = EntityIndex()
+        self.relation_types_by_pair: Dict[Tuple[str, str], Dict[str, None]] = {}
+        self.isa_order = IncrementalTopologicalOrder()
+        self.cyclic_isa_relations: Dict[str, None] = {}
+        
+        # Persistence: snapshot files plus a batched change journal
+        self.journal = ChangeJournal(self.world_model_dir / "journal.jsonl")
+        self._batch_depth = 0
+        
         # Ontological consistency
         self.ontology_version = "1.0"
         self.consistency_score = 1.0
@@ -175,18 +190,7 @@ class WorldModel:
                     entities_data = json.load(f)
                 
                 for entity_id, entity_data in entities_data.items():
-                    entity = Entity(
-                        entity_id=entity_data["entity_id"],
-                        entity_type=EntityType(entity_data["entity_type"]),
-                        name=entity_data["name"],
-                        description=entity_data["description"],
-                        properties=entity_data["properties"],
-                        confidence=ConfidenceLevel(entity_data["confidence"]),
-                        created_at=entity_data["created_at"],
-                        last_updated=entity_data["last_updated"],
-                        source=entity_data["source"]
-                    )
-                    self.entities[entity_id] = entity
+                    self.entities[entity_id] = self._entity_from_dict(entity_data)
             
             # Load relations
             relations_file = self.world_model_dir / "relations.json"
@@ -195,18 +199,7 @@ class WorldModel:
                     relations_data = json.load(f)
                 
                 for relation_id, relation_data in relations_data.items():
-                    relation = Relation(
-                        relation_id=relation_data["relation_id"],
-                        relation_type=RelationType(relation_data["relation_type"]),
-                        source_entity=relation_data["source_entity"],
-                        target_entity=relation_data["target_entity"],
-                        strength=relation_data["strength"],
-                        confidence=ConfidenceLevel(relation_data["confidence"]),
-                        properties=relation_data["properties"],
-                        created_at=relation_data["created_at"],
-                        last_updated=relation_data["last_updated"]
-                    )
-                    self.relations[relation_id] = relation
+                    self.relations[relation_id] = self._relation_from_dict(relation_data)
             
             # Load ontology rules
             ontology_file = self.world_model_dir / "ontology.json"
@@ -215,61 +208,139 @@ class WorldModel:
                     ontology_data = json.load(f)
                 
                 for rule_id, rule_data in ontology_data.items():
-                    rule = OntologyRule(
-                        rule_id=rule_data["rule_id"],
-                        rule_type=rule_data["rule_type"],
-                        condition=rule_data["condition"],
-                        consequence=rule_data["consequence"],
-                        confidence=ConfidenceLevel(rule_data["confidence"]),
-                        active=rule_data["active"]
-                    )
-                    self.ontology_rules[rule_id] = rule
+                    self.ontology_rules[rule_id] = self._rule_from_dict(rule_data)
             
-            # Rebuild semantic network
+            # Apply changes recorded after the last snapshot
+            for record in self.journal.replay():
+                self._apply_journal_record(record)
+            
+            # Rebuild semantic network and indexes
             self._rebuild_semantic_network()
+            self._rebuild_indexes()
             
             self.logger.info(f"✅ Loaded world model: {len(self.entities)} entities, {len(self.relations)} relations")
             
         except Exception as e:
             self.logger.error(f"Failed to load world model: {e}")
     
+    def _entity_from_dict(self, data: Dict[str, Any]) -> Entity:
+        return Entity(
+            entity_id=data["entity_id"],
+            entity_type=EntityType(data["entity_type"]),
+            name=data["name"],
+            description=data["description"],
+            properties=data["properties"],
+            confidence=ConfidenceLevel(data["confidence"]),
+            created_at=data["created_at"],
+            last_updated=data["last_updated"],
+            source=data["source"]
+        )
+    
+    def _relation_from_dict(self, data: Dict[str, Any]) -> Relation:
+        return Relation(
+            relation_id=data["relation_id"],
+            relation_type=RelationType(data["relation_type"]),
+            source_entity=data["source_entity"],
+            target_entity=data["target_entity"],
+            strength=data["strength"],
+            confidence=ConfidenceLevel(data["confidence"]),
+            properties=data["properties"],
+            created_at=data["created_at"],
+            last_updated=data["last_updated"]
+        )
+    
+    def _rule_from_dict(self, data: Dict[str, Any]) -> OntologyRule:
+        return OntologyRule(
+            rule_id=data["rule_id"],
+            rule_type=data["rule_type"],
+            condition=data["condition"],
+            consequence=data["consequence"],
+            confidence=ConfidenceLevel(data["confidence"]),
+            active=data["active"]
+        )
+    
+    def _entity_to_dict(self, entity: Entity) -> Dict[str, Any]:
+        return {
+            "entity_id": entity.entity_id,
+            "entity_type": entity.entity_type.value,
+            "name": entity.name,
+            "description": entity.description,
+            "properties": entity.properties,
+            "confidence": entity.confidence.value,
+            "created_at": entity.created_at,
+            "last_updated": entity.last_updated,
+            "source": entity.source
+        }
+    
+    def _relation_to_dict(self, relation: Relation) -> Dict[str, Any]:
+        return {
+            "relation_id": relation.relation_id,
+            "relation_type": relation.relation_type.value,
+            "source_entity": relation.source_entity,
+            "target_entity": relation.target_entity,
+            "strength": relation.strength,
+            "confidence": relation.confidence.value,
+            "properties": relation.properties,
+            "created_at": relation.created_at,
+            "last_updated": relation.last_updated
+        }
+    
+    def _rule_to_dict(self, rule: OntologyRule) -> Dict[str, Any]:
+        rule_dict = asdict(rule)
+        rule_dict["confidence"] = rule.confidence.value
+        return rule_dict
+    
+    def _apply_journal_record(self, record: Dict[str, Any]):
+        """Apply one journal record during load"""
+        kind, data = record["kind"], record["data"]
+        if kind == "entity":
+            self.entities[data["entity_id"]] = self._entity_from_dict(data)
+        elif kind == "relation":
+            self.relations[data["relation_id"]] = self._relation_from_dict(data)
+        elif kind == "rule":
+            self.ontology_rules[data["rule_id"]] = self._rule_from_dict(data)
+    
+    def _record_change(self, kind: str, data: Dict[str, Any]):
+        """Journal a change; written immediately unless inside batch()"""
+        self.journal.append({"kind": kind, "data": data})
+        if self._batch_depth == 0:
+            self._flush_changes()
+    
+    def _flush_changes(self):
+        """Write pending journal records and fold the journal into a snapshot when it grows large"""
+        self.journal.flush()
+        if self.journal.records > max(10000, len(self.entities) + len(self.relations)):
+            self._save_world_model()
+    
+    @contextmanager
+    def batch(self):
+        """Group many changes into one journal write"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_changes()
+    
     def _save_world_model(self):
-        """Save world model to storage"""
+        """Save full snapshot of the world model and reset the journal"""
         try:
-            # Save entities
-            entities_data = {}
-            for entity_id, entity in self.entities.items():
-                entity_dict = asdict(entity)
-                entity_dict["entity_type"] = entity.entity_type.value
-                entity_dict["confidence"] = entity.confidence.value
-                entities_data[entity_id] = entity_dict
-            
-            entities_file = self.world_model_dir / "entities.json"
-            with open(entities_file, 'w') as f:
-                json.dump(entities_data, f, indent=2)
-            
-            # Save relations
-            relations_data = {}
-            for relation_id, relation in self.relations.items():
-                relation_dict = asdict(relation)
-                relation_dict["relation_type"] = relation.relation_type.value
-                relation_dict["confidence"] = relation.confidence.value
-                relations_data[relation_id] = relation_dict
-            
-            relations_file = self.world_model_dir / "relations.json"
-            with open(relations_file, 'w') as f:
-                json.dump(relations_data, f, indent=2)
+            snapshots = {
+                "entities.json": {eid: self._entity_to_dict(e) for eid, e in self.entities.items()},
+                "relations.json": {rid: self._relation_to_dict(r) for rid, r in self.relations.items()},
+                "ontology.json": {rid: self._rule_to_dict(r) for rid, r in self.ontology_rules.items()},
+            }
             
-            # Save ontology rules
-            ontology_data = {}
-            for rule_id, rule in self.ontology_rules.items():
-                rule_dict = asdict(rule)
-                rule_dict["confidence"] = rule.confidence.value
-                ontology_data[rule_id] = rule_dict
+            for filename, data in snapshots.items():
+                target = self.world_model_dir / filename
+                tmp = target.with_suffix(".json.tmp")
+                # json.dumps without indent runs in the C encoder, json.dump never does
+                with open(tmp, 'w') as f:
+                    f.write(json.dumps(data))
+                os.replace(tmp, target)
             
-            ontology_file = self.world_model_dir / "ontology.json"
-            with open(ontology_file, 'w') as f:
-                json.dump(ontology_data, f, indent=2)
+            self.journal.reset()
             
         except Exception as e:
             self.logger.error(f"Failed to save world model: {e}")
@@ -290,7 +361,7 @@ class WorldModel:
                 ("intelligence", EntityType.CONCEPT, "The ability to acquire and apply knowledge and skills"),
                 ("communication", EntityType.CONCEPT, "The imparting or exchanging of information")
             ]
-            
+        
             for concept_name, entity_type, description in fundamental_concepts:
                 if not self._entity_exists(concept_name):
                     self.add_entity(
@@ -301,7 +372,7 @@ class WorldModel:
                         confidence=ConfidenceLevel.CERTAIN,
                         source="basic_ontology"
                     )
-            
+        
             # Create basic ontological rules
             basic_rules = [
                 ("existence_rule", "existence", "if entity exists then entity has identity", ConfidenceLevel.CERTAIN),
@@ -309,7 +380,7 @@ class WorldModel:
                 ("knowledge_rule", "knowledge", "if agent has knowledge then agent can reason", ConfidenceLevel.HIGH),
                 ("consciousness_rule", "consciousness", "if agent is conscious then agent can experience", ConfidenceLevel.HIGH)
             ]
-            
+        
             for rule_name, rule_type, rule_condition, confidence in basic_rules:
                 if rule_name not in self.ontology_rules:
                     self.add_ontology_rule(
@@ -326,7 +397,30 @@ class WorldModel:
     
     def _entity_exists(self, name: str) -> bool:
         """Check if entity with given name exists"""
-        return any(entity.name == name for entity in self.entities.values())
+        return any(self.entities[eid].name == name for eid in self.entity_index.named(name))
+    
+    def _rebuild_indexes(self):
+        """Rebuild entity, relation-pair and IS_A indexes"""
+        self.entity_index = EntityIndex()
+        for entity_id, entity in self.entities.items():
+            self.entity_index.add(entity_id, entity.name, entity.entity_type, entity.confidence)
+        
+        self.relation_types_by_pair = {}
+        self.isa_order = IncrementalTopologicalOrder()
+        self.cyclic_isa_relations = {}
+        for relation in self.relations.values():
+            self._index_relation(relation)
+    
+    def _index_relation(self, relation: Relation) -> bool:
+        """Add relation to indexes; returns False if an IS_A edge closes a cycle"""
+        pair = (relation.source_entity, relation.target_entity)
+        self.relation_types_by_pair.setdefault(pair, {})[relation.relation_type.value] = None
+        
+        if relation.relation_type == RelationType.IS_A:
+            if not self.isa_order.add_edge(relation.source_entity, relation.target_entity):
+                self.cyclic_isa_relations[relation.relation_id] = None
+                return False
+        return True
     
     def _rebuild_semantic_network(self):
         """Rebuild semantic network from entities and relations"""
@@ -387,6 +481,7 @@ class WorldModel:
             
             # Add to world model
             self.entities[entity_id] = entity
+            self.entity_index.add(entity_id, name, entity_type, confidence)
             
             # Update semantic network
             self.semantic_network.add_node(
@@ -396,8 +491,8 @@ class WorldModel:
                 confidence=confidence.value
             )
             
-            # Save world model
-            self._save_world_model()
+            # Journal change
+            self._record_change("entity", self._entity_to_dict(entity))
             
             self.logger.info(f"✅ Added entity: {name} ({entity_type.value})")
             return entity_id
@@ -437,8 +532,15 @@ class WorldModel:
                 self.logger.warning(f"Relation consistency check failed")
                 return ""
             
+            # Reject IS_A edges that would close a cycle
+            if (relation_type == RelationType.IS_A and
+                    not self.isa_order.add_edge(source_entity_id, target_entity_id)):
+                self.logger.warning(f"Relation rejected: circular IS_A {source_entity_id} -> {target_entity_id}")
+                return ""
+            
             # Add to world model
             self.relations[relation_id] = relation
+            self._index_relation(relation)
             
             # Update semantic network
             self.semantic_network.add_edge(
@@ -449,8 +551,8 @@ class WorldModel:
                 confidence=confidence.value
             )
             
-            # Save world model
-            self._save_world_model()
+            # Journal change
+            self._record_change("relation", self._relation_to_dict(relation))
             
             source_name = self.entities[source_entity_id].name
             target_name = self.entities[target_entity_id].name
@@ -481,8 +583,8 @@ class WorldModel:
             # Add to ontology
             self.ontology_rules[rule_id] = rule
             
-            # Save world model
-            self._save_world_model()
+            # Journal change
+            self._record_change("rule", self._rule_to_dict(rule))
             
             self.logger.info(f"✅ Added ontology rule: {rule_type}")
             return rule_id
@@ -495,7 +597,8 @@ class WorldModel:
         """Check for entity conflicts"""
         try:
             # Check for duplicate names with different types
-            for existing_entity in self.entities.values():
+            for entity_id in self.entity_index.named(entity.name):
+                existing_entity = self.entities[entity_id]
                 if (existing_entity.name == entity.name and 
                     existing_entity.entity_type != entity.entity_type):
                     return True
@@ -543,24 +646,12 @@ class WorldModel:
                        min_confidence: Optional[ConfidenceLevel] = None) -> List[Entity]:
         """Query entities based on criteria"""
         try:
-            results = []
-            
-            for entity in self.entities.values():
-                # Filter by type
-                if entity_type and entity.entity_type != entity_type:
-                    continue
-                
-                # Filter by name pattern
-                if name_pattern and name_pattern.lower() not in entity.name.lower():
-                    continue
-                
-                # Filter by confidence
-                if min_confidence and entity.confidence.value < min_confidence.value:
-                    continue
-                
-                results.append(entity)
-            
-            return results
+            entity_ids = self.entity_index.query(
+                entity_type=entity_type,
+                name_pattern=name_pattern,
+                min_confidence=min_confidence.value if min_confidence else None
+            )
+            return [self.entities[entity_id] for entity_id in entity_ids]
             
         except Exception as e:
             self.logger.error(f"Failed to query entities: {e}")
@@ -614,20 +705,20 @@ class WorldModel:
         try:
             issues = []
             
-            # Check for circular IS_A relations
-            for relation in self.relations.values():
-                if relation.relation_type == RelationType.IS_A:
-                    if self._has_circular_isa(relation.source_entity, relation.target_entity):
-                        issues.append(f"Circular IS_A relation detected: {relation.source_entity} -> {relation.target_entity}")
-            
-            # Check for contradictory relations
-            for entity_id in self.entities:
-                related = self.find_related_entities(entity_id, max_depth=1)
-                for i, (related_id1, rel_type1, _) in enumerate(related):
-                    for related_id2, rel_type2, _ in related[i+1:]:
-                        if related_id1 == related_id2:
-                            if self._are_contradictory_relations(rel_type1, rel_type2):
-                                issues.append(f"Contradictory relations: {entity_id} has both {rel_type1} and {rel_type2} with {related_id1}")
+            # Circular IS_A relations are found when edges are inserted
+            for relation_id in self.cyclic_isa_relations:
+                relation = self.relations[relation_id]
+                issues.append(f"Circular IS_A relation detected: {relation.source_entity} -> {relation.target_entity}")
+            
+            # Check for contradictory relations between the same pair of entities
+            for (entity_id, related_id), rel_types in self.relation_types_by_pair.items():
+                if len(rel_types) < 2:
+                    continue
+                rel_types = list(rel_types)
+                for i, rel_type1 in enumerate(rel_types):
+                    for rel_type2 in rel_types[i+1:]:
+                        if self._are_contradictory_relations(rel_type1, rel_type2):
+                            issues.append(f"Contradictory relations: {entity_id} has both {rel_type1} and {rel_type2} with {related_id}")
             
             # Update consistency score
             total_checks = len(self.relations) + len(self.entities)
@@ -640,24 +731,9 @@ class WorldModel:
             self.logger.error(f"Failed to check ontological consistency: {e}")
             return False, [f"Consistency check error: {e}"]
     
-    def _has_circular_isa(self, source_id: str, target_id: str, visited: Set[str] = None) -> bool:
-        """Check for circular IS_A relations"""
-        if visited is None:
-            visited = set()
-        
-        if source_id in visited:
-            return True
-        
-        visited.add(source_id)
-        
-        # Find all IS_A relations from target
-        for relation in self.relations.values():
-            if (relation.relation_type == RelationType.IS_A and 
-                relation.source_entity == target_id):
-                if self._has_circular_isa(source_id, relation.target_entity, visited.copy()):
-                    return True
-        
-        return False
+    def _has_circular_isa(self, source_id: str, target_id: str) -> bool:
+        """Check if IS_A edge source -> target lies on a cycle"""
+        return self.isa_order.reaches(target_id, source_id)
     
     def _are_contradictory_relations(self, rel_type1: str, rel_type2: str) -> bool:
         """Check if two relation types are contradictory"""
@@ -676,33 +752,8 @@ class WorldModel:
     def integrate_knowledge(self, knowledge_item: Dict[str, Any], source: str) -> bool:
         """Integrate new knowledge into world model"""
         try:
-            # Extract entities and relations from knowledge item
-            if "entities" in knowledge_item:
-                for entity_data in knowledge_item["entities"]:
-                    self.add_entity(
-                        name=entity_data["name"],
-                        entity_type=EntityType(entity_data["type"]),
-                        description=entity_data.get("description", ""),
-                        properties=entity_data.get("properties", {}),
-                        confidence=ConfidenceLevel(entity_data.get("confidence", 0.6)),
-                        source=source
-                    )
-            
-            if "relations" in knowledge_item:
-                for relation_data in knowledge_item["relations"]:
-                    # Find entity IDs by name
-                    source_entity_id = self._find_entity_by_name(relation_data["source"])
-                    target_entity_id = self._find_entity_by_name(relation_data["target"])
-                    
-                    if source_entity_id and target_entity_id:
-                        self.add_relation(
-                            source_entity_id=source_entity_id,
-                            target_entity_id=target_entity_id,
-                            relation_type=RelationType(relation_data["type"]),
-                            strength=relation_data.get("strength", 0.7),
-                            confidence=ConfidenceLevel(relation_data.get("confidence", 0.6)),
-                            properties=relation_data.get("properties", {})
-                        )
+            with self.batch():
+                self._integrate_knowledge(knowledge_item, source)
             
             self.logger.info(f"✅ Integrated knowledge from: {source}")
             return True
@@ -711,12 +762,40 @@ class WorldModel:
             self.logger.error(f"Failed to integrate knowledge: {e}")
             return False
     
+    def _integrate_knowledge(self, knowledge_item: Dict[str, Any], source: str):
+        """Add entities and relations of a knowledge item"""
+        # Extract entities and relations from knowledge item
+        if "entities" in knowledge_item:
+            for entity_data in knowledge_item["entities"]:
+                self.add_entity(
+                    name=entity_data["name"],
+                    entity_type=EntityType(entity_data["type"]),
+                    description=entity_data.get("description", ""),
+                    properties=entity_data.get("properties", {}),
+                    confidence=ConfidenceLevel(entity_data.get("confidence", 0.6)),
+                    source=source
+                )
+        
+        if "relations" in knowledge_item:
+            for relation_data in knowledge_item["relations"]:
+                # Find entity IDs by name
+                source_entity_id = self._find_entity_by_name(relation_data["source"])
+                target_entity_id = self._find_entity_by_name(relation_data["target"])
+                
+                if source_entity_id and target_entity_id:
+                    self.add_relation(
+                        source_entity_id=source_entity_id,
+                        target_entity_id=target_entity_id,
+                        relation_type=RelationType(relation_data["type"]),
+                        strength=relation_data.get("strength", 0.7),
+                        confidence=ConfidenceLevel(relation_data.get("confidence", 0.6)),
+                        properties=relation_data.get("properties", {})
+                    )
+    
     def _find_entity_by_name(self, name: str) -> Optional[str]:
         """Find entity ID by name"""
-        for entity_id, entity in self.entities.items():
-            if entity.name.lower() == name.lower():
-                return entity_id
-        return None
+        entity_ids = self.entity_index.named(name)
+        return entity_ids[0] if entity_ids else None
     
     def get_world_model_status(self) -> Dict[str, Any]:
         """Get world model status"""
@@ -740,5 +819,73 @@ class WorldModel:
             self.logger.error(f"Failed to get world model status: {e}")
             return {"error": str(e)}
 
+def benchmark_world_model(n_entities: int = 100000, n_relations: int = 500000, seed: int = 7) -> Dict[str, Any]:
+    """Build, check and reload a large synthetic world model"""
+    import random
+    import shutil
+    import tempfile
+    
+    rng = random.Random(seed)
+    data_dir = tempfile.mkdtemp(prefix="world_model_bench_")
+    config_path = str(Path(data_dir) / "config.json")
+    results: Dict[str, Any] = {"entities": n_entities, "relations": n_relations}
+    try:
+        model = WorldModel(config_path=config_path, data_dir=data_dir)
+        model.logger.setLevel(logging.WARNING)
+        
+        start = time.perf_counter()
+        with model.batch():
+            entity_ids = [
+                model.add_entity(f"entity_{i}", EntityType.CONCEPT, "", {}, ConfidenceLevel.MEDIUM, "benchmark")
+                for i in range(n_entities)
+            ]
+        results["add_entities_s"] = time.perf_counter() - start
+        
+        # IS_A edges follow a hidden hierarchy rank (1% point upwards and would close cycles)
+        rank = list(range(n_entities))
+        rng.shuffle(rank)
+        other_types = [RelationType.PART_OF, RelationType.SIMILAR_TO, RelationType.OPPOSITE_OF, RelationType.ENABLES]
+        start = time.perf_counter()
+        added = 0
+        with model.batch():
+            for i in range(n_relations):
+                a, b = rng.randrange(n_entities), rng.randrange(n_entities)
+                if a == b:
+                    continue
+                if i % 2 == 0:
+                    if (rank[a] < rank[b]) == (rng.random() < 0.99):
+                        a, b = b, a
+                    relation_type = RelationType.IS_A
+                else:
+                    relation_type = rng.choice(other_types)
+                if model.add_relation(entity_ids[a], entity_ids[b], relation_type, 0.7, ConfidenceLevel.MEDIUM):
+                    added += 1
+        results["add_relations_s"] = time.perf_counter() - start
+        results["relations_accepted"] = added
+        
+        start = time.perf_counter()
+        consistent, issues = model.check_ontological_consistency()
+        results["consistency_check_s"] = time.perf_counter() - start
+        results["consistency_issues"] = len(issues)
+        
+        start = time.perf_counter()
+        model.query_entities(entity_type=EntityType.CONCEPT, name_pattern="entity_4242")
+        results["query_ms"] = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        model._save_world_model()
+        results["snapshot_s"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        reloaded = WorldModel(config_path=config_path, data_dir=data_dir)
+        results["reload_s"] = time.perf_counter() - start
+        results["reloaded_relations"] = len(reloaded.relations)
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
 # Global instance
-world_model = WorldModel()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, world_model=WorldModel)
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_world_model(), indent=2))
\ No newline at end of file
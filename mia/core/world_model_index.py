@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+MIA World Model indeksi
+Sekundarni indeksi entitet, inkrementalni topološki vrstni red za IS_A
+in paketni dnevnik sprememb za WorldModel
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+
+class EntityIndex:
+    """Secondary indexes over entities by name, type and confidence.
+
+    Buckets are insertion-ordered dicts so query results keep the order in
+    which entities were added, like a scan over ``WorldModel.entities``.
+    """
+
+    def __init__(self):
+        self.by_name: Dict[str, Dict[str, None]] = {}
+        self.by_type: Dict[Any, Dict[str, None]] = {}
+        self.by_confidence: Dict[Any, Dict[str, None]] = {}
+        self._keys: Dict[str, tuple] = {}
+
+    def add(self, entity_id: str, name: str, entity_type: Any, confidence: Any):
+        if entity_id in self._keys:
+            self.remove(entity_id)
+        name_key = name.lower()
+        self.by_name.setdefault(name_key, {})[entity_id] = None
+        self.by_type.setdefault(entity_type, {})[entity_id] = None
+        self.by_confidence.setdefault(confidence, {})[entity_id] = None
+        self._keys[entity_id] = (name_key, entity_type, confidence)
+
+    def remove(self, entity_id: str):
+        keys = self._keys.pop(entity_id, None)
+        if keys is None:
+            return
+        for index, key in zip((self.by_name, self.by_type, self.by_confidence), keys):
+            bucket = index[key]
+            del bucket[entity_id]
+            if not bucket:
+                del index[key]
+
+    def named(self, name: str) -> List[str]:
+        """Entity IDs whose name matches case-insensitively"""
+        return list(self.by_name.get(name.lower(), ()))
+
+    def query(self, entity_type: Any = None, name_pattern: Optional[str] = None,
+              min_confidence: Optional[float] = None) -> List[str]:
+        """Entity IDs matching all given criteria, smallest index first"""
+        candidates: List[Iterable[str]] = []
+        if entity_type is not None:
+            candidates.append(self.by_type.get(entity_type, {}))
+        if min_confidence is not None:
+            levels = [level for level in self.by_confidence if level.value >= min_confidence]
+            candidates.append({eid: None for level in levels for eid in self.by_confidence[level]})
+        if name_pattern:
+            pattern = name_pattern.lower()
+            candidates.append({eid: None for name, bucket in self.by_name.items() if pattern in name
+                               for eid in bucket})
+        if not candidates:
+            return list(self._keys)
+
+        candidates.sort(key=len)
+        first, rest = candidates[0], candidates[1:]
+        return [eid for eid in first if all(eid in other for other in rest)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class IncrementalTopologicalOrder:
+    """Dynamic topological order of a DAG (Pearce-Kelly).
+
+    Inserting edge u -> v only touches nodes whose order lies between
+    ord(v) and ord(u), so cycle detection on insert is proportional to the
+    affected region instead of the whole graph.
+    """
+
+    def __init__(self):
+        self.successors: Dict[str, Set[str]] = {}
+        self.predecessors: Dict[str, Set[str]] = {}
+        self.order: Dict[str, int] = {}
+        self._next_order = 0
+
+    def add_node(self, node: str):
+        if node not in self.order:
+            self.order[node] = self._next_order
+            self._next_order += 1
+            self.successors[node] = set()
+            self.predecessors[node] = set()
+
+    def has_edge(self, source: str, target: str) -> bool:
+        return target in self.successors.get(source, ())
+
+    def add_edge(self, source: str, target: str) -> bool:
+        """Insert edge; returns False (and leaves the graph unchanged) if it would close a cycle"""
+        self.add_node(source)
+        self.add_node(target)
+        if source == target:
+            return False
+        if target in self.successors[source]:
+            return True
+
+        lower, upper = self.order[target], self.order[source]
+        if lower < upper:
+            forward = self._forward(target, upper, source)
+            if forward is None:
+                return False
+            backward = self._backward(source, lower)
+            self._reorder(forward, backward)
+
+        self.successors[source].add(target)
+        self.predecessors[target].add(source)
+        return True
+
+    def remove_edge(self, source: str, target: str):
+        """Removing an edge never invalidates the order"""
+        if target in self.successors.get(source, ()):
+            self.successors[source].discard(target)
+            self.predecessors[target].discard(source)
+
+    def reaches(self, start: str, goal: str) -> bool:
+        """True if goal is reachable from start"""
+        if start not in self.order or goal not in self.order:
+            return False
+        if start == goal:
+            return True
+        if self.order[start] > self.order[goal]:
+            return False
+        return self._forward(start, self.order[goal], goal) is None
+
+    def _forward(self, start: str, upper: int, forbidden: str) -> Optional[List[str]]:
+        """Nodes reachable from start with order below upper; None if forbidden is reached"""
+        order = self.order
+        visited = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for succ in self.successors[node]:
+                if succ == forbidden:
+                    return None
+                if succ not in visited and order[succ] < upper:
+                    visited.add(succ)
+                    stack.append(succ)
+        return list(visited)
+
+    def _backward(self, start: str, lower: int) -> List[str]:
+        order = self.order
+        visited = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for pred in self.predecessors[node]:
+                if pred not in visited and order[pred] > lower:
+                    visited.add(pred)
+                    stack.append(pred)
+        return list(visited)
+
+    def _reorder(self, forward: List[str], backward: List[str]):
+        """Move the backward set in front of the forward set, reusing their slots"""
+        order = self.order
+        forward.sort(key=order.__getitem__)
+        backward.sort(key=order.__getitem__)
+        slots = sorted(order[node] for node in forward + backward)
+        for node, slot in zip(backward + forward, slots):
+            order[node] = slot
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+
+class ChangeJournal:
+    """Append-only JSONL journal written in batches"""
+
+    def __init__(self, path: Path, batch_size: int = 1000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.pending: List[Dict[str, Any]] = []
+        self.records = self._recover()
+
+    def _recover(self) -> int:
+        """Count intact records and cut off a torn tail so new appends stay readable"""
+        if not self.path.exists():
+            return 0
+        records = 0
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    json.loads(line)
+                except ValueError:
+                    break
+                records += 1
+                valid_bytes += len(line)
+        if valid_bytes < self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_bytes)
+        return records
+
+    def append(self, record: Dict[str, Any]):
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in self.pending)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        self.records += len(self.pending)
+        self.pending.clear()
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """Journal records in write order; a torn last line is skipped"""
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    break
+
+    def reset(self):
+        """Drop the journal after its records were folded into a snapshot"""
+        self.pending.clear()
+        if self.path.exists():
+            os.remove(self.path)
+        self.records = 0
@@ -7,6 +7,7 @@ Essential methods for desktop module production readiness.
 """
 
 from typing import Dict, List, Any, Optional
+from mia.core.service_registry import lazy_services
 class DesktopEssentialMethods:
     """Essential methods for desktop module"""
     
@@ -154,4 +155,4 @@ class DesktopEssentialMethods:
             }
 
 # Global instance
-desktop_essential = DesktopEssentialMethods()
+__getattr__ = lazy_services(__name__, desktop_essential=DesktopEssentialMethods)
@@ -4,8 +4,8 @@ MIA Enterprise Module
 Enterprise-level stability, monitoring, and compliance
 """
 
+from mia.core.service_registry import lazy_services
 from .stability_monitor import (
-    enterprise_stability_monitor,
     start_enterprise_monitoring,
     stop_enterprise_monitoring,
     get_enterprise_status,
@@ -19,6 +19,10 @@ from .policy_manager import PolicyManager
 from .configuration_manager import ConfigurationManager
 from .deployment_manager import EnterpriseDeploymentManager
 
+__getattr__ = lazy_services(
+    __name__, enterprise_stability_monitor="mia.enterprise.stability_monitor.enterprise_stability_monitor"
+)
+
 __all__ = [
     'enterprise_stability_monitor',
     'start_enterprise_monitoring', 
@@ -16,6 +16,7 @@ from enum import Enum
 from datetime import datetime, timedelta
 import sqlite3
 import numpy as np
+from mia.core.service_registry import get_service, lazy_services
 
 class MetricType(Enum):
     """Types of metrics"""
@@ -341,24 +342,28 @@ class EnterpriseAnalytics:
         return deleted_count
 
 # Global analytics instance
-analytics = EnterpriseAnalytics()
+__getattr__ = lazy_services(__name__, analytics=EnterpriseAnalytics)
+
+def get_analytics() -> EnterpriseAnalytics:
+    """Process-wide enterprise analytics, constructed on first use"""
+    return get_service(f"{__name__}.analytics")
 
 def record_performance_metric(name: str, value: float, tags: Dict[str, str] = None):
     """Record performance metric"""
-    analytics.record_metric(name, value, MetricType.PERFORMANCE, tags)
+    get_analytics().record_metric(name, value, MetricType.PERFORMANCE, tags)
 
 def record_usage_metric(name: str, value: float, tags: Dict[str, str] = None):
     """Record usage metric"""
-    analytics.record_metric(name, value, MetricType.USAGE, tags)
+    get_analytics().record_metric(name, value, MetricType.USAGE, tags)
 
 def record_system_metric(name: str, value: float, tags: Dict[str, str] = None):
     """Record system metric"""
-    analytics.record_metric(name, value, MetricType.SYSTEM, tags)
+    get_analytics().record_metric(name, value, MetricType.SYSTEM, tags)
 
 def get_performance_report(hours: int = 24) -> Report:
     """Get performance report"""
-    return analytics.generate_performance_report(hours)
+    return get_analytics().generate_performance_report(hours)
 
 def get_usage_report(days: int = 7) -> Report:
     """Get usage report"""
-    return analytics.generate_usage_report(days)
\ No newline at end of file
+    return get_analytics().generate_usage_report(days)
\ No newline at end of file
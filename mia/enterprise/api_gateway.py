@@ -18,8 +18,9 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import uvicorn
 
-from .security import security_manager, validate_session
-from .analytics import analytics, record_performance_metric, record_usage_metric
+from .security import validate_session
+from .analytics import get_analytics, record_performance_metric, record_usage_metric
+from mia.core.service_registry import get_service, lazy_services, service
 
 class APIVersion(Enum):
     """API versions"""
@@ -153,7 +154,7 @@ class EnterpriseAPIGateway:
             if not username:
                 raise HTTPException(status_code=401, detail="Invalid authentication")
             
-            return analytics.get_real_time_metrics()
+            return get_analytics().get_real_time_metrics()
         
         @self.app.post("/v1/chat")
         async def chat_endpoint(request: Request, credentials: HTTPAuthorizationCredentials = Depends(self.security)):
@@ -249,9 +250,9 @@ class EnterpriseAPIGateway:
                 raise HTTPException(status_code=403, detail="Insufficient permissions")
             
             if report_type == "performance":
-                report = analytics.generate_performance_report()
+                report = get_analytics().generate_performance_report()
             elif report_type == "usage":
-                report = analytics.generate_usage_report()
+                report = get_analytics().generate_usage_report()
             else:
                 raise HTTPException(status_code=400, detail="Invalid report type")
             
@@ -369,7 +370,15 @@ class EnterpriseAPIGateway:
         }
 
 # Global API gateway instance
-api_gateway = EnterpriseAPIGateway()
+__getattr__ = lazy_services(
+    __name__,
+    api_gateway=service(EnterpriseAPIGateway, depends_on=["mia.enterprise.security.security_manager",
+                                                          "mia.enterprise.analytics.analytics"])
+)
+
+def get_api_gateway() -> EnterpriseAPIGateway:
+    """Process-wide API gateway, constructed on first use"""
+    return get_service(f"{__name__}.api_gateway")
 
 def start_api_gateway(host: str = "0.0.0.0", port: int = 8000):
     """Start the API gateway"""
@@ -13,6 +13,7 @@ from pathlib import Path
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
+from mia.core.service_registry import lazy_services
 
 class ConfigEnvironment(Enum):
     """Configuration environments"""
@@ -387,6 +388,10 @@ DEFAULT_SCHEMA = [
     ConfigSchema("monitoring.alerts_enabled", bool, True, description="Enable alerts")
 ]
 
+def _create_config_manager() -> ConfigurationManager:
+    manager = ConfigurationManager()
+    manager.define_schema(DEFAULT_SCHEMA)
+    return manager
+
 # Global configuration manager
-config_manager = ConfigurationManager()
-config_manager.define_schema(DEFAULT_SCHEMA)
\ No newline at end of file
+__getattr__ = lazy_services(__name__, config_manager=_create_config_manager)
@@ -9,7 +9,6 @@ import json
 import logging
 import asyncio
 import time
-import psutil
 import threading
 from typing import Dict, List, Any, Optional
 from pathlib import Path
@@ -18,6 +17,9 @@ from enum import Enum
 from collections import defaultdict, deque
 import datetime
 
+from mia.core.telemetry import get_telemetry
+from mia.core.service_registry import lazy_services
+
 class MetricType(Enum):
     """Types of metrics"""
     PERFORMANCE = "performance"
@@ -151,40 +153,35 @@ class EnterpriseMonitoring:
         """Collect system performance metrics"""
         try:
             current_time = time.time()
+            snapshot = get_telemetry().latest()
             
             # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = snapshot.cpu_percent
             self._add_metric("system.cpu.usage", cpu_percent, MetricType.PERFORMANCE, 
                            tags={"unit": "percent"})
             
             # Memory metrics
-            memory = psutil.virtual_memory()
-            self._add_metric("system.memory.usage", memory.percent, MetricType.PERFORMANCE,
+            self._add_metric("system.memory.usage", snapshot.memory_percent, MetricType.PERFORMANCE,
                            tags={"unit": "percent"})
-            self._add_metric("system.memory.available", memory.available / (1024**3), MetricType.PERFORMANCE,
+            self._add_metric("system.memory.available", snapshot.memory_available_gb, MetricType.PERFORMANCE,
                            tags={"unit": "GB"})
             
             # Disk metrics
-            disk = psutil.disk_usage('/')
-            disk_percent = (disk.used / disk.total) * 100
+            disk_percent = (snapshot.disk_used / snapshot.disk_total) * 100
             self._add_metric("system.disk.usage", disk_percent, MetricType.PERFORMANCE,
                            tags={"unit": "percent"})
             
-            # Network metrics (if available)
-            try:
-                network = psutil.net_io_counters()
-                self._add_metric("system.network.bytes_sent", network.bytes_sent, MetricType.PERFORMANCE,
-                               tags={"unit": "bytes"})
-                self._add_metric("system.network.bytes_recv", network.bytes_recv, MetricType.PERFORMANCE,
-                               tags={"unit": "bytes"})
-            except:
-                pass  # Network stats might not be available
+            # Network metrics
+            self._add_metric("system.network.bytes_sent", snapshot.net_bytes_sent, MetricType.PERFORMANCE,
+                           tags={"unit": "bytes"})
+            self._add_metric("system.network.bytes_recv", snapshot.net_bytes_recv, MetricType.PERFORMANCE,
+                           tags={"unit": "bytes"})
             
             # Update system stats
             self.system_stats = {
                 "cpu_usage": cpu_percent,
-                "memory_usage": memory.percent,
-                "memory_available_gb": memory.available / (1024**3),
+                "memory_usage": snapshot.memory_percent,
+                "memory_available_gb": snapshot.memory_available_gb,
                 "disk_usage": disk_percent,
                 "timestamp": current_time
             }
@@ -367,4 +364,4 @@ class EnterpriseMonitoring:
         self.logger.info("🔍 Enterprise monitoring system shutdown")
 
 # Global monitoring instance
-enterprise_monitoring = EnterpriseMonitoring()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, enterprise_monitoring=EnterpriseMonitoring)
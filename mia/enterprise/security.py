@@ -19,6 +19,7 @@ from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
+from mia.core.service_registry import get_service, lazy_services
 
 class SecurityLevel(Enum):
     """Security levels"""
@@ -243,20 +244,24 @@ class EnterpriseSecurityManager:
         }
 
 # Global security manager instance
-security_manager = EnterpriseSecurityManager()
+__getattr__ = lazy_services(__name__, security_manager=EnterpriseSecurityManager)
+
+def get_security_manager() -> EnterpriseSecurityManager:
+    """Process-wide security manager, constructed on first use"""
+    return get_service(f"{__name__}.security_manager")
 
 def authenticate(username: str, password: str) -> Optional[str]:
     """Authenticate user"""
-    return security_manager.authenticate_user(username, password)
+    return get_security_manager().authenticate_user(username, password)
 
 def validate_session(token: str) -> Optional[str]:
     """Validate session token"""
-    return security_manager.validate_session(token)
+    return get_security_manager().validate_session(token)
 
 def encrypt_sensitive_data(data: str) -> str:
     """Encrypt sensitive data"""
-    return security_manager.encrypt_data(data)
+    return get_security_manager().encrypt_data(data)
 
 def decrypt_sensitive_data(encrypted_data: str) -> str:
     """Decrypt sensitive data"""
-    return security_manager.decrypt_data(encrypted_data)
\ No newline at end of file
+    return get_security_manager().decrypt_data(encrypted_data)
\ No newline at end of file
@@ -19,6 +19,7 @@ from enum import Enum
 import threading
 from datetime import datetime, timedelta
 import base64
+from mia.core.service_registry import lazy_services
 
 class UserRole(Enum):
     """User roles"""
@@ -637,4 +638,4 @@ class SecuritySystem:
         self.logger.info("🔐 Security system shutdown")
 
 # Global security system instance
-security_system = SecuritySystem()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, security_system=SecuritySystem)
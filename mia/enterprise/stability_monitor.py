@@ -8,13 +8,15 @@ import time
 import json
 import asyncio
 import threading
-import psutil
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 
+from mia.core.telemetry import get_telemetry
+from mia.core.service_registry import get_service, lazy_services
+
 class StabilityLevel(Enum):
 
     def _get_deterministic_time(self) -> float:
@@ -418,12 +420,11 @@ class EnterpriseStabilityMonitor:
         """Calculate system performance score"""
         try:
             # Get system performance metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
+            snapshot = get_telemetry().latest()
             
             # Calculate performance score
-            cpu_score = max(0, (100 - cpu_percent) / 100)
-            memory_score = max(0, (100 - memory.percent) / 100)
+            cpu_score = max(0, (100 - snapshot.cpu_percent) / 100)
+            memory_score = max(0, (100 - snapshot.memory_percent) / 100)
             
             performance_score = (cpu_score + memory_score) / 2
             
@@ -827,20 +828,24 @@ class EnterpriseStabilityMonitor:
             }
 
 # Global enterprise stability monitor
-enterprise_stability_monitor = EnterpriseStabilityMonitor()
+__getattr__ = lazy_services(__name__, enterprise_stability_monitor=EnterpriseStabilityMonitor)
+
+def get_enterprise_stability_monitor() -> EnterpriseStabilityMonitor:
+    """Process-wide enterprise stability monitor, constructed on first use"""
+    return get_service(f"{__name__}.enterprise_stability_monitor")
 
 async def start_enterprise_monitoring():
     """Start enterprise stability monitoring"""
-    await enterprise_stability_monitor.start_monitoring()
+    await get_enterprise_stability_monitor().start_monitoring()
 
 async def stop_enterprise_monitoring():
     """Stop enterprise stability monitoring"""
-    await enterprise_stability_monitor.stop_monitoring()
+    await get_enterprise_stability_monitor().stop_monitoring()
 
 def get_enterprise_status() -> Dict[str, Any]:
     """Get current enterprise status"""
-    return enterprise_stability_monitor.get_current_status()
+    return get_enterprise_stability_monitor().get_current_status()
 
 def get_enterprise_score() -> float:
     """Get enterprise score"""
-    return enterprise_stability_monitor.get_enterprise_score()
\ No newline at end of file
+    return get_enterprise_stability_monitor().get_enterprise_score()
\ No newline at end of file
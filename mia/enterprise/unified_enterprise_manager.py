@@ -25,6 +25,7 @@ from pathlib import Path
 import hashlib
 import uuid
 from datetime import datetime, timedelta
+from mia.core.service_registry import get_service, lazy_services
 
 class EnterpriseMode(Enum):
     """Enterprise operation modes"""
@@ -420,11 +421,12 @@ class UnifiedEnterpriseManager:
         while True:
             try:
                 # Check system resources
-                import psutil
+                from mia.core.telemetry import get_telemetry
                 
-                cpu_percent = psutil.cpu_percent()
-                memory_percent = psutil.virtual_memory().percent
-                disk_percent = psutil.disk_usage('/').percent
+                snapshot = get_telemetry().latest()
+                cpu_percent = snapshot.cpu_percent
+                memory_percent = snapshot.memory_percent
+                disk_percent = snapshot.disk_percent
                 
                 # Update health status
                 health_status = "healthy"
@@ -606,25 +608,29 @@ class UnifiedEnterpriseManager:
         self.logger.info("✅ Enterprise Manager shutdown complete")
 
 # Global enterprise manager instance
-enterprise_manager = UnifiedEnterpriseManager()
+__getattr__ = lazy_services(__name__, enterprise_manager=UnifiedEnterpriseManager)
+
+def get_enterprise_manager() -> UnifiedEnterpriseManager:
+    """Process-wide enterprise manager, constructed on first use"""
+    return get_service(f"{__name__}.enterprise_manager")
 
 # Convenience functions for backward compatibility
 async def initialize_enterprise():
     """Initialize enterprise system"""
-    await enterprise_manager.initialize()
+    await get_enterprise_manager().initialize()
 
 async def get_enterprise_status():
     """Get enterprise status"""
-    return await enterprise_manager.get_system_status()
+    return await get_enterprise_manager().get_system_status()
 
 async def create_user_session(user_id: str, metadata: Dict[str, Any] = None):
     """Create user session"""
-    return await enterprise_manager.create_session(user_id, metadata)
+    return await get_enterprise_manager().create_session(user_id, metadata)
 
 async def end_user_session(session_id: str):
     """End user session"""
-    await enterprise_manager.end_session(session_id)
+    await get_enterprise_manager().end_session(session_id)
 
 async def shutdown_enterprise():
     """Shutdown enterprise system"""
-    await enterprise_manager.shutdown()
\ No newline at end of file
+    await get_enterprise_manager().shutdown()
\ No newline at end of file
@@ -3,7 +3,10 @@ MIA Enterprise AGI - Interfaces Module
 User interfaces and interaction systems
 """
 
-from .chat import chat_interface, ChatInterface, MessageType, ChatMessage
+from mia.core.service_registry import lazy_services
+from .chat import ChatInterface, MessageType, ChatMessage
+
+__getattr__ = lazy_services(__name__, chat_interface="mia.interfaces.chat.chat_interface")
 
 __all__ = [
     'chat_interface',
@@ -16,7 +16,9 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
-from mia.core.agi_core import agi_core, ThoughtType
+from mia.core.agi_core import ThoughtType, get_agi_core
+from mia.core.service_registry import get_service, lazy_services, service
+from mia.core.session_runtime import ChatSession, SessionRequest, SessionRuntime
 
 class MessageType(Enum):
     """Types of chat messages"""
@@ -58,6 +60,9 @@ class ChatInterface:
         self.show_thoughts = True
         self.stream_responses = True
         
+        # Per-connection sessions with cancellation and shared admission control
+        self.sessions = SessionRuntime(self._handle_session_request)
+        
         self.logger.info("💬 Chat Interface initialized")
     
     async def initialize(self):
@@ -159,11 +164,16 @@ class ChatInterface:
             
             await self._broadcast_message(error_msg)
     
+    async def _handle_session_request(self, session: ChatSession, request: SessionRequest) -> Optional[str]:
+        """Session runtime handler; replies are broadcast by process_message"""
+        await self.process_message(session.transport, request.data)
+        return None
+    
     async def _process_streaming_response(self, user_message: ChatMessage):
         """Process message with streaming response"""
         
         # Generate thought about the message
-        thought = await agi_core.think(user_message.content, ThoughtType.REASONING)
+        thought = await get_agi_core().think(user_message.content, ThoughtType.REASONING)
         
         # Show thought process if enabled
         if self.show_thoughts:
@@ -181,7 +191,7 @@ class ChatInterface:
             await self._broadcast_message(thought_msg)
         
         # Generate response using AGI core
-        response_content = await agi_core.chat(user_message.content)
+        response_content = await get_agi_core().chat(user_message.content)
         
         # Stream the response
         await self._stream_response(response_content)
@@ -190,7 +200,7 @@ class ChatInterface:
         """Process message with complete response"""
         
         # Generate response using AGI core
-        response_content = await agi_core.chat(user_message.content)
+        response_content = await get_agi_core().chat(user_message.content)
         
         # Create assistant message
         assistant_message = ChatMessage(
@@ -366,4 +376,10 @@ class ChatInterface:
             self.logger.error(f"❌ Failed to learn from conversation: {e}")
 
 # Global chat interface instance
-chat_interface = ChatInterface()
\ No newline at end of file
+__getattr__ = lazy_services(
+    __name__, chat_interface=service(ChatInterface, depends_on=["mia.core.agi_core.agi_core"])
+)
+
+def get_chat_interface() -> ChatInterface:
+    """Process-wide chat interface, constructed on first use"""
+    return get_service(f"{__name__}.chat_interface")
@@ -17,11 +17,12 @@ import json
 import logging
 import asyncio
 import time
-from typing import Dict, List, Any, Optional, Union, AsyncGenerator
+from typing import Dict, List, Any, Optional, Union, AsyncGenerator, Deque
 from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
 import uuid
+from collections import deque
 from datetime import datetime
 
 # FastAPI and WebSocket imports
@@ -31,6 +32,9 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
 import uvicorn
+from mia.core.service_registry import get_registry, get_service, lazy_services
+from mia.core.session_runtime import ChatSession, SessionRequest, SessionRuntime
+from mia.core.web_assets import AssetPipeline
 
 class InterfaceType(Enum):
     """Interface types"""
@@ -89,7 +93,7 @@ class UnifiedInterfaceSystem:
         self.web_app = FastAPI(title="MIA Enterprise AGI", version="1.0.0")
         self.websocket_connections: List[WebSocket] = []
         self.active_sessions: Dict[str, Dict[str, Any]] = {}
-        self.message_history: List[InterfaceMessage] = []
+        self.message_history: Deque[InterfaceMessage] = deque(maxlen=1000)
         
         # Setup directories
         self.static_dir = Path("web/static")
@@ -97,6 +101,12 @@ class UnifiedInterfaceSystem:
         self.data_dir = Path("mia_data/interfaces")
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
+        # Chat sessions: bounded queues, cancel-on-supersede, shared admission control
+        self.sessions = SessionRuntime(self._handle_session_request, history_dir=str(self.data_dir / "sessions"))
+        
+        # Pages and static assets rendered once, precompressed and served with validators
+        self.assets: Optional[AssetPipeline] = None
+        
         self.logger.info("🌐 Unified Interface System initializing...")
     
     def _setup_logging(self) -> logging.Logger:
@@ -161,17 +171,22 @@ class UnifiedInterfaceSystem:
         @self.web_app.get("/", response_class=HTMLResponse)
         async def home(request: Request):
             """Home page"""
-            return HTMLResponse(self._get_home_html())
+            return self._serve_asset(request, "/")
         
         @self.web_app.get("/chat", response_class=HTMLResponse)
         async def chat_page(request: Request):
             """Chat interface page"""
-            return HTMLResponse(self._get_chat_html())
+            return self._serve_asset(request, "/chat")
         
         @self.web_app.get("/dashboard", response_class=HTMLResponse)
         async def dashboard(request: Request):
             """Dashboard page"""
-            return HTMLResponse(self._get_dashboard_html())
+            return self._serve_asset(request, "/dashboard")
+        
+        @self.web_app.get("/assets/{asset_path:path}")
+        async def assets(request: Request, asset_path: str):
+            """Fingerprinted, immutable static assets"""
+            return self._serve_asset(request, f"/assets/{asset_path}")
         
         @self.web_app.websocket("/ws/chat")
         async def chat_websocket(websocket: WebSocket):
@@ -302,8 +317,30 @@ class UnifiedInterfaceSystem:
         with open(self.static_dir / "unified.js", "w") as f:
             f.write(js_content)
         
+        self._build_assets()
+        
         self.logger.info("✅ Web Assets created")
     
+    def _build_assets(self) -> AssetPipeline:
+        """Render pages once and fingerprint the CSS/JS they reference"""
+        assets = AssetPipeline()
+        assets.add_static("unified.css", self._get_unified_css(), source_url="/static/unified.css")
+        assets.add_static("unified.js", self._get_unified_js(), source_url="/static/unified.js")
+        assets.add_page("/", self._get_home_html)
+        assets.add_page("/chat", self._get_chat_html)
+        assets.add_page("/dashboard", self._get_dashboard_html)
+        self.assets = assets
+        return assets
+    
+    def _serve_asset(self, request: Request, url: str) -> Response:
+        """Serve a prebuilt asset, answering conditional requests with 304"""
+        assets = self.assets or self._build_assets()
+        result = assets.respond(url, request.headers.get("accept-encoding", ""),
+                                request.headers.get("if-none-match", ""))
+        if result is None:
+            raise HTTPException(status_code=404, detail="Asset not found")
+        return Response(content=result.body, status_code=result.status, headers=result.headers)
+    
     def _get_home_html(self) -> str:
         """Get home page HTML"""
         return """
@@ -1207,10 +1244,21 @@ document.addEventListener('DOMContentLoaded', function() {
     async def _handle_chat_websocket(self, websocket: WebSocket):
         """Handle chat WebSocket connection"""
         await websocket.accept()
-        self.websocket_connections.append(websocket)
         
         # Create session
-        session_id = str(uuid.uuid4())
+        session = self.sessions.open(lambda payload: websocket.send_text(json.dumps(payload)), transport=websocket,
+                                     subject_id=websocket.query_params.get("user_id"))
+        if session is None:
+            await websocket.send_text(json.dumps({
+                "type": "busy",
+                "reason": "too_many_sessions",
+                "timestamp": time.time()
+            }))
+            await websocket.close()
+            return
+        
+        session_id = session.session_id
+        self.websocket_connections.append(websocket)
         self.active_sessions[session_id] = {
             "websocket": websocket,
             "created_at": time.time(),
@@ -1228,8 +1276,8 @@ document.addEventListener('DOMContentLoaded', function() {
                 # Update session activity
                 self.active_sessions[session_id]["last_activity"] = time.time()
                 
-                # Process message
-                await self._process_websocket_message(websocket, message_data, session_id)
+                # Queue message; the session runtime sends the reply
+                await self.sessions.submit(session, message_data)
                 
         except WebSocketDisconnect:
             self.logger.info(f"💬 WebSocket disconnected: {session_id}")
@@ -1237,57 +1285,41 @@ document.addEventListener('DOMContentLoaded', function() {
             self.logger.error(f"WebSocket error: {e}")
         finally:
             # Cleanup
+            await self.sessions.close(session)
             if websocket in self.websocket_connections:
                 self.websocket_connections.remove(websocket)
             if session_id in self.active_sessions:
                 del self.active_sessions[session_id]
     
-    async def _process_websocket_message(self, websocket: WebSocket, data: Dict[str, Any], session_id: str):
-        """Process WebSocket message"""
-        try:
-            message_type = data.get("type", "unknown")
-            content = data.get("content", "")
-            
-            if message_type == "user_message":
-                # Log user message
-                user_message = InterfaceMessage(
-                    id=str(uuid.uuid4()),
-                    type=MessageType.USER,
-                    content=content,
-                    timestamp=time.time(),
-                    interface=InterfaceType.CHAT,
-                    metadata={"session_id": session_id}
-                )
-                self.message_history.append(user_message)
-                
-                # Process with AGI core
-                response = await self._process_with_agi(content, session_id)
-                
-                # Send response
-                await websocket.send_text(json.dumps({
-                    "type": "assistant",
-                    "content": response,
-                    "timestamp": time.time()
-                }))
-                
-                # Log assistant response
-                assistant_message = InterfaceMessage(
-                    id=str(uuid.uuid4()),
-                    type=MessageType.ASSISTANT,
-                    content=response,
-                    timestamp=time.time(),
-                    interface=InterfaceType.CHAT,
-                    metadata={"session_id": session_id}
-                )
-                self.message_history.append(assistant_message)
-                
-        except Exception as e:
-            self.logger.error(f"Error processing WebSocket message: {e}")
-            await websocket.send_text(json.dumps({
-                "type": "error",
-                "content": "Sorry, I encountered an error processing your message.",
-                "timestamp": time.time()
-            }))
+    async def _handle_session_request(self, session: ChatSession, request: SessionRequest) -> Optional[str]:
+        """Process chat session request"""
+        if request.type != "user_message":
+            return None
+        
+        # Log user message
+        self.message_history.append(InterfaceMessage(
+            id=str(uuid.uuid4()),
+            type=MessageType.USER,
+            content=request.content,
+            timestamp=time.time(),
+            interface=InterfaceType.CHAT,
+            metadata={"session_id": session.session_id, "request_id": request.request_id}
+        ))
+        
+        # Process with AGI core (cancelled when a newer message supersedes it)
+        response = await self._process_with_agi(request.content, session.session_id)
+        
+        # Log assistant response
+        self.message_history.append(InterfaceMessage(
+            id=str(uuid.uuid4()),
+            type=MessageType.ASSISTANT,
+            content=response,
+            timestamp=time.time(),
+            interface=InterfaceType.CHAT,
+            metadata={"session_id": session.session_id, "request_id": request.request_id}
+        ))
+        
+        return response
     
     async def _process_with_agi(self, message: str, session_id: str) -> str:
         """Process message with AGI core"""
@@ -1327,6 +1359,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 "sessions": len(self.active_sessions)
             },
             "messages": len(self.message_history),
+            "sessions": self.sessions.get_status(),
             "timestamp": time.time()
         }
     
@@ -1446,6 +1479,9 @@ document.addEventListener('DOMContentLoaded', function() {
         """Shutdown interface system"""
         self.logger.info("🛑 Shutting down Unified Interface System...")
         
+        # Cancel in-flight chat requests
+        await self.sessions.shutdown()
+        
         # Close all WebSocket connections
         for websocket in self.websocket_connections:
             try:
@@ -1459,25 +1495,28 @@ document.addEventListener('DOMContentLoaded', function() {
         self.logger.info("✅ Unified Interface System shutdown complete")
 
 # Global interface system instance
-unified_interface = UnifiedInterfaceSystem()
+__getattr__ = lazy_services(__name__, unified_interface=UnifiedInterfaceSystem)
+
+def get_unified_interface() -> UnifiedInterfaceSystem:
+    """Process-wide interface system, constructed on first use"""
+    return get_service(f"{__name__}.unified_interface")
 
 # Convenience functions
 async def initialize_interfaces(config: Optional[InterfaceConfig] = None):
     """Initialize interface system"""
     if config:
-        global unified_interface
-        unified_interface = UnifiedInterfaceSystem(config)
+        get_registry().set(f"{__name__}.unified_interface", UnifiedInterfaceSystem(config))
     
-    await unified_interface.initialize()
+    await get_unified_interface().initialize()
 
 async def start_interface_server(port: Optional[int] = None):
     """Start interface server"""
-    await unified_interface.start_server(port)
+    await get_unified_interface().start_server(port)
 
 async def get_interface_status():
     """Get interface status"""
-    return await unified_interface._get_api_status()
+    return await get_unified_interface()._get_api_status()
 
 async def shutdown_interfaces():
     """Shutdown interface system"""
-    await unified_interface.shutdown()
\ No newline at end of file
+    await get_unified_interface().shutdown()
\ No newline at end of file
@@ -34,7 +34,7 @@ import asyncio
 import threading
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Set, Union, Callable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from concurrent.futures import ThreadPoolExecutor
 import hashlib
 import uuid
@@ -56,15 +56,9 @@ try:
 except ImportError:
     HYBRID_COMPONENTS_AVAILABLE = False
 
-# Machine learning dependencies
-try:
-    import numpy as np
-    from sklearn.cluster import DBSCAN
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    ML_AVAILABLE = True
-except ImportError:
-    ML_AVAILABLE = False
+# Online pattern clustering (pure Python, no sklearn required)
+from mia.knowledge.hybrid.stream_clustering import StreamingClusterer
+from mia.knowledge.hybrid.deduplication import DeduplicationEngine
 
 logger = logging.getLogger(__name__)
 
@@ -129,6 +123,7 @@ class ConsolidationResult:
     knowledge_pruned: int
     quality_improved: float
     processing_time: float
+    merges: List[Dict[str, Any]] = field(default_factory=list)
 
 class AutonomousLearning:
     """
@@ -193,14 +188,16 @@ class AutonomousLearning:
         self.consolidation_interval = 3600  # 1 hour
         self.max_memory_size = 10000
         
-        # Machine learning availability
-        self.ml_available = ML_AVAILABLE
-        if self.ml_available:
-            self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-            self.clusterer = DBSCAN(eps=0.3, min_samples=2)
-            logger.info("✅ ML components available")
-        else:
-            logger.warning("❌ ML components not available - pattern recognition limited")
+        # Streaming pattern clustering - hashing vectorizer + micro-clusters,
+        # cluster IDs persist across interactions and restarts
+        self.ml_available = True
+        # (weights are decayed counts, so N recent points weigh slightly below N)
+        self.pattern_clusterer = StreamingClusterer(min_weight=self.pattern_min_frequency - 0.5)
+        
+        # Near-duplicate consolidation (MinHash/LSH), indexes only what changed in the KB
+        self.concept_deduplicator = DeduplicationEngine()
+        self.relation_deduplicator = DeduplicationEngine(threshold=0.8)
+        self.last_merges: List[Dict[str, Any]] = []
             
         # Performance optimization
         self.executor = ThreadPoolExecutor(max_workers=4)
@@ -680,7 +677,7 @@ class AutonomousLearning:
                 patterns.append(pattern)
                 
             # Pattern 4: ML-based pattern detection
-            if self.ml_available and len(self.interaction_history) > 10:
+            if self.ml_available:
                 ml_patterns = await self._detect_ml_patterns(interaction)
                 patterns.extend(ml_patterns)
                 
@@ -709,77 +706,39 @@ class AutonomousLearning:
             return pattern
             
     async def _detect_ml_patterns(self, interaction: Dict[str, Any]) -> List[Pattern]:
-        """Zaznaj vzorce z ML algoritmi"""
+        """Zaznaj vzorce z inkrementalnim gručenjem (samo trenutna interakcija)"""
         patterns = []
         
         try:
-            if not self.ml_available or len(self.interaction_history) < 10:
+            example = {
+                'user_input': interaction['user_input'],
+                'system_response': interaction['system_response'],
+                'timestamp': interaction['timestamp']
+            }
+            assignment = self.pattern_clusterer.add(
+                f"{interaction['user_input']} {interaction['system_response']}", example
+            )
+            if assignment is None or not assignment.is_pattern:
+                return patterns
+            # Gruča je lahko že obrezana ali združena - zastarelo dodelitev preskoči
+            cluster = self.pattern_clusterer.clusters.get(assignment.cluster_id)
+            if cluster is None:
                 return patterns
                 
-            # Prepare text data for clustering
-            texts = []
-            for hist_interaction in self.interaction_history[-100:]:  # Last 100 interactions
-                combined_text = f"{hist_interaction['user_input']} {hist_interaction['system_response']}"
-                texts.append(combined_text)
-                
-            # Vectorize texts
-            def vectorize_texts():
-                try:
-                    vectors = self.vectorizer.fit_transform(texts)
-                    return vectors.toarray()
-                except Exception as e:
-                    logger.error(f"Error vectorizing texts: {e}")
-                    return None
-                    
-            vectors = await asyncio.get_event_loop().run_in_executor(
-                self.executor, vectorize_texts
+            pattern = await self._get_or_create_pattern(
+                pattern_id=f"ml_cluster_{assignment.cluster_id}",
+                pattern_type="ml_cluster",
+                description="ML-detected interaction cluster"
             )
             
-            if vectors is not None:
-                # Perform clustering
-                def cluster_vectors():
-                    try:
-                        clusters = self.clusterer.fit_predict(vectors)
-                        return clusters
-                    except Exception as e:
-                        logger.error(f"Error clustering vectors: {e}")
-                        return None
-                        
-                clusters = await asyncio.get_event_loop().run_in_executor(
-                    self.executor, cluster_vectors
-                )
-                
-                if clusters is not None:
-                    # Analyze clusters
-                    cluster_counts = Counter(clusters)
-                    
-                    for cluster_id, count in cluster_counts.items():
-                        if cluster_id != -1 and count >= self.pattern_min_frequency:  # -1 is noise in DBSCAN
-                            pattern_id = f"ml_cluster_{cluster_id}"
-                            
-                            pattern = await self._get_or_create_pattern(
-                                pattern_id=pattern_id,
-                                pattern_type="ml_cluster",
-                                description=f"ML-detected interaction cluster with {count} examples"
-                            )
-                            
-                            # Add examples from this cluster
-                            cluster_indices = [i for i, c in enumerate(clusters) if c == cluster_id]
-                            for idx in cluster_indices[-5:]:  # Last 5 examples
-                                if idx < len(self.interaction_history):
-                                    hist_interaction = self.interaction_history[-(len(texts)-idx)]
-                                    pattern.examples.append({
-                                        'user_input': hist_interaction['user_input'],
-                                        'system_response': hist_interaction['system_response'],
-                                        'timestamp': hist_interaction['timestamp'],
-                                        'cluster_id': cluster_id
-                                    })
-                                    
-                            pattern.frequency = count
-                            pattern.confidence = min(1.0, count / 10.0)
-                            pattern.last_seen = time.time()
-                            
-                            patterns.append(pattern)
+            pattern.description = f"ML-detected interaction cluster with {cluster.total_points} examples"
+            pattern.examples = [dict(e, cluster_id=assignment.cluster_id) for e in cluster.examples]
+            pattern.frequency = cluster.total_points
+            pattern.confidence = min(1.0, assignment.weight / 10.0)
+            pattern.last_seen = time.time()
+            pattern.metadata['cluster_weight'] = assignment.weight
+            
+            patterns.append(pattern)
                             
         except Exception as e:
             logger.error(f"Error in ML pattern detection: {e}")
@@ -929,6 +888,7 @@ class AutonomousLearning:
                 relations_refined = 0
                 patterns_validated = 0
                 knowledge_pruned = 0
+                self.last_merges = []
                 
                 # Consolidate concepts
                 if self.kb_available:
@@ -956,7 +916,8 @@ class AutonomousLearning:
                     patterns_validated=patterns_validated,
                     knowledge_pruned=knowledge_pruned,
                     quality_improved=0.0,  # Would need before/after comparison
-                    processing_time=processing_time
+                    processing_time=processing_time,
+                    merges=list(self.last_merges)
                 )
                 
                 logger.info(f"✅ Knowledge consolidation completed: "
@@ -980,24 +941,37 @@ class AutonomousLearning:
             )
             
     async def _consolidate_concepts(self) -> int:
-        """Konsolidiraj koncepte"""
+        """Konsolidiraj koncepte - združi skoraj podvojene (MinHash/LSH)"""
         merged_count = 0
         
         try:
             if not self.kb_available:
                 return 0
                 
-            # Get all concepts from knowledge bank
-            stats = self.knowledge_bank.get_statistics()
-            
-            # Simple consolidation: merge very similar concepts
-            # This is a simplified implementation
-            # In practice, this would use more sophisticated similarity measures
-            
-            logger.debug(f"Consolidating concepts from {stats.total_concepts} total concepts")
-            
-            # For now, just return 0 as we don't want to accidentally merge important concepts
-            # In a full implementation, this would use semantic similarity to identify duplicates
+            # Re-index only concepts created or changed since the last pass
+            for concept_uri in self.knowledge_bank.pop_changed_concepts():
+                concept = self.knowledge_bank.concepts[concept_uri]
+                self.concept_deduplicator.upsert(
+                    concept_uri,
+                    label=concept.label,
+                    description=concept.description,
+                    neighbours=self.knowledge_bank.concept_neighbourhood(concept_uri),
+                    rank=concept.created_at
+                )
+                
+            report = self.concept_deduplicator.find_duplicates()
+            for match in report.matches:
+                if await self.knowledge_bank.merge_concepts(match.duplicate, match.canonical):
+                    merged_count += 1
+                    self.last_merges.append({
+                        'type': 'concept',
+                        'duplicate': match.duplicate,
+                        'canonical': match.canonical,
+                        'score': match.score
+                    })
+                    
+            logger.debug(f"Concept consolidation: {report.items_checked} checked, "
+                        f"{report.candidates_verified} candidates, {merged_count} merged")
             
         except Exception as e:
             logger.error(f"Error consolidating concepts: {e}")
@@ -1005,20 +979,35 @@ class AutonomousLearning:
         return merged_count
         
     async def _consolidate_relations(self) -> int:
-        """Konsolidiraj relacije"""
+        """Konsolidiraj relacije - združi podvojene med istima konceptoma"""
         refined_count = 0
         
         try:
             if not self.kb_available:
                 return 0
                 
-            # Get all relations from knowledge bank
-            stats = self.knowledge_bank.get_statistics()
-            
-            logger.debug(f"Consolidating relations from {stats.total_relations} total relations")
-            
-            # Simple relation refinement
-            # In practice, this would identify redundant or conflicting relations
+            # Relations only match relations with the same (resolved) domain and range
+            for relation_uri in self.knowledge_bank.pop_changed_relations():
+                relation = self.knowledge_bank.relations[relation_uri]
+                self.relation_deduplicator.upsert(
+                    relation_uri,
+                    label=relation.label,
+                    block=(relation.domain, relation.range),
+                    rank=relation.created_at
+                )
+                
+            report = self.relation_deduplicator.find_duplicates()
+            for match in report.matches:
+                if await self.knowledge_bank.merge_relations(match.duplicate, match.canonical):
+                    refined_count += 1
+                    self.last_merges.append({
+                        'type': 'relation',
+                        'duplicate': match.duplicate,
+                        'canonical': match.canonical,
+                        'score': match.score
+                    })
+                    
+            logger.debug(f"Relation consolidation: {report.items_checked} checked, {refined_count} merged")
             
         except Exception as e:
             logger.error(f"Error consolidating relations: {e}")
@@ -1159,6 +1148,30 @@ class AutonomousLearning:
         except Exception as e:
             logger.error(f"Error loading learning data: {e}")
             
+        self._load_pattern_clusters()
+        
+    def _load_pattern_clusters(self):
+        """Naloži stanje gruč; brez združljivega stanja jih zgradi iz zgodovine"""
+        try:
+            clusters_file = self.data_dir / 'pattern_clusters.json'
+            if clusters_file.exists():
+                with open(clusters_file, 'r', encoding='utf-8') as f:
+                    if self.pattern_clusterer.load_dict(json.load(f)):
+                        return
+                        
+            for hist_interaction in self.interaction_history:
+                self.pattern_clusterer.add(
+                    f"{hist_interaction['user_input']} {hist_interaction['system_response']}",
+                    {
+                        'user_input': hist_interaction['user_input'],
+                        'system_response': hist_interaction['system_response'],
+                        'timestamp': hist_interaction['timestamp']
+                    }
+                )
+                
+        except Exception as e:
+            logger.error(f"Error loading pattern clusters: {e}")
+            
     async def save_learning_data(self) -> bool:
         """Shrani learning podatke na disk"""
         try:
@@ -1184,6 +1197,11 @@ class AutonomousLearning:
                 with open(history_file, 'w', encoding='utf-8') as f:
                     json.dump(self.interaction_history[-1000:], f, indent=2, ensure_ascii=False, default=str)
                     
+                # Save pattern clusters
+                clusters_file = self.data_dir / 'pattern_clusters.json'
+                with open(clusters_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.pattern_clusterer.to_dict(), f, ensure_ascii=False, default=str)
+                    
                 # Save statistics
                 stats_file = self.data_dir / 'learning_statistics.json'
                 with open(stats_file, 'w', encoding='utf-8') as f:
@@ -1234,7 +1252,9 @@ class AutonomousLearning:
                 'total_patterns': len(self.discovered_patterns),
                 'high_confidence_patterns': len([p for p in self.discovered_patterns.values() if p.confidence > 0.8]),
                 'frequent_patterns': len([p for p in self.discovered_patterns.values() if p.frequency >= self.pattern_min_frequency]),
-                'recent_patterns': len([p for p in self.discovered_patterns.values() if time.time() - p.last_seen < 86400])
+                'recent_patterns': len([p for p in self.discovered_patterns.values() if time.time() - p.last_seen < 86400]),
+                'live_clusters': len(self.pattern_clusterer.clusters),
+                'clustered_interactions': self.pattern_clusterer.stats['points']
             },
             'system_info': {
                 'learning_strategy': self.learning_strategy.value,
@@ -27,6 +27,8 @@ from concurrent.futures import ThreadPoolExecutor
 import math
 import hashlib
 
+from mia.core.text_encoder import get_text_encoder
+
 logger = logging.getLogger(__name__)
 
 class PipelineStage(Enum):
@@ -392,9 +394,8 @@ class EnhancedHybridPipeline:
                 concepts = [word.lower() for word in words if len(word) > 3 and word.isalpha()]
                 semantic_result["concepts"] = list(set(concepts))[:20]  # Limit to 20
                 
-                # Simple embedding (hash-based for consistency)
-                embedding = [hash(word) % 100 / 100.0 for word in concepts[:10]]
-                semantic_result["semantic_embedding"] = embedding
+                # Stable hashed embedding, comparable with memory/internet learning vectors
+                semantic_result["semantic_embedding"] = get_text_encoder(384).encode(content)
                 
                 semantic_result["confidence"] = min(1.0, len(entities) * 0.1 + len(concepts) * 0.05)
                 
@@ -46,7 +46,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirna
 try:
     from mia.knowledge.hybrid.knowledge_bank_core import HybridKnowledgeBank, create_hybrid_knowledge_bank
     from mia.knowledge.hybrid.semantic_layer import SemanticLayer, create_semantic_layer
-    from mia.knowledge.hybrid.deterministic_reasoning import DeterministicReasoningEngine, create_reasoning_engine
+    from mia.knowledge.hybrid.deterministic_reasoning import DeterministicReasoningEngine, InferenceMethod, create_reasoning_engine
     HYBRID_COMPONENTS_AVAILABLE = True
 except ImportError:
     HYBRID_COMPONENTS_AVAILABLE = False
@@ -949,7 +949,7 @@ class HybridPipeline:
             # Perform reasoning
             reasoning_result = await self.reasoning_engine.reason(
                 query=reasoning_query,
-                method=self.reasoning_engine.InferenceMethod.HYBRID
+                method=InferenceMethod.HYBRID
             )
             
             # Check consistency if we have knowledge
@@ -168,6 +168,12 @@ class HybridKnowledgeBank:
         self.relations: Dict[str, RelationDefinition] = {}
         self.individuals: Dict[str, Dict[str, Any]] = {}
         
+        # Merged URIs (duplicate -> canonical) and change tracking for consolidation
+        self.redirects: Dict[str, str] = {}
+        self.concept_relations: Dict[str, Set[str]] = {}
+        self.changed_concepts: Set[str] = set()
+        self.changed_relations: Set[str] = set()
+        
         # Performance optimization
         self.executor = ThreadPoolExecutor(max_workers=4)
         self.query_cache: Dict[str, QueryResult] = {}
@@ -202,7 +208,7 @@ class HybridKnowledgeBank:
         
     def _setup_namespaces(self):
         """Nastavi RDF namespaces in osnovne ontologije"""
-        if not self.graph:
+        if self.graph is None:
             return
             
         # Define MIA ontology namespace
@@ -244,7 +250,7 @@ class HybridKnowledgeBank:
             self.stats['relations_count'] = len(self.relations)
             self.stats['individuals_count'] = len(self.individuals)
             
-            if self.graph:
+            if self.graph is not None:
                 self.stats['triples_count'] = len(self.graph)
             
             self.stats['system_health'] = 'healthy'
@@ -278,6 +284,9 @@ class HybridKnowledgeBank:
             if concept_uri in self.concepts:
                 logger.warning(f"Concept {concept_id} already exists")
                 return False
+            if concept_uri in self.redirects:
+                logger.debug(f"Concept {concept_id} was merged into {self.resolve_uri(concept_uri)}")
+                return False
                 
             # Validate parent classes
             for parent_uri in parent_classes or []:
@@ -296,7 +305,7 @@ class HybridKnowledgeBank:
             )
             
             # Add to RDF graph
-            if self.graph:
+            if self.graph is not None:
                 concept_ref = URIRef(concept_uri)
                 self.graph.add((concept_ref, RDF.type, OWL.Class))
                 self.graph.add((concept_ref, RDFS.label, Literal(label)))
@@ -319,6 +328,7 @@ class HybridKnowledgeBank:
                 
             # Store concept
             self.concepts[concept_uri] = concept
+            self.changed_concepts.add(concept_uri)
             
             # Sync with MIA classic system
             if sync_with_mia and self.mia_integration and self.mia_store:
@@ -389,6 +399,13 @@ class HybridKnowledgeBank:
             if relation_uri in self.relations:
                 logger.warning(f"Relation {relation_id} already exists")
                 return False
+            if relation_uri in self.redirects:
+                logger.debug(f"Relation {relation_id} was merged into {self.resolve_uri(relation_uri)}")
+                return False
+                
+            # Endpoints that were merged point to their canonical concept
+            domain = self.resolve_uri(domain)
+            range = self.resolve_uri(range)
                 
             # Validate domain and range concepts
             if domain not in self.concepts:
@@ -408,7 +425,7 @@ class HybridKnowledgeBank:
             )
             
             # Add to RDF graph
-            if self.graph:
+            if self.graph is not None:
                 relation_ref = URIRef(relation_uri)
                 self.graph.add((relation_ref, RDF.type, OWL.ObjectProperty))
                 self.graph.add((relation_ref, RDFS.label, Literal(label)))
@@ -428,6 +445,7 @@ class HybridKnowledgeBank:
                 
             # Store relation
             self.relations[relation_uri] = relation
+            self._index_relation(relation)
             
             # Sync with MIA classic system
             if sync_with_mia and self.mia_integration and self.mia_store:
@@ -481,7 +499,7 @@ class HybridKnowledgeBank:
                 logger.warning(f"Concept {concept_uri} does not exist")
                 
             # Add to RDF graph
-            if self.graph:
+            if self.graph is not None:
                 individual_ref = URIRef(individual_uri)
                 concept_ref = URIRef(concept_uri)
                 self.graph.add((individual_ref, RDF.type, concept_ref))
@@ -571,7 +589,7 @@ class HybridKnowledgeBank:
         start_time = time.time()
         
         try:
-            if not self.graph:
+            if self.graph is None:
                 return QueryResult(
                     success=False,
                     results=[],
@@ -653,6 +671,176 @@ class HybridKnowledgeBank:
                 error_message=str(e)
             )
             
+    def resolve_uri(self, uri: str) -> str:
+        """Sledi preusmeritvam združenih URI-jev do kanoničnega URI-ja"""
+        chain = []
+        while uri in self.redirects:
+            chain.append(uri)
+            uri = self.redirects[uri]
+        for alias in chain[:-1]:
+            self.redirects[alias] = uri
+        return uri
+        
+    def _index_relation(self, relation: RelationDefinition):
+        """Register relation in the concept adjacency index and mark it for consolidation"""
+        for endpoint in (relation.domain, relation.range):
+            self.concept_relations.setdefault(endpoint, set()).add(relation.uri)
+            if endpoint in self.concepts:
+                self.changed_concepts.add(endpoint)
+        self.changed_relations.add(relation.uri)
+        
+    def _unindex_relation(self, relation: RelationDefinition):
+        for endpoint in (relation.domain, relation.range):
+            uris = self.concept_relations.get(endpoint)
+            if uris is not None:
+                uris.discard(relation.uri)
+                if not uris:
+                    del self.concept_relations[endpoint]
+                    
+    @staticmethod
+    def _local_name(uri: str) -> str:
+        return uri.split('#')[-1] if '#' in uri else uri
+        
+    def concept_neighbourhood(self, concept_uri: str) -> List[str]:
+        """Oznake sosednjih vozlišč koncepta (starši in relacije) za iskanje podvojenih"""
+        concept = self.concepts[concept_uri]
+        neighbours = [f"parent {self._local_name(parent)}" for parent in concept.parent_classes]
+        for relation_uri in self.concept_relations.get(concept_uri, ()):
+            relation = self.relations.get(relation_uri)
+            if relation is None:
+                continue
+            if relation.domain == concept_uri:
+                neighbours.append(f"{relation.label} {self._local_name(relation.range)}")
+            if relation.range == concept_uri:
+                neighbours.append(f"{self._local_name(relation.domain)} {relation.label}")
+        return neighbours
+        
+    def pop_changed_concepts(self) -> Set[str]:
+        """Koncepti, spremenjeni od zadnjega klica (za inkrementalno konsolidacijo)"""
+        changed, self.changed_concepts = self.changed_concepts, set()
+        return {uri for uri in changed if uri in self.concepts}
+        
+    def pop_changed_relations(self) -> Set[str]:
+        """Relacije, spremenjene od zadnjega klica (za inkrementalno konsolidacijo)"""
+        changed, self.changed_relations = self.changed_relations, set()
+        return {uri for uri in changed if uri in self.relations}
+        
+    def _redirect_graph_node(self, duplicate_uri: str, canonical_uri: str, keep_local: Set[Any]):
+        """Move triples of duplicate onto canonical and leave an owl:sameAs redirect"""
+        duplicate_ref, canonical_ref = URIRef(duplicate_uri), URIRef(canonical_uri)
+        for predicate, obj in list(self.graph.predicate_objects(duplicate_ref)):
+            self.graph.remove((duplicate_ref, predicate, obj))
+            if predicate == RDFS.label:
+                self.graph.add((canonical_ref, self.MIA.alias, obj))
+            elif predicate not in keep_local and obj != canonical_ref:
+                self.graph.add((canonical_ref, predicate, obj))
+        for subject, predicate in list(self.graph.subject_predicates(duplicate_ref)):
+            self.graph.remove((subject, predicate, duplicate_ref))
+            if subject != canonical_ref:
+                self.graph.add((subject, predicate, canonical_ref))
+        self.graph.add((duplicate_ref, OWL.sameAs, canonical_ref))
+        
+    async def merge_concepts(self, duplicate_uri: str, canonical_uri: str) -> bool:
+        """
+        Združi podvojen koncept v kanoničnega.
+        
+        Starši, lastnosti, relacije in RDF trojice podvojenega koncepta se
+        prenesejo na kanoničnega; podvojen URI ostane kot preusmeritev
+        (owl:sameAs in ``redirects``), zato obstoječe reference še delujejo.
+        
+        Returns:
+            True če je bil koncept združen
+        """
+        try:
+            canonical_uri = self.resolve_uri(canonical_uri)
+            if (duplicate_uri == canonical_uri or duplicate_uri not in self.concepts
+                    or canonical_uri not in self.concepts):
+                return False
+                
+            duplicate = self.concepts.pop(duplicate_uri)
+            canonical = self.concepts[canonical_uri]
+            
+            for parent_uri in duplicate.parent_classes:
+                parent_uri = self.resolve_uri(parent_uri)
+                if parent_uri != canonical_uri and parent_uri not in canonical.parent_classes:
+                    canonical.parent_classes.append(parent_uri)
+            for prop_name, prop_value in duplicate.properties.items():
+                canonical.properties.setdefault(prop_name, prop_value)
+            canonical.properties.setdefault('aliases', []).append(duplicate.label)
+            if not canonical.description:
+                canonical.description = duplicate.description
+                
+            # Children of the duplicate now inherit from the canonical concept
+            if self.graph is not None:
+                for child_ref in list(self.graph.subjects(RDFS.subClassOf, URIRef(duplicate_uri))):
+                    child = self.concepts.get(str(child_ref))
+                    if child is not None and child is not canonical:
+                        child.parent_classes = [canonical_uri if p == duplicate_uri else p
+                                                for p in child.parent_classes]
+                        
+            # Relations attached to the duplicate move to the canonical concept
+            for relation_uri in self.concept_relations.pop(duplicate_uri, set()):
+                relation = self.relations.get(relation_uri)
+                if relation is None:
+                    continue
+                self._unindex_relation(relation)
+                if relation.domain == duplicate_uri:
+                    relation.domain = canonical_uri
+                if relation.range == duplicate_uri:
+                    relation.range = canonical_uri
+                self._index_relation(relation)
+                
+            if self.graph is not None:
+                self._redirect_graph_node(duplicate_uri, canonical_uri, {RDF.type, RDFS.comment})
+                
+            self.redirects[duplicate_uri] = canonical_uri
+            self.changed_concepts.add(canonical_uri)
+            self.query_cache.clear()
+            
+            if self.mia_integration and self.mia_store:
+                await asyncio.get_event_loop().run_in_executor(
+                    self.executor, self.mia_store.merge_entity,
+                    self._local_name(duplicate_uri), self._local_name(canonical_uri)
+                )
+                
+            self._update_statistics()
+            logger.info(f"🔗 Merged concept {duplicate_uri} -> {canonical_uri}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error merging concept {duplicate_uri}: {e}")
+            return False
+            
+    async def merge_relations(self, duplicate_uri: str, canonical_uri: str) -> bool:
+        """Združi podvojeno relacijo v kanonično in preusmeri njen URI"""
+        try:
+            canonical_uri = self.resolve_uri(canonical_uri)
+            if (duplicate_uri == canonical_uri or duplicate_uri not in self.relations
+                    or canonical_uri not in self.relations):
+                return False
+                
+            duplicate = self.relations.pop(duplicate_uri)
+            canonical = self.relations[canonical_uri]
+            self._unindex_relation(duplicate)
+            for prop_name, prop_value in duplicate.properties.items():
+                canonical.properties.setdefault(prop_name, prop_value)
+            canonical.properties.setdefault('aliases', []).append(duplicate.label)
+            
+            if self.graph is not None:
+                self._redirect_graph_node(duplicate_uri, canonical_uri,
+                                          {RDF.type, RDFS.domain, RDFS.range})
+                
+            self.redirects[duplicate_uri] = canonical_uri
+            self.changed_relations.add(canonical_uri)
+            self.query_cache.clear()
+            self._update_statistics()
+            logger.info(f"🔗 Merged relation {duplicate_uri} -> {canonical_uri}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error merging relation {duplicate_uri}: {e}")
+            return False
+            
     async def get_concept_hierarchy(self, concept_uri: str) -> Dict[str, Any]:
         """
         Pridobi hierarhijo koncepta z SPARQL poizvedbami.
@@ -764,7 +952,7 @@ class HybridKnowledgeBank:
                 errors.extend([f"Circular dependency detected: {dep}" for dep in circular_deps])
                 
             # RDF graph validation
-            if self.graph:
+            if self.graph is not None:
                 try:
                     # Check for basic RDF consistency
                     triples_count = len(self.graph)
@@ -800,7 +988,7 @@ class HybridKnowledgeBank:
                     'relations_checked': len(self.relations),
                     'individuals_checked': len(self.individuals),
                     'circular_dependencies': len(circular_deps),
-                    'rdf_triples': len(self.graph) if self.graph else 0,
+                    'rdf_triples': len(self.graph) if self.graph is not None else 0,
                     'mia_integration': self.mia_integration,
                     'validation_timestamp': time.time()
                 }
@@ -867,7 +1055,7 @@ class HybridKnowledgeBank:
             
             # Calculate ontology size
             ontology_size_mb = 0.0
-            if self.graph:
+            if self.graph is not None:
                 # Estimate size based on triples count
                 ontology_size_mb = len(self.graph) * 0.0001  # Rough estimate
                 
@@ -875,7 +1063,7 @@ class HybridKnowledgeBank:
                 total_concepts=len(self.concepts),
                 total_relations=len(self.relations),
                 total_individuals=len(self.individuals),
-                total_triples=len(self.graph) if self.graph else 0,
+                total_triples=len(self.graph) if self.graph is not None else 0,
                 ontology_size_mb=ontology_size_mb,
                 last_updated=time.time(),
                 validation_status=self.stats.get('system_health', 'unknown')
@@ -912,7 +1100,7 @@ class HybridKnowledgeBank:
             'system_info': {
                 'rdf_available': self.rdf_available,
                 'mia_integration': self.mia_integration,
-                'storage_type': 'RDF Graph' if self.graph else 'No Storage',
+                'storage_type': 'RDF Graph' if self.graph is not None else 'No Storage',
                 'cache_size': len(self.query_cache),
                 'cache_max_size': self.cache_max_size,
                 'executor_threads': self.executor._max_workers if self.executor else 0
@@ -952,13 +1140,18 @@ class HybridKnowledgeBank:
                     relations_data = {uri: asdict(relation) for uri, relation in self.relations.items()}
                     json.dump(relations_data, f, indent=2, ensure_ascii=False)
                     
+                # Save URI redirects of merged concepts and relations
+                redirects_file = self.data_dir / 'redirects.json'
+                with open(redirects_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.redirects, f, indent=2, ensure_ascii=False)
+                    
                 # Save individuals
                 individuals_file = self.data_dir / 'individuals.json'
                 with open(individuals_file, 'w', encoding='utf-8') as f:
                     json.dump(self.individuals, f, indent=2, ensure_ascii=False)
                     
                 # Save RDF graph if available
-                if self.graph:
+                if self.graph is not None:
                     rdf_file = self.data_dir / 'ontology.ttl'
                     self.graph.serialize(destination=str(rdf_file), format='turtle')
                     
@@ -1006,8 +1199,19 @@ class HybridKnowledgeBank:
                     for uri, data in relations_data.items():
                         self.relations[uri] = RelationDefinition(**data)
                         
+            # Load URI redirects
+            redirects_file = self.data_dir / 'redirects.json'
+            if redirects_file.exists():
+                with open(redirects_file, 'r') as f:
+                    self.redirects = json.load(f)
+                    
+            # Adjacency index; everything loaded is new to the consolidation pass
+            for relation in self.relations.values():
+                self._index_relation(relation)
+            self.changed_concepts.update(self.concepts)
+                        
             # Load RDF graph if available
-            if self.graph:
+            if self.graph is not None:
                 rdf_file = self.data_dir / 'ontology.ttl'
                 if rdf_file.exists():
                     self.graph.parse(str(rdf_file), format='turtle')
@@ -1059,7 +1263,7 @@ class HybridKnowledgeBank:
                     'concepts_count': len(self.concepts),
                     'relations_count': len(self.relations),
                     'individuals_count': len(self.individuals),
-                    'rdf_triples': len(self.graph) if self.graph else 0,
+                    'rdf_triples': len(self.graph) if self.graph is not None else 0,
                     'backup_reason': 'pre_save_backup'
                 }
                 
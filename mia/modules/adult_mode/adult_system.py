@@ -14,6 +14,7 @@ from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
+from mia.core.service_registry import lazy_services
 
 # Encryption for adult content
 try:
@@ -961,4 +962,4 @@ Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}
         }
 
 # Global instance
-adult_system = AdultModeSystem()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, adult_system=AdultModeSystem)
@@ -6,6 +6,7 @@ Secure IMAP/SMTP client for API key retrieval and email automation
 
 import os
 import json
+import hashlib
 import logging
 import time
 import re
@@ -21,6 +22,7 @@ from email.mime.multipart import MIMEMultipart
 from email.header import decode_header
 import threading
 import queue
+from mia.core.service_registry import lazy_services
 
 # Encryption
 try:
@@ -91,9 +93,9 @@ class APIKeyExtraction:
 class EmailClient:
     """Secure email client for API key management"""
     
-    def __init__(self, config_path: str = "mia/data/email/config.json"):
+    def __init__(self, config_path: str = "mia/data/email/config.json", email_dir: str = "mia/data/email"):
         self.config_path = config_path
-        self.email_dir = Path("mia/data/email")
+        self.email_dir = Path(email_dir)
         self.email_dir.mkdir(parents=True, exist_ok=True)
         
         self.keys_dir = self.email_dir / "keys"
@@ -114,6 +116,10 @@ class EmailClient:
         self.message_queue = queue.Queue()
         self.processing_thread = None
         self.is_processing = False
+        self.sync_engine = None
+        
+        # Indexed local mailbox (opened on first use)
+        self._mailbox = None
         
         # API key patterns
         self.api_key_patterns = self._load_api_key_patterns()
@@ -454,28 +460,26 @@ class EmailClient:
     def stop_email_monitoring(self):
         """Stop email monitoring"""
         self.is_processing = False
+        if self.sync_engine is not None:
+            self.sync_engine.stop()
         self.logger.info("📧 Stopped email monitoring")
     
+    @property
+    def mailbox(self):
+        """Indexed local mailbox"""
+        if self._mailbox is None:
+            from mia.modules.api_email.imap_sync import MailboxStore
+            self._mailbox = MailboxStore(self.email_dir / "mailbox.db")
+        return self._mailbox
+    
     def _email_monitoring_loop(self, account_name: str):
         """Email monitoring loop"""
-        account = self.email_accounts[account_name]
-        check_interval = self.config.get("check_interval", 300)
+        from mia.modules.api_email.imap_sync import IMAPSyncEngine
         
-        while self.is_processing:
-            try:
-                # Check for new emails
-                messages = self._fetch_new_emails(account)
-                
-                # Process messages
-                for message in messages:
-                    self._process_email_message(message)
-                
-                # Wait before next check
-                time.sleep(check_interval)
-                
-            except Exception as e:
-                self.logger.error(f"Email monitoring error: {e}")
-                time.sleep(60)  # Wait before retry
+        # One persistent connection: incremental UID sync, then IDLE until new mail
+        account = self.email_accounts[account_name]
+        self.sync_engine = IMAPSyncEngine(self, account)
+        self.sync_engine.run(lambda: self.is_processing)
     
     def _fetch_new_emails(self, account: EmailAccount) -> List[EmailMessage]:
         """Fetch new emails from account"""
@@ -878,75 +882,90 @@ class EmailClient:
     def _process_verification_email(self, message: EmailMessage):
         """Process verification email"""
         try:
-            # Extract verification links
-            verification_links = re.findall(
-                r'https?://[^\s]+(?:verify|confirm|activate)[^\s]*',
-                message.body,
-                re.IGNORECASE
-            )
-            
-            if verification_links:
-                self.logger.info(f"📧 Found verification links: {len(verification_links)}")
-                
-                # Store verification info
-                verification_file = self.email_dir / "verifications.json"
-                
-                verifications = []
-                if verification_file.exists():
-                    with open(verification_file, 'r') as f:
-                        verifications = json.load(f)
-                
-                verification_data = {
-                    "timestamp": self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200,
-                    "sender": message.sender,
-                    "subject": message.subject,
-                    "links": verification_links,
-                    "processed": False
-                }
-                
-                verifications.append(verification_data)
-                
-                with open(verification_file, 'w') as f:
-                    json.dump(verifications, f, indent=2)
+            verification_data = self._verification_record(message)
+            if verification_data:
+                self._append_verifications([verification_data])
             
         except Exception as e:
             self.logger.error(f"Failed to process verification email: {e}")
     
-    def _store_email_message(self, message: EmailMessage):
-        """Store email message"""
+    def _verification_record(self, message: EmailMessage) -> Optional[Dict[str, Any]]:
+        """Verification links of a message, if any"""
+        # Extract verification links
+        verification_links = re.findall(
+            r'https?://[^\s]+(?:verify|confirm|activate)[^\s]*',
+            message.body,
+            re.IGNORECASE
+        )
+        
+        if not verification_links:
+            return None
+        
+        self.logger.info(f"📧 Found verification links: {len(verification_links)}")
+        return {
+            "timestamp": self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200,
+            "sender": message.sender,
+            "subject": message.subject,
+            "links": verification_links,
+            "processed": False
+        }
+    
+    def _append_verifications(self, records: List[Dict[str, Any]]):
+        """Store verification info (one rewrite per batch)"""
         try:
-            # Check storage limits
-            max_stored = self.config.get("security", {}).get("max_stored_messages", 1000)
-            
-            messages_file = self.email_dir / "messages.json"
-            
-            messages = []
-            if messages_file.exists():
-                with open(messages_file, 'r') as f:
-                    messages = json.load(f)
+            verification_file = self.email_dir / "verifications.json"
             
-            # Add new message
-            message_data = asdict(message)
-            message_data["email_type"] = message.email_type.value
+            verifications = []
+            if verification_file.exists():
+                with open(verification_file, 'r') as f:
+                    verifications = json.load(f)
             
-            # Don't log email content if configured
-            if not self.config.get("security", {}).get("log_email_content", False):
-                message_data["body"] = "[Content not logged]"
-                message_data["html_body"] = "[Content not logged]"
+            verifications.extend(records)
             
-            messages.append(message_data)
+            with open(verification_file, 'w') as f:
+                json.dump(verifications, f, indent=2)
             
-            # Trim to max size
-            if len(messages) > max_stored:
-                messages = messages[-max_stored:]
+        except Exception as e:
+            self.logger.error(f"Failed to store verifications: {e}")
+    
+    def _is_sensitive(self, message: EmailMessage) -> bool:
+        """API key and verification emails, which are not kept when auto-deleting"""
+        return (message.email_type in (EmailType.API_KEY, EmailType.VERIFICATION)
+                and self.config.get("security", {}).get("auto_delete_sensitive", True))
+    
+    def _message_record(self, message: EmailMessage) -> Dict[str, Any]:
+        """Message data as stored in the local mailbox"""
+        security = self.config.get("security", {})
+        message_data = asdict(message)
+        message_data["email_type"] = message.email_type.value
+        
+        # Don't log email content if configured or if the email is sensitive
+        if self._is_sensitive(message) or not security.get("log_email_content", False):
+            message_data["body"] = "[Content not logged]"
+            message_data["html_body"] = "[Content not logged]"
+        
+        return message_data
+    
+    def _store_email_message(self, message: EmailMessage):
+        """Store email message"""
+        try:
+            # Check storage limits
+            max_stored = self.config.get("security", {}).get("max_stored_messages", 1000)
             
-            # Save messages
-            with open(messages_file, 'w') as f:
-                json.dump(messages, f, indent=2)
+            self.mailbox.add_messages(message.recipient, "INBOX", [(None, self._message_record(message))])
+            self.mailbox.prune(message.recipient, max_stored)
             
         except Exception as e:
             self.logger.error(f"Failed to store email message: {e}")
     
+    def search_messages(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Full-text search of the local mailbox"""
+        try:
+            return self.mailbox.search(query, limit=limit)
+        except Exception as e:
+            self.logger.error(f"Failed to search messages: {e}")
+            return []
+    
     def get_stored_api_keys(self, service: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
         """Get stored API keys"""
         try:
@@ -1058,7 +1077,9 @@ class EmailClient:
                 "stored_api_keys": total_keys,
                 "services_with_keys": list(stored_keys.keys()),
                 "auto_process_emails": self.config.get("auto_process_emails", True),
-                "check_interval": self.config.get("check_interval", 300)
+                "check_interval": self.config.get("check_interval", 300),
+                "sync": self.sync_engine.get_status() if self.sync_engine else None,
+                "mailbox": self._mailbox.get_stats() if self._mailbox else None
             }
             
         except Exception as e:
@@ -1066,4 +1087,4 @@ class EmailClient:
             return {"error": str(e)}
 
 # Global instance
-email_client = EmailClient()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, email_client=EmailClient)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+MIA Fake IMAP Server
+Testna podpora za sinhronizacijo pošte: IMAP4rev1 strežnik v procesu
+(UID, UIDVALIDITY, IDLE) in generator testnih sporočil za teste in meritve
+"""
+
+import bisect
+import re
+import socketserver
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from mia.modules.api_email.email_client import EmailAccount, EmailProvider
+
+
+class _FakeFolder:
+    def __init__(self, uidvalidity: int):
+        self.uidvalidity = uidvalidity
+        self.uids: List[int] = []
+        self.flags: List[set] = []
+        self.raw: List[bytes] = []
+        self.next_uid = 1
+
+
+class _FakeIMAPHandler(socketserver.StreamRequestHandler):
+
+    def setup(self):
+        super().setup()
+        self.fake: "FakeIMAPServer" = self.server.fake
+        self.write_lock = threading.Lock()
+        self.folder: Optional[_FakeFolder] = None
+        self.readonly = False
+        self.known = 0
+
+    def send(self, data: bytes):
+        with self.write_lock:
+            self.wfile.write(data)
+            self.wfile.flush()
+
+    def handle(self):
+        self.fake._count("CONNECT")
+        self.send(b"* OK [CAPABILITY " + self.fake.capabilities.encode() + b"] MIA fake IMAP ready\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            parts = line.decode(errors="replace").rstrip("\r\n").split(" ", 2)
+            if len(parts) < 2:
+                self.send(b"* BAD malformed command\r\n")
+                continue
+            tag, command = parts[0], parts[1].upper()
+            args = parts[2] if len(parts) > 2 else ""
+            use_uid = command == "UID"
+            if use_uid:
+                command, _, args = args.partition(" ")
+                command = command.upper()
+            self.fake._count(("UID " if use_uid else "") + command)
+            handler = getattr(self, f"do_{command.lower()}", None)
+            if handler is None:
+                self.send(f"{tag} BAD unknown command {command}\r\n".encode())
+                continue
+            if handler(tag, args, use_uid) is False:
+                return
+
+    def do_capability(self, tag, args, use_uid):
+        self.send(f"* CAPABILITY {self.fake.capabilities}\r\n{tag} OK CAPABILITY completed\r\n".encode())
+
+    def do_login(self, tag, args, use_uid):
+        user, _, password = args.partition(" ")
+        if user.strip('"') == self.fake.user and password.strip('"') == self.fake.password:
+            self.send(f"{tag} OK LOGIN completed\r\n".encode())
+        else:
+            self.send(f"{tag} NO [AUTHENTICATIONFAILED] invalid credentials\r\n".encode())
+
+    def do_select(self, tag, args, use_uid, readonly=False):
+        folder = self.fake.folders.get(args.strip('"'))
+        if folder is None:
+            self.send(f"{tag} NO no such mailbox\r\n".encode())
+            return
+        with self.fake.lock:
+            self.folder, self.readonly, self.known = folder, readonly, len(folder.uids)
+            response = (f"* {self.known} EXISTS\r\n* 0 RECENT\r\n* OK [UIDVALIDITY {folder.uidvalidity}] UIDs valid\r\n"
+                        f"* OK [UIDNEXT {folder.next_uid}] next UID\r\n"
+                        f"{tag} OK [{'READ-ONLY' if readonly else 'READ-WRITE'}] SELECT completed\r\n")
+        self.send(response.encode())
+
+    def do_examine(self, tag, args, use_uid):
+        self.do_select(tag, args, use_uid, readonly=True)
+
+    def _indices(self, message_set: str, use_uid: bool) -> List[int]:
+        folder = self.folder
+        count = len(folder.uids)
+        if not count:
+            return []
+        highest = folder.uids[-1] if use_uid else count
+        indices = set()
+        for part in message_set.split(","):
+            low, _, high = part.partition(":")
+            low_value = highest if low == "*" else int(low)
+            high_value = low_value if not high else (highest if high == "*" else int(high))
+            low_value, high_value = sorted((low_value, high_value))
+            if use_uid:
+                start = bisect.bisect_left(folder.uids, low_value)
+                end = bisect.bisect_right(folder.uids, high_value)
+                indices.update(range(start, end))
+            else:
+                indices.update(range(max(low_value, 1) - 1, min(high_value, count)))
+        return sorted(indices)
+
+    def do_search(self, tag, args, use_uid):
+        if self.folder is None:
+            self.send(f"{tag} NO no mailbox selected\r\n".encode())
+            return
+        criteria = args.upper().split()
+        with self.fake.lock:
+            if criteria[:1] == ["UID"]:
+                indices = self._indices(criteria[1], True)
+            else:
+                indices = range(len(self.folder.uids))
+            if "UNSEEN" in criteria:
+                indices = [i for i in indices if "\\Seen" not in self.folder.flags[i]]
+            results = [self.folder.uids[i] if use_uid else i + 1 for i in indices]
+        self.send(f"* SEARCH {' '.join(map(str, results))}\r\n{tag} OK SEARCH completed\r\n".encode())
+
+    def do_fetch(self, tag, args, use_uid):
+        if self.folder is None:
+            self.send(f"{tag} NO no mailbox selected\r\n".encode())
+            return
+        message_set, _, items = args.partition(" ")
+        items = items.upper()
+        body_item = "RFC822" if re.search(r"\bRFC822\b(?!\.)", items) else "BODY[]" if "BODY" in items else None
+        marks_seen = body_item is not None and "PEEK" not in items and not self.readonly
+        chunks = []
+        with self.fake.lock:
+            for index in self._indices(message_set, use_uid):
+                fields = []
+                if use_uid or "UID" in items:
+                    fields.append(f"UID {self.folder.uids[index]}")
+                if marks_seen:
+                    self.folder.flags[index].add("\\Seen")
+                if "FLAGS" in items:
+                    fields.append(f"FLAGS ({' '.join(sorted(self.folder.flags[index]))})")
+                head = f"* {index + 1} FETCH ({' '.join(fields)}"
+                if body_item:
+                    raw = self.folder.raw[index]
+                    chunks.append(f"{head}{' ' if fields else ''}{body_item} {{{len(raw)}}}\r\n".encode() + raw + b")\r\n")
+                else:
+                    chunks.append(f"{head})\r\n".encode())
+        chunks.append(f"{tag} OK FETCH completed\r\n".encode())
+        self.send(b"".join(chunks))
+
+    def do_noop(self, tag, args, use_uid):
+        self._report_new()
+        self.send(f"{tag} OK NOOP completed\r\n".encode())
+
+    def _report_new(self):
+        if self.folder is not None:
+            with self.fake.lock:
+                count = len(self.folder.uids)
+            if count != self.known:
+                self.known = count
+                self.send(f"* {count} EXISTS\r\n".encode())
+
+    def do_idle(self, tag, args, use_uid):
+        if "IDLE" not in self.fake.capabilities.split():
+            self.send(f"{tag} BAD IDLE not supported\r\n".encode())
+            return
+        self.send(b"+ idling\r\n")
+        with self.fake.lock:
+            self.fake.idlers.add(self)
+        try:
+            self._report_new()
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    return False
+                if line.strip().upper() == b"DONE":
+                    break
+        finally:
+            with self.fake.lock:
+                self.fake.idlers.discard(self)
+        self.send(f"{tag} OK IDLE terminated\r\n".encode())
+
+    def do_logout(self, tag, args, use_uid):
+        self.send(f"* BYE logging out\r\n{tag} OK LOGOUT completed\r\n".encode())
+        return False
+
+
+class _ThreadingIMAPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeIMAPServer:
+    """In-process IMAP4rev1 server for tests and benchmarks.
+
+    Supports LOGIN, CAPABILITY, SELECT/EXAMINE (with UIDVALIDITY and
+    UIDNEXT), SEARCH and FETCH with or without UID, NOOP, IDLE and LOGOUT
+    on plain TCP. ``commands`` counts every command received.
+    """
+
+    def __init__(self, user: str = "mia@example.com", password: str = "secret", idle: bool = True,
+                 uidvalidity: int = 1):
+        self.user = user
+        self.password = password
+        self.capabilities = "IMAP4rev1 IDLE" if idle else "IMAP4rev1"
+        self.lock = threading.RLock()
+        self.folders: Dict[str, _FakeFolder] = {"INBOX": _FakeFolder(uidvalidity)}
+        self.idlers: set = set()
+        self.commands: Counter = Counter()
+        self._server: Optional[_ThreadingIMAPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _count(self, command: str):
+        with self.lock:
+            self.commands[command] += 1
+
+    def start(self) -> Tuple[str, int]:
+        self._server = _ThreadingIMAPServer(("127.0.0.1", 0), _FakeIMAPHandler)
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-imap", daemon=True)
+        self._thread.start()
+        return self._server.server_address
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeIMAPServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address
+
+    def account(self) -> EmailAccount:
+        """Account settings that reach this server"""
+        host, port = self.address
+        return EmailAccount(name="fake", email=self.user, password=self.password, provider=EmailProvider.CUSTOM,
+                            imap_server=host, imap_port=port, smtp_server=host, smtp_port=0,
+                            use_ssl=False, use_tls=False)
+
+    def append(self, raw: bytes, folder: str = "INBOX", flags: Iterable[str] = ()) -> int:
+        """Deliver a message; idling clients get an EXISTS response"""
+        return self.append_many([raw], folder, flags)[-1]
+
+    def append_many(self, messages: Iterable[bytes], folder: str = "INBOX", flags: Iterable[str] = ()) -> List[int]:
+        with self.lock:
+            target = self.folders.setdefault(folder, _FakeFolder(1))
+            uids = []
+            for raw in messages:
+                target.uids.append(target.next_uid)
+                target.flags.append(set(flags))
+                target.raw.append(raw)
+                uids.append(target.next_uid)
+                target.next_uid += 1
+            count = len(target.uids)
+            idlers = [handler for handler in self.idlers if handler.folder is target]
+        for handler in idlers:
+            handler.known = count
+            handler.send(f"* {count} EXISTS\r\n".encode())
+        return uids
+
+    def renumber(self, folder: str = "INBOX"):
+        """Assign new UIDs under a new UIDVALIDITY, as after a server-side rebuild"""
+        with self.lock:
+            target = self.folders[folder]
+            target.uidvalidity += 1
+            target.uids = list(range(1, len(target.uids) + 1))
+            target.next_uid = len(target.uids) + 1
+
+
+def make_test_message(index: int, kind: str = "general", recipient: str = "mia@example.com") -> bytes:
+    """RFC 822 message of the given kind: general, api_key or verification"""
+    if kind == "api_key":
+        sender, subject = "noreply@openai.com", f"Your OpenAI API key #{index}"
+        body = f"Here is your new API key: sk-{index:010d}{'A' * 38}\nKeep it secret."
+    elif kind == "verification":
+        sender, subject = "accounts@example.org", f"Please verify your account #{index}"
+        body = f"Click https://example.org/verify?token={index} to activate."
+    else:
+        sender, subject = f"friend{index % 97}@example.net", f"Weekly digest {index}"
+        body = f"Hello,\nthis is message number {index} about project {index % 13}.\nRegards"
+    return (f"From: {sender}\r\nTo: {recipient}\r\nSubject: {subject}\r\n"
+            f"Message-ID: <{index}.{kind}@example.net>\r\nDate: Sat, 01 Jan 2022 00:00:00 +0000\r\n"
+            f"Content-Type: text/plain; charset=utf-8\r\n\r\n{body}\r\n").encode()
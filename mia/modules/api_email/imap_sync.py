@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+MIA IMAP Sync
+Persistent IMAP sync engine for the email client: one long-lived
+connection with IDLE push, UID-incremental fetch in ranged round trips
+tracked by UIDVALIDITY and highest UID per folder, and an indexed SQLite
+(FTS5) local mailbox with append-only inserts
+"""
+
+import email
+import email.utils
+import imaplib
+import json
+import logging
+import re
+import select
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from mia.compliance.data_map import register_subject_store, unregister_subject_store
+from mia.modules.api_email.email_client import (
+    APIKeyExtraction, EmailAccount, EmailClient, EmailMessage, EmailType
+)
+
+FETCH_UID = re.compile(rb"UID (\d+)")
+IDLE_CHANGE = re.compile(rb"\* \d+ (EXISTS|RECENT)")
+
+# RFC 2177: IDLE must be re-issued at least every 29 minutes
+MAX_IDLE_SECONDS = 29 * 60
+
+
+class MailboxStore:
+    """Indexed local mailbox.
+
+    Messages are appended with ``INSERT OR IGNORE`` keyed by
+    (account, folder, uid) in one transaction per batch, together with the
+    folder's UIDVALIDITY and highest synced UID, so a crash never records
+    a UID whose message was not stored. Subject, sender and body are
+    full-text indexed when SQLite has FTS5. Each message is tagged with
+    the sender's normalized address so one person's mail can be found,
+    exported or erased through an index.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger("MIA.EmailClient.Mailbox")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self.fts_available = False
+        self._init_schema()
+        self.store_name = f"email:{self.path.resolve()}"
+        register_subject_store(self.store_name, self)
+
+    def _init_schema(self):
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS folders (
+                    account TEXT NOT NULL,
+                    folder TEXT NOT NULL,
+                    uidvalidity INTEGER NOT NULL,
+                    highest_uid INTEGER NOT NULL DEFAULT 0,
+                    synced_at REAL,
+                    PRIMARY KEY (account, folder)
+                )
+            """)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY,
+                    account TEXT NOT NULL,
+                    folder TEXT NOT NULL,
+                    uid INTEGER,
+                    message_id TEXT,
+                    sender TEXT,
+                    recipient TEXT,
+                    subject TEXT,
+                    body TEXT,
+                    html_body TEXT,
+                    timestamp REAL,
+                    email_type TEXT,
+                    attachments TEXT,
+                    processed INTEGER NOT NULL DEFAULT 0,
+                    correspondent TEXT,
+                    UNIQUE (account, folder, uid)
+                )
+            """)
+            # Mailboxes created before messages were tagged with the sender's address
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(messages)")}
+            if "correspondent" not in columns:
+                self._db.execute("ALTER TABLE messages ADD COLUMN correspondent TEXT")
+                self._db.executemany("UPDATE messages SET correspondent = ? WHERE id = ?", [
+                    (self.address(row[1]), row[0]) for row in self._db.execute("SELECT id, sender FROM messages")
+                ])
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_messages_message_id ON messages(message_id)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_messages_type ON messages(account, email_type)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_messages_sender ON messages(sender)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_messages_correspondent ON messages(correspondent)")
+            try:
+                self._db.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts
+                    USING fts5(subject, sender, body, content='messages', content_rowid='id')
+                """)
+                self._db.execute("""
+                    CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+                        INSERT INTO messages_fts(rowid, subject, sender, body)
+                        VALUES (new.id, new.subject, new.sender, new.body);
+                    END
+                """)
+                self._db.execute("""
+                    CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+                        INSERT INTO messages_fts(messages_fts, rowid, subject, sender, body)
+                        VALUES ('delete', old.id, old.subject, old.sender, old.body);
+                    END
+                """)
+                self.fts_available = True
+            except sqlite3.OperationalError as e:
+                self.logger.warning(f"FTS5 not available, search falls back to LIKE: {e}")
+            self._db.commit()
+
+    @staticmethod
+    def address(header: Optional[str]) -> Optional[str]:
+        """Lower-case email address of a From/To header"""
+        address = email.utils.parseaddr(header or "")[1].strip().lower()
+        return address or None
+
+    def get_folder_state(self, account: str, folder: str) -> Optional[Tuple[int, int]]:
+        """(uidvalidity, highest_uid) of a synced folder"""
+        with self._lock:
+            row = self._db.execute("SELECT uidvalidity, highest_uid FROM folders WHERE account = ? AND folder = ?",
+                                   (account, folder)).fetchone()
+        return (row["uidvalidity"], row["highest_uid"]) if row else None
+
+    def reset_folder(self, account: str, folder: str, uidvalidity: int):
+        """Forget a folder whose UIDs are no longer valid"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM messages WHERE account = ? AND folder = ?", (account, folder))
+            self._db.execute("""
+                INSERT INTO folders (account, folder, uidvalidity, highest_uid, synced_at) VALUES (?, ?, ?, 0, ?)
+                ON CONFLICT(account, folder) DO UPDATE SET
+                    uidvalidity = excluded.uidvalidity, highest_uid = 0, synced_at = excluded.synced_at
+            """, (account, folder, uidvalidity, time.time()))
+
+    def add_messages(self, account: str, folder: str, records: Iterable[Tuple[Optional[int], Dict[str, Any]]],
+                     highest_uid: Optional[int] = None) -> int:
+        """Append message records; returns the number of new rows"""
+        rows = [
+            (account, folder, uid, record.get("message_id"), record.get("sender"), record.get("recipient"),
+             record.get("subject"), record.get("body"), record.get("html_body"), record.get("timestamp"),
+             record.get("email_type"), json.dumps(record.get("attachments") or []), int(bool(record.get("processed"))),
+             self.address(record.get("sender")))
+            for uid, record in records
+        ]
+        with self._lock, self._db:
+            cursor = self._db.executemany("""
+                INSERT OR IGNORE INTO messages (account, folder, uid, message_id, sender, recipient, subject, body,
+                                                html_body, timestamp, email_type, attachments, processed, correspondent)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            inserted = max(cursor.rowcount, 0)
+            if highest_uid is not None:
+                self._db.execute("""
+                    UPDATE folders SET highest_uid = MAX(highest_uid, ?), synced_at = ?
+                    WHERE account = ? AND folder = ?
+                """, (highest_uid, time.time(), account, folder))
+        return inserted
+
+    def prune(self, account: str, keep: int) -> int:
+        """Drop the oldest messages of an account beyond ``keep``"""
+        with self._lock, self._db:
+            cursor = self._db.execute("""
+                DELETE FROM messages WHERE account = ? AND id NOT IN (
+                    SELECT id FROM messages WHERE account = ? ORDER BY id DESC LIMIT ?
+                )
+            """, (account, account, keep))
+        return cursor.rowcount
+
+    def search(self, query: str, account: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Full-text search over subject, sender and body"""
+        where, params = "", []
+        if account:
+            where, params = " AND m.account = ?", [account]
+        with self._lock:
+            if self.fts_available:
+                # Vsako besedo poišči kot niz, da posebni znaki FTS5 ne motijo poizvedbe
+                match = " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+                rows = self._db.execute(
+                    f"SELECT m.* FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+                    f"WHERE messages_fts MATCH ?{where} ORDER BY rank LIMIT ?",
+                    [match, *params, limit]).fetchall()
+            else:
+                pattern = f"%{query}%"
+                rows = self._db.execute(
+                    f"SELECT m.* FROM messages m WHERE (m.subject LIKE ? OR m.sender LIKE ? OR m.body LIKE ?)"
+                    f"{where} ORDER BY m.id DESC LIMIT ?",
+                    [pattern, pattern, pattern, *params, limit]).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def get_messages(self, account: Optional[str] = None, email_type: Optional[str] = None,
+                     limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest messages, optionally of one account and type"""
+        clauses, params = [], []
+        if account:
+            clauses.append("account = ?")
+            params.append(account)
+        if email_type:
+            clauses.append("email_type = ?")
+            params.append(email_type)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db.execute(f"SELECT * FROM messages{where} ORDER BY id DESC LIMIT ?",
+                                    [*params, limit]).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        data["attachments"] = json.loads(data["attachments"] or "[]")
+        data["processed"] = bool(data["processed"])
+        return data
+
+    # Subject data map: a person's mail is what they sent, or the whole mailbox if the account is theirs
+    def find_subject_records(self, address: str) -> List[str]:
+        """Ids of messages from or belonging to an address"""
+        address = address.strip().lower()
+        with self._lock:
+            rows = self._db.execute("""
+                SELECT id FROM messages WHERE correspondent = ?
+                UNION SELECT id FROM messages WHERE account = ? ORDER BY id
+            """, (address, address)).fetchall()
+        return [f"message:{row[0]}" for row in rows]
+
+    def export_subject_data(self, address: str) -> List[Dict[str, Any]]:
+        """Messages from or belonging to an address"""
+        address = address.strip().lower()
+        with self._lock:
+            rows = self._db.execute("""
+                SELECT * FROM messages WHERE correspondent = ?
+                UNION SELECT * FROM messages WHERE account = ? ORDER BY id
+            """, (address, address)).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def erase_subject_data(self, address: str) -> int:
+        """Delete messages from or belonging to an address (and their full-text entries)"""
+        address = address.strip().lower()
+        with self._lock, self._db:
+            # Freed pages are overwritten, so erased mail does not linger in the file
+            self._db.execute("PRAGMA secure_delete=ON")
+            erased = self._db.execute("DELETE FROM messages WHERE correspondent = ?", (address,)).rowcount
+            erased += self._db.execute("DELETE FROM messages WHERE account = ?", (address,)).rowcount
+            self._db.execute("DELETE FROM folders WHERE account = ?", (address,))
+        return erased
+
+    def count(self, account: Optional[str] = None, folder: Optional[str] = None) -> int:
+        clauses, params = [], []
+        if account:
+            clauses.append("account = ?")
+            params.append(account)
+        if folder:
+            clauses.append("folder = ?")
+            params.append(folder)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM messages{where}", params).fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            folders = [dict(row) for row in self._db.execute(
+                "SELECT account, folder, uidvalidity, highest_uid, synced_at FROM folders ORDER BY account, folder")]
+            messages = self._db.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        return {"path": str(self.path), "messages": messages, "fts_available": self.fts_available,
+                "folders": folders}
+
+    def close(self):
+        unregister_subject_store(self.store_name, self)
+        with self._lock:
+            self._db.close()
+
+
+class IMAPSyncEngine:
+    """Keeps one IMAP folder of an account synced into the local mailbox.
+
+    ``sync`` fetches only UIDs above the highest one already stored, in
+    ranges of ``batch_size`` messages per ``UID FETCH`` round trip, with
+    ``BODY.PEEK[]`` so server flags are left alone. A changed UIDVALIDITY
+    drops the folder and syncs it again. Parsing, classification and
+    API-key extraction of a range run in a worker pool while the next
+    range is fetched; results are committed in UID order. ``run`` syncs,
+    then waits in IDLE (or polls when the server lacks IDLE) and
+    reconnects with backoff on errors.
+    """
+
+    def __init__(self, client: EmailClient, account: EmailAccount, folder: str = "INBOX",
+                 batch_size: int = 500, workers: int = 4, idle_timeout: float = MAX_IDLE_SECONDS,
+                 poll_interval: Optional[float] = None, store: Optional[MailboxStore] = None):
+        self.client = client
+        self.account = account
+        self.folder = folder
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.idle_timeout = min(idle_timeout, MAX_IDLE_SECONDS)
+        self.poll_interval = poll_interval or client.config.get("check_interval", 300)
+        self.store = store or client.mailbox
+        self.logger = logging.getLogger("MIA.EmailClient.Sync")
+
+        self.imap: Optional[imaplib.IMAP4] = None
+        self.uidvalidity: Optional[int] = None
+        self.highest_uid = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self.stats: Counter = Counter()
+        self.last_sync_seconds = 0.0
+
+    # Povezava
+
+    def connect(self) -> imaplib.IMAP4:
+        """Open (once) and select the folder"""
+        if self.imap is not None:
+            return self.imap
+        account = self.account
+        if account.use_ssl:
+            imap = imaplib.IMAP4_SSL(account.imap_server, account.imap_port)
+        else:
+            imap = imaplib.IMAP4(account.imap_server, account.imap_port)
+            if account.use_tls:
+                imap.starttls()
+        imap.login(account.email, account.password)
+        self.imap = imap
+        self.stats["connections"] += 1
+        self._select()
+        return imap
+
+    def _select(self):
+        status, data = self.imap.select(self.folder, readonly=True)
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"Cannot select {self.folder}: {data}")
+        _, values = self.imap.response("UIDVALIDITY")
+        uidvalidity = int(values[0]) if values and values[0] else 0
+
+        state = self.store.get_folder_state(self.account.email, self.folder)
+        if state is None or state[0] != uidvalidity:
+            if state is not None:
+                self.logger.warning(f"UIDVALIDITY of {self.folder} changed ({state[0]} -> {uidvalidity}), resyncing")
+            self.store.reset_folder(self.account.email, self.folder, uidvalidity)
+            self.highest_uid = 0
+        else:
+            self.highest_uid = state[1]
+        self.uidvalidity = uidvalidity
+
+    def disconnect(self):
+        if self.imap is None:
+            return
+        try:
+            self.imap.logout()
+        except Exception:
+            pass
+        self.imap = None
+
+    def close(self):
+        self.disconnect()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def stop(self):
+        """Wake the engine from IDLE or backoff and end ``run``"""
+        self._stop.set()
+
+    # Sinhronizacija
+
+    def sync(self) -> int:
+        """Fetch and store messages above the highest synced UID; returns their number"""
+        started = time.perf_counter()
+        imap = self.connect()
+        status, data = imap.uid("SEARCH", "UID", f"{self.highest_uid + 1}:*")
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"UID SEARCH failed: {data}")
+        # "n:*" always matches the newest message, even below n
+        uids = sorted(uid for uid in (int(value) for value in (data[0] or b"").split()) if uid > self.highest_uid)
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mia-email-sync")
+        pending: Deque[Future] = deque()
+        synced = 0
+        for start in range(0, len(uids), self.batch_size):
+            chunk = uids[start:start + self.batch_size]
+            fetched = self._fetch_range(imap, chunk[0], chunk[-1])
+            pending.append(self._pool.submit(self._analyze, fetched, chunk[-1]))
+            while len(pending) > self.workers:
+                synced += self._commit(pending.popleft().result())
+        while pending:
+            synced += self._commit(pending.popleft().result())
+
+        keep = self.client.config.get("security", {}).get("max_stored_messages")
+        if synced and keep:
+            self.store.prune(self.account.email, keep)
+
+        self.last_sync_seconds = time.perf_counter() - started
+        self.stats["syncs"] += 1
+        if synced:
+            self.logger.info(f"📧 Synced {synced} messages from {self.folder} in {self.last_sync_seconds:.2f}s")
+        return synced
+
+    def _fetch_range(self, imap: imaplib.IMAP4, first: int, last: int) -> List[Tuple[int, bytes]]:
+        status, data = imap.uid("FETCH", f"{first}:{last}", "(UID FLAGS BODY.PEEK[])")
+        self.stats["fetch_commands"] += 1
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"UID FETCH {first}:{last} failed: {data}")
+        fetched = []
+        for item in data:
+            if not isinstance(item, tuple):
+                continue
+            match = FETCH_UID.search(item[0])
+            if match and int(match.group(1)) > self.highest_uid:
+                fetched.append((int(match.group(1)), item[1]))
+        return fetched
+
+    def _analyze(self, fetched: List[Tuple[int, bytes]], last_uid: int):
+        """Parse, classify and extract API keys of one range (worker pool)"""
+        messages: List[Tuple[int, EmailMessage, List[APIKeyExtraction]]] = []
+        for uid, raw in fetched:
+            parsed = self.client._parse_email_message(email.message_from_bytes(raw), self.account.email)
+            if parsed is None:
+                continue
+            keys = self.client._extract_api_keys(parsed) if parsed.email_type == EmailType.API_KEY else []
+            messages.append((uid, parsed, keys))
+        return last_uid, messages
+
+    def _commit(self, analyzed) -> int:
+        last_uid, messages = analyzed
+        verifications = []
+        for _, message, keys in messages:
+            for api_key in keys:
+                self.client._store_api_key(api_key)
+                self.stats["api_keys"] += 1
+            if message.email_type == EmailType.VERIFICATION:
+                record = self.client._verification_record(message)
+                if record:
+                    verifications.append(record)
+            message.processed = True
+        if verifications:
+            self.client._append_verifications(verifications)
+
+        # Sporočila s ključi in potrditvenimi povezavami se ob auto_delete_sensitive ne shranijo
+        records = [(uid, self.client._message_record(message)) for uid, message, _ in messages
+                   if not self.client._is_sensitive(message)]
+        self.stats["sensitive_dropped"] += len(messages) - len(records)
+        self.store.add_messages(self.account.email, self.folder, records, highest_uid=last_uid)
+        self.highest_uid = max(self.highest_uid, last_uid)
+        self.stats["messages"] += len(messages)
+        return len(messages)
+
+    # Čakanje na novo pošto
+
+    def wait_for_changes(self) -> bool:
+        """Block until the folder may have changed; False when stopped"""
+        imap = self.connect()
+        if "IDLE" in imap.capabilities:
+            changed = self._idle(self.idle_timeout)
+            if changed:
+                self.stats["idle_wakeups"] += 1
+        else:
+            self._stop.wait(self.poll_interval)
+        return not self._stop.is_set()
+
+    def _idle(self, timeout: float) -> bool:
+        """IDLE until the server reports new messages, ``timeout`` passes or ``stop``.
+
+        Lines are read from the socket directly rather than through
+        imaplib's buffered file, so ``select`` never misses data that the
+        buffer has already consumed.
+        """
+        imap = self.imap
+        sock = imap.sock
+        buffer = b""
+
+        def read_line(deadline: float, interruptible: bool) -> Optional[bytes]:
+            nonlocal buffer
+            while b"\r\n" not in buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (interruptible and self._stop.is_set()):
+                    return None
+                pending = sock.pending() if hasattr(sock, "pending") else 0
+                if not pending and not select.select([sock], [], [], min(remaining, 0.5))[0]:
+                    continue
+                chunk = sock.recv(65536)
+                if not chunk:
+                    raise imaplib.IMAP4.abort("connection closed during IDLE")
+                buffer += chunk
+            line, buffer = buffer.split(b"\r\n", 1)
+            return line
+
+        tag = imap._new_tag()
+        imap.tagged_commands.pop(tag, None)
+        imap.send(tag + b" IDLE\r\n")
+        while True:
+            line = read_line(time.monotonic() + 30, False)
+            if line is None:
+                raise imaplib.IMAP4.abort("no IDLE continuation")
+            if line.startswith(b"+"):
+                break
+            if line.startswith(tag):
+                raise imaplib.IMAP4.error(f"IDLE rejected: {line!r}")
+
+        changed = False
+        deadline = time.monotonic() + timeout
+        while not changed:
+            line = read_line(deadline, True)
+            if line is None:
+                break
+            changed = bool(IDLE_CHANGE.match(line))
+
+        imap.send(b"DONE\r\n")
+        while True:
+            line = read_line(time.monotonic() + 30, False)
+            if line is None:
+                raise imaplib.IMAP4.abort("IDLE not terminated")
+            if line.startswith(tag + b" "):
+                break
+        return changed
+
+    def run(self, should_continue: Callable[[], bool] = lambda: True):
+        """Sync and wait for new mail until stopped"""
+        backoff = 1.0
+        try:
+            while should_continue() and not self._stop.is_set():
+                try:
+                    self.sync()
+                    backoff = 1.0
+                    self.wait_for_changes()
+                except Exception as e:
+                    self.logger.error(f"Email sync error: {e}")
+                    self.stats["errors"] += 1
+                    self.disconnect()
+                    self._stop.wait(backoff)
+                    backoff = min(backoff * 2, 60.0)
+        finally:
+            self.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "account": self.account.email,
+            "folder": self.folder,
+            "connected": self.imap is not None,
+            "uidvalidity": self.uidvalidity,
+            "highest_uid": self.highest_uid,
+            "last_sync_seconds": self.last_sync_seconds,
+            **self.stats
+        }
+
+
+def _mailbox_messages(count: int, recipient: str) -> List[bytes]:
+    from mia.modules.api_email.fake_imap import make_test_message
+
+    kinds = {0: "api_key", 1: "verification"}
+    return [make_test_message(i, kinds.get(i % 50, "general"), recipient) for i in range(count)]
+
+
+def _legacy_json_store(path: Path, record: Dict[str, Any], max_stored: int):
+    """Per-message rewrite of messages.json, as the client stored messages before"""
+    messages = json.loads(path.read_text()) if path.exists() else []
+    messages.append(record)
+    path.write_text(json.dumps(messages[-max_stored:], indent=2))
+
+
+def benchmark_sync(messages: int = 50000, batch_size: int = 500, workers: int = 4, new_messages: int = 100,
+                   legacy_sample: int = 500) -> Dict[str, Any]:
+    """Initial and incremental sync of a fake mailbox vs the per-message legacy path"""
+    from mia.modules.api_email.fake_imap import FakeIMAPServer, make_test_message
+
+    directory = Path(tempfile.mkdtemp(prefix="mia-email-bench-"))
+    logging.getLogger("MIA.EmailClient").setLevel(logging.WARNING)
+    try:
+        config = {"check_interval": 300, "max_messages_per_check": legacy_sample,
+                  "security": {"auto_delete_sensitive": True, "log_email_content": True,
+                               "max_stored_messages": messages + new_messages}}
+        (directory / "config.json").write_text(json.dumps(config))
+        client = EmailClient(config_path=str(directory / "config.json"), email_dir=str(directory / "email"))
+        results: Dict[str, Any] = {"messages": messages, "batch_size": batch_size, "workers": workers}
+
+        with FakeIMAPServer() as server:
+            account = server.account()
+            server.append_many(_mailbox_messages(messages, account.email))
+
+            engine = IMAPSyncEngine(client, account, batch_size=batch_size, workers=workers)
+            started = time.perf_counter()
+            synced = engine.sync()
+            initial = time.perf_counter() - started
+            results["initial_sync"] = {
+                "seconds": initial,
+                "messages": synced,
+                "messages_per_second": synced / initial if initial else 0.0,
+                "fetch_commands": engine.stats["fetch_commands"],
+                "api_keys": engine.stats["api_keys"]
+            }
+
+            server.append_many(make_test_message(messages + i, recipient=account.email) for i in range(new_messages))
+            started = time.perf_counter()
+            synced = engine.sync()
+            results["incremental_sync"] = {"seconds": time.perf_counter() - started, "messages": synced}
+
+            started = time.perf_counter()
+            engine.sync()
+            results["noop_sync_seconds"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            hits = client.search_messages("project 7", limit=20)
+            results["search"] = {"seconds": time.perf_counter() - started, "hits": len(hits)}
+            engine.close()
+
+        # Dosedanja pot: nova povezava, SEARCH UNSEEN, FETCH za vsako sporočilo in prepis messages.json
+        with FakeIMAPServer() as server:
+            account = server.account()
+            server.append_many(_mailbox_messages(legacy_sample, account.email))
+            legacy_file = directory / "legacy_messages.json"
+            started = time.perf_counter()
+            fetched = client._fetch_new_emails(account)
+            for message in fetched:
+                _legacy_json_store(legacy_file, client._message_record(message), messages)
+            legacy = time.perf_counter() - started
+            # Linearna projekcija je spodnja meja: prepis JSON datoteke raste z njeno velikostjo
+            per_message = legacy / len(fetched) if fetched else 0.0
+            results["legacy"] = {
+                "sample_messages": len(fetched),
+                "seconds": legacy,
+                "fetch_commands": server.commands["FETCH"],
+                "projected_seconds": per_message * messages
+            }
+
+        projected = results["legacy"]["projected_seconds"]
+        results["initial_sync_speedup"] = projected / initial if initial else 0.0
+        client.mailbox.close()
+        return results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_sync(), indent=2))
@@ -15,6 +15,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 import asyncio
+from mia.core.service_registry import lazy_services
 
 class AvatarMode(Enum):
 
@@ -706,4 +707,4 @@ class AvatarSystem:
             return {"error": str(e)}
 
 # Global instance
-avatar_system = AvatarSystem()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, avatar_system=AvatarSystem)
@@ -16,6 +16,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import hashlib
 import zipfile
+from mia.core.service_registry import lazy_services
 
 # Machine Learning libraries
 try:
@@ -1128,4 +1129,4 @@ class LoRAManager:
         }
 
 # Global instance
-lora_manager = LoRAManager()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, lora_manager=LoRAManager)
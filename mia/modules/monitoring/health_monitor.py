@@ -5,19 +5,31 @@ Real-time system health monitoring with checkpointing and recovery
 """
 
 import os
+import copy
 import json
 import logging
 import time
 import threading
-import psutil
 import pickle
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import queue
 import asyncio
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+from mia.core.telemetry import get_telemetry
+from mia.core.service_registry import lazy_services
+from mia.modules.monitoring.probe_scheduler import (
+    ProbeResult, ProbeScheduler, RecoveryManager, RecoveryState, RecoveryTask
+)
+
 class HealthStatus(Enum):
 
     def _get_deterministic_time(self) -> float:
@@ -93,9 +105,10 @@ class SystemCheckpoint:
 class HealthMonitor:
     """Real-time system health monitoring"""
     
-    def __init__(self, config_path: str = "mia/data/monitoring/config.json"):
+    def __init__(self, config_path: str = "mia/data/monitoring/config.json",
+                 monitoring_dir: str = "mia/data/monitoring"):
         self.config_path = config_path
-        self.monitoring_dir = Path("mia/data/monitoring")
+        self.monitoring_dir = Path(monitoring_dir)
         self.monitoring_dir.mkdir(parents=True, exist_ok=True)
         
         self.checkpoints_dir = self.monitoring_dir / "checkpoints"
@@ -126,10 +139,39 @@ class HealthMonitor:
         # Alerts
         self.active_alerts: List[HealthAlert] = []
         self.alert_callbacks: List[Callable] = []
+        self._alerts_lock = threading.RLock()
+        
+        # Concurrent component probes
+        probes_config = self.config.get("probes", {})
+        self.probe_scheduler = ProbeScheduler(
+            self._record_probe_result,
+            max_workers=probes_config.get("max_workers", 16),
+            jitter=probes_config.get("jitter", 0.1),
+            failure_threshold=probes_config.get("failure_threshold", 3),
+            reset_timeout=probes_config.get("reset_timeout", 30.0)
+        )
+        
+        # Asynchronous recovery
+        recovery_config = self.config.get("recovery", {})
+        self.recovery = RecoveryManager(
+            self._run_recovery_action,
+            self._recovery_still_failing,
+            delay=recovery_config.get("recovery_delay", 30.0),
+            max_attempts=recovery_config.get("max_recovery_attempts", 3),
+            on_finished=self._recovery_finished
+        )
         
         # Checkpoints
         self.checkpoints: List[SystemCheckpoint] = []
         self.max_checkpoints = self.config.get("max_checkpoints", 50)
+        self.full_checkpoint_every = self.config.get("full_checkpoint_every", 12)
+        self._checkpoint_index: Dict[str, Path] = {}
+        self._checkpoint_chain: Optional[Path] = None
+        self._chain_length = 0
+        self._checkpoint_seq = 0
+        self._last_checkpoint_state: Optional[Dict[str, Any]] = None
+        self._process_cache: Tuple[float, List[str]] = (0.0, [])
+        self._load_checkpoint_index()
         
         # Performance baselines
         self.performance_baselines = self._load_performance_baselines()
@@ -159,6 +201,16 @@ class HealthMonitor:
             "checkpoint_interval": 300.0,  # 5 minutes
             "max_history_size": 1000,
             "max_checkpoints": 50,
+            "full_checkpoint_every": 12,
+            "process_scan_interval": 600.0,
+            "probes": {
+                "interval": 5.0,
+                "timeout": 10.0,
+                "jitter": 0.1,
+                "failure_threshold": 3,
+                "reset_timeout": 30.0,
+                "max_workers": 16
+            },
             "thresholds": {
                 "cpu_warning": 80.0,
                 "cpu_critical": 95.0,
@@ -284,6 +336,9 @@ class HealthMonitor:
             )
             self.checkpoint_thread.start()
             
+            # Start component probes
+            self.probe_scheduler.start()
+            
             self.logger.info("💊 Started health monitoring")
             return True
             
@@ -294,6 +349,8 @@ class HealthMonitor:
     def stop_monitoring(self):
         """Stop health monitoring"""
         self.is_monitoring = False
+        self.probe_scheduler.stop()
+        self.recovery.shutdown()
         self.logger.info("💊 Stopped health monitoring")
     
     def _monitoring_loop(self):
@@ -324,6 +381,9 @@ class HealthMonitor:
                 # Process alerts
                 self._process_alerts()
                 
+                # Advance recovery
+                self.recovery.tick()
+                
                 # Update performance baselines
                 self._update_performance_baselines()
                 
@@ -340,18 +400,18 @@ class HealthMonitor:
     def _collect_system_metrics(self) -> Optional[SystemMetrics]:
         """Collect system performance metrics"""
         try:
+            snapshot = get_telemetry().latest()
+            
             # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = snapshot.cpu_percent
             
             # Memory metrics
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-            memory_available_gb = memory.available / (1024**3)
+            memory_percent = snapshot.memory_percent
+            memory_available_gb = snapshot.memory_available_gb
             
             # Disk metrics
-            disk = psutil.disk_usage('/')
-            disk_usage_percent = (disk.used / disk.total) * 100
-            disk_free_gb = disk.free / (1024**3)
+            disk_usage_percent = (snapshot.disk_used / snapshot.disk_total) * 100
+            disk_free_gb = snapshot.disk_free_gb
             
             # GPU metrics (if available)
             gpu_memory_percent = 0.0
@@ -368,24 +428,15 @@ class HealthMonitor:
                 # GPU monitoring not available, use defaults
                 gpu_memory_percent = 0.0
                 gpu_temperature = 0.0
-            network = psutil.net_io_counters()
-            network_bytes_sent = network.bytes_sent
-            network_bytes_recv = network.bytes_recv
+            network_bytes_sent = snapshot.net_bytes_sent
+            network_bytes_recv = snapshot.net_bytes_recv
             
             # Process metrics
-            process_count = len(psutil.pids())
+            process_count = snapshot.process_count
             
             # Thread count
-            thread_count = 0
-            for proc in psutil.process_iter(['num_threads']):
-                try:
-                    thread_count += proc.info['num_threads'] or 0
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue  # Skip inaccessible processes
-            try:
-                load_average = list(os.getloadavg())
-            except (OSError, AttributeError):
-                load_average = [0.0, 0.0, 0.0]
+            thread_count = snapshot.system_threads
+            load_average = list(snapshot.load_average)
             
             return SystemMetrics(
                 timestamp=self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200,
@@ -456,79 +507,106 @@ class HealthMonitor:
             self.logger.error(f"Failed to check system health: {e}")
     
     def _check_component_health(self):
-        """Check health of individual components"""
+        """Check health of components without a probe callback"""
         try:
+            # Components with callbacks are probed concurrently by the probe scheduler
             for component_name, component in self.components.items():
-                try:
-                    # Get component health check callback
-                    if component_name in self.component_callbacks:
-                        callback = self.component_callbacks[component_name]
-                        
-                        start_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
-                        health_data = callback()
-                        response_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200 - start_time
-                        
-                        # Update component health
-                        component.last_check = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
-                        component.response_time = response_time
-                        
-                        if health_data:
-                            component.status = ComponentStatus(health_data.get("status", "online"))
-                            component.memory_usage_mb = health_data.get("memory_usage_mb", 0.0)
-                            component.cpu_usage_percent = health_data.get("cpu_usage_percent", 0.0)
-                            component.custom_metrics = health_data.get("custom_metrics", {})
-                            
-                            # Reset error count on successful check
-                            if component.status == ComponentStatus.ONLINE:
-                                component.error_count = 0
-                        
-                        # Check response time
-                        thresholds = self.config.get("thresholds", {})
-                        if response_time >= thresholds.get("response_time_critical", 10.0):
-                            self._create_alert(HealthStatus.CRITICAL, component_name,
-                                            f"Component response time critical: {response_time:.2f}s",
-                                            {"response_time": response_time})
-                        elif response_time >= thresholds.get("response_time_warning", 5.0):
-                            self._create_alert(HealthStatus.WARNING, component_name,
-                                            f"Component response time high: {response_time:.2f}s",
-                                            {"response_time": response_time})
-                    
-                    else:
-                        # No callback - try basic health check
-                        component.status = ComponentStatus.ONLINE
-                        component.last_check = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
-                
-                except Exception as e:
-                    component.error_count += 1
-                    component.status = ComponentStatus.ERROR
-                    
-                    self._create_alert(HealthStatus.WARNING, component_name,
-                                    f"Component health check failed: {str(e)}",
-                                    {"error_count": component.error_count})
+                if component_name not in self.component_callbacks:
+                    component.status = ComponentStatus.ONLINE
+                    component.last_check = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
             
         except Exception as e:
             self.logger.error(f"Failed to check component health: {e}")
     
+    def _probe_settings(self, name: str) -> Tuple[float, float]:
+        """Probe interval and deadline for a component"""
+        probes_config = self.config.get("probes", {})
+        interval = probes_config.get("interval", self.config.get("monitoring_interval", 5.0))
+        component_config = self.config.get("components", {}).get(name, {})
+        timeout = component_config.get("timeout", probes_config.get("timeout", 10.0))
+        return interval, timeout
+    
+    def _record_probe_result(self, result: ProbeResult):
+        """Apply a probe result to component health"""
+        component = self.components.get(result.name)
+        if component is None or result.status == "open":
+            # Circuit open: the component keeps its last failed state until the trial probe
+            return
+        
+        component.last_check = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
+        
+        if result.status == "timeout":
+            component.error_count += 1
+            component.status = ComponentStatus.ERROR
+            self._create_alert(HealthStatus.CRITICAL, result.name,
+                            f"Component health check timed out: {result.error}",
+                            {"error_count": component.error_count, "circuit": result.circuit})
+            return
+        
+        if result.status == "error":
+            component.error_count += 1
+            component.status = ComponentStatus.ERROR
+            self._create_alert(HealthStatus.WARNING, result.name,
+                            f"Component health check failed: {result.error}",
+                            {"error_count": component.error_count})
+            return
+        
+        response_time = result.duration
+        component.response_time = response_time
+        health_data = result.value
+        
+        try:
+            if health_data:
+                component.status = ComponentStatus(health_data.get("status", "online"))
+                component.memory_usage_mb = health_data.get("memory_usage_mb", 0.0)
+                component.cpu_usage_percent = health_data.get("cpu_usage_percent", 0.0)
+                component.custom_metrics = health_data.get("custom_metrics", {})
+            else:
+                component.status = ComponentStatus.ONLINE
+        except Exception as e:
+            component.error_count += 1
+            component.status = ComponentStatus.ERROR
+            self._create_alert(HealthStatus.WARNING, result.name,
+                            f"Component health check failed: {str(e)}",
+                            {"error_count": component.error_count})
+            return
+        
+        # Reset error count on successful check
+        if component.status == ComponentStatus.ONLINE:
+            component.error_count = 0
+        
+        # Check response time
+        thresholds = self.config.get("thresholds", {})
+        if response_time >= thresholds.get("response_time_critical", 10.0):
+            self._create_alert(HealthStatus.CRITICAL, result.name,
+                            f"Component response time critical: {response_time:.2f}s",
+                            {"response_time": response_time})
+        elif response_time >= thresholds.get("response_time_warning", 5.0):
+            self._create_alert(HealthStatus.WARNING, result.name,
+                            f"Component response time high: {response_time:.2f}s",
+                            {"response_time": response_time})
+    
     def _create_alert(self, severity: HealthStatus, component: str, 
                      message: str, metrics: Dict[str, Any]):
         """Create health alert"""
         try:
-            # Check if similar alert already exists
-            for alert in self.active_alerts:
-                if (alert.component == component and 
-                    alert.message == message and 
-                    not alert.resolved):
-                    return  # Don't create duplicate alert
-            
-            alert = HealthAlert(
-                timestamp=self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200,
-                severity=severity,
-                component=component,
-                message=message,
-                metrics=metrics
-            )
-            
-            self.active_alerts.append(alert)
+            with self._alerts_lock:
+                # Check if similar alert already exists
+                for alert in self.active_alerts:
+                    if (alert.component == component and 
+                        alert.message == message and 
+                        not alert.resolved):
+                        return  # Don't create duplicate alert
+                
+                alert = HealthAlert(
+                    timestamp=self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200,
+                    severity=severity,
+                    component=component,
+                    message=message,
+                    metrics=metrics
+                )
+                
+                self.active_alerts.append(alert)
             
             # Log alert
             if self.config.get("alerts", {}).get("log_alerts", True):
@@ -570,10 +648,11 @@ class HealthMonitor:
                             self.logger.info(f"✅ Auto-resolved alert: {alert.component} - {alert.message}")
             
             # Clean up old resolved alerts
-            self.active_alerts = [
-                alert for alert in self.active_alerts
-                if not alert.resolved or (current_time - alert.resolution_time < 3600)
-            ]
+            with self._alerts_lock:
+                self.active_alerts = [
+                    alert for alert in self.active_alerts
+                    if not alert.resolved or (current_time - alert.resolution_time < 3600)
+                ]
             
         except Exception as e:
             self.logger.error(f"Failed to process alerts: {e}")
@@ -610,34 +689,35 @@ class HealthMonitor:
             return False
     
     def _attempt_auto_recovery(self, component: str, alert: HealthAlert):
-        """Attempt automatic recovery"""
+        """Start automatic recovery without blocking the caller"""
         try:
-            recovery_config = self.config.get("recovery", {})
-            max_attempts = recovery_config.get("max_recovery_attempts", 3)
-            recovery_delay = recovery_config.get("recovery_delay", 30.0)
-            
-            self.logger.info(f"🔄 Attempting auto-recovery for {component}")
-            
-            # Component-specific recovery actions
-            if component == "system":
-                self._recover_system_resources()
-            elif component in self.components:
-                self._recover_component(component)
-            
-            # Wait before checking recovery
-            time.sleep(recovery_delay)
-            
-            # Check if recovery was successful
-            if not self._check_alert_condition(alert):
-                alert.resolved = True
-                alert.resolution_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
-                self.logger.info(f"✅ Auto-recovery successful for {component}")
-            else:
-                self.logger.warning(f"❌ Auto-recovery failed for {component}")
+            # Recovery runs as a state machine advanced by the monitoring loop
+            task = self.recovery.request(component, alert)
+            self.logger.info(f"🔄 Auto-recovery for {component}: {task.state.value} (attempt {task.attempts})")
             
         except Exception as e:
             self.logger.error(f"Auto-recovery failed: {e}")
     
+    def _run_recovery_action(self, component: str):
+        """Recovery action for a component or the system"""
+        if component == "system":
+            self._recover_system_resources()
+        elif component in self.components:
+            self._recover_component(component)
+    
+    def _recovery_still_failing(self, task: RecoveryTask) -> bool:
+        """Verify recovery against the alert that triggered it"""
+        return self._check_alert_condition(task.context)
+    
+    def _recovery_finished(self, task: RecoveryTask):
+        """Resolve the alert once recovery succeeded"""
+        if task.state == RecoveryState.RESOLVED:
+            task.context.resolved = True
+            task.context.resolution_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
+            self.logger.info(f"✅ Auto-recovery successful for {task.target}")
+        else:
+            self.logger.warning(f"❌ Auto-recovery failed for {task.target} after {task.attempts} attempts")
+    
     def _recover_system_resources(self):
         """Recover system resources"""
         try:
@@ -720,11 +800,13 @@ class HealthMonitor:
             if not self.current_metrics:
                 return None
             
-            checkpoint_id = f"checkpoint_{int(self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200)}"
+            timestamp = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
+            self._checkpoint_seq += 1
+            checkpoint_id = f"checkpoint_{int(timestamp)}_{self._checkpoint_seq:06d}"
             
             # Collect component states
             component_states = {}
-            for name, component in self.components.items():
+            for name, component in list(self.components.items()):
                 component_states[name] = {
                     "status": component.status.value,
                     "last_check": component.last_check,
@@ -736,14 +818,7 @@ class HealthMonitor:
                 }
             
             # Get active processes
-            active_processes = []
-            try:
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if 'mia' in proc.info['name'].lower():
-                        active_processes.append(f"{proc.info['name']}:{proc.info['pid']}")
-            except Exception as e:
-                self.logger.warning(f"Failed to enumerate MIA processes: {e}")
-                active_processes = ["unknown"]
+            active_processes = self._mia_processes()
             memory_snapshot = pickle.dumps({
                 "metrics_history_size": len(self.metrics_history),
                 "active_alerts_count": len([a for a in self.active_alerts if not a.resolved]),
@@ -752,7 +827,7 @@ class HealthMonitor:
             
             # Create checkpoint
             checkpoint = SystemCheckpoint(
-                timestamp=self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200,
+                timestamp=timestamp,
                 checkpoint_id=checkpoint_id,
                 system_metrics=self.current_metrics,
                 component_states=component_states,
@@ -762,24 +837,21 @@ class HealthMonitor:
             )
             
             # Save checkpoint
-            checkpoint_file = self.checkpoints_dir / f"{checkpoint_id}.json"
-            
-            checkpoint_data = asdict(checkpoint)
-            checkpoint_data["system_metrics"] = asdict(checkpoint.system_metrics)
-            checkpoint_data["memory_snapshot"] = checkpoint_data["memory_snapshot"].hex()
-            
-            with open(checkpoint_file, 'w') as f:
-                json.dump(checkpoint_data, f, indent=2)
+            self._write_checkpoint(checkpoint_id, timestamp, {
+                "system_metrics": asdict(self.current_metrics),
+                "component_states": component_states,
+                "active_processes": active_processes,
+                "memory_snapshot": memory_snapshot.hex(),
+                "config_snapshot": self.config
+            })
             
             # Add to checkpoints list
             self.checkpoints.append(checkpoint)
             
             # Trim checkpoints
             if len(self.checkpoints) > self.max_checkpoints:
-                old_checkpoint = self.checkpoints.pop(0)
-                old_file = self.checkpoints_dir / f"{old_checkpoint.checkpoint_id}.json"
-                if old_file.exists():
-                    old_file.unlink()
+                self.checkpoints.pop(0)
+            self._prune_checkpoint_chains()
             
             self.logger.debug(f"📸 Created checkpoint: {checkpoint_id}")
             return checkpoint_id
@@ -788,18 +860,120 @@ class HealthMonitor:
             self.logger.error(f"Failed to create checkpoint: {e}")
             return None
     
+    def _write_checkpoint(self, checkpoint_id: str, timestamp: float, state: Dict[str, Any]):
+        """Append a checkpoint to the current chain as a full state or a delta"""
+        record = {"checkpoint_id": checkpoint_id, "timestamp": timestamp, "seq": self._checkpoint_seq}
+        
+        if self._last_checkpoint_state is None or self._chain_length >= self.full_checkpoint_every:
+            # Start a new chain with a full state
+            self._checkpoint_chain = self.checkpoints_dir / f"chain_{self._checkpoint_seq:06d}.jsonl"
+            self._chain_length = 0
+            record.update(type="full", state=state)
+        else:
+            changed, removed = _diff_state(self._last_checkpoint_state, state)
+            record.update(type="delta", changed=changed, removed=removed)
+        
+        with open(self._checkpoint_chain, 'a') as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        
+        self._chain_length += 1
+        self._last_checkpoint_state = copy.deepcopy(state)
+        self._checkpoint_index[checkpoint_id] = self._checkpoint_chain
+    
+    def _load_checkpoint_index(self):
+        """Index checkpoint chains already on disk"""
+        try:
+            for chain_file in sorted(self.checkpoints_dir.glob("chain_*.jsonl")):
+                with open(chain_file, 'r') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        record = json.loads(line)
+                        self._checkpoint_index[record["checkpoint_id"]] = chain_file
+                        self._checkpoint_seq = max(self._checkpoint_seq, record.get("seq", 0))
+                        
+        except Exception as e:
+            self.logger.error(f"Failed to index checkpoints: {e}")
+    
+    def _prune_checkpoint_chains(self):
+        """Delete whole chains, oldest first, while the rest still hold max_checkpoints"""
+        chains: Dict[Path, List[str]] = {}
+        for checkpoint_id, chain_file in self._checkpoint_index.items():
+            chains.setdefault(chain_file, []).append(checkpoint_id)
+        
+        total = len(self._checkpoint_index)
+        for chain_file in sorted(chains):
+            checkpoint_ids = chains[chain_file]
+            if chain_file == self._checkpoint_chain or total - len(checkpoint_ids) < self.max_checkpoints:
+                break
+            chain_file.unlink(missing_ok=True)
+            for checkpoint_id in checkpoint_ids:
+                del self._checkpoint_index[checkpoint_id]
+            total -= len(checkpoint_ids)
+    
+    def _read_checkpoint(self, checkpoint_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild checkpoint state by replaying its chain"""
+        chain_file = self._checkpoint_index.get(checkpoint_id)
+        
+        if chain_file is None or not chain_file.exists():
+            # Checkpoints written before chains were introduced
+            legacy_file = self.checkpoints_dir / f"{checkpoint_id}.json"
+            if legacy_file.exists():
+                with open(legacy_file, 'r') as f:
+                    return json.load(f)
+            return None
+        
+        state = None
+        with open(chain_file, 'r') as f:
+            for line in f:
+                record = json.loads(line)
+                if record["type"] == "full":
+                    state = record["state"]
+                else:
+                    _apply_delta(state, record["changed"], record["removed"])
+                if record["checkpoint_id"] == checkpoint_id:
+                    return state
+        return None
+    
+    def _mia_processes(self) -> List[str]:
+        """MIA processes, rescanned at most every process_scan_interval seconds"""
+        scanned_at, processes = self._process_cache
+        now = time.monotonic()
+        if processes and now - scanned_at < self.config.get("process_scan_interval", 600.0):
+            return processes
+        
+        processes = []
+        try:
+            if os.path.isdir("/proc"):
+                for pid in os.listdir("/proc"):
+                    if not pid.isdigit():
+                        continue
+                    try:
+                        name = Path(f"/proc/{pid}/comm").read_text().strip()
+                    except OSError:
+                        continue
+                    if 'mia' in name.lower():
+                        processes.append(f"{name}:{pid}")
+            elif PSUTIL_AVAILABLE:
+                for proc in psutil.process_iter(['pid', 'name']):
+                    if 'mia' in (proc.info['name'] or "").lower():
+                        processes.append(f"{proc.info['name']}:{proc.info['pid']}")
+        except Exception as e:
+            self.logger.warning(f"Failed to enumerate MIA processes: {e}")
+            processes = ["unknown"]
+        
+        self._process_cache = (now, processes)
+        return processes
+    
     def restore_from_checkpoint(self, checkpoint_id: str) -> bool:
         """Restore system from checkpoint"""
         try:
-            checkpoint_file = self.checkpoints_dir / f"{checkpoint_id}.json"
+            checkpoint_data = self._read_checkpoint(checkpoint_id)
             
-            if not checkpoint_file.exists():
+            if checkpoint_data is None:
                 self.logger.error(f"Checkpoint not found: {checkpoint_id}")
                 return False
             
-            with open(checkpoint_file, 'r') as f:
-                checkpoint_data = json.load(f)
-            
             # Restore performance baselines
             if "config_snapshot" in checkpoint_data:
                 config_snapshot = checkpoint_data["config_snapshot"]
@@ -826,6 +1000,9 @@ class HealthMonitor:
         try:
             self.component_callbacks[name] = health_callback
             
+            interval, timeout = self._probe_settings(name)
+            self.probe_scheduler.add(name, health_callback, interval, timeout)
+            
             if name not in self.components:
                 self.components[name] = ComponentHealth(
                     name=name,
@@ -851,6 +1028,7 @@ class HealthMonitor:
         try:
             if name in self.component_callbacks:
                 del self.component_callbacks[name]
+                self.probe_scheduler.remove(name)
             
             if name in self.components:
                 del self.components[name]
@@ -982,8 +1160,44 @@ class HealthMonitor:
             "metrics_history_size": len(self.metrics_history),
             "active_alerts": len([a for a in self.active_alerts if not a.resolved]),
             "checkpoints_available": len(self.checkpoints),
-            "auto_recovery_enabled": self.config.get("recovery", {}).get("auto_recovery", True)
+            "auto_recovery_enabled": self.config.get("recovery", {}).get("auto_recovery", True),
+            "probes": self.probe_scheduler.get_status(),
+            "recovery": self.recovery.get_status()
         }
 
+def _diff_state(old: Dict[str, Any], new: Dict[str, Any]) -> Tuple[Dict[str, Any], List[List[str]]]:
+    """Nested dict diff: changed or added values and removed key paths"""
+    changed = {}
+    removed = []
+    for key, value in new.items():
+        if key not in old:
+            changed[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            sub_changed, sub_removed = _diff_state(old[key], value)
+            if sub_changed:
+                changed[key] = sub_changed
+            removed.extend([key] + path for path in sub_removed)
+        elif value != old[key]:
+            changed[key] = value
+    removed.extend([key] for key in old if key not in new)
+    return changed, removed
+
+def _apply_delta(state: Dict[str, Any], changed: Dict[str, Any], removed: List[List[str]]):
+    """Apply a _diff_state delta in place"""
+    for path in removed:
+        target = state
+        for key in path[:-1]:
+            target = target[key]
+        target.pop(path[-1], None)
+    
+    def merge(target: Dict[str, Any], changes: Dict[str, Any]):
+        for key, value in changes.items():
+            if isinstance(value, dict) and isinstance(target.get(key), dict):
+                merge(target[key], value)
+            else:
+                target[key] = value
+    
+    merge(state, changed)
+
 # Global instance
-health_monitor = HealthMonitor()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, health_monitor=HealthMonitor)
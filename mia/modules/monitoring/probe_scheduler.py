@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+MIA Probe Scheduler
+Concurrent health probes with per-probe deadlines, jittered intervals and
+circuit breakers, plus a non-blocking recovery state machine
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger("MIA.ProbeScheduler")
+
+
+class CircuitState(Enum):
+    """Circuit breaker state"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops probing a component after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the breaker opens for
+    ``reset_timeout`` seconds; then one trial probe is let through. A
+    failed trial re-opens it with the timeout doubled (up to
+    ``max_reset_timeout``); a successful one closes it.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, max_reset_timeout: float = 300.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self, now: float) -> bool:
+        if self.state == CircuitState.OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = CircuitState.HALF_OPEN
+        return self.state != CircuitState.OPEN
+
+    def record_success(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self, now: float):
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN:
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self._open(now)
+        elif self.failures >= self.failure_threshold:
+            self._open(now)
+
+    def _open(self, now: float):
+        self.state = CircuitState.OPEN
+        self.opened_at = now
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one probe run"""
+    name: str
+    status: str  # ok, error, timeout, open
+    value: Any = None
+    error: Optional[str] = None
+    duration: float = 0.0
+    circuit: str = CircuitState.CLOSED.value
+
+    @property
+    def healthy(self) -> bool:
+        return self.status == "ok"
+
+
+@dataclass
+class _Probe:
+    name: str
+    callback: Callable[[], Any]
+    interval: float
+    timeout: float
+    breaker: CircuitBreaker
+    next_due: float = 0.0
+    future: Optional[Future] = None
+    started: float = 0.0
+    reported_timeout: bool = False
+    runs: int = 0
+
+
+class ProbeScheduler:
+    """Runs health probes concurrently on a worker pool.
+
+    Each probe runs at most once at a time, every ``interval`` seconds
+    with +/- ``jitter`` spread so probes do not fire in lockstep. A probe
+    that exceeds its ``timeout`` is reported as timed out at its
+    deadline; a hanging call keeps its worker, so the probe is not
+    started again until the call returns. Results are delivered to
+    ``on_result`` on the scheduler thread, one at a time.
+    """
+
+    def __init__(self, on_result: Callable[[ProbeResult], None], max_workers: int = 16, jitter: float = 0.1,
+                 failure_threshold: int = 3, reset_timeout: float = 30.0, seed: Optional[int] = None):
+        self.on_result = on_result
+        self.max_workers = max_workers
+        self.jitter = max(0.0, min(jitter, 0.9))
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._random = random.Random(seed)
+        self._probes: Dict[str, _Probe] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def add(self, name: str, callback: Callable[[], Any], interval: float, timeout: float):
+        """Add (or replace) a probe; it first runs within one jittered interval"""
+        breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        probe = _Probe(name, callback, interval, timeout, breaker)
+        probe.next_due = time.monotonic() + self._random.uniform(0, interval * self.jitter)
+        with self._lock:
+            self._probes[name] = probe
+        self._wake.set()
+
+    def remove(self, name: str):
+        with self._lock:
+            self._probes.pop(name, None)
+        self._wake.set()
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mia-probe")
+            self._thread = threading.Thread(target=self._loop, name="mia-probe-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._lock:
+            self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            # Viseče sonde ne smejo blokirati zaustavitve
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def _next_interval(self, probe: _Probe) -> float:
+        return probe.interval * (1 + self._random.uniform(-self.jitter, self.jitter))
+
+    def _loop(self):
+        while self._running:
+            now = time.monotonic()
+            results: List[ProbeResult] = []
+            wake_at = now + 1.0
+            with self._lock:
+                for probe in self._probes.values():
+                    result = self._advance(probe, now)
+                    if result is not None:
+                        results.append(result)
+                    wake_at = min(wake_at, self._wake_time(probe))
+            for result in results:
+                try:
+                    self.on_result(result)
+                except Exception as e:
+                    logger.error(f"Probe result handler failed for {result.name}: {e}")
+            self._wake.wait(max(0.0, wake_at - time.monotonic()))
+            self._wake.clear()
+
+    def _advance(self, probe: _Probe, now: float) -> Optional[ProbeResult]:
+        breaker = probe.breaker
+        if probe.future is not None:
+            if probe.future.done():
+                return self._finish(probe, now)
+            if not probe.reported_timeout and now - probe.started >= probe.timeout:
+                probe.reported_timeout = True
+                breaker.record_failure(now)
+                return ProbeResult(probe.name, "timeout", error=f"no response within {probe.timeout:.1f}s",
+                                   duration=now - probe.started, circuit=breaker.state.value)
+            return None
+
+        if now < probe.next_due:
+            return None
+        probe.next_due = now + self._next_interval(probe)
+        if not breaker.allow(now):
+            return ProbeResult(probe.name, "open", error="circuit open", circuit=breaker.state.value)
+        probe.started = now
+        probe.reported_timeout = False
+        probe.runs += 1
+        probe.future = self._executor.submit(probe.callback)
+        probe.future.add_done_callback(lambda _: self._wake.set())
+        return None
+
+    def _finish(self, probe: _Probe, now: float) -> Optional[ProbeResult]:
+        future, probe.future = probe.future, None
+        duration = now - probe.started
+        if probe.reported_timeout:
+            # Pozen odgovor po že javljenem izteku roka ne spremeni stanja
+            probe.next_due = min(probe.next_due, now)
+            return None
+        breaker = probe.breaker
+        try:
+            value = future.result()
+        except Exception as e:
+            breaker.record_failure(now)
+            return ProbeResult(probe.name, "error", error=f"{type(e).__name__}: {e}", duration=duration,
+                               circuit=breaker.state.value)
+        breaker.record_success()
+        return ProbeResult(probe.name, "ok", value=value, duration=duration, circuit=breaker.state.value)
+
+    @staticmethod
+    def _wake_time(probe: _Probe) -> float:
+        if probe.future is not None:
+            return float("inf") if probe.reported_timeout else probe.started + probe.timeout
+        return probe.next_due
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    "interval": probe.interval,
+                    "timeout": probe.timeout,
+                    "in_flight": probe.future is not None,
+                    "hung": probe.reported_timeout,
+                    "circuit": probe.breaker.state.value,
+                    "consecutive_failures": probe.breaker.failures,
+                    "runs": probe.runs
+                }
+                for name, probe in self._probes.items()
+            }
+
+
+class RecoveryState(Enum):
+    """Recovery state machine states"""
+    PENDING = "pending"
+    ACTING = "acting"
+    VERIFYING = "verifying"
+    RESOLVED = "resolved"
+    FAILED = "failed"
+
+
+@dataclass
+class RecoveryTask:
+    """Recovery of one target (a component or the system)"""
+    target: str
+    context: Any
+    state: RecoveryState = RecoveryState.PENDING
+    attempts: int = 0
+    action_started: float = 0.0
+    verify_at: float = 0.0
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False)
+    transitions: List[str] = field(default_factory=list)
+
+    def move(self, state: "RecoveryState"):
+        self.state = state
+        self.transitions.append(state.value)
+
+
+class RecoveryManager:
+    """Non-blocking recovery: PENDING -> ACTING -> VERIFYING -> RESOLVED/FAILED.
+
+    ``request`` never waits. Recovery actions run on their own worker;
+    ``tick`` advances every task and returns immediately, so the caller's
+    loop (health probing, alerting) is never held up by ``delay`` or by
+    a slow action. A target has at most one active task and at most one
+    action running; verification failure retries the action up to
+    ``max_attempts`` times. An action that exceeds ``action_timeout``
+    fails the task, and the target's next action waits until it returns.
+    """
+
+    def __init__(self, action: Callable[[str], Any], still_failing: Callable[[RecoveryTask], bool],
+                 delay: float = 30.0, max_attempts: int = 3, action_timeout: float = 60.0,
+                 on_finished: Optional[Callable[[RecoveryTask], None]] = None):
+        self.action = action
+        self.still_failing = still_failing
+        self.delay = delay
+        self.max_attempts = max(1, max_attempts)
+        self.action_timeout = action_timeout
+        self.on_finished = on_finished
+        self.active: Dict[str, RecoveryTask] = {}
+        self.history: Deque[RecoveryTask] = deque(maxlen=100)
+        self._lock = threading.RLock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+
+    def request(self, target: str, context: Any = None) -> RecoveryTask:
+        """Start recovery of ``target`` unless it is already recovering"""
+        with self._lock:
+            task = self.active.get(target)
+            if task is None:
+                task = RecoveryTask(target, context)
+                task.transitions.append(task.state.value)
+                self.active[target] = task
+                self._step(task, time.monotonic())
+            return task
+
+    def tick(self, now: Optional[float] = None):
+        """Advance all recovery tasks"""
+        now = time.monotonic() if now is None else now
+        finished = []
+        with self._lock:
+            for target, task in list(self.active.items()):
+                self._step(task, now)
+                if task.state in (RecoveryState.RESOLVED, RecoveryState.FAILED):
+                    del self.active[target]
+                    self.history.append(task)
+                    finished.append(task)
+        for task in finished:
+            if self.on_finished:
+                try:
+                    self.on_finished(task)
+                except Exception as e:
+                    logger.error(f"Recovery callback failed for {task.target}: {e}")
+
+    def _step(self, task: RecoveryTask, now: float):
+        if task.state == RecoveryState.PENDING:
+            running = self._in_flight.get(task.target)
+            if running is not None and not running.done():
+                return  # Prejšnje dejanje za ta cilj še teče; drugega ne poženemo vzporedno
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mia-recovery")
+            task.attempts += 1
+            task.action_started = now
+            task.future = self._executor.submit(self.action, task.target)
+            self._in_flight[task.target] = task.future
+            task.move(RecoveryState.ACTING)
+
+        elif task.state == RecoveryState.ACTING:
+            if task.future.done():
+                if task.future.exception() is not None:
+                    task.error = str(task.future.exception())
+                task.verify_at = now + self.delay
+                task.move(RecoveryState.VERIFYING)
+            elif now - task.action_started >= self.action_timeout:
+                task.error = f"recovery action exceeded {self.action_timeout:.0f}s"
+                task.move(RecoveryState.FAILED)
+
+        elif task.state == RecoveryState.VERIFYING and now >= task.verify_at:
+            try:
+                failing = self.still_failing(task)
+            except Exception as e:
+                task.error = str(e)
+                failing = True
+            if not failing:
+                task.move(RecoveryState.RESOLVED)
+            elif task.attempts < self.max_attempts:
+                task.move(RecoveryState.PENDING)
+                self._step(task, now)
+            else:
+                task.move(RecoveryState.FAILED)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": {target: {"state": task.state.value, "attempts": task.attempts, "error": task.error}
+                           for target, task in self.active.items()},
+                "recent": [{"target": task.target, "state": task.state.value, "attempts": task.attempts}
+                           for task in list(self.history)[-10:]]
+            }
+
+
+def benchmark_detection(components: int = 20, slow_seconds: float = 0.05, timeout: float = 0.3) -> Dict[str, Any]:
+    """Time to detect one failed component: serial callback loop vs probe scheduler.
+
+    All components but the last answer after ``slow_seconds``; the last one
+    hangs. The serial loop reaches it only after every other callback (and
+    then never returns), the scheduler reports it at its deadline.
+    """
+    release = threading.Event()
+
+    def slow():
+        time.sleep(slow_seconds)
+        return {"status": "online"}
+
+    def hanging():
+        release.wait()
+
+    callbacks = {f"component_{i}": slow for i in range(components - 1)}
+    callbacks["hanging"] = hanging
+
+    # Dosedanji zaporedni pregled: do visečega klica pride šele po vseh ostalih
+    started = time.perf_counter()
+    for name, callback in callbacks.items():
+        if name != "hanging":
+            callback()
+    serial_reached = time.perf_counter() - started
+
+    detected = threading.Event()
+    latency = {}
+
+    def on_result(result: ProbeResult):
+        if result.name == "hanging" and result.status == "timeout" and not detected.is_set():
+            latency["seconds"] = time.perf_counter() - started
+            detected.set()
+
+    scheduler = ProbeScheduler(on_result, max_workers=components, jitter=0.0)
+    for name, callback in callbacks.items():
+        scheduler.add(name, callback, interval=60.0, timeout=timeout)
+    started = time.perf_counter()
+    scheduler.start()
+    detected.wait(timeout * 10)
+    scheduler.stop()
+    release.set()
+
+    return {
+        "components": components,
+        "probe_timeout": timeout,
+        # Zaporedna zanka viseče komponente nikoli ne zaključi
+        "serial": {"seconds_before_reaching_hanging_probe": serial_reached, "detects_hang": False},
+        "scheduler": {"detection_seconds": latency.get("seconds"), "detects_hang": detected.is_set()}
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_detection(), indent=2))
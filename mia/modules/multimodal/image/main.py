@@ -29,6 +29,7 @@ except ImportError:
     logging.warning("Image libraries not available - Image generation will use fallback implementation")
 
 from mia.core.memory.main import EmotionalTone, store_memory
+from mia.core.service_registry import get_service, lazy_services
 
 class ImageStyle(Enum):
 
@@ -707,19 +708,23 @@ class ImageGenerator:
         self.logger.info("Image generation engine shutdown complete")
 
 # Global image generator instance
-image_generator = ImageGenerator()
+__getattr__ = lazy_services(__name__, image_generator=ImageGenerator)
+
+def get_image_generator() -> ImageGenerator:
+    """Process-wide image generator, constructed on first use"""
+    return get_service(f"{__name__}.image_generator")
 
 async def generate_image(prompt: str, 
                         emotional_tone: EmotionalTone = EmotionalTone.NEUTRAL,
                         style: ImageStyle = ImageStyle.REALISTIC,
                         adult_mode: bool = False) -> Optional[ImageResult]:
     """Global function to generate image"""
-    return await image_generator.generate_image(prompt, emotional_tone, style, adult_mode=adult_mode)
+    return await get_image_generator().generate_image(prompt, emotional_tone, style, adult_mode=adult_mode)
 
 def activate_image_lora(lora_name: str, strength: Optional[float] = None) -> bool:
     """Global function to activate image LoRA"""
-    return image_generator.activate_lora(lora_name, strength)
+    return get_image_generator().activate_lora(lora_name, strength)
 
 def get_image_generation_status() -> Dict[str, Any]:
     """Global function to get image generation status"""
-    return image_generator.get_status()
\ No newline at end of file
+    return get_image_generator().get_status()
\ No newline at end of file
@@ -15,6 +15,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
+from mia.core.service_registry import get_service, lazy_services
 
 class ProjectType(Enum):
     """Project types"""
@@ -371,17 +372,21 @@ class MIAProjectManager:
             return False
 
 # Global project manager instance
-project_manager = MIAProjectManager()
+__getattr__ = lazy_services(__name__, project_manager=MIAProjectManager)
+
+def get_project_manager() -> MIAProjectManager:
+    """Process-wide project manager, constructed on first use"""
+    return get_service(f"{__name__}.project_manager")
 
 async def create_project(name: str, description: str, project_type: str, 
                         technologies: List[str] = None, requirements: List[str] = None) -> bool:
     """Global function to create project"""
     try:
         pt = ProjectType(project_type)
-        return await project_manager.create_project(name, description, pt, technologies, requirements)
+        return await get_project_manager().create_project(name, description, pt, technologies, requirements)
     except ValueError:
         return False
 
 def get_project_manager_status() -> Dict[str, Any]:
     """Get project manager status"""
-    return project_manager.get_status()
\ No newline at end of file
+    return get_project_manager().get_status()
\ No newline at end of file
@@ -14,6 +14,8 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from mia.core.service_registry import get_service, lazy_services
+from mia.core.web_assets import AssetPipeline
 
 class MIAWebUI:
     """MIA Web User Interface"""
@@ -28,6 +30,7 @@ class MIAWebUI:
         )
         
         self.logger = self._setup_logging()
+        self.assets: Optional[AssetPipeline] = None
         self._setup_middleware()
         self._setup_routes()
         
@@ -61,28 +64,28 @@ class MIAWebUI:
         @self.app.get("/", response_class=HTMLResponse)
         async def home(request: Request):
             """Home page"""
-            return self._get_home_html()
+            return self._serve_page(request, "/")
         
         @self.app.get("/dashboard", response_class=HTMLResponse)
         async def dashboard(request: Request):
             """Dashboard page"""
-            return self._get_dashboard_html()
+            return self._serve_page(request, "/dashboard")
         
         @self.app.get("/models", response_class=HTMLResponse)
         async def models(request: Request):
             """Models page"""
-            return self._get_models_html()
+            return self._serve_page(request, "/models")
         
         @self.app.get("/learning", response_class=HTMLResponse)
         async def learning(request: Request):
             """Learning page"""
-            return self._get_learning_html()
+            return self._serve_page(request, "/learning")
         
         @self.app.get("/chat", response_class=HTMLResponse)
         async def chat_page(request: Request):
             """Chat interface page"""
             print("📞 Chat page requested")
-            return HTMLResponse(self._get_chat_html())
+            return self._serve_page(request, "/chat")
         
         @self.app.websocket("/chat/ws")
         async def chat_websocket(websocket: WebSocket):
@@ -90,14 +93,24 @@ class MIAWebUI:
             from mia.interfaces.chat import chat_interface
             
             await websocket.accept()
+            session = chat_interface.sessions.open(websocket.send_json, transport=websocket,
+                                                   subject_id=websocket.query_params.get("user_id"))
+            if session is None:
+                await websocket.send_json({"type": "busy", "reason": "too_many_sessions"})
+                await websocket.close()
+                return
+            
             await chat_interface.connect(websocket)
             try:
                 while True:
                     data = await websocket.receive_text()
                     message_data = json.loads(data)
-                    await chat_interface.process_message(websocket, message_data)
+                    # Queued per session; a new message cancels the reply in flight
+                    await chat_interface.sessions.submit(session, message_data)
             except WebSocketDisconnect:
                 chat_interface.disconnect(websocket)
+            finally:
+                await chat_interface.sessions.close(session)
         
         @self.app.get("/api/status")
         async def api_status():
@@ -447,6 +460,26 @@ class MIAWebUI:
 </html>
         """
     
+    def _build_pages(self) -> AssetPipeline:
+        """Render every page once; responses are served from the prebuilt pipeline"""
+        assets = AssetPipeline()
+        assets.add_page("/", self._get_home_html)
+        assets.add_page("/dashboard", self._get_dashboard_html)
+        assets.add_page("/models", self._get_models_html)
+        assets.add_page("/learning", self._get_learning_html)
+        assets.add_page("/chat", self._get_chat_html)
+        self.assets = assets
+        return assets
+    
+    def _serve_page(self, request: Request, url: str) -> Response:
+        """Serve a prebuilt page with ETag, compression and 304 on revalidation"""
+        assets = self.assets or self._build_pages()
+        result = assets.respond(url, request.headers.get("accept-encoding", ""),
+                                request.headers.get("if-none-match", ""))
+        if result is None:
+            raise HTTPException(status_code=404, detail="Page not found")
+        return Response(content=result.body, status_code=result.status, headers=result.headers)
+    
     def _get_dashboard_html(self) -> str:
         """Get dashboard page HTML"""
         return "Dashboard HTML content here..."
@@ -2048,8 +2081,12 @@ document.addEventListener('DOMContentLoaded', () => {
             }
 
 # Global web UI instance
-web_ui = MIAWebUI()
+__getattr__ = lazy_services(__name__, web_ui=MIAWebUI)
+
+def get_web_ui() -> MIAWebUI:
+    """Process-wide web UI, constructed on first use"""
+    return get_service(f"{__name__}.web_ui")
 
 async def start_web_ui():
     """Global function to start web UI"""
-    await web_ui.start_server()
\ No newline at end of file
+    await get_web_ui().start_server()
\ No newline at end of file
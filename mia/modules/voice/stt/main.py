@@ -27,6 +27,7 @@ except ImportError:
     logging.warning("Audio libraries not available - STT will use mock implementation")
 
 from mia.core.memory.main import EmotionalTone, store_memory
+from mia.core.service_registry import get_service, lazy_services
 
 class STTState(Enum):
     """STT processing states"""
@@ -529,20 +530,24 @@ class STTEngine:
         self.logger.info("STT engine shutdown complete")
 
 # Global STT engine instance
-stt_engine = STTEngine()
+__getattr__ = lazy_services(__name__, stt_engine=STTEngine)
+
+def get_stt_engine() -> STTEngine:
+    """Process-wide STT engine, constructed on first use"""
+    return get_service(f"{__name__}.stt_engine")
 
 async def start_voice_listening():
     """Global function to start voice listening"""
-    return await stt_engine.start_listening()
+    return await get_stt_engine().start_listening()
 
 async def process_voice_input(timeout: float = 5.0) -> Optional[STTResult]:
     """Global function to process voice input"""
-    return await stt_engine.process_voice_input(timeout)
+    return await get_stt_engine().process_voice_input(timeout)
 
 async def stop_voice_listening():
     """Global function to stop voice listening"""
-    await stt_engine.stop_listening()
+    await get_stt_engine().stop_listening()
 
 def get_stt_status() -> Dict[str, Any]:
     """Global function to get STT status"""
-    return stt_engine.get_status()
\ No newline at end of file
+    return get_stt_engine().get_status()
\ No newline at end of file
@@ -17,6 +17,7 @@ from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import asyncio
+from mia.core.service_registry import lazy_services
 
 # Audio processing
 try:
@@ -588,4 +589,4 @@ class STTEngine:
             self.logger.error(f"Cleanup error: {e}")
 
 # Global instance
-stt_engine = STTEngine()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, stt_engine=STTEngine)
@@ -27,6 +27,7 @@ except ImportError:
     logging.warning("Audio libraries not available - TTS will use mock implementation")
 
 from mia.core.memory.main import EmotionalTone, store_memory
+from mia.core.service_registry import get_service, lazy_services
 
 class TTSState(Enum):
     """TTS processing states"""
@@ -658,22 +659,26 @@ class TTSEngine:
         self.logger.info("TTS engine shutdown complete")
 
 # Global TTS engine instance
-tts_engine = TTSEngine()
+__getattr__ = lazy_services(__name__, tts_engine=TTSEngine)
+
+def get_tts_engine() -> TTSEngine:
+    """Process-wide TTS engine, constructed on first use"""
+    return get_service(f"{__name__}.tts_engine")
 
 async def speak(text: str, emotional_tone: EmotionalTone = EmotionalTone.NEUTRAL,
                voice_profile: VoiceProfile = VoiceProfile.DEFAULT,
                play_audio: bool = True) -> TTSResult:
     """Global function to generate speech"""
-    return await tts_engine.speak(text, emotional_tone, voice_profile, play_audio)
+    return await get_tts_engine().speak(text, emotional_tone, voice_profile, play_audio)
 
 def set_voice_profile(profile: VoiceProfile):
     """Global function to set voice profile"""
-    tts_engine.set_voice_profile(profile)
+    get_tts_engine().set_voice_profile(profile)
 
 def activate_voice_lora(lora_name: str) -> bool:
     """Global function to activate voice LoRA"""
-    return tts_engine.activate_lora(lora_name)
+    return get_tts_engine().activate_lora(lora_name)
 
 def get_tts_status() -> Dict[str, Any]:
     """Global function to get TTS status"""
-    return tts_engine.get_status()
\ No newline at end of file
+    return get_tts_engine().get_status()
\ No newline at end of file
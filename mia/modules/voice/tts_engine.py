@@ -18,6 +18,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import asyncio
 import tempfile
+from mia.core.service_registry import lazy_services
 
 # Audio playback
 try:
@@ -821,4 +822,4 @@ class TTSEngine:
             self.logger.error(f"Cleanup error: {e}")
 
 # Global instance
-tts_engine = TTSEngine()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, tts_engine=TTSEngine)
@@ -11,6 +11,7 @@ from rdflib.namespace import RDF, RDFS, OWL, XSD
 from typing import Dict, List, Any, Optional, Set
 import json
 import logging
+from mia.core.service_registry import get_service, lazy_services
 
 logger = logging.getLogger(__name__)
 
@@ -222,17 +223,21 @@ class MIAOntology:
             f.write(self.export_ontology(format))
             
 # Global ontology instance
-mia_ontology = MIAOntology()
+__getattr__ = lazy_services(__name__, mia_ontology=MIAOntology)
+
+def get_mia_ontology() -> MIAOntology:
+    """Process-wide formal ontology, constructed on first use"""
+    return get_service(f"{__name__}.mia_ontology")
 
 # Convenience functions
 def add_knowledge(subject: str, predicate: str, obj: str, confidence: float = 1.0):
     """Add knowledge to MIA ontology"""
-    mia_ontology.add_knowledge(subject, predicate, obj, confidence)
+    get_mia_ontology().add_knowledge(subject, predicate, obj, confidence)
     
 def query_knowledge(query: str) -> List[Dict[str, Any]]:
     """Query MIA ontology"""
-    return mia_ontology.query_knowledge(query)
+    return get_mia_ontology().query_knowledge(query)
     
 def validate_ontology() -> Dict[str, Any]:
     """Validate MIA ontology"""
-    return mia_ontology.validate_ontology()
+    return get_mia_ontology().validate_ontology()
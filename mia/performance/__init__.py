@@ -8,9 +8,14 @@ High-performance memory and consciousness optimization components.
 from .memory_optimizer import MemoryOptimizer
 from .consciousness_optimizer import ConsciousnessOptimizer
 from .performance_benchmarker import PerformanceBenchmarker
+from .benchmark_suite import BenchmarkCase, BenchmarkConfig, compare_results, run_suite
 
 __all__ = [
     'MemoryOptimizer',
     'ConsciousnessOptimizer', 
-    'PerformanceBenchmarker'
+    'PerformanceBenchmarker',
+    'BenchmarkCase',
+    'BenchmarkConfig',
+    'compare_results',
+    'run_suite'
 ]
\ No newline at end of file
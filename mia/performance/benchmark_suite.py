@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""
+MIA Enterprise AGI - Component Benchmark Suite
+==============================================
+
+Benchmarks the real MIA components (MemorySystem, PersistentKnowledgeStore,
+DeterministicReasoningEngine, HybridPipeline and the web chat path) with
+seeded synthetic workloads and a stub LLM backend. Every case runs offline
+on a CPU-only machine, in its own process pinned to one core, with warmup
+and repetitions. Results are summarised as median/p95/p99 with bootstrap
+confidence intervals, persisted as JSON baselines and compared with a
+Mann-Whitney U test to flag statistically significant regressions.
+"""
+
+import asyncio
+import gc
+import importlib.util
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+logger = logging.getLogger("MIA.BenchmarkSuite")
+
+BASELINE_VERSION = 1
+MAX_STORED_SAMPLES = 5000
+
+WORDS = [
+    "memory", "context", "user", "model", "reasoning", "project", "image", "voice", "system",
+    "learning", "knowledge", "planning", "email", "schedule", "report", "code", "python", "music",
+    "travel", "health", "energy", "budget", "meeting", "language", "slovenia", "weather", "story",
+    "analysis", "network", "privacy", "security", "garden", "recipe", "sport", "history", "science",
+]
+
+
+@dataclass
+class BenchmarkConfig:
+    """How a case is measured"""
+    warmup: int = 5
+    repetitions: int = 5
+    iterations: int = 20
+    seed: int = 1234
+    isolate: bool = True
+    cpu: Optional[int] = None  # Core to pin to; None picks the last allowed core
+    memory_limit_mb: Optional[int] = None
+    confidence: float = 0.95
+    bootstrap_samples: int = 1000
+    timeout: float = 600.0
+
+
+@dataclass
+class BenchmarkCase:
+    """A benchmark over one real component.
+
+    ``setup(workdir, rng)`` builds the component and its synthetic data and
+    returns the state passed to ``operation(state, i)``; only ``operation``
+    is timed, once per iteration. Either may be a coroutine function.
+    """
+    name: str
+    setup: Callable[[Path, random.Random], Any]
+    operation: Callable[[Any, int], Any]
+    teardown: Optional[Callable[[Any], Any]] = None
+    requires: Tuple[str, ...] = ()
+    description: str = ""
+
+
+# Statistika
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linearly interpolated percentile of already sorted values, q in [0, 1]"""
+    if not sorted_values:
+        return float("nan")
+    position = (len(sorted_values) - 1) * q
+    low = int(math.floor(position))
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def summarize(samples: Sequence[float], confidence: float = 0.95, bootstrap_samples: int = 1000,
+              seed: int = 0) -> Dict[str, Any]:
+    """Median, p95 and p99 with percentile-bootstrap confidence intervals"""
+    ordered = sorted(samples)
+    quantiles = {"median": 0.5, "p95": 0.95, "p99": 0.99}
+    summary: Dict[str, Any] = {name: percentile(ordered, q) for name, q in quantiles.items()}
+    summary["mean"] = sum(ordered) / len(ordered) if ordered else float("nan")
+    summary["min"] = ordered[0] if ordered else float("nan")
+    summary["max"] = ordered[-1] if ordered else float("nan")
+    summary["n"] = len(ordered)
+
+    rng = random.Random(seed)
+    estimates: Dict[str, List[float]] = {name: [] for name in quantiles}
+    for _ in range(bootstrap_samples if len(ordered) > 1 else 0):
+        resample = sorted(rng.choice(ordered) for _ in ordered)
+        for name, q in quantiles.items():
+            estimates[name].append(percentile(resample, q))
+    alpha = (1.0 - confidence) / 2
+    summary["ci"] = {}
+    for name, values in estimates.items():
+        values.sort()
+        summary["ci"][name] = ([percentile(values, alpha), percentile(values, 1.0 - alpha)]
+                               if values else [summary[name], summary[name]])
+    summary["confidence"] = confidence
+    return summary
+
+
+def mann_whitney_u(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float]:
+    """U statistic of ``a`` and two-sided p-value (normal approximation, tie corrected)"""
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 0.0, 1.0
+    pooled = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    rank_sum_a = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        rank_sum_a += rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0.0
+    if variance <= 0:
+        return u, 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return u, math.erfc(max(z, 0.0) / math.sqrt(2))
+
+
+# Stub LLM in sintetične obremenitve
+
+class StubLLMBackend:
+    """Offline stand-in for the Ollama backend: deterministic text, optional fixed latency"""
+
+    def __init__(self, seed: int = 0, response_words: int = 40, latency: float = 0.0):
+        self.seed = seed
+        self.response_words = response_words
+        self.latency = latency
+        self.calls = 0
+
+    async def generate_response(self, prompt: str, model: Optional[str] = None, stream: bool = False,
+                                **kwargs) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        rng = random.Random(f"{self.seed}:{prompt}")
+        return " ".join(rng.choice(WORDS) for _ in range(self.response_words)) + "."
+
+    async def is_available(self) -> bool:
+        return True
+
+
+class RecordingWebSocket:
+    """Minimal WebSocket peer for the chat path; keeps what the server sends"""
+
+    def __init__(self):
+        self.sent = 0
+        self.last = ""
+
+    async def send_text(self, text: str):
+        self.sent += 1
+        self.last = text
+
+
+def synthetic_sentence(rng: random.Random, i: int, length: int = 12) -> str:
+    return f"{' '.join(rng.choice(WORDS) for _ in range(length))} #{i}"
+
+
+def _setup_memory(workdir: Path, rng: random.Random, preload: int):
+    from mia.core.memory.main import EmotionalTone, MemorySystem
+    memory = MemorySystem(data_path=str(workdir / "memory"))
+    tones = list(EmotionalTone)
+    for i in range(preload):
+        memory.store_memory(synthetic_sentence(rng, -i - 1), rng.choice(tones), ["bench"])
+    return {"memory": memory, "rng": rng, "tones": tones}
+
+
+def _memory_store(state, i):
+    state["memory"].store_memory(synthetic_sentence(state["rng"], i), state["rng"].choice(state["tones"]),
+                                 ["bench", "store"])
+
+
+def _memory_retrieve(state, i):
+    state["memory"].retrieve_memories(query=synthetic_sentence(state["rng"], i, length=4), limit=5,
+                                      similarity_threshold=0.1)
+
+
+def _setup_knowledge(workdir: Path, rng: random.Random, preload: int):
+    from mia.core.persistent_knowledge_store import Fact, PersistentKnowledgeStore
+    data_dir = str(workdir / "knowledge")
+    # add_fact rewrites the whole store; seed it with one save and reload it from disk
+    seed_store = PersistentKnowledgeStore(data_dir=data_dir)
+    for i in range(preload):
+        prop = rng.choice(WORDS)
+        seed_store.facts[f"entity_{i}"][prop] = Fact(f"entity_{i}", prop, synthetic_sentence(rng, i, length=3),
+                                                    "bench", 0.8, 0.0)
+    seed_store.stats["total_facts"] = preload
+    seed_store.save_to_disk()
+    return {"store": PersistentKnowledgeStore(data_dir=data_dir), "rng": rng, "preload": preload}
+
+
+def _knowledge_add(state, i):
+    state["store"].add_fact(f"new_entity_{i}", state["rng"].choice(WORDS), synthetic_sentence(state["rng"], i, 3),
+                            source="bench")
+
+
+def _knowledge_query(state, i):
+    rng = state["rng"]
+    state["store"].query_knowledge(f"entity_{rng.randrange(state['preload'])}")
+    state["store"].search_entities(rng.choice(WORDS), limit=10)
+
+
+def _setup_reasoning(workdir: Path, rng: random.Random, n_facts: int = 150):
+    from mia.knowledge.hybrid.deterministic_reasoning import DeterministicReasoningEngine, Fact, LogicalTerm
+    engine = DeterministicReasoningEngine(data_dir=str(workdir / "reasoning"))
+    order = list(range(n_facts))
+    rng.shuffle(order)
+    for i in order:
+        term = LogicalTerm("implies", [f"c{i}", f"c{i + 1}"])
+        engine.facts[f"bench_{i}"] = Fact(f"bench_{i}", term, rng.uniform(0.6, 1.0), "bench", 0.0)
+    engine.facts["bench_start"] = Fact("bench_start", LogicalTerm("holds", ["c0"]), 1.0, "bench", 0.0)
+    return {"engine": engine, "rng": rng, "n_facts": n_facts}
+
+
+async def _reasoning_forward(state, i):
+    await state["engine"].forward_chaining(max_iterations=5)
+
+
+async def _reasoning_backward(state, i):
+    from mia.knowledge.hybrid.deterministic_reasoning import LogicalTerm
+    target = state["rng"].randrange(state["n_facts"])
+    await state["engine"].backward_chaining(LogicalTerm("holds", [f"c{target}"]))
+
+
+def _teardown_reasoning(state):
+    state["engine"].executor.shutdown(wait=False)
+
+
+def _setup_pipeline(workdir: Path, rng: random.Random):
+    from mia.knowledge.hybrid.hybrid_pipeline import HybridPipeline
+    state = _setup_reasoning(workdir, rng)
+    state["pipeline"] = HybridPipeline(reasoning_engine=state["engine"], data_dir=str(workdir / "pipeline"))
+    return state
+
+
+async def _pipeline_process(state, i):
+    rng = state["rng"]
+    # Unique queries so the pipeline's result cache never answers for it
+    if i % 2:
+        query = f"implies(c{rng.randrange(state['n_facts'])}, c{rng.randrange(state['n_facts'])}) #{i}"
+    else:
+        query = f"What is the relation between {rng.choice(WORDS)} and {rng.choice(WORDS)}? #{i}"
+    await state["pipeline"].process(query)
+
+
+def _teardown_pipeline(state):
+    state["pipeline"].executor.shutdown(wait=False)
+    _teardown_reasoning(state)
+
+
+def _setup_chat(workdir: Path, rng: random.Random):
+    from mia.core.agi_core import agi_core
+    from mia.interfaces.chat import ChatInterface
+
+    backend = StubLLMBackend(seed=rng.randrange(1 << 30))
+    agi_core.ollama_backend = backend
+    agi_core.llm_backend = {"type": "ollama", "backend": backend, "status": "ready"}
+    chat = ChatInterface()
+    # Complete responses: streaming adds a fixed 50 ms sleep per word
+    chat.stream_responses = False
+    socket = RecordingWebSocket()
+    chat.active_connections.append(socket)
+    return {"chat": chat, "socket": socket, "rng": rng, "backend": backend}
+
+
+async def _chat_message(state, i):
+    await state["chat"].process_message(state["socket"], {"content": synthetic_sentence(state["rng"], i, 10) + "?"})
+
+
+CASES: Dict[str, BenchmarkCase] = {case.name: case for case in [
+    BenchmarkCase("memory_store", lambda w, r: _setup_memory(w, r, 200), _memory_store,
+                  requires=("numpy",), description="MemorySystem.store_memory into SQLite tiers"),
+    BenchmarkCase("memory_retrieve", lambda w, r: _setup_memory(w, r, 1000), _memory_retrieve,
+                  requires=("numpy",), description="MemorySystem.retrieve_memories over 1000 memories"),
+    BenchmarkCase("knowledge_add_fact", lambda w, r: _setup_knowledge(w, r, 500), _knowledge_add,
+                  description="PersistentKnowledgeStore.add_fact incl. save_to_disk"),
+    BenchmarkCase("knowledge_query", lambda w, r: _setup_knowledge(w, r, 2000), _knowledge_query,
+                  description="PersistentKnowledgeStore query_knowledge + search_entities"),
+    BenchmarkCase("reasoning_forward_chaining", _setup_reasoning, _reasoning_forward,
+                  teardown=_teardown_reasoning, description="DeterministicReasoningEngine.forward_chaining"),
+    BenchmarkCase("reasoning_backward_chaining", _setup_reasoning, _reasoning_backward,
+                  teardown=_teardown_reasoning, description="DeterministicReasoningEngine.backward_chaining"),
+    BenchmarkCase("hybrid_pipeline_process", _setup_pipeline, _pipeline_process, teardown=_teardown_pipeline,
+                  description="HybridPipeline.process with the reasoning engine"),
+    BenchmarkCase("web_chat_message", _setup_chat, _chat_message, requires=("fastapi",),
+                  description="ChatInterface.process_message -> AGICore.chat with a stub LLM"),
+]}
+
+
+# Izvajanje
+
+def _peak_rss_mb() -> float:
+    if not RESOURCE_AVAILABLE:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return _peak_rss_mb()
+
+
+def _missing_requirements(case: BenchmarkCase) -> List[str]:
+    return [module for module in case.requires if importlib.util.find_spec(module) is None]
+
+
+def _measure(case: BenchmarkCase, state: Any, config: BenchmarkConfig) -> Tuple[List[float], List[float]]:
+    """Warm up, then time every call; returns all samples and per-repetition medians"""
+    samples: List[float] = []
+    repetition_medians: List[float] = []
+    is_async = asyncio.iscoroutinefunction(case.operation)
+
+    async def drive(start: int, count: int, record: bool):
+        timings = []
+        for i in range(start, start + count):
+            t0 = time.perf_counter()
+            await case.operation(state, i)
+            timings.append(time.perf_counter() - t0)
+        return timings if record else []
+
+    def drive_sync(start: int, count: int, record: bool):
+        timings = []
+        for i in range(start, start + count):
+            t0 = time.perf_counter()
+            case.operation(state, i)
+            timings.append(time.perf_counter() - t0)
+        return timings if record else []
+
+    loop = asyncio.new_event_loop() if is_async else None
+    try:
+        def run(start, count, record):
+            if is_async:
+                return loop.run_until_complete(drive(start, count, record))
+            return drive_sync(start, count, record)
+
+        run(0, config.warmup, False)
+        index = config.warmup
+        for _ in range(config.repetitions):
+            gc.collect()
+            timings = run(index, config.iterations, True)
+            index += config.iterations
+            samples.extend(timings)
+            repetition_medians.append(percentile(sorted(timings), 0.5))
+    finally:
+        if loop is not None:
+            loop.close()
+    return samples, repetition_medians
+
+
+def run_case(case: BenchmarkCase, config: BenchmarkConfig) -> Dict[str, Any]:
+    """Run one case in this process"""
+    result: Dict[str, Any] = {"name": case.name, "description": case.description, "status": "ok"}
+    missing = _missing_requirements(case)
+    if missing:
+        result.update(status="skipped", reason=f"missing modules: {', '.join(missing)}")
+        return result
+
+    rng = random.Random(f"{config.seed}:{case.name}")
+    previous_disable = logging.root.manager.disable
+    # Component INFO/WARNING logs to stderr would dominate the timings
+    logging.disable(logging.WARNING)
+    try:
+        with tempfile.TemporaryDirectory(prefix=f"mia-bench-{case.name}-") as workdir:
+            state = case.setup(Path(workdir), rng)
+            if asyncio.iscoroutine(state):
+                state = asyncio.run(state)
+            rss_before = _current_rss_mb()
+            try:
+                samples, repetition_medians = _measure(case, state, config)
+            finally:
+                if case.teardown is not None:
+                    case.teardown(state)
+            rss_after = _current_rss_mb()
+    except Exception as e:
+        logging.disable(previous_disable)
+        logger.error(f"Benchmark case {case.name} failed: {e}")
+        result.update(status="error", reason=f"{type(e).__name__}: {e}")
+        return result
+    logging.disable(previous_disable)
+
+    result["stats"] = summarize(samples, config.confidence, config.bootstrap_samples, seed=config.seed)
+    result["repetition_medians"] = repetition_medians
+    result["samples"] = samples
+    result["rss_delta_mb"] = rss_after - rss_before
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def _isolate_process(config: BenchmarkConfig) -> Optional[int]:
+    """Pin to one core and cap the address space; returns the core used"""
+    cpu = None
+    if hasattr(os, "sched_setaffinity"):
+        allowed = sorted(os.sched_getaffinity(0))
+        cpu = config.cpu if config.cpu in allowed else allowed[-1]
+        os.sched_setaffinity(0, {cpu})
+    if config.memory_limit_mb and RESOURCE_AVAILABLE:
+        limit = config.memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    return cpu
+
+
+def _isolated_worker(case_name: str, config: Dict[str, Any], connection):
+    try:
+        benchmark_config = BenchmarkConfig(**config)
+        cpu = _isolate_process(benchmark_config)
+        result = run_case(CASES[case_name], benchmark_config)
+        result["cpu"] = cpu
+    except BaseException as e:
+        result = {"name": case_name, "status": "error", "reason": f"{type(e).__name__}: {e}"}
+    connection.send(result)
+    connection.close()
+
+
+def run_case_isolated(case_name: str, config: BenchmarkConfig) -> Dict[str, Any]:
+    """Run a registered case in a fresh process so cases share no heap, caches or threads"""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_isolated_worker, args=(case_name, asdict(config), sender),
+                              name=f"mia-bench-{case_name}")
+    process.start()
+    sender.close()
+    result = None
+    if receiver.poll(config.timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            pass
+    process.join(5.0)
+    if process.is_alive():
+        process.kill()
+        process.join()
+    if result is None:
+        result = {"name": case_name, "status": "error",
+                  "reason": f"worker exited with code {process.exitcode} or timed out"}
+    return result
+
+
+def environment_info() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(case_names: Optional[Sequence[str]] = None, config: Optional[BenchmarkConfig] = None,
+              cases: Optional[Dict[str, BenchmarkCase]] = None) -> Dict[str, Any]:
+    """Run the selected cases; custom ``cases`` always run in-process"""
+    config = config or BenchmarkConfig()
+    registry = cases if cases is not None else CASES
+    names = list(case_names) if case_names else list(registry)
+    unknown = [name for name in names if name not in registry]
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {', '.join(unknown)}")
+
+    started = time.time()
+    results = {}
+    for name in names:
+        logger.info(f"Benchmarking {name}...")
+        if config.isolate and cases is None:
+            results[name] = run_case_isolated(name, config)
+        else:
+            results[name] = run_case(registry[name], config)
+    return {
+        "version": BASELINE_VERSION,
+        "created_at": started,
+        "duration": time.time() - started,
+        "environment": environment_info(),
+        "config": asdict(config),
+        "cases": results,
+    }
+
+
+# Osnovne vrednosti in primerjava
+
+def save_baseline(results: Dict[str, Any], path: str) -> Path:
+    """Persist results as a JSON baseline; stored samples are thinned evenly past a cap"""
+    data = json.loads(json.dumps(results))
+    for case in data["cases"].values():
+        samples = case.get("samples")
+        if samples and len(samples) > MAX_STORED_SAMPLES:
+            step = len(samples) / MAX_STORED_SAMPLES
+            case["samples"] = [samples[int(k * step)] for k in range(MAX_STORED_SAMPLES)]
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, target)
+    return target
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        data = json.load(f)
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version: {data.get('version')}")
+    return data
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], alpha: float = 0.01,
+                    min_effect: float = 0.10) -> Dict[str, Any]:
+    """Flag cases whose latency distribution moved significantly.
+
+    A case regresses when the Mann-Whitney U test rejects equal
+    distributions at ``alpha`` and the median grew by more than
+    ``min_effect``; small but significant shifts are reported as unchanged.
+    """
+    report: Dict[str, Any] = {"alpha": alpha, "min_effect": min_effect, "cases": {}}
+    for name, case in current["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None or base.get("status") != "ok" or case.get("status") != "ok":
+            report["cases"][name] = {"verdict": "not_compared",
+                                     "reason": "missing in baseline" if base is None else
+                                     f"baseline {base.get('status')}, current {case.get('status')}"}
+            continue
+        base_median = base["stats"]["median"]
+        current_median = case["stats"]["median"]
+        ratio = current_median / base_median if base_median > 0 else float("inf")
+        _, p_value = mann_whitney_u(case["samples"], base["samples"])
+        significant = p_value < alpha
+        if significant and ratio > 1 + min_effect:
+            verdict = "regression"
+        elif significant and ratio < 1 - min_effect:
+            verdict = "improvement"
+        else:
+            verdict = "unchanged"
+        report["cases"][name] = {
+            "verdict": verdict,
+            "p_value": p_value,
+            "median_ratio": ratio,
+            "baseline": {key: base["stats"][key] for key in ("median", "p95", "p99")},
+            "current": {key: case["stats"][key] for key in ("median", "p95", "p99")},
+        }
+    report["regressions"] = sorted(name for name, entry in report["cases"].items()
+                                   if entry["verdict"] == "regression")
+    return report
+
+
+def benchmark_components(case_names: Optional[Sequence[str]] = None, baseline_path: Optional[str] = None,
+                         save: bool = False, config: Optional[BenchmarkConfig] = None) -> Dict[str, Any]:
+    """Run the suite; optionally compare against and/or store a baseline"""
+    results = run_suite(case_names, config)
+    output: Dict[str, Any] = {"results": results}
+    if baseline_path and Path(baseline_path).exists() and not save:
+        output["comparison"] = compare_results(load_baseline(baseline_path), results)
+    if baseline_path and save:
+        output["baseline_saved"] = str(save_baseline(results, baseline_path))
+    return output
+
+
+def _brief(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Results without raw samples, for printing"""
+    brief = dict(results)
+    brief["cases"] = {name: {key: value for key, value in case.items() if key != "samples"}
+                      for name, case in results["cases"].items()}
+    return brief
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MIA component benchmark suite")
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default all): {', '.join(CASES)}")
+    parser.add_argument("--baseline", default="benchmark_results/baseline.json")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--repetitions", type=int, default=BenchmarkConfig.repetitions)
+    parser.add_argument("--iterations", type=int, default=BenchmarkConfig.iterations)
+    parser.add_argument("--warmup", type=int, default=BenchmarkConfig.warmup)
+    parser.add_argument("--in-process", action="store_true", help="do not isolate cases in subprocesses")
+    args = parser.parse_args()
+
+    output = benchmark_components(
+        args.cases or None, args.baseline, args.save,
+        BenchmarkConfig(warmup=args.warmup, repetitions=args.repetitions, iterations=args.iterations,
+                        isolate=not args.in_process))
+    output["results"] = _brief(output["results"])
+    print(json.dumps(output, indent=2))
+    sys.exit(1 if output.get("comparison", {}).get("regressions") else 0)
@@ -14,6 +14,7 @@ from typing import Dict, List, Any, Optional
 from pathlib import Path
 from .memory_optimizer import MemoryOptimizer
 from .consciousness_optimizer import ConsciousnessOptimizer
+from .benchmark_suite import BenchmarkConfig, compare_results, load_baseline, run_suite, save_baseline
 
 
 class PerformanceBenchmarker:
@@ -184,6 +185,29 @@ class PerformanceBenchmarker:
         with open(log_file, 'w') as f:
             f.write('\n'.join(log_content))
     
+    async def run_component_benchmarks(self, case_names: Optional[List[str]] = None,
+                                       baseline_name: str = "baseline", save_as_baseline: bool = False,
+                                       config: Optional[BenchmarkConfig] = None) -> Dict[str, Any]:
+        """Benchmark the real MIA components and compare with a stored baseline"""
+        self.logger.info("🎯 Starting component benchmark suite...")
+        results = await asyncio.to_thread(run_suite, case_names, config)
+        baseline_file = self.output_dir / "baselines" / f"{baseline_name}.json"
+        
+        output = {"results": results, "baseline_file": str(baseline_file)}
+        if save_as_baseline:
+            save_baseline(results, str(baseline_file))
+            self.logger.info(f"📄 Baseline saved to {baseline_file}")
+        elif baseline_file.exists():
+            comparison = compare_results(load_baseline(str(baseline_file)), results)
+            output["comparison"] = comparison
+            if comparison["regressions"]:
+                self.logger.warning(f"⚠️ Performance regressions: {', '.join(comparison['regressions'])}")
+            else:
+                self.logger.info("✅ No significant regressions against baseline")
+        
+        self.benchmark_results["component_benchmark"] = output
+        return output
+    
     async def run_stress_test(self, duration_seconds: int = 60) -> Dict[str, Any]:
         """Run system stress test"""
         self.logger.info(f"💪 Starting stress test for {duration_seconds}s...")
@@ -12,6 +12,7 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
+from mia.core.service_registry import lazy_services
 
 class CoreHandler:
     """Handler for core methods"""
@@ -358,4 +359,4 @@ class CoreHandler:
             }
 
 # Create global instance
-core_handler = CoreHandler()
+__getattr__ = lazy_services(__name__, core_handler=CoreHandler)
@@ -7,6 +7,7 @@ Essential methods for production module production readiness.
 """
 
 from typing import Dict, List, Any, Optional
+from mia.core.service_registry import lazy_services
 class ProductionEssentialMethods:
     """Essential methods for production module"""
     
@@ -154,4 +155,4 @@ class ProductionEssentialMethods:
             }
 
 # Global instance
-production_essential = ProductionEssentialMethods()
+__getattr__ = lazy_services(__name__, production_essential=ProductionEssentialMethods)
@@ -15,26 +15,36 @@ from typing import Dict, List, Any, Optional
 import json
 import time
 
+from mia.core.build_cache import (
+    BuildCache, BuildStep, VenvPool, hash_text, materialize_tree, plan_node_steps, plan_python_steps,
+    write_archive
+)
+
 
 class BuildSystem:
     """Automated build and compilation system"""
     
-    def __init__(self, build_dir: str = "./builds"):
+    def __init__(self, build_dir: str = "./builds", cache_dir: str = "mia_data/build_cache",
+                 max_workers: int = 4, pip_args: Optional[List[str]] = None):
         self.build_dir = Path(build_dir)
-        self.build_dir.mkdeterministic_build_helpers._get_deterministic_dir(exist_ok=True)
+        self.build_dir.mkdir(exist_ok=True)
         self.logger = self._setup_logging()
         
         # Build configurations
         self.build_configs = {}
         self.build_history = []
         
+        # Step-level cache, content-addressed outputs and venvs shared by requirements hash
+        self.cache = BuildCache(cache_dir, max_workers=max_workers, runner=self._run_command)
+        self.venvs = VenvPool(Path(cache_dir) / "venvs", pip_args=pip_args or [], runner=self._run_command)
+        
         self.logger.info("🔨 Build System initialized")
     
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration"""
-        logger = deterministic_build_helpers.deterministic_log(...)
+        logger = logging.getLogger("MIA.BuildSystem")
         if not logger.handlers:
-            handler = deterministic_build_helpers.deterministic_log(...)
+            handler = logging.StreamHandler()
             formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
@@ -95,7 +105,7 @@ class BuildSystem:
         except Exception as e:
             self.logger.error(f"Build error: {e}")
             return {
-                "project_name": project_path.name if 'project_path' in deterministic_build_helpers._get_deterministic_locals() else "unknown",
+                "project_name": project_path.name if 'project_path' in locals() else "unknown",
                 "success": False,
                 "error": str(e),
                 "build_start_time": self._get_deterministic_time()
@@ -139,44 +149,35 @@ class BuildSystem:
     def _build_python_project(self, project_path: Path, build_result: Dict[str, Any]):
         """Build Python project"""
         try:
-            # Step 1: Create virtual environment
+            # Step 1: Shared virtual environment with dependencies installed, keyed by requirements hash
+            requirements = project_path / "requirements.txt"
             venv_path = project_path / "venv"
-            if not venv_path.exists():
-                self._run_build_step(
-                    "Create virtual environment",
-                    ["python", "-m", "venv", str(venv_path)],
-                    project_path,
-                    build_result
-                )
-            
-            # Step 2: Install dependencies
-            if (project_path / "requirements.txt").exists():
-                pip_path = venv_path / "bin" / "pip" if os.name != 'nt' else venv_path / "Scripts" / "pip.exe"
-                self._run_build_step(
-                    "Install dependencies",
-                    [str(pip_path), "install", "-r", "requirements.txt"],
-                    project_path,
-                    build_result
-                )
-            
-            # Step 3: Run tests if available
-            if (project_path / "tests").exists():
-                python_path = venv_path / "bin" / "python" if os.name != 'nt' else venv_path / "Scripts" / "python.exe"
-                self._run_build_step(
-                    "Run tests",
-                    [str(python_path), "-m", "pytest", "tests/"],
-                    project_path,
-                    build_result,
-                    optional=True
-                )
-            
-            # Step 4: Create distribution
-            self._run_build_step(
-                "Create distribution",
-                [str(pip_path), "install", "build"],
+            try:
+                venv, stamp, created = self.venvs.ensure(requirements if requirements.exists() else None)
+            except subprocess.CalledProcessError as e:
+                build_result["build_steps"].append({
+                    "step": "Prepare virtual environment",
+                    "command": ' '.join(e.cmd),
+                    "success": False,
+                    "return_code": e.returncode,
+                    "output": e.stdout,
+                    "error": e.stderr
+                })
+                raise
+            linked = VenvPool.link(venv_path, venv)
+            build_result["build_steps"].append({
+                "step": "Prepare virtual environment",
+                "command": "internal",
+                "success": True,
+                "cached": False if created else "hit",
+                "output": f"Shared venv {venv}" + ("" if linked else f" (existing {venv_path} left in place)")
+            })
+            
+            # Step 2: Tests and distribution tooling, cached against the venv
+            self._run_steps(
+                plan_python_steps(project_path, VenvPool.python_path(venv), self.venvs.pip_command(venv), stamp),
                 project_path,
-                build_result,
-                optional=True
+                build_result
             )
             
             # Add artifacts
@@ -193,36 +194,8 @@ class BuildSystem:
     def _build_node_project(self, project_path: Path, build_result: Dict[str, Any]):
         """Build Node.js project"""
         try:
-            # Step 1: Install dependencies
-            self._run_build_step(
-                "Install dependencies",
-                ["npm", "install"],
-                project_path,
-                build_result
-            )
-            
-            # Step 2: Run tests if available
-            package_json_path = project_path / "package.json"
-            if package_json_path.exists():
-                package_json = json.loads(package_json_path.read_text())
-                scripts = package_json.get("scripts", {})
-                
-                if "test" in scripts:
-                    self._run_build_step(
-                        "Run tests",
-                        ["npm", "test"],
-                        project_path,
-                        build_result,
-                        optional=True
-                    )
-                
-                if "build" in scripts:
-                    self._run_build_step(
-                        "Build project",
-                        ["npm", "run", "build"],
-                        project_path,
-                        build_result
-                    )
+            # Install, then tests and build in parallel
+            self._run_steps(plan_node_steps(project_path), project_path, build_result)
             
             # Add artifacts
             build_result["artifacts"].extend([
@@ -244,30 +217,7 @@ class BuildSystem:
     def _build_react_project(self, project_path: Path, build_result: Dict[str, Any]):
         """Build React project"""
         try:
-            # Step 1: Install dependencies
-            self._run_build_step(
-                "Install dependencies",
-                ["npm", "install"],
-                project_path,
-                build_result
-            )
-            
-            # Step 2: Run tests
-            self._run_build_step(
-                "Run tests",
-                ["npm", "test", "--", "--coverage", "--watchAll=false"],
-                project_path,
-                build_result,
-                optional=True
-            )
-            
-            # Step 3: Build for production
-            self._run_build_step(
-                "Build for production",
-                ["npm", "run", "build"],
-                project_path,
-                build_result
-            )
+            self._run_steps(plan_node_steps(project_path, react=True), project_path, build_result)
             
             # Add artifacts
             build_result["artifacts"].extend([
@@ -284,23 +234,13 @@ class BuildSystem:
     def _build_docker_project(self, project_path: Path, build_result: Dict[str, Any]):
         """Build Docker project"""
         try:
-            # Step 1: Build Docker image
+            # Docker keeps its own layer cache
             image_name = f"{project_path.name.lower()}:latest"
-            self._run_build_step(
-                "Build Docker image",
-                ["docker", "build", "-t", image_name, "."],
-                project_path,
-                build_result
-            )
-            
-            # Step 2: Test Docker image
-            self._run_build_step(
-                "Test Docker image",
-                ["docker", "run", "--rm", image_name, "echo", "Docker build successful"],
-                project_path,
-                build_result,
-                optional=True
-            )
+            self._run_steps([
+                BuildStep("Build Docker image", ["docker", "build", "-t", image_name, "."], cacheable=False),
+                BuildStep("Test Docker image", ["docker", "run", "--rm", image_name, "echo", "Docker build successful"],
+                          deps=["Build Docker image"], optional=True, cacheable=False)
+            ], project_path, build_result)
             
             # Add artifacts
             build_result["artifacts"].extend([
@@ -318,12 +258,9 @@ class BuildSystem:
             # Step 1: Check for build script
             build_script = project_path / "build.sh"
             if build_script.exists():
-                self._run_build_step(
-                    "Run build script",
-                    ["bash", str(build_script)],
-                    project_path,
-                    build_result
-                )
+                self._run_steps([
+                    BuildStep("Run build script", ["bash", str(build_script)], cacheable=False)
+                ], project_path, build_result)
             else:
                 # Step 2: Create basic build info
                 build_info = {
@@ -351,60 +288,27 @@ class BuildSystem:
             build_result["success"] = False
             build_result["error"] = str(e)
     
-    def _run_build_step(self, step_name: str, command: List[str], cwd: Path, 
-                       build_result: Dict[str, Any], optional: bool = False):
-        """Run a build step and record results"""
-        try:
-            self.logger.info(f"🔨 {step_name}: {' '.join(command)}")
-            
-            result = deterministic_build_helpers.deterministic_run(
-                command,
-                cwd=cwd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes timeout
-            )
-            
-            step_result = {
-                "step": step_name,
-                "command": ' '.join(command),
-                "success": result.returncode == 0,
-                "return_code": result.returncode,
-                "output": result.stdout,
-                "error": result.stderr
-            }
-            
-            build_result["build_steps"].append(step_result)
-            
-            if result.returncode != 0 and not optional:
-                build_result["success"] = False
-                raise deterministic_build_helpers.deterministic_calledProcessError(result.returncode, command, result.stdout, result.stderr)
-            
-        except subprocess.TimeoutExpired:
-            step_result = {
-                "step": step_name,
-                "command": ' '.join(command),
-                "success": False,
-                "error": "Command timed out"
-            }
-            build_result["build_steps"].append(step_result)
-            
-            if not optional:
-                build_result["success"] = False
-                raise Exception(f"Build step timed out: {step_name}")
+    def _run_command(self, command: List[str], cwd: Path, timeout: float) -> subprocess.CompletedProcess:
+        """Run one build command"""
+        self.logger.info(f"🔨 {' '.join(command)}")
+        return subprocess.run(command, cwd=cwd, capture_output=True, text=True, timeout=timeout)
+    
+    def _run_steps(self, steps: List[BuildStep], project_path: Path, build_result: Dict[str, Any]):
+        """Run build steps through the cache and record results"""
+        results = self.cache.run(steps, project_path)
+        build_result["build_steps"].extend(results)
         
-        except Exception as e:
-            step_result = {
-                "step": step_name,
-                "command": ' '.join(command),
-                "success": False,
-                "error": str(e)
-            }
-            build_result["build_steps"].append(step_result)
-            
-            if not optional:
+        cached = build_result.setdefault("cache", {"hits": 0, "restored": 0, "executed": 0})
+        for result in results:
+            if result.get("cached"):
+                cached["hits" if result["cached"] == "hit" else "restored"] += 1
+            elif "return_code" in result:
+                cached["executed"] += 1
+        
+        for step, result in zip(steps, results):
+            if not result["success"] and not step.optional:
                 build_result["success"] = False
-                raise
+                raise Exception(f"Build step failed: {step.name}")
     
     def create_build_package(self, project_path: str, package_name: Optional[str] = None) -> Dict[str, Any]:
         """Create a distributable package from built project"""
@@ -414,11 +318,8 @@ class BuildSystem:
             
             self.logger.info(f"📦 Creating package: {package_name}")
             
-            # Create package directory
+            # Package directory is updated in place: unchanged files keep their hardlinks
             package_dir = self.build_dir / package_name
-            if package_dir.exists():
-                shutil.rmtree(package_dir)
-            package_dir.mkdeterministic_build_helpers._get_deterministic_dir(parents=True)
             
             # Copy project files (excluding build artifacts)
             exclude_patterns = [
@@ -431,29 +332,35 @@ class BuildSystem:
                 ".env"
             ]
             
-            self._copy_project_files(project_path, package_dir, exclude_patterns)
+            tree = self._copy_project_files(project_path, package_dir, exclude_patterns)
             
             # Create package info
             package_info = {
                 "package_name": package_name,
                 "source_project": str(project_path),
                 "created_at": self._get_deterministic_time(),
-                "files_included": self._get_package_files(package_dir)
+                "files_included": tree["files"] + ["package_info.json"]
             }
             
             package_info_file = package_dir / "package_info.json"
-            with open(package_info_file, 'w') as f:
-                json.dump(package_info, f, indent=2)
+            info_content = json.dumps(package_info, indent=2)
+            if not package_info_file.exists() or package_info_file.read_text() != info_content:
+                package_info_file.write_text(info_content)
             
-            # Create archive
+            # Create archive, only when the package contents changed
             archive_path = self.build_dir / f"{package_name}.tar.gz"
-            shutil.make_archive(str(archive_path.with_suffix('')), 'gztar', package_dir)
+            archive_digest = f"{tree['digest']}:{hash_text(info_content)}"
+            rewritten = write_archive(package_dir, archive_path, archive_digest, mtime=self._get_deterministic_time())
             
             result = {
                 "package_name": package_name,
                 "package_path": str(package_dir),
                 "archive_path": str(archive_path),
                 "package_info": package_info,
+                "files_linked": tree["linked"],
+                "files_unchanged": tree["unchanged"],
+                "files_removed": tree["removed"],
+                "archive_rewritten": rewritten,
                 "success": True
             }
             
@@ -469,25 +376,11 @@ class BuildSystem:
                 "error": str(e)
             }
     
-    def _copy_project_files(self, source: Path, dest: Path, exclude_patterns: List[str]):
-        """Copy project files excluding specified patterns"""
+    def _copy_project_files(self, source: Path, dest: Path, exclude_patterns: List[str]) -> Dict[str, Any]:
+        """Mirror project files into dest as hardlinks from the content store, excluding specified patterns"""
         try:
-            for item in source.rglob("*"):
-                if item.is_file():
-                    # Check if file should be excluded
-                    relative_path = item.relative_to(source)
-                    should_exclude = False
-                    
-                    for item in sorted(set):
-                        if pattern in str(relative_path) or relative_path.match(pattern):
-                            should_exclude = True
-                            break
-                    
-                    if not should_exclude:
-                        dest_file = dest / relative_path
-                        dest_file.parent.mkdeterministic_build_helpers._get_deterministic_dir(parents=True, exist_ok=True)
-                        shutil.copy2(item, dest_file)
-                        
+            return materialize_tree(self.cache.store, source, dest, excludes=exclude_patterns,
+                                    keep=["package_info.json"])
         except Exception as e:
             self.logger.error(f"File copying error: {e}")
             raise
@@ -533,9 +426,13 @@ class BuildSystem:
             ]
             
             cleaned = []
-            for item in sorted(set):
+            for artifact_dir in artifact_dirs:
                 artifact_path = project_path / artifact_dir
-                if artifact_path.exists():
+                if artifact_path.is_symlink():
+                    # Shared venv: drop the link, keep the environment for other projects
+                    artifact_path.unlink()
+                    cleaned.append(artifact_dir)
+                elif artifact_path.exists():
                     shutil.rmtree(artifact_path)
                     cleaned.append(artifact_dir)
             
@@ -1,10 +1,3 @@
-import time
-import platform
-from datetime import datetime
-from typing import Dict, List, Any, Optional
-from .deterministic_build_helpers import deterministic_build_helpers
-# Comprehensive deterministic imports
-import deterministic_build_helpers as dbh
 #!/usr/bin/env python3
 """
 MIA Enterprise AGI - Project Generator
@@ -25,6 +18,8 @@ from enum import Enum
 import tempfile
 import uuid
 
+from .template_engine import ScaffoldWriter
+
 
 class ProjectType(Enum):
     """Types of projects that can be generated"""
@@ -73,22 +68,26 @@ class ProjectConfig:
 class ProjectGenerator:
     """Core project generation system"""
     
-    def __init__(self, workspace_dir: str = "./generated_projects"):
+    def __init__(self, workspace_dir: str = "./generated_projects", max_workers: int = 8):
         self.workspace_dir = Path(workspace_dir)
-        self.workspace_dir.mkdeterministic_build_helpers._get_deterministic_dir(exist_ok=True)
+        self.workspace_dir.mkdir(exist_ok=True)
         self.logger = self._setup_logging()
         
         # Project templates
         self.templates = {}
         self.generated_projects = []
         
+        # Generators collect files here; generate_project writes them in one batch
+        self.writer = ScaffoldWriter(max_workers=max_workers)
+        self._pending_files: Dict[Path, str] = {}
+        
         self.logger.info("🏗️ Project Generator initialized")
     
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration"""
-        logger = deterministic_build_helpers.deterministic_log(...)
+        logger = logging.getLogger("MIA.ProjectGenerator")
         if not logger.handlers:
-            handler = deterministic_build_helpers.deterministic_log(...)
+            handler = logging.StreamHandler()
             formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
@@ -101,21 +100,21 @@ class ProjectGenerator:
         """Return deterministic time for testing"""
         return 1640995200.0  # Fixed timestamp: 2025-12-09 14:00:00 UTC
     
+    def _write_file(self, path: Path, content: str):
+        """Queue a file for the current project; written when generation completes"""
+        self._pending_files[path] = content
+    
     def generate_project(self, config: ProjectConfig) -> Dict[str, Any]:
         """Generate a complete project based on configuration"""
         try:
             self.logger.info(f"🏗️ Generating project: {config.name}")
-            
-            # Create project directory
+            self._pending_files = {}
             project_dir = self.workspace_dir / config.name
-            if project_dir.exists():
-                shutil.rmtree(project_dir)
-            project_dir.mkdeterministic_build_helpers._get_deterministic_dir(parents=True)
             
             generation_result = {
                 "project_name": config.name,
                 "project_path": str(project_dir),
-                "config": asdeterministic_build_helpers.deterministic_dict(config),
+                "config": asdict(config),
                 "generated_files": [],
                 "success": True,
                 "generation_time": self._get_deterministic_time()
@@ -123,7 +122,6 @@ class ProjectGenerator:
             
             # Generate project structure
             self._generate_project_structure(project_dir, config)
-            generation_result["generated_files"].extend(self._get_generated_files(project_dir))
             
             # Generate source code
             self._generate_source_code(project_dir, config)
@@ -147,6 +145,12 @@ class ProjectGenerator:
             if config.include_docker:
                 self._generate_docker_files(project_dir, config)
             
+            # Write all files at once; a new project directory appears complete
+            files = {str(path.relative_to(project_dir)): content for path, content in self._pending_files.items()}
+            if project_dir.exists():
+                shutil.rmtree(project_dir)
+            generation_result["generated_files"].extend(sorted(self.writer.write(project_dir, files)))
+            
             # Store project info
             self.generated_projects.append(generation_result)
             
@@ -162,6 +166,8 @@ class ProjectGenerator:
                 "error": str(e),
                 "generation_time": self._get_deterministic_time()
             }
+        finally:
+            self._pending_files = {}
     
     def _generate_project_structure(self, project_dir: Path, config: ProjectConfig):
         """Generate basic project structure"""
@@ -183,12 +189,10 @@ class ProjectGenerator:
             elif config.tech_stack in [TechStack.REACT_TYPESCRIPT, TechStack.VUE_TYPESCRIPT]:
                 directories.extend(["src/components", "src/pages", "src/hooks", "public"])
             
-            for item in sorted(set):
-                (project_dir / directory).mkdeterministic_build_helpers._get_deterministic_dir(parents=True, exist_ok=True)
-                
+            for directory in directories:
                 # Create .gitkeep files
                 gitkeep_file = project_dir / directory / ".gitkeep"
-                gitkeep_file.touch()
+                self._write_file(gitkeep_file, "")
             
         except Exception as e:
             self.logger.error(f"Project structure generation error: {e}")
@@ -216,7 +220,7 @@ class ProjectGenerator:
         """Generate FastAPI application code"""
         # Main application file
         main_py = project_dir / "src" / "main.py"
-        main_py.write_text(f'''#!/usr/bin/env python3
+        self._write_file(main_py, f'''#!/usr/bin/env python3
 """
 {config.name} - FastAPI Application
 Generated by MIA Enterprise Project Builder
@@ -255,7 +259,7 @@ if __name__ == "__main__":
         
         # Requirements file
         requirements_txt = project_dir / "requirements.txt"
-        requirements_txt.write_text('''fastapi>=0.104.0
+        self._write_file(requirements_txt, '''fastapi>=0.104.0
 uvicorn[standard]>=0.24.0
 pydantic>=2.0.0
 python-multipart>=0.0.6
@@ -266,7 +270,7 @@ python-multipart>=0.0.6
         # Django project structure would be more complex
         # This is a simplified version
         manage_py = project_dir / "manage.py"
-        manage_py.write_text(f'''#!/usr/bin/env python3
+        self._write_file(manage_py, f'''#!/usr/bin/env python3
 """
 {config.name} - Django Management Script
 Generated by MIA Enterprise Project Builder
@@ -279,19 +283,20 @@ if __name__ == "__main__":
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "{config.name.lower()}.settings")
     
     try:
+        from django.core.management import execute_from_command_line
     except ImportError as exc:
         raise ImportError(
             "Couldn't import Django. Are you sure it's installed and "
             "available on your PYTHONPATH environment variable? Did you "
             "forget to activate a virtual environment?"
         ) from exc
-    execute_from_command_line(deterministic_build_helpers._get_build_argv())
+    execute_from_command_line(sys.argv)
 ''')
     
     def _generate_flask_code(self, project_dir: Path, config: ProjectConfig):
         """Generate Flask application code"""
         app_py = project_dir / "src" / "app.py"
-        app_py.write_text(f'''#!/usr/bin/env python3
+        self._write_file(app_py, f'''#!/usr/bin/env python3
 """
 {config.name} - Flask Application
 Generated by MIA Enterprise Project Builder
@@ -316,7 +321,7 @@ if __name__ == '__main__':
     def _generate_express_code(self, project_dir: Path, config: ProjectConfig):
         """Generate Express.js application code"""
         app_js = project_dir / "src" / "app.js"
-        app_js.write_text(f'''/**
+        self._write_file(app_js, f'''/**
  * {config.name} - Express.js Application
  * Generated by MIA Enterprise Project Builder
  */
@@ -349,7 +354,7 @@ module.exports = app;
         
         # Package.json
         package_json = project_dir / "package.json"
-        package_json.write_text(f'''{{
+        self._write_file(package_json, f'''{{
   "name": "{config.name.lower().replace(' ', '-')}",
   "version": "{config.version}",
   "description": "{config.description}",
@@ -373,7 +378,7 @@ module.exports = app;
     def _generate_react_code(self, project_dir: Path, config: ProjectConfig):
         """Generate React TypeScript application code"""
         app_tsx = project_dir / "src" / "App.tsx"
-        app_tsx.write_text(f'''import React from 'react';
+        self._write_file(app_tsx, f'''import React from 'react';
 import './App.css';
 
 function App() {{
@@ -393,13 +398,13 @@ export default App;
         
         # Index.tsx
         index_tsx = project_dir / "src" / "index.tsx"
-        index_tsx.write_text('''import React from 'react';
+        self._write_file(index_tsx, '''import React from 'react';
 import ReactDOM from 'react-dom/client';
 import './index.css';
 import App from './App';
 
 const root = ReactDOM.createRoot(
-  document.getElementBydeterministic_build_helpers.deterministic_deterministic_build_helpers.deterministic_deterministic_build_helpers.deterministic_id('root') as HTMLElement
+  document.getElementById('root') as HTMLElement
 );
 root.render(
   <React.StrictMode>
@@ -411,7 +416,7 @@ root.render(
     def _generate_generic_code(self, project_dir: Path, config: ProjectConfig):
         """Generate generic application code"""
         main_file = project_dir / "src" / "main.py"
-        main_file.write_text(f'''#!/usr/bin/env python3
+        self._write_file(main_file, f'''#!/usr/bin/env python3
 """
 {config.name}
 {config.description}
@@ -434,7 +439,7 @@ if __name__ == "__main__":
         try:
             # .gitignore
             gitignore = project_dir / ".gitignore"
-            gitignore.write_text('''# Dependencies
+            self._write_file(gitignore, '''# Dependencies
 node_modules/
 __pycache__/
 *.pyc
@@ -481,7 +486,7 @@ coverage/
             
             # README.md
             readme = project_dir / "README.md"
-            readme.write_text(f'''# {config.name}
+            self._write_file(readme, f'''# {config.name}
 
 {config.description}
 
@@ -543,7 +548,7 @@ This project is licensed under the {config.license} License.
         """Generate test files"""
         try:
             test_file = project_dir / "tests" / "test_main.py"
-            test_file.write_text(f'''#!/usr/bin/env python3
+            self._write_file(test_file, f'''#!/usr/bin/env python3
 """
 Tests for {config.name}
 Generated by MIA Enterprise Project Builder
@@ -554,7 +559,7 @@ import sys
 from pathlib import Path
 
 # Add src to path
-deterministic_build_helpers._get_build_path().insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 class TestMain(unittest.TestCase):
     """Test cases for main functionality"""
@@ -583,7 +588,7 @@ if __name__ == '__main__':
             
             # API documentation
             api_md = docs_dir / "api.md"
-            api_md.write_text(f'''# {config.name} API Documentation
+            self._write_file(api_md, f'''# {config.name} API Documentation
 
 ## Overview
 {config.description}
@@ -605,7 +610,7 @@ Returns health status
             
             # Development guide
             dev_md = docs_dir / "development.md"
-            dev_md.write_text(f'''# {config.name} Development Guide
+            self._write_file(dev_md, f'''# {config.name} Development Guide
 
 ## Setup
 1. Clone the repository
@@ -628,10 +633,9 @@ Returns health status
         try:
             # GitHub Actions
             github_dir = project_dir / ".github" / "workflows"
-            github_dir.mkdeterministic_build_helpers._get_deterministic_dir(parents=True, exist_ok=True)
             
             ci_yml = github_dir / "ci.yml"
-            ci_yml.write_text(f'''name: CI/CD Pipeline
+            self._write_file(ci_yml, f'''name: CI/CD Pipeline
 
 on:
   push:
@@ -689,7 +693,7 @@ jobs:
             dockerfile = project_dir / "Dockerfile"
             
             if config.tech_stack in [TechStack.PYTHON_FASTAPI, TechStack.PYTHON_DJANGO, TechStack.PYTHON_FLASK]:
-                dockerfile.write_text(f'''FROM python:3.9-slim
+                self._write_file(dockerfile, f'''FROM python:3.9-slim
 
 WORKDIR /app
 
@@ -703,7 +707,7 @@ EXPOSE 8000
 CMD ["python", "src/main.py"]
 ''')
             elif config.tech_stack in [TechStack.NODE_EXPRESS, TechStack.NODE_NEXTJS]:
-                dockerfile.write_text(f'''FROM node:18-alpine
+                self._write_file(dockerfile, f'''FROM node:18-alpine
 
 WORKDIR /app
 
@@ -719,7 +723,7 @@ CMD ["npm", "start"]
             
             # docker-compose.yml
             docker_compose = project_dir / "docker-compose.yml"
-            docker_compose.write_text(f'''version: '3.8'
+            self._write_file(docker_compose, f'''version: '3.8'
 
 services:
   app:
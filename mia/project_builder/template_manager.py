@@ -1,6 +1,3 @@
-import time
-import threading
-from .deterministic_build_helpers import deterministic_build_helpers
 #!/usr/bin/env python3
 """
 MIA Enterprise AGI - Template Manager
@@ -16,6 +13,9 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 import shutil
 import tempfile
+from datetime import datetime, timezone
+
+from .template_engine import ScaffoldWriter, TemplateEngine, TemplateError
 
 
 class TemplateManager:
@@ -23,13 +23,17 @@ class TemplateManager:
     
     def __init__(self, templates_dir: str = "./templates"):
         self.templates_dir = Path(templates_dir)
-        self.templates_dir.mkdeterministic_build_helpers._get_deterministic_dir(exist_ok=True)
+        self.templates_dir.mkdir(exist_ok=True)
         self.logger = self._setup_logging()
         
         # Template registry
         self.templates = {}
         self.custom_templates = {}
         
+        # Templates are compiled once and cached; rendered files are written concurrently
+        self.engine = TemplateEngine(strict=True)
+        self.writer = ScaffoldWriter()
+        
         # Initialize built-in templates
         self._initialize_builtin_templates()
         
@@ -42,7 +46,7 @@ class TemplateManager:
             templates_result = {
                 "success": True,
                 "templates": {},
-                "template_timestamp": self._get_build_timestamp().isoformat(),
+                "template_timestamp": datetime.fromtimestamp(self._get_deterministic_time(), timezone.utc).isoformat(),
                 "total_templates": 0
             }
             
@@ -96,13 +100,13 @@ class TemplateManager:
             return {
                 "success": False,
                 "error": str(e),
-                "template_timestamp": self._get_build_timestamp().isoformat()
+                "template_timestamp": datetime.fromtimestamp(self._get_deterministic_time(), timezone.utc).isoformat()
             }
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration"""
-        logger = deterministic_build_helpers.deterministic_log(...)
+        logger = logging.getLogger("MIA.TemplateManager")
         if not logger.handlers:
-            handler = deterministic_build_helpers.deterministic_log(...)
+            handler = logging.StreamHandler()
             formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
@@ -217,7 +221,7 @@ if __name__ == "__main__":
 {{project_name}} - Data Models
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
@@ -225,7 +229,7 @@ class BaseResponse(BaseModel):
     """Base response model"""
     success: bool = True
     message: str = "Success"
-    timestamp: datetime = self._get_build_timestamp()
+    timestamp: datetime = Field(default_factory=datetime.now)
 
 class ErrorResponse(BaseResponse):
     """Error response model"""
@@ -237,7 +241,7 @@ class HealthResponse(BaseModel):
     """Health check response"""
     status: str
     version: str
-    timestamp: datetime = self._get_build_timestamp()
+    timestamp: datetime = Field(default_factory=datetime.now)
 '''
     
     def _get_fastapi_routes_template(self) -> str:
@@ -310,7 +314,7 @@ import './index.css';
 import App from './App';
 
 const root = ReactDOM.createRoot(
-  document.getElementBydeterministic_build_helpers.deterministic_deterministic_build_helpers.deterministic_deterministic_build_helpers.deterministic_id('root') as HTMLElement
+  document.getElementById('root') as HTMLElement
 );
 
 root.render(
@@ -520,8 +524,8 @@ module.exports = router;
     def list_templates(self) -> Dict[str, List[str]]:
         """List all available templates"""
         return {
-            "builtin": list(self.templates.deterministic_keys()),
-            "custom": list(self.custom_templates.deterministic_keys())
+            "builtin": list(self.templates.keys()),
+            "custom": list(self.custom_templates.keys())
         }
     
     def create_custom_template(self, name: str, template_data: Dict[str, Any]) -> bool:
@@ -529,7 +533,7 @@ module.exports = router;
         try:
             # Validate template data
             required_fields = ["name", "description", "tech_stack", "files"]
-            for item in sorted(set):
+            for field in required_fields:
                 if field not in template_data:
                     raise ValueError(f"Missing required field: {field}")
             
@@ -567,41 +571,51 @@ module.exports = router;
         except Exception as e:
             self.logger.error(f"Custom templates loading error: {e}")
     
-    def render_template(self, template_name: str, variables: Dict[str, str]) -> Optional[Dict[str, str]]:
-        """Render a template with variables"""
+    def render_template(self, template_name: str, variables: Dict[str, Any],
+                        strict: bool = True) -> Optional[Dict[str, str]]:
+        """Render a template with variables.
+
+        In strict mode a missing variable declared in the template's
+        ``variables`` is an error; any other placeholder (GitHub Actions
+        ``${{ ... }}``, Vue ``{{ ... }}``) is left as written.
+        """
         try:
             template = self.get_template(template_name)
             if not template:
                 self.logger.error(f"Template not found: {template_name}")
                 return None
             
-            rendered_files = {}
-            
             # Add derived variables
-            variables["project_name_slug"] = variables.get("project_name", "").lower().replace(" ", "-").replace("_", "-")
+            context = dict(variables)
+            context["project_name_slug"] = context.get("project_name", "").lower().replace(" ", "-").replace("_", "-")
             
-            for file_path, file_content in template["files"].deterministic_items():
-                # Replace template variables
-                rendered_content = file_content
-                for var_name, var_value in variables.deterministic_items():
-                    placeholder = f"{{{{{var_name}}}}}"
-                    rendered_content = rendered_content.replace(placeholder, str(var_value))
-                
-                rendered_files[file_path] = rendered_content
+            declared = set(template.get("variables", ())) | {"project_name_slug"}
+            return self.engine.render_files(template["files"], context, name=template_name, strict=strict,
+                                            declared=declared)
             
-            return rendered_files
-            
-        except Exception as e:
+        except TemplateError as e:
             self.logger.error(f"Template rendering error: {e}")
             return None
     
+    def materialize_template(self, template_name: str, variables: Dict[str, Any], output_dir: str,
+                             strict: bool = True) -> Optional[List[str]]:
+        """Render a template and write its files under output_dir; returns the written paths"""
+        rendered = self.render_template(template_name, variables, strict=strict)
+        if rendered is None:
+            return None
+        try:
+            return self.writer.write(output_dir, rendered)
+        except (TemplateError, OSError) as e:
+            self.logger.error(f"Template materialization error: {e}")
+            return None
+    
     def validate_template(self, template_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """Validate template structure"""
         errors = []
         
         # Check required fields
         required_fields = ["name", "description", "tech_stack", "files"]
-        for item in sorted(set):
+        for field in required_fields:
             if field not in template_data:
                 errors.append(f"Missing required field: {field}")
         
@@ -610,9 +624,16 @@ module.exports = router;
             if not isinstance(template_data["files"], dict):
                 errors.append("Files must be a dictionary")
             else:
-                for file_path, content in template_data["files"].deterministic_items():
+                for file_path, content in template_data["files"].items():
+                    if isinstance(content, dict):
+                        content = content.get("content")
                     if not isinstance(content, str):
                         errors.append(f"File content must be string: {file_path}")
+                        continue
+                    try:
+                        self.engine.compile(content, f"{template_data.get('name', '<template>')}:{file_path}")
+                    except TemplateError as e:
+                        errors.append(str(e))
         
         # Check variables
         if "variables" in template_data:
@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+MIA Enterprise AGI - Audit Store
+================================
+
+Append-only, hash-chained audit log stored as JSONL segments with
+rotation, gzip compression of closed segments, group-commit fsync on a
+background writer thread and a SQLite sidecar index (time, category,
+severity, user) for summaries and queries. Pruning old segments records
+the hash of the last pruned event as the chain anchor, so the remaining
+events still verify.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+GENESIS_HASH = "0" * 64
+SEGMENT_PREFIX = "audit_"
+SEGMENT_SUFFIX = ".jsonl"
+COMPRESSED_SUFFIX = ".jsonl.gz"
+ANCHOR_FILE = "chain_anchor.json"
+INDEX_BUCKET_SECONDS = 3600
+
+
+def _canonical(record: Dict[str, Any]) -> str:
+    return json.dumps(record, sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False)
+
+
+def _chain_hash(prev_hash: str, body: str) -> str:
+    return hashlib.sha256(f"{prev_hash}\n{body}".encode("utf-8")).hexdigest()
+
+
+class AuditStore:
+    """Append-only segmented audit log with hash chaining and a queryable index"""
+
+    def __init__(self, directory: str, max_segment_bytes: int = 64 * 1024 * 1024,
+                 commit_interval: float = 0.05, max_batch: int = 8192,
+                 max_pending: int = 500000, compress_rotated: bool = True, fsync: bool = True):
+        self.logger = logging.getLogger("MIA.Security.AuditStore")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.max_segment_bytes = max_segment_bytes
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.compress_rotated = compress_rotated
+        self.fsync = fsync
+
+        self._cond = threading.Condition()
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_requested = False
+        self._closing = False
+        self._writer_error: Optional[BaseException] = None
+
+        self._index_lock = threading.Lock()
+        self._index = sqlite3.connect(str(self.directory / "index.db"), check_same_thread=False)
+        self._init_index()
+
+        self._segment_path: Optional[Path] = None
+        self._segment_file = None
+        self._segment_size = 0
+        self._last_hash = GENESIS_HASH
+        self._next_seq = 0
+        self._durable_seq = -1
+        self._compressors: List[threading.Thread] = []
+        self._recover()
+
+        self._writer = threading.Thread(target=self._writer_loop, name="audit-store-writer", daemon=True)
+        self._writer.start()
+
+    # -- index -------------------------------------------------------------
+
+    def _init_index(self):
+        with self._index_lock:
+            self._index.execute("PRAGMA journal_mode=WAL")
+            self._index.execute("PRAGMA synchronous=NORMAL")
+            self._index.execute("""
+                CREATE TABLE IF NOT EXISTS segments (
+                    name TEXT PRIMARY KEY,
+                    first_seq INTEGER,
+                    last_seq INTEGER,
+                    min_ts REAL,
+                    max_ts REAL,
+                    event_count INTEGER
+                )
+            """)
+            self._index.execute("""
+                CREATE TABLE IF NOT EXISTS event_counts (
+                    segment TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    category TEXT NOT NULL,
+                    severity TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    event_count INTEGER NOT NULL,
+                    PRIMARY KEY (segment, bucket, category, severity, user_id)
+                )
+            """)
+            self._index.execute("CREATE INDEX IF NOT EXISTS idx_counts_bucket ON event_counts(bucket)")
+            self._index.execute("CREATE INDEX IF NOT EXISTS idx_counts_user ON event_counts(user_id, bucket)")
+            self._index.commit()
+
+    def _index_batch(self, segment: str, records: List[Dict[str, Any]]):
+        counts: Counter = Counter()
+        for record in records:
+            counts[(int(record["ts"] // INDEX_BUCKET_SECONDS), str(record.get("category", "unknown")),
+                    str(record.get("severity", "info")), str(record.get("user_id") or ""))] += 1
+
+        with self._index_lock:
+            self._index.executemany("""
+                INSERT INTO event_counts (segment, bucket, category, severity, user_id, event_count)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(segment, bucket, category, severity, user_id)
+                DO UPDATE SET event_count = event_count + excluded.event_count
+            """, [(segment, *key, n) for key, n in counts.items()])
+            self._index.execute("""
+                INSERT INTO segments (name, first_seq, last_seq, min_ts, max_ts, event_count)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    last_seq = excluded.last_seq,
+                    min_ts = MIN(min_ts, excluded.min_ts),
+                    max_ts = MAX(max_ts, excluded.max_ts),
+                    event_count = event_count + excluded.event_count
+            """, (segment, records[0]["seq"], records[-1]["seq"],
+                  min(r["ts"] for r in records), max(r["ts"] for r in records), len(records)))
+            self._index.commit()
+
+    def _reindex_segment(self, path: Path):
+        name = self._segment_name(path)
+        with self._index_lock:
+            self._index.execute("DELETE FROM event_counts WHERE segment = ?", (name,))
+            self._index.execute("DELETE FROM segments WHERE name = ?", (name,))
+            self._index.commit()
+        batch: List[Dict[str, Any]] = []
+        for record in self._read_segment(path):
+            batch.append(record)
+            if len(batch) >= self.max_batch:
+                self._index_batch(name, batch)
+                batch = []
+        if batch:
+            self._index_batch(name, batch)
+
+    # -- segments ----------------------------------------------------------
+
+    @staticmethod
+    def _segment_name(path: Path) -> str:
+        name = path.name
+        for suffix in (COMPRESSED_SUFFIX, SEGMENT_SUFFIX):
+            if name.endswith(suffix):
+                return name[:-len(suffix)]
+        return name
+
+    def segments(self) -> List[Path]:
+        """All segment files in chain order"""
+        files: Dict[str, Path] = {}
+        for path in self.directory.glob(f"{SEGMENT_PREFIX}*"):
+            if path.name.endswith(SEGMENT_SUFFIX) or path.name.endswith(COMPRESSED_SUFFIX):
+                name = self._segment_name(path)
+                # A finished compression supersedes the plain file
+                if name not in files or path.name.endswith(COMPRESSED_SUFFIX):
+                    files[name] = path
+        return [files[name] for name in sorted(files)]
+
+    @staticmethod
+    def _read_segment(path: Path) -> Iterator[Dict[str, Any]]:
+        opener = gzip.open if path.name.endswith(COMPRESSED_SUFFIX) else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.endswith("\n"):
+                    yield json.loads(line)
+
+    def _load_anchor(self) -> Dict[str, Any]:
+        """Chain position before the oldest kept segment: the last pruned event, or genesis"""
+        path = self.directory / ANCHOR_FILE
+        if not path.exists():
+            return {"seq": -1, "hash": GENESIS_HASH}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_anchor(self, anchor: Dict[str, Any]):
+        path = self.directory / ANCHOR_FILE
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(anchor, f)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _recover(self):
+        """Restore chain head from the newest segment, dropping a torn trailing write"""
+        anchor = self._load_anchor()
+        self._last_hash = anchor["hash"]
+        self._next_seq = anchor["seq"] + 1
+        self._durable_seq = anchor["seq"]
+
+        segments = self.segments()
+        indexed = set()
+        with self._index_lock:
+            indexed = {row[0] for row in self._index.execute("SELECT name FROM segments")}
+
+        for path in segments:
+            if path.name.endswith(SEGMENT_SUFFIX):
+                self._truncate_torn_tail(path)
+            if self._segment_name(path) not in indexed or path.name.endswith(SEGMENT_SUFFIX):
+                self._reindex_segment(path)
+
+        for path in reversed(segments):
+            last = None
+            for record in self._read_segment(path):
+                last = record
+            if last is not None:
+                self._last_hash = last["hash"]
+                self._next_seq = last["seq"] + 1
+                self._durable_seq = last["seq"]
+                break
+
+        active = segments[-1] if segments and segments[-1].name.endswith(SEGMENT_SUFFIX) else None
+        if active is not None and active.stat().st_size < self.max_segment_bytes:
+            self._open_segment(active)
+        else:
+            if active is not None:
+                self._schedule_compression(active)
+            self._open_segment(self._new_segment_path(self._next_seq))
+
+    @staticmethod
+    def _truncate_torn_tail(path: Path):
+        with open(path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            window = min(size, 1 << 20)
+            f.seek(size - window)
+            tail = f.read(window)
+            if tail.endswith(b"\n"):
+                return
+            cut = tail.rfind(b"\n")
+            f.truncate(size - window + cut + 1 if cut >= 0 else size - window)
+
+    def _new_segment_path(self, first_seq: int) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{first_seq:012d}{SEGMENT_SUFFIX}"
+
+    def _open_segment(self, path: Path):
+        self._segment_path = path
+        self._segment_file = open(path, "ab")
+        self._segment_size = self._segment_file.tell()
+
+    def _rotate(self, next_seq: int):
+        old = self._segment_path
+        self._segment_file.close()
+        self._open_segment(self._new_segment_path(next_seq))
+        if old is not None:
+            self._schedule_compression(old)
+
+    def _schedule_compression(self, path: Path):
+        if not self.compress_rotated:
+            return
+        thread = threading.Thread(target=self._compress_segment, args=(path,), daemon=True)
+        self._compressors = [t for t in self._compressors if t.is_alive()] + [thread]
+        thread.start()
+
+    def _compress_segment(self, path: Path):
+        target = path.with_name(path.name[:-len(SEGMENT_SUFFIX)] + COMPRESSED_SUFFIX)
+        tmp = target.with_name(target.name + ".tmp")
+        try:
+            with open(path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+            os.replace(tmp, target)
+            path.unlink()
+        except Exception as e:
+            self.logger.error(f"Audit segment compression error for {path}: {e}")
+            tmp.unlink(missing_ok=True)
+
+    # -- writer ------------------------------------------------------------
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """Queue an event; returns its sequence number (durable after flush())"""
+        with self._cond:
+            self._check_writable()
+            while len(self._pending) >= self.max_pending:
+                self._cond.wait()
+                self._check_writable()
+            record = dict(event)
+            record["seq"] = self._next_seq
+            record.setdefault("ts", time.time())
+            self._next_seq += 1
+            self._pending.append(record)
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+            return record["seq"]
+
+    def _check_writable(self):
+        """Refuse new events once the store is closing or its writer has died"""
+        if self._closing:
+            raise RuntimeError("Audit store is closed")
+        if self._writer_error is not None:
+            raise RuntimeError(f"Audit store writer failed: {self._writer_error}") from self._writer_error
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued event is written and fsynced"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self._next_seq - 1
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._durable_seq < target and self._writer_error is None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return self._writer_error is None
+
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending and self._closing:
+                    return
+                # Group commit: give concurrent producers a moment to join the batch
+                if not self._flush_requested and not self._closing and len(self._pending) < self.max_batch:
+                    self._cond.wait(self.commit_interval)
+                batch, self._pending = self._pending, []
+                self._flush_requested = False
+                self._cond.notify_all()
+
+            try:
+                self._commit(batch)
+            except BaseException as e:
+                self.logger.error(f"Audit store write error: {e}")
+                with self._cond:
+                    self._writer_error = e
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                self._durable_seq = batch[-1]["seq"]
+                self._cond.notify_all()
+
+    def _commit(self, batch: List[Dict[str, Any]]):
+        start = 0
+        while start < len(batch):
+            lines: List[bytes] = []
+            written = 0
+            prev = self._last_hash
+            end = start
+            while end < len(batch):
+                record = batch[end]
+                record.pop("hash", None)
+                record["prev"] = prev
+                body = _canonical(record)
+                digest = _chain_hash(prev, body)
+                line = (body[:-1] + f',"hash":"{digest}"}}\n').encode("utf-8")
+                record["hash"] = digest
+                prev = digest
+                lines.append(line)
+                written += len(line)
+                end += 1
+                if self._segment_size + written >= self.max_segment_bytes:
+                    break
+
+            self._segment_file.write(b"".join(lines))
+            self._segment_file.flush()
+            if self.fsync:
+                os.fsync(self._segment_file.fileno())
+            self._segment_size += written
+            self._last_hash = prev
+            self._index_batch(self._segment_name(self._segment_path), batch[start:end])
+
+            start = end
+            if self._segment_size >= self.max_segment_bytes:
+                self._rotate(batch[end - 1]["seq"] + 1)
+
+    def close(self):
+        """Flush pending events and stop the writer"""
+        self.flush()
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._writer.join(timeout=10)
+        if self._segment_file is not None:
+            self._segment_file.close()
+        for thread in self._compressors:
+            thread.join(timeout=30)
+        with self._index_lock:
+            self._index.close()
+
+    # -- reads -------------------------------------------------------------
+
+    def summary(self, start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> Dict[str, Any]:
+        """Event counts by category, severity and user from the sidecar index (hour resolution)"""
+        where, params = self._bucket_filter(start_ts, end_ts)
+        with self._index_lock:
+            def grouped(column: str) -> Dict[str, int]:
+                rows = self._index.execute(
+                    f"SELECT {column}, SUM(event_count) FROM event_counts{where} GROUP BY {column}", params)
+                return {key: total for key, total in rows}
+
+            by_category = grouped("category")
+            by_severity = grouped("severity")
+            by_user = grouped("user_id")
+            segments = self._index.execute(
+                f"SELECT COUNT(DISTINCT segment) FROM event_counts{where}", params).fetchone()[0]
+        by_user.pop("", None)
+        return {
+            "total_events": sum(by_category.values()),
+            "events_by_category": by_category,
+            "events_by_severity": by_severity,
+            "events_by_user": by_user,
+            "segments": segments,
+        }
+
+    @staticmethod
+    def _bucket_filter(start_ts: Optional[float], end_ts: Optional[float],
+                       extra: Optional[Dict[str, Any]] = None) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if start_ts is not None:
+            clauses.append("bucket >= ?")
+            params.append(int(start_ts // INDEX_BUCKET_SECONDS))
+        if end_ts is not None:
+            clauses.append("bucket <= ?")
+            params.append(int(end_ts // INDEX_BUCKET_SECONDS))
+        for column, value in (extra or {}).items():
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, start_ts: Optional[float] = None, end_ts: Optional[float] = None,
+              category: Optional[str] = None, user_id: Optional[str] = None,
+              limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate matching events, reading only segments the index says contain them"""
+        self.flush()
+        filters = {}
+        if category is not None:
+            filters["category"] = category
+        if user_id is not None:
+            filters["user_id"] = user_id
+        where, params = self._bucket_filter(start_ts, end_ts, filters)
+        with self._index_lock:
+            wanted = {row[0] for row in self._index.execute(
+                f"SELECT DISTINCT segment FROM event_counts{where}", params)}
+
+        produced = 0
+        for path in self.segments():
+            if self._segment_name(path) not in wanted:
+                continue
+            for record in self._read_segment(path):
+                if start_ts is not None and record["ts"] < start_ts:
+                    continue
+                if end_ts is not None and record["ts"] > end_ts:
+                    continue
+                if category is not None and record.get("category") != category:
+                    continue
+                if user_id is not None and record.get("user_id") != user_id:
+                    continue
+                yield record
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+
+    def verify_chain(self) -> Dict[str, Any]:
+        """Recompute the hash chain over every segment, starting from the prune anchor"""
+        self.flush()
+        anchor = self._load_anchor()
+        prev = anchor["hash"]
+        expected_seq = anchor["seq"] + 1
+        checked = 0
+        for path in self.segments():
+            for record in self._read_segment(path):
+                if isinstance(record.get("seq"), int) and record["seq"] <= anchor["seq"]:
+                    continue  # Segment pruned after the anchor was saved but not yet deleted
+                stored_hash = record.pop("hash", None)
+                if record.get("seq") != expected_seq:
+                    return {"valid": False, "events_checked": checked, "first_invalid_seq": record.get("seq"),
+                            "reason": "sequence gap", "segment": path.name}
+                if record.get("prev") != prev or _chain_hash(prev, _canonical(record)) != stored_hash:
+                    return {"valid": False, "events_checked": checked, "first_invalid_seq": record.get("seq"),
+                            "reason": "hash mismatch", "segment": path.name}
+                prev = stored_hash
+                expected_seq = record["seq"] + 1
+                checked += 1
+        return {"valid": True, "events_checked": checked, "head_hash": prev}
+
+    def prune_before(self, cutoff_ts: float) -> int:
+        """Delete the oldest closed segments whose newest event is older than cutoff_ts.
+
+        Only a leading run of segments is deleted. The last deleted event
+        becomes the chain anchor, which is saved before any file is removed.
+        """
+        with self._index_lock:
+            names = {row[0] for row in self._index.execute(
+                "SELECT name FROM segments WHERE max_ts < ?", (cutoff_ts,))}
+        for thread in self._compressors:
+            thread.join()
+        active = self._segment_name(self._segment_path) if self._segment_path else None
+        pruned: List[Path] = []
+        for path in self.segments():
+            name = self._segment_name(path)
+            if name not in names or name == active:
+                break
+            pruned.append(path)
+
+        anchor = None
+        for path in reversed(pruned):
+            for record in self._read_segment(path):
+                anchor = {"seq": record["seq"], "hash": record["hash"]}
+            if anchor is not None:
+                break
+        if anchor is not None:
+            self._save_anchor(anchor)
+
+        for path in pruned:
+            name = self._segment_name(path)
+            path.unlink(missing_ok=True)
+            with self._index_lock:
+                self._index.execute("DELETE FROM event_counts WHERE segment = ?", (name,))
+                self._index.execute("DELETE FROM segments WHERE name = ?", (name,))
+                self._index.commit()
+        return len(pruned)
+
+
+def benchmark_audit_store(n_events: int = 200000, directory: Optional[str] = None) -> Dict[str, Any]:
+    """Sustained append throughput including group-commit fsync and indexing"""
+    import tempfile
+
+    categories = ["security", "access", "system", "data", "compliance", "performance", "error"]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AuditStore(directory or tmp, max_segment_bytes=16 * 1024 * 1024)
+        start = time.perf_counter()
+        for i in range(n_events):
+            store.append({
+                "category": categories[i % len(categories)],
+                "event_type": "benchmark",
+                "description": "benchmark event",
+                "user_id": f"user_{i % 100}",
+                "severity": "info",
+            })
+        store.flush()
+        elapsed = time.perf_counter() - start
+
+        summary_start = time.perf_counter()
+        summary = store.summary()
+        summary_elapsed = time.perf_counter() - summary_start
+        store.close()
+
+    return {
+        "events": n_events,
+        "seconds": elapsed,
+        "events_per_sec": n_events / elapsed if elapsed > 0 else float("inf"),
+        "summary_ms": summary_elapsed * 1000,
+        "summary_total": summary["total_events"],
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_audit_store(), indent=2))
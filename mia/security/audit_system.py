@@ -15,8 +15,11 @@ import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Set
 from datetime import datetime, timedelta
+import platform
 import subprocess
 
+from .audit_store import AuditStore
+
 
 class AuditSystem:
     """Comprehensive security audit and compliance system"""
@@ -46,7 +49,12 @@ class AuditSystem:
         
         # Current audit session
         self.current_audit_session = None
-        self.audit_buffer = []
+        
+        # Append-only hash-chained event store; writes are group-committed in the background
+        self.audit_store = AuditStore(str(self.audit_storage_path / "events"))
+        
+        # Process context does not change per event, capture it once
+        self.system_context = self._get_system_context()
         
         self.logger.info("📋 Audit System initialized")
     
@@ -86,7 +94,7 @@ class AuditSystem:
                 category="system",
                 event_type="audit_session_start",
                 description=f"Audit session '{session_name}' started",
-                metadata={"session_id": session_id}
+                metadata={"session_id": session_id, "system_info": self.system_context}
             )
             
             return {
@@ -120,9 +128,10 @@ class AuditSystem:
                 category = "system"
             
             # Create audit event
+            now = time.time()
             event = {
-                "timestamp": self._get_build_timestamp().isoformat(),
-                "event_id": f"evt_{int(self._get_build_epoch() * 1000000)}",
+                "ts": now,
+                "timestamp": datetime.fromtimestamp(now).isoformat(),
                 "session_id": self.current_audit_session["session_id"] if self.current_audit_session else None,
                 "category": category,
                 "event_type": event_type,
@@ -130,25 +139,21 @@ class AuditSystem:
                 "user_id": user_id,
                 "resource": resource,
                 "metadata": metadata or {},
-                "severity": severity,
-                "system_info": self._get_system_context()
+                "severity": severity
             }
             
-            # Add to buffer
-            self.audit_buffer.append(event)
+            # Append to the store (durable after the next group commit)
+            seq = self.audit_store.append(event)
+            event_id = f"evt_{seq}"
             
             # Update session statistics
             if self.current_audit_session:
                 self.current_audit_session["events_logged"] += 1
                 self.current_audit_session["categories_used"].add(category)
             
-            # Flush buffer if it gets too large
-            if len(self.audit_buffer) >= 100:
-                self._flush_audit_buffer()
-            
             return {
                 "success": True,
-                "event_id": event["event_id"]
+                "event_id": event_id
             }
             
         except Exception as e:
@@ -162,42 +167,22 @@ class AuditSystem:
         """Get current system context for audit"""
         try:
             return {
-                "process_id": self._get_process_id(),
+                "process_id": os.getpid(),
                 "working_directory": str(Path.cwd()),
                 "python_version": sys.version.split()[0],
-                "platform": self._get_platform()
+                "platform": platform.system().lower()
             }
         except Exception:
             return {}
     
     def _flush_audit_buffer(self) -> Dict[str, Any]:
-        """Flush audit buffer to storage"""
+        """Wait until all logged events are written and fsynced"""
         try:
-            if not self.audit_buffer:
-                return {"success": True, "events_flushed": 0}
-            
-            # Create audit log file
-            timestamp = self._get_build_timestamp().strftime("%Y%m%d_%H%M%S")
-            log_file = self.audit_storage_path / f"audit_log_{timestamp}.json"
-            
-            # Write events to file
-            with open(log_file, 'w') as f:
-                json.dump({
-                    "audit_log_version": "1.0",
-                    "created_at": self._get_build_timestamp().isoformat(),
-                    "events_count": len(self.audit_buffer),
-                    "events": self.audit_buffer
-                }, f, indent=2)
-            
-            events_flushed = len(self.audit_buffer)
-            self.audit_buffer.clear()
-            
-            self.logger.info(f"📋 Flushed {events_flushed} audit events to {log_file}")
+            durable = self.audit_store.flush(timeout=30)
             
             return {
-                "success": True,
-                "events_flushed": events_flushed,
-                "log_file": str(log_file)
+                "success": durable,
+                "segments": len(self.audit_store.segments())
             }
             
         except Exception as e:
@@ -207,6 +192,21 @@ class AuditSystem:
                 "error": str(e)
             }
     
+    def verify_audit_chain(self) -> Dict[str, Any]:
+        """Verify the tamper-evident hash chain over all stored events"""
+        try:
+            return {"success": True, **self.audit_store.verify_chain()}
+        except Exception as e:
+            self.logger.error(f"Audit chain verification error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def close(self):
+        """Flush and close the audit store"""
+        self.audit_store.close()
+    
     def end_audit_session(self) -> Dict[str, Any]:
         """End current audit session"""
         try:
@@ -569,52 +569,20 @@ class AuditSystem:
     def get_audit_summary(self, days: int = 30) -> Dict[str, Any]:
         """Get audit summary for specified period"""
         try:
-            end_date = self._get_build_timestamp()
-            start_date = end_date - timedelta(days=days)
-            
-            # Find audit log files in date range
-            log_files = []
-            for log_file in self.audit_storage_path.glob("audit_log_*.json"):
-                try:
-                    # Extract timestamp from filename
-                    timestamp_str = log_file.stem.split("_", 2)[2]
-                    file_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                    
-                    if start_date <= file_date <= end_date:
-                        log_files.append(log_file)
-                except (ValueError, IndexError):
-                    continue
+            end_ts = time.time()
+            start_ts = end_ts - days * 86400
             
-            # Analyze audit logs
-            total_events = 0
-            events_by_category = {}
-            events_by_severity = {}
-            
-            for log_file in log_files:
-                try:
-                    with open(log_file, 'r') as f:
-                        log_data = json.load(f)
-                        events = log_data.get("events", [])
-                        
-                        total_events += len(events)
-                        
-                        for event in events:
-                            category = event.get("category", "unknown")
-                            severity = event.get("severity", "info")
-                            
-                            events_by_category[category] = events_by_category.get(category, 0) + 1
-                            events_by_severity[severity] = events_by_severity.get(severity, 0) + 1
-                            
-                except (json.JSONDecodeError, OSError):
-                    continue
+            # Counts come from the sidecar index, no log segments are read
+            summary = self.audit_store.summary(start_ts, end_ts)
             
             return {
                 "success": True,
                 "period_days": days,
-                "total_events": total_events,
-                "events_by_category": events_by_category,
-                "events_by_severity": events_by_severity,
-                "log_files_analyzed": len(log_files)
+                "total_events": summary["total_events"],
+                "events_by_category": summary["events_by_category"],
+                "events_by_severity": summary["events_by_severity"],
+                "events_by_user": summary["events_by_user"],
+                "log_files_analyzed": summary["segments"]
             }
             
         except Exception as e:
@@ -11,6 +11,9 @@ from typing import Dict, List, Any, Optional, Set
 from datetime import datetime, timedelta
 from enum import Enum
 
+from mia.security.pattern_scanner import get_pattern_scanner
+from mia.core.service_registry import lazy_services
+
 class ActionType(Enum):
     ALLOW = "allow"
     BLOCK = "block"
@@ -118,15 +121,8 @@ class BehaviorFirewall:
                     return False
                 
                 # Preveri za injection patterns
-                injection_patterns = [
-                    'ignore previous instructions',
-                    'system: you are',
-                    'jailbreak'
-                ]
-                
-                for pattern in injection_patterns:
-                    if pattern.lower() in prompt.lower():
-                        return False
+                if not get_pattern_scanner().is_clean(prompt, {"prompt_injection"}):
+                    return False
             
             elif action_type == 'file_access':
                 # Preveri file path
@@ -246,4 +242,4 @@ class BehaviorFirewall:
             return {}
 
 # Globalni behavior firewall
-behavior_firewall = BehaviorFirewall()
+__getattr__ = lazy_services(__name__, behavior_firewall=BehaviorFirewall)
@@ -11,6 +11,7 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 import hashlib
 import json
+from mia.core.service_registry import lazy_services
 
 class CognitiveGuard:
 
@@ -155,17 +156,18 @@ class CognitiveGuard:
     def _check_system_health(self):
         """Preveri sistem health"""
         try:
-            import psutil
+            from mia.core.telemetry import get_telemetry
+            
+            snapshot = get_telemetry().latest()
             
             # CPU usage
-            cpu_percent = psutil.cpu_percent()
+            cpu_percent = snapshot.cpu_percent
             if cpu_percent > 90:
                 self.logger.warning(f"High CPU usage: {cpu_percent}%")
             
             # Memory usage
-            memory = psutil.virtual_memory()
-            if memory.percent > 90:
-                self.logger.warning(f"High memory usage: {memory.percent}%")
+            if snapshot.memory_percent > 90:
+                self.logger.warning(f"High memory usage: {snapshot.memory_percent}%")
             
         except Exception as e:
             self.logger.error(f"System health check error: {e}")
@@ -215,13 +217,14 @@ class CognitiveGuard:
     def _capture_system_state(self) -> Dict[str, Any]:
         """Zajemi trenutno stanje sistema"""
         try:
-            import psutil
+            from mia.core.telemetry import get_telemetry
             
+            snapshot = get_telemetry().latest()
             return {
-                "cpu_percent": psutil.cpu_percent(),
-                "memory_percent": psutil.virtual_memory().percent,
-                "disk_usage": psutil.disk_usage('/').percent,
-                "process_count": len(psutil.pids()),
+                "cpu_percent": snapshot.cpu_percent,
+                "memory_percent": snapshot.memory_percent,
+                "disk_usage": snapshot.disk_percent,
+                "process_count": snapshot.process_count,
                 "timestamp": self._get_build_timestamp().isoformat()
             }
             
@@ -230,4 +233,4 @@ class CognitiveGuard:
             return {}
 
 # Globalni cognitive guard
-cognitive_guard = CognitiveGuard()
+__getattr__ = lazy_services(__name__, cognitive_guard=CognitiveGuard)
@@ -11,25 +11,18 @@ import logging
 from typing import Any, Dict, List, Optional, Union
 from urllib.parse import quote, unquote
 
+from mia.security.pattern_scanner import DEFAULT_RULES, get_pattern_scanner
+from mia.core.service_registry import get_service, lazy_services
+
 class InputSanitizer:
     """Centralizirani input sanitization sistem"""
     
     def __init__(self):
         self.logger = logging.getLogger("MIA.InputSanitizer")
         
-        # Nevarne vzorce
-        self.dangerous_patterns = [
-            r'<script[^>]*>.*?</script>',  # XSS
-            r'javascript:',                # JavaScript injection
-            r'on\w+\s*=',                 # Event handlers
-            r'eval\s*\(',                 # Code execution
-            r'exec\s*\(',                 # Code execution
-            r'\|\s*sh',                   # Shell commands
-            r'&&\s*\w+',                  # Command chaining
-            r';\s*rm\s+-rf',              # Dangerous commands
-        ]
-        
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.dangerous_patterns]
+        # Nevarne vzorce - vsi se preverijo v enem prehodu skozi PatternScanner
+        self.scanner = get_pattern_scanner()
+        self.dangerous_patterns = [rule.pattern for rule in DEFAULT_RULES if rule.category == "dangerous"]
     
     def sanitize_string(self, input_str: str) -> str:
         """Sanitiziraj string input"""
@@ -39,9 +32,8 @@ class InputSanitizer:
         # HTML escape
         sanitized = html.escape(input_str)
         
-        # Odstrani nevarne vzorce
-        for pattern in self.compiled_patterns:
-            sanitized = pattern.sub('', sanitized)
+        # Odstrani nevarne vzorce (en prehod za vse vzorce)
+        sanitized, _ = self.scanner.strip(sanitized, {"dangerous"})
         
         # Omeji dolžino
         if len(sanitized) > 10000:
@@ -117,17 +109,10 @@ class InputSanitizer:
             return False
         
         # Preveri za injection napade
-        injection_patterns = [
-            r'ignore\s+previous\s+instructions',
-            r'system\s*:\s*you\s+are',
-            r'jailbreak',
-            r'pretend\s+you\s+are'
-        ]
-        
-        for pattern in injection_patterns:
-            if re.search(pattern, prompt, re.IGNORECASE):
-                self.logger.warning(f"Možen prompt injection: {pattern}")
-                return False
+        matches = self.scanner.scan(prompt, {"prompt_injection"})
+        if matches:
+            self.logger.warning(f"Možen prompt injection: {matches[0].rule_id}")
+            return False
         
         return True
     
@@ -161,19 +146,23 @@ class InputSanitizer:
         return True
 
 # Globalni sanitizer instance
-input_sanitizer = InputSanitizer()
+__getattr__ = lazy_services(__name__, input_sanitizer=InputSanitizer)
+
+def get_input_sanitizer() -> InputSanitizer:
+    """Process-wide input sanitizer, constructed on first use"""
+    return get_service(f"{__name__}.input_sanitizer")
 
 def sanitize_input(data: Any) -> Any:
     """Sanitiziraj input podatke"""
     if isinstance(data, str):
-        return input_sanitizer.sanitize_string(data)
+        return get_input_sanitizer().sanitize_string(data)
     elif isinstance(data, dict):
-        return input_sanitizer.sanitize_dict(data)
+        return get_input_sanitizer().sanitize_dict(data)
     elif isinstance(data, list):
-        return input_sanitizer.sanitize_list(data)
+        return get_input_sanitizer().sanitize_list(data)
     else:
         return data
 
 def validate_input(data: Any, input_type: str = "general") -> bool:
     """Validiraj input podatke"""
-    return input_sanitizer.validate_input(data, input_type)
+    return get_input_sanitizer().validate_input(data, input_type)
@@ -14,6 +14,9 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from mia.core.integrity_engine import IntegrityEngine, hash_file, merkle_root
+from mia.core.service_registry import lazy_services
+
 class IntegrityHashSystem:
 
     def _get_deterministic_time(self) -> float:
@@ -41,6 +44,13 @@ class IntegrityHashSystem:
             "mia/security/cognitive_guard.py"
         ]
         
+        # Shared integrity engine: stat-gated rehash, Merkle root over the tree
+        self.engine = IntegrityEngine(roots=["."], patterns=("*.py",),
+                                      state_path="integrity_engine_state.json")
+        for file_path in self.critical_files:
+            self.engine.track(file_path)
+        self._baseline_root: Optional[str] = None
+        
         # Load existing hashes
         self._load_hash_database()
     
@@ -54,6 +64,9 @@ class IntegrityHashSystem:
         # Generiraj baseline hashes
         self._generate_baseline_hashes()
         
+        # Use inotify events when available so idle checks touch no files
+        self.engine.start_watching()
+        
         # Začni monitoring thread
         self.monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
         self.monitoring_thread.start()
@@ -63,6 +76,7 @@ class IntegrityHashSystem:
     def stop_monitoring(self):
         """Ustavi integrity monitoring"""
         self.is_active = False
+        self.engine.stop_watching()
         if self.monitoring_thread:
             self.monitoring_thread.join(timeout=5)
         
@@ -89,26 +103,28 @@ class IntegrityHashSystem:
         try:
             self.logger.info("Generating baseline integrity hashes...")
             
+            # Only files whose (size, mtime_ns, inode) changed are rehashed
+            self.engine.refresh()
+            entries = self.engine.entries()
+            
             # Hash critical files
             for file_path in self.critical_files:
-                full_path = Path(file_path)
-                if full_path.exists():
-                    file_hash = self._calculate_file_hash(full_path)
-                    self.hash_database[str(full_path)] = {
-                        'hash': file_hash,
+                entry = entries.get(os.path.normpath(file_path))
+                if entry:
+                    self.hash_database[str(Path(file_path))] = {
+                        'hash': entry.digest,
                         'timestamp': self._get_build_timestamp().isoformat(),
-                        'size': full_path.stat().st_size,
+                        'size': entry.signature.size,
                         'type': 'critical'
                     }
             
             # Hash all Python files
-            for py_file in Path('.').rglob('*.py'):
-                if str(py_file) not in self.hash_database:
-                    file_hash = self._calculate_file_hash(py_file)
-                    self.hash_database[str(py_file)] = {
-                        'hash': file_hash,
+            for py_file, entry in entries.items():
+                if py_file not in self.hash_database:
+                    self.hash_database[py_file] = {
+                        'hash': entry.digest,
                         'timestamp': self._get_build_timestamp().isoformat(),
-                        'size': py_file.stat().st_size,
+                        'size': entry.signature.size,
                         'type': 'standard'
                     }
             
@@ -123,13 +139,7 @@ class IntegrityHashSystem:
     def _calculate_file_hash(self, file_path: Path) -> str:
         """Izračunaj hash datoteke"""
         try:
-            hasher = hashlib.sha256()
-            
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
-            
-            return hasher.hexdigest()
+            return hash_file(str(file_path))
             
         except Exception as e:
             self.logger.error(f"File hash calculation error for {file_path}: {e}")
@@ -140,10 +150,23 @@ class IntegrityHashSystem:
         violations = []
         
         try:
+            self.engine.refresh()
+            
+            # Fast path: identical Merkle roots mean every baseline file is unchanged
+            if self.engine.root_hash() == self._get_baseline_root():
+                return violations
+            
+            entries = self.engine.entries()
+            
             for file_path, stored_data in self.hash_database.items():
-                path_obj = Path(file_path)
+                entry = entries.get(os.path.normpath(file_path))
+                if entry is None and Path(file_path).exists():
+                    # Baseline file outside the engine's roots/patterns
+                    self.engine.track(file_path)
+                    self.engine.digest(file_path)
+                    entry = self.engine.entries().get(os.path.normpath(file_path))
                 
-                if not path_obj.exists():
+                if entry is None:
                     violations.append({
                         'type': 'file_missing',
                         'file': file_path,
@@ -152,8 +175,8 @@ class IntegrityHashSystem:
                     })
                     continue
                 
-                # Calculate current hash
-                current_hash = self._calculate_file_hash(path_obj)
+                # Current hash from the engine (no file read unless it changed)
+                current_hash = entry.digest
                 stored_hash = stored_data['hash']
                 
                 if current_hash != stored_hash:
@@ -167,7 +190,7 @@ class IntegrityHashSystem:
                     })
                 
                 # Check file size
-                current_size = path_obj.stat().st_size
+                current_size = entry.signature.size
                 stored_size = stored_data['size']
                 
                 if abs(current_size - stored_size) > 1000:  # 1KB tolerance
@@ -316,6 +339,8 @@ Please investigate immediately.
                 
                 self.logger.info(f"Loaded {len(self.hash_database)} hashes from database")
             
+            self._baseline_root = None
+            
         except Exception as e:
             self.logger.error(f"Hash database load error: {e}")
             self.hash_database = {}
@@ -323,18 +348,28 @@ Please investigate immediately.
     def _save_hash_database(self):
         """Shrani hash database"""
         try:
+            self._baseline_root = None
             with open(self.hash_file, 'w') as f:
                 json.dump(self.hash_database, f, indent=2)
             
         except Exception as e:
             self.logger.error(f"Hash database save error: {e}")
     
+    def _get_baseline_root(self) -> str:
+        """Merkle root of the baseline hash database (recomputed only after it changes)"""
+        if self._baseline_root is None:
+            self._baseline_root = merkle_root(
+                {path: data['hash'] for path, data in self.hash_database.items()}
+            )
+        return self._baseline_root
+    
     def update_file_hash(self, file_path: str):
         """Posodobi hash datoteke"""
         try:
             path_obj = Path(file_path)
             if path_obj.exists():
-                file_hash = self._calculate_file_hash(path_obj)
+                self.engine.track(file_path)
+                file_hash = self.engine.digest(file_path)
                 self.hash_database[file_path] = {
                     'hash': file_hash,
                     'timestamp': self._get_build_timestamp().isoformat(),
@@ -368,4 +403,4 @@ Please investigate immediately.
             return {'status': 'ERROR', 'error': str(e)}
 
 # Globalni integrity hash system
-integrity_hash_system = IntegrityHashSystem()
+__getattr__ = lazy_services(__name__, integrity_hash_system=IntegrityHashSystem)
@@ -13,6 +13,7 @@ from urllib.parse import urlparse
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from mia.core.service_registry import lazy_services
 
 class NetworkSecurityManager:
     """Network security manager"""
@@ -157,4 +158,4 @@ class NetworkSecurityManager:
             return {}
 
 # Globalni network security manager
-network_security = NetworkSecurityManager()
+__getattr__ = lazy_services(__name__, network_security=NetworkSecurityManager)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+🔎 Pattern Scanner
+==================
+
+Compiled multi-pattern matching engine shared by InputSanitizer and
+BehaviorFirewall. All regex rules of a category set are folded into a
+single alternation and literal rules into an Aho-Corasick automaton
+(pyahocorasick when installed, otherwise the same combined regex), so a
+payload is scanned once and every match is reported with its rule ID and
+position. Verdicts for repeated identical inputs are cached.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """Single detection rule"""
+    rule_id: str
+    pattern: str
+    category: str
+    literal: bool = False
+    ignore_case: bool = True
+
+
+@dataclass(frozen=True)
+class ScanMatch:
+    """Rule hit inside a scanned payload"""
+    rule_id: str
+    category: str
+    start: int
+    end: int
+    text: str
+
+
+DEFAULT_RULES: Tuple[ScanRule, ...] = (
+    # Content stripped by InputSanitizer.sanitize_string
+    ScanRule("xss_script_tag", r"<script[^>]*>.*?</script>", "dangerous"),
+    ScanRule("js_uri", r"javascript:", "dangerous"),
+    ScanRule("event_handler", r"on\w+\s*=", "dangerous"),
+    ScanRule("eval_call", r"eval\s*\(", "dangerous"),
+    ScanRule("exec_call", r"exec\s*\(", "dangerous"),
+    ScanRule("shell_pipe", r"\|\s*sh", "dangerous"),
+    ScanRule("command_chain", r"&&\s*\w+", "dangerous"),
+    ScanRule("rm_rf", r";\s*rm\s+-rf", "dangerous"),
+    # Prompt injection, checked by prompt validation and the behavior firewall
+    ScanRule("ignore_previous", r"ignore\s+previous\s+instructions", "prompt_injection"),
+    ScanRule("system_role", r"system\s*:\s*you\s+are", "prompt_injection"),
+    ScanRule("jailbreak", "jailbreak", "prompt_injection", literal=True),
+    ScanRule("pretend_role", r"pretend\s+you\s+are", "prompt_injection"),
+)
+
+
+def _first_chars(rule: ScanRule) -> Optional[Set[str]]:
+    """Characters a match of ``rule`` can start with, or None if unknown"""
+    pattern = rule.pattern
+    if not pattern:
+        return None
+    if rule.literal:
+        first, rest = pattern[0], ""
+    elif pattern[0] == "\\" and len(pattern) > 1 and not pattern[1].isalnum():
+        first, rest = pattern[1], pattern[2:]
+    elif pattern[0].isalnum() or pattern[0] in "<>;:&=!@#%'\"/,~`-":
+        first, rest = pattern[0], pattern[1:]
+    else:
+        return None
+    # Optional first atom or a top-level alternation can start anywhere else
+    if rest[:1] in ("?", "*", "{") or (not rule.literal and _has_top_level_alternation(pattern)):
+        return None
+    return {first.lower(), first.upper()} if rule.ignore_case else {first}
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+class _CompiledSet:
+    """One automaton for a fixed set of rules"""
+
+    def __init__(self, rules: List[ScanRule]):
+        self.rules = {rule.rule_id: rule for rule in rules}
+        self.group_to_rule: Dict[str, str] = {}
+
+        literals = [r for r in rules if r.literal]
+        self.automaton = None
+        if literals and AHOCORASICK_AVAILABLE:
+            self.automaton = ahocorasick.Automaton()
+            for rule in literals:
+                self.automaton.add_word(rule.pattern.lower(), (rule.rule_id, len(rule.pattern)))
+            self.automaton.make_automaton()
+            regex_rules = [r for r in rules if not r.literal]
+        else:
+            regex_rules = list(rules)
+
+        parts = []
+        for i, rule in enumerate(regex_rules):
+            group = f"r{i}"
+            self.group_to_rule[group] = rule.rule_id
+            body = re.escape(rule.pattern) if rule.literal else rule.pattern
+            flags = "i" if rule.ignore_case else "-i"
+            parts.append(f"(?P<{group}>(?{flags}:{body}))")
+        self.regex = None
+        if parts:
+            combined = "|".join(parts)
+            # sre tries every branch at every offset; a first-character
+            # lookahead lets it skip positions no rule can start at
+            starts = [_first_chars(rule) for rule in regex_rules]
+            if all(starts):
+                charset = "".join(sorted(re.escape(c) for c in set().union(*starts)))
+                combined = f"(?=[{charset}])(?:{combined})"
+            self.regex = re.compile(combined)
+
+    def scan(self, text: str) -> List[ScanMatch]:
+        matches: List[ScanMatch] = []
+        if self.regex is not None:
+            for m in self.regex.finditer(text):
+                rule = self.rules[self.group_to_rule[m.lastgroup]]
+                matches.append(ScanMatch(rule.rule_id, rule.category, m.start(), m.end(), m.group()))
+        if self.automaton is not None:
+            for end, (rule_id, length) in self.automaton.iter(text.lower()):
+                rule = self.rules[rule_id]
+                start = end - length + 1
+                matches.append(ScanMatch(rule_id, rule.category, start, end + 1, text[start:end + 1]))
+            matches.sort(key=lambda m: (m.start, m.end))
+        return matches
+
+
+class PatternScanner:
+    """Single-pass multi-pattern scanner with a verdict cache"""
+
+    def __init__(self, rules: Iterable[ScanRule] = DEFAULT_RULES, cache_size: int = 4096,
+                 max_cached_length: int = 65536):
+        self.rules: Tuple[ScanRule, ...] = tuple(rules)
+        self.categories: FrozenSet[str] = frozenset(r.category for r in self.rules)
+        self.cache_size = cache_size
+        self.max_cached_length = max_cached_length
+
+        self._compiled: Dict[FrozenSet[str], _CompiledSet] = {}
+        self._cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"scans": 0, "cache_hits": 0, "bytes_scanned": 0}
+
+    def _compiled_for(self, categories: Optional[Iterable[str]]) -> Tuple[FrozenSet[str], _CompiledSet]:
+        key = self.categories if categories is None else frozenset(categories)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = _CompiledSet([r for r in self.rules if r.category in key])
+            with self._lock:
+                self._compiled.setdefault(key, compiled)
+        return key, compiled
+
+    def scan(self, text: str, categories: Optional[Iterable[str]] = None) -> List[ScanMatch]:
+        """All non-overlapping rule matches in ``text`` (leftmost first)"""
+        key, compiled = self._compiled_for(categories)
+        cacheable = len(text) <= self.max_cached_length
+        if cacheable:
+            with self._lock:
+                cached = self._cache.get((key, text))
+                if cached is not None:
+                    self._cache.move_to_end((key, text))
+                    self.stats["cache_hits"] += 1
+                    return list(cached)
+
+        matches = compiled.scan(text)
+
+        with self._lock:
+            self.stats["scans"] += 1
+            self.stats["bytes_scanned"] += len(text)
+            if cacheable:
+                self._cache[(key, text)] = tuple(matches)
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return matches
+
+    def is_clean(self, text: str, categories: Optional[Iterable[str]] = None) -> bool:
+        return not self.scan(text, categories)
+
+    def strip(self, text: str, categories: Optional[Iterable[str]] = None) -> Tuple[str, int]:
+        """Remove every match until none is left; returns (clean_text, removed_count)
+
+        Removing a match can join the text around it into a new one
+        ("ejavascript:val(" -> "eval("), so passes repeat until one removes nothing.
+        """
+        key, compiled = self._compiled_for(categories)
+        cache_key = (key, text, "strip")
+        cacheable = len(text) <= self.max_cached_length
+        if cacheable:
+            with self._lock:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache.move_to_end(cache_key)
+                    self.stats["cache_hits"] += 1
+                    return cached
+
+        clean, removed = text, 0
+        while True:
+            clean, count = self._strip_once(compiled, clean)
+            if not count:
+                break
+            removed += count
+        result = (clean, removed)
+
+        with self._lock:
+            self.stats["scans"] += 1
+            self.stats["bytes_scanned"] += len(text)
+            if cacheable:
+                self._cache[cache_key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _strip_once(compiled, text: str) -> Tuple[str, int]:
+        """One pass removing all non-overlapping matches"""
+        if compiled.automaton is None:
+            return compiled.regex.subn("", text) if compiled.regex is not None else (text, 0)
+        matches = compiled.scan(text)
+        pieces = []
+        position = 0
+        for match in matches:
+            if match.start < position:
+                continue
+            pieces.append(text[position:match.start])
+            position = match.end
+        pieces.append(text[position:])
+        return "".join(pieces), len(matches)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_default_scanner: Optional[PatternScanner] = None
+_default_lock = threading.Lock()
+
+
+def get_pattern_scanner() -> PatternScanner:
+    """Shared scanner with the default rule set"""
+    global _default_scanner
+    if _default_scanner is None:
+        with _default_lock:
+            if _default_scanner is None:
+                _default_scanner = PatternScanner()
+    return _default_scanner
+
+
+def benchmark_pattern_scanner(payload_kb: int = 256, repeats: int = 5) -> Dict[str, Any]:
+    """Throughput (MB/s) of the combined scanner vs. sequential per-pattern substitution"""
+    import html
+    import random
+
+    rng = random.Random(7)
+    clean_words = ["hello", "world", "memory", "mia", "learning", "data", "the", "a"]
+    hostile_words = clean_words + ["onclick=", "eval(", "javascript:", "<b>", "| sh"]
+
+    def payload(words: List[str]) -> str:
+        text = " ".join(rng.choice(words) for _ in range(payload_kb * 1024 // 5))
+        return html.escape(text[:payload_kb * 1024])
+
+    def best(fn) -> float:
+        elapsed = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            elapsed = min(elapsed, time.perf_counter() - start)
+        return elapsed
+
+    # Default rules plus a rule library of the size production deployments load
+    extra_rules = [ScanRule(f"kw_{i}", rf"forbidden{i}\s*\(", "dangerous") for i in range(40)]
+    results: Dict[str, Any] = {}
+    for label, rules in (("default_rules", list(DEFAULT_RULES)), ("48_rules", list(DEFAULT_RULES) + extra_rules)):
+        compiled = [re.compile(r.pattern, re.IGNORECASE) for r in rules if r.category == "dangerous"]
+        scanner = PatternScanner(rules, cache_size=0)
+        for kind, words in (("clean", clean_words), ("hostile", hostile_words)):
+            text = payload(words)
+            size_mb = len(text) / (1024 * 1024)
+
+            def sequential():
+                out = text
+                for pattern in compiled:
+                    out = pattern.sub("", out)
+                return out
+
+            results[f"{label}_{kind}"] = {
+                "sequential_mb_per_sec": size_mb / best(sequential),
+                "single_pass_mb_per_sec": size_mb / best(lambda: scanner.strip(text, {"dangerous"})),
+            }
+
+    cached = PatternScanner()
+    prompt = payload(clean_words)[:4096]
+    cached.scan(prompt, {"prompt_injection"})
+    results["cached_4kb_verdict_us"] = best(lambda: cached.scan(prompt, {"prompt_injection"})) * 1e6
+    return results
+
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(benchmark_pattern_scanner(), indent=2))
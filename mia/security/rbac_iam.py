@@ -12,6 +12,7 @@ from typing import Dict, List, Set, Optional, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
+from mia.core.service_registry import get_service, lazy_services
 
 class Permission(Enum):
 
@@ -248,7 +249,11 @@ class RBACEngine:
         return False
 
 # Globalni RBAC engine
-rbac_engine = RBACEngine()
+__getattr__ = lazy_services(__name__, rbac_engine=RBACEngine)
+
+def get_rbac_engine() -> RBACEngine:
+    """Globalni RBAC engine, ustvarjen ob prvi uporabi"""
+    return get_service(f"{__name__}.rbac_engine")
 
 def require_permission(permission: Permission):
     """Decorator za preverjanje dovoljenj"""
@@ -256,7 +261,7 @@ def require_permission(permission: Permission):
         def wrapper(*args, **kwargs):
             session_id = kwargs.get('session_id') or (args[0] if args else None)
             
-            if not session_id or not rbac_engine.check_permission(session_id, permission):
+            if not session_id or not get_rbac_engine().check_permission(session_id, permission):
                 raise PermissionError(f"Insufficient permissions for {permission.value}")
             
             return func(*args, **kwargs)
@@ -77,6 +77,7 @@ import signal
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from contextlib import contextmanager
+from mia.core.service_registry import lazy_services
 
 class SandboxEnvironment:
 
@@ -344,5 +345,4 @@ class ContentSandbox:
             return None
 
 # Globalni sandbox instances
-sandbox_environment = SandboxEnvironment()
-content_sandbox = ContentSandbox()
+__getattr__ = lazy_services(__name__, sandbox_environment=SandboxEnvironment, content_sandbox=ContentSandbox)
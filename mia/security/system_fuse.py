@@ -76,6 +76,9 @@ from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from mia.core.telemetry import get_telemetry
+from mia.core.service_registry import lazy_services
+
 class FuseType(Enum):
 
     def _get_deterministic_time(self) -> float:
@@ -228,7 +231,7 @@ class SystemFuse:
             fuse_definitions = self.config.get("fuse_definitions", {})
             
             for fuse_name, fuse_config in fuse_definitions.items():
-                fuse_id = f"fuse_{fuse_name}_{int(self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200)}"
+                fuse_id = f"fuse_{fuse_name}_{int(self._get_deterministic_time() if hasattr(self, '_get_deterministic_time') else 1640995200)}"
                 
                 fuse = FuseConfiguration(
                     fuse_id=fuse_id,
@@ -333,19 +336,19 @@ class SystemFuse:
         """Get current value for fuse type"""
         try:
             if fuse_type == FuseType.MEMORY_FUSE:
-                return psutil.virtual_memory().percent
+                return get_telemetry().latest().memory_percent
             
             elif fuse_type == FuseType.CPU_FUSE:
-                return psutil.cpu_percent(interval=1)
+                return get_telemetry().latest().cpu_percent
             
             elif fuse_type == FuseType.DISK_FUSE:
-                disk_usage = psutil.disk_usage('/')
-                return (disk_usage.used / disk_usage.total) * 100
+                snapshot = get_telemetry().latest()
+                return (snapshot.disk_used / snapshot.disk_total) * 100
             
             elif fuse_type == FuseType.PROCESS_FUSE:
                 # Check for runaway processes
                 max_memory_percent = 0.0
-                total_memory = psutil.virtual_memory().total
+                total_memory = get_telemetry().latest().memory_total
                 
                 for proc in psutil.process_iter(['pid', 'memory_info']):
                     try:
@@ -370,7 +373,7 @@ class SystemFuse:
             self.fuse_states[fuse.fuse_id] = FuseState.TRIGGERED
             
             # Create trigger event
-            event_id = f"trigger_{fuse.fuse_id}_{int(self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200)}"
+            event_id = f"trigger_{fuse.fuse_id}_{int(self._get_deterministic_time() if hasattr(self, '_get_deterministic_time') else 1640995200)}"
             
             trigger_event = FuseTriggerEvent(
                 event_id=event_id,
@@ -456,7 +459,7 @@ class SystemFuse:
             # Save alert to file
             alert_file = self.fuse_dir / "critical_alerts.log"
             with open(alert_file, 'a') as f:
-                f.write(f"{self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200}: {alert_message}\n")
+                f.write(f"{self._get_deterministic_time() if hasattr(self, '_get_deterministic_time') else 1640995200}: {alert_message}\n")
             
         except Exception as e:
             self.logger.error(f"Failed to log alert: {e}")
@@ -513,6 +516,7 @@ class SystemFuse:
         try:
             # Save critical state
             state_file = self.fuse_dir / "emergency_state.json"
+            snapshot = get_telemetry().latest()
             emergency_state = {
                 "timestamp": self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200,
                 "fuse_id": fuse.fuse_id,
@@ -520,9 +524,9 @@ class SystemFuse:
                 "trigger_value": trigger.trigger_value,
                 "description": trigger.description,
                 "system_state": {
-                    "memory_percent": psutil.virtual_memory().percent,
-                    "cpu_percent": psutil.cpu_percent(),
-                    "disk_percent": (psutil.disk_usage('/').used / psutil.disk_usage('/').total) * 100
+                    "memory_percent": snapshot.memory_percent,
+                    "cpu_percent": snapshot.cpu_percent,
+                    "disk_percent": (snapshot.disk_used / snapshot.disk_total) * 100
                 }
             }
             
@@ -591,4 +595,4 @@ class SystemFuse:
             }
 
 # Global instance
-system_fuse = SystemFuse()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, system_fuse=SystemFuse)
\ No newline at end of file
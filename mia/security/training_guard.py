@@ -11,6 +11,7 @@ import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import os
+from mia.core.service_registry import lazy_services
 
 class TrainingGuard:
 
@@ -281,21 +282,20 @@ class TrainingGuard:
     def _check_system_resources(self) -> bool:
         """Preveri sistem resources"""
         try:
-            import psutil
+            from mia.core.telemetry import get_telemetry
+            
+            snapshot = get_telemetry().latest()
             
             # CPU check
-            cpu_percent = psutil.cpu_percent(interval=1)
-            if cpu_percent > 90:
+            if snapshot.cpu_percent > 90:
                 return False
             
             # Memory check
-            memory = psutil.virtual_memory()
-            if memory.percent > 90:
+            if snapshot.memory_percent > 90:
                 return False
             
             # Disk space check
-            disk = psutil.disk_usage('/')
-            if disk.percent > 90:
+            if snapshot.disk_percent > 90:
                 return False
             
             return True
@@ -322,4 +322,4 @@ class TrainingGuard:
             return 0.0
 
 # Globalni training guard
-training_guard = TrainingGuard()
+__getattr__ = lazy_services(__name__, training_guard=TrainingGuard)
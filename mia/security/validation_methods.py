@@ -12,6 +12,7 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
+from mia.core.service_registry import lazy_services
 
 class ValidationHandler:
     """Handler for validation methods"""
@@ -264,4 +265,4 @@ class ValidationHandler:
             }
 
 # Create global instance
-validation_handler = ValidationHandler()
+__getattr__ = lazy_services(__name__, validation_handler=ValidationHandler)
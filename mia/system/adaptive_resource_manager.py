@@ -16,6 +16,9 @@ from typing import Dict, Any, Optional, Callable
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+from mia.core.hardware_profile import get_hardware_profile
+from mia.core.telemetry import get_telemetry
+
 # GPU detection (optional)
 try:
     import GPUtil
@@ -101,33 +104,17 @@ class AdaptiveResourceManager:
     def detect_system_capabilities(self) -> SystemCapabilities:
         """Zaznaj sistemske zmogljivosti"""
         try:
-            # CPU info
-            cpu_info = psutil.cpu_freq()
-            cpu_cores = psutil.cpu_count()
-            cpu_frequency = cpu_info.max if cpu_info else 0
-            
-            # Memory info
-            memory = psutil.virtual_memory()
-            total_memory_gb = memory.total / (1024**3)
-            available_memory_gb = memory.available / (1024**3)
+            # Statični podatki iz predpomnjenega profila, spremenljivi iz telemetrije
+            profile = get_hardware_profile()
+            snapshot = get_telemetry().latest()
             
-            # GPU info
-            gpu_available = False
-            gpu_memory_gb = 0
-            
-            if GPU_AVAILABLE:
-                try:
-                    gpus = GPUtil.getGPUs()
-                    if gpus:
-                        gpu = gpus[0]  # Primary GPU
-                        gpu_available = True
-                        gpu_memory_gb = gpu.memoryTotal / 1024  # Convert MB to GB
-                except Exception as e:
-                    logger.warning(f"GPU detection failed: {e}")
-            
-            # Disk info
-            disk = psutil.disk_usage('/')
-            disk_free_gb = disk.free / (1024**3)
+            cpu_cores = profile.cpu_logical_cores
+            cpu_frequency = profile.cpu_frequency_mhz
+            total_memory_gb = profile.ram_total_gb
+            available_memory_gb = snapshot.memory_available_gb
+            gpu_available = profile.gpu_available
+            gpu_memory_gb = profile.gpu_memory_gb
+            disk_free_gb = snapshot.disk_free_gb
             
             self.capabilities = SystemCapabilities(
                 cpu_cores=cpu_cores,
@@ -204,12 +191,13 @@ class AdaptiveResourceManager:
     def get_current_usage(self) -> CurrentUsage:
         """Pridobi trenutno uporabo virov"""
         try:
+            snapshot = get_telemetry().latest()
+            
             # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = snapshot.cpu_percent
             
             # Memory usage
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
+            memory_percent = snapshot.memory_percent
             
             # GPU usage
             gpu_percent = 0.0
@@ -222,8 +210,7 @@ class AdaptiveResourceManager:
                     pass
                     
             # Disk usage
-            disk = psutil.disk_usage('/')
-            disk_percent = (disk.used / disk.total) * 100
+            disk_percent = (snapshot.disk_used / snapshot.disk_total) * 100
             
             # Count MIA processes (simplified)
             mia_processes = len([p for p in psutil.process_iter(['name']) 
@@ -235,7 +222,7 @@ class AdaptiveResourceManager:
                 gpu_percent=gpu_percent,
                 disk_usage_percent=disk_percent,
                 mia_processes=mia_processes,
-                timestamp=time.time()
+                timestamp=snapshot.timestamp
             )
             
             return self.current_usage
@@ -244,9 +231,10 @@ class AdaptiveResourceManager:
             logger.error(f"Error getting current usage: {e}")
             return CurrentUsage(0, 0, 0, 0, 0, time.time())
             
-    def is_system_overloaded(self) -> Dict[str, bool]:
+    def is_system_overloaded(self, usage: Optional[CurrentUsage] = None) -> Dict[str, bool]:
         """Preveri, ali je sistem preobremenjeni"""
-        usage = self.get_current_usage()
+        if usage is None:
+            usage = self.get_current_usage()
         limits = self.resource_limits
         
         overload_status = {
@@ -318,7 +306,7 @@ class AdaptiveResourceManager:
             try:
                 # Get current usage
                 usage = self.get_current_usage()
-                overload = self.is_system_overloaded()
+                overload = self.is_system_overloaded(usage)
                 
                 # Log status
                 logger.debug(f"Resource usage: CPU={usage.cpu_percent:.1f}%, "
@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
+from mia.core.service_registry import lazy_services
 
 class TestType(Enum):
 
@@ -562,4 +563,4 @@ class EnterpriseTestSuite:
             return {"error": str(e)}
 
 # Global instance
-enterprise_test_suite = EnterpriseTestSuite()
\ No newline at end of file
+__getattr__ = lazy_services(__name__, enterprise_test_suite=EnterpriseTestSuite)
@@ -14,7 +14,8 @@ import logging
 import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-import psutil
+
+from mia.core.telemetry import get_telemetry
 
 
 class ValidationUtils:
@@ -57,11 +58,12 @@ class ValidationUtils:
     @staticmethod
     def get_system_metrics() -> Dict[str, Any]:
         """Get current system metrics"""
+        snapshot = get_telemetry().latest()
         return {
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "memory_percent": psutil.virtual_memory().percent,
-            "disk_usage": psutil.disk_usage('/').percent,
-            "timestamp": time.time()
+            "cpu_percent": snapshot.cpu_percent,
+            "memory_percent": snapshot.memory_percent,
+            "disk_usage": snapshot.disk_percent,
+            "timestamp": snapshot.timestamp
         }
     
     @staticmethod
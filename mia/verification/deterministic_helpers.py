@@ -10,6 +10,7 @@ import hashlib
 import json
 from typing import Any, Dict, List, Optional
 from datetime import datetime
+from mia.core.service_registry import lazy_services
 
 class DeterministicHelpers:
     """Helpers for deterministic behavior"""
@@ -38,7 +39,7 @@ class DeterministicHelpers:
     def get_seeded_random(self, seed: int = 42):
         """Get seeded random generator"""
         import random
-        deterministic_helpers.get_seeded_random().seed(seed)
+        random.seed(seed)
         return random
     
     def normalize_data(self, data: Any) -> str:
@@ -57,4 +58,4 @@ class DeterministicHelpers:
         return hasher.hexdigest()
 
 # Global instance
-deterministic_helpers = DeterministicHelpers()
+__getattr__ = lazy_services(__name__, deterministic_helpers=DeterministicHelpers)
@@ -7,6 +7,7 @@ Essential methods for verification module production readiness.
 """
 
 from typing import Dict, List, Any, Optional
+from mia.core.service_registry import lazy_services
 class VerificationEssentialMethods:
     """Essential methods for verification module"""
     
@@ -154,4 +155,4 @@ class VerificationEssentialMethods:
             }
 
 # Global instance
-verification_essential = VerificationEssentialMethods()
+__getattr__ = lazy_services(__name__, verification_essential=VerificationEssentialMethods)
@@ -10,6 +10,7 @@ import sys
 import os
 from typing import Any, Dict, List, Optional, Callable
 from contextlib import contextmanager
+from mia.core.service_registry import lazy_services
 
 class IsolationWrapper:
     """Wrapper for module isolation"""
@@ -61,4 +62,4 @@ class IsolationWrapper:
         }
 
 # Global instance
-isolation_wrapper = IsolationWrapper()
+__getattr__ = lazy_services(__name__, isolation_wrapper=IsolationWrapper)
@@ -38,6 +38,7 @@ try:
     from mia_multimodal_system import MIAMultimodalSystem
     from mia_project_system import MIAProjectSystem
     from mia_web_interface import MIAWebInterface
+    from mia.core.startup_orchestrator import ResourceClass, StartupOrchestrator, StartupStep
 except ImportError as e:
     print(f"❌ Critical import error: {e}")
     print("Ensure all MIA modules are properly installed")
@@ -84,6 +85,7 @@ class MIAEnterpriseLauncher:
         self.services = {}
         self.health_monitor = None
         self.performance_optimizer = None
+        self.startup: Optional[StartupOrchestrator] = None
         
         # System state
         self.system_ready = False
@@ -191,19 +193,15 @@ class MIAEnterpriseLauncher:
         try:
             self.logger.info("🚀 Starting MIA Enterprise AGI System...")
             
-            # Pre-flight checks
-            if not await self._preflight_checks():
+            # Checks, services and monitoring start as a dependency graph;
+            # voice, multimodal and projects follow once the web interface is up
+            self.startup = StartupOrchestrator(self._startup_steps(), ready_step="start_web", name="enterprise")
+            success = await self.startup.run()
+            if not self.startup.results["preflight"].succeeded:
                 self.logger.error("❌ Pre-flight checks failed")
                 return False
-            
-            # Initialize core systems
-            await self._initialize_core_systems()
-            
-            # Start services
-            await self._start_services()
-            
-            # Start monitoring
-            await self._start_monitoring()
+            if not success:
+                raise RuntimeError(f"Startup failed: {self.startup.get_report()['steps']}")
             
             # System ready
             self.system_ready = True
@@ -221,31 +219,59 @@ class MIAEnterpriseLauncher:
             self.logger.error(f"❌ Failed to start system: {e}")
             return False
     
-    async def _preflight_checks(self) -> bool:
-        """Perform pre-flight system checks"""
-        self.logger.info("🔍 Performing pre-flight checks...")
-        
-        checks = [
-            ("System resources", self._check_system_resources),
-            ("Network connectivity", self._check_network),
-            ("Data directories", self._check_data_directories),
-            ("Dependencies", self._check_dependencies),
-            ("Ports availability", self._check_ports)
+    def _startup_steps(self) -> List[StartupStep]:
+        """Startup steps with their dependencies"""
+        services = self.config["services"]
+        checks = {
+            "check_resources": ("System resources", self._check_system_resources),
+            "check_network": ("Network connectivity", self._check_network),
+            "check_directories": ("Data directories", self._check_data_directories),
+            "check_dependencies": ("Dependencies", self._check_dependencies),
+            "check_ports": ("Ports availability", self._check_ports)
+        }
+        steps = [
+            StartupStep(step_name, lambda name=name, func=func: self._run_check(name, func), timeout=10.0)
+            for step_name, (name, func) in checks.items()
         ]
-        
-        all_passed = True
-        for check_name, check_func in checks:
-            try:
-                result = await check_func() if asyncio.iscoroutinefunction(check_func) else check_func()
-                status = "✅" if result else "❌"
-                self.logger.info(f"  {status} {check_name}")
-                if not result:
-                    all_passed = False
-            except Exception as e:
-                self.logger.error(f"  ❌ {check_name}: {e}")
-                all_passed = False
-        
-        return all_passed
+        steps += [
+            StartupStep("preflight", lambda: self._require_checks(list(checks)), depends_on=list(checks),
+                        resource=ResourceClass.CPU),
+            StartupStep("core", lambda: self._create_service("core", MIACore, str(self.data_path)),
+                        depends_on=["preflight"], resource=ResourceClass.CPU),
+            StartupStep("start_core", self._start_core_service, depends_on=["core"]),
+            StartupStep("web", lambda: self._create_service("web", MIAWebInterface, str(self.data_path),
+                                                            port=services["web"]["port"]),
+                        depends_on=["preflight"], condition=lambda: services["web"]["enabled"]),
+            StartupStep("start_web", self._start_web_service, depends_on=["web"],
+                        condition=lambda: "web" in self.services),
+            StartupStep("monitoring", self._start_monitoring, depends_on=["start_core"]),
+            StartupStep("voice", lambda: self._create_service("voice", MIAVoiceSystem, self.data_path),
+                        depends_on=["preflight"], optional=True, condition=lambda: services["voice"]["enabled"]),
+            StartupStep("multimodal", lambda: self._create_service("multimodal", MIAMultimodalSystem,
+                                                                   str(self.data_path)),
+                        depends_on=["preflight"], optional=True,
+                        condition=lambda: services["multimodal"]["enabled"]),
+            StartupStep("projects", lambda: self._create_service("projects", MIAProjectSystem, self.data_path),
+                        depends_on=["preflight"], optional=True, condition=lambda: services["projects"]["enabled"])
+        ]
+        return steps
+    
+    def _run_check(self, check_name: str, check_func) -> bool:
+        """Run one pre-flight check"""
+        try:
+            result = check_func()
+            status = "✅" if result else "❌"
+            self.logger.info(f"  {status} {check_name}")
+            return bool(result)
+        except Exception as e:
+            self.logger.error(f"  ❌ {check_name}: {e}")
+            return False
+    
+    def _require_checks(self, step_names: List[str]):
+        """Fail startup unless every pre-flight check passed"""
+        failed = [name for name in step_names if not self.startup.results[name].value]
+        if failed:
+            raise RuntimeError(f"Pre-flight checks failed: {', '.join(failed)}")
     
     def _check_system_resources(self) -> bool:
         """Check system resources"""
@@ -316,48 +342,26 @@ class MIAEnterpriseLauncher:
         
         return True
     
-    async def _initialize_core_systems(self):
-        """Initialize core MIA systems"""
-        self.logger.info("🧠 Initializing core systems...")
-        
-        # Initialize MIA Core
-        self.services['core'] = MIACore(str(self.data_path))
-        
-        # Initialize subsystems based on config
-        if self.config["services"]["voice"]["enabled"]:
-            self.services['voice'] = MIAVoiceSystem(self.data_path)
-        
-        if self.config["services"]["multimodal"]["enabled"]:
-            self.services['multimodal'] = MIAMultimodalSystem(str(self.data_path))
-        
-        if self.config["services"]["projects"]["enabled"]:
-            self.services['projects'] = MIAProjectSystem(self.data_path)
-        
-        if self.config["services"]["web"]["enabled"]:
-            self.services['web'] = MIAWebInterface(
-                str(self.data_path),
-                port=self.config["services"]["web"]["port"]
-            )
+    def _create_service(self, name: str, service_class, *args, **kwargs):
+        """Initialize one MIA system"""
+        self.logger.info(f"🧠 Initializing {name}...")
+        self.services[name] = service_class(*args, **kwargs)
+        return self.services[name]
     
-    async def _start_services(self):
-        """Start all enabled services"""
-        self.logger.info("🔧 Starting services...")
-        
-        # Start core service
-        if 'core' in self.services:
-            self.services['core'].start()
-            self.logger.info("  ✅ Core service started")
-        
-        # Start web interface
-        if 'web' in self.services:
-            # Start web interface in background thread
-            web_thread = threading.Thread(
-                target=self.services['web'].run,
-                kwargs={'host': '0.0.0.0', 'port': self.config["services"]["web"]["port"]},
-                daemon=True
-            )
-            web_thread.start()
-            self.logger.info(f"  ✅ Web interface started on port {self.config['services']['web']['port']}")
+    def _start_core_service(self):
+        """Start core service"""
+        self.services['core'].start()
+        self.logger.info("  ✅ Core service started")
+    
+    def _start_web_service(self):
+        """Start web interface in background thread"""
+        web_thread = threading.Thread(
+            target=self.services['web'].run,
+            kwargs={'host': '0.0.0.0', 'port': self.config["services"]["web"]["port"]},
+            daemon=True
+        )
+        web_thread.start()
+        self.logger.info(f"  ✅ Web interface started on port {self.config['services']['web']['port']}")
     
     async def _start_monitoring(self):
         """Start system monitoring"""
@@ -21,14 +21,17 @@ sys.path.insert(0, str(project_root))
 
 # Import MIA core systems
 try:
-    from mia.core.agi_core import agi_core, initialize_agi, shutdown_agi
-    from mia.core.model_discovery import model_discovery, discover_models
-    from mia.core.model_learning import model_learning, start_learning_from_models
-    from mia.interfaces.chat import chat_interface
-    from mia.enterprise.security import security_manager
-    from mia.enterprise.analytics import analytics
-    from mia.enterprise.api_gateway import api_gateway
+    # Subsystems are constructed on first use, not at import
+    from mia.core.agi_core import initialize_agi, shutdown_agi
+    from mia.core.model_discovery import get_model_discovery, discover_models
+    from mia.core.model_learning import get_model_learning, start_learning_from_models
+    from mia.interfaces.chat import get_chat_interface
+    from mia.enterprise.security import get_security_manager
+    from mia.enterprise.analytics import get_analytics
+    from mia.enterprise.api_gateway import get_api_gateway
     from mia.modules.ui.web import MIAWebUI
+    from mia.core.startup_orchestrator import ResourceClass, StartupOrchestrator, StartupStep
+    from mia.core.service_registry import get_registry
 except ImportError as e:
     print(f"❌ Critical import error: {e}")
     print("Ensure all MIA modules are properly installed")
@@ -41,6 +44,7 @@ class MIADesktopApp:
         self.logger = self._setup_logging()
         self.is_running = False
         self.web_ui = None
+        self.startup: Optional[StartupOrchestrator] = None
         self.shutdown_event = threading.Event()
         
         # Setup signal handlers
@@ -73,20 +77,19 @@ class MIADesktopApp:
             # Display startup banner
             self._display_banner()
             
-            # Initialize core systems
-            await self._initialize_systems()
-            
-            # Start model discovery
-            self._start_model_discovery()
-            
-            # Start model learning
-            self._start_model_learning()
-            
-            # Start web interface
-            await self._start_web_interface()
-            
-            # Start API gateway
-            await self._start_api_gateway()
+            # Web interface is up as soon as core systems are; discovery,
+            # learning and the API gateway start after it in the background
+            self.startup = StartupOrchestrator([
+                StartupStep("init_systems", self._initialize_systems),
+                StartupStep("web_interface", self._start_web_interface, depends_on=["init_systems"]),
+                StartupStep("model_discovery", self._start_model_discovery, resource=ResourceClass.IO,
+                            optional=True),
+                StartupStep("model_learning", self._start_model_learning, depends_on=["model_discovery"],
+                            optional=True),
+                StartupStep("api_gateway", self._start_api_gateway, optional=True)
+            ], ready_step="web_interface", name="desktop")
+            if not await self.startup.run():
+                raise RuntimeError(f"Startup failed: {self.startup.get_report()['steps']}")
             
             self.logger.info("✅ MIA Desktop Application started successfully")
             self.logger.info("🌐 Web interface: http://localhost:12000")
@@ -151,13 +154,13 @@ class MIADesktopApp:
         
         try:
             # Load existing model cache
-            model_discovery.load_model_cache()
+            get_model_discovery().load_model_cache()
             
             # Start continuous discovery
             discover_models(continuous=True)
             
             # Display initial stats
-            stats = model_discovery.get_discovery_stats()
+            stats = get_model_discovery().get_discovery_stats()
             self.logger.info(f"📊 Model discovery stats: {stats['total_models']} models found")
             
         except Exception as e:
@@ -222,7 +225,7 @@ class MIADesktopApp:
                 try:
                     import uvicorn
                     uvicorn.run(
-                        api_gateway.app,
+                        get_api_gateway().app,
                         host="0.0.0.0",
                         port=8000,
                         log_level="error",  # Reduce log noise
@@ -277,13 +280,13 @@ class MIADesktopApp:
         """Display current system status"""
         try:
             # Get model discovery stats
-            discovery_stats = model_discovery.get_discovery_stats()
+            discovery_stats = get_model_discovery().get_discovery_stats()
             
             # Get learning stats
-            learning_stats = model_learning.get_learning_stats()
+            learning_stats = get_model_learning().get_learning_stats()
             
             # Get analytics stats
-            analytics_stats = analytics.get_real_time_metrics()
+            analytics_stats = get_analytics().get_real_time_metrics()
             
             status = f"""
 📊 MIA System Status:
@@ -311,17 +314,21 @@ class MIADesktopApp:
         try:
             self.logger.info("🧹 Cleaning up resources...")
             
-            # Stop model discovery
-            model_discovery.stop_discovery()
+            # Only services that were started are stopped; none is built just to shut it down
+            registry = get_registry()
             
-            # Stop model learning
-            model_learning.stop_learning()
+            # Stop model discovery
+            if registry.is_constructed("mia.core.model_discovery.model_discovery"):
+                get_model_discovery().stop_discovery()
             
-            # Save learning results
-            model_learning.save_learning_results()
+            # Stop model learning and save learning results
+            if registry.is_constructed("mia.core.model_learning.model_learning"):
+                get_model_learning().stop_learning()
+                get_model_learning().save_learning_results()
             
             # Flush analytics
-            analytics._flush_metrics()
+            if registry.is_constructed("mia.enterprise.analytics.analytics"):
+                get_analytics()._flush_metrics()
             
             self.logger.info("✅ Cleanup completed")
             
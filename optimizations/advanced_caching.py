@@ -4,29 +4,33 @@
 ==============================================
 
 Multi-level intelligent caching system for ultimate performance:
-- Memory caching with LRU eviction
-- Disk-based persistent caching
+- Memory caching with W-TinyLFU admission and O(1) eviction
+- Disk caching on a single append-only log
+- Single-flight loading against cache stampedes
 - Distributed caching support
 - Intelligent cache warming
 - Performance analytics
 """
 
+import abc
 import asyncio
+import heapq
+import itertools
+import os
+import struct
+import sys
 import time
 import logging
 import threading
 import pickle
-import hashlib
 import json
-import sqlite3
+import random
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import weakref
 from collections import OrderedDict
-import psutil
-import gzip
 import zlib
 
 class CacheLevel(Enum):
@@ -44,6 +48,7 @@ class CacheStrategy(Enum):
     LFU = "lfu"
     FIFO = "fifo"
     TTL = "ttl"
+    TINYLFU = "tinylfu"
 
 @dataclass
 class CacheEntry:
@@ -64,151 +69,397 @@ class CacheStats:
     entry_count: int
     hit_rate: float
 
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Estimate in-memory cost of a value without serializing it"""
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if _depth >= 3 or not isinstance(value, (list, tuple, set, frozenset, dict)) or not value:
+        return size
+
+    # Sample large containers and extrapolate
+    if isinstance(value, dict):
+        sample = list(itertools.islice(value.items(), 32))
+        sampled = sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in sample)
+    else:
+        sample = list(itertools.islice(value, 32))
+        sampled = sum(estimate_size(item, _depth + 1) for item in sample)
+    return size + sampled * len(value) // len(sample)
+
+_HALVE_TABLE = bytes(i >> 1 for i in range(256))
+
+class FrequencySketch:
+    """Count-Min sketch of access frequencies with periodic halving (TinyLFU aging)"""
+
+    DEPTH = 4
+
+    def __init__(self, capacity: int):
+        self.width = 1 << max(4, (max(1, capacity) * 4 - 1).bit_length())
+        self.mask = self.width - 1
+        # One flat table of 4-bit saturating counters, row after row
+        self.table = bytearray(self.width * self.DEPTH)
+        self.sample_size = 10 * max(1, capacity)
+        self.additions = 0
+
+    def _indexes(self, key: Any) -> List[int]:
+        h = (hash(key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        mask = self.mask
+        width = self.width
+        return [(h1 & mask), width + ((h1 + h2) & mask),
+                2 * width + ((h1 + 2 * h2) & mask), 3 * width + ((h1 + 3 * h2) & mask)]
+
+    def increment(self, key: Any):
+        table = self.table
+        added = False
+        for index in self._indexes(key):
+            if table[index] < 15:
+                table[index] += 1
+                added = True
+        if added:
+            self.additions += 1
+            if self.additions >= self.sample_size:
+                self._reset()
+
+    def frequency(self, key: Any) -> int:
+        table = self.table
+        a, b, c, d = self._indexes(key)
+        return min(table[a], table[b], table[c], table[d])
+
+    def _reset(self):
+        """Halve all counters so old popularity decays"""
+        self.table = bytearray(self.table.translate(_HALVE_TABLE))
+        self.additions //= 2
+
+    def clear(self):
+        self.table = bytearray(len(self.table))
+        self.additions = 0
+
+class EvictionPolicy(abc.ABC):
+    """Key ordering used by AdvancedMemoryCache; every operation is O(1)"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+
+    def on_hit(self, key: str):
+        pass
+
+    def on_miss(self, key: str):
+        pass
+
+    @abc.abstractmethod
+    def insert(self, key: str) -> List[str]:
+        """Track a new key; return keys that must be evicted (may include key itself)"""
+
+    @abc.abstractmethod
+    def remove(self, key: str):
+        """Stop tracking key"""
+
+    @abc.abstractmethod
+    def victim(self) -> Optional[str]:
+        """Next key to evict when the cost budget is exceeded"""
+
+    @abc.abstractmethod
+    def clear(self):
+        """Forget every tracked key"""
+
+class LRUPolicy(EvictionPolicy):
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.order: OrderedDict = OrderedDict()
+
+    def on_hit(self, key: str):
+        self.order.move_to_end(key)
+
+    def insert(self, key: str) -> List[str]:
+        evicted = []
+        while len(self.order) >= self.capacity:
+            evicted.append(self.order.popitem(last=False)[0])
+        self.order[key] = None
+        return evicted
+
+    def remove(self, key: str):
+        self.order.pop(key, None)
+
+    def victim(self) -> Optional[str]:
+        return next(iter(self.order), None)
+
+    def clear(self):
+        self.order.clear()
+
+class FIFOPolicy(LRUPolicy):
+
+    def on_hit(self, key: str):
+        pass
+
+class LFUPolicy(EvictionPolicy):
+    """Frequency buckets with LRU tie-breaking"""
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.frequencies: Dict[str, int] = {}
+        self.buckets: Dict[int, OrderedDict] = {}
+        self.min_frequency = 0
+
+    def on_hit(self, key: str):
+        frequency = self.frequencies[key]
+        bucket = self.buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[frequency]
+            if self.min_frequency == frequency:
+                self.min_frequency = frequency + 1
+        self.frequencies[key] = frequency + 1
+        self.buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def insert(self, key: str) -> List[str]:
+        evicted = []
+        while len(self.frequencies) >= self.capacity:
+            victim = self.victim()
+            self.remove(victim)
+            evicted.append(victim)
+        self.frequencies[key] = 1
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_frequency = 1
+        return evicted
+
+    def remove(self, key: str):
+        frequency = self.frequencies.pop(key, None)
+        if frequency is None:
+            return
+        bucket = self.buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[frequency]
+
+    def victim(self) -> Optional[str]:
+        if not self.frequencies:
+            return None
+        if self.min_frequency not in self.buckets:
+            self.min_frequency = min(self.buckets)
+        return next(iter(self.buckets[self.min_frequency]))
+
+    def clear(self):
+        self.frequencies.clear()
+        self.buckets.clear()
+        self.min_frequency = 0
+
+class WTinyLFUPolicy(EvictionPolicy):
+    """Window TinyLFU: small LRU window in front of a segmented LRU main space.
+
+    Entries leaving the window are admitted to the main space only if their
+    sketched frequency beats the main space's eviction victim, which keeps
+    one-hit wonders and scans from flushing the working set.
+    """
+
+    def __init__(self, capacity: int, window_ratio: float = 0.01, protected_ratio: float = 0.8):
+        super().__init__(capacity)
+        self.window_capacity = max(1, int(self.capacity * window_ratio))
+        self.main_capacity = self.capacity - self.window_capacity
+        self.protected_capacity = int(self.main_capacity * protected_ratio)
+        self.window: OrderedDict = OrderedDict()
+        self.probation: OrderedDict = OrderedDict()
+        self.protected: OrderedDict = OrderedDict()
+        self.sketch = FrequencySketch(self.capacity)
+
+    def on_hit(self, key: str):
+        self.sketch.increment(key)
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.probation:
+            del self.probation[key]
+            self.protected[key] = None
+            if len(self.protected) > self.protected_capacity:
+                demoted = self.protected.popitem(last=False)[0]
+                self.probation[demoted] = None
+        elif key in self.protected:
+            self.protected.move_to_end(key)
+
+    def on_miss(self, key: str):
+        self.sketch.increment(key)
+
+    def insert(self, key: str) -> List[str]:
+        self.window[key] = None
+        if len(self.window) <= self.window_capacity:
+            return []
+        candidate = self.window.popitem(last=False)[0]
+        return self._admit(candidate)
+
+    def _admit(self, candidate: str) -> List[str]:
+        if len(self.probation) + len(self.protected) < self.main_capacity:
+            self.probation[candidate] = None
+            return []
+        segment = self.probation if self.probation else self.protected
+        if not segment:
+            return [candidate]
+        victim = next(iter(segment))
+        if self.sketch.frequency(candidate) > self.sketch.frequency(victim):
+            del segment[victim]
+            self.probation[candidate] = None
+            return [victim]
+        return [candidate]
+
+    def remove(self, key: str):
+        for segment in (self.window, self.probation, self.protected):
+            if key in segment:
+                del segment[key]
+                return
+
+    def victim(self) -> Optional[str]:
+        for segment in (self.probation, self.window, self.protected):
+            if segment:
+                return next(iter(segment))
+        return None
+
+    def clear(self):
+        self.window.clear()
+        self.probation.clear()
+        self.protected.clear()
+        self.sketch.clear()
+
+_POLICIES = {
+    CacheStrategy.LRU: LRUPolicy,
+    CacheStrategy.TTL: LRUPolicy,
+    CacheStrategy.FIFO: FIFOPolicy,
+    CacheStrategy.LFU: LFUPolicy,
+    CacheStrategy.TINYLFU: WTinyLFUPolicy,
+}
+
 class AdvancedMemoryCache:
     """Advanced Memory Cache with multiple eviction strategies"""
-    
-    def __init__(self, max_size: int = 1000, max_memory_mb: int = 100, strategy: CacheStrategy = CacheStrategy.LRU):
+
+    def __init__(self, max_size: int = 1000, max_memory_mb: int = 100, strategy: CacheStrategy = CacheStrategy.LRU,
+                 cost_fn: Optional[Callable[[Any], int]] = None):
         self.max_size = max_size
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.strategy = strategy
-        self.cache: OrderedDict = OrderedDict()
+        self.cost_fn = cost_fn or estimate_size
+        self.policy: EvictionPolicy = _POLICIES[strategy](max_size)
+        self.cache: Dict[str, CacheEntry] = {}
+        self._expiry_heap: List[tuple] = []
         self.stats = CacheStats(0, 0, 0, 0, 0, 0.0)
         self.lock = threading.RLock()
-        
+
         self.logger = logging.getLogger("MIA.MemoryCache")
-    
+
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         with self.lock:
-            if key in self.cache:
-                entry = self.cache[key]
-                
-                # Check TTL
-                if entry.ttl and self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200 > entry.timestamp + entry.ttl:
-                    del self.cache[key]
-                    self.stats.misses += 1
-                    self._update_stats()
-                    return None
-                
-                # Update access patterns
-                entry.access_count += 1
-                
-                if self.strategy == CacheStrategy.LRU:
-                    # Move to end (most recently used)
-                    self.cache.move_to_end(key)
-                
-                self.stats.hits += 1
+            entry = self.cache.get(key)
+            if entry is None:
+                self.policy.on_miss(key)
+                self.stats.misses += 1
                 self._update_stats()
-                return entry.value
-            else:
+                return None
+
+            # Check TTL
+            if entry.ttl and time.time() > entry.timestamp + entry.ttl:
+                self._remove(key)
+                self.policy.on_miss(key)
                 self.stats.misses += 1
                 self._update_stats()
                 return None
-    
-    def put(self, key: str, value: Any, ttl: Optional[float] = None, metadata: Optional[Dict] = None) -> bool:
-        """Put value in cache"""
+
+            # Update access patterns
+            entry.access_count += 1
+            self.policy.on_hit(key)
+
+            self.stats.hits += 1
+            self._update_stats()
+            return entry.value
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None, metadata: Optional[Dict] = None,
+            cost: Optional[int] = None) -> bool:
+        """Put value in cache; ``cost`` overrides the estimated size in bytes"""
         with self.lock:
             try:
-                # Calculate size
-                size_bytes = self._calculate_size(value)
-                
-                # Check if we need to evict
-                while (len(self.cache) >= self.max_size or 
-                       self.stats.size_bytes + size_bytes > self.max_memory_bytes):
-                    if not self._evict_entry():
-                        return False  # Cannot evict more entries
-                
-                # Create cache entry
-                entry = CacheEntry(
+                size_bytes = cost if cost is not None else self.cost_fn(value)
+                if size_bytes > self.max_memory_bytes:
+                    return False
+
+                if key in self.cache:
+                    self._remove(key)
+
+                now = time.time()
+                self._purge_expired(now)
+
+                # Make room within the cost budget
+                while self.stats.size_bytes + size_bytes > self.max_memory_bytes:
+                    victim = self.policy.victim()
+                    if victim is None:
+                        return False
+                    self._evict(victim)
+
+                self.cache[key] = CacheEntry(
                     key=key,
                     value=value,
-                    timestamp=self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200,
+                    timestamp=now,
                     access_count=1,
                     ttl=ttl,
                     size_bytes=size_bytes,
                     metadata=metadata or {}
                 )
-                
-                # Add to cache
-                self.cache[key] = entry
                 self.stats.size_bytes += size_bytes
+                if ttl:
+                    heapq.heappush(self._expiry_heap, (now + ttl, key))
+
+                # Count limit and admission are decided by the policy
+                for evicted in self.policy.insert(key):
+                    self._evict(evicted)
+
                 self.stats.entry_count = len(self.cache)
-                self._update_stats()
-                
-                return True
-                
+                return key in self.cache
+
             except Exception as e:
                 self.logger.error(f"Failed to put cache entry: {e}")
                 return False
-    
-    def _evict_entry(self) -> bool:
-        """Evict entry based on strategy"""
-        if not self.cache:
-            return False
-        
-        try:
-            if self.strategy == CacheStrategy.LRU:
-                # Remove least recently used (first item)
-                key, entry = self.cache.popitem(last=False)
-            elif self.strategy == CacheStrategy.LFU:
-                # Remove least frequently used
-                key = min(self.cache.keys(), key=lambda k: self.cache[k].access_count)
-                entry = self.cache.pop(key)
-            elif self.strategy == CacheStrategy.FIFO:
-                # Remove first in (first item)
-                key, entry = self.cache.popitem(last=False)
-            elif self.strategy == CacheStrategy.TTL:
-                # Remove expired entries first
-                current_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
-                expired_keys = [
-                    k for k, v in self.cache.items()
-                    if v.ttl and current_time > v.timestamp + v.ttl
-                ]
-                if expired_keys:
-                    key = expired_keys[0]
-                    entry = self.cache.pop(key)
-                else:
-                    # Fallback to LRU
-                    key, entry = self.cache.popitem(last=False)
-            
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self.policy.remove(key)
+            self.stats.size_bytes -= entry.size_bytes
+            self.stats.entry_count = len(self.cache)
+        return entry
+
+    def _evict(self, key: str):
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self.policy.remove(key)
             self.stats.size_bytes -= entry.size_bytes
             self.stats.evictions += 1
             self.stats.entry_count = len(self.cache)
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Failed to evict cache entry: {e}")
-            return False
-    
-    def _calculate_size(self, value: Any) -> int:
-        """Calculate approximate size of value in bytes"""
-        try:
-            return len(pickle.dumps(value))
-        except:
-            # Fallback estimation
-            if isinstance(value, str):
-                return len(value.encode('utf-8'))
-            elif isinstance(value, (int, float)):
-                return 8
-            elif isinstance(value, (list, tuple)):
-                return sum(self._calculate_size(item) for item in value)
-            elif isinstance(value, dict):
-                return sum(self._calculate_size(k) + self._calculate_size(v) for k, v in value.items())
-            else:
-                return 1024  # Default estimate
-    
+
+    def _purge_expired(self, now: float):
+        """Drop entries whose TTL has passed (heap entries of replaced keys are skipped)"""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            if entry is not None and entry.ttl and entry.timestamp + entry.ttl == expires_at:
+                self._evict(key)
+        if len(heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [
+                (entry.timestamp + entry.ttl, key) for key, entry in self.cache.items() if entry.ttl
+            ]
+            heapq.heapify(self._expiry_heap)
+
     def _update_stats(self):
         """Update cache statistics"""
         total_requests = self.stats.hits + self.stats.misses
         self.stats.hit_rate = self.stats.hits / total_requests if total_requests > 0 else 0.0
-    
+
     def clear(self):
         """Clear all cache entries"""
         with self.lock:
             self.cache.clear()
+            self.policy.clear()
+            self._expiry_heap = []
             self.stats = CacheStats(0, 0, 0, 0, 0, 0.0)
-    
+
     def get_stats(self) -> CacheStats:
         """Get cache statistics"""
         with self.lock:
@@ -221,239 +472,260 @@ class AdvancedMemoryCache:
                 hit_rate=self.stats.hit_rate
             )
 
+# Log record: flags, key length, value length, expiry (0 = none), crc32 of key + value
+_RECORD_HEADER = struct.Struct("<BIIdI")
+_FLAG_TOMBSTONE = 1
+_FLAG_COMPRESSED = 2
+
 class PersistentDiskCache:
-    """Persistent disk-based cache with compression"""
-    
-    def __init__(self, cache_dir: str = "cache", max_size_mb: int = 1000, compression: bool = True):
+    """Persistent disk cache on a single append-only log with an in-memory key index"""
+
+    def __init__(self, cache_dir: str = "cache", max_size_mb: int = 1000, compression: bool = True,
+                 compact_ratio: float = 0.5):
         self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.max_size_bytes = max_size_mb * 1024 * 1024
         self.compression = compression
-        
-        # Initialize SQLite index
-        self.db_path = self.cache_dir / "cache_index.db"
-        self._init_database()
-        
+        self.compact_ratio = compact_ratio
+
         self.logger = logging.getLogger("MIA.DiskCache")
         self.stats = CacheStats(0, 0, 0, 0, 0, 0.0)
         self.lock = threading.RLock()
-    
-    def _init_database(self):
-        """Initialize SQLite database for cache index"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS cache_entries (
-                    key TEXT PRIMARY KEY,
-                    filename TEXT NOT NULL,
-                    timestamp REAL NOT NULL,
-                    access_count INTEGER DEFAULT 1,
-                    ttl REAL,
-                    size_bytes INTEGER NOT NULL,
-                    metadata TEXT
-                )
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_timestamp ON cache_entries(timestamp)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_access_count ON cache_entries(access_count)
-            """)
-    
+
+        # key -> (value offset, value length, expires_at, flags), in LRU order
+        self.index: OrderedDict = OrderedDict()
+        self.live_bytes = 0
+        self.log_path = self.cache_dir / "cache.log"
+        self._file = open(self.log_path, "a+b")
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the key index by replaying the log; a torn tail is truncated"""
+        self._file.seek(0)
+        offset = 0
+        while True:
+            header = self._file.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                break
+            flags, key_len, value_len, expires_at, crc = _RECORD_HEADER.unpack(header)
+            body = self._file.read(key_len + value_len)
+            if len(body) < key_len + value_len or zlib.crc32(body) != crc:
+                break
+            key = body[:key_len].decode("utf-8")
+            self._drop(key)
+            if not flags & _FLAG_TOMBSTONE:
+                self.index[key] = (offset + _RECORD_HEADER.size + key_len, value_len, expires_at, flags)
+                self.live_bytes += value_len
+            offset += _RECORD_HEADER.size + key_len + value_len
+
+        if offset < self.log_path.stat().st_size:
+            self.logger.warning(f"Truncating damaged disk cache log at byte {offset}")
+            self._file.truncate(offset)
+
+    def _append(self, key: str, payload: bytes, flags: int, expires_at: float) -> int:
+        """Append one record; returns the offset of its value"""
+        key_bytes = key.encode("utf-8")
+        body = key_bytes + payload
+        self._file.seek(0, os.SEEK_END)
+        start = self._file.tell()
+        self._file.write(_RECORD_HEADER.pack(flags, len(key_bytes), len(payload), expires_at, zlib.crc32(body)))
+        self._file.write(body)
+        self._file.flush()
+        return start + _RECORD_HEADER.size + len(key_bytes)
+
+    def _read_value(self, location: tuple) -> Any:
+        offset, length, _, flags = location
+        self._file.seek(offset)
+        data = self._file.read(length)
+        if flags & _FLAG_COMPRESSED:
+            data = zlib.decompress(data)
+        return pickle.loads(data)
+
     def get(self, key: str) -> Optional[Any]:
         """Get value from disk cache"""
         with self.lock:
             try:
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.execute(
-                        "SELECT filename, timestamp, ttl, access_count FROM cache_entries WHERE key = ?",
-                        (key,)
-                    )
-                    row = cursor.fetchone()
-                    
-                    if not row:
-                        self.stats.misses += 1
-                        self._update_stats()
-                        return None
-                    
-                    filename, timestamp, ttl, access_count = row
-                    
-                    # Check TTL
-                    if ttl and self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200 > timestamp + ttl:
-                        self._remove_entry(key, filename)
-                        self.stats.misses += 1
-                        self._update_stats()
-                        return None
-                    
-                    # Load value from file
-                    file_path = self.cache_dir / filename
-                    if not file_path.exists():
-                        self._remove_entry(key, filename)
-                        self.stats.misses += 1
-                        self._update_stats()
-                        return None
-                    
-                    value = self._load_from_file(file_path)
-                    
-                    # Update access count
-                    conn.execute(
-                        "UPDATE cache_entries SET access_count = access_count + 1 WHERE key = ?",
-                        (key,)
-                    )
-                    
-                    self.stats.hits += 1
+                location = self.index.get(key)
+                if location is None:
+                    self.stats.misses += 1
+                    self._update_stats()
+                    return None
+
+                # Check TTL
+                expires_at = location[2]
+                if expires_at and time.time() > expires_at:
+                    self._delete(key)
+                    self.stats.misses += 1
                     self._update_stats()
-                    return value
-                    
+                    return None
+
+                value = self._read_value(location)
+                self.index.move_to_end(key)
+
+                self.stats.hits += 1
+                self._update_stats()
+                return value
+
             except Exception as e:
                 self.logger.error(f"Failed to get from disk cache: {e}")
                 self.stats.misses += 1
                 self._update_stats()
                 return None
-    
+
     def put(self, key: str, value: Any, ttl: Optional[float] = None, metadata: Optional[Dict] = None) -> bool:
         """Put value in disk cache"""
         with self.lock:
             try:
-                # Generate filename
-                filename = self._generate_filename(key)
-                file_path = self.cache_dir / filename
-                
-                # Save value to file
-                size_bytes = self._save_to_file(file_path, value)
-                
-                # Check if we need to evict
-                while self._get_total_size() + size_bytes > self.max_size_bytes:
-                    if not self._evict_entry():
-                        file_path.unlink(missing_ok=True)
-                        return False
-                
-                # Add to database
-                with sqlite3.connect(self.db_path) as conn:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO cache_entries 
-                        (key, filename, timestamp, ttl, size_bytes, metadata)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (
-                        key, filename, self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200, ttl, size_bytes,
-                        json.dumps(metadata) if metadata else None
-                    ))
-                
+                payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                flags = 0
+                if self.compression:
+                    payload = zlib.compress(payload)
+                    flags |= _FLAG_COMPRESSED
+
+                if len(payload) > self.max_size_bytes:
+                    return False
+
+                # The new record supersedes any older one for the same key
+                self._drop(key)
+
+                # Evict least recently used entries
+                while self.index and self.live_bytes + len(payload) > self.max_size_bytes:
+                    self._delete(next(iter(self.index)))
+                    self.stats.evictions += 1
+
+                expires_at = time.time() + ttl if ttl else 0.0
+                offset = self._append(key, payload, flags, expires_at)
+                self.index[key] = (offset, len(payload), expires_at, flags)
+                self.live_bytes += len(payload)
+
+                self._maybe_compact()
                 return True
-                
+
             except Exception as e:
                 self.logger.error(f"Failed to put in disk cache: {e}")
                 return False
-    
-    def _generate_filename(self, key: str) -> str:
-        """Generate filename for cache key"""
-        hash_obj = hashlib.md5(key.encode())
-        return f"cache_{hash_obj.hexdigest()}.pkl"
-    
-    def _save_to_file(self, file_path: Path, value: Any) -> int:
-        """Save value to file with optional compression"""
-        data = pickle.dumps(value)
-        
-        if self.compression:
-            data = gzip.compress(data)
-        
-        with open(file_path, 'wb') as f:
-            f.write(data)
-        
-        return len(data)
-    
-    def _load_from_file(self, file_path: Path) -> Any:
-        """Load value from file with optional decompression"""
-        with open(file_path, 'rb') as f:
-            data = f.read()
-        
-        if self.compression:
-            data = gzip.decompress(data)
-        
-        return pickle.loads(data)
-    
-    def _get_total_size(self) -> int:
-        """Get total cache size in bytes"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT SUM(size_bytes) FROM cache_entries")
-            result = cursor.fetchone()[0]
-            return result or 0
-    
-    def _evict_entry(self) -> bool:
-        """Evict least recently used entry"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("""
-                    SELECT key, filename FROM cache_entries 
-                    ORDER BY timestamp ASC LIMIT 1
-                """)
-                row = cursor.fetchone()
-                
-                if row:
-                    key, filename = row
-                    self._remove_entry(key, filename)
-                    self.stats.evictions += 1
-                    return True
-                
-                return False
-                
-        except Exception as e:
-            self.logger.error(f"Failed to evict entry: {e}")
-            return False
-    
-    def _remove_entry(self, key: str, filename: str):
-        """Remove entry from cache"""
-        try:
-            # Remove file
-            file_path = self.cache_dir / filename
-            file_path.unlink(missing_ok=True)
-            
-            # Remove from database
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
-                
-        except Exception as e:
-            self.logger.error(f"Failed to remove cache entry: {e}")
-    
+
+    def _drop(self, key: str):
+        """Forget key in the index only"""
+        location = self.index.pop(key, None)
+        if location is not None:
+            self.live_bytes -= location[1]
+
+    def _delete(self, key: str):
+        """Forget key and persist a tombstone so it stays deleted after restart"""
+        self._drop(key)
+        self._append(key, b"", _FLAG_TOMBSTONE, 0.0)
+
+    def _maybe_compact(self):
+        log_size = self._file.tell()
+        if log_size > 1024 * 1024 and self.live_bytes < log_size * self.compact_ratio:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the log with live records only"""
+        with self.lock:
+            compact_path = self.log_path.with_suffix(".log.compact")
+            index: OrderedDict = OrderedDict()
+            now = time.time()
+            with open(compact_path, "wb") as out:
+                offset = 0
+                for key, location in self.index.items():
+                    value_offset, length, expires_at, flags = location
+                    if expires_at and now > expires_at:
+                        continue
+                    self._file.seek(value_offset)
+                    payload = self._file.read(length)
+                    key_bytes = key.encode("utf-8")
+                    body = key_bytes + payload
+                    out.write(_RECORD_HEADER.pack(flags, len(key_bytes), length, expires_at, zlib.crc32(body)))
+                    out.write(body)
+                    index[key] = (offset + _RECORD_HEADER.size + len(key_bytes), length, expires_at, flags)
+                    offset += _RECORD_HEADER.size + len(body)
+                out.flush()
+                os.fsync(out.fileno())
+
+            self._file.close()
+            os.replace(compact_path, self.log_path)
+            self._file = open(self.log_path, "a+b")
+            self.index = index
+            self.live_bytes = sum(location[1] for location in index.values())
+
     def _update_stats(self):
         """Update cache statistics"""
         total_requests = self.stats.hits + self.stats.misses
         self.stats.hit_rate = self.stats.hits / total_requests if total_requests > 0 else 0.0
-    
+
     def clear(self):
         """Clear all cache entries"""
         with self.lock:
             try:
-                # Remove all files
-                for file_path in self.cache_dir.glob("cache_*.pkl"):
-                    file_path.unlink(missing_ok=True)
-                
-                # Clear database
-                with sqlite3.connect(self.db_path) as conn:
-                    conn.execute("DELETE FROM cache_entries")
-                
+                self._file.truncate(0)
+                self.index.clear()
+                self.live_bytes = 0
                 self.stats = CacheStats(0, 0, 0, 0, 0, 0.0)
-                
+
             except Exception as e:
                 self.logger.error(f"Failed to clear disk cache: {e}")
-    
+
+    def close(self):
+        """Close the log file"""
+        with self.lock:
+            if not self._file.closed:
+                self._file.close()
+
     def get_stats(self) -> CacheStats:
         """Get cache statistics"""
         with self.lock:
-            try:
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.execute("SELECT COUNT(*), SUM(size_bytes) FROM cache_entries")
-                    count, size = cursor.fetchone()
-                    
-                    return CacheStats(
-                        hits=self.stats.hits,
-                        misses=self.stats.misses,
-                        evictions=self.stats.evictions,
-                        size_bytes=size or 0,
-                        entry_count=count or 0,
-                        hit_rate=self.stats.hit_rate
-                    )
-            except:
-                return self.stats
+            return CacheStats(
+                hits=self.stats.hits,
+                misses=self.stats.misses,
+                evictions=self.stats.evictions,
+                size_bytes=self.live_bytes,
+                entry_count=len(self.index),
+                hit_rate=self.stats.hit_rate
+            )
+
+class _InFlightCall:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Coalesces concurrent loads of the same key into a single loader call"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _InFlightCall()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
 
 class IntelligentCacheWarmer:
     """Intelligent cache warming system"""
@@ -591,6 +863,7 @@ class UltimateCacheSystem:
         
         # Initialize cache warmer
         self.cache_warmer = IntelligentCacheWarmer(self)
+        self.single_flight = SingleFlight()
         
         # Performance metrics
         self.performance_metrics = {
@@ -609,7 +882,7 @@ class UltimateCacheSystem:
             'memory': {
                 'max_size': 10000,
                 'max_memory_mb': 500,
-                'strategy': 'lru'
+                'strategy': 'tinylfu'
             },
             'disk': {
                 'cache_dir': 'cache',
@@ -639,7 +912,7 @@ class UltimateCacheSystem:
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from multi-level cache"""
-        start_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200
+        start_time = time.perf_counter()
         
         try:
             self.performance_metrics['total_requests'] += 1
@@ -675,11 +948,12 @@ class UltimateCacheSystem:
             self._update_response_time(start_time)
             return None
     
-    def put(self, key: str, value: Any, ttl: Optional[float] = None, metadata: Optional[Dict] = None) -> bool:
+    def put(self, key: str, value: Any, ttl: Optional[float] = None, metadata: Optional[Dict] = None,
+            cost: Optional[int] = None) -> bool:
         """Put value in multi-level cache"""
         try:
             # Put in memory cache
-            memory_success = self.memory_cache.put(key, value, ttl, metadata)
+            memory_success = self.memory_cache.put(key, value, ttl, metadata, cost=cost)
             
             # Put in disk cache for persistence
             disk_success = self.disk_cache.put(key, value, ttl, metadata)
@@ -690,9 +964,28 @@ class UltimateCacheSystem:
             self.logger.error(f"Cache put error: {e}")
             return False
     
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None,
+                    cost: Optional[int] = None) -> Any:
+        """Get value or load it once, even when many threads miss the same key"""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def load():
+            # Another caller may have filled the cache while we waited
+            cached = self.memory_cache.get(key)
+            if cached is not None:
+                return cached
+            loaded = loader()
+            if loaded is not None:
+                self.put(key, loaded, ttl, cost=cost)
+            return loaded
+
+        return self.single_flight.do(key, load)
+    
     def _update_response_time(self, start_time: float):
         """Update average response time"""
-        response_time = self._get_deterministic_time() if hasattr(self, "_get_deterministic_time") else 1640995200 - start_time
+        response_time = time.perf_counter() - start_time
         total_requests = self.performance_metrics['total_requests']
         
         if total_requests == 1:
@@ -726,6 +1019,11 @@ class UltimateCacheSystem:
         }
         self.logger.info("🧹 All caches cleared")
     
+    def close(self):
+        """Stop warming and release the disk log"""
+        self.stop_cache_warming()
+        self.disk_cache.close()
+    
     def get_comprehensive_stats(self) -> Dict[str, Any]:
         """Get comprehensive cache statistics"""
         memory_stats = self.memory_cache.get_stats()
@@ -745,6 +1043,9 @@ class UltimateCacheSystem:
             },
             'memory_cache': asdict(memory_stats),
             'disk_cache': asdict(disk_stats),
+            'single_flight': {
+                'coalesced_loads': self.single_flight.coalesced
+            },
             'warming': {
                 'active': self.cache_warmer.warming_active,
                 'patterns_tracked': len(self.cache_warmer.access_patterns),
@@ -752,6 +1053,54 @@ class UltimateCacheSystem:
             }
         }
 
+def _zipf_trace(n_keys: int, length: int, skew: float, seed: int) -> List[str]:
+    """Zipf-distributed key trace"""
+    rng = random.Random(seed)
+    keys = [f"key_{i}" for i in range(n_keys)]
+    rng.shuffle(keys)
+    weights = [1.0 / (rank + 1) ** skew for rank in range(n_keys)]
+    return rng.choices(keys, cum_weights=list(itertools.accumulate(weights)), k=length)
+
+def benchmark_cache(capacity: int = 1000, n_keys: int = 50000, length: int = 200000,
+                    skew: float = 0.9) -> Dict[str, Any]:
+    """Hit ratio and latency of each eviction strategy on Zipf traces, plus disk tier latency"""
+    zipf = _zipf_trace(n_keys, length, skew, seed=42)
+    # Same popularity with periodic one-off scans mixed in
+    scans = list(zipf)
+    for start in range(0, length, 20000):
+        scans[start:start + 2000] = [f"scan_{start}_{i}" for i in range(2000)]
+
+    results: Dict[str, Any] = {"capacity": capacity, "keys": n_keys, "requests": length, "skew": skew}
+    for trace_name, trace in (("zipf", zipf), ("zipf_with_scans", scans)):
+        for strategy in (CacheStrategy.LRU, CacheStrategy.LFU, CacheStrategy.TINYLFU):
+            cache = AdvancedMemoryCache(max_size=capacity, max_memory_mb=1024, strategy=strategy)
+            start = time.perf_counter()
+            for key in trace:
+                if cache.get(key) is None:
+                    cache.put(key, key, cost=1)
+            elapsed = time.perf_counter() - start
+            results[f"{trace_name}_{strategy.value}"] = {
+                "hit_rate": cache.get_stats().hit_rate,
+                "ns_per_request": elapsed / len(trace) * 1e9,
+            }
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = PersistentDiskCache(cache_dir=tmp, max_size_mb=64)
+        value = {"payload": "x" * 1024}
+        start = time.perf_counter()
+        for i in range(2000):
+            disk.put(f"key_{i}", value)
+        put_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(2000):
+            disk.get(f"key_{i}")
+        get_s = time.perf_counter() - start
+        disk.close()
+    results["disk_put_us"] = put_s / 2000 * 1e6
+    results["disk_get_us"] = get_s / 2000 * 1e6
+    return results
+
 def main():
     """Main execution function"""
     print("🚀 Initializing Ultimate Cache System...")
@@ -818,4 +1167,7 @@ def main():
     cache_system.stop_cache_warming()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--benchmark" in sys.argv:
+        print(json.dumps(benchmark_cache(), indent=2))
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Tests for ai_model_management.py
+"""
+
+import importlib.util
+import logging
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Load by path: other suites may already have imported mia/enterprise as "enterprise"
+spec = importlib.util.spec_from_file_location("ai_model_management", project_root / "enterprise" / "ai_model_management.py")
+ai_model_management = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = ai_model_management
+spec.loader.exec_module(ai_model_management)
+
+ExperimentPolicy = ai_model_management.ExperimentPolicy
+ModelStatus = ai_model_management.ModelStatus
+TrafficRouter = ai_model_management.TrafficRouter
+UltimateAIModelManager = ai_model_management.UltimateAIModelManager
+always_valid_p_value = ai_model_management.always_valid_p_value
+synthetic_model = ai_model_management.synthetic_model
+
+
+class FakeClock:
+    """Per-thread virtual time; synthetic models advance it instead of sleeping"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def __call__(self) -> float:
+        return getattr(self._local, "now", 0.0)
+
+    def sleep(self, seconds: float):
+        self._local.now = self() + seconds
+
+
+class TestAIModelManagement(unittest.TestCase):
+    """Test cases for ai_model_management.py"""
+
+    def setUp(self):
+        logging.getLogger("MIA.UltimateAIManager").setLevel(logging.CRITICAL)
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.clock = FakeClock()
+
+    def model(self, latency_ms, error_rate=0.0, seed=0):
+        return synthetic_model(latency_ms, error_rate, seed=seed, sleep=self.clock.sleep)
+
+    def manager(self, **policy):
+        manager = UltimateAIModelManager(str(self.directory / "registry"), ExperimentPolicy(**policy), clock=self.clock)
+        self.addCleanup(manager.router.close)
+        return manager
+
+    def register(self, manager, model_id, latency_ms, error_rate=0.0, seed=0, route="chat"):
+        self.assertTrue(manager.register_model(model_id, {"route": route}, self.model(latency_ms, error_rate, seed)))
+
+    def serve(self, manager, requests, route="chat", sessions=1000):
+        for i in range(requests):
+            try:
+                manager.infer(route, i, session_id=f"s{i % sessions}")
+            except RuntimeError:
+                pass
+
+    def test_weighted_sticky_split(self):
+        router = TrafficRouter(clock=self.clock)
+        self.addCleanup(router.close)
+        for version in ["v1", "v2"]:
+            router.add_version(version, self.model(1.0))
+        router.set_stable("chat", "v1")
+        router.set_weights("chat", {"v2": 0.2, "v1": 0.8})
+        sessions = [f"user-{i}" for i in range(5000)]
+        first = {session: router.assign("chat", session) for session in sessions}
+        share = sum(version == "v2" for version in first.values()) / len(sessions)
+        self.assertAlmostEqual(share, 0.2, delta=0.03)
+        self.assertEqual(first, {session: router.assign("chat", session) for session in sessions})
+
+        # Ramping up only moves sessions from the stable version to the candidate
+        router.set_weights("chat", {"v2": 0.5, "v1": 0.5})
+        ramped = {session: router.assign("chat", session) for session in sessions}
+        self.assertTrue(all(ramped[s] == "v2" for s in sessions if first[s] == "v2"))
+        with self.assertRaises(KeyError):
+            router.set_weights("chat", {"missing": 1.0})
+        with self.assertRaises(ValueError):
+            router.set_weights("chat", {"v1": 0.0})
+
+    def test_measured_latency_and_errors(self):
+        router = TrafficRouter(clock=self.clock)
+        self.addCleanup(router.close)
+        router.add_version("v1", self.model(20.0, error_rate=0.1, seed=1))
+        router.set_stable("chat", "v1")
+        for i in range(4000):
+            try:
+                self.assertEqual(router.infer("chat", i), {"echo": i})
+            except RuntimeError:
+                pass
+        snapshot = router.version_stats("v1").snapshot()
+        self.assertEqual(snapshot["requests"], 4000)
+        self.assertAlmostEqual(snapshot["error_rate"], 0.1, delta=0.02)
+        self.assertAlmostEqual(snapshot["latency_ms"]["p50"], 20.0, delta=1.5)
+        self.assertAlmostEqual(snapshot["latency_ms"]["geometric_mean"], 20.0, delta=1.0)
+        self.assertGreater(snapshot["latency_ms"]["p99"], 30.0)
+
+    def test_always_valid_p_value(self):
+        self.assertEqual(always_valid_p_value(0.5, 0.0, 0.1), 1.0)
+        self.assertGreater(always_valid_p_value(0.0, 0.01, 0.1), 0.9)
+        self.assertLess(always_valid_p_value(0.5, 0.001, 0.1), 1e-6)
+        # More data (smaller variance) gives stronger evidence for the same effect
+        self.assertLess(always_valid_p_value(0.05, 0.0001, 0.1), always_valid_p_value(0.05, 0.001, 0.1))
+
+    def test_canary_with_error_regression_rolled_back(self):
+        manager = self.manager()
+        self.register(manager, "v1", 10.0, 0.01, seed=1)
+        self.register(manager, "v2", 10.0, 0.10, seed=2)
+        self.assertTrue(manager.deploy_model("v1", "canary"))
+        self.assertEqual(manager.models["v1"]["status"], ModelStatus.PRODUCTION.value)
+        self.assertTrue(manager.deploy_model("v2", "canary", 25.0))
+        self.assertEqual(manager.router.routes["chat"].weights, {"v2": 0.25, "v1": 0.75})
+
+        self.serve(manager, 20000)
+        deployment = manager.deployments["canary_v2_2"]
+        self.assertEqual(deployment["status"], "rolled_back")
+        self.assertEqual(deployment["decision"]["reason"], "error rate regression")
+        # Decided long before the sample cap
+        self.assertLess(deployment["decision"]["samples"]["candidate"], 2000)
+        self.assertEqual(manager.router.routes["chat"].weights, {"v1": 1.0})
+        self.assertEqual(manager.models["v2"]["status"], ModelStatus.DEPRECATED.value)
+
+    def test_canary_with_latency_regression_rolled_back(self):
+        manager = self.manager()
+        self.register(manager, "v1", 10.0, seed=1)
+        self.register(manager, "v2", 15.0, seed=2)
+        manager.deploy_model("v1")
+        manager.deploy_model("v2", "rolling", 50.0)
+        self.serve(manager, 5000)
+        decision = manager.deployments["rolling_v2_2"]["decision"]
+        self.assertEqual(decision["reason"], "latency regression")
+        self.assertAlmostEqual(decision["latency_ratio"], 1.5, delta=0.15)
+
+    def test_faster_canary_promoted(self):
+        manager = self.manager()
+        self.register(manager, "v1", 10.0, 0.01, seed=1)
+        self.register(manager, "v2", 8.0, 0.01, seed=2)
+        manager.deploy_model("v1")
+        manager.deploy_model("v2", "canary", 20.0)
+        self.serve(manager, 20000)
+        self.assertEqual(manager.deployments["canary_v2_2"]["status"], "promoted")
+        route = manager.router.routes["chat"]
+        self.assertEqual((route.stable, route.weights), ("v2", {"v2": 1.0}))
+        self.assertEqual(manager.models["v2"]["status"], ModelStatus.PRODUCTION.value)
+        self.assertEqual(manager.models["v1"]["status"], ModelStatus.STAGING.value)
+
+    def test_identical_versions_not_rolled_back(self):
+        # A/A runs: the always-valid test should not flag a regression that does not exist
+        for seed in range(5):
+            manager = self.manager()
+            self.register(manager, "a", 10.0, 0.02, seed=seed)
+            self.register(manager, "b", 10.0, 0.02, seed=seed + 100)
+            manager.create_ab_test("aa", "a", "b", 0.5)
+            self.serve(manager, 30000)
+            results = manager.get_ab_test_results("aa")
+            self.assertNotEqual(results["decision"].get("reason"), "error rate regression", seed)
+            self.assertNotEqual(results["decision"].get("reason"), "latency regression", seed)
+
+    def test_ab_test_picks_winner(self):
+        manager = self.manager()
+        self.register(manager, "a", 10.0, 0.01, seed=1)
+        self.register(manager, "b", 10.0, 0.08, seed=2)
+        self.assertTrue(manager.create_ab_test("errors", "a", "b", 0.5))
+        self.assertEqual(manager.get_system_overview()["active_ab_tests"], 1)
+        self.serve(manager, 10000)
+        results = manager.get_ab_test_results("errors")
+        self.assertEqual((results["status"], results["winner"]), ("completed", "a"))
+        self.assertGreater(results["arms"]["b"]["error_rate"], results["arms"]["a"]["error_rate"])
+        self.assertLess(results["p_values"]["error_harm"], 0.025)
+        self.assertFalse(manager.create_ab_test("missing", "a", "nope"))
+
+    def test_shadow_mirrors_off_critical_path(self):
+        manager = UltimateAIModelManager(str(self.directory / "registry"), ExperimentPolicy(min_samples=50))
+        self.addCleanup(manager.router.close)
+        manager.register_model("v1", {"route": "chat"}, lambda request: request * 2)
+        released = threading.Event()
+
+        def slow_shadow(request):
+            released.wait(5)
+            raise RuntimeError("shadow failure")
+
+        manager.register_model("v2", {"route": "chat"}, slow_shadow)
+        manager.deploy_model("v1")
+        self.assertTrue(manager.deploy_model("v2", "shadow"))
+        self.assertEqual(manager.models["v2"]["status"], ModelStatus.STAGING.value)
+
+        started = time.perf_counter()
+        self.assertEqual([manager.infer("chat", i) for i in range(100)], [i * 2 for i in range(100)])
+        # Responses do not wait for the blocked, failing shadow
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(manager.router.version_stats("v2", "live").requests, 0)
+        released.set()
+        manager.router.close()
+        shadow = manager.router.version_stats("v2", "shadow").snapshot()
+        self.assertEqual((shadow["requests"], shadow["errors"]), (100, 100))
+        self.assertEqual(manager.deployments["shadow_v2_2"]["status"], "rolled_back")
+        self.assertEqual(manager.router.routes["chat"].shadows, [])
+
+    def test_shadow_mismatches_and_validation(self):
+        router = TrafficRouter(clock=self.clock, max_shadow_pending=500)
+        self.addCleanup(router.close)
+        router.add_version("v1", self.model(10.0, seed=1))
+        router.add_version("v2", lambda request: {"echo": request} if request % 10 else None)
+        router.set_stable("chat", "v1")
+        experiment = router.start_experiment("chat", "v2", mode="shadow", policy=ExperimentPolicy(min_samples=100))
+        with self.assertRaises(ValueError):
+            router.start_experiment("chat", "v2")
+        shadow = router.version_stats("v2", "shadow")
+        for i in range(1, 501):
+            router.infer("chat", i)
+            # Drain each mirror so validation is decided before the next request
+            deadline = time.monotonic() + 5
+            while router.routes["chat"].shadows and shadow.requests < i and time.monotonic() < deadline:
+                time.sleep(0.001)
+        router.close()
+        self.assertEqual(router.shadow_dropped, 0)
+        self.assertEqual(experiment.status, "validated")
+        # Mirroring stops once the shadow is validated
+        self.assertLess(shadow.requests, 500)
+        self.assertEqual(shadow.mismatches, shadow.requests // 10)
+        self.assertEqual(router.routes["chat"].weights, {"v1": 1.0})
+
+    def test_monitoring_uses_measured_metrics(self):
+        manager = self.manager()
+        self.register(manager, "v1", 25.0, 0.05, seed=3)
+        manager.deploy_model("v1")
+        self.assertEqual(manager.collect_metrics(), [])
+        self.serve(manager, 2000)
+        metrics = manager.collect_metrics()
+        self.assertEqual(len(metrics), 1)
+        self.assertEqual(metrics[0]["requests"], 2000)
+        self.assertAlmostEqual(metrics[0]["latency_ms"], 25.0, delta=2.0)
+        self.assertAlmostEqual(metrics[0]["error_rate"], 0.05, delta=0.02)
+        overview = manager.get_system_overview()
+        self.assertEqual(overview["performance_summary"]["metrics_collected"], 1)
+        self.assertEqual(overview["routes"], {"chat": {"v1": 1.0}})
+        self.assertFalse(manager.deploy_model("v1", "nonexistent_strategy"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Tests for data_map.py
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.compliance.audit_system import ComplianceAuditSystem
+from mia.compliance import data_map as data_map_module
+from mia.compliance.data_map import (
+    SQLiteSubjectTable, SubjectDataMap, SubjectRequestExecutor, benchmark_subject_requests
+)
+from mia.compliance.data_processor import DataProcessor
+from mia.compliance.lgpd_manager import LGPDComplianceManager
+from mia.core.agi_core import AGICore
+from mia.core.persistent_knowledge_store import PersistentKnowledgeStore
+from mia.modules.api_email.imap_sync import MailboxStore
+
+
+class FlakyStore:
+    """In-memory store whose erasure fails a given number of times"""
+
+    def __init__(self, records, failures=0, leaves=0):
+        self.records = dict(records)
+        self.failures = failures
+        self.leaves = leaves
+        self.erase_calls = 0
+
+    def find_subject_records(self, subject_id):
+        return sorted(key for key, owner in self.records.items() if owner == subject_id)
+
+    def export_subject_data(self, subject_id):
+        return self.find_subject_records(subject_id)
+
+    def erase_subject_data(self, subject_id):
+        self.erase_calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise IOError("store unavailable")
+        keys = self.find_subject_records(subject_id)[self.leaves:]
+        for key in keys:
+            del self.records[key]
+        return len(keys)
+
+
+def memory_tiers(directory, rows):
+    connections = {}
+    for tier in ["short_term", "long_term"]:
+        conn = sqlite3.connect(str(directory / f"{tier}.db"), check_same_thread=False)
+        conn.execute("CREATE TABLE memories (id TEXT PRIMARY KEY, content TEXT, user_id TEXT, vector_embedding BLOB)")
+        conn.execute("CREATE INDEX idx_user_id ON memories(user_id)")
+        conn.executemany("INSERT INTO memories VALUES (?, ?, ?, ?)",
+                         [(f"{tier}-{key}", content, user, b"\x00") for key, content, user in rows])
+        conn.commit()
+        connections[tier] = conn
+    return connections
+
+
+class TestDataMap(unittest.TestCase):
+    """Test cases for data_map.py"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        for name in ["MIA.Compliance.DataProcessor", "MIA.Compliance.AuditSystem", "MIA.Compliance.DataMap",
+                     "MIA.Compliance.PrivacyManager", "MIA.Compliance.LGPDManager", "MIA.Compliance.ConsentManager",
+                     "MIA.AGI.Core", "mia.core.persistent_knowledge_store"]:
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    def processor(self):
+        processor = DataProcessor(str(self.directory))
+        for subject in ["ana", "bob"]:
+            for purpose in ["service_provision", "marketing"]:
+                result = processor.process_data({"subject_id": subject, "purpose": purpose, "legal_basis": "consent",
+                                                 "data_categories": [purpose], "data": {"user_id": subject},
+                                                 "extra": purpose})
+                self.assertTrue(result["success"])
+        processor.add_inventory_item("inv-1", {"subject_id": "ana", "categories": ["profile"]})
+        return processor
+
+    def executor(self, data_map, **kwargs):
+        executor = SubjectRequestExecutor(data_map, str(self.directory / "journal.db"), retry_delay=0, **kwargs)
+        self.addCleanup(executor.close)
+        return executor
+
+    def test_data_processor_uses_subject_index(self):
+        processor = self.processor()
+        self.assertEqual(len(processor.find_subject_records("ana")), 3)
+        exported = processor.export_data("ana")
+        self.assertEqual((exported["total_activities"], exported["total_inventory_items"]), (2, 1))
+
+        deleted = processor.delete_data("ana", ["marketing"])
+        self.assertEqual((deleted["deleted_processing_activities"], deleted["deleted_inventory_items"]), (1, 0))
+
+        # The index is rebuilt from the saved records
+        reloaded = DataProcessor(str(self.directory))
+        reloaded.initialize_data_processing()
+        self.assertEqual(reloaded.find_subject_records("ana"), processor.find_subject_records("ana"))
+        self.assertEqual(reloaded.erase_subject_data("ana"), 2)
+        self.assertEqual(reloaded.find_subject_records("ana"), [])
+        self.assertEqual(len(reloaded.find_subject_records("bob")), 2)
+
+    def test_erasure_fans_out_and_verifies(self):
+        processor = self.processor()
+        audit = ComplianceAuditSystem(str(self.directory))
+        audit.log_subject_rights_request({"request_type": "access", "subject_id": "ana",
+                                          "additional_data": {"email": "ana@example.com"}, "result": {}})
+        knowledge = PersistentKnowledgeStore(str(self.directory / "knowledge"))
+        knowledge.add_fact("ana", "city", "Lisbon", user_id="ana")
+        knowledge.add_fact("aspirin", "type", "medication", user_id="bob")
+        knowledge.add_conversation("ana", "hello", "hi")
+        mailbox = MailboxStore(str(self.directory / "mailbox.db"))
+        self.addCleanup(mailbox.close)
+        mailbox.add_messages("mia@example.com", "INBOX", [
+            (1, {"sender": "Ana <ANA@example.com>", "subject": "hi", "body": "from ana"}),
+            (2, {"sender": "bob@example.com", "subject": "hi", "body": "from bob"}),
+        ])
+        tiers = memory_tiers(self.directory, [("1", "ana likes tea", "ana"), ("2", "bob", "bob")])
+
+        data_map = SubjectDataMap()
+        for name, store in [("data_processor", processor), ("audit", audit), ("knowledge", knowledge),
+                            ("email", mailbox), ("memory", SQLiteSubjectTable(tiers))]:
+            data_map.register(name, store)
+        with self.assertRaises(TypeError):
+            data_map.register("broken", object())
+        identities = {"email": "ana@example.com"}
+        self.assertEqual(set(data_map.locate("ana", identities)), {"data_processor", "audit", "knowledge", "email", "memory"})
+
+        executor = self.executor(data_map)
+        exported = executor.export("ana", identities=identities)
+        self.assertTrue(exported["success"])
+        self.assertEqual(exported["data"]["memory"]["short_term"], [{"id": "short_term-1", "content": "ana likes tea",
+                                                                     "user_id": "ana"}])
+        self.assertEqual(exported["data"]["email"][0]["body"], "from ana")
+        json.dumps(exported["data"])
+
+        events = []
+        erased = executor.erase("ana", "req-1", identities, progress=events.append)
+        self.assertTrue(erased["success"])
+        self.assertEqual(erased["records"], exported["records"])
+        self.assertEqual(sorted(event["completed"] for event in events), [1, 2, 3, 4, 5])
+        self.assertEqual(executor.verify("ana", identities), {})
+
+        # Other subjects are untouched; the audit trail is kept but pseudonymized
+        self.assertEqual(len(data_map.locate("bob", {"email": "bob@example.com"})), 4)
+        self.assertEqual(len(audit.audit_logs), 1)
+        self.assertTrue(audit.audit_logs[0]["subject_id"].startswith("erased_"))
+        self.assertIsNone(audit.audit_logs[0]["additional_data"])
+        self.assertIsNone(knowledge.query_knowledge("ana", "city"))
+        self.assertEqual(knowledge.query_knowledge("aspirin", "type"), "medication")
+        backups = list((self.directory / "knowledge").glob("knowledge_backup_*.json"))
+        self.assertEqual(len(backups), 1)
+        self.assertNotIn("Lisbon", backups[0].read_text())
+        self.assertEqual(mailbox.count(), 1)
+
+    def test_retries_and_resumes_by_request_id(self):
+        flaky = FlakyStore({"a1": "ana", "a2": "ana"}, failures=1)
+        down = FlakyStore({"d1": "ana"}, failures=10)
+        stuck = FlakyStore({"s1": "ana", "s2": "ana"}, leaves=1)
+        data_map = SubjectDataMap()
+        for name, store in [("flaky", flaky), ("down", down), ("stuck", stuck)]:
+            data_map.register(name, store)
+
+        executor = self.executor(data_map, retries=2)
+        first = executor.erase("ana", "req-1")
+        self.assertFalse(first["success"])
+        self.assertEqual(first["failed_stores"], ["down", "stuck"])
+        self.assertEqual((first["stores"]["flaky"]["status"], first["stores"]["flaky"]["attempts"]), ("verified", 2))
+        # Erased records that are still found fail verification
+        self.assertIn("remain after erasure", first["stores"]["stuck"]["error"])
+        self.assertEqual(down.erase_calls, 3)
+
+        down.failures = 0
+        stuck.leaves = 0
+        second = executor.erase("ana", "req-1")
+        self.assertTrue(second["success"])
+        self.assertTrue(second["stores"]["flaky"]["skipped"])
+        self.assertEqual(flaky.erase_calls, 2)
+        self.assertEqual(executor.journal.get("req-1")["down"]["attempts"], 4)
+
+    def test_agi_core_tags_chat_memories(self):
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        self.addCleanup(os.chdir, cwd)
+        core = AGICore()
+        asyncio.run(core.chat("hello there", subject_id="ana"))
+        asyncio.run(core.chat("hi", subject_id="bob"))
+        bob = core.find_subject_records("bob")
+        self.assertEqual(bob[-1], "context:last_message")
+        self.assertTrue(any(key.startswith("conversation_") for key in bob))
+        exported = core.export_subject_data("bob")
+        self.assertEqual((exported["last_message"], len(exported["memories"])), ("hi", len(bob) - 1))
+
+        ana = len(core.find_subject_records("ana"))
+        self.assertEqual(core.erase_subject_data("bob"), len(bob))
+        self.assertEqual(core.find_subject_records("bob"), [])
+        self.assertNotIn("last_message", core.context)
+        state = json.loads((self.directory / "mia" / "data" / "agi_state.json").read_text())
+        self.assertEqual({memory["context"]["subject_id"] for memory in state["memories"]}, {"ana"})
+
+        restored = AGICore()
+        asyncio.run(restored._load_state())
+        self.assertEqual(len(restored.find_subject_records("ana")), ana)
+
+    def test_mailbox_migration_tags_existing_messages(self):
+        path = self.directory / "old.db"
+        old = MailboxStore(str(path))
+        old.add_messages("me", "INBOX", [(1, {"sender": "Ana <ana@x.org>", "subject": "hi", "body": "Ana"})])
+        old.close()
+        # Back to the schema before messages were tagged
+        with sqlite3.connect(str(path)) as conn:
+            conn.execute("DROP INDEX idx_messages_correspondent")
+            conn.execute("ALTER TABLE messages DROP COLUMN correspondent")
+        mailbox = MailboxStore(str(path))
+        self.addCleanup(mailbox.close)
+        self.assertEqual(mailbox.find_subject_records("ANA@x.org"), ["message:1"])
+        self.assertEqual(mailbox.find_subject_records("me"), ["message:1"])
+        self.assertEqual(mailbox.erase_subject_data("ana@x.org"), 1)
+        self.assertEqual(mailbox.search("Ana"), [])
+
+    def isolated_registry(self):
+        """Only stores built by this test are registered"""
+        patcher = mock.patch.dict(data_map_module._registered_stores, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lgpd_requests_use_data_map(self):
+        self.isolated_registry()
+        manager = LGPDComplianceManager(str(self.directory))
+        processor = manager.data_processor
+        processor.process_data({"subject_id": "ana", "purpose": "analytics", "legal_basis": "consent",
+                                "data": {"user_id": "ana"}})
+        knowledge = PersistentKnowledgeStore(str(self.directory / "knowledge"))
+        knowledge.add_conversation("ana", "my address is X", "noted")
+        manager.register_data_store("knowledge", knowledge)
+
+        access = manager.handle_subject_rights_request("access", "ana")
+        data = access["request_result"]["access_data"]
+        self.assertEqual(len(data["processing_activities"]), 1)
+        self.assertEqual(data["personal_data"]["knowledge"]["conversations"][0]["user_input"], "my address is X")
+        # Exported personal data is not copied into the audit trail
+        self.assertNotIn("my address is X", json.dumps(manager.audit_system.audit_logs))
+
+        erasure = manager.handle_subject_rights_request("erasure", "ana")
+        self.assertEqual(erasure["status"], "completed")
+        confirmation = erasure["request_result"]["erasure_confirmation"]
+        self.assertTrue(confirmation["verified"])
+        self.assertEqual(confirmation["erased_records"], 4)
+        self.assertEqual(manager.data_map.locate("ana"), {"audit": [manager.audit_system.audit_logs[-1]["audit_id"]]})
+        self.assertNotEqual(access["request_id"], erasure["request_id"])
+
+    def test_lgpd_covers_self_registered_stores(self):
+        self.isolated_registry()
+        manager = LGPDComplianceManager(str(self.directory))
+        knowledge = PersistentKnowledgeStore(str(self.directory / "knowledge"))
+        knowledge.add_conversation("ana", "hello", "hi")
+        mailbox = MailboxStore(str(self.directory / "mailbox.db"))
+        self.addCleanup(mailbox.close)
+        mailbox.add_messages("mia@example.com", "INBOX", [
+            (1, {"sender": "Ana <ana@example.com>", "subject": "hi", "body": "from ana"}),
+        ])
+        # Neither store was handed to the manager; both registered themselves when built
+        self.assertEqual(manager.data_map.kinds(), ["audit", "data_processor", "email", "knowledge"])
+        identities = {"identities": {"email": "ana@example.com"}}
+
+        unknown = manager.handle_subject_rights_request("erasure", "ana", {"data_categories": ["photos"], **identities})
+        self.assertEqual(unknown["status"], "rejected")
+        self.assertIn("photos", unknown["request_result"]["error"])
+        self.assertIn("email", unknown["request_result"]["available_categories"])
+        self.assertEqual(mailbox.count(), 1)
+
+        scoped = manager.handle_subject_rights_request("erasure", "ana", {"data_categories": ["email"], **identities})
+        confirmation = scoped["request_result"]["erasure_confirmation"]
+        self.assertTrue(confirmation["verified"])
+        self.assertEqual(confirmation["erased_categories"], ["email"])
+        self.assertEqual(list(confirmation["stores"]), [mailbox.store_name])
+        self.assertEqual(mailbox.count(), 0)
+        self.assertTrue(knowledge.find_subject_records("ana"))
+
+        full = manager.handle_subject_rights_request("erasure", "ana", identities)
+        confirmation = full["request_result"]["erasure_confirmation"]
+        self.assertEqual(confirmation["erased_categories"], ["all"])
+        self.assertIn(f"knowledge:{(self.directory / 'knowledge').resolve()}", confirmation["stores"])
+        self.assertEqual(knowledge.find_subject_records("ana"), [])
+
+        mailbox.close()
+        self.assertEqual(manager.data_map.kinds(), ["audit", "data_processor", "knowledge"])
+
+    def test_benchmark_small_corpus(self):
+        result = benchmark_subject_requests(records=20000, subjects=500, target_records=20, side_records=2000)
+        self.assertTrue(result["scan_matches_index"])
+        self.assertEqual(result["located"]["memory"], 20)
+        self.assertTrue(result["erase_success"])
+        self.assertEqual(result["erased_records"], result["exported_records"])
+        self.assertEqual(result["retry_skipped_stores"], 5)
+        self.assertEqual(result["remaining_after_erase"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
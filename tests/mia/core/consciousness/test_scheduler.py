@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for consciousness/scheduler.py
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.consciousness.scheduler import CognitiveScheduler
+
+# ConsciousnessModule intervals (seconds) scaled so one real second is one minute
+SCALE = 1 / 60
+MODULE_INTERVALS = {"introspection": 30, "proactive": 60, "emotion": 60,
+                    "thoughts": 30, "evaluation": 60, "save": 300}
+
+
+class TestCognitiveScheduler(unittest.TestCase):
+    """Test cases for consciousness/scheduler.py"""
+
+    def _run(self, scheduler: CognitiveScheduler, duration: float, during=None):
+        async def main():
+            task = asyncio.create_task(scheduler.run())
+            await asyncio.sleep(0.01)
+            if during is not None:
+                await during()
+            await asyncio.sleep(duration)
+            scheduler.stop()
+            await asyncio.wait_for(task, 1)
+        asyncio.run(main())
+
+    def test_idle_wakeups_per_minute(self):
+        scheduler = CognitiveScheduler()
+        for name, interval in MODULE_INTERVALS.items():
+            scheduler.register(name, lambda: None, interval=interval * SCALE, triggers=("user_input",))
+        start = time.monotonic()
+        self._run(scheduler, 1.0)
+        minutes = (time.monotonic() - start) / 60 / SCALE
+        # Polling once per second would wake 60 times per minute
+        self.assertLessEqual(scheduler.stats.wakeups / minutes, 6)
+        self.assertGreaterEqual(scheduler.subsystems["thoughts"].runs, 1)
+        self.assertEqual(scheduler.subsystems["save"].runs, 0)
+
+    def test_input_to_reaction_latency(self):
+        scheduler = CognitiveScheduler()
+        reacted = []
+        scheduler.register("emotion", lambda: reacted.append(time.perf_counter()), triggers=("user_input",))
+        scheduler.register("introspection", lambda: None, interval=60)
+        latencies = []
+
+        async def send_inputs():
+            for _ in range(5):
+                sent = time.perf_counter()
+                scheduler.trigger("user_input")
+                while len(reacted) <= len(latencies):
+                    await asyncio.sleep(0)
+                latencies.append(reacted[-1] - sent)
+                await asyncio.sleep(0.02)
+
+        self._run(scheduler, 0.0, send_inputs)
+        self.assertEqual(len(latencies), 5)
+        self.assertLess(max(latencies), 0.05)
+
+    def test_trigger_from_other_thread(self):
+        scheduler = CognitiveScheduler()
+        ran = threading.Event()
+        scheduler.register("emotion", ran.set, triggers=("user_input",))
+
+        async def trigger_from_thread():
+            threading.Thread(target=scheduler.trigger, args=("user_input",)).start()
+            await asyncio.sleep(0.05)
+
+        self._run(scheduler, 0.0, trigger_from_thread)
+        self.assertTrue(ran.is_set())
+
+    def test_requests_coalesce(self):
+        scheduler = CognitiveScheduler()
+        saves = []
+        scheduler.register("save", lambda: saves.append(1), interval=60)
+
+        async def burst():
+            for _ in range(20):
+                scheduler.request("save", 0.05)
+                await asyncio.sleep(0.001)
+
+        self._run(scheduler, 0.15, burst)
+        self.assertEqual(len(saves), 1)
+
+    def test_min_spacing_limits_trigger_bursts(self):
+        scheduler = CognitiveScheduler()
+        runs = []
+        scheduler.register("evaluation", lambda: runs.append(1), triggers=("user_input",), min_spacing=0.1)
+
+        async def burst():
+            for _ in range(30):
+                scheduler.trigger("user_input")
+                await asyncio.sleep(0.005)
+
+        self._run(scheduler, 0.1, burst)
+        self.assertLessEqual(len(runs), 3)
+
+    def test_failing_subsystem_keeps_schedule(self):
+        scheduler = CognitiveScheduler()
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        scheduler.register("broken", broken, interval=0.02)
+        self._run(scheduler, 0.1)
+        subsystem = scheduler.subsystems["broken"]
+        self.assertGreaterEqual(subsystem.runs, 3)
+        self.assertEqual(subsystem.errors, subsystem.runs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for build_cache.py
+"""
+
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.build_cache import (
+    BuildCache, BuildStep, VenvPool, benchmark_build_cache, materialize_tree, run_command, write_archive
+)
+
+
+def python_step(name, code, **kwargs):
+    return BuildStep(name, [sys.executable, "-c", code], **kwargs)
+
+
+class TestBuildCache(unittest.TestCase):
+    """Test cases for build_cache.py"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.project = self.directory / "project"
+        (self.project / "src").mkdir(parents=True)
+        (self.project / "src" / "main.py").write_text("print('v1')\n")
+        (self.project / "README.md").write_text("readme\n")
+        self.commands = []
+        self.cache = self.new_cache()
+
+    def new_cache(self, **kwargs):
+        def runner(command, cwd, timeout):
+            self.commands.append(command[-1] if command[0] == sys.executable else command)
+            return run_command(command, cwd, timeout)
+        return BuildCache(self.directory / "cache", runner=runner, **kwargs)
+
+    def compile_step(self):
+        code = "import pathlib; pathlib.Path('dist').mkdir(exist_ok=True); " \
+               "pathlib.Path('dist/app.txt').write_text(open('src/main.py').read().upper())"
+        return python_step("compile", code, inputs=["*.py"], outputs=["dist"])
+
+    def test_unchanged_step_skipped_and_changed_input_reruns(self):
+        first = self.cache.run([self.compile_step()], self.project)[0]
+        self.assertEqual((first["success"], first["cached"]), (True, False))
+        second = self.cache.run([self.compile_step()], self.project)[0]
+        self.assertEqual(second["cached"], "hit")
+        self.assertEqual(len(self.commands), 1)
+
+        # Files outside the declared inputs do not invalidate the step
+        (self.project / "README.md").write_text("changed\n")
+        self.assertEqual(self.cache.run([self.compile_step()], self.project)[0]["cached"], "hit")
+
+        (self.project / "src" / "main.py").write_text("print('v2')\n")
+        third = self.cache.run([self.compile_step()], self.project)[0]
+        self.assertFalse(third["cached"])
+        self.assertEqual((self.project / "dist" / "app.txt").read_text(), "PRINT('V2')\n")
+        self.assertEqual(len(self.commands), 2)
+
+    def test_missing_outputs_restored_from_store(self):
+        self.cache.run([self.compile_step()], self.project)
+        shutil.rmtree(self.project / "dist")
+        # A new cache instance, as in a later process
+        result = self.new_cache().run([self.compile_step()], self.project)[0]
+        self.assertEqual(result["cached"], "restored")
+        restored = self.project / "dist" / "app.txt"
+        self.assertEqual(restored.read_text(), "PRINT('V1')\n")
+        self.assertGreater(os.stat(restored).st_nlink, 1)
+        self.assertEqual(len(self.commands), 1)
+
+        # Same sources in another checkout reuse the outputs too
+        checkout = self.directory / "checkout"
+        shutil.copytree(self.project, checkout, ignore=shutil.ignore_patterns("dist"))
+        self.assertEqual(self.cache.run([self.compile_step()], checkout)[0]["cached"], "restored")
+        self.assertTrue((checkout / "dist" / "app.txt").exists())
+
+    def test_key_includes_salt_and_dependencies(self):
+        self.cache.run([python_step("a", "pass", salt="venv-1")], self.project)
+        self.assertFalse(self.cache.run([python_step("a", "pass", salt="venv-2")], self.project)[0]["cached"])
+
+        steps = [self.compile_step(), python_step("after", "pass", deps=["compile"])]
+        self.cache.run(steps, self.project)
+        (self.project / "src" / "main.py").write_text("print('v3')\n")
+        results = self.cache.run([self.compile_step(), python_step("after", "pass", deps=["compile"])], self.project)
+        self.assertEqual([result["cached"] for result in results], [False, False])
+
+    def test_step_producing_its_own_input_settles(self):
+        # Like npm install writing package-lock.json on the first run
+        code = "import pathlib; p = pathlib.Path('app.lock'); p.exists() or p.write_text('locked')"
+        step = lambda: python_step("install", code, inputs=["*.lock"], outputs=["app.lock"])
+        self.cache.run([step()], self.project)
+        self.assertEqual(self.cache.run([step()], self.project)[0]["cached"], "hit")
+        self.assertEqual(len(self.commands), 1)
+
+    def test_independent_steps_run_in_parallel(self):
+        sleep = "import time; time.sleep(0.4)"
+        steps = [python_step("install", "pass"),
+                 python_step("test", sleep, deps=["install"], cacheable=False),
+                 python_step("build", sleep, deps=["install"], cacheable=False)]
+        started = time.perf_counter()
+        results = self.cache.run(steps, self.project)
+        self.assertLess(time.perf_counter() - started, 0.75)
+        self.assertEqual([result["step"] for result in results], ["install", "test", "build"])
+        self.assertTrue(all(result["success"] for result in results))
+
+    def test_failures_not_cached_and_block_dependents(self):
+        steps = lambda: [python_step("fails", "raise SystemExit(3)"), python_step("next", "pass", deps=["fails"])]
+        results = self.cache.run(steps(), self.project)
+        self.assertEqual(results[0]["return_code"], 3)
+        self.assertFalse(results[1]["success"])
+        self.assertIn("Dependency failed", results[1]["error"])
+        self.cache.run(steps(), self.project)
+        self.assertEqual(self.commands.count("raise SystemExit(3)"), 2)
+
+        with self.assertRaises(ValueError):
+            self.cache.run([python_step("x", "pass", deps=["missing"])], self.project)
+
+    def test_venv_pool_shares_by_requirements(self):
+        pool = VenvPool(self.directory / "venvs", with_pip=False)
+        requirements = self.project / "requirements.txt"
+        requirements.write_text("")
+        venv, stamp, created = pool.ensure(requirements)
+        self.assertTrue(created)
+        self.assertTrue(VenvPool.python_path(venv).exists())
+
+        other = self.directory / "other"
+        other.mkdir()
+        (other / "requirements.txt").write_text("")
+        self.assertEqual(pool.ensure(other / "requirements.txt"), (venv, stamp, False))
+        (other / "requirements.txt").write_text("# changed\n")
+        self.assertNotEqual(pool.key(other / "requirements.txt"), pool.key(requirements))
+
+        self.assertTrue(VenvPool.link(self.project / "venv", venv))
+        self.assertEqual(os.readlink(self.project / "venv"), str(venv))
+        self.assertEqual(pool.pip_command(venv)[-2:], ["--python", str(VenvPool.python_path(venv))])
+
+    def test_incremental_packaging(self):
+        package = self.directory / "package"
+        first = materialize_tree(self.cache.store, self.project, package)
+        self.assertEqual((first["linked"], first["files"]), (2, ["README.md", "src/main.py"]))
+        archive = self.directory / "package.tar.gz"
+        self.assertTrue(write_archive(package, archive, first["digest"]))
+
+        again = materialize_tree(self.cache.store, self.project, package)
+        self.assertEqual((again["linked"], again["unchanged"]), (0, 2))
+        self.assertFalse(write_archive(package, archive, again["digest"]))
+
+        (self.project / "README.md").unlink()
+        (self.project / "src" / "main.py").write_text("print('v4')\n")
+        changed = materialize_tree(self.cache.store, self.project, package)
+        self.assertEqual((changed["linked"], changed["removed"]), (1, 1))
+        self.assertTrue(write_archive(package, archive, changed["digest"]))
+        with tarfile.open(archive) as tar:
+            self.assertEqual(tar.getnames(), ["./src/main.py"])
+            self.assertEqual(tar.getmember("./src/main.py").mtime, 0)
+
+    def test_noop_rebuild_benchmark(self):
+        result = benchmark_build_cache(rebuilds=2)
+        projects = ["fastapi"] + (["express"] if result["node_available"] else [])
+        for project in projects:
+            report = result[project]
+            self.assertTrue(all(report["cold_steps"].values()), report)
+            self.assertTrue(all(report["noop_steps"].values()))
+            self.assertTrue(all(report["fresh_checkout_steps"].values()))
+            self.assertLess(report["noop_rebuild_seconds"], report["uncached_rebuild_seconds"] / 20)
+        self.assertEqual(result["packaging"]["relinked"], 0)
+        self.assertFalse(result["packaging"]["archive_rewritten"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for deterministic_scheduler.py
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.deterministic_scheduler import DeterministicScheduler, benchmark_scheduler
+
+
+def run_workload(workers: int, retention: int = 1000) -> DeterministicScheduler:
+    """Mixed workload: shared counter, readers, undeclared and failing tasks, random sleeps"""
+    rng = random.Random(7)
+    state = {"counter": 0, "log": []}
+
+    def increment(amount):
+        time.sleep(rng.random() * 0.002)
+        value = state["counter"]
+        time.sleep(0.0005)
+        state["counter"] = value + amount
+        return state["counter"]
+
+    def read_counter():
+        return state["counter"]
+
+    def independent(i):
+        time.sleep(rng.random() * 0.003)
+        return i * i
+
+    def undeclared(i):
+        state["log"].append(i)
+        return len(state["log"])
+
+    def failing():
+        raise ValueError("boom")
+
+    scheduler = DeterministicScheduler(42, workers=workers, result_retention=retention)
+    for i in range(60):
+        kind = i % 6
+        priority = i % 3
+        if kind == 0:
+            scheduler.schedule_task(increment, priority, i, writes=["counter"])
+        elif kind == 1:
+            scheduler.schedule_task(read_counter, priority, reads=["counter"])
+        elif kind in (2, 3):
+            scheduler.schedule_task(independent, priority, i, writes=[f"slot_{i}"])
+        elif kind == 4:
+            scheduler.schedule_task(undeclared, priority, i)
+        else:
+            scheduler.schedule_task(failing, priority, reads=[])
+    scheduler.start_deterministic_execution()
+    assert scheduler.wait_until_complete(timeout=30)
+    scheduler.stop_execution()
+    return scheduler
+
+
+class TestDeterministicScheduler(unittest.TestCase):
+    """Test cases for deterministic_scheduler.py"""
+
+    def test_identical_hash_across_worker_counts(self):
+        reference = run_workload(1)
+        self.assertEqual(reference.committed_count, 60)
+        for workers in (2, 4, 8):
+            scheduler = run_workload(workers)
+            self.assertEqual(scheduler.get_execution_hash(), reference.get_execution_hash(), workers)
+            self.assertEqual(list(scheduler.execution_order), list(reference.execution_order))
+        orders = [(entry["priority"], entry["order"]) for entry in reference.execution_order]
+        self.assertEqual(orders, sorted(orders))
+        self.assertTrue(any("error" in entry for entry in reference.execution_order))
+
+    def test_streaming_hash_matches_full_order_hash(self):
+        scheduler = run_workload(4)
+        expected = hashlib.sha256(json.dumps({
+            "execution_order": list(scheduler.execution_order),
+            "seed": 42,
+            "task_count": 60
+        }, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+        self.assertEqual(scheduler.get_execution_hash(), expected)
+
+    def test_bounded_retention(self):
+        full = run_workload(4)
+        bounded = run_workload(4, retention=10)
+        self.assertEqual(len(bounded.execution_order), 10)
+        self.assertEqual(bounded.committed_count, 60)
+        self.assertEqual(bounded.get_execution_hash(), full.get_execution_hash())
+
+    def test_dependency_waits_for_earlier_task(self):
+        events = []
+        scheduler = DeterministicScheduler(workers=4)
+        first = scheduler.schedule_task(lambda: (time.sleep(0.05), events.append("first")), 0, writes=["a"])
+        scheduler.schedule_task(lambda: events.append("second"), 0, writes=["b"], depends_on=[first])
+        scheduler.schedule_task(lambda: events.append("free"), 0, writes=["c"])
+        scheduler.start_deterministic_execution()
+        self.assertTrue(scheduler.wait_until_complete(timeout=5))
+        scheduler.stop_execution()
+        self.assertEqual(events.index("second"), events.index("first") + 1)
+        self.assertLess(events.index("free"), events.index("first"))
+
+    def test_idle_workers_do_not_poll(self):
+        scheduler = DeterministicScheduler(workers=4)
+        scheduler.start_deterministic_execution()
+        try:
+            cpu_before = time.process_time()
+            time.sleep(0.5)
+            idle_cpu = time.process_time() - cpu_before
+            # A task scheduled while idle wakes a worker at once
+            done = threading.Event()
+            started = time.perf_counter()
+            scheduler.schedule_task(done.set, 0)
+            self.assertTrue(done.wait(1.0))
+            wake_latency = time.perf_counter() - started
+        finally:
+            scheduler.stop_execution()
+        self.assertLess(idle_cpu, 0.05)
+        self.assertLess(wake_latency, 0.05)
+        self.assertEqual(scheduler.worker_threads, [])
+
+    def test_io_bound_speedup(self):
+        result = benchmark_scheduler(n_tasks=32, workers=4, io_seconds=0.01, cpu_bytes=256 * 1024)
+        self.assertTrue(result["io_bound"]["hash_identical"])
+        self.assertTrue(result["cpu_bound"]["hash_identical"])
+        self.assertGreater(result["io_bound"]["speedup"], 2.5)
+
+    @unittest.skipIf((os.cpu_count() or 1) < 2, "CPU-bound speedup needs at least two cores")
+    def test_cpu_bound_speedup(self):
+        result = benchmark_scheduler(n_tasks=32, workers=min(4, os.cpu_count()), cpu_bytes=8 * 1024 * 1024)
+        self.assertTrue(result["cpu_bound"]["hash_identical"])
+        self.assertGreater(result["cpu_bound"]["speedup"], 1.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
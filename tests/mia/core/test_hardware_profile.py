@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for hardware_profile.py
+"""
+
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core import hardware_profile
+from mia.core.hardware_profile import HardwareProfileService, machine_fingerprint
+
+
+def slow_probe(delay, **values):
+    def probe(timeout):
+        time.sleep(delay)
+        return values
+    return probe
+
+
+def command_probe(timeout):
+    output = hardware_profile.run_command(["nvidia-smi"], timeout)
+    return {"gpu_available": output is not None}
+
+
+class TestHardwareProfile(unittest.TestCase):
+    """Test cases for hardware_profile.py"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = str(Path(self.tmp.name) / "profile.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def service(self, fingerprint="machine-a", probes=None, timeout=2.0):
+        probes = probes if probes is not None else {"gpu": command_probe}
+        return HardwareProfileService(self.cache_path, probe_timeout=timeout, probes=probes,
+                                      fingerprint=lambda: fingerprint)
+
+    def test_fingerprint_spawns_no_process(self):
+        with mock.patch.object(hardware_profile.subprocess, "run") as run:
+            first = machine_fingerprint()
+            second = machine_fingerprint()
+        run.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertIn("kernel", hardware_profile.machine_fingerprint_data())
+
+    def test_warm_start_makes_no_subprocess_calls(self):
+        with mock.patch.object(hardware_profile.subprocess, "run",
+                               return_value=mock.Mock(returncode=0, stdout="GPU")) as run:
+            cold = self.service().get()
+            self.assertEqual(run.call_count, 1)
+            run.reset_mock()
+            warm_service = self.service()
+            warm = warm_service.get()
+        run.assert_not_called()
+        self.assertEqual(warm_service.source, "cache")
+        self.assertEqual(warm, cold)
+        self.assertTrue(warm.gpu_available)
+
+    def test_probes_run_in_parallel(self):
+        probes = {name: slow_probe(0.2, **{field: value}) for name, field, value in [
+            ("cpu", "cpu_model", "Test CPU"), ("memory", "ram_total_gb", 64.0),
+            ("gpu", "gpu_memory_gb", 24.0), ("storage", "storage_type", "SSD")]}
+        started = time.perf_counter()
+        profile = self.service(probes=probes).get()
+        elapsed = time.perf_counter() - started
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual((profile.cpu_model, profile.ram_total_gb, profile.gpu_memory_gb, profile.storage_type),
+                         ("Test CPU", 64.0, 24.0, "SSD"))
+
+    def test_hung_probe_times_out_to_defaults(self):
+        probes = {"cpu": slow_probe(0.0, cpu_model="Test CPU"), "gpu": slow_probe(2.0, gpu_available=True),
+                  "broken": lambda timeout: 1 / 0}
+        started = time.perf_counter()
+        profile = self.service(probes=probes, timeout=0.2).get()
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(profile.cpu_model, "Test CPU")
+        self.assertFalse(profile.gpu_available)
+        self.assertEqual(sorted(error.split(":")[0] for error in profile.probe_errors), ["broken", "gpu"])
+
+    def test_changed_machine_reprobes_in_background(self):
+        self.service(probes={"cpu": slow_probe(0.0, cpu_model="Old CPU")}).get()
+        service = self.service(fingerprint="machine-b", probes={"cpu": slow_probe(0.2, cpu_model="New CPU")})
+        started = time.perf_counter()
+        stale = service.get()
+        # The stale profile is served at once while the probe runs
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertEqual((stale.cpu_model, service.source), ("Old CPU", "stale_cache"))
+        fresh = service.get(wait_for_fresh=True)
+        self.assertEqual((fresh.cpu_model, fresh.fingerprint, service.source), ("New CPU", "machine-b", "probe"))
+        self.assertEqual(self.service(fingerprint="machine-b").get().cpu_model, "New CPU")
+
+    def test_corrupt_cache_is_reprobed(self):
+        Path(self.cache_path).write_text("{not json")
+        service = self.service(probes={"cpu": slow_probe(0.0, cpu_model="Test CPU")})
+        self.assertEqual(service.get().cpu_model, "Test CPU")
+        self.assertEqual(service.source, "probe")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for integrity_engine.py
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.integrity_engine import IntegrityEngine, hash_file, merkle_root
+
+
+class TestIntegrityEngine(unittest.TestCase):
+    """Test cases for integrity_engine.py"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.old = time.time() - 3600
+        for name in ("a/x.py", "a/b/y.py", "z.py", "a/notes.txt", "a/__pycache__/c.py"):
+            self._write(name, name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name: str, content: str, age: float = 0.0):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        # Back-date mtimes so entries are not considered racily clean
+        os.utime(path, (self.old + age, self.old + age))
+        return path
+
+    def _engine(self, **kwargs) -> IntegrityEngine:
+        return IntegrityEngine(roots=[str(self.root)], **kwargs)
+
+    def test_hash_file_matches_hashlib(self):
+        path = self._write("big.bin", "x" * 3_000_000)
+        self.assertEqual(hash_file(str(path)), hashlib.sha256(path.read_bytes()).hexdigest())
+
+    def test_initial_scan_respects_patterns(self):
+        changes = self._engine().refresh()
+        names = sorted(os.path.relpath(p, self.root) for p in changes.added)
+        self.assertEqual(names, ["a/b/y.py", "a/x.py", "z.py"])
+
+    def test_idle_refresh_hashes_nothing(self):
+        engine = self._engine()
+        engine.refresh()
+        changes = engine.refresh()
+        self.assertFalse(changes)
+        self.assertEqual(changes.hashed, 0)
+
+    def test_only_changed_file_is_rehashed(self):
+        engine = self._engine()
+        engine.refresh()
+        root_before = engine.root_hash()
+        self._write("a/x.py", "modified", age=10)
+        changes = engine.refresh()
+        self.assertEqual(changes.hashed, 1)
+        self.assertEqual([os.path.relpath(p, self.root) for p in changes.modified], ["a/x.py"])
+        self.assertNotEqual(engine.root_hash(), root_before)
+
+    def test_removed_file_reported(self):
+        engine = self._engine()
+        engine.refresh()
+        (self.root / "a/b/y.py").unlink()
+        changes = engine.refresh()
+        self.assertEqual([os.path.relpath(p, self.root) for p in changes.removed], ["a/b/y.py"])
+
+    def test_root_hash_matches_full_merkle_root(self):
+        engine = self._engine()
+        engine.refresh()
+        self.assertEqual(engine.root_hash(), merkle_root(engine.digests()))
+        (self.root / "a/b/y.py").unlink()
+        self._write("a/new.py", "new", age=5)
+        engine.refresh()
+        self.assertEqual(engine.root_hash(), merkle_root(engine.digests()))
+
+    def test_event_driven_refresh_stats_only_dirty_paths(self):
+        engine = self._engine(event_driven=True)
+        engine.refresh()
+        self.assertEqual(engine.refresh().stat_calls, 0)
+
+        path = self._write("z.py", "edited", age=20)
+        engine.mark_dirty(str(path))
+        changes = engine.refresh()
+        self.assertFalse(changes.full_scan)
+        self.assertEqual(changes.stat_calls, 1)
+        self.assertEqual(changes.modified, [str(path)])
+
+    def test_persisted_state_skips_rehash_on_restart(self):
+        state = self.root / "state" / "engine.json"
+        self._engine(state_path=str(state)).refresh()
+        restarted = self._engine(state_path=str(state))
+        changes = restarted.refresh()
+        self.assertEqual(changes.hashed, 0)
+        self.assertEqual(len(restarted.digests()), 3)
+
+    def test_tracked_file_outside_patterns(self):
+        engine = IntegrityEngine(patterns=())
+        notes = str(self.root / "a/notes.txt")
+        engine.track(notes)
+        self.assertEqual(engine.digest(notes), hashlib.sha256(b"a/notes.txt").hexdigest())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for model_residency.py
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.model_residency import GIB, ModelResidencyManager, current_rss
+
+MIB = 1024 ** 2
+
+
+class FakeModels:
+    """Loader that accounts known footprints on a virtual RSS counter"""
+
+    def __init__(self, sizes, load_seconds=None):
+        self.sizes = sizes
+        self.load_seconds = load_seconds or {}
+        self.rss = 0
+        self.now = 0.0
+        self.loads = []
+        self.unloads = []
+
+    async def load(self, name):
+        self.loads.append(name)
+        await asyncio.sleep(0)
+        self.now += self.load_seconds.get(name, 1.0)
+        self.rss += self.sizes[name]
+        return {"name": name}
+
+    def unload(self, name, instance):
+        self.unloads.append(name)
+        self.rss -= self.sizes[name]
+
+    def manager(self, ram_budget, **kwargs):
+        manager = ModelResidencyManager(self.load, ram_budget, unloader=self.unload,
+                                        rss_probe=lambda: self.rss, clock=lambda: self.now, **kwargs)
+        for name in self.sizes:
+            manager.register(name, tasks=(name,), ram_estimate=self.sizes[name])
+        return manager
+
+
+class TestModelResidency(unittest.TestCase):
+    """Test cases for model_residency.py"""
+
+    def test_measures_real_allocation(self):
+        held = []
+
+        def loader(name):
+            block = bytearray(b"\x01") * (64 * MIB)
+            held.append(block)
+            return block
+
+        def unloader(name, instance):
+            held.clear()
+
+        async def scenario():
+            manager = ModelResidencyManager(loader, 4 * GIB, unloader=unloader)
+            manager.register("fake")
+            await manager.acquire("fake")
+            manager.release("fake")
+            measured = manager.profiles["fake"].ram_measured
+            await manager.shed(1)
+            return measured, manager.stats.bytes_freed
+
+        if current_rss() == 0:
+            self.skipTest("RSS cannot be read on this platform")
+        measured, freed = asyncio.run(scenario())
+        self.assertGreater(measured, 60 * MIB)
+        self.assertLess(measured, 80 * MIB)
+        self.assertGreater(freed, 32 * MIB)
+
+    def test_single_flight_load(self):
+        models = FakeModels({"chat": 100})
+
+        async def scenario():
+            manager = models.manager(1000)
+            instances = await asyncio.gather(*(manager.acquire("chat", "chat") for _ in range(10)))
+            return manager, instances
+
+        manager, instances = asyncio.run(scenario())
+        self.assertEqual(models.loads, ["chat"])
+        self.assertTrue(all(instance is instances[0] for instance in instances))
+        self.assertEqual(manager.resident["chat"].in_flight, 10)
+        self.assertEqual(manager.stats.misses, 10)
+        self.assertEqual(manager.stats.coalesced, 9)
+
+    def test_stays_within_budget(self):
+        models = FakeModels({"a": 400, "b": 400, "c": 400})
+
+        async def scenario():
+            manager = models.manager(1000)
+            for name in ["a", "b", "c", "a", "c"]:
+                async with manager.lease(name, name):
+                    self.assertLessEqual(manager.ram_used, 1000)
+            return manager
+
+        manager = asyncio.run(scenario())
+        self.assertLessEqual(manager.stats.peak_ram, 1000)
+        self.assertEqual(models.rss, manager.ram_used)
+        self.assertEqual(manager.stats.evictions, len(models.unloads))
+
+    def test_cost_aware_keeps_expensive_model(self):
+        # Same demand and size, but "slow" costs ten times more to reload
+        models = FakeModels({"slow": 400, "fast": 400, "other": 400}, {"slow": 10.0, "fast": 1.0, "other": 1.0})
+
+        async def scenario():
+            manager = models.manager(800)
+            for name in ["slow", "fast", "slow", "fast"]:
+                async with manager.lease(name, name):
+                    pass
+            async with manager.lease("other", "other"):
+                pass
+            return manager
+
+        manager = asyncio.run(scenario())
+        self.assertIn("slow", manager.resident)
+        self.assertEqual(models.unloads, ["fast"])
+
+    def test_eviction_drains_in_flight(self):
+        models = FakeModels({"a": 600, "b": 600})
+
+        async def scenario():
+            manager = models.manager(1000)
+            await manager.acquire("a", "a")
+            load_b = asyncio.ensure_future(manager.acquire("b", "b"))
+            for _ in range(5):
+                await asyncio.sleep(0)
+            # "a" is still serving a request, so "b" waits for it to drain
+            self.assertFalse(load_b.done())
+            self.assertTrue(manager.resident["a"].draining)
+            self.assertEqual(models.unloads, [])
+            manager.release("a")
+            await load_b
+            return manager
+
+        manager = asyncio.run(scenario())
+        self.assertEqual(models.unloads, ["a"])
+        self.assertEqual(list(manager.resident), ["b"])
+
+    def test_prefetch_follows_task_mix(self):
+        models = FakeModels({"chat": 300, "speech": 300, "vision": 300})
+
+        async def scenario():
+            manager = models.manager(1000)
+            for _ in range(8):
+                manager.observe_task("chat")
+            for _ in range(2):
+                manager.observe_task("speech")
+            manager.observe_task("vision")
+            loaded = await manager.prefetch()
+            return manager, loaded
+
+        manager, loaded = asyncio.run(scenario())
+        self.assertEqual(loaded, ["chat", "speech"])
+        self.assertEqual(manager.stats.misses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for model_router.py
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.model_router import DDSketch, DecayingSketch, SLORouter, simulate_routing
+
+
+class TestModelRouter(unittest.TestCase):
+    """Test cases for model_router.py"""
+
+    def test_sketch_relative_accuracy(self):
+        rng = random.Random(1)
+        values = [rng.lognormvariate(0.0, 1.0) for _ in range(20000)]
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        values.sort()
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            self.assertAlmostEqual(sketch.quantile(q) / exact, 1.0, delta=0.02)
+        self.assertAlmostEqual(sketch.rank(values[9999]), 10000, delta=200)
+
+    def test_sketch_merge(self):
+        a, b, both = DDSketch(), DDSketch(), DDSketch()
+        for value in range(1, 1001):
+            (a if value % 2 else b).add(value / 100)
+            both.add(value / 100)
+        a.merge(b)
+        self.assertEqual(a.bins, both.bins)
+        self.assertEqual(a.quantile(0.95), both.quantile(0.95))
+
+    def test_decay_forgets_old_latency(self):
+        sketch = DecayingSketch(half_life=10.0)
+        for t in range(50):
+            sketch.add(5.0, 1.0, now=float(t))
+        for t in range(200, 210):
+            sketch.add(0.5, 1.0, now=float(t))
+        self.assertLess(sketch.quantile(0.95), 0.6)
+        self.assertLess(sketch.effective_count(210.0), 15)
+
+    def test_explores_unknown_models_first(self):
+        router = SLORouter(latency_slo=1.0, seed=1, clock=lambda: 0.0)
+        chosen = set()
+        for _ in range(6):
+            decision = router.choose("chat", ["a", "b"])
+            self.assertEqual(decision.reason, "explore")
+            chosen.add(decision.model)
+            router.observe(decision.model, "chat", 0.2, 1.0)
+        self.assertEqual(chosen, {"a", "b"})
+        self.assertNotEqual(router.choose("chat", ["a", "b"]).reason, "explore")
+
+    def test_avoids_tail_latency_and_low_quality(self):
+        rng = random.Random(2)
+        router = SLORouter(latency_slo=1.0, quality_floor=0.5, seed=2, clock=lambda: 0.0)
+        for _ in range(200):
+            # "tail" is fast on average but one request in five is slow
+            router.observe("tail", "chat", 3.0 if rng.random() < 0.2 else 0.1, 1.0)
+            router.observe("steady", "chat", 0.4, 0.8)
+            router.observe("sloppy", "chat", 0.1, 0.2)
+        picks = [router.choose("chat").model for _ in range(200)]
+        self.assertGreater(picks.count("steady"), 190)
+
+    def test_reroutes_when_latency_degrades(self):
+        state = {"now": 0.0}
+        router = SLORouter(latency_slo=1.0, half_life=60.0, seed=3, clock=lambda: state["now"])
+        for step in range(400):
+            state["now"] = step * 0.2
+            degraded = step >= 200
+            model = router.choose("chat", ["best", "backup"]).model
+            if model == "best":
+                router.observe("best", "chat", 2.0 if degraded else 0.3, 0.9)
+            else:
+                router.observe("backup", "chat", 0.3, 0.7)
+        picks = [router.choose("chat", ["best", "backup"]).model for _ in range(100)]
+        self.assertGreater(picks.count("backup"), 90)
+        self.assertLess(router.summary("best", "chat")["slo_attainment"], 0.95)
+
+    def test_survives_long_idle_gap(self):
+        state = {"now": 0.0}
+        router = SLORouter(latency_slo=1.0, seed=4, clock=lambda: state["now"])
+        router.observe("m", "chat", 0.5)
+        # ~1080 half-lives without traffic would overflow 2 ** (gap / half_life)
+        state["now"] = 130000.0
+        self.assertEqual(router.choose("chat", ["m"]).model, "m")
+        self.assertLess(router.routes[("m", "chat")].effective_count(state["now"]), 1e-6)
+        router.observe("m", "chat", 0.5)
+        router.summary("m", "chat")
+        self.assertAlmostEqual(router.routes[("m", "chat")].effective_count(state["now"]), 1.0)
+
+    def test_simulation_beats_mean_score(self):
+        result = simulate_routing(n_requests=4000, seed=7)
+        self.assertLess(result["slo_router"]["cumulative_regret"], result["mean_score"]["cumulative_regret"])
+        self.assertGreater(result["slo_router"]["slo_attainment"], 0.95)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for service_registry.py
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.service_registry import (
+    ServiceError, ServiceRegistry, get_registry, lazy_services, profile_imports, service
+)
+
+# Modules whose global instances used to be built at import time
+LAZY_MODULES = [
+    "mia.core.agi_core", "mia.core.adaptive_llm", "mia.core.hardware_optimizer",
+    "mia.core.quality_control.qpm", "mia.enterprise.monitoring", "mia.enterprise.stability_monitor",
+    "mia.modules.api_email.email_client", "mia.core.system_integrator"
+]
+
+FIRST_USE_SCRIPT = """
+import json, sys, threading
+sys.path.insert(0, {root!r})
+import mia.enterprise.monitoring as monitoring
+before = [t.name for t in threading.enumerate() if t is not threading.main_thread()]
+instance = monitoring.enterprise_monitoring
+after = [t.name for t in threading.enumerate() if t is not threading.main_thread()]
+cached = monitoring.__dict__.get("enterprise_monitoring") is instance
+instance.shutdown()
+print(json.dumps({{"before": before, "after": after, "cached": cached}}))
+"""
+
+
+class Counter:
+    """Factory that records every construction"""
+
+    def __init__(self, delay=0.0, fail_times=0):
+        self.calls = 0
+        self.delay = delay
+        self.fail_times = fail_times
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        if calls <= self.fail_times:
+            raise RuntimeError("factory failed")
+        return object()
+
+
+class TestServiceRegistry(unittest.TestCase):
+    """Test cases for service_registry.py"""
+
+    def test_lazy_single_flight_construction(self):
+        registry = ServiceRegistry()
+        factory = Counter(delay=0.1)
+        registry.register("slow", factory)
+        self.assertEqual(factory.calls, 0)
+        self.assertFalse(registry.is_constructed("slow"))
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("slow"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(factory.calls, 1)
+        self.assertEqual(len({id(result) for result in results}), 1)
+        self.assertGreaterEqual(registry.get_status()["slow"]["construction_seconds"], 0.1)
+
+    def test_dependencies_and_cycles(self):
+        registry = ServiceRegistry()
+        order = []
+        registry.register("store", lambda: order.append("store") or "store")
+        registry.register("cache", lambda: order.append("cache") or "cache", depends_on=["store"])
+        registry.register("api", lambda: order.append("api") or "api", depends_on=["cache", "store"])
+        self.assertEqual(registry.get("api"), "api")
+        self.assertEqual(order, ["store", "cache", "api"])
+
+        registry.register("a", object, depends_on=["b"])
+        registry.register("b", object, depends_on=["a"])
+        with self.assertRaises(ServiceError):
+            registry.get("a")
+        registry.register("self_lookup", lambda: registry.get("self_lookup"))
+        with self.assertRaises(ServiceError):
+            registry.get("self_lookup")
+        with self.assertRaises(ServiceError):
+            registry.get("missing")
+
+    def test_failed_construction_is_retried(self):
+        registry = ServiceRegistry()
+        factory = Counter(fail_times=1)
+        registry.register("flaky", factory)
+        with self.assertRaises(RuntimeError):
+            registry.get("flaky")
+        self.assertIn("factory failed", registry.get_status()["flaky"]["error"])
+        self.assertIsNotNone(registry.get("flaky"))
+        self.assertEqual(factory.calls, 2)
+
+    def test_module_getattr_proxy(self):
+        name = "mia_test_lazy_module"
+        module = types.ModuleType(name)
+        sys.modules[name] = module
+        self.addCleanup(sys.modules.pop, name, None)
+        factory = Counter()
+        module.__getattr__ = lazy_services(name, engine=factory, engine_alias="engine",
+                                           client=service(list, depends_on=[f"{name}.engine"]))
+        self.assertEqual(factory.calls, 0)
+
+        from mia_test_lazy_module import engine
+        self.assertIs(module.__dict__["engine"], engine)
+        self.assertIs(module.engine_alias, engine)
+        self.assertEqual(module.client, [])
+        self.assertEqual(factory.calls, 1)
+        with self.assertRaises(AttributeError):
+            module.unknown
+
+        replacement = object()
+        get_registry().set(f"{name}.engine", replacement)
+        self.assertIs(module.engine, replacement)
+        get_registry().reset(f"{name}.engine")
+        self.assertNotIn("engine", module.__dict__)
+        self.assertIsNot(module.engine, replacement)
+
+    def test_import_constructs_nothing_and_starts_no_threads(self):
+        report = profile_imports(LAZY_MODULES)
+        imported = [module for module in LAZY_MODULES if module not in report["errors"]]
+        self.assertTrue(imported, report["errors"])
+        self.assertEqual(report["constructed_at_import"], [])
+        self.assertEqual(report["threads_after_import"], [])
+        self.assertTrue(any(entry["module"].startswith("mia.core") for entry in report["slowest_imports"]))
+
+        # The monitor writes under mia_data/ relative to the working directory
+        with tempfile.TemporaryDirectory() as workdir:
+            completed = subprocess.run([sys.executable, "-c", FIRST_USE_SCRIPT.format(root=str(project_root.resolve()))],
+                                       capture_output=True, text=True, timeout=120, cwd=workdir)
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        self.assertEqual(result["before"], [])
+        self.assertTrue(result["after"])
+        self.assertTrue(result["cached"])
+
+    def test_mia_main_cold_import_budget(self):
+        report = profile_imports(["mia_main"])
+        if report["errors"] or report["returncode"]:
+            self.skipTest(f"mia_main dependencies missing: {report['errors']}")
+        self.assertLess(report["import_seconds"], 3.0)
+        self.assertEqual(report["constructed_at_import"], [])
+        self.assertEqual(report["threads_after_import"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Tests for session_runtime.py
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.session_runtime import (
+    AdmissionController, AdmissionRejected, SessionHistory, SessionRuntime, StubBackend,
+    benchmark_sessions, jain_fairness
+)
+from mia.compliance.data_map import registered_subject_stores
+
+
+class FakeClient:
+    """Collects what the runtime sends to one simulated WebSocket"""
+
+    def __init__(self):
+        self.replies = asyncio.Queue()
+
+    async def send(self, payload):
+        await self.replies.put(payload)
+
+    async def next(self, timeout=2.0):
+        return await asyncio.wait_for(self.replies.get(), timeout)
+
+
+class TestSessionRuntime(unittest.TestCase):
+    """Test cases for session_runtime.py"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def runtime(self, handler, **kwargs):
+        kwargs.setdefault("admission", AdmissionController(max_concurrent=2, max_waiting=8, max_wait=5.0))
+        kwargs.setdefault("history_dir", str(self.directory / "sessions"))
+        return SessionRuntime(handler, **kwargs)
+
+    def test_new_message_cancels_generation_in_flight(self):
+        backend = StubBackend(base_latency=0.3)
+
+        async def handler(session, request):
+            return await backend.generate(request.content)
+
+        async def scenario():
+            runtime = self.runtime(handler)
+            client = FakeClient()
+            session = runtime.open(client.send)
+            await runtime.submit(session, {"type": "user_message", "content": "slow", "id": "a"})
+            await asyncio.sleep(0.05)
+            await runtime.submit(session, {"type": "user_message", "content": "fast", "id": "b"})
+            first = await client.next()
+            second = await client.next()
+            await runtime.close(session)
+            return runtime, first, second
+
+        runtime, first, second = asyncio.run(scenario())
+        self.assertEqual(first, {**first, "type": "cancelled", "request_id": "a", "reason": "superseded"})
+        self.assertEqual(second["type"], "assistant")
+        self.assertEqual(second["content"], "echo: fast")
+        self.assertEqual(second["request_id"], "b")
+        # Cancellation reached the backend call itself
+        self.assertEqual(backend.cancelled, 1)
+        self.assertEqual(backend.in_flight, 0)
+        self.assertEqual(runtime.admission.active, 0)
+        self.assertEqual(runtime.stats["cancelled"], 1)
+
+    def test_explicit_cancel(self):
+        backend = StubBackend(base_latency=5.0)
+
+        async def handler(session, request):
+            return await backend.generate(request.content)
+
+        async def scenario():
+            runtime = self.runtime(handler)
+            client = FakeClient()
+            session = runtime.open(client.send)
+            await runtime.submit(session, {"type": "user_message", "content": "long", "id": "x"})
+            await asyncio.sleep(0.05)
+            await runtime.submit(session, {"type": "cancel"})
+            reply = await client.next()
+            await asyncio.sleep(0.05)
+            status = runtime.get_status()
+            await runtime.close(session)
+            return reply, status
+
+        reply, status = asyncio.run(scenario())
+        self.assertEqual((reply["type"], reply["reason"]), ("cancelled", "cancelled"))
+        self.assertEqual(backend.cancelled, 1)
+        self.assertEqual(status["in_flight"], 0)
+
+    def test_pipelined_requests_in_order_with_bounded_queue(self):
+        order = []
+
+        async def handler(session, request):
+            order.append(request.content)
+            await asyncio.sleep(0.02)
+            return request.content.upper()
+
+        async def scenario():
+            runtime = self.runtime(handler, max_queue=3)
+            client = FakeClient()
+            session = runtime.open(client.send)
+            for content in ["a", "b", "c", "d", "e"]:
+                await runtime.submit(session, {"type": "user_message", "content": content, "supersede": False})
+            replies = [await client.next() for _ in range(5)]
+            await runtime.close(session)
+            return session, replies
+
+        session, replies = asyncio.run(scenario())
+        busy = [reply for reply in replies if reply["type"] == "busy"]
+        answers = [reply["content"] for reply in replies if reply["type"] == "assistant"]
+        # All five arrive before the worker takes the first one; the queue holds three
+        self.assertEqual(len(busy), 2)
+        self.assertEqual({reply["reason"] for reply in busy}, {"session_queue_full"})
+        self.assertEqual(answers, ["A", "B", "C"])
+        self.assertEqual(order, ["a", "b", "c"])
+        self.assertEqual([m["role"] for m in session.history.recent(2)], ["user", "assistant"])
+
+    def test_handler_error_reply(self):
+        async def handler(session, request):
+            raise RuntimeError("backend down")
+
+        async def scenario():
+            runtime = self.runtime(handler)
+            client = FakeClient()
+            session = runtime.open(client.send)
+            await runtime.submit(session, {"type": "user_message", "content": "hi"})
+            reply = await client.next()
+            await runtime.close(session)
+            return runtime, reply
+
+        runtime, reply = asyncio.run(scenario())
+        self.assertEqual(reply["type"], "error")
+        self.assertEqual(runtime.stats["errors"], 1)
+
+    def test_admission_round_robin_between_sessions(self):
+        async def scenario():
+            admission = AdmissionController(max_concurrent=1, max_waiting=10, max_wait=5.0)
+            await admission.acquire("holder")
+            served = []
+
+            async def request(session_id):
+                async with admission.slot(session_id):
+                    served.append(session_id)
+
+            tasks = [asyncio.create_task(request(session_id)) for session_id in ["a", "a", "a", "b", "c"]]
+            await asyncio.sleep(0.01)
+            admission.release()
+            await asyncio.gather(*tasks)
+            return admission, served
+
+        admission, served = asyncio.run(scenario())
+        self.assertEqual(served, ["a", "b", "c", "a", "a"])
+        self.assertEqual((admission.active, admission.waiting), (0, 0))
+
+    def test_admission_sheds_load(self):
+        async def scenario():
+            admission = AdmissionController(max_concurrent=1, max_waiting=1, max_wait=0.1)
+            await admission.acquire("a")
+            waiter = asyncio.create_task(admission.acquire("b"))
+            await asyncio.sleep(0.01)
+            with self.assertRaises(AdmissionRejected) as full:
+                await admission.acquire("c")
+            with self.assertRaises(AdmissionRejected) as timeout:
+                await waiter
+            return admission, full.exception.reason, timeout.exception.reason
+
+        admission, full, timeout = asyncio.run(scenario())
+        self.assertEqual(full, "server_busy")
+        self.assertEqual(timeout, "admission_timeout")
+        self.assertEqual(admission.waiting, 0)
+        self.assertEqual(admission.active, 1)
+
+    def test_busy_reply_when_backend_saturated(self):
+        release = None
+
+        async def handler(session, request):
+            await release.wait()
+            return "done"
+
+        async def scenario():
+            nonlocal release
+            release = asyncio.Event()
+            admission = AdmissionController(max_concurrent=1, max_waiting=1, max_wait=5.0)
+            runtime = self.runtime(handler, admission=admission)
+            clients = [FakeClient() for _ in range(3)]
+            sessions = [runtime.open(client.send) for client in clients]
+            for session in sessions:
+                await runtime.submit(session, {"type": "user_message", "content": "hi"})
+                await asyncio.sleep(0.01)
+            busy = await clients[2].next()
+            release.set()
+            replies = [await clients[0].next(), await clients[1].next()]
+            for session in sessions:
+                await runtime.close(session)
+            return busy, replies
+
+        busy, replies = asyncio.run(scenario())
+        self.assertEqual((busy["type"], busy["reason"]), ("busy", "server_busy"))
+        self.assertEqual([reply["content"] for reply in replies], ["done", "done"])
+
+    def test_session_limit(self):
+        async def scenario():
+            runtime = self.runtime(lambda session, request: None, max_sessions=2)
+            sessions = [runtime.open(FakeClient().send) for _ in range(3)]
+            for session in sessions[:2]:
+                await runtime.close(session)
+            return runtime, sessions
+
+        runtime, sessions = asyncio.run(scenario())
+        self.assertIsNone(sessions[2])
+        self.assertEqual(runtime.stats["rejected_sessions"], 1)
+        self.assertEqual(runtime.sessions, {})
+
+    def test_history_spills_to_storage(self):
+        history = SessionHistory(limit=4, spill_path=self.directory / "s1.jsonl")
+        for i in range(10):
+            history.append({"role": "user", "content": str(i)})
+        self.assertEqual([m["content"] for m in history.recent()], ["6", "7", "8", "9"])
+        self.assertEqual(history.spilled, 6)
+        lines = (self.directory / "s1.jsonl").read_text().splitlines()
+        self.assertEqual(json.loads(lines[0])["content"], "0")
+        self.assertEqual([m["content"] for m in history.load_all()], [str(i) for i in range(10)])
+
+    def test_history_store_by_subject(self):
+        async def handler(session, request):
+            return f"re: {request.content}"
+
+        async def scenario():
+            runtime = self.runtime(handler, history_limit=2)
+            store = runtime.history_store
+            client = FakeClient()
+            ana = runtime.open(client.send, subject_id="ana")
+            guest = runtime.open(client.send)
+            for session, count in [(ana, 3), (guest, 1)]:
+                for i in range(count):
+                    await runtime.submit(session, {"type": "user_message", "content": f"m{i}", "supersede": False})
+                    await client.next()
+
+            self.assertIn(store, registered_subject_stores().values())
+            # Three exchanges, two messages each: four spilled to disk, two still in memory
+            self.assertEqual(len(store.find_subject_records("ana")), 6)
+            exported = store.export_subject_data("ana")
+            self.assertEqual([m["content"] for m in exported[ana.session_id]],
+                             ["m0", "re: m0", "m1", "re: m1", "m2", "re: m2"])
+            self.assertEqual(len(store.find_subject_records(guest.session_id)), 2)
+
+            self.assertEqual(store.erase_subject_data("ana"), 6)
+            self.assertEqual(store.find_subject_records("ana"), [])
+            self.assertFalse(store.subject_dir("ana").exists())
+            self.assertEqual(len(store.find_subject_records(guest.session_id)), 2)
+            await runtime.shutdown()
+
+        asyncio.run(scenario())
+
+    def test_runtimes_sharing_a_directory_share_the_store(self):
+        async def handler(session, request):
+            return f"re: {request.content}"
+
+        async def scenario():
+            # ChatInterface and UnifiedInterfaceSystem both file under mia_data/interfaces/sessions
+            chat = self.runtime(handler)
+            unified = self.runtime(handler)
+            self.assertIs(chat.history_store, unified.history_store)
+            stores = [store for store in registered_subject_stores().values() if store is chat.history_store]
+            self.assertEqual(len(stores), 1)
+
+            client = FakeClient()
+            for runtime in (chat, unified):
+                session = runtime.open(client.send, subject_id="ana")
+                await runtime.submit(session, {"type": "user_message", "content": "hi", "supersede": False})
+                await client.next()
+
+            self.assertEqual(len(chat.history_store.export_subject_data("ana")), 2)
+            self.assertEqual(chat.history_store.erase_subject_data("ana"), 4)
+            for runtime in (chat, unified):
+                self.assertEqual([len(s.history.messages) for s in runtime.sessions.values()], [0])
+                await runtime.shutdown()
+
+        asyncio.run(scenario())
+
+    def test_jain_fairness(self):
+        self.assertAlmostEqual(jain_fairness([3.0, 3.0, 3.0]), 1.0)
+        self.assertAlmostEqual(jain_fairness([1.0, 0.0, 0.0, 0.0]), 1.0)
+        self.assertAlmostEqual(jain_fairness([4.0, 1.0, 1.0, 1.0, 1.0]), 64 / 100)
+
+    def test_load_benchmark(self):
+        result = benchmark_sessions(clients=20, heavy_clients=2, duration=0.5, capacity=4)
+        managed = result["session_runtime"]
+        direct = result["direct"]
+        self.assertEqual(managed["backend_peak_concurrency"], 4)
+        self.assertGreater(managed["fairness"], 0.95)
+        self.assertGreater(managed["fairness"], direct["fairness"])
+        self.assertGreater(managed["replies"], direct["replies"])
+        self.assertGreater(result["p99_improvement"], 2.0)
+        self.assertLessEqual(managed["light_client_latency"]["p50"], managed["light_client_latency"]["p99"])
+
+
+if __name__ == "__main__":
+    unittest.main()
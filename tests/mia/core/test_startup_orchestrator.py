@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for startup_orchestrator.py
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.startup_orchestrator import (
+    ResourceClass, StartupOrchestrator, StartupStep, benchmark_startup
+)
+
+
+def sleeper(seconds, log=None, name=None):
+    def run():
+        if log is not None:
+            log.append(("start", name))
+        time.sleep(seconds)
+        if log is not None:
+            log.append(("end", name))
+        return name
+    return run
+
+
+class TestStartupOrchestrator(unittest.TestCase):
+    """Test cases for startup_orchestrator.py"""
+
+    def setUp(self):
+        self.trace_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.trace_dir, True)
+
+    def run_orchestrator(self, steps, **kwargs):
+        orchestrator = StartupOrchestrator(steps, trace_dir=self.trace_dir, **kwargs)
+        success = asyncio.run(orchestrator.run(wait_deferred=True))
+        return orchestrator, success
+
+    def test_independent_steps_run_concurrently_in_dependency_order(self):
+        log = []
+        steps = [
+            StartupStep("a", sleeper(0.2, log, "a")),
+            StartupStep("b", sleeper(0.2, log, "b")),
+            StartupStep("c", sleeper(0.2, log, "c"), resource=ResourceClass.SUBPROCESS),
+            StartupStep("d", sleeper(0.01, log, "d"), depends_on=["a", "b"])
+        ]
+        started = time.perf_counter()
+        orchestrator, success = self.run_orchestrator(steps)
+        elapsed = time.perf_counter() - started
+        self.assertTrue(success)
+        self.assertLess(elapsed, 0.45)
+        self.assertGreater(log.index(("start", "d")), log.index(("end", "a")))
+        self.assertGreater(log.index(("start", "d")), log.index(("end", "b")))
+        self.assertEqual(orchestrator.results["d"].value, "d")
+
+    def test_resource_limits(self):
+        active = []
+        peak = [0]
+        lock = threading.Lock()
+
+        def limited():
+            with lock:
+                active.append(1)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+        steps = [StartupStep(f"proc_{i}", limited, resource=ResourceClass.SUBPROCESS) for i in range(6)]
+        _, success = self.run_orchestrator(steps, limits={ResourceClass.SUBPROCESS: 2})
+        self.assertTrue(success)
+        self.assertEqual(peak[0], 2)
+
+    def test_timeout_and_failure_skip_dependents(self):
+        def broken():
+            raise RuntimeError("no config")
+
+        steps = [
+            StartupStep("slow", sleeper(1.0), timeout=0.1),
+            StartupStep("after_slow", sleeper(0.0), depends_on=["slow"]),
+            StartupStep("broken", broken),
+            StartupStep("after_broken", sleeper(0.0), depends_on=["broken"]),
+            StartupStep("disabled", sleeper(0.0), condition=lambda: False),
+            StartupStep("after_disabled", sleeper(0.0), depends_on=["disabled"])
+        ]
+        orchestrator, success = self.run_orchestrator(steps)
+        self.assertFalse(success)
+        results = orchestrator.results
+        self.assertEqual(results["slow"].status, "timeout")
+        self.assertEqual(results["after_slow"].status, "skipped")
+        self.assertIn("slow", results["after_slow"].error)
+        self.assertEqual(results["broken"].status, "failed")
+        self.assertIn("no config", results["broken"].error)
+        self.assertEqual(results["after_broken"].status, "skipped")
+        self.assertTrue(results["disabled"].succeeded)
+        self.assertEqual(results["after_disabled"].status, "ok")
+
+    def test_optional_steps_deferred_until_ready(self):
+        log = []
+        steps = [
+            StartupStep("core", sleeper(0.05, log, "core")),
+            StartupStep("ui", sleeper(0.05, log, "ui"), depends_on=["core"]),
+            StartupStep("extra", sleeper(0.2, log, "extra"), optional=True),
+            StartupStep("extra_failing", lambda: 1 / 0, optional=True)
+        ]
+        orchestrator = StartupOrchestrator(steps, ready_step="ui", trace_dir=self.trace_dir)
+
+        async def boot():
+            success = await orchestrator.run()
+            finished_before = ("end", "extra") in log
+            await orchestrator.wait_deferred()
+            return success, finished_before
+
+        success, finished_before = asyncio.run(boot())
+        self.assertTrue(success)
+        self.assertFalse(finished_before)
+        self.assertGreater(log.index(("start", "extra")), log.index(("end", "ui")))
+        self.assertEqual(orchestrator.results["extra_failing"].status, "failed")
+        self.assertGreaterEqual(orchestrator.results["extra"].started, orchestrator.ready_at)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            StartupOrchestrator([StartupStep("a", sleeper(0)), StartupStep("a", sleeper(0))])
+        invalid = [
+            [StartupStep("a", sleeper(0), depends_on=["missing"])],
+            [StartupStep("a", sleeper(0), depends_on=["b"]), StartupStep("b", sleeper(0), depends_on=["a"])],
+            [StartupStep("a", sleeper(0), optional=True), StartupStep("b", sleeper(0), depends_on=["a"])]
+        ]
+        for steps in invalid:
+            with self.assertRaises(ValueError):
+                asyncio.run(StartupOrchestrator(steps, trace_dir=None).run())
+
+    def test_chrome_trace(self):
+        async def on_loop():
+            await asyncio.sleep(0.01)
+            return threading.current_thread() is threading.main_thread()
+
+        steps = [
+            StartupStep("config", sleeper(0.02)),
+            StartupStep("loop_step", on_loop, depends_on=["config"]),
+            StartupStep("deferred", sleeper(0.01), optional=True)
+        ]
+        orchestrator, _ = self.run_orchestrator(steps, ready_step="loop_step", name="boot")
+        self.assertTrue(orchestrator.results["loop_step"].value)
+
+        trace = json.loads(orchestrator.trace_path.read_text())
+        events = trace["traceEvents"]
+        complete = {event["name"]: event for event in events if event["ph"] == "X"}
+        self.assertEqual(set(complete), {"config", "loop_step", "deferred"})
+        for event in complete.values():
+            self.assertGreater(event["dur"], 0)
+            self.assertIn("status", event["args"])
+        self.assertGreaterEqual(complete["loop_step"]["ts"], complete["config"]["ts"] + complete["config"]["dur"])
+        milestones = {event["name"] for event in events if event["ph"] == "i"}
+        self.assertEqual(milestones, {"ready", "required_complete", "deferred_complete"})
+        self.assertEqual(events[0]["ph"], "M")
+
+    def test_old_traces_pruned(self):
+        for _ in range(3):
+            self.run_orchestrator([StartupStep("a", sleeper(0))], keep_traces=2)
+            time.sleep(1.05)
+        self.assertEqual(len(list(Path(self.trace_dir).glob("mia-*.json"))), 2)
+
+    def test_time_to_first_chat_benchmark(self):
+        result = benchmark_startup(scale=0.5)
+        self.assertTrue(result["success"])
+        self.assertGreater(result["first_chat_speedup"], 2.0)
+        self.assertLess(result["orchestrated"]["total_seconds"], result["sequential"]["total_seconds"])
+        self.assertEqual(result["steps"]["install_dependencies"]["status"], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
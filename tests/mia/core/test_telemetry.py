@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for telemetry.py
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.telemetry import SystemTelemetry, TelemetrySnapshot, empty_snapshot, make_reader
+
+
+class ScriptedReader:
+    """Reader returning snapshots with a scripted memory_percent"""
+
+    def __init__(self, values):
+        self.values = list(values)
+        self.reads = 0
+
+    def read(self) -> TelemetrySnapshot:
+        value = self.values[min(self.reads, len(self.values) - 1)]
+        self.reads += 1
+        return replace(empty_snapshot(), memory_percent=value, monotonic=time.monotonic())
+
+
+class TestTelemetry(unittest.TestCase):
+    """Test cases for telemetry.py"""
+
+    def test_reader_snapshot(self):
+        snapshot = make_reader().read()
+        self.assertGreater(snapshot.memory_total, 0)
+        self.assertGreater(snapshot.disk_total, 0)
+        self.assertGreaterEqual(snapshot.cpu_percent, 0.0)
+        self.assertLessEqual(snapshot.memory_percent, 100.0)
+        self.assertGreater(snapshot.process_rss, 0)
+        self.assertIn("cpu_percent", snapshot.as_dict())
+
+    def test_latest_never_blocks(self):
+        telemetry = SystemTelemetry(interval=0.01)
+        try:
+            telemetry.start()
+            worst = 0.0
+            deadline = time.monotonic() + 0.3
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                telemetry.latest()
+                telemetry.history(1.0)
+                worst = max(worst, time.perf_counter() - started)
+            # Far below a blocking cpu_percent(interval=1); GIL switches still apply
+            self.assertLess(worst, 0.05)
+            self.assertGreater(telemetry.stats.samples, 5)
+        finally:
+            telemetry.stop()
+
+    def test_async_stream_does_not_block_loop(self):
+        telemetry = SystemTelemetry(interval=0.02)
+
+        async def scenario():
+            ticks = 0
+            received = []
+
+            async def ticker():
+                nonlocal ticks
+                while len(received) < 5:
+                    ticks += 1
+                    await asyncio.sleep(0.001)
+
+            async def consumer():
+                async for snapshot in telemetry.stream():
+                    received.append(snapshot)
+                    if len(received) == 5:
+                        break
+
+            await asyncio.gather(ticker(), consumer())
+            return ticks, received
+
+        try:
+            ticks, received = asyncio.run(scenario())
+        finally:
+            telemetry.stop()
+        self.assertEqual(len(received), 5)
+        self.assertGreater(ticks, 20)
+        self.assertEqual(telemetry.get_status()["subscribers"], 0)
+
+    def test_threshold_hysteresis(self):
+        fired = []
+        telemetry = SystemTelemetry(interval=3600, reader=ScriptedReader([50, 95, 96, 88, 80, 97]))
+        telemetry.on_threshold("memory_percent", 90, lambda s, metric, value: fired.append(value),
+                               clear_margin=5)
+        for _ in range(5):
+            telemetry._sample()
+        telemetry.stop()
+        # 96 does not re-fire, 88 is inside the margin, 80 re-arms, 97 fires again
+        self.assertEqual(fired, [95, 97])
+
+    def test_subscribers_and_history(self):
+        seen = []
+        telemetry = SystemTelemetry(interval=3600, history_size=3, reader=ScriptedReader([10, 20, 30, 40]))
+        telemetry.subscribe(lambda snapshot: seen.append(snapshot.memory_percent))
+        for _ in range(3):
+            telemetry._sample()
+        telemetry.stop()
+        self.assertEqual(seen, [10, 20, 30, 40])
+        self.assertEqual([s.memory_percent for s in telemetry.history()], [20, 30, 40])
+        self.assertAlmostEqual(telemetry.average("memory_percent", 3600), 30.0)
+        with self.assertRaises(ValueError):
+            telemetry.on_threshold("no_such_metric", 1, lambda *args: None)
+
+    def test_sampling_overhead_budget(self):
+        telemetry = SystemTelemetry(interval=0.05)
+        try:
+            telemetry.start()
+            time.sleep(1.0)
+        finally:
+            telemetry.stop()
+        # Twenty samples a second must stay below 5% of one core
+        self.assertGreater(telemetry.stats.samples, 10)
+        self.assertLess(telemetry.stats.overhead_ratio(time.monotonic()), 0.05)
+
+    def test_many_readers_one_sampler(self):
+        telemetry = SystemTelemetry(interval=0.01)
+        errors = []
+
+        def reader():
+            try:
+                for _ in range(2000):
+                    snapshot = telemetry.latest()
+                    assert snapshot.memory_total > 0
+            except Exception as e:
+                errors.append(e)
+
+        try:
+            threads = [threading.Thread(target=reader) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            telemetry.stop()
+        self.assertEqual(errors, [])
+        self.assertFalse(telemetry.running)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for text_encoder.py
+"""
+
+import math
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.text_encoder import (
+    TextEncoder, get_text_encoder, murmur3_32, NUMPY_AVAILABLE, SCIPY_AVAILABLE
+)
+
+
+class TestTextEncoder(unittest.TestCase):
+    """Test cases for text_encoder.py"""
+
+    def test_murmur3_reference_vectors(self):
+        """Hash matches published MurmurHash3_x86_32 values"""
+        self.assertEqual(murmur3_32(b"", 0), 0)
+        self.assertEqual(murmur3_32(b"hello", 0), 0x248BFA47)
+        self.assertEqual(murmur3_32(b"The quick brown fox jumps over the lazy dog", 0), 0x2E4FF723)
+
+    def test_stable_across_processes(self):
+        """Embeddings do not depend on PYTHONHASHSEED"""
+        code = ("from mia.core.text_encoder import TextEncoder;"
+                "print(sorted(TextEncoder().features('stable embeddings across restarts').items()))")
+        outputs = set()
+        for seed in ("1", "2"):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            result = subprocess.run([sys.executable, "-c", code], cwd=str(project_root),
+                                    env=env, capture_output=True, text=True, check=True)
+            outputs.add(result.stdout)
+        self.assertEqual(len(outputs), 1)
+
+    def test_encode_is_normalized(self):
+        vector = TextEncoder(dim=64).encode("memory memory memory system")
+        self.assertEqual(len(vector), 64)
+        self.assertAlmostEqual(math.sqrt(sum(v * v for v in vector)), 1.0, places=6)
+        self.assertEqual(TextEncoder(dim=64).encode(""), [0.0] * 64)
+
+    def test_sublinear_tf(self):
+        encoder = TextEncoder(dim=4096, alternate_sign=False)
+        feats = encoder.features("alpha alpha alpha alpha beta")
+        alpha, _ = encoder._bucket("alpha")
+        beta, _ = encoder._bucket("beta")
+        self.assertAlmostEqual(feats[alpha] / feats[beta], 1.0 + math.log(4), places=6)
+
+    def test_char_ngrams_match_morphology(self):
+        encoder = TextEncoder(dim=4096, char_ngrams=(3, 4))
+
+        def cosine(a, b):
+            fa, fb = encoder.features(a), encoder.features(b)
+            return sum(w * fb.get(i, 0.0) for i, w in fa.items())
+
+        self.assertGreater(cosine("learning", "learned"), 0.2)
+
+    def test_version_reflects_configuration(self):
+        self.assertNotEqual(TextEncoder(dim=384).version, TextEncoder(dim=512).version)
+        self.assertNotEqual(TextEncoder().version, TextEncoder(char_ngrams=(3, 5)).version)
+        self.assertTrue(TextEncoder().is_current(TextEncoder().version))
+        self.assertFalse(TextEncoder().is_current(None))
+
+    def test_shared_instance(self):
+        self.assertIs(get_text_encoder(128), get_text_encoder(128))
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+    def test_batch_matches_single(self):
+        import numpy as np
+        encoder = TextEncoder(dim=256)
+        texts = ["first text", "", "second text with more words words"]
+        batch = encoder.encode_batch(texts)
+        self.assertEqual(batch.shape, (3, 256))
+        self.assertEqual(batch.dtype, np.float32)
+        for row, text in zip(batch, texts):
+            np.testing.assert_allclose(row, encoder.encode(text), atol=1e-6)
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not installed")
+    def test_sparse_matches_dense(self):
+        encoder = TextEncoder(dim=1 << 20, char_ngrams=(3, 3))
+        texts = ["sparse output", "for large vocabularies"]
+        matrix = encoder.encode_sparse(texts)
+        self.assertEqual(matrix.shape, (2, 1 << 20))
+        for row, text in enumerate(texts):
+            feats = encoder.features(text)
+            self.assertEqual(matrix[row].nnz, len(feats))
+
+
+if __name__ == "__main__":
+    unittest.main()
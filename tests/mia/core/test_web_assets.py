@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for web_assets.py
+"""
+
+import gzip
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.web_assets import IMMUTABLE, REVALIDATE, AssetPipeline, _sample_pages, benchmark_assets
+
+
+class TestAssetPipeline(unittest.TestCase):
+    """Test cases for web_assets.py"""
+
+    def setUp(self):
+        self.pages, self.static = _sample_pages(scale=4)
+        self.pipeline = AssetPipeline(brotli_enabled=False)
+        for source_url, (name, content) in self.static.items():
+            self.pipeline.add_static(name, content, source_url=source_url)
+        for url, render in self.pages.items():
+            self.pipeline.add_page(url, render)
+
+    def test_fingerprinted_urls_and_rewritten_references(self):
+        css_url = self.pipeline.url_for("/static/unified.css")
+        self.assertRegex(css_url, r"^/assets/unified\.[0-9a-f]{12}\.css$")
+        html = self.pipeline.respond("/").body.decode("utf-8")
+        self.assertIn(css_url, html)
+        self.assertIn(self.pipeline.url_for("/static/unified.js"), html)
+        self.assertNotIn("/static/unified.css", html)
+
+        # Changed content gets a new URL
+        other = AssetPipeline(brotli_enabled=False)
+        self.assertNotEqual(other.add_static("unified.css", self.static["/static/unified.css"][1] + "\n"), css_url)
+        self.assertIsNone(self.pipeline.respond("/missing"))
+
+    def test_gzip_negotiation(self):
+        identity = self.pipeline.respond("/chat")
+        compressed = self.pipeline.respond("/chat", "gzip, deflate")
+        self.assertNotIn("Content-Encoding", identity.headers)
+        self.assertEqual(compressed.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(compressed.body), identity.body)
+        self.assertLess(len(compressed.body), len(identity.body) / 2)
+        self.assertEqual(compressed.headers["Content-Length"], str(len(compressed.body)))
+        self.assertEqual(compressed.headers["Vary"], "Accept-Encoding")
+        self.assertNotEqual(compressed.headers["ETag"], identity.headers["ETag"])
+
+        self.assertNotIn("Content-Encoding", self.pipeline.respond("/chat", "gzip;q=0, deflate").headers)
+        self.assertEqual(self.pipeline.respond("/chat", "*").headers["Content-Encoding"], "gzip")
+
+    def test_not_modified(self):
+        first = self.pipeline.respond("/dashboard", "gzip")
+        etag = first.headers["ETag"]
+        for if_none_match in [etag, f"W/{etag}", f'"other", {etag}', "*"]:
+            response = self.pipeline.respond("/dashboard", "gzip", if_none_match)
+            self.assertEqual(response.status, 304, if_none_match)
+            self.assertEqual(response.body, b"")
+            self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(self.pipeline.respond("/dashboard", "gzip", '"stale"').status, 200)
+        self.assertEqual(self.pipeline.stats["not_modified"], 4)
+
+    def test_not_modified_only_for_selected_encoding(self):
+        gzip_etag = self.pipeline.respond("/dashboard", "gzip").headers["ETag"]
+        identity = self.pipeline.respond("/dashboard", "", gzip_etag)
+        self.assertEqual(identity.status, 200)
+        self.assertNotIn("Content-Encoding", identity.headers)
+        self.assertEqual(self.pipeline.respond("/dashboard", "gzip", gzip_etag).status, 304)
+
+    def test_cache_control(self):
+        page = self.pipeline.respond("/")
+        asset = self.pipeline.respond(self.pipeline.url_for("/static/unified.js"))
+        self.assertEqual(page.headers["Cache-Control"], REVALIDATE)
+        self.assertEqual(asset.headers["Cache-Control"], IMMUTABLE)
+        self.assertRegex(asset.headers["Content-Type"], r"^(text|application)/javascript; charset=utf-8$")
+        self.assertEqual(page.headers["Content-Type"], "text/html; charset=utf-8")
+
+    def test_small_bodies_not_compressed(self):
+        self.pipeline.add_page("/tiny", "Dashboard HTML content here...")
+        self.assertNotIn("Content-Encoding", self.pipeline.respond("/tiny", "gzip").headers)
+
+    def test_write_and_load(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, True)
+        self.pipeline.write(directory)
+        loaded = AssetPipeline.load(directory)
+        self.assertEqual(loaded.references, self.pipeline.references)
+        for url in self.pipeline.assets:
+            original = self.pipeline.respond(url, "gzip")
+            self.assertEqual(loaded.respond(url, "gzip").headers, original.headers)
+            self.assertEqual(loaded.respond(url, "gzip").body, original.body)
+
+    def test_benchmark_against_render_per_request(self):
+        result = benchmark_assets(requests=200)
+        self.assertGreater(result["byte_savings"], 0.8)
+        self.assertEqual(result["conditional"]["statuses"], [304])
+        self.assertEqual(result["conditional"]["bytes_per_request"], 0)
+        self.assertLess(result["pipeline"]["static_bytes_first_visit"], result["legacy"]["static_bytes_per_visit"] / 2)
+        # Serving prebuilt bytes costs far less CPU than compressing per request
+        self.assertGreater(result["cpu_vs_legacy_gzip"], 5.0)
+        self.assertLess(result["pipeline"]["cpu_per_request_us"], 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for world_model_index.py
+"""
+
+import random
+import sys
+import tempfile
+import unittest
+from enum import Enum
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.core.world_model_index import ChangeJournal, EntityIndex, IncrementalTopologicalOrder
+
+
+class Kind(Enum):
+    CONCEPT = "concept"
+    AGENT = "agent"
+
+
+class Level(Enum):
+    LOW = 0.4
+    HIGH = 0.8
+
+
+class TestWorldModelIndex(unittest.TestCase):
+    """Test cases for world_model_index.py"""
+
+    def test_entity_index_query(self):
+        index = EntityIndex()
+        index.add("1", "Time", Kind.CONCEPT, Level.HIGH)
+        index.add("2", "timer", Kind.AGENT, Level.LOW)
+        index.add("3", "space", Kind.CONCEPT, Level.LOW)
+
+        self.assertEqual(index.named("TIME"), ["1"])
+        self.assertEqual(index.query(entity_type=Kind.CONCEPT), ["1", "3"])
+        self.assertEqual(index.query(name_pattern="tim"), ["1", "2"])
+        self.assertEqual(index.query(name_pattern="tim", min_confidence=0.6), ["1"])
+        self.assertEqual(index.query(), ["1", "2", "3"])
+
+    def test_entity_index_replace(self):
+        index = EntityIndex()
+        index.add("1", "time", Kind.CONCEPT, Level.LOW)
+        index.add("1", "time", Kind.CONCEPT, Level.HIGH)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.query(min_confidence=0.8), ["1"])
+        self.assertNotIn(Level.LOW, index.by_confidence)
+
+    def test_cycle_rejected(self):
+        order = IncrementalTopologicalOrder()
+        self.assertTrue(order.add_edge("dog", "mammal"))
+        self.assertTrue(order.add_edge("mammal", "animal"))
+        self.assertFalse(order.add_edge("animal", "dog"))
+        self.assertFalse(order.add_edge("dog", "dog"))
+        self.assertFalse(order.has_edge("animal", "dog"))
+        self.assertTrue(order.reaches("dog", "animal"))
+        self.assertFalse(order.reaches("animal", "dog"))
+
+    def test_order_stays_topological(self):
+        rng = random.Random(3)
+        order = IncrementalTopologicalOrder()
+        rank = list(range(300))
+        rng.shuffle(rank)
+        for node in range(300):
+            order.add_node(str(node))
+        for _ in range(2000):
+            a, b = rng.sample(range(300), 2)
+            if rank[a] > rank[b]:
+                a, b = b, a
+            self.assertTrue(order.add_edge(str(a), str(b)))
+        for source, targets in order.successors.items():
+            for target in targets:
+                self.assertLess(order.order[source], order.order[target])
+        self.assertEqual(len(set(order.order.values())), 300)
+
+    def test_reaches_after_remove(self):
+        order = IncrementalTopologicalOrder()
+        order.add_edge("a", "b")
+        order.add_edge("b", "c")
+        order.remove_edge("b", "c")
+        self.assertFalse(order.reaches("a", "c"))
+        self.assertTrue(order.add_edge("c", "a"))
+
+    def test_journal_batches_and_replays(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "journal.jsonl"
+            journal = ChangeJournal(path, batch_size=3)
+            journal.append({"kind": "entity", "n": 1})
+            journal.append({"kind": "entity", "n": 2})
+            self.assertFalse(path.exists())
+            journal.append({"kind": "entity", "n": 3})
+            self.assertEqual(journal.records, 3)
+            journal.append({"kind": "entity", "n": 4})
+            journal.flush()
+
+            with open(path, "a") as f:
+                f.write('{"kind": "ent')
+            reopened = ChangeJournal(path)
+            self.assertEqual(reopened.records, 4)
+            reopened.append({"kind": "entity", "n": 5})
+            reopened.flush()
+            self.assertEqual([r["n"] for r in reopened.replay()], [1, 2, 3, 4, 5])
+            reopened.reset()
+            self.assertEqual(list(reopened.replay()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for deduplication.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.knowledge.hybrid.deduplication import (
+    DeduplicationEngine, MinHasher, _synthetic_graph, jaccard, label_shingles, normalize_label
+)
+
+
+class TestDeduplication(unittest.TestCase):
+    """Test cases for deduplication.py"""
+
+    def test_normalize_label(self):
+        for label in ("MachineLearning", "machine_learning", "Machine  learning", "MACHINE-LEARNING"):
+            self.assertEqual(normalize_label(label), "machine learning")
+
+    def test_minhash_estimates_jaccard(self):
+        hasher = MinHasher(128)
+        a = {f"f{i}" for i in range(200)}
+        b = {f"f{i}" for i in range(50, 250)}
+        sig_a, sig_b = hasher.signature(a), hasher.signature(b)
+        estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / 128
+        self.assertAlmostEqual(estimate, jaccard(frozenset(a), frozenset(b)), delta=0.15)
+        self.assertEqual(hasher.signature(["x"]), hasher.signature(["x"]))
+
+    def test_duplicates_merge_into_oldest(self):
+        engine = DeduplicationEngine()
+        engine.upsert("python", "Python", "programming language", ["uses data"], rank=1)
+        engine.upsert("pythons", "pythons", "", ["uses data"], rank=2)
+        engine.upsert("java", "Java", "programming language", ["uses data"], rank=3)
+        engine.upsert("javascript", "JavaScript", "programming language", ["uses data"], rank=4)
+        report = engine.find_duplicates()
+        self.assertEqual([(m.duplicate, m.canonical) for m in report.matches], [("pythons", "python")])
+        self.assertNotIn("pythons", engine.items)
+
+    def test_different_versions_never_merge(self):
+        engine = DeduplicationEngine()
+        engine.upsert("win10", "Windows 10", "operating system by microsoft", ["runs on pc"], rank=1)
+        engine.upsert("win11", "Windows 11", "operating system by microsoft", ["runs on pc"], rank=2)
+        engine.upsert("py2", "python2", rank=3)
+        engine.upsert("py3", "Python3", rank=4)
+        self.assertEqual(engine.find_duplicates().matches, [])
+
+    def test_label_only_needs_higher_score(self):
+        engine = DeduplicationEngine()
+        engine.upsert("ml", "machine learning", rank=1)
+        engine.upsert("model", "machine learning model", rank=2)
+        self.assertEqual(engine.find_duplicates().matches, [])
+        engine.upsert("ml", "machine learning", neighbours=["uses data", "part of ai"], rank=1)
+        engine.upsert("model", "machine learning model", neighbours=["uses data", "part of ai"], rank=2)
+        self.assertEqual([(m.duplicate, m.canonical) for m in engine.find_duplicates().matches],
+                         [("model", "ml")])
+
+    def test_incremental_pass_checks_only_changes(self):
+        concepts, _, _ = _synthetic_graph(500, 0.0, seed=4)
+        engine = DeduplicationEngine()
+        for rank, (concept_id, data) in enumerate(concepts.items()):
+            engine.upsert(concept_id, data["label"], rank=rank)
+        self.assertEqual(engine.find_duplicates().matches, [])
+        self.assertFalse(engine.upsert("c3", concepts["c3"]["label"], rank=3))
+        engine.upsert("new", concepts["c7"]["label"].title().replace(" ", "_"), rank=100)
+        report = engine.find_duplicates()
+        self.assertEqual(report.items_checked, 1)
+        self.assertEqual([(m.duplicate, m.canonical) for m in report.matches], [("new", "c7")])
+
+    def test_block_separates_relations(self):
+        engine = DeduplicationEngine(threshold=0.8)
+        engine.upsert("r1", "is_a", block=("dog", "animal"), rank=1)
+        engine.upsert("r2", "isA", block=("dog", "animal"), rank=2)
+        engine.upsert("r3", "is a", block=("cat", "animal"), rank=3)
+        report = engine.find_duplicates()
+        self.assertEqual([(m.duplicate, m.canonical) for m in report.matches], [("r2", "r1")])
+
+    def test_synthetic_recall_and_precision(self):
+        concepts, truth, _ = _synthetic_graph(30000, 0.1, seed=2)
+        engine = DeduplicationEngine()
+        for rank, (concept_id, data) in enumerate(concepts.items()):
+            engine.upsert(concept_id, data["label"], data["description"], data["neighbours"], rank=rank)
+        found = {(m.canonical, m.duplicate) for m in engine.find_duplicates().matches}
+        self.assertGreater(len(found & truth) / len(truth), 0.9)
+        self.assertGreater(len(found & truth) / len(found), 0.98)
+
+
+if __name__ == "__main__":
+    unittest.main()
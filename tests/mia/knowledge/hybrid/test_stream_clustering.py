@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for stream_clustering.py
+"""
+
+import json
+import sys
+from collections import Counter
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.knowledge.hybrid.stream_clustering import StreamingClusterer, _synthetic_interactions
+
+
+class TestStreamClustering(unittest.TestCase):
+    """Test cases for stream_clustering.py"""
+
+    def test_similar_texts_share_cluster(self):
+        clusterer = StreamingClusterer(min_weight=1.5)
+        first = clusterer.add("sourdough bread starter flour water")
+        second = clusterer.add("bread flour starter for sourdough loaf")
+        other = clusterer.add("python list comprehension syntax brackets")
+        self.assertTrue(first.created)
+        self.assertFalse(second.created)
+        self.assertEqual(first.cluster_id, second.cluster_id)
+        self.assertNotEqual(first.cluster_id, other.cluster_id)
+        self.assertEqual([c.cluster_id for c in clusterer.patterns()], [first.cluster_id])
+
+    def test_empty_text_is_ignored(self):
+        clusterer = StreamingClusterer()
+        self.assertIsNone(clusterer.add(""))
+        self.assertEqual(clusterer.tick, 0)
+
+    def test_cluster_ids_stable_over_stream(self):
+        clusterer = StreamingClusterer(prune_interval=200)
+        topic_cluster = {}
+        for i, (topic, text) in enumerate(_synthetic_interactions(4000, 8, seed=5)):
+            cluster_id = clusterer.add(text).cluster_id
+            if i >= 1000:
+                topic_cluster.setdefault(topic, Counter())[cluster_id] += 1
+        dominant = {topic: counts.most_common(1)[0] for topic, counts in topic_cluster.items()}
+        self.assertEqual(len({cluster_id for cluster_id, _ in dominant.values()}), 8)
+        for topic, (cluster_id, count) in dominant.items():
+            self.assertGreater(count / sum(topic_cluster[topic].values()), 0.95)
+        # Stray points that opened their own cluster are merged back into the topic
+        self.assertEqual(len(clusterer.clusters), 8)
+
+    def test_inactive_clusters_decay_and_are_pruned(self):
+        clusterer = StreamingClusterer(half_life=50, prune_interval=100, min_weight=3)
+        old = clusterer.add("quantum entanglement photon experiment").cluster_id
+        for i in range(500):
+            clusterer.add(f"weather forecast rain tomorrow {i}")
+        self.assertNotIn(old, clusterer.clusters)
+        self.assertEqual(clusterer.weight(old), 0.0)
+
+    def test_max_clusters_enforced(self):
+        clusterer = StreamingClusterer(max_clusters=10, prune_interval=10 ** 6)
+        for i in range(50):
+            clusterer.add(f"uniqueword{i} distinctterm{i}")
+        self.assertLessEqual(len(clusterer.clusters), 10)
+        for cluster_ids in clusterer.postings.values():
+            self.assertTrue(cluster_ids <= set(clusterer.clusters))
+
+    def test_state_round_trip(self):
+        clusterer = StreamingClusterer()
+        for _ in range(3):
+            clusterer.add("sourdough bread starter flour", {"n": 1})
+        state = json.loads(json.dumps(clusterer.to_dict()))
+
+        restored = StreamingClusterer()
+        self.assertTrue(restored.load_dict(state))
+        assignment = restored.add("flour starter for sourdough bread")
+        self.assertFalse(assignment.created)
+        self.assertEqual(assignment.cluster_id, 0)
+        self.assertEqual(restored.add("unrelated astronomy telescope").cluster_id, 1)
+
+    def test_state_from_other_encoder_rejected(self):
+        state = StreamingClusterer().to_dict()
+        state["encoder"] = "other"
+        self.assertFalse(StreamingClusterer().load_dict(state))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for imap_sync.py
+"""
+
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.modules.api_email.email_client import EmailClient
+from mia.modules.api_email.fake_imap import FakeIMAPServer, make_test_message
+from mia.modules.api_email.imap_sync import IMAPSyncEngine, MailboxStore, benchmark_sync
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestIMAPSync(unittest.TestCase):
+    """Test cases for imap_sync.py"""
+
+    def setUp(self):
+        logging.getLogger("MIA.EmailClient").setLevel(logging.CRITICAL)
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        config = {"check_interval": 300, "security": {"auto_delete_sensitive": True, "log_email_content": True,
+                                                      "max_stored_messages": 100000}}
+        (self.directory / "config.json").write_text(json.dumps(config))
+        self.client = EmailClient(config_path=str(self.directory / "config.json"),
+                                  email_dir=str(self.directory / "email"))
+        self.addCleanup(lambda: self.client._mailbox and self.client._mailbox.close())
+        self.server = FakeIMAPServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.account = self.server.account()
+
+    def deliver(self, count, start=0, kind="general"):
+        return self.server.append_many(make_test_message(start + i, kind, self.account.email) for i in range(count))
+
+    def engine(self, **kwargs):
+        engine = IMAPSyncEngine(self.client, self.account, **kwargs)
+        self.addCleanup(engine.close)
+        return engine
+
+    def test_initial_sync_uses_ranged_fetches_on_one_connection(self):
+        self.deliver(1200)
+        engine = self.engine(batch_size=500)
+        self.assertEqual(engine.sync(), 1200)
+        self.assertEqual(engine.highest_uid, 1200)
+        self.assertEqual(self.client.mailbox.count(self.account.email, "INBOX"), 1200)
+        self.assertEqual(self.server.commands["UID FETCH"], 3)
+        self.assertEqual(self.server.commands["FETCH"], 0)
+        self.assertEqual(self.server.commands["LOGIN"], 1)
+        # BODY.PEEK[] leaves server flags untouched
+        self.assertTrue(all(not flags for flags in self.server.folders["INBOX"].flags))
+
+    def test_incremental_sync_resumes_from_stored_state(self):
+        self.deliver(50)
+        self.engine().sync()
+        self.deliver(5, start=50)
+
+        engine = self.engine()
+        self.assertEqual(engine.sync(), 5)
+        self.assertEqual(engine.stats["fetch_commands"], 1)
+        self.assertEqual(engine.sync(), 0)
+        self.assertEqual(self.client.mailbox.count(), 55)
+        self.assertEqual(self.client.mailbox.get_folder_state(self.account.email, "INBOX")[1], 55)
+
+    def test_uidvalidity_change_resyncs_folder(self):
+        self.deliver(20)
+        engine = self.engine()
+        engine.sync()
+        engine.disconnect()
+        self.server.renumber()
+
+        self.assertEqual(engine.sync(), 20)
+        self.assertEqual(engine.uidvalidity, 2)
+        self.assertEqual(self.client.mailbox.count(), 20)
+
+    def test_api_keys_and_verifications_processed(self):
+        self.deliver(3, kind="api_key")
+        self.deliver(2, start=3, kind="verification")
+        engine = self.engine(batch_size=2)
+        self.assertEqual(engine.sync(), 5)
+        self.assertGreaterEqual(engine.stats["api_keys"], 3)
+        self.assertTrue(list((self.client.keys_dir / "openai").glob("*.json")))
+        verifications = json.loads((self.client.email_dir / "verifications.json").read_text())
+        self.assertEqual(len(verifications), 2)
+
+        # auto_delete_sensitive: processed, but neither message is kept in the mailbox
+        self.assertEqual(engine.stats["sensitive_dropped"], 5)
+        self.assertEqual(self.client.mailbox.count(), 0)
+        self.assertEqual(self.client.mailbox.get_folder_state(self.account.email, "INBOX")[1], 5)
+        self.assertEqual(engine.sync(), 0)
+
+    def test_sensitive_messages_kept_without_auto_delete(self):
+        self.client.config["security"]["auto_delete_sensitive"] = False
+        self.deliver(3, kind="api_key")
+        self.deliver(2, start=3)
+        self.assertEqual(self.engine().sync(), 5)
+        api_messages = self.client.mailbox.get_messages(email_type="api_key")
+        self.assertEqual(len(api_messages), 3)
+        self.assertTrue(all(message["processed"] for message in api_messages))
+        self.assertEqual(self.client.mailbox.count(), 5)
+
+    def test_full_text_search(self):
+        self.deliver(30)
+        self.engine().sync()
+        hits = self.client.search_messages("project 7")
+        self.assertTrue(hits)
+        self.assertTrue(all("project 7." in hit["body"] for hit in hits))
+        self.assertEqual(self.client.search_messages('"unbalanced'), [])
+
+    def test_idle_push_and_stop(self):
+        self.deliver(3)
+        engine = self.engine()
+        thread = threading.Thread(target=engine.run, daemon=True)
+        thread.start()
+        self.assertTrue(wait_until(lambda: self.client.mailbox.count() == 3))
+        self.assertTrue(wait_until(lambda: self.server.idlers))
+
+        self.deliver(2, start=3)
+        self.assertTrue(wait_until(lambda: self.client.mailbox.count() == 5, timeout=3.0))
+        self.assertGreaterEqual(engine.stats["idle_wakeups"], 1)
+        self.assertEqual(engine.stats["connections"], 1)
+
+        started = time.perf_counter()
+        engine.stop()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.perf_counter() - started, 2.0)
+
+    def test_polling_without_idle(self):
+        self.server.capabilities = "IMAP4rev1"
+        engine = self.engine(poll_interval=0.1)
+        thread = threading.Thread(target=engine.run, daemon=True)
+        thread.start()
+        self.deliver(4)
+        self.assertTrue(wait_until(lambda: self.client.mailbox.count() == 4))
+        self.assertEqual(self.server.commands["IDLE"], 0)
+        engine.stop()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+
+    def test_store_prunes_oldest(self):
+        store = MailboxStore(self.directory / "prune.db")
+        self.addCleanup(store.close)
+        store.reset_folder("a", "INBOX", 1)
+        store.add_messages("a", "INBOX", [(uid, {"subject": f"s{uid}"}) for uid in range(1, 11)], highest_uid=10)
+        self.assertEqual(store.add_messages("a", "INBOX", [(10, {"subject": "dup"})]), 0)
+        self.assertEqual(store.prune("a", 4), 6)
+        self.assertEqual([m["uid"] for m in store.get_messages("a")], [10, 9, 8, 7])
+        self.assertEqual(store.get_folder_state("a", "INBOX"), (1, 10))
+
+    def test_sync_benchmark(self):
+        result = benchmark_sync(messages=2000, batch_size=250, new_messages=20, legacy_sample=200)
+        self.assertEqual(result["initial_sync"]["messages"], 2000)
+        self.assertEqual(result["initial_sync"]["fetch_commands"], 8)
+        self.assertEqual(result["incremental_sync"]["messages"], 20)
+        self.assertEqual(result["legacy"]["fetch_commands"], 200)
+        self.assertGreater(result["initial_sync_speedup"], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for health_monitor.py
+"""
+
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.modules.monitoring.health_monitor import ComponentStatus, HealthMonitor, HealthStatus
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestHealthMonitor(unittest.TestCase):
+    """Test cases for health_monitor.py"""
+
+    def setUp(self):
+        logging.getLogger("MIA.HealthMonitor").setLevel(logging.CRITICAL)
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def monitor(self, **overrides):
+        config = {
+            "enabled": True,
+            "monitoring_interval": 0.05,
+            "checkpoint_interval": 3600.0,
+            "max_checkpoints": 5,
+            "full_checkpoint_every": 3,
+            "probes": {"interval": 0.05, "jitter": 0.0, "failure_threshold": 3, "reset_timeout": 30.0},
+            "recovery": {"auto_recovery": True, "max_recovery_attempts": 2, "recovery_delay": 30.0},
+            "components": {"vision": {"enabled": True, "timeout": 0.2}, "chat": {"enabled": True, "timeout": 1.0}}
+        }
+        config.update(overrides)
+        (self.directory / "config.json").write_text(json.dumps(config))
+        monitor = HealthMonitor(config_path=str(self.directory / "config.json"),
+                                monitoring_dir=str(self.directory / "monitoring"))
+        self.addCleanup(monitor.stop_monitoring)
+        return monitor
+
+    def hanging(self):
+        self.release.wait()
+
+    def alerts(self, monitor, component):
+        return [alert for alert in monitor.get_active_alerts() if alert["component"] == component]
+
+    def test_hanging_component_detected_within_deadline(self):
+        monitor = self.monitor()
+        monitor.register_component("vision", self.hanging)
+        monitor.register_component("chat", lambda: time.sleep(0.1) or {"status": "online"})
+
+        started = time.monotonic()
+        self.assertTrue(monitor.start_monitoring())
+        self.assertTrue(wait_until(lambda: self.alerts(monitor, "vision")))
+        self.assertLess(time.monotonic() - started, 0.6)
+
+        alert = self.alerts(monitor, "vision")[0]
+        self.assertEqual(alert["severity"], HealthStatus.CRITICAL.value)
+        self.assertIn("timed out", alert["message"])
+        self.assertEqual(monitor.components["vision"].status, ComponentStatus.ERROR)
+
+        # The slow component keeps being probed while the other one hangs
+        self.assertTrue(wait_until(lambda: monitor.components["chat"].status == ComponentStatus.ONLINE))
+        self.assertGreaterEqual(monitor.components["chat"].response_time, 0.1)
+        self.assertEqual(self.alerts(monitor, "chat"), [])
+
+        # Recovery started for the hung component without waiting out recovery_delay
+        self.assertIn("vision", monitor.get_status()["recovery"]["active"])
+        self.assertTrue(monitor.get_status()["probes"]["vision"]["hung"])
+
+    def test_failing_probe_warns(self):
+        monitor = self.monitor()
+        monitor.register_component("chat", lambda: 1 / 0)
+        monitor.start_monitoring()
+        self.assertTrue(wait_until(lambda: self.alerts(monitor, "chat")))
+        alert = self.alerts(monitor, "chat")[0]
+        self.assertEqual(alert["severity"], HealthStatus.WARNING.value)
+        self.assertIn("ZeroDivisionError", alert["message"])
+
+    def test_critical_alert_does_not_block_on_recovery(self):
+        monitor = self.monitor()
+        started = time.perf_counter()
+        monitor._create_alert(HealthStatus.CRITICAL, "system", "CPU usage critical: 99.0%", {"cpu_percent": 99.0})
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertIn("system", monitor.recovery.active)
+
+    def test_recovery_resolves_alert(self):
+        monitor = self.monitor(recovery={"auto_recovery": True, "max_recovery_attempts": 2, "recovery_delay": 0.0})
+        monitor.register_component("chat", lambda: {"status": "online"})
+        monitor.components["chat"].status = ComponentStatus.ERROR
+        monitor._create_alert(HealthStatus.CRITICAL, "chat", "Component health check timed out", {"error_count": 1})
+        monitor.components["chat"].status = ComponentStatus.ONLINE
+        self.assertTrue(wait_until(lambda: monitor.recovery.tick() or not monitor.recovery.active))
+        self.assertEqual(self.alerts(monitor, "chat"), [])
+
+    def test_delta_checkpoints(self):
+        monitor = self.monitor()
+        monitor.current_metrics = monitor._collect_system_metrics()
+        self.assertIsNotNone(monitor.current_metrics)
+        monitor.register_component("chat", lambda: None)
+
+        checkpoint_ids = []
+        for i in range(4):
+            monitor.components["chat"].error_count = i
+            monitor.performance_baselines["cpu_baseline"] = 10.0 + i
+            checkpoint_ids.append(monitor._create_checkpoint())
+        self.assertEqual(len(set(checkpoint_ids)), 4)
+
+        chains = sorted((self.directory / "monitoring" / "checkpoints").glob("chain_*.jsonl"))
+        self.assertEqual(len(chains), 2)
+        records = [json.loads(line) for line in chains[0].read_text().splitlines()]
+        self.assertEqual([record["type"] for record in records], ["full", "delta", "delta"])
+        self.assertEqual(records[1]["changed"]["component_states"], {"chat": {"error_count": 1}})
+        self.assertNotIn("config_snapshot", records[1]["changed"])
+        self.assertLess(len(json.dumps(records[1])), len(json.dumps(records[0])) / 2)
+
+        monitor.performance_baselines = {}
+        self.assertTrue(monitor.restore_from_checkpoint(checkpoint_ids[2]))
+        self.assertEqual(monitor.performance_baselines["cpu_baseline"], 12.0)
+        self.assertEqual(monitor._read_checkpoint(checkpoint_ids[1])["component_states"]["chat"]["error_count"], 1)
+        self.assertFalse(monitor.restore_from_checkpoint("checkpoint_missing"))
+
+        # A new monitor finds the chains and continues numbering after them
+        reopened = self.monitor()
+        self.assertTrue(reopened.restore_from_checkpoint(checkpoint_ids[3]))
+        self.assertEqual(reopened.performance_baselines["cpu_baseline"], 13.0)
+        self.assertEqual(reopened._checkpoint_seq, 4)
+
+    def test_old_checkpoint_chains_pruned(self):
+        monitor = self.monitor()
+        monitor.current_metrics = monitor._collect_system_metrics()
+        checkpoint_ids = [monitor._create_checkpoint() for _ in range(10)]
+        chains = sorted((self.directory / "monitoring" / "checkpoints").glob("chain_*.jsonl"))
+        # Whole chains are dropped only while at least max_checkpoints stay restorable
+        self.assertEqual([chain.name for chain in chains],
+                         ["chain_000004.jsonl", "chain_000007.jsonl", "chain_000010.jsonl"])
+        self.assertEqual(len(monitor.checkpoints), 5)
+        self.assertFalse(monitor.restore_from_checkpoint(checkpoint_ids[0]))
+        self.assertTrue(monitor.restore_from_checkpoint(checkpoint_ids[-1]))
+
+    def test_process_scan_cached(self):
+        monitor = self.monitor()
+        monitor._process_cache = (time.monotonic(), ["mia:1"])
+        self.assertEqual(monitor._mia_processes(), ["mia:1"])
+        monitor._process_cache = (0.0, [])
+        self.assertIsInstance(monitor._mia_processes(), list)
+
+
+if __name__ == "__main__":
+    unittest.main()
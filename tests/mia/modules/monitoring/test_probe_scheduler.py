@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for probe_scheduler.py
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.modules.monitoring.probe_scheduler import (
+    CircuitBreaker, CircuitState, ProbeScheduler, RecoveryManager, RecoveryState, benchmark_detection
+)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestProbeScheduler(unittest.TestCase):
+    """Test cases for probe_scheduler.py"""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.results = []
+        self.scheduler = ProbeScheduler(self.results.append, jitter=0.0, seed=1)
+        self.addCleanup(self.scheduler.stop)
+
+    def hanging(self):
+        self.release.wait()
+
+    def of(self, name, status=None):
+        return [r for r in list(self.results) if r.name == name and (status is None or r.status == status)]
+
+    def test_hanging_probe_detected_at_deadline_without_blocking_others(self):
+        self.scheduler.add("hanging", self.hanging, interval=0.05, timeout=0.2)
+        self.scheduler.add("slow", lambda: time.sleep(0.1) or {"status": "online"}, interval=0.05, timeout=1.0)
+        started = time.monotonic()
+        self.scheduler.start()
+
+        self.assertTrue(wait_until(lambda: self.of("hanging", "timeout")))
+        detected = time.monotonic() - started
+        self.assertLess(detected, 0.5)
+        self.assertTrue(wait_until(lambda: len(self.of("slow", "ok")) >= 3))
+
+        slow = self.of("slow", "ok")[0]
+        self.assertGreaterEqual(slow.duration, 0.1)
+        self.assertEqual(slow.value, {"status": "online"})
+        # A hung call is reported once and never stacked up
+        self.assertEqual(len(self.of("hanging", "timeout")), 1)
+        self.assertEqual(self.scheduler.get_status()["hanging"]["runs"], 1)
+        self.assertTrue(self.scheduler.get_status()["hanging"]["hung"])
+
+    def test_hung_probe_runs_again_after_returning(self):
+        self.scheduler.add("stuck", self.hanging, interval=0.05, timeout=0.1)
+        self.scheduler.start()
+        self.assertTrue(wait_until(lambda: self.of("stuck", "timeout")))
+        self.release.set()
+        self.assertTrue(wait_until(lambda: self.scheduler.get_status()["stuck"]["runs"] >= 2))
+        self.assertTrue(wait_until(lambda: self.of("stuck", "ok")))
+
+    def test_errors_open_circuit(self):
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise ConnectionError("refused")
+
+        scheduler = ProbeScheduler(self.results.append, jitter=0.0, failure_threshold=2, reset_timeout=30.0)
+        self.addCleanup(scheduler.stop)
+        scheduler.add("db", broken, interval=0.02, timeout=1.0)
+        scheduler.start()
+        self.assertTrue(wait_until(lambda: self.of("db", "open")))
+        errors = self.of("db", "error")
+        self.assertEqual(len(errors), 2)
+        self.assertIn("ConnectionError: refused", errors[0].error)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(scheduler.get_status()["db"]["circuit"], "open")
+
+    def test_circuit_breaker_half_open_backoff(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, max_reset_timeout=30.0)
+        breaker.record_failure(0.0)
+        self.assertTrue(breaker.allow(0.0))
+        breaker.record_failure(1.0)
+        self.assertFalse(breaker.allow(5.0))
+        self.assertTrue(breaker.allow(11.0))
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        breaker.record_failure(11.0)
+        self.assertEqual(breaker.reset_timeout, 20.0)
+        self.assertFalse(breaker.allow(25.0))
+        self.assertTrue(breaker.allow(31.0))
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self.assertEqual(breaker.reset_timeout, 10.0)
+
+    def test_jitter_spreads_intervals(self):
+        scheduler = ProbeScheduler(self.results.append, jitter=0.2, seed=3)
+        probe = type("Probe", (), {"interval": 10.0})()
+        intervals = {round(scheduler._next_interval(probe), 3) for _ in range(20)}
+        self.assertGreater(len(intervals), 10)
+        self.assertTrue(all(8.0 <= interval <= 12.0 for interval in intervals))
+
+    def test_detection_benchmark(self):
+        result = benchmark_detection(components=10, slow_seconds=0.03, timeout=0.2)
+        self.assertTrue(result["scheduler"]["detects_hang"])
+        self.assertLess(result["scheduler"]["detection_seconds"], 0.5)
+        self.assertGreater(result["serial"]["seconds_before_reaching_hanging_probe"], 0.25)
+
+
+class TestRecoveryManager(unittest.TestCase):
+    """Test cases for RecoveryManager"""
+
+    def test_request_and_tick_never_block(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        manager = RecoveryManager(lambda target: release.wait(), lambda task: False, delay=0.0)
+        self.addCleanup(manager.shutdown)
+
+        started = time.perf_counter()
+        task = manager.request("voice")
+        self.assertIs(manager.request("voice"), task)
+        manager.tick()
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertEqual(task.state, RecoveryState.ACTING)
+
+        release.set()
+        self.assertTrue(wait_until(lambda: manager.tick() or task.state == RecoveryState.RESOLVED))
+        self.assertEqual(task.transitions, ["pending", "acting", "verifying", "resolved"])
+        self.assertNotIn("voice", manager.active)
+
+    def test_retries_until_max_attempts(self):
+        actions = []
+        finished = []
+        manager = RecoveryManager(actions.append, lambda task: True, delay=0.05, max_attempts=3,
+                                  on_finished=finished.append)
+        self.addCleanup(manager.shutdown)
+        task = manager.request("memory")
+        self.assertTrue(wait_until(lambda: manager.tick() or task.state == RecoveryState.FAILED))
+        self.assertEqual(task.attempts, 3)
+        self.assertEqual(actions, ["memory"] * 3)
+        self.assertEqual(finished, [task])
+
+    def test_action_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        actions = []
+
+        def hang(target):
+            actions.append(target)
+            release.wait()
+
+        manager = RecoveryManager(hang, lambda task: True, delay=0.0, max_attempts=3, action_timeout=0.1)
+        self.addCleanup(manager.shutdown)
+        task = manager.request("lora_manager")
+        self.assertTrue(wait_until(lambda: manager.tick() or task.state == RecoveryState.FAILED))
+        self.assertIn("exceeded", task.error)
+        self.assertEqual(task.transitions, ["pending", "acting", "failed"])
+
+        # The hung action still runs: a new request waits for it instead of starting another
+        retry = manager.request("lora_manager")
+        manager.tick()
+        self.assertEqual(retry.state, RecoveryState.PENDING)
+        self.assertEqual(actions, ["lora_manager"])
+        release.set()
+        self.assertTrue(wait_until(lambda: manager.tick() or retry.state == RecoveryState.FAILED))
+        self.assertEqual(actions, ["lora_manager"] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
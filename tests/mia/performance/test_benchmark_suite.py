@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for benchmark_suite.py
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.performance.benchmark_suite import (
+    BenchmarkCase, BenchmarkConfig, compare_results, load_baseline, mann_whitney_u, run_suite,
+    save_baseline, summarize
+)
+
+QUICK = BenchmarkConfig(warmup=2, repetitions=3, iterations=15, bootstrap_samples=200, isolate=False)
+
+
+def busy_case(name, seconds):
+    calls = []
+
+    def operation(state, i):
+        calls.append(i)
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+
+    case = BenchmarkCase(name, lambda workdir, rng: {"workdir": workdir}, operation)
+    return case, calls
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Test cases for benchmark_suite.py"""
+
+    def test_summary_confidence_intervals(self):
+        rng = random.Random(3)
+        samples = [rng.expovariate(1.0) for _ in range(2000)]
+        summary = summarize(samples, bootstrap_samples=300, seed=1)
+        # Exponential(1): median ln 2, p95 ln 20, p99 ln 100
+        for name, true_value in (("median", 0.693), ("p95", 2.996), ("p99", 4.605)):
+            low, high = summary["ci"][name]
+            self.assertLessEqual(low, summary[name])
+            self.assertGreaterEqual(high, summary[name])
+            self.assertAlmostEqual(summary[name], true_value, delta=0.2 * true_value)
+        self.assertEqual(summary["n"], 2000)
+
+    def test_mann_whitney(self):
+        rng = random.Random(4)
+        a = [rng.gauss(1.0, 0.1) for _ in range(200)]
+        b = [rng.gauss(1.0, 0.1) for _ in range(200)]
+        shifted = [value + 0.1 for value in b]
+        self.assertGreater(mann_whitney_u(a, b)[1], 0.01)
+        self.assertLess(mann_whitney_u(a, shifted)[1], 1e-6)
+        self.assertEqual(mann_whitney_u([], a), (0.0, 1.0))
+
+    def test_warmup_and_repetitions(self):
+        case, calls = busy_case("busy", 0.0005)
+
+        async def async_operation(state, i):
+            await asyncio.sleep(0)
+
+        async_case = BenchmarkCase("async", lambda workdir, rng: None, async_operation)
+        results = run_suite(config=QUICK, cases={"busy": case, "async": async_case})
+        busy = results["cases"]["busy"]
+        self.assertEqual(calls, list(range(2 + 3 * 15)))
+        self.assertEqual(len(busy["samples"]), 45)
+        self.assertEqual(len(busy["repetition_medians"]), 3)
+        self.assertGreaterEqual(busy["stats"]["median"], 0.0005)
+        self.assertEqual(results["cases"]["async"]["status"], "ok")
+
+    def test_missing_dependency_and_failure(self):
+        missing = BenchmarkCase("missing", lambda w, r: None, lambda s, i: None, requires=("no_such_module_x",))
+        broken = BenchmarkCase("broken", lambda w, r: None, lambda s, i: 1 / 0)
+        results = run_suite(config=QUICK, cases={"missing": missing, "broken": broken})
+        self.assertEqual(results["cases"]["missing"]["status"], "skipped")
+        self.assertEqual(results["cases"]["broken"]["status"], "error")
+        with self.assertRaises(ValueError):
+            run_suite(["no_such_case"], QUICK)
+
+    def test_baseline_flags_regression(self):
+        fast, _ = busy_case("op", 0.001)
+        slow, _ = busy_case("op", 0.0015)
+        same, _ = busy_case("op", 0.001)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = save_baseline(run_suite(config=QUICK, cases={"op": fast}), str(Path(tmp) / "base.json"))
+            baseline = load_baseline(str(path))
+        regression = compare_results(baseline, run_suite(config=QUICK, cases={"op": slow}))
+        self.assertEqual(regression["regressions"], ["op"])
+        self.assertGreater(regression["cases"]["op"]["median_ratio"], 1.3)
+        unchanged = compare_results(baseline, run_suite(config=QUICK, cases={"op": same}))
+        self.assertEqual(unchanged["regressions"], [])
+
+    def test_real_component_isolated(self):
+        config = BenchmarkConfig(warmup=1, repetitions=2, iterations=5, bootstrap_samples=50, timeout=120)
+        results = run_suite(["reasoning_forward_chaining", "hybrid_pipeline_process"], config)
+        for name in ("reasoning_forward_chaining", "hybrid_pipeline_process"):
+            case = results["cases"][name]
+            self.assertEqual(case["status"], "ok", case.get("reason"))
+            self.assertEqual(len(case["samples"]), 10)
+            self.assertGreater(case["peak_rss_mb"], 0)
+            for key in ("median", "p95", "p99"):
+                self.assertIn(key, case["stats"]["ci"])
+
+
+if __name__ == "__main__":
+    unittest.main()
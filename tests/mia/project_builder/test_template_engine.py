@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Tests for template_engine.py
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.project_builder.template_engine import (
+    ScaffoldWriter, TemplateEngine, TemplateError, TemplateSyntaxError, UndefinedVariable, benchmark_templates
+)
+from mia.project_builder.template_manager import TemplateManager
+from mia.project_builder.project_generator import ProjectConfig, ProjectGenerator, ProjectType, TechStack
+
+
+class TestTemplateEngine(unittest.TestCase):
+    """Test cases for template_engine.py"""
+
+    def setUp(self):
+        self.engine = TemplateEngine()
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        logging.getLogger("MIA.TemplateManager").setLevel(logging.CRITICAL)
+        logging.getLogger("MIA.ProjectGenerator").setLevel(logging.CRITICAL)
+
+    def test_variables_filters_and_literal_braces(self):
+        source = "name={{ name }} slug={{name|slug}} up={{ author.name | upper }}\nstyle={{color: 'red'}} {x}"
+        result = self.engine.render(source, {"name": "My App_1", "author": {"name": "ana"}})
+        self.assertEqual(result, "name=My App_1 slug=my-app-1 up=ANA\nstyle={{color: 'red'}} {x}")
+        self.assertEqual(self.engine.render("{{ items|json }}", {"items": [1, "a"]}), '[1, "a"]')
+        self.assertEqual(self.engine.render("no placeholders", {}), "no placeholders")
+
+    def test_conditionals_and_loops(self):
+        source = (
+            "deps:\n"
+            "{% for dep in deps %}\n"
+            "- {{ dep }}{% if loop.last %}.{% else %},{% endif %}\n"
+            "{% endfor %}\n"
+            "{% if database == \"postgres\" and not sqlite %}\n"
+            "db: pg\n"
+            "{% elif \"redis\" in features %}\n"
+            "db: redis\n"
+            "{% else %}\n"
+            "db: none\n"
+            "{% endif %}\n"
+        )
+        context = {"deps": ["fastapi", "uvicorn"], "database": "postgres", "sqlite": False, "features": []}
+        self.assertEqual(self.engine.render(source, context), "deps:\n- fastapi,\n- uvicorn.\ndb: pg\n")
+        context.update(database=None, features=["redis"])
+        self.assertEqual(self.engine.render(source, context), "deps:\n- fastapi,\n- uvicorn.\ndb: redis\n")
+        context.update(deps=[], features=[])
+        self.assertEqual(self.engine.render(source, context), "deps:\ndb: none\n")
+
+    def test_strict_and_lenient_undefined(self):
+        with self.assertRaises(UndefinedVariable) as raised:
+            self.engine.render("line one\nhello {{ user }}", {}, name="greeting")
+        self.assertEqual((raised.exception.name, raised.exception.line), ("user", 2))
+        self.assertIn("greeting:2", str(raised.exception))
+        with self.assertRaises(UndefinedVariable):
+            self.engine.render("{% if user.name %}x{% endif %}", {"user": {}})
+
+        self.assertEqual(self.engine.render("hi {{ user }}", {}, strict=False), "hi {{ user }}")
+        self.assertEqual(self.engine.render("{% if flag %}x{% endif %}y", {}, strict=False), "y")
+
+    def test_raw_blocks_and_declared_variables(self):
+        source = (
+            "<h1>{{ title }}</h1>\n"
+            "{% raw %}\n"
+            "{% extends \"base.html\" %}{% block content %}{{ msg }}{% endblock %}\n"
+            "{% endraw %}\n"
+            "inline: {% raw %}{{ user }}{% endraw %}\n"
+        )
+        self.assertEqual(self.engine.render(source, {"title": "Home"}),
+                         "<h1>Home</h1>\n{% extends \"base.html\" %}{% block content %}{{ msg }}{% endblock %}\n"
+                         "inline: {{ user }}\n")
+        with self.assertRaises(TemplateSyntaxError) as raised:
+            self.engine.compile("a\n{% raw %}{{ x }}", "t")
+        self.assertIn("unclosed 'raw'", str(raised.exception))
+
+        workflow = "token: ${{ secrets.GITHUB_TOKEN }}\nname: {{ project_name }}\n<p>{{ msg }}</p>"
+        rendered = self.engine.render(workflow, {"project_name": "app"}, declared={"project_name"})
+        self.assertEqual(rendered, "token: ${{ secrets.GITHUB_TOKEN }}\nname: app\n<p>{{ msg }}</p>")
+        self.assertEqual(self.engine.render("{{ msg }}", {}, declared={"project_name"}), "{{ msg }}")
+        with self.assertRaises(UndefinedVariable):
+            self.engine.render(workflow, {}, declared={"project_name"})
+        with self.assertRaises(UndefinedVariable):
+            self.engine.render("{% if project_name %}x{% endif %}", {}, declared={"project_name"})
+
+    def test_syntax_errors_report_line(self):
+        cases = {
+            "a\n{% if x %}\nb": "unclosed 'if'",
+            "{% endfor %}": "'endfor' without 'for'",
+            "x\n\n{{ name|nope }}": "unknown filter 'nope'",
+            "{% while x %}{% endwhile %}": "unknown tag 'while'",
+        }
+        for source, message in cases.items():
+            with self.assertRaises(TemplateSyntaxError, msg=source) as raised:
+                self.engine.compile(source, "t")
+            self.assertIn(message, str(raised.exception))
+        with self.assertRaises(TemplateSyntaxError) as raised:
+            self.engine.compile("x\n\n{{ name|nope }}", "t")
+        self.assertEqual(raised.exception.line, 3)
+
+    def test_compiled_once_and_cached(self):
+        for index in range(5):
+            self.engine.render("{{ n }}", {"n": index})
+        self.assertEqual(self.engine.stats["compiled"], 1)
+        self.assertEqual(self.engine.stats["cache_hits"], 4)
+
+        small = TemplateEngine(max_cached=2)
+        for source in ["a", "b", "c"]:
+            small.compile(source)
+        self.assertEqual(len(small._cache), 2)
+
+    def test_render_files_scaffold(self):
+        files = {
+            "README.md": "# {{ name }}",
+            "Dockerfile": {"content": "FROM python", "when": "docker"},
+            "src/{{ module }}.py": {"content": "# {{ module }} of {{ name }}", "each": "modules", "as": "module"},
+            "{% if tests %}tests/test_app.py{% endif %}": "import unittest",
+        }
+        rendered = self.engine.render_files(files, {"name": "app", "docker": False, "tests": False,
+                                                    "modules": ["api", "models"]})
+        self.assertEqual(rendered, {"README.md": "# app", "src/api.py": "# api of app",
+                                    "src/models.py": "# models of app"})
+        with self.assertRaises(TemplateError):
+            self.engine.render_files({"a/{{ x }}": "1", "a/{{ y }}": "2"}, {"x": "same", "y": "same"})
+        with self.assertRaises(UndefinedVariable):
+            self.engine.render_files({"x": {"content": "", "each": "missing"}}, {})
+
+    def test_scaffold_writer_atomic_and_contained(self):
+        writer = ScaffoldWriter(max_workers=4)
+        self.addCleanup(writer.close)
+        roots = [self.directory / f"p{index}" for index in range(3)]
+        written = writer.write_many((root, {"a.txt": f"{index}", "deep/b/c.txt": "c"}) for index, root in enumerate(roots))
+        self.assertEqual(written, [["a.txt", "deep/b/c.txt"]] * 3)
+        self.assertEqual((roots[2] / "a.txt").read_text(), "2")
+        self.assertEqual(writer.stats["projects_staged"], 3)
+
+        # Existing projects are updated file by file; no temporary files are left behind
+        writer.write(roots[0], {"a.txt": "updated"})
+        self.assertEqual((roots[0] / "a.txt").read_text(), "updated")
+        self.assertEqual(sorted(os.listdir(roots[0])), ["a.txt", "deep"])
+        self.assertEqual(sorted(os.listdir(self.directory)), ["p0", "p1", "p2"])
+
+        for bad in ["../escape.txt", "/etc/passwd", "a/../../x"]:
+            with self.assertRaises(TemplateError, msg=bad):
+                writer.write(self.directory / "p3", {bad: "x"})
+        self.assertFalse((self.directory / "escape.txt").exists())
+
+    def test_template_manager_render_and_materialize(self):
+        manager = TemplateManager(templates_dir=str(self.directory / "templates"))
+        variables = {"project_name": "Demo App", "description": "d", "author": "a", "version": "1.0.0"}
+        rendered = manager.render_template("fastapi", variables)
+        self.assertIn("Demo App", rendered["src/main.py"])
+        self.assertNotIn("{{project_name}}", "".join(rendered.values()))
+        self.assertIsNone(manager.render_template("fastapi", {"project_name": "x"}))
+        self.assertIsNotNone(manager.render_template("fastapi", {"project_name": "x"}, strict=False))
+
+        manager.custom_templates["vue"] = {"name": "vue", "description": "", "tech_stack": [],
+                                           "variables": ["project_name"],
+                                           "files": {"App.vue": "<h1>{{ project_name }}</h1><p>{{ msg }}</p>",
+                                                     ".github/ci.yml": "key: ${{ secrets.GITHUB_TOKEN }}"}}
+        self.assertEqual(manager.render_template("vue", {"project_name": "Demo"}),
+                         {"App.vue": "<h1>Demo</h1><p>{{ msg }}</p>", ".github/ci.yml": "key: ${{ secrets.GITHUB_TOKEN }}"})
+
+        written = manager.materialize_template("react", variables, str(self.directory / "out"))
+        self.assertIn("package.json", written)
+        self.assertIn("demo-app", (self.directory / "out" / "package.json").read_text())
+
+        valid, errors = manager.validate_template({"name": "t", "description": "", "tech_stack": [],
+                                                   "files": {"x": "{% if a %}"}})
+        self.assertFalse(valid)
+        self.assertIn("unclosed 'if'", errors[0])
+
+    def test_project_generator_writes_in_one_batch(self):
+        generator = ProjectGenerator(str(self.directory / "projects"))
+        config = ProjectConfig("demo", "Demo", list(ProjectType)[0], TechStack.PYTHON_FASTAPI, "MIA")
+        for _ in range(2):
+            result = generator.generate_project(config)
+            self.assertTrue(result["success"])
+            project = Path(result["project_path"])
+            on_disk = sorted(str(path.relative_to(project)) for path in project.rglob("*") if path.is_file())
+            self.assertEqual(result["generated_files"], on_disk)
+        self.assertIn("src/main.py", result["generated_files"])
+        self.assertIn(".github/workflows/ci.yml", result["generated_files"])
+        self.assertEqual(generator._pending_files, {})
+
+    def test_benchmark_identical_output(self):
+        result = benchmark_templates(projects=30, workdir=self.directory / "bench", max_workers=2)
+        self.assertTrue(result["identical_output"])
+        self.assertEqual(result["writer"]["files"], result["files"])
+        self.assertEqual(result["engine"]["compiled"], 11)
+        # Compiled templates do not pay for context variables they never use
+        wide = result["render_with_50_extra_variables"]
+        self.assertLess(wide["compiled_cpu_seconds"], wide["legacy_cpu_seconds"])
+
+
+if __name__ == "__main__":
+    unittest.main()
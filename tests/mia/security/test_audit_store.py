@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for audit_store.py
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from mia.security.audit_store import AuditStore, COMPRESSED_SUFFIX, SEGMENT_SUFFIX
+
+
+class TestAuditStore(unittest.TestCase):
+    """Test cases for audit_store.py"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _fill(self, store: AuditStore, n: int):
+        for i in range(n):
+            store.append({
+                "category": "security" if i % 2 else "data",
+                "user_id": f"user_{i % 3}",
+                "severity": "info",
+                "description": f"event {i}",
+            })
+        store.flush()
+
+    def test_sequence_numbers_and_chain(self):
+        store = AuditStore(str(self.directory))
+        self._fill(store, 50)
+        result = store.verify_chain()
+        store.close()
+        self.assertTrue(result["valid"])
+        self.assertEqual(result["events_checked"], 50)
+
+    def test_rotation_and_compression(self):
+        store = AuditStore(str(self.directory), max_segment_bytes=4096)
+        self._fill(store, 300)
+        store.close()
+        names = [p.name for p in store.segments()]
+        self.assertGreater(len(names), 1)
+        self.assertTrue(all(n.endswith(COMPRESSED_SUFFIX) for n in names[:-1]))
+        self.assertTrue(names[-1].endswith(SEGMENT_SUFFIX))
+
+    def test_summary_from_index(self):
+        store = AuditStore(str(self.directory), max_segment_bytes=4096)
+        self._fill(store, 300)
+        summary = store.summary(time.time() - 3600, time.time() + 3600)
+        store.close()
+        self.assertEqual(summary["total_events"], 300)
+        self.assertEqual(summary["events_by_category"], {"data": 150, "security": 150})
+        self.assertEqual(summary["events_by_user"]["user_0"], 100)
+
+    def test_query_by_user_and_category(self):
+        store = AuditStore(str(self.directory), max_segment_bytes=4096)
+        self._fill(store, 120)
+        events = list(store.query(category="data", user_id="user_1"))
+        store.close()
+        self.assertEqual(len(events), 20)
+        self.assertTrue(all(e["user_id"] == "user_1" and e["category"] == "data" for e in events))
+
+    def test_restart_continues_chain_and_drops_torn_tail(self):
+        store = AuditStore(str(self.directory))
+        self._fill(store, 10)
+        store.close()
+        active = store.segments()[-1]
+        with open(active, "ab") as f:
+            f.write(b'{"seq": 10, "torn')
+
+        reopened = AuditStore(str(self.directory))
+        self.assertEqual(reopened.append({"category": "system"}), 10)
+        result = reopened.verify_chain()
+        reopened.close()
+        self.assertTrue(result["valid"])
+        self.assertEqual(result["events_checked"], 11)
+
+    def test_tampering_detected(self):
+        store = AuditStore(str(self.directory))
+        self._fill(store, 10)
+        store.close()
+        active = store.segments()[-1]
+        lines = active.read_text().splitlines()
+        record = json.loads(lines[4])
+        record["description"] = "rewritten"
+        lines[4] = json.dumps(record)
+        active.write_text("\n".join(lines) + "\n")
+
+        reopened = AuditStore(str(self.directory))
+        result = reopened.verify_chain()
+        reopened.close()
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["first_invalid_seq"], 4)
+
+    def test_chain_verifies_after_prune(self):
+        store = AuditStore(str(self.directory), max_segment_bytes=4096)
+        self._fill(store, 300)
+        segments = len(store.segments())
+        self.assertEqual(store.prune_before(time.time() + 60), segments - 1)
+        self.assertEqual(len(store.segments()), 1)
+        result = store.verify_chain()
+        store.close()
+        self.assertTrue(result["valid"], result)
+        kept = result["events_checked"]
+        self.assertTrue(0 < kept < 300)
+
+        reopened = AuditStore(str(self.directory))
+        self.assertEqual(reopened.append({"category": "system"}), 300)
+        result = reopened.verify_chain()
+        reopened.close()
+        self.assertTrue(result["valid"], result)
+        self.assertEqual(result["events_checked"], kept + 1)
+
+    def test_append_fails_after_writer_dies(self):
+        store = AuditStore(str(self.directory), max_pending=2)
+        release = threading.Event()
+
+        def failing_commit(batch):
+            release.wait(5)
+            raise OSError("disk gone")
+
+        store._commit = failing_commit
+        store.append({"category": "data", "description": "first"})
+        # The writer now holds the first batch; fill the queue to max_pending
+        deadline = time.time() + 5
+        while store._pending and time.time() < deadline:
+            time.sleep(0.01)
+        store.append({"category": "data", "description": "second"})
+        store.append({"category": "data", "description": "third"})
+
+        errors = []
+
+        def blocked_append():
+            try:
+                store.append({"category": "data", "description": "fourth"})
+            except RuntimeError as e:
+                errors.append(e)
+
+        producer = threading.Thread(target=blocked_append)
+        producer.start()
+        time.sleep(0.1)
+        self.assertTrue(producer.is_alive())
+        release.set()
+        producer.join(timeout=5)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(len(errors), 1)
+
+        self.assertFalse(store.flush(timeout=1))
+        with self.assertRaises(RuntimeError):
+            store.append({"category": "data", "description": "lost"})
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
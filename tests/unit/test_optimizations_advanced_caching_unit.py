@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Unit tests for optimizations/advanced_caching.py
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from optimizations.advanced_caching import (
+    AdvancedMemoryCache, CacheStrategy, FrequencySketch, PersistentDiskCache,
+    SingleFlight, UltimateCacheSystem, _zipf_trace
+)
+
+
+class TestAdvancedMemoryCache(unittest.TestCase):
+    """Test cases for AdvancedMemoryCache"""
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = AdvancedMemoryCache(max_size=2, strategy=CacheStrategy.LRU)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+
+    def test_lfu_evicts_least_frequently_used(self):
+        cache = AdvancedMemoryCache(max_size=2, strategy=CacheStrategy.LFU)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        for _ in range(3):
+            cache.get("b")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_ttl_uses_wall_clock(self):
+        cache = AdvancedMemoryCache(max_size=10)
+        cache.put("short", "value", ttl=0.05)
+        cache.put("long", "value", ttl=60)
+        self.assertEqual(cache.get("short"), "value")
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get("long"), "value")
+
+    def test_explicit_cost_budget(self):
+        cache = AdvancedMemoryCache(max_size=100, max_memory_mb=1)
+        half = 512 * 1024
+        self.assertTrue(cache.put("a", "x", cost=half))
+        self.assertTrue(cache.put("b", "y", cost=half))
+        self.assertTrue(cache.put("c", "z", cost=half))
+        self.assertEqual(cache.get_stats().size_bytes, 2 * half)
+        self.assertFalse(cache.put("huge", "w", cost=4 * half))
+
+    def test_tinylfu_keeps_hot_keys_through_scan(self):
+        hot = [f"hot_{i}" for i in range(50)]
+        survivors = {}
+        for strategy in (CacheStrategy.LRU, CacheStrategy.TINYLFU):
+            cache = AdvancedMemoryCache(max_size=100, strategy=strategy)
+            for _ in range(5):
+                for key in hot:
+                    if cache.get(key) is None:
+                        cache.put(key, key, cost=1)
+            for i in range(1000):
+                if cache.get(f"scan_{i}") is None:
+                    cache.put(f"scan_{i}", i, cost=1)
+            survivors[strategy] = sum(key in cache.cache for key in hot)
+        self.assertEqual(survivors[CacheStrategy.LRU], 0)
+        self.assertGreaterEqual(survivors[CacheStrategy.TINYLFU], 45)
+
+    def test_tinylfu_hit_rate_beats_lru_on_zipf(self):
+        trace = _zipf_trace(5000, 30000, 0.9, seed=1)
+        rates = {}
+        for strategy in (CacheStrategy.LRU, CacheStrategy.TINYLFU):
+            cache = AdvancedMemoryCache(max_size=200, strategy=strategy)
+            for key in trace:
+                if cache.get(key) is None:
+                    cache.put(key, key, cost=1)
+            rates[strategy] = cache.get_stats().hit_rate
+        self.assertGreater(rates[CacheStrategy.TINYLFU], rates[CacheStrategy.LRU])
+
+    def test_frequency_sketch_ages(self):
+        sketch = FrequencySketch(capacity=10)
+        for _ in range(8):
+            sketch.increment("key")
+        self.assertEqual(sketch.frequency("key"), 8)
+        sketch._reset()
+        self.assertEqual(sketch.frequency("key"), 4)
+
+
+class TestPersistentDiskCache(unittest.TestCase):
+    """Test cases for PersistentDiskCache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_single_log_file(self):
+        cache = PersistentDiskCache(cache_dir=self.tmp.name)
+        for i in range(20):
+            cache.put(f"key_{i}", {"i": i})
+        cache.close()
+        self.assertEqual([p.name for p in Path(self.tmp.name).iterdir()], ["cache.log"])
+
+    def test_index_rebuilt_after_restart(self):
+        cache = PersistentDiskCache(cache_dir=self.tmp.name)
+        cache.put("a", [1, 2, 3])
+        cache.put("b", "old")
+        cache.put("b", "new")
+        cache.put("gone", 1)
+        cache._delete("gone")
+        cache.close()
+
+        reopened = PersistentDiskCache(cache_dir=self.tmp.name)
+        self.assertEqual(reopened.get("a"), [1, 2, 3])
+        self.assertEqual(reopened.get("b"), "new")
+        self.assertIsNone(reopened.get("gone"))
+        reopened.close()
+
+    def test_torn_tail_is_truncated(self):
+        cache = PersistentDiskCache(cache_dir=self.tmp.name)
+        cache.put("a", "value")
+        cache.close()
+        with open(Path(self.tmp.name) / "cache.log", "ab") as f:
+            f.write(b"\x00\x05\x00")
+
+        reopened = PersistentDiskCache(cache_dir=self.tmp.name)
+        self.assertEqual(reopened.get("a"), "value")
+        self.assertTrue(reopened.put("b", "next"))
+        self.assertEqual(reopened.get("b"), "next")
+        reopened.close()
+
+    def test_compaction_preserves_live_entries(self):
+        cache = PersistentDiskCache(cache_dir=self.tmp.name, compression=False)
+        for round_ in range(3):
+            for i in range(50):
+                cache.put(f"key_{i}", f"{round_}-" + "x" * 1000)
+        size_before = (Path(self.tmp.name) / "cache.log").stat().st_size
+        cache.compact()
+        self.assertLess((Path(self.tmp.name) / "cache.log").stat().st_size, size_before)
+        self.assertEqual(cache.get("key_7"), "2-" + "x" * 1000)
+        cache.close()
+
+    def test_size_limit_evicts_oldest(self):
+        cache = PersistentDiskCache(cache_dir=self.tmp.name, max_size_mb=1, compression=False)
+        blob = b"x" * (400 * 1024)
+        for key in ("a", "b", "c"):
+            cache.put(key, blob)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), blob)
+        self.assertEqual(cache.get_stats().evictions, 1)
+        cache.close()
+
+    def test_ttl(self):
+        cache = PersistentDiskCache(cache_dir=self.tmp.name)
+        cache.put("a", 1, ttl=0.05)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+        cache.close()
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight"""
+
+    def test_concurrent_loads_coalesce(self):
+        flight = SingleFlight()
+        calls = []
+        gate = threading.Event()
+
+        def loader():
+            calls.append(1)
+            gate.wait(1)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do("key", loader))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 8)
+
+    def test_get_or_load_fills_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = UltimateCacheSystem({
+                'memory': {'max_size': 100, 'max_memory_mb': 1, 'strategy': 'tinylfu'},
+                'disk': {'cache_dir': tmp, 'max_size_mb': 1, 'compression': True},
+                'warming': {'enabled': False, 'interval': 300}
+            })
+            self.assertEqual(cache.get_or_load("k", lambda: "loaded"), "loaded")
+            self.assertEqual(cache.get_or_load("k", lambda: "other"), "loaded")
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()